@@ -0,0 +1,71 @@
+"""Benchmark the cargo packing engine on typical CJ and Legacy baggage loads.
+
+Run from the repository root::
+
+    python benchmarks/bench_cargo_packing.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cargo_packing import (  # noqa: E402
+    CONTAINERS,
+    STANDARD_BAGGAGE,
+    beam_search_packing,
+    multi_strategy_packing,
+)
+
+
+def _bags(*counts: Tuple[str, int]) -> List[Dict[str, Any]]:
+    bags = []
+    for name, count in counts:
+        preset = STANDARD_BAGGAGE[name]
+        bags.extend({"Type": name, "Dims": preset["dims"], "Flex": preset["flex"]} for _ in range(count))
+    return bags
+
+
+LOADS = {
+    "CJ": [
+        ("4 pax weekend", _bags(("Standard Suitcase", 2), ("Small Carry-on", 3))),
+        ("golf trip", _bags(("Golf Clubs (Soft Bag)", 2), ("Standard Suitcase", 3), ("Small Carry-on", 2))),
+        ("ski trip (overfull)", _bags(("Ski Bag (Soft)", 3), ("Large Suitcase", 4), ("Standard Suitcase", 4))),
+    ],
+    "Legacy": [
+        ("6 pax week", _bags(("Large Suitcase", 4), ("Standard Suitcase", 4), ("Small Carry-on", 4))),
+        ("golf + ski", _bags(("Golf Clubs (Soft Bag)", 3), ("Ski Bag (Soft)", 2), ("Large Suitcase", 5))),
+        ("full charter (overfull)", _bags(("Large Suitcase", 10), ("Standard Suitcase", 8), ("Golf Clubs (Soft Bag)", 4))),
+    ],
+}
+
+
+def _best_of(runs: int, func: Any) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    for container_type, loads in LOADS.items():
+        interior = CONTAINERS[container_type]["interior"]
+        for label, bags in loads:
+            result = multi_strategy_packing(bags, container_type, interior, beam_width=0)
+            greedy = _best_of(5, lambda: multi_strategy_packing(bags, container_type, interior, beam_width=0))
+            beam = _best_of(3, lambda: beam_search_packing(bags, container_type, interior))
+            outcome = "fits" if result["success"] else f"{result['fit_count']}/{len(bags)}"
+            print(
+                f"{container_type:<7} {label:<24} bags={len(bags):>2} greedy={outcome:<6}"
+                f" strategies: {greedy * 1000:7.1f} ms   beam: {beam * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark the Customs Dashboard data layer against the old per-leg loop.
+
+FL3XX leg-detail and migration endpoints are simulated with a fixed latency, so
+the fetch numbers reflect request scheduling rather than the network. The
+clearance numbers compare one leg at a time against uncompiled rule rows with
+the batch pass over compiled rules, with and without the materialized port
+calendar.
+
+Run from the repository root::
+
+    python benchmarks/bench_customs_service.py
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List, Mapping, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from customs_service import (  # noqa: E402
+    DEFAULT_CUSTOMS_RULES_PATH,
+    compile_customs_rules,
+    compute_clearance_window,
+    compute_clearance_windows,
+    prefetch_customs_payloads,
+    read_customs_rules,
+)
+from fl3xx_api import Fl3xxApiConfig, PayloadCache  # noqa: E402
+from flight_leg_utils import load_airport_metadata_lookup  # noqa: E402
+
+LATENCY_SECONDS = 0.04
+LEGS = 240
+
+
+def fake_fetch(config: Fl3xxApiConfig, identifier: Any, session: Any = None) -> Dict[str, Any]:
+    time.sleep(LATENCY_SECONDS)
+    return {"planningNotes": f"notes {identifier}", "arrivalMigration": {"status": "NOT_OK"}}
+
+
+def build_legs(codes: List[str], seed: int = 5) -> List[Tuple[Mapping[str, Any], str, str, str]]:
+    rng = random.Random(seed)
+    base = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    legs = []
+    for idx in range(LEGS):
+        arrival = base + timedelta(hours=rng.randint(-12, 72))
+        row = {
+            "flightId": 5000 + idx,
+            "quoteId": f"Q{idx // 2}",
+            "arrival_time": arrival.isoformat().replace("+00:00", "Z"),
+            "dep_time": (arrival - timedelta(hours=3)).isoformat().replace("+00:00", "Z"),
+        }
+        legs.append((row, "CYYC", rng.choice(codes), rng.choice(["OK", "NOT_OK", ""])))
+    return legs
+
+
+def main() -> None:
+    frame = read_customs_rules(DEFAULT_CUSTOMS_RULES_PATH)
+    book = compile_customs_rules(frame)
+    raw_rules = {code: dict(rule.record) for code, rule in book.rules.items()}
+    lookup = load_airport_metadata_lookup()
+    legs = build_legs(sorted(book.rules))
+    config = Fl3xxApiConfig(api_token="bench")
+    quote_ids = [row["quoteId"] for row, *_ in legs]
+    flight_ids = [row["flightId"] for row, *_ in legs]
+
+    start = time.perf_counter()
+    detail_cache: Dict[str, Any] = {}
+    for row, *_ in legs:
+        if row["quoteId"] not in detail_cache:
+            detail_cache[row["quoteId"]] = fake_fetch(config, row["quoteId"])
+        fake_fetch(config, row["flightId"])
+    serial_s = time.perf_counter() - start
+
+    kwargs = dict(
+        fetch_leg_details_fn=fake_fetch,
+        fetch_migration_fn=fake_fetch,
+        leg_details_cache=PayloadCache(),
+        migration_cache=PayloadCache(),
+    )
+    start = time.perf_counter()
+    cold = prefetch_customs_payloads(config, quote_ids=quote_ids, flight_ids=flight_ids, **kwargs)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = prefetch_customs_payloads(config, quote_ids=quote_ids, flight_ids=flight_ids, **kwargs)
+    warm_s = time.perf_counter() - start
+
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        per_leg = [
+            compute_clearance_window(row, dep, arr, lookup, raw_rules.get(arr), status)
+            for row, dep, arr, status in legs
+        ]
+    per_leg_s = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        batch = compute_clearance_windows(legs, lookup, book.rules)
+    batch_s = (time.perf_counter() - start) / repeats
+
+    calendar = book.calendar(datetime.now(timezone.utc).date(), days=5)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        with_calendar = compute_clearance_windows(legs, lookup, book.rules, calendar=calendar)
+    calendar_s = (time.perf_counter() - start) / repeats
+
+    assert [result[3] for result in per_leg] == [result[3] for result in batch] == [result[3] for result in with_calendar]
+    print(f"legs={LEGS} rules={len(book.rules)} requests={cold.requests}")
+    print(f"serial leg-detail + migration fetch:  {serial_s:.2f}s")
+    print(f"concurrent prefetch, cold cache:      {cold_s:.2f}s")
+    print(f"concurrent prefetch, warm cache:      {warm_s * 1000:.1f}ms ({warm.cache_hits} hits)")
+    print(f"clearance windows, per leg:           {per_leg_s * 1000:.1f}ms")
+    print(f"clearance windows, compiled batch:    {batch_s * 1000:.1f}ms")
+    print(f"clearance windows, port calendar:     {calendar_s * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark delay code collection over a multi-week window.
+
+The FL3XX postflight endpoint is simulated with a fixed latency. The serial
+run replays the old per-flight loop; the store runs replay the Delay Codes page
+loading the same six weeks twice, with most flights already closed out.
+
+Run from the repository root::
+
+    python benchmarks/bench_delay_codes.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from delay_codes import DelayRecordStore, collect_delay_code_history  # noqa: E402
+from fl3xx_api import Fl3xxApiConfig  # noqa: E402
+
+LATENCY_SECONDS = 0.02
+DAYS = 42
+FLIGHTS_PER_DAY = 30
+START = date(2026, 9, 1)
+
+
+def build_flights(rng: random.Random) -> List[Dict[str, Any]]:
+    flights = []
+    for day in range(DAYS):
+        for slot in range(FLIGHTS_PER_DAY):
+            departure = datetime.combine(START + timedelta(days=day), datetime.min.time(), timezone.utc)
+            departure += timedelta(minutes=rng.randint(0, 1200))
+            arrival = departure + timedelta(hours=2)
+            flights.append(
+                {
+                    "flightId": 100000 + day * FLIGHTS_PER_DAY + slot,
+                    "blockOffEstUTC": departure.isoformat(),
+                    "blockOnEstUTC": arrival.isoformat(),
+                    "realDateOUT": (departure + timedelta(minutes=rng.randint(-5, 45))).isoformat(),
+                    "realDateIN": (arrival + timedelta(minutes=rng.randint(-5, 45))).isoformat(),
+                    "postFlightClosed": day < DAYS - 2,
+                }
+            )
+    return flights
+
+
+def main() -> None:
+    rng = random.Random(5)
+    flights = build_flights(rng)
+    reasons = ["ATC", "WX", "Crew", "Maintenance", "Catering"]
+    requests_made: List[Any] = []
+
+    def fetch_flights(config: Fl3xxApiConfig, from_date: date, to_date: date) -> Any:
+        return flights, {}
+
+    def fetch_postflight(config: Fl3xxApiConfig, flight_id: Any, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append(flight_id)
+        return {"delayOffBlockReason": reasons[int(flight_id) % len(reasons)]}
+
+    config = Fl3xxApiConfig(api_token="bench")
+    end = START + timedelta(days=DAYS - 1)
+
+    def run(**kwargs: Any) -> Any:
+        requests_made.clear()
+        start = time.perf_counter()
+        records, _, diagnostics = collect_delay_code_history(
+            config,
+            START,
+            end,
+            fetch_flights_fn=fetch_flights,
+            fetch_postflight_fn=fetch_postflight,
+            **kwargs,
+        )
+        return time.perf_counter() - start, len(records), len(requests_made), diagnostics
+
+    print(f"days={DAYS} flights={len(flights)} latency={LATENCY_SECONDS * 1000:.0f}ms")
+    seconds, count, requests, _ = run(max_workers=1)
+    print(f"serial, no store:          {seconds:6.2f}s records={count} postflight requests={requests}")
+    seconds, count, requests, _ = run()
+    print(f"concurrent, no store:      {seconds:6.2f}s records={count} postflight requests={requests}")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DelayRecordStore(Path(tmp) / "delays.json")
+        for label in ("concurrent, cold store:", "concurrent, warm store:"):
+            seconds, count, requests, diagnostics = run(store=store)
+            print(
+                f"{label:<26} {seconds:6.2f}s records={count} postflight requests={requests} "
+                f"from store={diagnostics['postflight_from_store']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
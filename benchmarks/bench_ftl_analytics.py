@@ -0,0 +1,80 @@
+"""Benchmark the FTL Report Reader analytics on a season-long export.
+
+Run from the repository root::
+
+    python benchmarks/bench_ftl_analytics.py
+"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ftl_analytics import analyze_ftl, read_csv_bytes  # noqa: E402
+
+
+def build_season(*, pilots: int = 80, days: int = 180, seed: int = 11) -> bytes:
+    """Return an FTL CSV export with a few legs per duty day and rest marker rows."""
+
+    rng = random.Random(seed)
+    start = pd.Timestamp("2025-04-01")
+    rows: List[Dict[str, Any]] = []
+    for pilot in range(pilots):
+        name = f"Pilot {pilot:03d}"
+        for day in range(days):
+            if rng.random() < 0.3:
+                continue
+            date = start + pd.Timedelta(days=day)
+            report = date + pd.Timedelta(hours=rng.randint(5, 14), minutes=rng.choice([0, 15, 30, 45]))
+            legs = rng.randint(1, 4)
+            duty = f"{rng.randint(6, 14)}:{rng.randint(0, 59):02d}"
+            for leg in range(legs):
+                last = leg == legs - 1
+                rows.append(
+                    {
+                        "Name": name if not rows or rows[-1]["Name"] != name else "",
+                        "Duty Date": date.strftime("%d/%m/%Y"),
+                        "Report Time": report.strftime("%d/%m/%Y %H:%M"),
+                        "Duty Time": duty if last else "",
+                        "Marker": "Rest" if last else "",
+                        "Rest Before FDP (act)": f"{rng.randint(9, 16)}:{rng.randint(0, 59):02d}",
+                        "Rest After FDP (act)": f"{rng.randint(9, 16)}:{rng.randint(0, 59):02d}" if last else "",
+                    }
+                )
+    return pd.DataFrame(rows).to_csv(index=False).encode("utf-8")
+
+
+def _best_of(runs: int, func: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    data = build_season()
+    frame = pd.read_csv(io.BytesIO(data))
+    print(f"{len(frame)} rows, {frame['Name'].nunique()} pilots")
+
+    analyse = _best_of(3, lambda: analyze_ftl(frame))
+    print(f"analyze_ftl (inference + all tables): {analyse:.3f}s")
+
+    print(f"read + analyze, first render:         {_best_of(3, lambda: analyze_ftl(read_csv_bytes(data))):.3f}s")
+    analysis = analyze_ftl(read_csv_bytes(data))
+    rest_col = analysis.default_rest_prior_column()
+    analysis.min_rest_days(rest_col)
+    print(f"memoised min rest days, rerender:     {_best_of(5, lambda: analysis.min_rest_days(rest_col)):.4f}s")
+
+
+if __name__ == "__main__":
+    main()
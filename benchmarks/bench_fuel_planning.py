@@ -0,0 +1,110 @@
+"""Benchmark ForeFlight/FL3XX matching and performance fetching for fuel planning.
+
+Matching is timed against scoring every ForeFlight flight against every FL3XX
+leg. The ForeFlight performance endpoint is simulated with a fixed latency and
+fetched serially, concurrently, and again through a warm cache.
+
+Run from the repository root::
+
+    python benchmarks/bench_fuel_planning.py
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import PayloadCache  # noqa: E402
+from fuel_planning import FlightRecord, fetch_performance_payloads, match_records, score_match  # noqa: E402
+
+TAILS = 40
+DAYS = 14
+LEGS_PER_TAIL_DAY = 4
+LATENCY_SECONDS = 0.05
+PERFORMANCE_FLIGHTS = 40
+AIRPORTS = ["CYYC", "CYVR", "CYYZ", "KPSP", "KLAS", "KSFO"]
+
+
+def build_records(rng: random.Random) -> Tuple[List[FlightRecord], List[FlightRecord]]:
+    foreflight: List[FlightRecord] = []
+    fl3xx: List[FlightRecord] = []
+    start = datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    for tail_index in range(TAILS):
+        tail = f"CG{tail_index:03d}"
+        for day in range(DAYS):
+            for leg in range(LEGS_PER_TAIL_DAY):
+                departure, arrival = rng.sample(AIRPORTS[:3], 2)
+                off = start + timedelta(days=day, hours=3 * leg)
+                minutes = rng.randint(60, 180)
+                booking = f"B{tail_index:02d}{day:02d}{leg}" if rng.random() < 0.3 else None
+                for records, source, shift in ((fl3xx, "FL3XX", 0), (foreflight, "ForeFlight", rng.randint(-20, 20))):
+                    records.append(
+                        FlightRecord(
+                            source=source,
+                            tail=tail,
+                            departure_airport=departure,
+                            arrival_airport=arrival,
+                            departure_time=off + timedelta(minutes=shift),
+                            arrival_time=off + timedelta(minutes=shift + minutes),
+                            duration_minutes=minutes,
+                            flight_id=f"{source}-{len(records)}",
+                            booking_identifier=booking,
+                        )
+                    )
+    rng.shuffle(foreflight)
+    return foreflight, fl3xx
+
+
+def score_all_pairs(foreflight: List[FlightRecord], fl3xx: List[FlightRecord]) -> int:
+    best = 0
+    for ff_record in foreflight:
+        for candidate in fl3xx:
+            best = max(best, score_match(ff_record, candidate)[0])
+    return best
+
+
+def main() -> None:
+    rng = random.Random(17)
+    foreflight, fl3xx = build_records(rng)
+    print(f"foreflight={len(foreflight)} fl3xx={len(fl3xx)}")
+
+    start = time.perf_counter()
+    score_all_pairs(foreflight[:500], fl3xx)
+    all_pairs_s = (time.perf_counter() - start) * len(foreflight) / 500
+    print(f"score every pair (extrapolated):   {all_pairs_s:6.2f}s")
+
+    start = time.perf_counter()
+    matches, unmatched_foreflight, unmatched_fl3xx = match_records(foreflight, fl3xx)
+    print(
+        f"blocked match_records:             {time.perf_counter() - start:6.2f}s "
+        f"matched={len(matches)} unmatched={len(unmatched_foreflight)}/{len(unmatched_fl3xx)}"
+    )
+
+    requests_made: List[Any] = []
+
+    def fetch_performance(flight_id: str, *, token: str, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append(flight_id)
+        return {"performance": {"fuel": {"flightFuel": 1500}}}
+
+    flight_ids = [match.foreflight_record.flight_id for match in matches[:PERFORMANCE_FLIGHTS]]
+    cache = PayloadCache(300)
+    for label, kwargs in (
+        ("serial performance fetch:", {"max_workers": 1}),
+        ("concurrent, cold cache:", {"cache": cache}),
+        ("concurrent, warm cache:", {"cache": cache}),
+    ):
+        requests_made.clear()
+        start = time.perf_counter()
+        fetch_performance_payloads(flight_ids, token="bench", fetch_performance_fn=fetch_performance, **kwargs)
+        print(f"{label:<34} {time.perf_counter() - start:6.2f}s requests={len(requests_made)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark roster-to-schedule assignment on a synthetic two-week Gantt window.
+
+Run from the repository root::
+
+    python benchmarks/bench_gantt_roster_assignment.py
+"""
+
+from __future__ import annotations
+
+import copy
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from gantt_roster_assignment import _explode_roster, assign_roster_to_schedule_rows  # noqa: E402
+
+
+AIRPORTS = ["CYYZ", "CYUL", "CYYC", "CYVR", "CYEG", "CYOW", "KPSP", "KFLL", "MMSD"]
+
+
+def build_window(
+    *,
+    pilots: int = 160,
+    tails: int = 50,
+    schedule_flights: int = 2200,
+    flights_per_pilot: int = 28,
+    entries_per_pilot: int = 40,
+    seed: int = 7,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    window_start = datetime(2026, 3, 1, tzinfo=UTC)
+    window_minutes = 14 * 24 * 60
+
+    schedule_rows: List[Dict[str, Any]] = []
+    for flight_id in range(schedule_flights):
+        start = window_start + timedelta(minutes=rng.randrange(0, window_minutes, 5))
+        dep, arr = rng.sample(AIRPORTS, 2)
+        schedule_rows.append(
+            {
+                "tail": f"C-G{flight_id % tails:03d}",
+                "task_id": f"flight_{flight_id}",
+                "category": "OCS Flight" if flight_id % 9 == 0 else "Client Flight",
+                "departure_airport": dep,
+                "arrival_airport": arr,
+                "start_utc": start,
+                "end_utc": start + timedelta(hours=2),
+            }
+        )
+
+    roster_rows: List[Dict[str, Any]] = []
+    for pilot in range(pilots):
+        entries = [
+            {
+                "type": rng.choice(["P", "A", "OFF"]),
+                "fromAirport": rng.choice(AIRPORTS),
+                "toAirport": rng.choice(AIRPORTS),
+                "to": (window_start + timedelta(minutes=rng.randrange(0, window_minutes, 30))).isoformat(),
+            }
+            for _ in range(entries_per_pilot)
+        ]
+        flights = []
+        for _ in range(flights_per_pilot):
+            row = schedule_rows[rng.randrange(schedule_flights)]
+            flights.append(
+                {
+                    "flightId": int(row["task_id"].split("_", 1)[1]),
+                    "departureTime": row["start_utc"].isoformat(),
+                    "fromAirport": row["departure_airport"],
+                    "toAirport": row["arrival_airport"],
+                    "registrationNumber": row["tail"],
+                    "paxNumber": rng.randint(0, 8),
+                    "crew": [
+                        {"firstName": f"Pilot{pilot}", "lastName": "Cmd", "role": "CMD"},
+                        {"firstName": f"Pilot{(pilot + 1) % pilots}", "lastName": "Fo", "role": "FO"},
+                    ],
+                }
+            )
+        roster_rows.append(
+            {"user": {"firstName": f"Pilot{pilot}", "lastName": "Cmd"}, "entries": entries, "flights": flights}
+        )
+
+    return schedule_rows, roster_rows
+
+
+def _best_of(runs: int, func: Any) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    schedule_rows, roster_rows = build_window()
+    flights = sum(len(row["flights"]) for row in roster_rows)
+    entries = sum(len(row["entries"]) for row in roster_rows)
+    print(f"schedule rows: {len(schedule_rows)}, roster rows: {len(roster_rows)}, roster flights: {flights}, entries: {entries}")
+
+    explode = _best_of(5, lambda: _explode_roster(roster_rows))
+    total = _best_of(5, lambda: assign_roster_to_schedule_rows(copy.copy(schedule_rows), roster_rows))
+    print(f"roster extraction:       {explode * 1000:8.1f} ms")
+    print(f"join + merge_asof stage: {(total - explode) * 1000:8.1f} ms")
+    print(f"total assignment:        {total * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark the columnar Historical Airport Use analytics against per-leg helpers.
+
+Builds a two-year leg archive in a temporary directory, then compares the old
+leg-by-leg enrichment and row-wise focus filtering with the cached partition
+pivots used by the page.
+
+Run from the repository root::
+
+    python benchmarks/bench_historical_airport_analytics.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+from flight_leg_utils import filter_out_subcharter_rows, normalize_fl3xx_payload  # noqa: E402
+from historical_airport_use_utils import (  # noqa: E402
+    DEPARTURE_CODE_COLUMNS,
+    ARRIVAL_CODE_COLUMNS,
+    FOCUS_REGIONS,
+    airport_country_code,
+    airport_matches_focus,
+    airport_visits,
+    analyze_window,
+    average_flight_length_summary,
+    clear_partition_cache,
+    extract_airport_code,
+    filter_out_add_lines,
+    is_positioning_leg,
+    leg_duration_hours,
+)
+from historical_leg_archive import LegArchive  # noqa: E402
+
+START = date(2023, 1, 1)
+END = date(2024, 12, 31)
+AIRPORTS = ["CYHZ", "CYYT", "CYYC", "CYVR", "CYYZ", "KPSP", "KLAS", "MYNN", "TNCM", "MKJP", "EGGW", "LFPB"]
+LOOKUP = {
+    "CYHZ": {"country": "CA", "subd": "NS"},
+    "CYYT": {"country": "CA", "subd": "NL"},
+    "CYYC": {"country": "CA", "subd": "AB"},
+    "CYVR": {"country": "CA", "subd": "BC"},
+    "CYYZ": {"country": "CA", "subd": "ON"},
+    "KPSP": {"country": "US", "subd": "CA"},
+    "KLAS": {"country": "US", "subd": "NV"},
+    "MYNN": {"country": "BS"},
+    "TNCM": {"country": "SX"},
+    "MKJP": {"country": "JM"},
+    "EGGW": {"country": "GB"},
+    "LFPB": {"country": "FR"},
+}
+
+
+def build_fetch(per_day: int = 40, seed: int = 9):
+    rng = random.Random(seed)
+
+    def fetch(chunk_start: date, chunk_end: date) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        flights = []
+        day = chunk_start
+        while day < chunk_end:
+            for idx in range(per_day):
+                hour = rng.randint(0, 20)
+                flights.append(
+                    {
+                        "flightId": f"{day.isoformat()}-{idx}",
+                        "registrationNumber": rng.choice(["C-GASR", "C-FASW", "C-GZAS", "C-FSNY"]),
+                        "airportFrom": rng.choice(AIRPORTS),
+                        "airportTo": rng.choice(AIRPORTS),
+                        "flightType": rng.choice(["PAX", "PAX", "POS", "OWNER"]),
+                        "blockOffEstUTC": f"{day.isoformat()}T{hour:02d}:00:00Z",
+                        "blockOnEstUTC": f"{day.isoformat()}T{hour + rng.randint(1, 3):02d}:30:00Z",
+                    }
+                )
+            day += timedelta(days=1)
+        return flights, {}
+
+    return fetch
+
+
+def per_leg_summary(archive: LegArchive) -> pd.DataFrame:
+    flights = archive.read(START, END)
+    normalized, _ = normalize_fl3xx_payload({"items": flights})
+    legs, _ = filter_out_subcharter_rows(normalized)
+    legs, _ = filter_out_add_lines(legs)
+    records = []
+    for leg in legs:
+        dep = extract_airport_code(leg, DEPARTURE_CODE_COLUMNS)
+        arr = extract_airport_code(leg, ARRIVAL_CODE_COLUMNS)
+        records.append(
+            {
+                "dep_airport": dep,
+                "arr_airport": arr,
+                "dep_country": airport_country_code(dep, LOOKUP),
+                "is_pos": is_positioning_leg(leg),
+                "is_pax": str(leg.get("flightType") or "").upper() == "PAX",
+                "duration_hours": leg_duration_hours(leg),
+            }
+        )
+    frame = pd.DataFrame(records)
+    rows = []
+    for label, focus in FOCUS_REGIONS.items():
+        subset = frame[
+            frame.apply(
+                lambda row: airport_matches_focus(row["dep_airport"], LOOKUP, focus)
+                or airport_matches_focus(row["arr_airport"], LOOKUP, focus),
+                axis=1,
+            )
+        ]
+        rows.append({"Region": label, "Avg PAX": subset[subset["is_pax"]]["duration_hours"].mean()})
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = LegArchive(Path(tmp), today_fn=lambda: date(2025, 6, 1))
+        archive.refresh(START, END, build_fetch())
+
+        start = time.perf_counter()
+        per_leg_summary(archive)
+        per_leg_s = time.perf_counter() - start
+
+        clear_partition_cache()
+        start = time.perf_counter()
+        window = analyze_window(archive, START, END, LOOKUP)
+        average_flight_length_summary(window.pivot)
+        cold_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        window = analyze_window(archive, START, END, LOOKUP)
+        average_flight_length_summary(window.pivot)
+        warm_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        visits = airport_visits(window.pivot, "CYHZ")
+        airport_s = time.perf_counter() - start
+
+    print(f"legs={len(window.legs)} pivot_rows={len(window.pivot)} cyhz_months={visits['month'].nunique()}")
+    print(f"per-leg helpers + row-wise focus:  {per_leg_s:.2f}s")
+    print(f"columnar, cold partition cache:    {cold_s:.2f}s")
+    print(f"columnar, warm partition cache:    {warm_s:.3f}s")
+    print(f"single-airport multi-year visits:  {airport_s * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
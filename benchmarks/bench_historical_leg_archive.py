@@ -0,0 +1,94 @@
+"""Benchmark the Historical Airport Use leg archive against sequential chunk fetches.
+
+The FL3XX flights endpoint is simulated with a fixed per-chunk latency so the
+numbers reflect request scheduling and archive IO rather than the network.
+
+Run from the repository root::
+
+    python benchmarks/bench_historical_leg_archive.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from historical_leg_archive import LegArchive, chunk_ranges  # noqa: E402
+
+LATENCY_SECONDS = 0.05
+START = date(2023, 1, 1)
+END = date(2024, 12, 31)
+TODAY = date(2025, 1, 5)
+
+
+def build_flights(per_day: int = 40, seed: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    by_day: Dict[str, List[Dict[str, Any]]] = {}
+    day = START
+    flight_id = 0
+    while day <= END:
+        flights = []
+        for _ in range(per_day):
+            flight_id += 1
+            flights.append(
+                {
+                    "flightId": flight_id,
+                    "blockOffEstUTC": f"{day.isoformat()}T{rng.randint(12, 23):02d}:00:00Z",
+                    "airportFrom": rng.choice(["CYYC", "CYVR", "KPSP", "MYNN", "CYHZ"]),
+                    "airportTo": rng.choice(["CYYZ", "KLAS", "TNCM", "EGGW"]),
+                    "registrationNumber": rng.choice(["C-GASR", "C-FASW", "C-GZAS"]),
+                    "flightType": rng.choice(["PAX", "POS"]),
+                }
+            )
+        by_day[day.isoformat()] = flights
+        day += timedelta(days=1)
+    return by_day
+
+
+def main() -> None:
+    by_day = build_flights()
+
+    def fetch_chunk(chunk_start: date, chunk_end: date) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        time.sleep(LATENCY_SECONDS)
+        flights: List[Dict[str, Any]] = []
+        day = chunk_start
+        while day < chunk_end:
+            flights.extend(by_day.get(day.isoformat(), []))
+            day += timedelta(days=1)
+        return flights, {}
+
+    start = time.perf_counter()
+    sequential = [flight for chunk in chunk_ranges(START, END) for flight in fetch_chunk(*chunk)[0]]
+    sequential_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = LegArchive(Path(tmp), today_fn=lambda: TODAY)
+        start = time.perf_counter()
+        cold = archive.load(START, END, fetch_chunk)
+        cold_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm = archive.load(START, END, fetch_chunk)
+        warm_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        offline = archive.load(START, END)
+        offline_s = time.perf_counter() - start
+
+    assert len(sequential) == len(cold.flights) == len(warm.flights) == len(offline.flights)
+    print(f"flights={len(sequential)} days={(END - START).days + 1}")
+    print(f"sequential chunk fetch:  {sequential_s:.2f}s")
+    print(f"archive cold load:       {cold_s:.2f}s ({cold.days_fetched} days fetched)")
+    print(f"archive warm load:       {warm_s:.2f}s ({warm.days_fetched} days fetched)")
+    print(f"archive offline read:    {offline_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
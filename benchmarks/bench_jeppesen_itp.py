@@ -0,0 +1,131 @@
+"""Benchmark the Jeppesen ITP check against the page's old per-leg loop.
+
+The FL3XX leg fetch is simulated with a fixed latency per chunk, so the fetch
+numbers reflect request scheduling rather than the network. Classification
+compares walking every leg's airport columns one row at a time with the single
+join done by :func:`jeppesen_itp_utils.classify_itp_legs`.
+
+Run from the repository root::
+
+    python benchmarks/bench_jeppesen_itp.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, List, Mapping, Optional, Sequence, Set
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import Fl3xxApiConfig  # noqa: E402
+from flight_leg_utils import (  # noqa: E402
+    ARRIVAL_AIRPORT_COLUMNS,
+    DEPARTURE_AIRPORT_COLUMNS,
+    load_airport_metadata_lookup,
+)
+from jeppesen_itp_utils import (  # noqa: E402
+    ALLOWED_COUNTRY_IDENTIFIERS,
+    classify_itp_legs,
+    extract_airport_codes,
+    fetch_itp_legs,
+    iter_date_chunks,
+    normalize_country_name,
+)
+
+LATENCY_SECONDS = 0.25
+DAYS = 45
+LEGS = 20000
+AIRPORTS = ["CYYC", "KLAS", "CYVR", "KTEB", "MYNN", "TNCM", "MKJP", "EGGW", "LFPB", "SKBO", "MMUN", "XXXX"]
+
+
+def build_legs(rng: random.Random) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "departure_airport": [rng.choice(AIRPORTS) for _ in range(LEGS)],
+            "airportFrom": [rng.choice(AIRPORTS + [None]) for _ in range(LEGS)],
+            "arrival_airport": [rng.choice(AIRPORTS + [None]) for _ in range(LEGS)],
+            "airportTo": [rng.choice(AIRPORTS) for _ in range(LEGS)],
+        }
+    )
+
+
+def detect_country(
+    row: Mapping[str, Any],
+    columns: Sequence[str],
+    lookup: Mapping[str, Mapping[str, Optional[str]]],
+    missing_codes: Set[str],
+) -> Optional[str]:
+    for column in columns:
+        if column not in row:
+            continue
+        for code in extract_airport_codes(row[column]):
+            record = lookup.get(code)
+            if record:
+                if normalize_country_name(record.get("country")):
+                    return record.get("country")
+            else:
+                missing_codes.add(code)
+    return None
+
+
+def per_leg(legs: pd.DataFrame, lookup: Mapping[str, Mapping[str, Optional[str]]]) -> int:
+    missing: Set[str] = set()
+    flagged = 0
+    for _, leg in legs.iterrows():
+        row = leg.to_dict()
+        countries = (
+            detect_country(row, DEPARTURE_AIRPORT_COLUMNS, lookup, missing),
+            detect_country(row, ARRIVAL_AIRPORT_COLUMNS, lookup, missing),
+        )
+        normalized = [normalize_country_name(country) for country in countries]
+        flagged += any(value and value not in ALLOWED_COUNTRY_IDENTIFIERS for value in normalized)
+    return flagged
+
+
+def fake_fetch_legs(config: Fl3xxApiConfig, from_date: date, to_date: date, **_: Any) -> Any:
+    time.sleep(LATENCY_SECONDS)
+    return pd.DataFrame({"flightId": [from_date.isoformat()]}), {"from": from_date.isoformat()}, None
+
+
+def main() -> None:
+    lookup = load_airport_metadata_lookup()
+    legs = build_legs(random.Random(7))
+
+    start = time.perf_counter()
+    flagged_old = per_leg(legs, lookup)
+    per_leg_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classification = classify_itp_legs(legs, lookup)
+    batch_s = time.perf_counter() - start
+    flagged_new = int(classification.frame["requires_itp"].sum())
+
+    config = Fl3xxApiConfig(api_token="bench")
+    window_start = date(2026, 10, 1)
+    window_end = window_start + timedelta(days=DAYS - 1)
+    start = time.perf_counter()
+    frames: List[pd.DataFrame] = []
+    for chunk_start, chunk_end in iter_date_chunks(window_start, window_end, 5):
+        frames.append(fake_fetch_legs(config, chunk_start, chunk_end + timedelta(days=1))[0])
+    serial_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fetch = fetch_itp_legs(config, window_start, window_end, fetch_legs_fn=fake_fetch_legs)
+    concurrent_s = time.perf_counter() - start
+
+    print(f"legs={LEGS} flagged old={flagged_old} new={flagged_new}")
+    print(f"per-leg classification:      {per_leg_s:.2f}s")
+    print(f"classify_itp_legs:           {batch_s:.2f}s")
+    print(f"days={DAYS} chunks={len(fetch.chunks)} latency={LATENCY_SECONDS}s")
+    print(f"serial chunk fetch:          {serial_s:.2f}s")
+    print(f"concurrent chunk fetch:      {concurrent_s:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
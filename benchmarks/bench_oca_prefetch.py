@@ -0,0 +1,111 @@
+"""Benchmark the shared OCA data-prep stage against per-check sequential fetches.
+
+Detail endpoints are simulated with a fixed latency so the numbers reflect
+request scheduling rather than payload parsing.
+
+Run from the repository root::
+
+    python benchmarks/bench_oca_prefetch.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import Fl3xxApiConfig  # noqa: E402
+from oca_reports import (  # noqa: E402
+    PayloadCache,
+    evaluate_flights_for_high_pax_weight,
+    evaluate_flights_for_max_time,
+    evaluate_flights_for_zfw_check,
+    prepare_oca_run,
+)
+
+LATENCY_SECONDS = 0.04
+FROM_DATE = date(2025, 10, 1)
+TO_DATE = date(2025, 10, 4)
+
+
+def build_flights(count: int = 150, seed: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    start = datetime(2025, 10, 1, 12, tzinfo=timezone.utc)
+    flights = []
+    for idx in range(count):
+        off = start + timedelta(minutes=rng.randint(0, 3 * 24 * 60))
+        on = off + timedelta(minutes=rng.randint(40, 330))
+        flights.append(
+            {
+                "flightId": 1000 + idx,
+                "quoteId": f"Q{rng.randint(0, count // 2)}",
+                "flightType": "PAX",
+                "aircraftCategory": rng.choice(["C25A", "C25B", "E545"]),
+                "paxNumber": rng.randint(1, 9),
+                "blocksoffestimated": off.isoformat().replace("+00:00", "Z"),
+                "blocksonestimated": on.isoformat().replace("+00:00", "Z"),
+                "airportFrom": "CYYC",
+                "airportTo": "CYYZ",
+            }
+        )
+    return flights
+
+
+def _slow(payload: Any) -> Callable[..., Any]:
+    def fetch(config, identifier, session=None):
+        time.sleep(LATENCY_SECONDS)
+        return payload
+
+    return fetch
+
+
+def main() -> None:
+    flights = build_flights()
+    fetch_flights = lambda config, from_date, to_date: (flights, {})  # noqa: E731
+    leg = _slow({"bookingNote": "FPL RUN BY OCA"})
+    pax = _slow({"tickets": [{"bodyWeight": 190}] * 4})
+    config = Fl3xxApiConfig()
+    window = {"from_date": FROM_DATE, "to_date": TO_DATE}
+
+    started = time.perf_counter()
+    evaluate_flights_for_max_time(config, fetch_flights_fn=fetch_flights, fetch_leg_details_fn=leg, **window)
+    evaluate_flights_for_zfw_check(config, fetch_flights_fn=fetch_flights, fetch_leg_details_fn=leg, **window)
+    evaluate_flights_for_high_pax_weight(config, fetch_flights_fn=fetch_flights, fetch_pax_details_fn=pax, **window)
+    sequential = time.perf_counter() - started
+
+    cache = PayloadCache()
+
+    def shared() -> Dict[str, Any]:
+        data = prepare_oca_run(
+            config,
+            fetch_flights_fn=fetch_flights,
+            fetch_leg_details_fn=leg,
+            fetch_pax_details_fn=pax,
+            cache=cache,
+            **window,
+        )
+        evaluate_flights_for_max_time(config, data=data, **window)
+        evaluate_flights_for_zfw_check(config, data=data, **window)
+        evaluate_flights_for_high_pax_weight(config, data=data, **window)
+        return data.diagnostics
+
+    started = time.perf_counter()
+    diagnostics = shared()
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    shared()
+    warm = time.perf_counter() - started
+
+    print(f"{len(flights)} flights, {diagnostics['leg_details_needed']} quotes, {diagnostics['pax_details_needed']} pax payloads")
+    print(f"sequential per-check fetches: {sequential:.2f}s")
+    print(f"shared prefetch (cold cache): {cold:.2f}s")
+    print(f"shared prefetch (warm cache): {warm:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
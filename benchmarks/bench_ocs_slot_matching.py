@@ -0,0 +1,93 @@
+"""Benchmark OCS slot comparison on a synthetic month of legs and slots.
+
+Run from the repository root::
+
+    python benchmarks/bench_ocs_slot_matching.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ocs_slot_matching import SLOT_COLUMNS, compare  # noqa: E402
+
+
+AIRPORTS = ["CYYC", "CYVR", "CYYZ", "CYUL", "CYEG", "KPSP", "CYOW"]
+
+
+def build_month(*, tails: int = 40, legs_per_day: int = 3, days: int = 30, seed: int = 3) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return FL3XX legs and OCS slots where most legs carry a slot near their time."""
+
+    rng = random.Random(seed)
+    start = pd.Timestamp.now("UTC").tz_localize(None).floor("D")
+    legs: List[Dict[str, Any]] = []
+    slots: List[Dict[str, Any]] = []
+    ref = 0
+    for tail_idx in range(tails):
+        tail = f"CG{tail_idx:03d}"
+        station = rng.choice(AIRPORTS)
+        clock = start + pd.Timedelta(minutes=rng.randint(0, 600))
+        for _ in range(days * legs_per_day):
+            arrival = rng.choice([ap for ap in AIRPORTS if ap != station])
+            onblock = clock + pd.Timedelta(minutes=rng.randint(45, 300))
+            legs.append(
+                {
+                    "Booking": f"B{len(legs):05d}",
+                    "From (ICAO)": station,
+                    "To (ICAO)": arrival,
+                    "Tail": tail,
+                    "OffBlock": clock,
+                    "OnBlock": onblock,
+                    "Aircraft Type": "CJ3",
+                    "Workflow": "PAX",
+                    "Flight Type": rng.choice(["PAX", "POS"]),
+                }
+            )
+            for airport, movement, when in ((station, "DEP", clock), (arrival, "ARR", onblock)):
+                if rng.random() < 0.85:
+                    slot_time = when + pd.Timedelta(minutes=rng.randint(-45, 45))
+                    slots.append(
+                        {
+                            "SlotAirport": airport,
+                            "Date": (slot_time.day, slot_time.month),
+                            "Movement": movement,
+                            "SlotTimeHHMM": f"{slot_time.hour:02d}{slot_time.minute:02d}",
+                            "Tail": tail if rng.random() < 0.9 else f"CG{rng.randrange(tails):03d}",
+                            "SlotRef": f"{airport}{movement[0]}{ref:07d}",
+                        }
+                    )
+                    ref += 1
+            station = arrival
+            clock = onblock + pd.Timedelta(minutes=rng.randint(40, 600))
+    return pd.DataFrame(legs), pd.DataFrame(slots, columns=SLOT_COLUMNS)
+
+
+def _best_of(runs: int, func: Any) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    fl3xx_df, ocs_df = build_month()
+    results, stale = compare(fl3xx_df, ocs_df)
+    summary = ", ".join(f"{key}: {len(rows)}" for key, rows in results.items())
+    print(f"legs: {len(fl3xx_df)}, slots: {len(ocs_df)} -> {summary}, unused: {len(stale)}")
+
+    elapsed = _best_of(3, lambda: compare(fl3xx_df, ocs_df))
+    print(f"compare: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark sensitive-keyword scanning against the regex alternation it replaced.
+
+The Owner Services sensitive notes tab used to compile every monitored keyword
+into one ``\\b(k1|k2|...)\\b`` pattern and scan each note block on every fetch.
+This compares that pattern with :class:`owner_services.KeywordAutomaton` as the
+keyword list grows, and shows how many legs :class:`SensitiveNoteScanner`
+rescans on a refresh where only a few notes changed.
+
+Run from the repository root::
+
+    python benchmarks/bench_owner_services_keywords.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import re
+import string
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from owner_services import KeywordAutomaton, SensitiveNoteScanner  # noqa: E402
+
+LEGS = 600
+CHANGED_PER_REFRESH = 15
+KEYWORD_COUNTS = (25, 500, 5000)
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def build_notes(rng: random.Random, vocabulary: List[str]) -> List[List[Tuple[str, str]]]:
+    legs = []
+    for _ in range(LEGS):
+        blocks = []
+        for label in ("Leg notes", "Planning notes"):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(20, 80))]
+            blocks.append((label, " ".join(words) + "."))
+        legs.append(blocks)
+    return legs
+
+
+def main() -> None:
+    rng = random.Random(17)
+    vocabulary = [random_word(rng) for _ in range(4000)]
+    notes = build_notes(rng, vocabulary)
+    texts = [text for blocks in notes for _, text in blocks]
+
+    print(f"legs={LEGS} note_blocks={len(texts)}")
+    for count in KEYWORD_COUNTS:
+        keywords = list(dict.fromkeys(rng.sample(vocabulary, min(count // 2, len(vocabulary)))))
+        keywords += [random_word(rng) + " " + random_word(rng) for _ in range(count - len(keywords))]
+
+        start = time.perf_counter()
+        pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in keywords) + r")\b", re.IGNORECASE)
+        regex_matches = [sorted({match.group(0).lower() for match in pattern.finditer(text)}) for text in texts]
+        regex_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        automaton = KeywordAutomaton(keywords)
+        automaton_matches = [automaton.find(text) for text in texts]
+        automaton_s = time.perf_counter() - start
+
+        assert regex_matches == automaton_matches
+        print(f"keywords={count:>5}  regex alternation: {regex_s:.2f}s  automaton (incl. build): {automaton_s:.2f}s")
+
+    scanner = SensitiveNoteScanner(keywords, ["special event fee"])
+    start = time.perf_counter()
+    for index, blocks in enumerate(notes):
+        scanner.scan(f"F-{index}", blocks)
+    cold_s = time.perf_counter() - start
+
+    for index in rng.sample(range(LEGS), CHANGED_PER_REFRESH):
+        notes[index] = notes[index][:1] + [("Planning notes", "Updated: special event fee applies")]
+    start = time.perf_counter()
+    rescanned = sum(scanner.scan(f"F-{index}", blocks)[1] for index, blocks in enumerate(notes))
+    refresh_s = time.perf_counter() - start
+    print(f"scanner first fetch: {cold_s:.2f}s  refresh: {refresh_s:.2f}s (rescanned {rescanned}/{LEGS} legs)")
+
+
+if __name__ == "__main__":
+    main()
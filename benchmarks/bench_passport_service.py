@@ -0,0 +1,102 @@
+"""Benchmark the shared passport data load against the old per-tab, per-flight loop.
+
+FL3XX pax_details, preflight and staff/crew endpoints are simulated with a
+fixed latency. The serial figure replays what the page used to do when all
+three tabs were run for the same window: every tab fetched each flight on its
+own and every flight backfilled its own passengers.
+
+Run from the repository root::
+
+    python benchmarks/bench_passport_service.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import (  # noqa: E402
+    Fl3xxApiConfig,
+    PayloadCache,
+    backfill_missing_passenger_passports,
+    extract_passengers_from_pax_details,
+)
+from passport_service import fetch_passport_data  # noqa: E402
+
+LATENCY_SECONDS = 0.03
+FLIGHTS = 60
+TRAVELLERS = 90
+
+
+def build_manifests(seed: int = 3) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    manifests = {}
+    for idx in range(FLIGHTS):
+        tickets = []
+        for user_id in rng.sample(range(TRAVELLERS), 4):
+            card = {"number": f"D{user_id}", "issueCountry": {"iso3": "CAN"}, "expirationDate": 1893456000000}
+            tickets.append({"paxUser": {"id": user_id}, "idCard": card if user_id % 2 else None})
+        manifests[str(7000 + idx)] = {"pax": {"tickets": tickets}}
+    return manifests
+
+
+def main() -> None:
+    manifests = build_manifests()
+    flight_ids = list(manifests)
+    config = Fl3xxApiConfig(api_token="bench")
+    requests_made: List[str] = []
+
+    def fetch_pax(config: Fl3xxApiConfig, flight_id: Any, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append("pax")
+        return manifests[str(flight_id)]
+
+    def fetch_preflight(config: Fl3xxApiConfig, flight_id: Any, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append("preflight")
+        return {"details": {"hndlgAndSvcs": {"cstm": "OK"}}}
+
+    def fetch_member(config: Fl3xxApiConfig, user_id: Any, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append("member")
+        return {"idCards": [{"type": "PASSPORT", "number": f"M{user_id}", "issueCountry": {"iso3": "USA"}}]}
+
+    start = time.perf_counter()
+    for _tab in ("passport expirations", "us inbound", "us outbound"):
+        for flight_id in flight_ids:
+            passengers = extract_passengers_from_pax_details(fetch_pax(config, flight_id))
+            backfill_missing_passenger_passports(config, passengers, fetch_member_fn=fetch_member)
+    for flight_id in flight_ids:
+        fetch_preflight(config, flight_id)
+    serial_s = time.perf_counter() - start
+    serial_requests = len(requests_made)
+
+    kwargs = dict(
+        fetch_pax_fn=fetch_pax,
+        fetch_preflight_fn=fetch_preflight,
+        fetch_member_fn=fetch_member,
+        pax_cache=PayloadCache(),
+        preflight_cache=PayloadCache(),
+        member_cache=PayloadCache(),
+    )
+    start = time.perf_counter()
+    cold = fetch_passport_data(config, flight_ids, **kwargs)
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = fetch_passport_data(config, flight_ids, **kwargs)
+    warm_s = time.perf_counter() - start
+
+    print(f"flights={FLIGHTS} passport_lookups={cold.passport_lookups}")
+    print(f"serial, three tabs:           {serial_s:.2f}s ({serial_requests} requests)")
+    print(f"shared concurrent load, cold: {cold_s:.2f}s ({cold.requests} requests)")
+    print(f"shared concurrent load, warm: {warm_s * 1000:.1f}ms ({warm.cache_hits} hits)")
+
+
+if __name__ == "__main__":
+    main()
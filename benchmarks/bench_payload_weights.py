@@ -0,0 +1,74 @@
+"""Benchmark fleet-wide payload weights against the per-flight ticket walk.
+
+Run from the repository root::
+
+    python benchmarks/bench_payload_weights.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from oca_reports import _calculate_pax_payload_weight  # noqa: E402
+from payload_weights import compute_payload_weights, flatten_pax_payloads  # noqa: E402
+
+
+def build_payloads(count: int = 2000, seed: int = 11) -> Dict[int, Any]:
+    rng = random.Random(seed)
+    payloads: Dict[int, Any] = {}
+    for flight_id in range(count):
+        tickets = []
+        for _ in range(rng.randint(1, 9)):
+            ticket: Dict[str, Any] = {
+                "paxType": rng.choice(["ADULT", "ADULT", "ADULT", "CHILD", "INFANT"]),
+                "paxUser": {"gender": rng.choice(["M", "F", ""])},
+            }
+            if rng.random() < 0.3:
+                ticket["bodyWeight"] = rng.randint(110, 260)
+            if rng.random() < 0.2:
+                ticket["luggageWeight"] = rng.randint(10, 60)
+            tickets.append(ticket)
+        payload: Dict[str, Any] = {"payload": {"paxPayload": {"tickets": tickets}}}
+        if rng.random() < 0.4:
+            payload["cargo"] = [{"weightQty": rng.randint(5, 80), "note": "Bag"} for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.05:
+            payload["animals"] = [{"weightQty": rng.randint(5, 40), "note": "Dog"}]
+        payloads[flight_id] = payload
+    return payloads
+
+
+def _best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    payloads = build_payloads()
+    seasons = {flight_id: "Summer" if flight_id % 2 else "Winter" for flight_id in payloads}
+
+    def per_flight() -> None:
+        for flight_id, payload in payloads.items():
+            _calculate_pax_payload_weight(payload, season=seasons[flight_id])
+
+    def fleet() -> None:
+        compute_payload_weights(flatten_pax_payloads(payloads), seasons)
+
+    tables = flatten_pax_payloads(payloads)
+    print(f"flights={len(payloads)} tickets={len(tables.tickets)} cargo={len(tables.cargo)}")
+    print(f"one call per flight:    {_best_of(per_flight):.3f}s")
+    print(f"fleet flatten+compute:  {_best_of(fleet):.3f}s")
+    print(f"compute only:           {_best_of(lambda: compute_payload_weights(tables, seasons)):.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark the shared preflight scanner against the Crew Qualification Monitor's old loop.
+
+The FL3XX preflight endpoint is simulated with a fixed latency. "Polls" replay
+an auto-refreshing page: the first poll fetches everything, later polls fall
+inside or outside the refetch window while a handful of preflights change.
+
+Run from the repository root::
+
+    python benchmarks/bench_preflight_scanner.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import (  # noqa: E402
+    Fl3xxApiConfig,
+    extract_conflicts_from_preflight,
+    extract_missing_qualifications_from_preflight,
+)
+from preflight_scanner import PreflightDigestStore, PreflightScanner  # noqa: E402
+
+LATENCY_SECONDS = 0.03
+FLIGHTS = 150
+CHANGES_PER_POLL = 5
+
+
+def build_payload(rng: random.Random, flight_id: str, revision: int) -> Dict[str, Any]:
+    messages = [
+        {"type": "QUALIFICATION", "status": "MISSING", "name": f"QUAL-{rng.randint(0, 20)}"}
+        for _ in range(rng.randint(0, 3))
+    ]
+    return {
+        "flightId": flight_id,
+        "revision": revision,
+        "crewAssign": {"commander": {"user": {"id": flight_id}, "warnings": {"messages": messages}}},
+    }
+
+
+def parse(payload: Any) -> Any:
+    return extract_missing_qualifications_from_preflight(payload), extract_conflicts_from_preflight(payload)
+
+
+def main() -> None:
+    rng = random.Random(11)
+    flight_ids = [str(9000 + idx) for idx in range(FLIGHTS)]
+    payloads = {flight_id: build_payload(rng, flight_id, 0) for flight_id in flight_ids}
+    requests_made: List[str] = []
+
+    def fetch_preflight(config: Fl3xxApiConfig, flight_id: Any, session: Any = None) -> Any:
+        time.sleep(LATENCY_SECONDS)
+        requests_made.append(flight_id)
+        return payloads[str(flight_id)]
+
+    config = Fl3xxApiConfig(api_token="bench")
+
+    start = time.perf_counter()
+    for flight_id in flight_ids:
+        parse(fetch_preflight(config, flight_id))
+    serial_s = time.perf_counter() - start
+
+    clock = [0.0]
+    with tempfile.TemporaryDirectory() as tmp:
+        scanner = PreflightScanner(
+            parse,
+            store=PreflightDigestStore(Path(tmp) / "digests.json"),
+            fetch_preflight_fn=fetch_preflight,
+            clock=lambda: clock[0],
+        )
+        timings = []
+        for poll in range(4):
+            for flight_id in rng.sample(flight_ids, CHANGES_PER_POLL):
+                payloads[flight_id] = build_payload(rng, flight_id, poll + 1)
+            clock[0] += 30
+            start = time.perf_counter()
+            scan = scanner.scan(config, flight_ids)
+            timings.append((time.perf_counter() - start, scan))
+
+    print(f"flights={FLIGHTS} changes_per_poll={CHANGES_PER_POLL}")
+    print(f"serial fetch + parse:               {serial_s:.2f}s")
+    for poll, (seconds, scan) in enumerate(timings):
+        print(
+            f"scanner poll at +{(poll + 1) * 30:>3}s:           {seconds:.2f}s "
+            f"requests={scan.requests} reparsed={scan.reparsed} changed={len(scan.changed)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark a full-season reserve day check against the date-by-date run.
+
+The flights and planning-note endpoints are simulated with fixed latencies so
+the numbers reflect request counts and scheduling rather than the network.
+
+Run from the repository root::
+
+    python benchmarks/bench_reserve_calendar_checker.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import reserve_calendar_checker  # noqa: E402
+from fl3xx_api import Fl3xxApiConfig  # noqa: E402
+from reserve_calendar_checker import run_reserve_day_check, select_reserve_dates_for_year  # noqa: E402
+
+FLIGHTS_LATENCY_SECONDS = 0.15
+NOTE_LATENCY_SECONDS = 0.02
+YEAR = 2025
+
+
+def build_flights(per_day: int = 25, seed: int = 6) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    flights = []
+    day = date(YEAR, 1, 1)
+    while day <= date(YEAR, 12, 31):
+        for idx in range(per_day):
+            flights.append(
+                {
+                    "flightId": f"{day.isoformat()}-{idx}",
+                    "dep_time": f"{day.isoformat()}T{rng.randint(0, 23):02d}:15:00Z",
+                    "tail": rng.choice(["C-GASR", "C-FASW", "C-GZAS"]),
+                    "departure_airport": "CYYC",
+                    "arrival_airport": rng.choice(["CYVR", "CYYZ", "KPSP"]),
+                    "workflowCustomName": rng.choice(["Club", "Club as available", "Owner"]),
+                }
+            )
+        day += timedelta(days=1)
+    return flights
+
+
+def main() -> None:
+    flights = build_flights()
+    dates = select_reserve_dates_for_year(YEAR)
+    counts = {"flights": 0, "notes": 0}
+
+    def fetch_flights(config, from_date, to_date, session=None):
+        counts["flights"] += 1
+        time.sleep(FLIGHTS_LATENCY_SECONDS)
+        # FL3XX returns flights overlapping the window, so neighbouring days leak in.
+        low = (from_date - timedelta(days=1)).isoformat()
+        return [flight for flight in flights if low <= flight["dep_time"][:10] <= to_date.isoformat()], {}
+
+    def fetch_planning_note(config, flight_id, session=None):
+        counts["notes"] += 1
+        time.sleep(NOTE_LATENCY_SECONDS)
+        return {"note": "Club member request" if hash(flight_id) % 4 == 0 else "Standard trip"}
+
+    reserve_calendar_checker.fetch_flights = fetch_flights
+    reserve_calendar_checker.fetch_flight_planning_note = fetch_planning_note
+    config = Fl3xxApiConfig()
+
+    start = time.perf_counter()
+    sequential = run_reserve_day_check(config, target_dates=dates, session=object(), max_gap_days=-1, max_workers=1)
+    sequential_s = time.perf_counter() - start
+    sequential_counts = dict(counts)
+
+    counts.update(flights=0, notes=0)
+    start = time.perf_counter()
+    batched = run_reserve_day_check(config, target_dates=dates, session=object())
+    batched_s = time.perf_counter() - start
+
+    assert [r.rows for r in sequential.dates] == [r.rows for r in batched.dates]
+    print(f"reserve days={len(dates)} flagged={sum(len(r.rows) for r in batched.dates)}")
+    print(
+        f"date by date, serial notes:  {sequential_s:.2f}s "
+        f"({sequential_counts['flights']} flight requests, {sequential_counts['notes']} notes)"
+    )
+    print(
+        f"season batch, shared notes:  {batched_s:.2f}s "
+        f"({counts['flights']} flight requests, {counts['notes']} notes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
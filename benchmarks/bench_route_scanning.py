@@ -0,0 +1,80 @@
+"""Benchmark watch-list route scanning against per-term substring checks.
+
+A day of filed routes is scanned against a growing number of watch lists. The
+baseline replays the Route Watcher's old check, one substring test per term
+per route for each list, and the scanner checks every list in one pass.
+
+Run from the repository root::
+
+    python benchmarks/bench_route_scanning.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import string
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from route_scanning import ROUTE_TERMS, RouteScanner  # noqa: E402
+
+ROUTES = 5000
+FIXES = 3000
+TERMS_PER_LIST = 25
+AIRWAYS = [f"{prefix}{number}" for prefix in ("J", "Q", "T", "V", "UL") for number in range(1, 600, 7)]
+
+
+def random_fix(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_uppercase) for _ in range(5))
+
+
+def build_routes(rng: random.Random, fixes: List[str]) -> List[str]:
+    routes = []
+    for _ in range(ROUTES):
+        parts = [rng.choice(["CYYC", "CYVR", "KPSP", "KLAS"]), f"{rng.choice(fixes)}{rng.randint(1, 9)}"]
+        for _ in range(rng.randint(4, 16)):
+            parts.append(rng.choice(fixes) if rng.random() < 0.7 else rng.choice(AIRWAYS))
+        parts.append(rng.choice(["CYYZ", "KSFO", "KTEB"]))
+        routes.append(" ".join(parts))
+    return routes
+
+
+def substring_scan(routes: List[str], watch_lists: Dict[str, List[str]]) -> int:
+    hits = 0
+    for route in routes:
+        upper_route = route.upper()
+        for terms in watch_lists.values():
+            if sorted({term for term in terms if term.upper() in upper_route}):
+                hits += 1
+    return hits
+
+
+def main() -> None:
+    rng = random.Random(23)
+    fixes = list(ROUTE_TERMS) + [random_fix(rng) for _ in range(FIXES)]
+    routes = build_routes(rng, fixes)
+    print(f"routes={ROUTES} terms_per_list={TERMS_PER_LIST}")
+    for list_count in (1, 10, 40):
+        watch_lists = {
+            f"List {index}": rng.sample(fixes, TERMS_PER_LIST) for index in range(list_count)
+        }
+        start = time.perf_counter()
+        baseline_hits = substring_scan(routes, watch_lists)
+        baseline_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanner = RouteScanner(watch_lists)
+        scanner_hits = sum(len(scanner.scan(route)) for route in routes)
+        scanner_s = time.perf_counter() - start
+        print(
+            f"lists={list_count:>3}: substring {baseline_s:6.3f}s  scanner {scanner_s:6.3f}s  "
+            f"list hits {baseline_hits}/{scanner_hits}"
+        )
+
+
+if __name__ == "__main__":
+    main()
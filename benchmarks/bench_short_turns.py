@@ -0,0 +1,79 @@
+"""Benchmark short-turn detection on a synthetic 30-day, 80-tail schedule.
+
+Run from the repository root::
+
+    python benchmarks/bench_short_turns.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from short_turn_utils import compute_short_turns  # noqa: E402
+
+
+AIRPORTS = ["CYYZ", "CYUL", "CYYC", "CYVR", "CYEG", "CYOW", "KPSP", "KFLL", "KTEB", "MMSD"]
+
+
+def build_schedule(*, tails: int = 80, days: int = 30, legs_per_day: int = 4, seed: int = 11) -> pd.DataFrame:
+    """Return legs chained per tail so each arrival station is the next departure."""
+
+    rng = random.Random(seed)
+    start = pd.Timestamp("2026-03-01T06:00:00Z")
+    rows: List[Dict[str, Any]] = []
+    for tail_idx in range(tails):
+        tail = f"C-G{tail_idx:03d}"
+        station = rng.choice(AIRPORTS)
+        clock = start + pd.Timedelta(minutes=rng.randint(0, 240))
+        for leg in range(days * legs_per_day):
+            arrival = rng.choice([ap for ap in AIRPORTS if ap != station])
+            block = pd.Timedelta(minutes=rng.randint(45, 300))
+            booking = f"BK{rng.randint(0, 400):04d}"
+            rows.append(
+                {
+                    "tail": tail,
+                    "leg_id": f"{tail}-{leg}",
+                    "flight_id": f"{tail_idx * 1000 + leg}",
+                    "dep_airport": station,
+                    "arr_airport": arrival,
+                    "dep_offblock": clock.isoformat(),
+                    "arr_onblock": (clock + block).isoformat(),
+                    "is_priority": rng.random() < 0.15,
+                    "priority_label": None,
+                    "booking_code": booking,
+                    "account_name": f"Owner {rng.randint(0, 200)}",
+                }
+            )
+            station = arrival
+            clock = clock + block + pd.Timedelta(minutes=rng.choice([25, 40, 60, 90, 180, 600]))
+    return pd.DataFrame(rows)
+
+
+def _best_of(runs: int, func: Any) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    legs = build_schedule()
+    short = compute_short_turns(legs, 45)
+    print(f"legs: {len(legs)}, tails: {legs['tail'].nunique()}, short turns: {len(short)}")
+
+    elapsed = _best_of(5, lambda: compute_short_turns(legs, 45))
+    print(f"compute_short_turns: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark a full-month Syndicate Audit against the day-by-day sequential run.
+
+Preflight requests are simulated with a fixed latency so the numbers reflect
+request scheduling and partner matching rather than the network.
+
+Run from the repository root::
+
+    python benchmarks/bench_syndicate_audit.py
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fl3xx_api import Fl3xxApiConfig  # noqa: E402
+from syndicate_audit import (  # noqa: E402
+    AccountIndex,
+    _find_fuzzy_account_match,
+    _normalize_name,
+    run_syndicate_audit,
+)
+
+LATENCY_SECONDS = 0.02
+START = date(2025, 5, 1)
+END = date(2025, 5, 31)
+WORDS = (
+    "smith jones brown taylor wilson martin roy tremblay gagnon lee white harris clark lewis walker young allen "
+    "king wright scott green baker adams nelson hill campbell mitchell roberts carter phillips evans turner torres "
+    "parker collins edwards stewart morris murphy cook rogers morgan peterson cooper reed bailey bell kelly howard "
+    "holdings capital family trust aviation north ventures group partners investments enterprises ltd inc"
+).split()
+
+
+def _account(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 4)))
+
+
+def build_month(per_day: int = 40, seed: int = 8) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    rng = random.Random(seed)
+    flights: List[Dict[str, Any]] = []
+    notes: Dict[str, Any] = {}
+    day = START
+    while day <= END:
+        accounts = [_account(rng) for _ in range(per_day)]
+        for idx, account in enumerate(accounts):
+            flight_id = f"{day.isoformat()}-{idx}"
+            flights.append(
+                {
+                    "flightId": flight_id,
+                    "flightType": "PAX",
+                    "accountName": account,
+                    "blockOffEstUTC": f"{day.isoformat()}T{rng.randint(12, 23):02d}:00:00Z",
+                    "airportFrom": "CYYC",
+                    "airportTo": "CYVR",
+                    "registrationNumber": "C-GASR",
+                }
+            )
+            if rng.random() < 0.4:
+                notes[flight_id] = {"bookingNotes": f"CJ3\nSyndicate: {rng.choice(accounts)}; {_account(rng)}"}
+        day += timedelta(days=1)
+    return flights, notes
+
+
+def _best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    flights, notes = build_month()
+    config = Fl3xxApiConfig()
+
+    def fetch_flights(config, *, from_date, to_date, session=None):
+        return [f for f in flights if from_date.isoformat() <= f["blockOffEstUTC"][:10] < to_date.isoformat()], {}
+
+    def fetch_preflight(config, flight_id, *, session=None):
+        time.sleep(LATENCY_SECONDS)
+        return notes.get(flight_id, {})
+
+    def day_by_day() -> int:
+        matches = 0
+        day = START
+        while day <= END:
+            result = run_syndicate_audit(
+                config,
+                target_date=day,
+                session=object(),
+                max_workers=1,
+                fetch_flights_fn=fetch_flights,
+                fetch_preflight_fn=fetch_preflight,
+            )
+            matches += len(result.entries)
+            day += timedelta(days=1)
+        return matches
+
+    start = time.perf_counter()
+    sequential_matches = day_by_day()
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    month = run_syndicate_audit(
+        config,
+        target_date=START,
+        end_date=END,
+        session=object(),
+        fetch_flights_fn=fetch_flights,
+        fetch_preflight_fn=fetch_preflight,
+    )
+    month_s = time.perf_counter() - start
+    assert len(month.entries) == sequential_matches
+
+    rng = random.Random(2)
+    accounts: Dict[str, str] = {}
+    for _ in range(3000):
+        name = _account(rng)
+        accounts.setdefault(_normalize_name(name), name)
+    partners = [_normalize_name(_account(rng)) for _ in range(500)]
+
+    print(f"flights={len(flights)} preflights={month.diagnostics['preflight_requests']} matches={len(month.entries)}")
+    print(f"day-by-day sequential audit:  {sequential_s:.2f}s")
+    print(f"month audit, concurrent:      {month_s:.2f}s  timings={ {k: round(v, 3) for k, v in month.diagnostics['timings'].items()} }")
+    print(f"linear fuzzy scan ({len(accounts)} accounts x {len(partners)} partners): "
+          f"{_best_of(lambda: [_find_fuzzy_account_match(p, accounts) for p in partners], 1):.2f}s")
+    index = AccountIndex(accounts)
+    print(f"account index build:          {_best_of(lambda: AccountIndex(accounts)) * 1000:.1f}ms")
+    print(f"account index lookups:        {_best_of(lambda: [index.match(p) for p in partners]):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
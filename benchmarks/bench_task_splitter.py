@@ -0,0 +1,80 @@
+"""Benchmark night-shift tail splitting on a synthetic busy day.
+
+Run from the repository root::
+
+    python benchmarks/bench_task_splitter.py
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from task_splitter import TailPackage, assign_preference_weighted  # noqa: E402
+from zoneinfo_compat import ZoneInfo  # noqa: E402
+
+
+TIMEZONES = [
+    "America/Halifax",
+    "America/Toronto",
+    "America/New_York",
+    "America/Chicago",
+    "America/Denver",
+    "America/Edmonton",
+    "America/Vancouver",
+    "America/Los_Angeles",
+]
+
+
+def build_packages(*, tails: int = 90, seed: int = 5) -> List[TailPackage]:
+    """Return one package per tail with 1-6 legs, some customs and priority flags."""
+
+    rng = random.Random(seed)
+    packages: List[TailPackage] = []
+    for idx in range(tails):
+        legs = rng.randint(1, 6)
+        customs = sum(1 for _ in range(legs) if rng.random() < 0.2)
+        first = datetime(2026, 3, 2, rng.randint(5, 14), rng.choice([0, 15, 30, 45]), tzinfo=ZoneInfo(rng.choice(TIMEZONES)))
+        packages.append(
+            TailPackage(
+                tail=f"C-G{idx:03d}",
+                legs=legs,
+                workload=2.5 + legs + customs * 0.25,
+                first_local_dt=first,
+                sample_legs=[],
+                has_priority=rng.random() < 0.1,
+                customs_legs=customs,
+            )
+        )
+    return packages
+
+
+def _best_of(runs: int, func: Any) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    labels = ["0400", "0500", "0600", "0700", "0800"]
+    weights = [1.0, 1.0, 1.0, 1.0, 0.5]
+    for tails in (14, 40, 90):
+        packages = build_packages(tails=tails)
+        buckets = assign_preference_weighted(packages, labels, weights)
+        loads = [round(sum(pkg.workload for pkg in buckets[label]), 2) for label in labels]
+        counts = [len(buckets[label]) for label in labels]
+        elapsed = _best_of(3, lambda: assign_preference_weighted(packages, labels, weights))
+        print(f"{tails:3d} tails: {elapsed * 1000:8.1f} ms  counts={counts}  workload={loads}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark incremental tracking-mailbox polls against the page's old fetch.
+
+The IMAP server is simulated in memory with a fixed latency per round trip and
+an extra cost for opening a TLS connection. Each tracking e-mail carries the
+CSV report next to a larger inline logo, as the provider's messages do. The old
+fetch opened a connection, searched the whole mailbox and downloaded the full
+newest message on every 3-minute refresh; the mailbox keeps its connection,
+searches from the last seen UID and downloads only the CSV part.
+
+Run from the repository root::
+
+    python benchmarks/bench_tracking_email_ingest.py
+"""
+
+from __future__ import annotations
+
+import base64
+import email
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tracking_email_ingest import TrackingMailbox, read_tracking_csv  # noqa: E402
+
+ROUND_TRIP_SECONDS = 0.03
+CONNECT_SECONDS = 0.25
+MESSAGES = 2000
+REFRESHES = 10
+SENDER = "no-reply@telematics.guru"
+SUBJECT = "ASP TRACKING EMAIL"
+FILENAME = "IOCCReport-2ndIteration.csv"
+LOGO = base64.encodebytes(random.Random(1).randbytes(300_000))
+
+
+def build_message(csv_text: str) -> Dict[str, Any]:
+    csv_part = base64.encodebytes(csv_text.encode("utf-8"))
+    raw = (
+        f"From: {SENDER}\r\nSubject: {SUBJECT}\r\nContent-Type: multipart/mixed; boundary=b\r\n\r\n"
+        "--b\r\nContent-Type: image/png\r\nContent-Transfer-Encoding: base64\r\n"
+        "Content-Disposition: inline; filename=\"logo.png\"\r\n\r\n"
+    ).encode() + LOGO + (
+        "--b\r\nContent-Type: text/csv\r\nContent-Transfer-Encoding: base64\r\n"
+        f"Content-Disposition: attachment; filename=\"{FILENAME}\"\r\n\r\n"
+    ).encode() + csv_part + b"--b--\r\n"
+    structure = (
+        f'(("IMAGE" "PNG" NIL NIL NIL "BASE64" {len(LOGO)} NIL ("INLINE" ("FILENAME" "logo.png")) NIL)'
+        f'("TEXT" "CSV" NIL NIL NIL "BASE64" {len(csv_part)} 1 NIL ("ATTACHMENT" ("FILENAME" "{FILENAME}")) NIL)'
+        ' "MIXED" ("BOUNDARY" "b") NIL NIL)'
+    )
+    return {"raw": raw, "structure": structure, "parts": {"1": LOGO, "2": csv_part}}
+
+
+class SimulatedServer:
+    def __init__(self) -> None:
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.bytes_sent = 0
+
+    def connect(self) -> "SimulatedConnection":
+        time.sleep(CONNECT_SECONDS)
+        return SimulatedConnection(self)
+
+
+class SimulatedConnection:
+    def __init__(self, server: SimulatedServer) -> None:
+        self.server = server
+
+    def _reply(self, payload: bytes) -> None:
+        time.sleep(ROUND_TRIP_SECONDS)
+        self.server.bytes_sent += len(payload)
+
+    def login(self, *args: Any) -> Any:
+        self._reply(b"")
+        return "OK", [b""]
+
+    def select(self, *args: Any, **kwargs: Any) -> Any:
+        self._reply(b"")
+        return "OK", [b""]
+
+    def response(self, code: str) -> Any:
+        return code, [b"1"]
+
+    def noop(self) -> Any:
+        self._reply(b"")
+        return "OK", [b""]
+
+    def logout(self) -> Any:
+        return "BYE", [b""]
+
+    def _uids(self, criteria: str) -> List[int]:
+        uids = sorted(self.server.messages)
+        if "UID " in criteria:
+            low = int(criteria.split("UID ")[1].split(":")[0])
+            uids = [uid for uid in uids if uid >= low] or uids[-1:]
+        return uids
+
+    def search(self, charset: Any, criteria: str) -> Any:
+        payload = " ".join(map(str, self._uids(criteria))).encode()
+        self._reply(payload)
+        return "OK", [payload]
+
+    def fetch(self, message_id: bytes, query: str) -> Any:
+        raw = self.server.messages[int(message_id)]["raw"]
+        self._reply(raw)
+        return "OK", [(b"1 (RFC822 {%d}" % len(raw), raw), b")"]
+
+    def uid(self, command: str, *args: Any) -> Any:
+        if command == "SEARCH":
+            return self.search(None, args[-1])
+        message = self.server.messages[int(args[0])]
+        if args[1] == "(BODYSTRUCTURE)":
+            payload = f"1 (UID {args[0]} BODYSTRUCTURE {message['structure']})".encode()
+            self._reply(payload)
+            return "OK", [payload]
+        section = args[1][len("(BODY.PEEK["):-2]
+        body = message["parts"][section]
+        self._reply(body)
+        return "OK", [(f"1 (UID {args[0]} BODY[{section}] {{{len(body)}}}".encode(), body), b")"]
+
+
+def old_fetch(server: SimulatedServer) -> pd.DataFrame:
+    mail = server.connect()
+    mail.login("ops", "secret")
+    mail.select("inbox")
+    _, messages = mail.search(None, f'(FROM "{SENDER}" SUBJECT "{SUBJECT}")')
+    latest_id = messages[0].split()[-1]
+    _, msg_data = mail.fetch(latest_id, "(RFC822)")
+    for part in email.message_from_bytes(msg_data[0][1]).walk():
+        if part.get_filename() == FILENAME:
+            return read_tracking_csv(part.get_payload(decode=True))
+    return pd.DataFrame()
+
+
+def main() -> None:
+    rng = random.Random(5)
+    server = SimulatedServer()
+    for uid in range(1, MESSAGES + 1):
+        rows = "\n".join(f"C-G{index:03d} ASP,01/10/2026 12:{rng.randint(0, 59):02d},McCall Hangar" for index in range(40))
+        server.messages[uid] = build_message("Name,Last Connected Date Time,Location\n" + rows + "\n")
+
+    server.bytes_sent = 0
+    start = time.perf_counter()
+    for _ in range(REFRESHES):
+        old_fetch(server)
+    old_s, old_bytes = time.perf_counter() - start, server.bytes_sent
+
+    mailbox = TrackingMailbox(
+        account="ops", password="secret", sender=SENDER, subject=SUBJECT, filename=FILENAME, connect_fn=server.connect
+    )
+    server.bytes_sent = 0
+    start = time.perf_counter()
+    mailbox.poll()
+    first_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for refresh in range(REFRESHES - 1):
+        if refresh % 3 == 0:
+            server.messages[max(server.messages) + 1] = build_message("Name\nC-GNEW\n")
+        mailbox.poll()
+    later_s = time.perf_counter() - start
+    new_bytes = server.bytes_sent
+
+    print(f"messages={MESSAGES} refreshes={REFRESHES} round_trip={ROUND_TRIP_SECONDS}s connect={CONNECT_SECONDS}s")
+    print(f"old fetch:   {old_s:.2f}s total, {old_bytes / 1e6:.1f} MB downloaded")
+    print(f"mailbox:     {first_s + later_s:.2f}s total (first poll {first_s:.2f}s), {new_bytes / 1e6:.2f} MB downloaded")
+
+
+if __name__ == "__main__":
+    main()
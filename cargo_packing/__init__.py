@@ -0,0 +1,45 @@
+"""Cargo hold fit checks and baggage packing engine."""
+
+from .engine import (
+    DEFAULT_BEAM_WIDTH,
+    beam_search_packing,
+    choose_oriented_fit,
+    greedy_3d_packing,
+    multi_strategy_packing,
+)
+from .geometry import (
+    apply_flex,
+    bag_volume,
+    can_fit_rotated_in_plane,
+    cargo_volume,
+    depth_at_height,
+    fits_in_space,
+    fits_inside,
+    fits_through_door,
+    legacy_width_at_height,
+    legacy_width_ok,
+)
+from .holds import CONTAINERS, STANDARD_BAGGAGE
+from .spaces import FreeSpaces, initial_spaces
+
+__all__ = [
+    "CONTAINERS",
+    "DEFAULT_BEAM_WIDTH",
+    "FreeSpaces",
+    "STANDARD_BAGGAGE",
+    "apply_flex",
+    "bag_volume",
+    "beam_search_packing",
+    "can_fit_rotated_in_plane",
+    "cargo_volume",
+    "choose_oriented_fit",
+    "depth_at_height",
+    "fits_in_space",
+    "fits_inside",
+    "fits_through_door",
+    "greedy_3d_packing",
+    "initial_spaces",
+    "legacy_width_at_height",
+    "legacy_width_ok",
+    "multi_strategy_packing",
+]
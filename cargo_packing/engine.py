@@ -0,0 +1,408 @@
+"""Greedy, multi-strategy and beam-search packing over a cargo hold."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import lru_cache
+import itertools
+import random
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .geometry import Dims, apply_flex, bag_volume, depth_at_height, legacy_width_ok
+from .spaces import Box, FreeSpaces
+
+Placement = Dict[str, Any]
+
+DEFAULT_BEAM_WIDTH = 8
+
+_SHUFFLE_SEEDS = (7, 23, 91)
+
+
+@lru_cache(maxsize=4096)
+def choose_oriented_fit(
+    box_dims: Dims, space_dims: Dims, prefer_long_axis: bool = False
+) -> Optional[Dims]:
+    """Return the first orientation of ``box_dims`` fitting ``space_dims``.
+
+    Memoized: free boxes repeat the same few sizes across placements and
+    strategies, so most lookups are cache hits.
+    """
+
+    permutations = list(itertools.permutations(box_dims))
+    if prefer_long_axis:
+        longest = max(box_dims)
+        preferred = [dims for dims in permutations if dims[1] == longest]
+        permutations = preferred + [dims for dims in permutations if dims not in preferred]
+    for dims in permutations:
+        bl, bw, bh = dims
+        if bl <= space_dims[0] and bw <= space_dims[1] and bh <= space_dims[2]:
+            return dims
+    return None
+
+
+def _placement_ok(
+    container_type: str,
+    interior: Mapping[str, Any],
+    box: Box,
+    dims: Dims,
+) -> bool:
+    """Apply the Legacy taper and sloped-depth limits to a corner placement."""
+
+    x0, y0, z0 = box[:3]
+    l, w, h = dims
+    x1, y1, z1 = x0 + l, y0 + w, z0 + h
+    if container_type == "Legacy" and not legacy_width_ok(interior, y1, z0, z1):
+        return False
+    if "depth_profile" in interior and x1 > depth_at_height(interior, z1):
+        return False
+    return True
+
+
+def _best_space(
+    spaces: FreeSpaces,
+    dims_flex: Dims,
+    container_type: str,
+    interior: Mapping[str, Any],
+    *,
+    tunnel_first: bool,
+    allowed_tunnel: bool,
+) -> Optional[Tuple[int, Dims]]:
+    tunnel = spaces.tunnel
+    if tunnel_first:
+        order = [idx for idx, flag in enumerate(tunnel) if flag]
+        order.extend(idx for idx, flag in enumerate(tunnel) if not flag)
+    elif allowed_tunnel:
+        order = range(len(spaces))
+    else:
+        order = [idx for idx, flag in enumerate(tunnel) if not flag]
+
+    best_choice = None
+    best: Optional[Tuple[int, Dims]] = None
+    for idx in order:
+        box = spaces.boxes[idx]
+        L, W, H = box[3:]
+        oriented = choose_oriented_fit(
+            dims_flex, (L, W, H), prefer_long_axis=tunnel_first and tunnel[idx]
+        )
+        if not oriented or not _placement_ok(container_type, interior, box, oriented):
+            continue
+        l, w, h = oriented
+        leftover = L * W * H - (l * w * h)
+        if best_choice is None or leftover < best_choice:
+            best_choice = leftover
+            best = (idx, oriented)
+    return best
+
+
+def _placement(number: int, item: Mapping[str, Any], spaces: FreeSpaces, idx: int, dims: Dims) -> Placement:
+    return {
+        "Item": number,
+        "Type": item["Type"],
+        "Dims": dims,
+        "Position": spaces.origin(idx),
+        "Section": spaces.section(idx),
+    }
+
+
+def greedy_3d_packing(
+    baggage_list: Sequence[Mapping[str, Any]],
+    container_type: str,
+    interior: Mapping[str, Any],
+    force_tunnel_for_long: bool = True,
+    long_threshold: float = 50,
+    allow_tunnel_for_short: bool = False,
+) -> Tuple[bool, List[Placement]]:
+    """
+    Returns (success: bool, placements: list[dict]).
+    Each placement: {Item, Type, Dims: (x,y,z) oriented, Position: (x0,y0,z0), Section: "Tunnel"/"Main"}
+    """
+    placements: List[Placement] = []
+    spaces = FreeSpaces.initial(container_type, interior)
+    is_cj = container_type == "CJ"
+
+    for i, item in enumerate(baggage_list):
+        dims_flex = apply_flex(item["Dims"], item.get("Flex", 1.0))
+        is_long = max(dims_flex) >= long_threshold
+        tunnel_first = is_cj and is_long and force_tunnel_for_long
+
+        choice = _best_space(
+            spaces,
+            dims_flex,
+            container_type,
+            interior,
+            tunnel_first=tunnel_first,
+            allowed_tunnel=is_cj and (allow_tunnel_for_short or is_long),
+        )
+        if choice is None:
+            return False, placements
+
+        idx, dims = choice
+        placements.append(_placement(i + 1, item, spaces, idx, dims))
+        spaces.place(idx, dims)
+
+    return True, placements
+
+
+def _placement_options(
+    spaces: FreeSpaces,
+    dims_flex: Dims,
+    container_type: str,
+    interior: Mapping[str, Any],
+) -> List[Tuple[float, int, Dims]]:
+    """Return every feasible ``(leftover, space, orientation)`` choice, tightest first."""
+
+    orientations = list(dict.fromkeys(itertools.permutations(dims_flex)))
+    options: List[Tuple[float, int, Dims]] = []
+    for idx, box in enumerate(spaces.boxes):
+        L, W, H = box[3:]
+        volume = L * W * H
+        for dims in orientations:
+            l, w, h = dims
+            if l <= L and w <= W and h <= H and _placement_ok(container_type, interior, box, dims):
+                options.append((volume - l * w * h, idx, dims))
+    options.sort(key=lambda option: (option[0], option[1]))
+    return options
+
+
+def beam_search_packing(
+    baggage_list: Sequence[Mapping[str, Any]],
+    container_type: str,
+    interior: Mapping[str, Any],
+    *,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+    branch_limit: int = 6,
+    max_states: int = 4000,
+) -> Tuple[bool, List[Placement]]:
+    """Bounded beam search over space/orientation choices for each bag.
+
+    Bags are placed largest first. Each state branches into its
+    ``branch_limit`` tightest placements (any section, any orientation), and
+    the ``beam_width`` states leaving the largest free box survive each round.
+    Once ``max_states`` children have been generated the search narrows to a
+    single greedy line so the cost stays bounded. Placements use the same
+    format as :func:`greedy_3d_packing`; on failure the deepest partial
+    packing is returned.
+    """
+
+    order = sorted(baggage_list, key=lambda item: bag_volume(item["Dims"]), reverse=True)
+    beam: List[Tuple[Tuple[Placement, ...], FreeSpaces]] = [
+        ((), FreeSpaces.initial(container_type, interior))
+    ]
+    generated = 0
+
+    for number, item in enumerate(order, start=1):
+        dims_flex = apply_flex(item["Dims"], item.get("Flex", 1.0))
+        width, branches = (beam_width, branch_limit) if generated < max_states else (1, 1)
+
+        children: Dict[Any, Tuple[Tuple[float, int], Tuple[Placement, ...], FreeSpaces]] = {}
+        for placements, spaces in beam:
+            for _, idx, dims in _placement_options(spaces, dims_flex, container_type, interior)[:branches]:
+                child = spaces.copy()
+                child.place(idx, dims)
+                generated += 1
+                signature = child.signature()
+                if signature in children:
+                    continue
+                score = (-child.largest_volume(), len(child))
+                children[signature] = (score, placements + (_placement(number, item, spaces, idx, dims),), child)
+
+        if not children:
+            return False, list(beam[0][0])
+        ranked = sorted(children.values(), key=lambda entry: entry[0])[:width]
+        beam = [(placements, spaces) for _, placements, spaces in ranked]
+
+    return True, list(beam[0][0])
+
+
+def _strategy_orders(
+    baggage_list: Sequence[Mapping[str, Any]], container_type: str
+) -> List[Tuple[str, List[int]]]:
+    """Return bag orderings (as indices) to try, in priority order."""
+
+    indices = list(range(len(baggage_list)))
+
+    def ordered(key: Any, reverse: bool = False) -> List[int]:
+        return sorted(indices, key=lambda idx: key(baggage_list[idx]), reverse=reverse)
+
+    # Different orderings can impact greedy results
+    strategies = [
+        ("Original Order", indices),
+        ("Largest Volume First", ordered(lambda x: bag_volume(x["Dims"]), reverse=True)),
+        ("Largest Dimension First", ordered(lambda x: max(x["Dims"]), reverse=True)),
+        ("Largest Footprint First", ordered(lambda x: (x["Dims"][0] * x["Dims"][1]), reverse=True)),
+        ("Smallest First", ordered(lambda x: bag_volume(x["Dims"]))),
+    ]
+
+    for seed in _SHUFFLE_SEEDS:
+        shuffled = indices[:]
+        random.Random(seed).shuffle(shuffled)
+        strategies.append((f"Random Shuffle {seed}", shuffled))
+
+    if container_type == "CJ":
+        def is_long(item: Mapping[str, Any]) -> bool:
+            return max(item["Dims"]) >= 50
+
+        strategies.append(
+            (
+                "Tunnel Priority Ordering",
+                ordered(lambda x: (not is_long(x), -bag_volume(x["Dims"]))),
+            )
+        )
+    return strategies
+
+
+def _variant_settings(container_type: str) -> List[Dict[str, Any]]:
+    if container_type == "CJ":
+        return [
+            {
+                "force_tunnel_for_long": True,
+                "long_threshold": 50,
+                "allow_tunnel_for_short": False,
+                "label": "Prefer tunnel ≥50\""
+            },
+            {
+                "force_tunnel_for_long": True,
+                "long_threshold": 60,
+                "allow_tunnel_for_short": False,
+                "label": "Prefer tunnel ≥60\""
+            },
+            {
+                "force_tunnel_for_long": False,
+                "long_threshold": 50,
+                "allow_tunnel_for_short": True,
+                "label": "Tunnel allowed all"
+            },
+        ]
+    return [
+        {"force_tunnel_for_long": True, "long_threshold": 50, "allow_tunnel_for_short": False, "label": None}
+    ]
+
+
+def _run_strategy(
+    bags: Sequence[Mapping[str, Any]],
+    container_type: str,
+    interior: Mapping[str, Any],
+    variant: Mapping[str, Any],
+) -> Tuple[bool, List[Placement]]:
+    return greedy_3d_packing(
+        bags,
+        container_type,
+        interior,
+        force_tunnel_for_long=variant["force_tunnel_for_long"],
+        long_threshold=variant["long_threshold"],
+        allow_tunnel_for_short=variant["allow_tunnel_for_short"],
+    )
+
+
+def _run_strategies_parallel(
+    jobs: Sequence[Tuple[str, List[Mapping[str, Any]], Mapping[str, Any]]],
+    container_type: str,
+    interior: Mapping[str, Any],
+    max_workers: int,
+) -> List[Optional[Tuple[bool, List[Placement]]]]:
+    """Run ``jobs`` in worker processes, cancelling those after the first full fit.
+
+    Results are returned in job order; jobs cancelled because an earlier job
+    already packed every bag are ``None``.
+    """
+
+    results: List[Optional[Tuple[bool, List[Placement]]]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures: Dict[Future, int] = {
+            pool.submit(_run_strategy, bags, container_type, interior, variant): position
+            for position, (_, bags, variant) in enumerate(jobs)
+        }
+        first_success = len(jobs)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                position = futures[future]
+                results[position] = future.result()
+                if results[position][0] and position < first_success:
+                    first_success = position
+                    for other, other_position in futures.items():
+                        if other_position > position:
+                            other.cancel()
+            # Only jobs ahead of the earliest full fit can still change the answer.
+            pending = {future for future in pending if futures[future] < first_success}
+        for future in futures:
+            future.cancel()
+    return results
+
+
+def multi_strategy_packing(
+    baggage_list: Sequence[Mapping[str, Any]],
+    container_type: str,
+    interior: Mapping[str, Any],
+    *,
+    max_workers: int = 1,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+) -> Dict[str, Any]:
+    """Try the greedy orderings and return the first full fit or the best partial one.
+
+    Orderings that produce the same bag sequence are only run once. With
+    ``max_workers > 1`` the strategies run in worker processes and the
+    remaining ones are cancelled as soon as an earlier one packs every bag;
+    the chosen strategy is the same as in a sequential run. When no greedy
+    ordering fits everything and ``beam_width`` is positive, a bounded
+    :func:`beam_search_packing` pass gets a final attempt.
+    """
+
+    jobs: List[Tuple[str, List[Mapping[str, Any]], Mapping[str, Any]]] = []
+    seen = set()
+    for name, order in _strategy_orders(baggage_list, container_type):
+        for variant in _variant_settings(container_type):
+            key = (tuple(order), variant["label"])
+            if key in seen:
+                continue
+            seen.add(key)
+            strategy_label = name
+            if container_type == "CJ" and variant["label"]:
+                strategy_label = f"{name} / {variant['label']}"
+            jobs.append((strategy_label, [baggage_list[idx] for idx in order], variant))
+
+    if max_workers > 1 and len(jobs) > 1:
+        outcomes = _run_strategies_parallel(jobs, container_type, interior, max_workers)
+    else:
+        outcomes = []
+        for _, bags, variant in jobs:
+            outcomes.append(_run_strategy(bags, container_type, interior, variant))
+            if outcomes[-1][0]:
+                break
+
+    best_result: Dict[str, Any] = {"success": False, "placements": [], "strategy": None, "fit_count": 0}
+    for (strategy_label, _, _), outcome in zip(jobs, outcomes):
+        if outcome is None:
+            continue
+        success, placements = outcome
+        if success:
+            return {
+                "success": True,
+                "placements": placements,
+                "strategy": strategy_label,
+                "fit_count": len(placements)
+            }
+        if len(placements) > best_result["fit_count"]:
+            best_result = {
+                "success": False,
+                "placements": placements,
+                "strategy": strategy_label,
+                "fit_count": len(placements)
+            }
+
+    if beam_width > 0 and baggage_list:
+        success, placements = beam_search_packing(
+            baggage_list, container_type, interior, beam_width=beam_width
+        )
+        if success:
+            return {
+                "success": True,
+                "placements": placements,
+                "strategy": "Beam Search",
+                "fit_count": len(placements)
+            }
+
+    return best_result
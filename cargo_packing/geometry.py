@@ -0,0 +1,199 @@
+"""Single-bag fit checks and volume helpers for the supported cargo holds."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import Any, Mapping, Optional, Tuple
+
+Dims = Tuple[float, float, float]
+
+
+def fits_through_door(box_dims: Dims, door: Mapping[str, float], flex: float = 1.0) -> bool:
+    """Return ``True`` when some orientation of the bag passes through the door."""
+    dims_flex = apply_flex(box_dims, flex)
+    for dims in itertools.permutations(dims_flex):
+        bw, bh = dims[0], dims[1]
+        diag = math.hypot(bw, bh)
+        if "width_min" in door:  # CJ style door with narrowest span
+            width_ok_min = bw <= door["width_min"]
+            width_ok_max = bw <= door["width_max"]
+            height_ok = bh <= door["height"]
+            if width_ok_min and height_ok:
+                return True
+            if width_ok_min and width_ok_max and diag <= door["diag"]:
+                return True
+        else:  # Legacy style door (single width)
+            width_ok = bw <= door["width"]
+            height_ok = bh <= door["height"]
+            if width_ok and height_ok:
+                return True
+            if width_ok and diag <= door["diag"]:
+                return True
+    return False
+
+
+def legacy_width_at_height(interior: Mapping[str, Any], z: float) -> float:
+    """Linear interpolation of width at height z (Legacy taper)."""
+    h = interior["height"]
+    wmin, wmax = interior["width_min"], interior["width_max"]
+    return wmin + (wmax - wmin) * (z / h)
+
+
+def depth_at_height(interior: Mapping[str, Any], z: float) -> float:
+    """Return available depth at height z for sloped holds."""
+    profile = interior.get("depth_profile")
+    if not profile:
+        return interior["depth"]
+    slope_start = profile["slope_start"]
+    slope_end = profile["slope_end"]
+    depth_max = profile["depth_max"]
+    depth_min = profile["depth_min"]
+    if z <= slope_start:
+        return depth_max
+    if z >= slope_end:
+        return depth_min
+    slope = (depth_min - depth_max) / (slope_end - slope_start)
+    return depth_max + slope * (z - slope_start)
+
+
+def apply_flex(dims: Dims, flex: float) -> Dims:
+    """Apply flexibility/squish factor (for fit checks only)."""
+    l, w, h = dims
+    return (l * flex, w * flex, h * flex)
+
+
+def fits_in_space(box_dims: Dims, space_dims: Dims) -> Optional[Dims]:
+    """Return an oriented (l,w,h) that fits inside space_dims (L,W,H), else None."""
+    l, w, h = box_dims
+    for dims in itertools.permutations([l, w, h]):
+        bl, bw, bh = dims
+        if bl <= space_dims[0] and bw <= space_dims[1] and bh <= space_dims[2]:
+            return dims
+    return None
+
+
+def can_fit_rotated_in_plane(
+    item_length: float,
+    item_width: float,
+    space_length: float,
+    space_width: float,
+    step_degrees: float = 1.0,
+) -> bool:
+    """Check if a rectangle can fit in a rectangle via in-plane rotation."""
+    for angle_deg in [i * step_degrees for i in range(int(90 / step_degrees) + 1)]:
+        angle = math.radians(angle_deg)
+        cos_a = abs(math.cos(angle))
+        sin_a = abs(math.sin(angle))
+        proj_length = item_length * cos_a + item_width * sin_a
+        proj_width = item_length * sin_a + item_width * cos_a
+        if proj_length <= space_length and proj_width <= space_width:
+            return True
+    return False
+
+
+def box_diagonal(length: float, width: float, height: float) -> float:
+    return math.sqrt(length ** 2 + width ** 2 + height ** 2)
+
+
+def fits_inside(
+    box_dims: Dims,
+    interior: Mapping[str, Any],
+    container_type: str,
+    flex: float = 1.0,
+    allow_diagonal: bool = False,
+) -> Tuple[bool, bool]:
+    """Check if a single box can fit somewhere in the empty hold (not a packing check)."""
+    dims_flex = apply_flex(box_dims, flex)
+    for dims in itertools.permutations(dims_flex):
+        bl, bw, bh = dims
+        if container_type == "CJ":
+            if bh <= interior["height"] and bl <= interior["depth"] and bw <= interior["width"]:
+                r = interior["restricted"]
+                main_depth = max(0.0, interior["depth"] - r["depth"])
+                main_width = max(0.0, interior["width"] - r["width"])
+                fits_outside_restricted = (
+                    bl > r["depth"]
+                    or bw > r["width"]
+                    or bl <= main_depth
+                    or bw <= main_width
+                )
+                if fits_outside_restricted:
+                    return True, False
+            if allow_diagonal and bh <= interior["height"]:
+                r = interior["restricted"]
+                main_depth = max(0.0, interior["depth"] - r["depth"])
+                main_width = max(0.0, interior["width"] - r["width"])
+                diagonal_spaces = [
+                    (r["depth"], main_width),
+                    (main_depth, interior["width"]),
+                    (interior["depth"], interior["width"]),
+                ]
+                for space_depth, space_width in diagonal_spaces:
+                    if can_fit_rotated_in_plane(bl, bw, space_depth, space_width):
+                        return True, True
+                space_diag = box_diagonal(interior["depth"], interior["width"], interior["height"])
+                if bl <= space_diag and bw <= interior["width"] and bh <= interior["height"]:
+                    return True, True
+        elif container_type == "Legacy":
+            width_limit = min(
+                legacy_width_at_height(interior, 0),
+                legacy_width_at_height(interior, bh)
+            )
+            if bl <= interior["depth"] and bh <= interior["height"]:
+                if bw <= width_limit:
+                    return True, False
+            if allow_diagonal and bh <= interior["height"]:
+                if can_fit_rotated_in_plane(bl, bw, interior["depth"], width_limit):
+                    return True, True
+                space_diag = box_diagonal(interior["depth"], width_limit, interior["height"])
+                if bl <= space_diag and bw <= width_limit and bh <= interior["height"]:
+                    return True, True
+        else:
+            depth_limit = depth_at_height(interior, bh)
+            if bh <= interior["height"] and bl <= depth_limit and bw <= interior["width"]:
+                return True, False
+            if allow_diagonal and bh <= interior["height"]:
+                if can_fit_rotated_in_plane(bl, bw, depth_limit, interior["width"]):
+                    return True, True
+                space_diag = box_diagonal(depth_limit, interior["width"], interior["height"])
+                if bl <= space_diag and bw <= interior["width"] and bh <= interior["height"]:
+                    return True, True
+    return False, False
+
+
+def bag_volume(dims: Dims) -> float:
+    l, w, h = dims
+    return l * w * h
+
+
+def cargo_volume(interior: Mapping[str, Any], container_type: str) -> float:
+    if container_type == "CJ":
+        main_vol = interior["depth"] * interior["width"] * interior["height"]
+        restricted = interior["restricted"]
+        restricted_vol = restricted["depth"] * restricted["width"] * interior["height"]
+        return max(0.0, main_vol - restricted_vol)
+    if container_type == "Legacy":
+        # approximate trapezoidal cross-section (average width)
+        return interior["depth"] * ((interior["width_min"] + interior["width_max"]) / 2) * interior["height"]
+    if "depth_profile" in interior:
+        profile = interior["depth_profile"]
+        slope_start = profile["slope_start"]
+        slope_end = profile["slope_end"]
+        depth_max = profile["depth_max"]
+        depth_min = profile["depth_min"]
+        height = interior["height"]
+        width = interior["width"]
+        lower_vol = depth_max * slope_start
+        middle_height = max(0.0, slope_end - slope_start)
+        middle_vol = ((depth_max + depth_min) / 2) * middle_height
+        upper_vol = depth_min * max(0.0, height - slope_end)
+        return width * (lower_vol + middle_vol + upper_vol)
+    return interior["depth"] * interior["width"] * interior["height"]
+
+
+def legacy_width_ok(interior: Mapping[str, Any], y1: float, z0: float, z1: float) -> bool:
+    from_bottom = legacy_width_at_height(interior, z0)
+    to_top = legacy_width_at_height(interior, z1)
+    w_avail = min(from_bottom, to_top)
+    return y1 <= w_avail
@@ -0,0 +1,69 @@
+"""Cargo hold definitions and standard baggage presets."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict
+
+
+CONTAINERS: Dict[str, Dict[str, Any]] = {
+    "CJ": {
+        "door": {"width_min": 24, "width_max": 26, "height": 20, "diag": 31},
+        "interior": {
+            "height": 22,         # z
+            "depth": 45,          # x (front -> back)
+            "width": 84,          # y (left -> right)
+            "restricted": {"width": 20, "depth": 20},   # near the door, right side (y high, x near 0)
+            # Long tunnel: against the BACK WALL (x near cargo_L), spans full width (y 0->84)
+            "tunnel": {"depth": 24, "width": 84}
+        }
+    },
+    "Sprinter Van (Rear)": {
+        "door": {"width": 68, "height": 46, "diag": math.hypot(68, 46)},
+        "interior": {
+            "height": 46,
+            "depth": 33,
+            "width": 68,
+            "depth_profile": {
+                "slope_start": 13,
+                "slope_end": 40,
+                "depth_max": 33,
+                "depth_min": 20
+            }
+        }
+    },
+    "Legacy": {
+        "door": {"width": 34, "height": 22, "diag": 38},
+        "interior": {
+            "height": 36,
+            "depth": 89,
+            "width_min": 36,
+            "width_max": 54
+        }
+    },
+    "Full-Size SUV": {
+        "modes": [
+            {
+                "label": "Third Row Up (All Seats in Use)",
+                "cargo_volume_cf": 41,
+                "door": {"width": 49, "height": 28, "diag": math.hypot(49, 28)},
+                "interior": {"depth": 22, "width": 49, "height": 28}
+            },
+            {
+                "label": "Third Row Folded",
+                "cargo_volume_cf": 94,
+                "door": {"width": 49, "height": 28, "diag": math.hypot(49, 28)},
+                "interior": {"depth": 50, "width": 49, "height": 28}
+            }
+        ]
+    }
+}
+
+STANDARD_BAGGAGE: Dict[str, Dict[str, Any]] = {
+    "Small Carry-on": {"dims": (22, 14, 9), "flex": 1.0},
+    "Standard Suitcase": {"dims": (26, 18, 10), "flex": 1.0},
+    "Large Suitcase": {"dims": (30, 19, 11), "flex": 1.0},
+    "Golf Clubs (Soft Bag)": {"dims": (55, 13, 13), "flex": 0.85},
+    "Ski Bag (Soft)": {"dims": (70, 12, 7), "flex": 0.9},
+    "Custom": {"dims": None, "flex": 1.0}
+}
@@ -0,0 +1,176 @@
+"""Free-space bookkeeping for the cargo packing engine."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from .geometry import Dims
+
+Box = Tuple[float, float, float, float, float, float]
+
+SECTION_MAIN = "Main"
+SECTION_TUNNEL = "Tunnel"
+
+_EPS = 1e-6
+
+
+def initial_spaces(container_type: str, interior: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Return the empty hold as a list of ``x/y/z/L/W/H/Section`` boxes."""
+
+    if container_type == "CJ":
+        cargo_L = interior["depth"]
+        cargo_W = interior["width"]
+        cargo_H = interior["height"]
+        r = interior["restricted"]
+        t = interior["tunnel"]
+
+        spaces = []
+        # Space near door, left side (exclude restricted block)
+        spaces.append({
+            "x": 0.0,
+            "y": 0.0,
+            "z": 0.0,
+            "L": r["depth"],
+            "W": max(0.0, cargo_W - r["width"]),
+            "H": cargo_H,
+            "Section": SECTION_MAIN
+        })
+        # Space behind restricted block, before tunnel
+        spaces.append({
+            "x": r["depth"],
+            "y": 0.0,
+            "z": 0.0,
+            "L": max(0.0, cargo_L - r["depth"] - t["depth"]),
+            "W": cargo_W,
+            "H": cargo_H,
+            "Section": SECTION_MAIN
+        })
+        # Space beside tunnel at back wall
+        spaces.append({
+            "x": max(0.0, cargo_L - t["depth"]),
+            "y": t["width"],
+            "z": 0.0,
+            "L": t["depth"],
+            "W": max(0.0, cargo_W - t["width"]),
+            "H": cargo_H,
+            "Section": SECTION_MAIN
+        })
+        # Tunnel space
+        spaces.append({
+            "x": max(0.0, cargo_L - t["depth"]),
+            "y": 0.0,
+            "z": 0.0,
+            "L": t["depth"],
+            "W": t["width"],
+            "H": cargo_H,
+            "Section": SECTION_TUNNEL
+        })
+        return [s for s in spaces if s["L"] > 0 and s["W"] > 0 and s["H"] > 0]
+
+    if container_type == "Legacy":
+        # Legacy (tapered) - use max width with taper checks on placement
+        return [{
+            "x": 0.0,
+            "y": 0.0,
+            "z": 0.0,
+            "L": interior["depth"],
+            "W": interior["width_max"],
+            "H": interior["height"],
+            "Section": SECTION_MAIN
+        }]
+
+    return [{
+        "x": 0.0,
+        "y": 0.0,
+        "z": 0.0,
+        "L": interior["depth"],
+        "W": interior["width"],
+        "H": interior["height"],
+        "Section": SECTION_MAIN
+    }]
+
+
+class FreeSpaces:
+    """Free boxes of a hold stored as flat ``(x, y, z, L, W, H)`` tuples.
+
+    ``tunnel`` runs parallel to ``boxes`` and flags the CJ tunnel. Placing a
+    bag replaces its box with the guillotine remainders in front of, beside
+    and on top of the bag, so the boxes stay pairwise disjoint and never
+    contain one another. That invariant is what lets the engine skip the
+    quadratic containment pruning entirely.
+    """
+
+    __slots__ = ("boxes", "tunnel")
+
+    def __init__(self, boxes: List[Box], tunnel: List[bool]) -> None:
+        self.boxes = boxes
+        self.tunnel = tunnel
+
+    @classmethod
+    def from_dicts(cls, spaces: Sequence[Mapping[str, Any]]) -> "FreeSpaces":
+        return cls(
+            [(s["x"], s["y"], s["z"], s["L"], s["W"], s["H"]) for s in spaces],
+            [s["Section"] == SECTION_TUNNEL for s in spaces],
+        )
+
+    @classmethod
+    def initial(cls, container_type: str, interior: Mapping[str, Any]) -> "FreeSpaces":
+        return cls.from_dicts(initial_spaces(container_type, interior))
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def copy(self) -> "FreeSpaces":
+        return FreeSpaces(list(self.boxes), list(self.tunnel))
+
+    def largest_volume(self) -> float:
+        return max((L * W * H for _, _, _, L, W, H in self.boxes), default=0.0)
+
+    def origin(self, idx: int) -> Tuple[float, float, float]:
+        x, y, z = self.boxes[idx][:3]
+        return x, y, z
+
+    def section(self, idx: int) -> str:
+        return SECTION_TUNNEL if self.tunnel[idx] else SECTION_MAIN
+
+    def place(self, idx: int, dims: Dims) -> None:
+        """Occupy the corner of box ``idx`` with an oriented ``(l, w, h)`` bag."""
+
+        x, y, z, L, W, H = self.boxes.pop(idx)
+        tunnel = self.tunnel.pop(idx)
+        l, w, h = dims
+        remainders = []
+        if L - l > _EPS:
+            remainders.append((x + l, y, z, L - l, W, H))
+        if W - w > _EPS:
+            remainders.append((x, y + w, z, l, W - w, H))
+        if H - h > _EPS:
+            remainders.append((x, y, z + h, l, w, H - h))
+        for box in remainders:
+            if box[3] > _EPS and box[4] > _EPS and box[5] > _EPS:
+                self.boxes.append(box)
+                self.tunnel.append(tunnel)
+
+    def signature(self) -> Tuple[Tuple[Any, ...], ...]:
+        """Order-independent fingerprint used to drop duplicate search states."""
+
+        return tuple(
+            sorted(
+                tuple(round(value, 4) for value in box) + (tunnel,)
+                for box, tunnel in zip(self.boxes, self.tunnel)
+            )
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "x": x,
+                "y": y,
+                "z": z,
+                "L": L,
+                "W": W,
+                "H": H,
+                "Section": self.section(idx),
+            }
+            for idx, (x, y, z, L, W, H) in enumerate(self.boxes)
+        ]
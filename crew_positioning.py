@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from roster_index import RosterIndex, ensure_index
 
 
 _DUTY_TYPES = {"F", "FLIGHT", "DUTY"}
@@ -113,14 +115,26 @@ def _is_positioning_event(event: Mapping[str, Any]) -> bool:
     return event_type in _POSITIONING_TYPES
 
 
-def build_positioning_statuses(rows: Iterable[Mapping[str, Any]], *, at_time: datetime) -> List[CrewPositioningStatus]:
+def build_positioning_index(rows: Iterable[Mapping[str, Any]]) -> RosterIndex:
+    """Index roster rows once for repeated positioning queries."""
+
+    return RosterIndex(rows, event_builder=_extract_events)
+
+
+def build_positioning_statuses(
+    rows: Union[Iterable[Mapping[str, Any]], RosterIndex],
+    *,
+    at_time: datetime,
+) -> List[CrewPositioningStatus]:
     reference = at_time.astimezone(UTC) if at_time.tzinfo else at_time.replace(tzinfo=UTC)
+    index = ensure_index(rows, _extract_events)
+    active_by_crew = index.active_events(reference)
     statuses: List[CrewPositioningStatus] = []
 
-    for row in rows:
-        user = row.get("user") if isinstance(row.get("user"), Mapping) else {}
-        events = _extract_events(row)
-        if not events:
+    for crew in index.crews:
+        row = crew.row
+        user = crew.user
+        if not crew.events:
             continue
 
         name = " ".join(part for part in (_first_non_empty(user, "firstName"), _first_non_empty(user, "lastName")) if part).strip()
@@ -131,24 +145,16 @@ def build_positioning_statuses(rows: Iterable[Mapping[str, Any]], *, at_time: da
         trigram = _first_non_empty(user, "trigram")
         home_base = _extract_home_base(row, user)
 
-        active = None
-        latest = None
+        active = active_by_crew.get(crew.position)
+        latest = crew.by_start.latest_at_or_before(reference)
         next_duty = None
-        future_positionings: List[Dict[str, Any]] = []
-
-        for event in events:
-            start = event.get("start")
-            end = event.get("end")
-            if isinstance(start, datetime) and start <= reference:
-                latest = event
-            if isinstance(start, datetime) and isinstance(end, datetime) and start <= reference <= end:
-                active = event
-
-            if isinstance(start, datetime) and start > reference:
-                if _is_duty_event(event) and next_duty is None:
-                    next_duty = event
-                if _is_positioning_event(event):
-                    future_positionings.append(event)
+        future_positionings: List[Mapping[str, Any]] = []
+
+        for event in crew.by_start.after(reference):
+            if _is_duty_event(event) and next_duty is None:
+                next_duty = event
+            if _is_positioning_event(event):
+                future_positionings.append(event)
 
         chosen = active or latest
         current_airport = None
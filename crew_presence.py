@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from roster_index import CrewTimeline, RosterIndex, ensure_index
 
 
 @dataclass
@@ -101,84 +103,96 @@ def _is_a_day_entry(entry: Mapping[str, Any]) -> bool:
     return entry_type in {"A", "ADAY", "A DAY", "OFF", "HOME"}
 
 
-def _in_flight_at_time(flight: Mapping[str, Any], at_time: datetime) -> bool:
-    start = _to_utc(_pick(flight, ("departureTime", "blockOffEstUTC", "etd", "start", "out", "from")))
-    end = _to_utc(_pick(flight, ("arrivalTime", "blockOnEstUTC", "eta", "end", "in", "to")))
-    if not isinstance(start, datetime) or not isinstance(end, datetime):
-        return False
-    return start <= at_time <= end
+def _row_flights(row: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+    return [item for item in (row.get("flights") or []) if isinstance(item, Mapping)]
 
 
-def _latest_arrival(flights: Iterable[Mapping[str, Any]], at_time: datetime) -> tuple[str, Optional[datetime], str]:
-    best_airport = ""
-    best_time: Optional[datetime] = None
-    source = ""
-    for flight in flights:
-        end = _to_utc(_pick(flight, ("arrivalTime", "blockOnEstUTC", "eta", "end", "in", "to")))
-        if not isinstance(end, datetime) or end > at_time:
-            continue
+def _row_entries(row: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+    return [item for item in (row.get("entries") or []) if isinstance(item, Mapping)]
+
+
+def _presence_events(row: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    events: List[Dict[str, Any]] = []
+    for flight in _row_flights(row):
+        dep = _airport(_pick(flight, ("fromAirport", "departureAirport", "airportFrom")))
         arr = _airport(_pick(flight, ("toAirport", "arrivalAirport", "airportTo", "realAirportTo")))
-        if not arr:
-            continue
-        if best_time is None or end > best_time:
-            route = f"{_airport(_pick(flight, ('fromAirport', 'departureAirport', 'airportFrom')))}-{arr}".strip("-")
-            best_airport = arr
-            best_time = end
-            source = f"Latest arrived flight ({route})"
-    return best_airport, best_time, source
-
-
-def _latest_positioning(entries: Iterable[Mapping[str, Any]], at_time: datetime) -> tuple[str, Optional[datetime], str]:
-    best_airport = ""
-    best_time: Optional[datetime] = None
-    for entry in entries:
+        events.append(
+            {
+                "kind": "flight",
+                "start": _to_utc(_pick(flight, ("departureTime", "blockOffEstUTC", "etd", "start", "out", "from"))),
+                "end": _to_utc(_pick(flight, ("arrivalTime", "blockOnEstUTC", "eta", "end", "in", "to"))),
+                "airport": arr,
+                "source": f"Latest arrived flight ({f'{dep}-{arr}'.strip('-')})",
+            }
+        )
+    for entry in _row_entries(row):
         event_type = str(_pick(entry, ("type", "eventType", "code")) or "").upper()
         if event_type not in {"P", "POSITIONING"}:
             continue
-        end = _to_utc(_pick(entry, ("end", "arrivalTime", "in", "to")))
-        if not isinstance(end, datetime) or end > at_time:
-            continue
-        arr = _airport(_pick(entry, ("toAirport", "arrivalAirport", "airportTo", "to")))
-        if not arr:
-            continue
-        if best_time is None or end > best_time:
-            best_airport = arr
-            best_time = end
-    return best_airport, best_time, "Latest positioning"
+        events.append(
+            {
+                "kind": "positioning",
+                "start": None,
+                "end": _to_utc(_pick(entry, ("end", "arrivalTime", "in", "to"))),
+                "airport": _airport(_pick(entry, ("toAirport", "arrivalAirport", "airportTo", "to"))),
+            }
+        )
+    return events
+
+
+def build_presence_index(roster_rows: Iterable[Mapping[str, Any]]) -> RosterIndex:
+    """Index a roster pull once so time/airport queries can be re-run cheaply."""
+
+    return RosterIndex(roster_rows, event_builder=_presence_events)
+
+
+def _indexed_latest(crew: CrewTimeline, kind: str, at_time: datetime) -> tuple[str, Optional[datetime], str]:
+    timeline = crew.ending(lambda event: event["kind"] == kind and bool(event["airport"]), name=kind)
+    event = timeline.latest_at_or_before(at_time, first_on_tie=True)
+    if event is None:
+        return "", None, ""
+    return event["airport"], event["end"], str(event.get("source") or "")
 
 
 def crew_at_airport(
-    roster_rows: Iterable[Mapping[str, Any]],
+    roster_rows: Union[Iterable[Mapping[str, Any]], RosterIndex],
     *,
     at_time: datetime,
     airport: str,
     fleet: str,
 ) -> List[CrewPresenceResult]:
+    """Return crew inferred to be at ``airport`` at ``at_time``.
+
+    Pass a :class:`RosterIndex` from :func:`build_presence_index` to answer
+    repeated queries against the same roster pull without rescanning it.
+    """
+
     target_airport = airport.strip().upper()
     at_time_utc = at_time.astimezone(UTC) if at_time.tzinfo else at_time.replace(tzinfo=UTC)
+    index = ensure_index(roster_rows, _presence_events)
+    airborne = index.active_events(at_time_utc, lambda event: event["kind"] == "flight")
 
     results: List[CrewPresenceResult] = []
-    for row in roster_rows:
-        if not isinstance(row, Mapping):
-            continue
-        user = row.get("user") if isinstance(row.get("user"), Mapping) else {}
-        flights = [item for item in (row.get("flights") or []) if isinstance(item, Mapping)]
-        entries = [item for item in (row.get("entries") or []) if isinstance(item, Mapping)]
+    for crew in index.crews:
+        user = crew.user
 
         name = " ".join(
             part for part in [str(user.get("firstName") or "").strip(), str(user.get("lastName") or "").strip()] if part
         ).strip() or str(user.get("logName") or user.get("name") or user.get("email") or "Unknown")
         role = str(user.get("role") or user.get("position") or "")
 
-        if any(_in_flight_at_time(flight, at_time_utc) for flight in flights):
+        if crew.position in airborne:
             continue
 
-        fleet_ok = _fleet_match(user, flights, fleet)
+        fleet_key = ("fleet", fleet)
+        if fleet_key not in crew.cache:
+            crew.cache[fleet_key] = _fleet_match(user, _row_flights(crew.row), fleet)
+        fleet_ok = crew.cache[fleet_key]
         if not fleet_ok:
             continue
 
-        flight_airport, flight_time, flight_source = _latest_arrival(flights, at_time_utc)
-        pos_airport, pos_time, _ = _latest_positioning(entries, at_time_utc)
+        flight_airport, flight_time, flight_source = _indexed_latest(crew, "flight", at_time_utc)
+        pos_airport, pos_time, _ = _indexed_latest(crew, "positioning", at_time_utc)
 
         chosen_airport = ""
         chosen_time: Optional[datetime] = None
@@ -198,7 +212,9 @@ def crew_at_airport(
 
         if not chosen_airport:
             # A-day/home fallback.
-            if any(_is_a_day_entry(entry) for entry in entries):
+            if "a_day" not in crew.cache:
+                crew.cache["a_day"] = any(_is_a_day_entry(entry) for entry in _row_entries(crew.row))
+            if crew.cache["a_day"]:
                 chosen_airport = _airport(
                     _pick(user, ("baseAirport", "homeBase", "airport", "base", "station"))
                 )
@@ -5,7 +5,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
-from typing import Any, List, Mapping, Optional, Tuple
+from typing import Any, Callable, List, Mapping, Optional, Tuple
 
 from zoneinfo_compat import ZoneInfo
 
@@ -22,6 +22,8 @@ DAY_KEYS: Tuple[str, ...] = (
 DEFAULT_BUSINESS_DAY_START = time(hour=9)
 DEFAULT_BUSINESS_DAY_END = time(hour=17)
 
+HoursForDate = Callable[[date], Optional[Tuple[time, time]]]
+
 
 def parse_hours_value(value: str) -> Optional[Tuple[time, time]]:
     """Parse a textual hours range such as ``"09:00-17:00"`` into start/end times."""
@@ -81,9 +83,14 @@ class ClearanceWindow:
 
 
 def _get_operating_hours_for_date(
-    rule: Optional[Mapping[str, Any]], target_date: date
+    rule: Optional[Mapping[str, Any]],
+    target_date: date,
+    hours_for_date: Optional[HoursForDate] = None,
 ) -> Tuple[time, time, bool]:
-    hours = rule_hours_for_weekday(rule, target_date.weekday())
+    if hours_for_date is not None:
+        hours = hours_for_date(target_date)
+    else:
+        hours = rule_hours_for_weekday(rule, target_date.weekday())
     if hours is None:
         return DEFAULT_BUSINESS_DAY_START, DEFAULT_BUSINESS_DAY_END, False
     start_time, end_time = hours
@@ -112,8 +119,13 @@ def build_followup_candidates(
     lead_deadline_local: Optional[datetime],
     lead_hours: Optional[float],
     departure_local: Optional[datetime],
+    hours_for_date: Optional[HoursForDate] = None,
 ) -> List[ClearanceWindow]:
-    """Generate fallback clearance windows once the prior-day window has passed."""
+    """Generate fallback clearance windows once the prior-day window has passed.
+
+    ``hours_for_date`` can supply precomputed port hours (for example a
+    ``customs_service.PortCalendar``) instead of re-parsing ``rule`` per day.
+    """
 
     candidates: List[ClearanceWindow] = []
 
@@ -128,7 +140,7 @@ def build_followup_candidates(
     ):
         lead_day = lead_deadline_local.date()
         lead_start_time, lead_end_time, lead_uses_rule = _get_operating_hours_for_date(
-            rule, lead_day
+            rule, lead_day, hours_for_date
         )
         lead_base_start = datetime.combine(lead_day, lead_start_time, tzinfo=tzinfo)
         lead_base_end = datetime.combine(lead_day, lead_end_time, tzinfo=tzinfo)
@@ -192,7 +204,7 @@ def build_followup_candidates(
         next_day = lead_day + timedelta(days=1)
         if next_day < event_local.date():
             next_start_time, next_end_time, next_uses_rule = _get_operating_hours_for_date(
-                rule, next_day
+                rule, next_day, hours_for_date
             )
             next_start = datetime.combine(next_day, next_start_time, tzinfo=tzinfo)
             next_end = datetime.combine(next_day, next_end_time, tzinfo=tzinfo)
@@ -237,7 +249,7 @@ def build_followup_candidates(
 
     same_day = event_local.date()
     same_start_time, same_end_time, same_uses_rule = _get_operating_hours_for_date(
-        rule, same_day
+        rule, same_day, hours_for_date
     )
     same_start = datetime.combine(same_day, same_start_time, tzinfo=tzinfo)
     same_end = datetime.combine(same_day, same_end_time, tzinfo=tzinfo)
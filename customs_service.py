@@ -0,0 +1,900 @@
+"""Data layer for the Customs Dashboard.
+
+Four pieces live here so the page only has to lay out the results:
+
+* ``customs_rules.csv`` compiled once into :class:`PortRule` records whose
+  weekly operating hours are parsed up front instead of on every lookup.
+* Concurrent, cross-session cached fetches of the FL3XX leg details (planning
+  note keywords) and customs migrations for every customs leg in a window.
+* A materialized per-port calendar of opening hours and notice deadlines, so
+  "which window must we clear in" and "is the port open at ETA" are interval
+  lookups. Calendars hang off the rule book and are dropped with it when the
+  CSV changes.
+* A batch pass computing the clearance target window for every leg.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from customs_deadline_utils import (
+    DAY_KEYS,
+    HoursForDate,
+    DEFAULT_BUSINESS_DAY_END,
+    DEFAULT_BUSINESS_DAY_START,
+    build_followup_candidates,
+    rule_hours_for_weekday,
+)
+from fl3xx_api import (
+    Fl3xxApiConfig,
+    PayloadCache,
+    fetch_flight_migration,
+    fetch_leg_details,
+    fetch_many,
+    unique_ids,
+)
+from flight_leg_utils import safe_parse_dt
+from zoneinfo_compat import ZoneInfo
+
+DEFAULT_CUSTOMS_RULES_PATH = Path(__file__).resolve().parent / "customs_rules.csv"
+DEFAULT_CUSTOMS_FETCH_WORKERS = 8
+# Leg notes rarely change within a shift; migration statuses flip as crews clear
+# customs, so they are only shared between sessions for a short while.
+LEG_DETAILS_CACHE_TTL_SECONDS = 600
+MIGRATION_CACHE_TTL_SECONDS = 60
+DEFAULT_CALENDAR_DAYS = 14
+# The dashboard's rolling start date adds a calendar key per day; keep the
+# most recently used few.
+CALENDAR_CACHE_SIZE = 8
+# Prior-window searches look back up to seven days before the event date.
+CALENDAR_LOOKBACK_DAYS = 8
+
+RULE_CODE_COLUMNS: Tuple[str, ...] = ("airport_icao", "Airport_icao", "airport")
+
+ARRIVAL_TIME_KEYS: Tuple[str, ...] = (
+    "arrivalTime",
+    "arrival_time",
+    "arr_time",
+    "eta",
+    "sta",
+    "scheduledArrival",
+)
+DEPARTURE_TIME_KEYS: Tuple[str, ...] = (
+    "departureTime",
+    "dep_time",
+    "std",
+    "scheduledDeparture",
+    "etd",
+)
+EVENT_TIME_KEYS: Tuple[str, ...] = ARRIVAL_TIME_KEYS + ("dep_time", "departureTime")
+TIMEZONE_KEYS: Tuple[str, ...] = (
+    "arrivalTimeZone",
+    "arrival_tz",
+    "arr_tz",
+    "dep_tz",
+    "departureTimeZone",
+)
+
+_HOURS_SUMMARY_LABELS: Tuple[str, ...] = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_UTC = ZoneInfo("UTC")
+
+ClearanceResult = Tuple[Optional[datetime], Optional[datetime], str, str]
+
+
+# ---------------------------------------------------------------------------
+# Compiled port rules
+# ---------------------------------------------------------------------------
+
+
+def parse_lead_time_hours(value: Any) -> Optional[float]:
+    """Return the first number in a lead-time cell such as ``"2"`` or ``"24 hrs"``."""
+
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        normalized = value.strip()
+        if not normalized:
+            return None
+        match = re.search(r"(\d+(?:\.\d+)?)", normalized)
+        if not match:
+            return None
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+
+def format_hours_summary(rule: Mapping[str, Any]) -> str:
+    """Return ``"Mon: 08:00-17:00; Tue: ..."`` for the populated day columns."""
+
+    segments: List[str] = []
+    for label, key in zip(_HOURS_SUMMARY_LABELS, DAY_KEYS):
+        value = rule.get(key)
+        if value is None:
+            continue
+        value_str = str(value).strip()
+        if not value_str or value_str.upper() == "NAN":
+            continue
+        segments.append(f"{label}: {value_str}")
+    return "; ".join(segments)
+
+
+class PortRule(Mapping):
+    """One customs rule row with its weekly operating hours parsed up front.
+
+    The rule still behaves as a read-only mapping of the original CSV row, so
+    code written against plain rule dicts (``rule.get("notes")``,
+    :func:`customs_deadline_utils.rule_hours_for_weekday`) keeps working.
+    ``weekly_hours`` holds one ``(open, close)`` interval or ``None`` per weekday,
+    Monday first.
+    """
+
+    __slots__ = ("code", "record", "weekly_hours", "lead_time_arrival_hours", "hours_summary")
+
+    def __init__(self, code: str, record: Mapping[str, Any]) -> None:
+        self.code = code
+        self.record: Dict[str, Any] = dict(record)
+        self.weekly_hours: Tuple[Optional[Tuple[time, time]], ...] = tuple(
+            rule_hours_for_weekday(self.record, weekday) for weekday in range(len(DAY_KEYS))
+        )
+        self.lead_time_arrival_hours = parse_lead_time_hours(self.record.get("lead_time_arrival_hours"))
+        self.hours_summary = format_hours_summary(self.record)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.record[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.record)
+
+    def __len__(self) -> int:
+        return len(self.record)
+
+    def __repr__(self) -> str:
+        return f"PortRule({self.code!r})"
+
+    def hours_for_weekday(self, weekday: int) -> Optional[Tuple[time, time]]:
+        if weekday < 0 or weekday >= len(self.weekly_hours):
+            return None
+        return self.weekly_hours[weekday]
+
+
+@dataclass
+class CustomsRuleBook:
+    """Compiled customs rules keyed by upper-case airport code."""
+
+    frame: pd.DataFrame
+    rules: Dict[str, PortRule] = field(default_factory=dict)
+    clearance_requirements: Dict[str, str] = field(default_factory=dict)
+    _calendars: "OrderedDict[Tuple[date, int], CustomsCalendar]" = field(default_factory=OrderedDict, repr=False)
+    _calendar_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def get(self, airport: Optional[str]) -> Optional[PortRule]:
+        if not airport:
+            return None
+        return self.rules.get(airport.upper())
+
+    def calendar(self, start: date, days: int = DEFAULT_CALENDAR_DAYS) -> "CustomsCalendar":
+        """Return the port calendar for ``days`` dates from ``start``, building it once."""
+
+        key = (start, days)
+        with self._calendar_lock:
+            calendar = self._calendars.get(key)
+            if calendar is None:
+                calendar = build_customs_calendar(self.rules, start, days)
+                self._calendars[key] = calendar
+                while len(self._calendars) > CALENDAR_CACHE_SIZE:
+                    self._calendars.popitem(last=False)
+            else:
+                self._calendars.move_to_end(key)
+        return calendar
+
+
+def _rule_code(record: Mapping[str, Any]) -> str:
+    for column in RULE_CODE_COLUMNS:
+        value = record.get(column)
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            continue
+        if value:
+            return str(value).strip().upper()
+    return ""
+
+
+def compile_customs_rules(frame: pd.DataFrame) -> CustomsRuleBook:
+    """Compile a customs rules sheet. Later rows for the same airport win."""
+
+    book = CustomsRuleBook(frame=frame)
+    if frame.empty:
+        return book
+    for record in frame.to_dict("records"):
+        code = _rule_code(record)
+        if not code:
+            continue
+        book.rules[code] = PortRule(code, record)
+        notes = record.get("notes")
+        if isinstance(notes, str):
+            book.clearance_requirements[code] = notes.strip()
+    return book
+
+
+def read_customs_rules(path: Path) -> pd.DataFrame:
+    try:
+        frame = pd.read_csv(path)
+    except FileNotFoundError:
+        return pd.DataFrame()
+    if frame.empty:
+        return frame
+    frame.columns = [str(col).strip() for col in frame.columns]
+    return frame
+
+
+_RULE_BOOK_CACHE: Dict[Path, Tuple[Tuple[int, int], CustomsRuleBook]] = {}
+_RULE_BOOK_LOCK = threading.Lock()
+
+
+def load_customs_rule_book(path: Path = DEFAULT_CUSTOMS_RULES_PATH) -> CustomsRuleBook:
+    """Return the compiled rule book for ``path``, recompiling only when the file changes."""
+
+    resolved = Path(path).resolve()
+    try:
+        stat = resolved.stat()
+    except FileNotFoundError:
+        return CustomsRuleBook(frame=pd.DataFrame())
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _RULE_BOOK_LOCK:
+        cached = _RULE_BOOK_CACHE.get(resolved)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    book = compile_customs_rules(read_customs_rules(resolved))
+    with _RULE_BOOK_LOCK:
+        _RULE_BOOK_CACHE[resolved] = (version, book)
+    return book
+
+
+def load_customs_calendar(
+    start: Optional[date] = None,
+    days: int = DEFAULT_CALENDAR_DAYS,
+    *,
+    path: Path = DEFAULT_CUSTOMS_RULES_PATH,
+) -> "CustomsCalendar":
+    """Return the calendar for the bundled rules, rebuilt whenever the CSV changes."""
+
+    return load_customs_rule_book(path).calendar(start or datetime.now(_UTC).date(), days)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent FL3XX payload fetches
+# ---------------------------------------------------------------------------
+
+_LEG_DETAILS = "leg_details"
+_MIGRATION = "migration"
+
+_LEG_DETAILS_CACHE = PayloadCache(LEG_DETAILS_CACHE_TTL_SECONDS)
+_MIGRATION_CACHE = PayloadCache(MIGRATION_CACHE_TTL_SECONDS)
+
+
+def clear_customs_payload_cache() -> None:
+    _LEG_DETAILS_CACHE.clear()
+    _MIGRATION_CACHE.clear()
+
+
+@dataclass
+class CustomsPayloads:
+    """Leg-detail and migration payloads for one dashboard load.
+
+    Payloads and errors are keyed by ``str(identifier)``.
+    """
+
+    leg_details: Dict[str, Any] = field(default_factory=dict)
+    migrations: Dict[str, Any] = field(default_factory=dict)
+    leg_detail_errors: Dict[str, Exception] = field(default_factory=dict)
+    migration_errors: Dict[str, Exception] = field(default_factory=dict)
+    requests: int = 0
+    cache_hits: int = 0
+
+
+def prefetch_customs_payloads(
+    config: Fl3xxApiConfig,
+    *,
+    quote_ids: Iterable[Any] = (),
+    flight_ids: Iterable[Any] = (),
+    max_workers: int = DEFAULT_CUSTOMS_FETCH_WORKERS,
+    fetch_leg_details_fn: Optional[Callable[..., Any]] = None,
+    fetch_migration_fn: Optional[Callable[..., Any]] = None,
+    leg_details_cache: Optional[PayloadCache] = _LEG_DETAILS_CACHE,
+    migration_cache: Optional[PayloadCache] = _MIGRATION_CACHE,
+) -> CustomsPayloads:
+    """Fetch every leg-detail and migration payload the dashboard needs at once.
+
+    Identifiers are de-duplicated, cached payloads younger than the cache TTL
+    are reused across sessions, and the rest are requested concurrently with
+    one ``requests.Session`` per worker thread. Failures are collected rather
+    than raised so one bad flight does not hide the rest of the window.
+    """
+
+    fetch_leg_details_fn = fetch_leg_details_fn or fetch_leg_details
+    fetch_migration_fn = fetch_migration_fn or fetch_flight_migration
+    payloads = CustomsPayloads()
+    base_url = str(config.base_url)
+    jobs: List[Tuple[str, str]] = []
+    for kind, identifiers, cache, target in (
+        (_LEG_DETAILS, quote_ids, leg_details_cache, payloads.leg_details),
+        (_MIGRATION, flight_ids, migration_cache, payloads.migrations),
+    ):
+        for identifier in unique_ids(identifiers):
+            hit, payload = cache.get((kind, base_url, identifier)) if cache is not None else (False, None)
+            if hit:
+                target[identifier] = payload
+                payloads.cache_hits += 1
+            else:
+                jobs.append((kind, identifier))
+
+    def _fetch(job: Tuple[str, str], http: Any) -> Any:
+        kind, identifier = job
+        fetch_fn = fetch_leg_details_fn if kind == _LEG_DETAILS else fetch_migration_fn
+        return fetch_fn(config, identifier, session=http)
+
+    results = fetch_many(jobs, _fetch, max_workers=max_workers)
+    payloads.requests = len(jobs)
+    for (kind, identifier), (ok, value) in results.items():
+        is_leg = kind == _LEG_DETAILS
+        if not ok:
+            (payloads.leg_detail_errors if is_leg else payloads.migration_errors)[identifier] = value
+            continue
+        (payloads.leg_details if is_leg else payloads.migrations)[identifier] = value
+        cache = leg_details_cache if is_leg else migration_cache
+        if cache is not None:
+            cache.set((kind, base_url, identifier), value)
+    return payloads
+
+
+# ---------------------------------------------------------------------------
+# Port calendars
+# ---------------------------------------------------------------------------
+
+
+class PortCalendar:
+    """Opening hours of one port materialized for every date in a range.
+
+    Open intervals are stored as naive local wall-clock datetimes in date
+    order, so prior-window searches are a bisect instead of a walk over
+    weekdays. Dates outside the range fall back to the rule's weekly hours,
+    so answers never depend on where the range ends.
+    """
+
+    __slots__ = ("rule", "first_day", "last_day", "_hours", "_opens", "_open_days")
+
+    def __init__(self, rule: PortRule, first_day: date, last_day: date) -> None:
+        self.rule = rule
+        self.first_day = first_day
+        self.last_day = last_day
+        hours: List[Optional[Tuple[time, time]]] = []
+        self._opens: List[datetime] = []
+        self._open_days: List[date] = []
+        day = first_day
+        while day <= last_day:
+            day_hours = rule.hours_for_weekday(day.weekday())
+            hours.append(day_hours)
+            if day_hours:
+                self._opens.append(datetime.combine(day, day_hours[0]))
+                self._open_days.append(day)
+            day += timedelta(days=1)
+        self._hours = tuple(hours)
+
+    @property
+    def code(self) -> str:
+        return self.rule.code
+
+    def hours_on(self, day: date) -> Optional[Tuple[time, time]]:
+        """Return the ``(open, close)`` local hours on ``day``, or ``None`` when closed."""
+
+        if self.first_day <= day <= self.last_day:
+            return self._hours[(day - self.first_day).days]
+        return self.rule.hours_for_weekday(day.weekday())
+
+    def is_open_at(self, local_dt: datetime) -> Optional[bool]:
+        """Return whether the port is open at ``local_dt`` (port-local time).
+
+        ``None`` means the rule lists no hours for any day, so nothing is known.
+        """
+
+        if not any(self.rule.weekly_hours):
+            return None
+        hours = self.hours_on(local_dt.date())
+        if not hours:
+            return False
+        wall_clock = local_dt.time().replace(second=0, microsecond=0, tzinfo=None)
+        return hours[0] <= wall_clock <= hours[1]
+
+    def notice_deadline(self, event_local: datetime) -> Optional[datetime]:
+        """Return when arrival notice is due for an arrival at ``event_local``."""
+
+        return lead_deadline(event_local, self.rule.lead_time_arrival_hours)
+
+    def window_before(self, reference_local: datetime, *, allow_same_day: bool) -> Tuple[date, time, time]:
+        """Same answer as :func:`find_operating_window_before` for this port's rule."""
+
+        reference = reference_local.replace(tzinfo=None)
+        reference_date = reference.date()
+        earliest = reference_date - timedelta(days=7)
+        if earliest < self.first_day or reference_date > self.last_day:
+            return find_operating_window_before(reference_local, self.rule, allow_same_day=allow_same_day)
+
+        if allow_same_day:
+            index = bisect_right(self._opens, reference) - 1
+        else:
+            index = bisect_left(self._opens, datetime.combine(reference_date, time.min)) - 1
+        if index < 0 or self._open_days[index] < earliest:
+            return _default_window_before(reference_local, allow_same_day=allow_same_day)
+
+        candidate_date = self._open_days[index]
+        start_time, end_time = self._hours[(candidate_date - self.first_day).days]
+        if candidate_date == reference_date and reference.time() < end_time:
+            end_time = reference.time()
+        if end_time <= start_time:
+            end_time = start_time
+        return candidate_date, start_time, end_time
+
+
+@dataclass
+class CustomsCalendar:
+    """Per-port calendars covering ``first_day`` to ``last_day`` inclusive."""
+
+    first_day: date
+    last_day: date
+    ports: Dict[str, PortCalendar] = field(default_factory=dict)
+
+    def get(self, airport: Optional[str]) -> Optional[PortCalendar]:
+        if not airport:
+            return None
+        return self.ports.get(airport.upper())
+
+    def open_ports(self, local_times: Mapping[str, datetime]) -> Dict[str, Optional[bool]]:
+        """Return ``{airport: is_open_at(local_time)}`` for each airport with a calendar."""
+
+        return {
+            airport: calendar.is_open_at(local_time)
+            for airport, local_time in local_times.items()
+            if (calendar := self.get(airport)) is not None
+        }
+
+
+def build_customs_calendar(
+    rules: Mapping[str, PortRule],
+    start: date,
+    days: int = DEFAULT_CALENDAR_DAYS,
+) -> CustomsCalendar:
+    """Materialize every port's hours from ``CALENDAR_LOOKBACK_DAYS`` before ``start`` to ``start + days``."""
+
+    first_day = start - timedelta(days=CALENDAR_LOOKBACK_DAYS)
+    last_day = start + timedelta(days=days)
+    return CustomsCalendar(
+        first_day=first_day,
+        last_day=last_day,
+        ports={
+            code: PortCalendar(rule, first_day, last_day)
+            for code, rule in rules.items()
+            if isinstance(rule, PortRule)
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Clearance windows
+# ---------------------------------------------------------------------------
+
+
+def extract_airport_timezone(airport_code: str, lookup: Mapping[str, Mapping[str, Any]]) -> Optional[str]:
+    if not airport_code:
+        return None
+    record = lookup.get(airport_code)
+    if not isinstance(record, Mapping):
+        return None
+    tz_value = record.get("tz")
+    if isinstance(tz_value, str) and tz_value.strip():
+        return tz_value.strip()
+    return None
+
+
+def candidate_timezone_from_row(row: Mapping[str, Any]) -> Optional[str]:
+    for key in TIMEZONE_KEYS:
+        value = row.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _first_parsed(row: Mapping[str, Any], keys: Sequence[str], parse: Callable[[str], Optional[datetime]]) -> Optional[datetime]:
+    for key in keys:
+        raw_value = row.get(key)
+        if not raw_value:
+            continue
+        parsed = parse(str(raw_value))
+        if parsed is not None:
+            return parsed
+    return None
+
+
+def _parse_or_none(value: str) -> Optional[datetime]:
+    try:
+        return safe_parse_dt(value)
+    except Exception:
+        return None
+
+
+def extract_arrival_dt(row: Mapping[str, Any]) -> Optional[datetime]:
+    return _first_parsed(row, ARRIVAL_TIME_KEYS, _parse_or_none)
+
+
+def extract_departure_dt(row: Mapping[str, Any]) -> Optional[datetime]:
+    return _first_parsed(row, DEPARTURE_TIME_KEYS, _parse_or_none)
+
+
+def _previous_business_day(reference: date) -> date:
+    candidate = reference - timedelta(days=1)
+    while candidate.weekday() >= 5:  # 5=Saturday, 6=Sunday
+        candidate -= timedelta(days=1)
+    return candidate
+
+
+def _rule_hours(rule: Optional[Mapping[str, Any]], weekday: int) -> Optional[Tuple[time, time]]:
+    if isinstance(rule, PortRule):
+        return rule.hours_for_weekday(weekday)
+    return rule_hours_for_weekday(rule, weekday)
+
+
+def _weekly_hours_for_date(rule: PortRule) -> HoursForDate:
+    return lambda day: rule.hours_for_weekday(day.weekday())
+
+
+def _rule_lead_hours(rule: Optional[Mapping[str, Any]]) -> Optional[float]:
+    if isinstance(rule, PortRule):
+        return rule.lead_time_arrival_hours
+    return parse_lead_time_hours(rule.get("lead_time_arrival_hours"))
+
+
+def find_operating_window_before(
+    reference_local: datetime,
+    rule: Optional[Mapping[str, Any]],
+    *,
+    allow_same_day: bool,
+) -> Tuple[date, time, time]:
+    """Return the last port window ending at or before ``reference_local``.
+
+    Without a rule (or with a port closed all week) the default business day
+    is used, skipping weekends.
+    """
+
+    reference_date = reference_local.date()
+    reference_time = reference_local.time()
+
+    if isinstance(rule, Mapping):
+        start_offset = 0 if allow_same_day else 1
+        for offset in range(start_offset, 8):
+            candidate_date = reference_date - timedelta(days=offset)
+            hours = _rule_hours(rule, candidate_date.weekday())
+            if not hours:
+                continue
+            start_time, end_time = hours
+            if offset == 0:
+                if reference_time < start_time:
+                    continue
+                if reference_time < end_time:
+                    end_time = reference_time
+            if end_time <= start_time:
+                end_time = start_time
+            return candidate_date, start_time, end_time
+
+    return _default_window_before(reference_local, allow_same_day=allow_same_day)
+
+
+def _default_window_before(reference_local: datetime, *, allow_same_day: bool) -> Tuple[date, time, time]:
+    reference_date = reference_local.date()
+    reference_time = reference_local.time()
+
+    if allow_same_day:
+        fallback_date = reference_date
+        fallback_start = DEFAULT_BUSINESS_DAY_START
+        fallback_end = DEFAULT_BUSINESS_DAY_END
+        if fallback_date.weekday() >= 5 or reference_time < fallback_start:
+            fallback_date = _previous_business_day(reference_date)
+        else:
+            fallback_end = min(reference_time, fallback_end)
+            if fallback_end <= fallback_start:
+                fallback_end = fallback_start
+            return fallback_date, fallback_start, fallback_end
+
+        return fallback_date, fallback_start, fallback_end
+
+    target_date = _previous_business_day(reference_date)
+    return target_date, DEFAULT_BUSINESS_DAY_START, DEFAULT_BUSINESS_DAY_END
+
+
+def lead_deadline(event_local: datetime, lead_hours: Optional[float]) -> Optional[datetime]:
+    """Return when notice is due for an arrival at ``event_local``, if the port sets a lead time."""
+
+    if not (lead_hours and lead_hours > 0):
+        return None
+    tzinfo = event_local.tzinfo or _UTC
+    deadline = event_local - timedelta(hours=lead_hours)
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=tzinfo)
+    try:
+        return deadline.astimezone(tzinfo)
+    except Exception:
+        return deadline
+
+
+def _format_local(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M %Z")
+
+
+def _clearance_window(
+    event_local: datetime,
+    rule: Optional[Mapping[str, Any]],
+    arrival_status: str,
+    now: datetime,
+    departure_dt: Callable[[], Optional[datetime]],
+    port_calendar: Optional[PortCalendar] = None,
+) -> ClearanceResult:
+    tzinfo = event_local.tzinfo or _UTC
+    lead_hours: Optional[float] = None
+    lead_deadline_local: Optional[datetime] = None
+    if isinstance(rule, Mapping):
+        lead_hours = _rule_lead_hours(rule)
+        lead_deadline_local = lead_deadline(event_local, lead_hours)
+
+    hours_for_date: Optional[HoursForDate] = None
+    if port_calendar is not None:
+        window_before = port_calendar.window_before
+        hours_for_date = port_calendar.hours_on
+    else:
+
+        def window_before(reference_local: datetime, *, allow_same_day: bool) -> Tuple[date, time, time]:
+            return find_operating_window_before(reference_local, rule, allow_same_day=allow_same_day)
+
+        if isinstance(rule, PortRule):
+            hours_for_date = _weekly_hours_for_date(rule)
+
+    target_date, window_start_time, window_end_time = window_before(event_local, allow_same_day=False)
+    start_local = datetime.combine(target_date, window_start_time, tzinfo=tzinfo)
+    end_local = datetime.combine(target_date, window_end_time, tzinfo=tzinfo)
+    timing_label = "Prior Day"
+    deadline_port_closed = False
+
+    if isinstance(lead_deadline_local, datetime):
+        if lead_deadline_local < start_local:
+            target_date, window_start_time, window_end_time = window_before(
+                lead_deadline_local,
+                allow_same_day=True,
+            )
+            start_local = datetime.combine(target_date, window_start_time, tzinfo=tzinfo)
+            end_local = datetime.combine(target_date, window_end_time, tzinfo=tzinfo)
+            if end_local > lead_deadline_local:
+                end_local = lead_deadline_local
+            timing_label = "Lead Time"
+            deadline_port_closed = start_local.date() != lead_deadline_local.date()
+        elif lead_deadline_local < end_local:
+            end_local = lead_deadline_local
+
+    goal_summary_parts: List[str] = []
+    if timing_label == "Lead Time":
+        if lead_hours:
+            goal_summary_parts.append(
+                f"Lead time requirement {lead_hours:g}h prior to arrival "
+                f"(deadline {_format_local(lead_deadline_local)})."
+            )
+        goal_summary_parts.append(
+            f"Last port window before deadline: {_format_local(start_local)} → {_format_local(end_local)}."
+        )
+        if deadline_port_closed:
+            goal_summary_parts.append(
+                "Port unavailable at deadline; window pulled from previous operating day."
+            )
+    else:
+        goal_summary_parts.append(
+            f"Prior operating window: {_format_local(start_local)} → {_format_local(end_local)}."
+        )
+        if isinstance(lead_deadline_local, datetime) and lead_hours:
+            goal_summary_parts.append(
+                f"Lead time ({lead_hours:g}h) deadline {_format_local(lead_deadline_local)}."
+            )
+
+    goal_summary = " ".join(goal_summary_parts)
+
+    normalized_status = (arrival_status or "").strip().upper()
+    if normalized_status != "OK" and now > end_local:
+        departure = departure_dt()
+        departure_local: Optional[datetime] = None
+        if isinstance(departure, datetime):
+            if departure.tzinfo is None:
+                departure = departure.replace(tzinfo=_UTC)
+            try:
+                departure_local = departure.astimezone(tzinfo)
+            except Exception:
+                departure_local = departure
+
+        fallback_candidates = build_followup_candidates(
+            event_local=event_local,
+            tzinfo=tzinfo,
+            rule=rule,
+            lead_deadline_local=lead_deadline_local,
+            lead_hours=lead_hours,
+            departure_local=departure_local,
+            hours_for_date=hours_for_date,
+        )
+
+        if fallback_candidates:
+            selected = fallback_candidates[-1]
+            for candidate in fallback_candidates:
+                if now <= candidate.end:
+                    selected = candidate
+                    break
+
+            start_local = selected.start
+            end_local = selected.end
+            goal_summary = selected.summary
+            timing_label = selected.label
+
+    return start_local, end_local, goal_summary, timing_label
+
+
+class _ZoneCache:
+    """Resolve time zone names once per batch; unknown names map to ``None``."""
+
+    def __init__(self) -> None:
+        self._zones: Dict[str, Optional[ZoneInfo]] = {}
+
+    def __call__(self, name: Optional[str]) -> Optional[ZoneInfo]:
+        if not name:
+            return None
+        if name not in self._zones:
+            try:
+                self._zones[name] = ZoneInfo(name)
+            except Exception:
+                self._zones[name] = None
+        return self._zones[name]
+
+
+def _localize(event_dt: datetime, zone: Optional[ZoneInfo]) -> datetime:
+    if zone is not None:
+        try:
+            return event_dt.astimezone(zone)
+        except Exception:
+            pass
+    if event_dt.tzinfo is None:
+        event_dt = event_dt.replace(tzinfo=_UTC)
+    return event_dt.astimezone(_UTC)
+
+
+def _clearance_windows(
+    legs: Iterable[Tuple[Mapping[str, Any], str, str, str, Optional[Mapping[str, Any]]]],
+    lookup: Mapping[str, Mapping[str, Any]],
+    now: Optional[datetime],
+    calendar: Optional[CustomsCalendar],
+) -> List[ClearanceResult]:
+    now = now or datetime.now(_UTC)
+    parsed: Dict[str, Optional[datetime]] = {}
+
+    def parse(value: str) -> Optional[datetime]:
+        if value not in parsed:
+            parsed[value] = _parse_or_none(value)
+        return parsed[value]
+
+    zones = _ZoneCache()
+    airport_zones: Dict[str, Optional[str]] = {}
+
+    def airport_tz(code: str) -> Optional[str]:
+        if code not in airport_zones:
+            airport_zones[code] = extract_airport_timezone(code, lookup)
+        return airport_zones[code]
+
+    results: List[ClearanceResult] = []
+    for row, dep_airport, arr_airport, arrival_status, rule in legs:
+        event_dt = _first_parsed(row, EVENT_TIME_KEYS, parse)
+        if event_dt is None:
+            results.append((None, None, "", "Unknown"))
+            continue
+        tz_name = airport_tz(arr_airport) or candidate_timezone_from_row(row) or airport_tz(dep_airport)
+        event_local = _localize(event_dt, zones(tz_name))
+        port_calendar = calendar.get(rule.code) if calendar is not None and isinstance(rule, PortRule) else None
+        if port_calendar is not None and port_calendar.rule is not rule:
+            port_calendar = None
+        results.append(
+            _clearance_window(
+                event_local,
+                rule,
+                arrival_status,
+                now,
+                lambda row=row: _first_parsed(row, DEPARTURE_TIME_KEYS, parse),
+                port_calendar,
+            )
+        )
+    return results
+
+
+def compute_clearance_windows(
+    legs: Sequence[Tuple[Mapping[str, Any], str, str, str]],
+    lookup: Mapping[str, Mapping[str, Any]],
+    rules: Mapping[str, Mapping[str, Any]],
+    *,
+    now: Optional[datetime] = None,
+    calendar: Optional[CustomsCalendar] = None,
+) -> List[ClearanceResult]:
+    """Return ``(start, end, goal, timing)`` clearance targets for every leg.
+
+    ``legs`` holds ``(row, dep_airport, arr_airport, arrival_status)`` tuples
+    and ``rules`` maps upper-case airport codes to rules (usually
+    :attr:`CustomsRuleBook.rules`). Timestamps are parsed once per distinct
+    value, airport time zones are resolved once per airport, and every leg is
+    judged against the same ``now``. With a ``calendar`` built from the same
+    rules, port windows come from its precomputed intervals.
+    """
+
+    return _clearance_windows(
+        (
+            (row, dep_airport, arr_airport, status, rules.get(arr_airport.upper()) if arr_airport else None)
+            for row, dep_airport, arr_airport, status in legs
+        ),
+        lookup,
+        now,
+        calendar,
+    )
+
+
+def compute_clearance_window(
+    row: Mapping[str, Any],
+    dep_airport: str,
+    arr_airport: str,
+    lookup: Mapping[str, Mapping[str, Any]],
+    rule: Optional[Mapping[str, Any]],
+    arrival_status: str,
+    *,
+    now: Optional[datetime] = None,
+) -> ClearanceResult:
+    """Single-leg form of :func:`compute_clearance_windows` with an explicit rule."""
+
+    return _clearance_windows([(row, dep_airport, arr_airport, arrival_status, rule)], lookup, now, None)[0]
+
+
+__all__ = [
+    "ClearanceResult",
+    "CustomsCalendar",
+    "CustomsPayloads",
+    "CustomsRuleBook",
+    "CALENDAR_CACHE_SIZE",
+    "DEFAULT_CALENDAR_DAYS",
+    "DEFAULT_CUSTOMS_FETCH_WORKERS",
+    "DEFAULT_CUSTOMS_RULES_PATH",
+    "PortCalendar",
+    "PortRule",
+    "build_customs_calendar",
+    "candidate_timezone_from_row",
+    "clear_customs_payload_cache",
+    "compile_customs_rules",
+    "compute_clearance_window",
+    "compute_clearance_windows",
+    "extract_airport_timezone",
+    "extract_arrival_dt",
+    "extract_departure_dt",
+    "find_operating_window_before",
+    "format_hours_summary",
+    "lead_deadline",
+    "load_customs_calendar",
+    "load_customs_rule_book",
+    "parse_lead_time_hours",
+    "prefetch_customs_payloads",
+    "read_customs_rules",
+]
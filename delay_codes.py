@@ -1,16 +1,38 @@
-"""Utilities for evaluating delay codes in FL3XX postflight data."""
+"""Utilities for evaluating delay codes in FL3XX postflight data.
+
+Postflights are only requested for flights that meet the delay threshold, and
+concurrently. Delay reasons stop changing once a flight is closed out, so a
+:class:`DelayRecordStore` keeps them on disk and multi-week windows only reach
+FL3XX for the flights that are still open.
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+import pandas as pd
 import requests
 
-from fl3xx_api import Fl3xxApiConfig, fetch_flights, fetch_postflight
+from fl3xx_api import (
+    Fl3xxApiConfig,
+    JsonFileStore,
+    fetch_flights,
+    fetch_many,
+    fetch_postflight,
+    instance_key,
+    unique_ids,
+)
 from flight_leg_utils import safe_parse_dt
 
+DEFAULT_POSTFLIGHT_WORKERS = 8
+DEFAULT_DELAY_RECORD_ROOT = Path(__file__).resolve().parent / "data" / "delay_records"
+MISSING_REASON_LABEL = "(no reason entered)"
+
+_REASON_PHASES = ("off_block", "takeoff", "landing", "on_block")
+
 
 @dataclass(frozen=True)
 class DelayCodeRecord:
@@ -55,6 +77,70 @@ class DelayCodeRecord:
         }
 
 
+def fetch_postflights(
+    config: Fl3xxApiConfig,
+    flight_ids: Iterable[Any],
+    *,
+    max_workers: int = DEFAULT_POSTFLIGHT_WORKERS,
+    session: Optional[requests.Session] = None,
+    fetch_postflight_fn: Optional[Callable[..., Any]] = None,
+) -> Dict[str, Tuple[bool, Any]]:
+    """Fetch postflight payloads through :func:`fl3xx_api.fetch_many`.
+
+    Returns ``{str(flight_id): (ok, payload_or_exception)}`` in request order.
+    """
+
+    fetch_postflight_fn = fetch_postflight_fn or fetch_postflight
+    return fetch_many(
+        unique_ids(flight_ids),
+        lambda flight_id, http: fetch_postflight_fn(config, flight_id, session=http),
+        max_workers=max_workers,
+        session=session,
+    )
+
+
+class DelayRecordStore(JsonFileStore):
+    """Delay reasons of closed-out flights, persisted as one JSON file.
+
+    Reasons are entered during postflight closeout and do not change after it,
+    so once a flight is closed out its reasons are read from here instead of
+    requesting the postflight again.
+    """
+
+    @classmethod
+    def for_instance(cls, base_url: Optional[str] = None, root: Path = DEFAULT_DELAY_RECORD_ROOT) -> "DelayRecordStore":
+        """Return the store for one FL3XX instance."""
+
+        return cls(root / f"{instance_key(base_url)}.json")
+
+    def get_many(self, flight_ids: Iterable[Any]) -> Dict[str, Dict[str, List[str]]]:
+        """Return stored reasons for the requested flights that have an entry."""
+
+        found: Dict[str, Dict[str, List[str]]] = {}
+        with self._lock:
+            entries = self._load()
+            for flight_id in unique_ids(flight_ids):
+                entry = entries.get(flight_id)
+                if isinstance(entry, dict) and isinstance(entry.get("reasons"), dict):
+                    found[flight_id] = {phase: list(entry["reasons"].get(phase, [])) for phase in _REASON_PHASES}
+        return found
+
+    def update(self, reasons: Mapping[str, Mapping[str, Sequence[str]]]) -> None:
+        """Record closed-out flights' reasons and write the file atomically."""
+
+        if not reasons:
+            return
+        stored_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            entries = self._load()
+            for flight_id, phases in reasons.items():
+                entries[str(flight_id)] = {
+                    "reasons": {phase: list(phases.get(phase, [])) for phase in _REASON_PHASES},
+                    "stored_at": stored_at,
+                }
+            self._save()
+
+
 def collect_delay_code_records(
     config: Fl3xxApiConfig,
     target_date: date,
@@ -62,145 +148,245 @@ def collect_delay_code_records(
     delay_threshold_min: int = 15,
     fetch_flights_fn=fetch_flights,
     fetch_postflight_fn=fetch_postflight,
+    store: Optional[DelayRecordStore] = None,
+    max_workers: int = DEFAULT_POSTFLIGHT_WORKERS,
 ) -> Tuple[List[DelayCodeRecord], Dict[str, Any], Dict[str, Any]]:
     """Return flights with delay codes for a given day."""
 
-    from_date = target_date
-    to_date = target_date + timedelta(days=1)
+    return collect_delay_code_history(
+        config,
+        target_date,
+        target_date,
+        delay_threshold_min=delay_threshold_min,
+        fetch_flights_fn=fetch_flights_fn,
+        fetch_postflight_fn=fetch_postflight_fn,
+        store=store,
+        max_workers=max_workers,
+    )
+
+
+def collect_delay_code_history(
+    config: Fl3xxApiConfig,
+    start_date: date,
+    end_date: date,
+    *,
+    delay_threshold_min: int = 15,
+    fetch_flights_fn=fetch_flights,
+    fetch_postflight_fn=fetch_postflight,
+    store: Optional[DelayRecordStore] = None,
+    max_workers: int = DEFAULT_POSTFLIGHT_WORKERS,
+) -> Tuple[List[DelayCodeRecord], Dict[str, Any], Dict[str, Any]]:
+    """Return flights with delay codes departing between two dates, inclusive.
+
+    Postflights are fetched concurrently, and only for delayed flights that
+    ``store`` does not already hold. Only flights whose postflight is closed
+    out are written back to ``store``; open ones are fetched again next time.
+    """
 
-    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+    flights, metadata = fetch_flights_fn(config, from_date=start_date, to_date=end_date + timedelta(days=1))
 
     diagnostics: Dict[str, Any] = {
         "total_flights": len(flights),
         "started_flights": 0,
         "flagged_flights": 0,
+        "postflight_requests": 0,
+        "postflight_from_store": 0,
         "postflight_errors": 0,
         "postflight_error_messages": [],
     }
 
-    records: List[DelayCodeRecord] = []
-    session: Optional[requests.Session] = None
-
-    try:
-        for flight in flights:
-            if not _has_real_activity(flight):
-                continue
-            diagnostics["started_flights"] += 1
-
-            block_off_est = _extract_datetime_value(
-                flight,
-                (
-                    "blocksoffestimated",
-                    "blockOffEstUTC",
-                ),
-            )
-            block_on_est = _extract_datetime_value(
-                flight,
-                (
-                    "blocksonestimated",
-                    "blockOnEstUTC",
-                ),
-            )
-            real_out = _extract_datetime_value(flight, ("realDateOUT",))
-            real_off = _extract_datetime_value(flight, ("realDateOFF",))
-            real_on = _extract_datetime_value(flight, ("realDateON",))
-            real_in = _extract_datetime_value(flight, ("realDateIN",))
-
-            off_block_delay_min = _compute_max_delay_minutes(
-                block_off_est,
-                [real_out, real_off],
-            )
-            on_block_delay_min = _compute_max_delay_minutes(
-                block_on_est,
-                [real_on, real_in],
-            )
+    flagged: List[Tuple[Mapping[str, Any], Dict[str, Optional[datetime]], Optional[int], Optional[int]]] = []
+    for flight in flights:
+        if not _has_real_activity(flight):
+            continue
+        diagnostics["started_flights"] += 1
+
+        times = _extract_flight_times(flight)
+        off_block_delay_min = _compute_max_delay_minutes(
+            times["block_off_est"],
+            [times["real_out"], times["real_off"]],
+        )
+        on_block_delay_min = _compute_max_delay_minutes(
+            times["block_on_est"],
+            [times["real_on"], times["real_in"]],
+        )
+
+        has_delay = _delay_meets_threshold(off_block_delay_min, delay_threshold_min) or _delay_meets_threshold(
+            on_block_delay_min,
+            delay_threshold_min,
+        )
+        if not has_delay:
+            continue
 
-            has_delay = _delay_meets_threshold(off_block_delay_min, delay_threshold_min) or _delay_meets_threshold(
-                on_block_delay_min,
-                delay_threshold_min,
-            )
-            if not has_delay:
-                continue
+        diagnostics["flagged_flights"] += 1
+        flagged.append((flight, times, off_block_delay_min, on_block_delay_min))
 
-            diagnostics["flagged_flights"] += 1
+    flight_ids = [flight.get("flightId") for flight, *_ in flagged]
+    stored = store.get_many(flight_ids) if store is not None else {}
+    to_fetch = [flight_id for flight_id in unique_ids(flight_ids) if flight_id not in stored]
+    fetched = fetch_postflights(
+        config,
+        to_fetch,
+        max_workers=max_workers,
+        fetch_postflight_fn=fetch_postflight_fn,
+    )
+    diagnostics["postflight_requests"] = len(to_fetch)
 
-            flight_id = flight.get("flightId")
-            postflight_payload: Any = None
-            if flight_id is not None:
-                if session is None:
-                    session = requests.Session()
-                try:
-                    postflight_payload = fetch_postflight_fn(config, flight_id, session=session)
-                except Exception as exc:  # pragma: no cover - network/runtime issues
+    records: List[DelayCodeRecord] = []
+    closed_out: Dict[str, Dict[str, List[str]]] = {}
+    for flight, times, off_block_delay_min, on_block_delay_min in flagged:
+        flight_id = flight.get("flightId")
+        key = str(flight_id) if flight_id not in (None, "") else None
+        postflight_payload: Any = None
+        if key in stored:
+            reasons = stored[key]
+            diagnostics["postflight_from_store"] += 1
+        else:
+            if key is not None:
+                ok, value = fetched[key]
+                if ok:
+                    postflight_payload = value
+                else:
                     diagnostics["postflight_errors"] += 1
-                    diagnostics["postflight_error_messages"].append(str(exc))
-
+                    diagnostics["postflight_error_messages"].append(str(value))
             reasons = _extract_delay_reasons(postflight_payload)
+            if postflight_payload is not None and flight.get("postFlightClosed") is True:
+                closed_out[key] = reasons
 
-            off_block_reason_status = _reason_status(
+        records.append(
+            _build_record(
+                flight,
+                times,
                 off_block_delay_min,
-                delay_threshold_min,
-                reasons["off_block"] + reasons["takeoff"],
-            )
-            on_block_reason_status = _reason_status(
                 on_block_delay_min,
+                reasons,
                 delay_threshold_min,
-                reasons["landing"] + reasons["on_block"],
             )
+        )
 
-            record = DelayCodeRecord(
-                flight_id=_coerce_int(flight.get("flightId")),
-                quote_id=_coerce_int(flight.get("quoteId")),
-                booking_reference=_coerce_str(
-                    flight.get("bookingIdentifier")
-                    or flight.get("bookingReference")
-                ),
-                account_name=_coerce_str(
-                    flight.get("accountName")
-                    or flight.get("account")
-                    or flight.get("account_name")
-                    or flight.get("owner")
-                    or flight.get("ownerName")
-                    or flight.get("customer")
-                    or flight.get("customerName")
-                    or flight.get("client")
-                    or flight.get("clientName")
-                ),
-                flight_reference=_coerce_str(flight.get("flightNumberCompany") or flight.get("flightNumber")),
-                tail_number=_coerce_str(
-                    flight.get("registrationNumber")
-                    or flight.get("tail")
-                    or flight.get("tailNumber")
-                ),
-                airport_from=_coerce_str(flight.get("airportFrom")),
-                airport_to=_coerce_str(flight.get("airportTo")),
-                block_off_est=block_off_est,
-                block_on_est=block_on_est,
-                real_out=real_out,
-                real_off=real_off,
-                real_on=real_on,
-                real_in=real_in,
-                off_block_delay_min=off_block_delay_min,
-                on_block_delay_min=on_block_delay_min,
-                off_block_reasons=reasons["off_block"],
-                takeoff_reasons=reasons["takeoff"],
-                landing_reasons=reasons["landing"],
-                on_block_reasons=reasons["on_block"],
-                off_block_reason_status=off_block_reason_status,
-                on_block_reason_status=on_block_reason_status,
-            )
-            records.append(record)
-    finally:
-        if session is not None:
-            try:
-                session.close()
-            except AttributeError:  # pragma: no cover - defensive cleanup
-                pass
+    if store is not None:
+        store.update(closed_out)
 
     records.sort(key=lambda item: (item.block_off_est or datetime.min))
     return records, metadata, diagnostics
 
 
+def summarize_delay_reasons(records: Sequence[DelayCodeRecord], delay_threshold_min: int = 15) -> pd.DataFrame:
+    """Count delayed flights per week, phase and reason.
+
+    Departure delays use the off-block and takeoff reasons, arrival delays the
+    landing and on-block ones. A delayed phase without any reason is counted
+    under :data:`MISSING_REASON_LABEL`.
+    """
+
+    rows: List[Tuple[str, str, str]] = []
+    for record in records:
+        if record.block_off_est is None:
+            continue
+        day = record.block_off_est.date()
+        week = (day - timedelta(days=day.weekday())).isoformat()
+        phases = (
+            ("Departure", record.off_block_delay_min, record.off_block_reasons + record.takeoff_reasons),
+            ("Arrival", record.on_block_delay_min, record.landing_reasons + record.on_block_reasons),
+        )
+        for phase, delay_minutes, reasons in phases:
+            if not _delay_meets_threshold(delay_minutes, delay_threshold_min):
+                continue
+            for reason in _dedupe_keep_order(reasons) or [MISSING_REASON_LABEL]:
+                rows.append((week, phase, reason))
+
+    columns = ["Week", "Phase", "Reason"]
+    if not rows:
+        return pd.DataFrame(columns=columns + ["Flights"])
+    frame = pd.DataFrame(rows, columns=columns)
+    return frame.groupby(columns, sort=True).size().reset_index(name="Flights")
+
+
+def _extract_flight_times(flight: Mapping[str, Any]) -> Dict[str, Optional[datetime]]:
+    return {
+        "block_off_est": _extract_datetime_value(
+            flight,
+            (
+                "blocksoffestimated",
+                "blockOffEstUTC",
+            ),
+        ),
+        "block_on_est": _extract_datetime_value(
+            flight,
+            (
+                "blocksonestimated",
+                "blockOnEstUTC",
+            ),
+        ),
+        "real_out": _extract_datetime_value(flight, ("realDateOUT",)),
+        "real_off": _extract_datetime_value(flight, ("realDateOFF",)),
+        "real_on": _extract_datetime_value(flight, ("realDateON",)),
+        "real_in": _extract_datetime_value(flight, ("realDateIN",)),
+    }
+
+
+def _build_record(
+    flight: Mapping[str, Any],
+    times: Mapping[str, Optional[datetime]],
+    off_block_delay_min: Optional[int],
+    on_block_delay_min: Optional[int],
+    reasons: Mapping[str, List[str]],
+    delay_threshold_min: int,
+) -> DelayCodeRecord:
+    off_block_reason_status = _reason_status(
+        off_block_delay_min,
+        delay_threshold_min,
+        reasons["off_block"] + reasons["takeoff"],
+    )
+    on_block_reason_status = _reason_status(
+        on_block_delay_min,
+        delay_threshold_min,
+        reasons["landing"] + reasons["on_block"],
+    )
+
+    return DelayCodeRecord(
+        flight_id=_coerce_int(flight.get("flightId")),
+        quote_id=_coerce_int(flight.get("quoteId")),
+        booking_reference=_coerce_str(
+            flight.get("bookingIdentifier")
+            or flight.get("bookingReference")
+        ),
+        account_name=_coerce_str(
+            flight.get("accountName")
+            or flight.get("account")
+            or flight.get("account_name")
+            or flight.get("owner")
+            or flight.get("ownerName")
+            or flight.get("customer")
+            or flight.get("customerName")
+            or flight.get("client")
+            or flight.get("clientName")
+        ),
+        flight_reference=_coerce_str(flight.get("flightNumberCompany") or flight.get("flightNumber")),
+        tail_number=_coerce_str(
+            flight.get("registrationNumber")
+            or flight.get("tail")
+            or flight.get("tailNumber")
+        ),
+        airport_from=_coerce_str(flight.get("airportFrom")),
+        airport_to=_coerce_str(flight.get("airportTo")),
+        block_off_est=times["block_off_est"],
+        block_on_est=times["block_on_est"],
+        real_out=times["real_out"],
+        real_off=times["real_off"],
+        real_on=times["real_on"],
+        real_in=times["real_in"],
+        off_block_delay_min=off_block_delay_min,
+        on_block_delay_min=on_block_delay_min,
+        off_block_reasons=reasons["off_block"],
+        takeoff_reasons=reasons["takeoff"],
+        landing_reasons=reasons["landing"],
+        on_block_reasons=reasons["on_block"],
+        off_block_reason_status=off_block_reason_status,
+        on_block_reason_status=on_block_reason_status,
+    )
+
+
 def _extract_datetime_value(row: Mapping[str, Any], keys: Iterable[str]) -> Optional[datetime]:
     for key in keys:
         value = row.get(key)
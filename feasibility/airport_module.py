@@ -19,8 +19,10 @@ except ModuleNotFoundError:  # pragma: no cover - exercised indirectly
     LocationInfo = None  # type: ignore[assignment]
     sun = None  # type: ignore[assignment]
 
+from customs_service import CustomsCalendar, PortCalendar, load_customs_calendar
 from deice_info_helper import DeiceRecord, get_deice_record
 from flight_leg_utils import load_airport_metadata_lookup, safe_parse_dt
+from zoneinfo_compat import ZoneInfo
 
 from .airport_notes_parser import (
     ParsedCustoms,
@@ -113,6 +115,9 @@ class CustomsProfile:
     icao: str
     service_type: Optional[str]
     notes: Optional[str]
+    # Posted hours and notice lead from the customs calendar, when the caller
+    # supplied one.
+    port_calendar: Optional[PortCalendar] = None
 
 
 @dataclass(frozen=True)
@@ -514,11 +519,20 @@ def _build_deice_profile(
     )
 
 
-def _build_customs_profile(icao: str, customs_rules: Mapping[str, CustomsRule]) -> Optional[CustomsProfile]:
+def _build_customs_profile(
+    icao: str,
+    customs_rules: Mapping[str, CustomsRule],
+    customs_calendar: Optional[CustomsCalendar] = None,
+) -> Optional[CustomsProfile]:
     record = customs_rules.get(icao)
     if not record:
         return None
-    return CustomsProfile(icao=icao, service_type=record.service_type, notes=record.notes)
+    return CustomsProfile(
+        icao=icao,
+        service_type=record.service_type,
+        notes=record.notes,
+        port_calendar=customs_calendar.get(icao) if customs_calendar is not None else None,
+    )
 
 
 def _build_osa_ssa_profile(icao: str, airport_categories: Mapping[str, AirportCategoryRecord]) -> OsaSsaProfile:
@@ -597,6 +611,29 @@ def _evaluate_aircraft_endurance(leg: LegContext) -> CategoryResult:
     return checker_aircraft.evaluate_aircraft(evaluation_payload)
 
 
+def load_customs_calendar_for_legs(legs: Sequence[LegContext]) -> Optional[CustomsCalendar]:
+    """Return one port calendar covering every arrival in ``legs``, or ``None`` without arrivals.
+
+    Feasibility runs build this once and pass it to
+    :func:`evaluate_airport_feasibility_for_leg` for each leg.
+    """
+
+    arrival_days: List[date] = []
+    for leg in legs:
+        raw = leg.get("arrival_date_utc")
+        if not raw:
+            continue
+        try:
+            arrival_days.append(safe_parse_dt(str(raw)).astimezone(timezone.utc).date())
+        except Exception:
+            continue
+    if not arrival_days:
+        return None
+    start = min(arrival_days)
+    # One extra day covers arrivals whose port-local date is after the UTC date.
+    return load_customs_calendar(start, (max(arrival_days) - start).days + 1)
+
+
 def evaluate_airport_feasibility_for_leg(
     leg: LegContext,
     *,
@@ -606,6 +643,7 @@ def evaluate_airport_feasibility_for_leg(
     airport_categories: Optional[Mapping[str, AirportCategoryRecord]] = None,
     fl3xx_categories: Optional[Mapping[str, Fl3xxAirportCategory]] = None,
     customs_rules: Optional[Mapping[str, CustomsRule]] = None,
+    customs_calendar: Optional[CustomsCalendar] = None,
     now: Optional[datetime] = None,
 ) -> AirportFeasibilityResult:
     airport_categories = airport_categories or load_airport_categories()
@@ -630,7 +668,9 @@ def evaluate_airport_feasibility_for_leg(
     arr_deice = _build_deice_profile(arr_icao, metadata=airport_metadata)
 
     dep_customs = _build_customs_profile(dep_icao, customs_rules)
-    arr_customs = _build_customs_profile(arr_icao, customs_rules)
+    # Posted hours and notice deadlines only apply to arrivals. The checker and
+    # engine pass one calendar per run (see load_customs_calendar_for_legs).
+    arr_customs = _build_customs_profile(arr_icao, customs_rules, customs_calendar)
 
     dep_osa = _build_osa_ssa_profile(dep_icao, airport_categories)
     arr_osa = _build_osa_ssa_profile(arr_icao, airport_categories)
@@ -1394,6 +1434,41 @@ def _is_within_customs_hours(
     return False
 
 
+def _apply_posted_customs_hours(
+    port_calendar: PortCalendar,
+    arrival_dt_local: datetime,
+    tz_name: str,
+    issues: List[str],
+    hours_result: Optional[bool],
+) -> CategoryStatus:
+    """Check the arrival against the port's hours and notice lead in ``customs_rules.csv``.
+
+    Posted hours only matter when the operational notes did not state hours of
+    their own (``hours_result`` is ``None``).
+    """
+
+    status: CategoryStatus = "PASS"
+    try:
+        arrival_port_local = arrival_dt_local.astimezone(ZoneInfo(tz_name))
+    except Exception:
+        return status
+    if hours_result is None and port_calendar.is_open_at(arrival_port_local) is False:
+        status = "CAUTION"
+        hours = port_calendar.hours_on(arrival_port_local.date())
+        posted = f"{hours[0]:%H:%M}-{hours[1]:%H:%M}" if hours else "closed"
+        issues.append(
+            f"Arrival {arrival_port_local:%a %H:%M} local is outside posted customs hours ({posted}); "
+            "confirm after-hours support."
+        )
+    deadline = port_calendar.notice_deadline(arrival_port_local)
+    lead_hours = port_calendar.rule.lead_time_arrival_hours
+    if deadline is not None and lead_hours:
+        issues.append(
+            f"Customs notice due by {deadline:%Y-%m-%d %H:%M %Z} ({lead_hours:g}h before arrival)."
+        )
+    return status
+
+
 def evaluate_customs(
     customs_profile: Optional[CustomsProfile],
     leg: LegContext,
@@ -1455,6 +1530,13 @@ def evaluate_customs(
         if customs_profile.notes:
             issues.append(customs_profile.notes)
 
+    port_calendar = customs_profile.port_calendar if customs_profile is not None else None
+    if port_calendar is not None and arrival_dt_local is not None and tz_name:
+        status = _combine_status(
+            status,
+            _apply_posted_customs_hours(port_calendar, arrival_dt_local, tz_name, issues, hours_result),
+        )
+
     if parsed:
         if hours_result is False:
             if parsed.get("aoe_type") == "AOE":
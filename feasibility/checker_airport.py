@@ -12,6 +12,7 @@ from .airport_module import (
     AirportFeasibilityResult,
     build_leg_context_from_flight,
     evaluate_airport_feasibility_for_leg,
+    load_customs_calendar_for_legs,
 )
 from .common import (
     OSA_CATEGORY,
@@ -132,6 +133,7 @@ def evaluate_airport(
                 tz_provider=tz_provider,
                 airport_metadata=lookup,
                 customs_rules=customs,
+                customs_calendar=load_customs_calendar_for_legs([leg_context]),
             )
         except Exception:
             module_result = None
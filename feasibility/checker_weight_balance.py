@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Iterable, Mapping, MutableMapping, Optional, Tuple
+from typing import Any, Iterable, Mapping, MutableMapping, Optional
+
+from payload_weights import (
+    DEFAULT_ANIMAL_WEIGHT,
+    STD_WEIGHTS,
+    compute_payload_weights,
+    determine_season,
+    flatten_pax_payloads,
+    normalize_season,
+    pax_breakdown as _pax_breakdown,
+)
 
 from .schemas import CategoryResult
 
+__all__ = ["MAX_PAX_CARGO", "STD_WEIGHTS", "determine_season", "evaluate_weight_balance"]
+
 
 MAX_PAX_CARGO = {
     "C25A": {"Summer": 1086, "Winter": 1034},
@@ -15,57 +26,9 @@ MAX_PAX_CARGO = {
 }
 
 
-STD_WEIGHTS = {
-    "Summer": {"Male": 193, "Female": 159, "Child": 75, "Infant": 30},
-    "Winter": {"Male": 199, "Female": 165, "Child": 75, "Infant": 30},
-}
-
-
 HIGH_RISK_KEYWORDS = ("SKI", "GOLF", "BIKE", "PET")
 
 
-def determine_season(departure_time: Any) -> str:
-    """Return ``Summer`` or ``Winter`` based on the month (UTC).
-
-    Defaults to ``Winter`` when the date cannot be determined.
-    """
-
-    month: Optional[int] = None
-    if isinstance(departure_time, (int, float)):
-        try:
-            if departure_time > 10**11:
-                departure_time = departure_time / 1000.0
-            month = datetime.utcfromtimestamp(float(departure_time)).month
-        except Exception:
-            month = None
-    elif isinstance(departure_time, str):
-        try:
-            parsed = datetime.fromisoformat(departure_time.replace("Z", "+00:00"))
-            month = parsed.month
-        except ValueError:
-            month = None
-    if month is None and isinstance(departure_time, Mapping):
-        for key in ("departureTime", "dep_time"):
-            candidate = departure_time.get(key)
-            if candidate:
-                return determine_season(candidate)
-    if month and 4 <= month <= 10:
-        return "Summer"
-    return "Winter"
-
-
-def _coerce_number(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    try:
-        number = float(value)
-    except (TypeError, ValueError):
-        return None
-    if number != number:  # NaN guard
-        return None
-    return number
-
-
 def _normalize_aircraft_type(name: Optional[str]) -> Optional[str]:
     if not name:
         return None
@@ -81,211 +44,18 @@ def _normalize_aircraft_type(name: Optional[str]) -> Optional[str]:
     return text
 
 
-def _normalize_gender_label(value: Optional[str]) -> Optional[str]:
-    if not value:
-        return None
-    cleaned = str(value).strip().lower()
-    if cleaned.startswith("f"):
-        return "Female"
-    if cleaned.startswith("m"):
-        return "Male"
-    return None
-
-
-def _extract_label(value: Any, *keys: str) -> Optional[str]:
-    """Return a non-empty string from ``value`` or selected mapping keys."""
-
-    if isinstance(value, str) and value.strip():
-        return value.strip()
-    if isinstance(value, Mapping):
-        for key in keys:
-            candidate = value.get(key)
-            if isinstance(candidate, str) and candidate.strip():
-                return candidate.strip()
-    return None
-
-
-def _pax_category(ticket: Mapping[str, Any]) -> str:
-    pax_type_raw = (
-        _extract_label(ticket.get("paxType"), "code", "type", "name", "label")
-        or _extract_label(ticket.get("type"))
-        or _extract_label(ticket.get("pax_type"))
-        or "ADULT"
-    )
-    pax_type = pax_type_raw.upper()
-
-    # Children / infants first
-    if "INFANT" in pax_type:
-        return "Infant"
-    if "CHILD" in pax_type or "CHD" in pax_type:
-        return "Child"
-
-    pax_user = ticket.get("paxUser") if isinstance(ticket.get("paxUser"), Mapping) else {}
-
-    # Try as many gender-related fields as possible
-    gender_raw = (
-        _extract_label(ticket.get("gender"))
-        or _extract_label(pax_user.get("gender"))
-        or _extract_label(pax_user.get("sex"))
-        or _extract_label(pax_user.get("salutation"))
-        or _extract_label(pax_user.get("title"))
-    )
-
-    # First prefer explicit gender fields, then fall back to pax_type label
-    gender_label = _normalize_gender_label(gender_raw) or _normalize_gender_label(pax_type)
-
-    # If we still can't tell, you can choose your default:
-    #   - "Male" (current behaviour – conservative for weights)
-    #   - "Female"
-    #   - or something like "Male" but tag it differently in the UI
-    return gender_label or "Male"
-
-
-
-def _standard_pax_weight(season: str, category: str) -> float:
-    weights = STD_WEIGHTS.get(season, STD_WEIGHTS["Winter"])
-    return float(weights.get(category, weights["Male"]))
-
-
-def _iter_tickets(payload: Mapping[str, Any]) -> Iterable[Mapping[str, Any]]:
-    """Yield ticket mappings from many possible pax payload shapes.
-
-    FL3XX responses sometimes nest ``tickets`` under several layers (e.g.
-    ``payload`` → ``paxPayload`` → ``tickets``). We traverse mappings/lists
-    breadth-first and emit each unique ticket mapping once.
-    """
-
-    search_queue: list[Any] = []
-    if payload is not None:
-        search_queue.append(payload)
-
-    visited: set[int] = set()
-    yielded: set[int] = set()
-
-    while search_queue:
-        current = search_queue.pop(0)
-        marker = id(current)
-        if marker in visited:
-            continue
-        visited.add(marker)
-
-        if isinstance(current, Mapping):
-            entries = current.get("tickets")
-            if isinstance(entries, Iterable) and not isinstance(entries, (str, bytes)):
-                for entry in entries:
-                    if isinstance(entry, Mapping):
-                        entry_marker = id(entry)
-                        if entry_marker in yielded:
-                            continue
-                        yielded.add(entry_marker)
-                        yield entry
-
-            for key in (
-                "pax",
-                "pax_details",
-                "paxDetails",
-                "paxPayload",
-                "passengers",
-                "payload",
-            ):
-                child = current.get(key)
-                if child is not None:
-                    search_queue.append(child)
-
-            for child in current.values():
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-        elif isinstance(current, Iterable) and not isinstance(current, (str, bytes)):
-            for child in current:
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-
-def _iter_cargo(payload: Mapping[str, Any]) -> Iterable[Tuple[Mapping[str, Any], str]]:
-    """Yield cargo item mappings from nested payload structures.
-
-    Returns tuples of ``(entry, entry_type)`` where ``entry_type`` is
-    ``"animal"`` when the item originates from ``animal``/``animals`` keys and
-    ``"cargo"`` otherwise.
-    """
-
-    search_queue: list[Any] = []
-    if payload is not None:
-        search_queue.append(payload)
-
-    visited: set[int] = set()
-    yielded: set[int] = set()
-    cargo_keys = {"cargo", "cargoItems", "cargo_items", "animal", "animals"}
-
-    while search_queue:
-        current = search_queue.pop(0)
-        marker = id(current)
-        if marker in visited:
-            continue
-        visited.add(marker)
-
-        if isinstance(current, Mapping):
-            for key in cargo_keys:
-                entries = current.get(key)
-                if isinstance(entries, Iterable) and not isinstance(entries, (str, bytes)):
-                    for entry in entries:
-                        if isinstance(entry, Mapping):
-                            entry_marker = id(entry)
-                            if entry_marker in yielded:
-                                continue
-                            yielded.add(entry_marker)
-                            entry_type = "animal" if key in {"animal", "animals"} else "cargo"
-                            yield entry, entry_type
-
-            for child in (
-                current.get("pax"),
-                current.get("paxPayload"),
-                current.get("payload"),
-            ):
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-            for child in current.values():
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-        elif isinstance(current, Iterable) and not isinstance(current, (str, bytes)):
-            for child in current:
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-
-def _extract_ticket_stats(ticket: Mapping[str, Any], season: str) -> tuple[float, str]:
-    category = _pax_category(ticket)
-
-    pax_user = ticket.get("paxUser") if isinstance(ticket.get("paxUser"), Mapping) else {}
-
-    explicit_weight = _coerce_number(
-        ticket.get("bodyWeight")
-        or ticket.get("weight")
-        or (pax_user.get("bodyWeight") if isinstance(pax_user, Mapping) else None)
-    )
-    base_weight = (
-        explicit_weight
-        if explicit_weight is not None
-        else _standard_pax_weight(season, category)
-    )
-
-    luggage_weight = _coerce_number(ticket.get("luggageWeight") or ticket.get("luggage_weight")) or 0
-    return base_weight + luggage_weight, category
-
-
-def _detect_high_risk_items(
-    cargo_entries: Iterable[Tuple[Mapping[str, Any], str]]
-) -> bool:
-    for entry, _ in cargo_entries:
-        note = str(entry.get("note") or "")
-        if any(keyword in note.upper() for keyword in HIGH_RISK_KEYWORDS):
+def _detect_high_risk_items(notes: Iterable[Any]) -> bool:
+    for note in notes:
+        text = str(note or "").upper()
+        if any(keyword in text for keyword in HIGH_RISK_KEYWORDS):
             return True
     return False
 
 
+def _none_if_nan(value: Any) -> Any:
+    return None if isinstance(value, float) and value != value else value
+
+
 def evaluate_weight_balance(
     flight: Mapping[str, Any],
     *,
@@ -299,7 +69,7 @@ def evaluate_weight_balance(
 
     issues = []
     normalised_type = _normalize_aircraft_type(aircraft_type)
-    season_label = season if season in STD_WEIGHTS else "Winter"
+    season_label = normalize_season(season)
 
     details: MutableMapping[str, Any] = {"season": season_label}
 
@@ -321,43 +91,23 @@ def evaluate_weight_balance(
     print("PAX DEBUG: Keys received =", pax_keys)
     print("PAX DEBUG FULL:", pax_payload)
 
-    tickets = list(_iter_tickets(pax_payload))
-    pax_count = len(tickets)
-    pax_breakdown: MutableMapping[str, int] = {"Male": 0, "Female": 0, "Child": 0, "Infant": 0}
-
-    pax_weight = 0.0
-    for ticket in tickets:
-        ticket_weight, category = _extract_ticket_stats(ticket, season_label)
-        pax_weight += ticket_weight
-        pax_breakdown[category] = pax_breakdown.get(category, 0) + 1
-
-    cargo_entries = list(_iter_cargo(pax_payload))
-    cargo_summary = []
-    cargo_weights = []
-    for item, entry_type in cargo_entries:
-        weight = _coerce_number(
-            item.get("weightQty")
-            or item.get("weight")
-            or item.get("weight_qty")
-        )
-        if weight is None and entry_type == "animal":
-            weight = 30.0
-        cargo_summary.append(
-            {
-                "note": item.get("note"),
-                "type": item.get("type") or item.get("cargoType"),
-                "weight": weight,
-                "unit": item.get("weightUnit") or item.get("unit"),
-            }
-        )
-        if weight is not None:
-            cargo_weights.append(weight)
-    cargo_weight = sum(cargo_weights) if cargo_weights else None
-    if cargo_weight is None:
-        cargo_weight = 30 * pax_count
-
+    tables = flatten_pax_payloads({0: pax_payload})
+    weights = compute_payload_weights(
+        tables, {0: season_label}, animal_default_weight=DEFAULT_ANIMAL_WEIGHT
+    ).iloc[0]
+    pax_count = int(weights["pax_count"])
+    pax_weight = float(weights["pax_weight"])
+    cargo_weight = float(weights["cargo_weight"] + weights["animal_weight"])
     total_payload = pax_weight + cargo_weight
 
+    cargo_rows = tables.cargo
+    unweighted_animals = cargo_rows["kind"].eq("animal") & cargo_rows["weight"].isna()
+    cargo_rows.loc[unweighted_animals, "weight"] = DEFAULT_ANIMAL_WEIGHT
+    cargo_summary = [
+        {key: _none_if_nan(entry[key]) for key in ("note", "type", "weight", "unit")}
+        for entry in cargo_rows.to_dict("records")
+    ]
+
     details.update(
         {
             "paxWeight": round(pax_weight, 2),
@@ -365,7 +115,7 @@ def evaluate_weight_balance(
             "totalPayload": round(total_payload, 2),
             "paxCount": pax_count,
             "maxAllowed": None,
-            "paxBreakdown": dict(pax_breakdown),
+            "paxBreakdown": _pax_breakdown(weights, include_zero=True),
             "paxPayloadKeys": pax_keys,
             "cargoEntries": cargo_summary,
         }
@@ -384,7 +134,7 @@ def evaluate_weight_balance(
     details["maxAllowed"] = max_allowed
 
     payload_overage = total_payload - max_allowed
-    high_risk = _detect_high_risk_items(cargo_entries)
+    high_risk = _detect_high_risk_items(cargo_rows["note"])
     details["highRiskCargo"] = high_risk
 
     if payload_overage > 0:
@@ -21,6 +21,7 @@ from .airport_module import (
     LegContext,
     build_leg_context_from_flight,
     evaluate_airport_feasibility_for_leg,
+    load_customs_calendar_for_legs,
 )
 from .common import OSA_CATEGORY, SSA_CATEGORY, classify_airport_category
 from .duty_module import evaluate_generic_duty_day
@@ -994,6 +995,7 @@ def run_feasibility_phase1(request: FeasibilityRequest) -> FullFeasibilityResult
 
     tz_provider = request.get("tz_provider") or _build_default_tz_provider()
     operational_notes_fetcher = request.get("operational_notes_fetcher")
+    customs_calendar = load_customs_calendar_for_legs(day["legs"])
 
     leg_results: List[AirportFeasibilityResult] = []
     for leg in day["legs"]:
@@ -1006,6 +1008,7 @@ def run_feasibility_phase1(request: FeasibilityRequest) -> FullFeasibilityResult
                 tz_provider=tz_provider,
                 airport_metadata=airport_metadata,
                 operational_notes_fetcher=operational_notes_fetcher,
+                customs_calendar=customs_calendar,
             )
         )
 
@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 import hashlib
 import json
-from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Literal
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Literal
 
 import importlib.util
 
 import pandas as pd
 import requests
+from roster_pull import iter_roster_rows, row_has_activity
 from zoneinfo_compat import ZoneInfo
 
 
@@ -95,6 +101,211 @@ def compute_flights_digest(flights: Iterable[Any]) -> str:
     return hashlib.sha256(digest_input).hexdigest()
 
 
+class SessionPool:
+    """Hand each worker thread its own ``requests.Session`` and close them together.
+
+    Sessions are not safe to share between threads, so concurrent detail
+    fetches borrow one per worker and keep its connection pool warm across
+    the requests that worker issues.
+    """
+
+    def __init__(self, session_factory: Callable[[], requests.Session] = requests.Session) -> None:
+        self._factory = session_factory
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._factory()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except AttributeError:  # pragma: no cover - defensive cleanup
+                pass
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def instance_key(base_url: Optional[str]) -> str:
+    """Short, filesystem-safe key for one FL3XX instance, shared by every on-disk store."""
+
+    return hashlib.sha1((base_url or DEFAULT_FL3XX_BASE_URL).encode("utf-8")).hexdigest()[:12]
+
+
+def unique_ids(values: Iterable[Any]) -> List[str]:
+    """Return ``values`` as strings in first-seen order, without blanks or repeats."""
+
+    seen: Dict[str, None] = {}
+    for value in values:
+        if value in (None, ""):
+            continue
+        seen.setdefault(str(value), None)
+    return list(seen)
+
+
+def fetch_many(
+    keys: Iterable[Hashable],
+    fetch_fn: Callable[[Any, requests.Session], Any],
+    *,
+    max_workers: int,
+    session: Optional[requests.Session] = None,
+) -> Dict[Any, Tuple[bool, Any]]:
+    """Call ``fetch_fn(key, session)`` once per distinct key, concurrently when allowed.
+
+    Returns ``{key: (ok, payload_or_exception)}`` in request order; failures
+    are collected rather than raised. Concurrent requests borrow one session
+    per worker from a :class:`SessionPool`. With a single worker (or a single
+    key) they go out on ``session``, or on a temporary session when none is
+    given.
+    """
+
+    jobs = list(dict.fromkeys(keys))
+
+    def _fetch(key: Any, http: requests.Session) -> Tuple[bool, Any]:
+        try:
+            return True, fetch_fn(key, http)
+        except Exception as exc:  # pragma: no cover - surfaced to the caller
+            return False, exc
+
+    if not jobs:
+        return {}
+    if max_workers <= 1 or len(jobs) <= 1:
+        if session is not None:
+            return {key: _fetch(key, session) for key in jobs}
+        with requests.Session() as http:
+            return {key: _fetch(key, http) for key in jobs}
+    with SessionPool() as sessions:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            results = pool.map(lambda key: _fetch(key, sessions.session()), jobs)
+            return dict(zip(jobs, results))
+
+
+class JsonFileStore:
+    """A JSON object persisted as one file, loaded lazily and replaced atomically.
+
+    Subclasses define the entry format and hold ``self._lock`` around
+    :meth:`_load` and :meth:`_save`. A missing or unreadable file loads as
+    empty, and a failed write keeps the in-memory copy, so read-only
+    deployments still work for the life of the process.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with self.path.open("r", encoding="utf-8") as handle:
+                    entries = json.load(handle)
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with tmp.open("w", encoding="utf-8") as handle:
+                json.dump(self._load(), handle, sort_keys=True, indent=1)
+            os.replace(tmp, self.path)
+        except OSError:  # pragma: no cover - read-only deployments keep the in-memory copy
+            pass
+
+
+DEFAULT_PAYLOAD_CACHE_TTL_SECONDS = 3600
+
+
+class PayloadCache:
+    """Time-limited cache of FL3XX detail payloads keyed by ``(kind, base_url, id)``.
+
+    Only successful responses are stored, so failed fetches are retried on the
+    next run. Instances are usually module-level and shared by every Streamlit
+    session, so reads and writes are guarded by a lock.
+
+    Expired entries are swept on write at most once per TTL, so payloads that
+    are never read again do not pile up in a long-running server.
+    ``max_entries`` additionally caps the cache, evicting the oldest writes.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_PAYLOAD_CACHE_TTL_SECONDS,
+        *,
+        max_entries: Optional[int] = None,
+        clock=time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str, str]) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            stored_at, payload = entry
+            if self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return False, None
+            return True, payload
+
+    def set(self, key: Tuple[str, str, str], payload: Any) -> None:
+        with self._lock:
+            now = self._clock()
+            if now - self._last_sweep > self.ttl_seconds:
+                self._prune_locked(now)
+            # Re-inserting keeps the dict in write order, oldest first.
+            self._entries.pop(key, None)
+            self._entries[key] = (now, payload)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+
+    def prune(self) -> int:
+        """Drop expired entries now and return how many were removed."""
+
+        with self._lock:
+            return self._prune_locked(self._clock())
+
+    def _prune_locked(self, now: float) -> int:
+        expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        self._last_sweep = now
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 def fetch_flights(
     config: Fl3xxApiConfig,
     *,
@@ -512,6 +723,20 @@ def fetch_crew_member(
                 pass
 
 
+def _staff_roster_params(
+    from_time: datetime,
+    to_time: datetime,
+    filter_value: str,
+    include_flights: bool,
+) -> List[Tuple[str, str]]:
+    return [
+        ("from", from_time.strftime("%Y-%m-%dT%H:%M")),
+        ("to", to_time.strftime("%Y-%m-%dT%H:%M")),
+        ("filter", str(filter_value or "STAFF").upper()),
+        ("includeFlights", "true" if include_flights else "false"),
+    ]
+
+
 def fetch_staff_roster(
     config: Fl3xxApiConfig,
     *,
@@ -524,12 +749,7 @@ def fetch_staff_roster(
 ) -> List[Dict[str, Any]]:
     """Return roster rows from the ``/staff/roster`` endpoint."""
 
-    params: List[Tuple[str, str]] = [
-        ("from", from_time.strftime("%Y-%m-%dT%H:%M")),
-        ("to", to_time.strftime("%Y-%m-%dT%H:%M")),
-        ("filter", str(filter_value or "STAFF").upper()),
-        ("includeFlights", "true" if include_flights else "false"),
-    ]
+    params = _staff_roster_params(from_time, to_time, filter_value, include_flights)
 
     def _coerce_rows(value: Any) -> Optional[List[Dict[str, Any]]]:
         if isinstance(value, list):
@@ -554,18 +774,10 @@ def fetch_staff_roster(
         response.raise_for_status()
         payload = response.json()
 
-        def _row_has_activity(row: Mapping[str, Any]) -> bool:
-            entries = row.get("entries")
-            flights = row.get("flights")
-
-            has_entries = isinstance(entries, list) and len(entries) > 0
-            has_flights = isinstance(flights, list) and len(flights) > 0
-            return has_entries or has_flights
-
         def _finalise_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             if not drop_empty_rows:
                 return rows
-            return [row for row in rows if _row_has_activity(row)]
+            return [row for row in rows if row_has_activity(row)]
 
         direct_rows = _coerce_rows(payload)
         if direct_rows is not None:
@@ -586,6 +798,55 @@ def fetch_staff_roster(
                 pass
 
 
+def iter_staff_roster(
+    config: Fl3xxApiConfig,
+    *,
+    from_time: datetime,
+    to_time: datetime,
+    filter_value: str = "STAFF",
+    include_flights: bool = True,
+    drop_empty_rows: bool = True,
+    chunk_size: int = 64 * 1024,
+    session: Optional[requests.Session] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream roster rows from ``/staff/roster`` as the response downloads.
+
+    Unlike :func:`fetch_staff_roster` the body is never loaded whole: rows are
+    decoded incrementally from ``response.iter_content`` and inactive rows are
+    dropped as they arrive, so wide windows keep a bounded memory footprint
+    and callers can render the first crew before the download completes.
+    """
+
+    http = session or requests.Session()
+    close_session = session is None
+    response: Optional[requests.Response] = None
+    try:
+        response = http.get(
+            _build_staff_roster_endpoint(config.base_url),
+            params=_staff_roster_params(from_time, to_time, filter_value, include_flights),
+            headers=config.build_headers(),
+            timeout=config.timeout,
+            verify=config.verify_ssl,
+            stream=True,
+        )
+        response.raise_for_status()
+        for row in iter_roster_rows(response.iter_content(chunk_size=chunk_size)):
+            if drop_empty_rows and not row_has_activity(row):
+                continue
+            yield row
+    finally:
+        if response is not None:
+            try:
+                response.close()
+            except AttributeError:
+                pass
+        if close_session:
+            try:
+                http.close()
+            except AttributeError:
+                pass
+
+
 
 @dataclass(frozen=True)
 class MissingQualificationAlert:
@@ -2049,6 +2310,12 @@ __all__ = [
     "MOUNTAIN_TIME_ZONE",
     "compute_fetch_dates",
     "compute_flights_digest",
+    "JsonFileStore",
+    "PayloadCache",
+    "SessionPool",
+    "fetch_many",
+    "instance_key",
+    "unique_ids",
     "fetch_flights",
     "fetch_flight_crew",
     "fetch_postflight",
@@ -18,6 +18,8 @@ from typing import (
     Tuple,
 )
 
+import pandas as pd
+
 from fl3xx_api import (
     Fl3xxApiConfig,
     MOUNTAIN_TIME_ZONE,
@@ -106,6 +108,7 @@ class DutyStartCollection:
     flights_metadata: Dict[str, Any] = field(default_factory=dict)
     grouped_flights: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
     ingestion_diagnostics: Dict[str, Any] = field(default_factory=dict)
+    duty_ledger: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -732,44 +735,150 @@ def _get_nested_value(mapping: Mapping[str, Any], key_path: str) -> Any:
     return current
 
 
-def build_rest_before_index(
+_DUTY_LEDGER_MINUTE_COLUMNS = (
+    "fdp_actual_min",
+    "fdp_max_min",
+    "rest_after_min",
+    "rest_after_required_min",
+    "rest_before_min",
+    "rest_before_required_min",
+)
+
+_DUTY_LEDGER_COLUMNS = (
+    "snapshot_idx",
+    "tail",
+    "flight_id",
+    "duty_start_utc",
+    "duty_end_utc",
+    "pilot",
+    "identifier",
+    "seat",
+    "name",
+    *_DUTY_LEDGER_MINUTE_COLUMNS,
+    "fdp_utilisation",
+    "fdp_display",
+    "actual_fdp_duty_str",
+    "actual_fdp_break_str",
+    "split_duty",
+    "split_break_str",
+    "rest_after_display",
+)
+
+
+def _duty_ledger_record(
+    snapshot_idx: int, snapshot: DutyStartSnapshot, pilot: DutyStartPilotSnapshot
+) -> Dict[str, Any]:
+    fdp_actual = pilot.fdp_actual_min
+    fdp_max = pilot.fdp_max_min
+    duty_str, break_str = _parse_actual_fdp_details(pilot.explainer_map)
+
+    rest_after = pilot.rest_after_actual_min
+    if rest_after is None and pilot.rest_after_payload:
+        rest_after = _coerce_minutes(pilot.rest_after_payload.get("actual"))
+    rest_before = pilot.rest_before_actual_min
+    if rest_before is None and pilot.rest_before_payload:
+        rest_before = _coerce_minutes(pilot.rest_before_payload.get("actual"))
+    rest_before_required = pilot.rest_before_required_min
+    if rest_before_required is None and pilot.rest_before_payload:
+        rest_before_required = _coerce_minutes(pilot.rest_before_payload.get("min"))
+
+    duty_start = snapshot.block_off_est_utc
+    duty_end = None
+    if isinstance(duty_start, datetime) and fdp_actual is not None:
+        duty_end = duty_start + timedelta(minutes=fdp_actual)
+
+    return {
+        "snapshot_idx": snapshot_idx,
+        "tail": snapshot.tail or "UNKNOWN",
+        "flight_id": snapshot.flight_id,
+        "duty_start_utc": duty_start,
+        "duty_end_utc": duty_end,
+        "pilot": pilot,
+        "identifier": _select_identifier(pilot),
+        "seat": (pilot.seat or "PIC").upper(),
+        "name": pilot.name or "",
+        "fdp_actual_min": fdp_actual,
+        "fdp_max_min": fdp_max,
+        "rest_after_min": rest_after,
+        "rest_after_required_min": pilot.rest_after_required_min,
+        "rest_before_min": rest_before,
+        "rest_before_required_min": rest_before_required,
+        "fdp_utilisation": fdp_actual / fdp_max if fdp_actual is not None and fdp_max else None,
+        "fdp_display": pilot.fdp_actual_str or _minutes_to_hhmm(fdp_actual),
+        "actual_fdp_duty_str": duty_str or None,
+        "actual_fdp_break_str": break_str or None,
+        "split_duty": bool(pilot.split_duty),
+        "split_break_str": pilot.split_break_str or None,
+        "rest_after_display": pilot.rest_after_actual_str or _minutes_to_hhmm(rest_after),
+    }
+
+
+def build_duty_ledger(
     collection: Iterable[DutyStartSnapshot] | DutyStartCollection,
-) -> Dict[str, Dict[str, Any]]:
-    """Return a mapping of pilot identifiers to next-day rest-before metrics."""
+    *,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Return a one-row-per-pilot-per-duty table for the snapshots.
+
+    The postflight-derived FDP, split and rest figures are resolved once so the
+    report sections can filter and group the table instead of walking every
+    pilot block again. For a :class:`DutyStartCollection` the table is cached
+    on the collection; pass ``refresh=True`` after mutating its snapshots.
+    """
 
     if isinstance(collection, DutyStartCollection):
+        if collection.duty_ledger is not None and not refresh:
+            return collection.duty_ledger
         snapshots: Iterable[DutyStartSnapshot] = collection.snapshots
     else:
         snapshots = collection
 
-    index: Dict[str, Dict[str, Any]] = {}
+    records = [
+        _duty_ledger_record(snapshot_idx, snapshot, pilot)
+        for snapshot_idx, snapshot in enumerate(snapshots)
+        for pilot in snapshot.pilots
+    ]
+    ledger = pd.DataFrame.from_records(records, columns=list(_DUTY_LEDGER_COLUMNS))
+    for column in _DUTY_LEDGER_MINUTE_COLUMNS:
+        ledger[column] = ledger[column].astype("Int64")
+    ledger["fdp_utilisation"] = ledger["fdp_utilisation"].astype("float64")
+    ledger["split_duty"] = ledger["split_duty"].astype(bool)
 
-    for snapshot in snapshots:
-        for pilot in snapshot.pilots:
-            identifier = _select_identifier(pilot)
-            if not identifier:
-                continue
+    if isinstance(collection, DutyStartCollection):
+        collection.duty_ledger = ledger
+    return ledger
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    return None if pd.isna(value) else int(value)
+
+
+def build_rest_before_index(
+    collection: Iterable[DutyStartSnapshot] | DutyStartCollection,
+) -> Dict[str, Dict[str, Any]]:
+    """Return a mapping of pilot identifiers to next-day rest-before metrics."""
 
-            entry = index.setdefault(identifier, {"pilot": pilot})
-
-            if entry.get("rest_before_actual_min") is None:
-                rest_actual = pilot.rest_before_actual_min
-                if rest_actual is None and pilot.rest_before_payload:
-                    rest_actual = _coerce_minutes(
-                        pilot.rest_before_payload.get("actual")
-                    )
-                if rest_actual is not None:
-                    entry["rest_before_actual_min"] = rest_actual
-
-            if entry.get("rest_before_required_min") is None:
-                rest_required = pilot.rest_before_required_min
-                if rest_required is None and pilot.rest_before_payload:
-                    rest_required = _coerce_minutes(
-                        pilot.rest_before_payload.get("min")
-                    )
-                if rest_required is not None:
-                    entry["rest_before_required_min"] = rest_required
+    ledger = build_duty_ledger(collection)
+    identified = ledger[ledger["identifier"].notna()]
+    if identified.empty:
+        return {}
+
+    # ``first`` skips missing values, so each metric comes from the earliest
+    # duty that reported it while ``pilot`` stays the first duty seen.
+    firsts = identified.groupby("identifier", sort=False).agg(
+        pilot=("pilot", "first"),
+        rest_before_actual_min=("rest_before_min", "first"),
+        rest_before_required_min=("rest_before_required_min", "first"),
+    )
 
+    index: Dict[str, Dict[str, Any]] = {}
+    for identifier, pilot, rest_actual, rest_required in firsts.itertuples(name=None):
+        entry: Dict[str, Any] = {"pilot": pilot}
+        if not pd.isna(rest_actual):
+            entry["rest_before_actual_min"] = int(rest_actual)
+        if not pd.isna(rest_required):
+            entry["rest_before_required_min"] = int(rest_required)
+        index[identifier] = entry
     return index
 
 
@@ -1636,48 +1745,17 @@ def summarize_split_duty_days(
 ) -> List[str]:
     """Return formatted lines for the Split Duty Days section."""
 
-    if isinstance(collection, DutyStartCollection):
-        snapshots: Iterable[DutyStartSnapshot] = collection.snapshots
-    else:
-        snapshots = collection
+    ledger = build_duty_ledger(collection)
+    split_rows = ledger[ledger["split_duty"]]
 
     lines: List[str] = []
 
-    for snapshot in snapshots:
-        tail = snapshot.tail or "UNKNOWN"
-        split_pilots = [pilot for pilot in snapshot.pilots if pilot.split_duty]
-        if not split_pilots:
-            continue
+    for _, duty in split_rows.groupby("snapshot_idx", sort=True):
+        tail = duty["tail"].iat[0]
+        seats_display = _format_seat_name_display(duty["pilot"].tolist())
 
-        seats_display = _format_seat_name_display(split_pilots)
-
-        duty_display: Optional[str] = None
-        break_display: Optional[str] = None
-
-        for pilot in split_pilots:
-            duty_candidate, break_candidate = _parse_actual_fdp_details(pilot.explainer_map)
-            if duty_candidate and not duty_display:
-                duty_display = duty_candidate
-            if break_candidate and not break_display:
-                break_display = break_candidate
-            if duty_display and break_display:
-                break
-
-        if duty_display is None:
-            for pilot in split_pilots:
-                if pilot.fdp_actual_str:
-                    duty_display = pilot.fdp_actual_str
-                    break
-                fallback = _minutes_to_hhmm(pilot.fdp_actual_min)
-                if fallback:
-                    duty_display = fallback
-                    break
-
-        if break_display is None:
-            for pilot in split_pilots:
-                if pilot.split_break_str:
-                    break_display = pilot.split_break_str
-                    break
+        duty_display = _first_present(duty["actual_fdp_duty_str"], duty["fdp_display"])
+        break_display = _first_present(duty["actual_fdp_break_str"], duty["split_break_str"])
 
         duty_display = _format_duration_for_display(duty_display)
         break_display = _format_duration_for_display(break_display, offset_minutes=120)
@@ -1691,6 +1769,16 @@ def summarize_split_duty_days(
     return lines
 
 
+def _first_present(*columns: pd.Series) -> Optional[str]:
+    """Return the first non-empty value, trying each column in turn."""
+
+    for column in columns:
+        for value in column.tolist():
+            if isinstance(value, str) and value:
+                return value
+    return None
+
+
 _LONG_DUTY_THRESHOLD_RATIO = 0.90
 
 
@@ -1699,40 +1787,21 @@ def summarize_long_duty_days(
 ) -> List[str]:
     """Return formatted lines for the Long Duty Days section."""
 
-    if isinstance(collection, DutyStartCollection):
-        snapshots: Iterable[DutyStartSnapshot] = collection.snapshots
-    else:
-        snapshots = collection
-
-    tail_entries: Dict[str, List[Tuple[str, float, str, str]]] = {}
-
-    for snapshot in snapshots:
-        tail = snapshot.tail or "UNKNOWN"
-
-        for pilot in snapshot.pilots:
-            actual = pilot.fdp_actual_min
-            max_allowed = pilot.fdp_max_min
-            if actual is None or max_allowed in (None, 0):
-                continue
-
-            utilisation = actual / max_allowed
-            if utilisation < _LONG_DUTY_THRESHOLD_RATIO:
-                continue
-
-            seat = (pilot.seat or "PIC").upper()
-            display = pilot.fdp_actual_str or _minutes_to_hhmm(actual)
-            if not display:
-                display = f"{actual} min"
-
-            tail_entries.setdefault(tail, []).append(
-                (seat, utilisation, display, pilot.name or "")
-            )
+    ledger = build_duty_ledger(collection)
+    long_rows = ledger[ledger["fdp_utilisation"] >= _LONG_DUTY_THRESHOLD_RATIO]
 
     lines: List[str] = []
-    for tail in sorted(tail_entries):
-        entries = tail_entries[tail]
-        if not entries:
-            continue
+    for tail, duties in long_rows.groupby("tail", sort=True):
+        entries = [
+            (seat, utilisation, display or f"{actual} min", name)
+            for seat, utilisation, display, actual, name in zip(
+                duties["seat"],
+                duties["fdp_utilisation"],
+                duties["fdp_display"],
+                duties["fdp_actual_min"],
+                duties["name"],
+            )
+        ]
 
         ordered_entries = sorted(
             entries, key=lambda item: (_seat_sort_key(item[0]), -item[1])
@@ -1828,71 +1897,40 @@ def summarize_tight_turnarounds(
     results.
     """
 
-    if isinstance(collection, DutyStartCollection):
-        snapshots: Iterable[DutyStartSnapshot] = collection.snapshots
-    else:
-        snapshots = collection
-
-    tail_map: Dict[str, Dict[str, Tuple[int, str, str]]] = {}
-
-    for snapshot in snapshots:
-        tail = snapshot.tail or "UNKNOWN"
-        seat_map = tail_map.setdefault(tail, {})
-
-        for pilot in snapshot.pilots:
-            rest_minutes = pilot.rest_after_actual_min
-            if rest_minutes is None and pilot.rest_after_payload:
-                rest_minutes = _coerce_minutes(pilot.rest_after_payload.get("actual"))
-            if rest_minutes is None:
-                continue
-            if rest_minutes >= _REST_THRESHOLD_MINUTES:
-                continue
-
-            rest_display = (
-                pilot.rest_after_actual_str or _minutes_to_hhmm(rest_minutes)
+    ledger = build_duty_ledger(collection)
+    short_rest = ledger[
+        (ledger["rest_after_min"] < _REST_THRESHOLD_MINUTES).fillna(False)
+        & ledger["rest_after_display"].notna()
+    ]
+    if next_day_rest_index is not None and not short_rest.empty:
+        has_flight = [
+            _has_upcoming_flight_duty(
+                pilot,
+                int(rest_minutes),
+                next_day_rest_index,
+                tolerance=rest_match_tolerance_min,
             )
-            if not rest_display:
-                continue
+            for pilot, rest_minutes in zip(short_rest["pilot"], short_rest["rest_after_min"])
+        ]
+        short_rest = short_rest[has_flight]
 
-            seat = (pilot.seat or "PIC").upper()
-            if next_day_rest_index is not None:
-                has_flight = _has_upcoming_flight_duty(
-                    pilot,
-                    rest_minutes,
-                    next_day_rest_index,
-                    tolerance=rest_match_tolerance_min,
-                )
-                if not has_flight:
-                    continue
-
-            existing = seat_map.get(seat)
-            candidate = (rest_minutes, rest_display, pilot.name or "")
-            if existing is None:
-                seat_map[seat] = candidate
-            else:
-                existing_minutes, _, _ = existing
-                if rest_minutes < existing_minutes:
-                    seat_map[seat] = candidate
+    # Keep the shortest rest per tail and seat; the stable sort leaves the
+    # earliest duty in front when two rests tie.
+    shortest = short_rest.sort_values("rest_after_min", kind="mergesort").drop_duplicates(
+        ["tail", "seat"], keep="first"
+    )
 
     lines: List[str] = []
-    for tail in sorted(tail_map):
-        seat_map = tail_map[tail]
-        if not seat_map:
-            continue
-
+    for tail, duties in shortest.groupby("tail", sort=True):
         sorted_entries = sorted(
-            seat_map.items(),
+            zip(duties["seat"], duties["rest_after_display"], duties["name"]),
             key=lambda item: _seat_sort_key(item[0]),
         )
 
-        seats = [seat for seat, _ in sorted_entries]
-        rest_values = [value[1] for _, value in sorted_entries]
-        if not seats:
-            continue
-
+        rest_values = [rest for _, rest, _ in sorted_entries]
         pilots = [
-            DutyStartPilotSnapshot(seat=seat, name=value[2] or "")
-            for seat, value in sorted_entries
+            DutyStartPilotSnapshot(seat=seat, name=name or "")
+            for seat, _, name in sorted_entries
         ]
         seat_display = _format_seat_name_display(pilots)
         rest_display = rest_values[0] if len(set(rest_values)) == 1 else "/".join(rest_values)
@@ -1981,6 +2019,7 @@ __all__ = [
     "FlightFollowingReport",
     "collect_duty_start_snapshots",
     "summarize_collection_for_display",
+    "build_duty_ledger",
     "build_rest_before_index",
     "summarize_split_duty_days",
     "summarize_long_duty_days",
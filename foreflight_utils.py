@@ -0,0 +1,86 @@
+"""Field helpers for ForeFlight flight payloads.
+
+ForeFlight flights name the same field several ways (``departure`` vs
+``departureAirport``, ``tail`` vs ``aircraftRegistration``), and airports may
+be codes or objects. These helpers normalise them for the Fuel Planning
+Assistant and the Route Watcher.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Optional
+
+import pandas as pd
+
+
+def normalize_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def normalize_tail(value: Any) -> Optional[str]:
+    text = normalize_text(value)
+    if not text:
+        return None
+    return text.replace("-", "").upper()
+
+
+def normalize_airport(value: Any) -> Optional[str]:
+    if isinstance(value, Mapping):
+        for key in ("icao", "icaoCode", "icao_code", "identifier", "ident", "code", "id"):
+            if key in value and value[key]:
+                return normalize_text(value[key])
+    return normalize_text(value)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = normalize_text(value)
+        if not text:
+            return None
+        # ForeFlight sends ISO timestamps; pandas is only needed for anything else.
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            dt = pd.to_datetime(text, utc=True, errors="coerce")
+            if pd.isna(dt):
+                return None
+            if isinstance(dt, pd.Timestamp):
+                dt = dt.to_pydatetime()
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def extract_first(container: Mapping[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if key in container and container[key] not in (None, ""):
+            return container[key]
+    return None
+
+
+def extract_foreflight_flights(payload: Any) -> List[Mapping[str, Any]]:
+    if isinstance(payload, Mapping):
+        flights = payload.get("flights")
+        if isinstance(flights, list):
+            return [flight for flight in flights if isinstance(flight, Mapping)]
+    if isinstance(payload, list):
+        return [flight for flight in payload if isinstance(flight, Mapping)]
+    return []
+
+
+__all__ = [
+    "extract_first",
+    "extract_foreflight_flights",
+    "normalize_airport",
+    "normalize_tail",
+    "normalize_text",
+    "parse_datetime",
+]
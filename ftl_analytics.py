@@ -0,0 +1,851 @@
+"""Analytics behind the FTL Report Reader page.
+
+FTL and Duty Violation exports are parsed once per upload (keyed by the SHA-256
+of the file bytes) and the column inference plus every derived FTL table are
+built in a single :func:`analyze_ftl` pass. Duration cells are parsed once per
+distinct value, duty days are reconstructed from rest markers with a
+``groupby``/``cumsum`` segmentation and consecutive-day streaks are found with
+run-length encoding, so a season of rows for the whole pilot group stays
+interactive.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import io
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+REST_AFTER_ACT_PATTERNS = [
+    r"\bRest\s*After\s*(FDP|Duty)\b.*\(act\)",
+    r"\bRest\s*After\s*(FDP|Duty)\b.*\bact\b",
+    r"\b(Post|Following)\b.*(FDP|Duty).*\(act\)",
+    r"\b(Post|Following)\b.*(FDP|Duty).*\bact\b",
+    r"\bTurn\s*Time\s*After\b.*\(act\)",
+    r"\bTurn\s*Time\s*After\b.*\bact\b",
+]
+REST_AFTER_MIN_PATTERNS = [
+    r"\bRest\s*After\s*(FDP|Duty)\b.*\(min\)",
+    r"\bRest\s*After\s*(FDP|Duty)\b.*\bmin\b",
+    r"\b(Post|Following)\b.*(FDP|Duty).*\(min\)",
+    r"\b(Post|Following)\b.*(FDP|Duty).*\bmin\b",
+    r"\bTurn\s*Time\s*After\b.*\(min\)",
+    r"\bTurn\s*Time\s*After\b.*\bmin\b",
+]
+REST_BEFORE_ACT_PATTERNS = [
+    r"\bRest\s*Before\s*(FDP|Duty)\b.*\(act\)",
+    r"\bRest\s*Before\s*(FDP|Duty)\b.*\bact\b",
+    r"\b(Pre|Prior)\b.*(FDP|Duty).*\(act\)",
+    r"\b(Pre|Prior)\b.*(FDP|Duty).*\bact\b",
+    r"\bTurn\s*Time\s*Before\b.*\(act\)",
+    r"\bTurn\s*Time\s*Before\b.*\bact\b",
+]
+REST_BEFORE_MIN_PATTERNS = [
+    r"\bRest\s*Before\s*(FDP|Duty)\b.*\(min\)",
+    r"\bRest\s*Before\s*(FDP|Duty)\b.*\bmin\b",
+    r"\b(Pre|Prior)\b.*(FDP|Duty).*\(min\)",
+    r"\b(Pre|Prior)\b.*(FDP|Duty).*\bmin\b",
+    r"\bTurn\s*Time\s*Before\b.*\(min\)",
+    r"\bTurn\s*Time\s*Before\b.*\bmin\b",
+]
+
+LONG_DUTY_HOURS = 12.0
+SHORT_REST_HOURS = 11.0
+MIN_REST_LOWER_HOURS = 10.0
+
+STREAK_COLUMNS = ["Pilot", "StartDate", "EndDate", "ConsecutiveDays"]
+
+
+# -----------------------------
+# Duration parsing
+# -----------------------------
+def parse_duration_to_hours(val):
+    if pd.isna(val):
+        return np.nan
+
+    # ---------------------------------------------------------
+    # Excel datetime duration fix
+    # FL3XX sometimes encodes durations (e.g. "30:02") as a
+    # timestamp (e.g. 1900-01-02 06:02:00).
+    # This block extracts the *duration* from that timestamp.
+    # ---------------------------------------------------------
+    try:
+        # Detect raw datetime-like objects (numpy, pandas, python)
+        if isinstance(val, (pd.Timestamp, datetime)) or \
+           ("datetime" in str(type(val)).lower()):
+            dt = pd.to_datetime(val, errors="coerce")
+            if pd.notna(dt):
+                # Excel stores durations as "time of day" plus day rollover
+                hours = dt.hour + dt.minute / 60 + dt.second / 3600
+
+                # If day > 1, Excel has rolled over past midnight
+                # so each additional day = +24 hours
+                if dt.day > 1:
+                    hours += (dt.day - 1) * 24
+
+                return hours
+    except Exception:
+        pass
+
+    # ---------------------------------------------------------
+    # Normal string-based duration parsing
+    # ---------------------------------------------------------
+    s = str(val).strip()
+    if s == "":
+        return np.nan
+
+    # Remove annotations like "(split duty)"
+    s = re.sub(r"\([^)]*\)", "", s)
+
+    # Normalize common formats
+    s = s.replace("hours", ":").replace("hour", ":").replace("H", ":").replace("h", ":")
+    s = s.replace(" ", "").replace("::", ":").replace(".", ":")
+
+    # Match HH:MM or HHH:MM:SS
+    m = re.match(r"^(\d{1,3}):(\d{1,2})(?::(\d{1,2}))?$", s)
+    if m:
+        h = int(m.group(1))
+        mi = int(m.group(2))
+        se = int(m.group(3)) if m.group(3) else 0
+        return h + mi/60 + se/3600
+
+    # Match "45m" or "45 min"
+    m2 = re.match(r"^(\d+)\s*(m|min)$", s, flags=re.I)
+    if m2:
+        return int(m2.group(1)) / 60.0
+
+    # Pure number like "12.5"
+    if re.match(r"^\d+(\.\d+)?$", s):
+        return float(s)
+
+    # Match formats like "12h 30m"
+    h = re.search(r"(\d+)\s*h", s, flags=re.I)
+    mi = re.search(r"(\d+)\s*m", s, flags=re.I)
+    if h or mi:
+        hours = int(h.group(1)) if h else 0
+        minutes = int(mi.group(1)) if mi else 0
+        return hours + minutes / 60
+
+    # Last-resort timedelta parser
+    try:
+        td = pd.to_timedelta(s)
+        return td.total_seconds() / 3600.0
+    except Exception:
+        return np.nan
+
+
+def parse_duration_series(series: pd.Series) -> pd.Series:
+    """Vectorised :func:`parse_duration_to_hours` that parses each distinct value once."""
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = np.array([parse_duration_to_hours(value) for value in uniques], dtype=float)
+    hours = np.full(len(series), np.nan)
+    present = codes >= 0
+    hours[present] = parsed[codes[present]]
+    return pd.Series(hours, index=series.index, dtype=float)
+
+
+# -----------------------------
+# Upload parsing
+# -----------------------------
+def try_read_csv(uploaded_file):
+    try:
+        return pd.read_csv(uploaded_file, sep=None, engine="python", encoding="utf-8")
+    except Exception:
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file, sep=";", engine="python", encoding="utf-8", on_bad_lines="skip")
+
+
+def upload_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_csv_bytes(data: bytes) -> pd.DataFrame:
+    """Parse an uploaded CSV export with header whitespace stripped."""
+
+    df = try_read_csv(io.BytesIO(data))
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+# -----------------------------
+# Column inference
+# -----------------------------
+def pick_column(columns, keywords=None, letter_fallback=None):
+    keywords = keywords or []
+    for col in columns:
+        lower = col.lower()
+        if any(key in lower for key in keywords):
+            return col
+
+    if letter_fallback:
+        idx = ord(letter_fallback.upper()) - ord("A")
+        if 0 <= idx < len(columns):
+            return columns[idx]
+
+    return None
+
+
+class _DatetimeColumns:
+    """Memoised ``dayfirst`` datetime parses of a frame's columns."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._parsed: Dict[Any, pd.Series] = {}
+
+    def __call__(self, col) -> pd.Series:
+        if col is None or col not in self.df.columns:
+            return pd.Series(pd.NaT, index=self.df.index, dtype="datetime64[ns]")
+        if col not in self._parsed:
+            self._parsed[col] = pd.to_datetime(self.df[col], errors="coerce", dayfirst=True)
+        return self._parsed[col]
+
+
+def _find_column(cols, patterns, exclude=None):
+    for pat in patterns:
+        for c in cols:
+            if exclude and c == exclude:
+                continue
+            if re.search(pat, c, re.I):
+                return c
+    return None
+
+
+def infer_common_columns(df, parsed_series=None):
+    cols = [c.strip() for c in df.columns]
+    df.columns = cols
+    pilot_candidates = [c for c in cols if re.search(r"(pilot|crew|user|employee|person|name)", c, re.I)]
+    pilot_col = pilot_candidates[0] if pilot_candidates else None
+
+    parsed_series = parsed_series or _DatetimeColumns(df)
+
+    date_candidates = [c for c in cols if re.search(r"(date|day)", c, re.I)]
+    # Also consider columns that explicitly mention begin/start even if they lack "date"/"day"
+    date_candidates += [c for c in cols if re.search(r"(begin|start|report)", c, re.I)]
+    # Preserve first occurrence order while removing duplicates
+    seen = set()
+    date_candidates = [c for c in date_candidates if not (c in seen or seen.add(c))]
+
+    def date_score(name):
+        lname = name.lower()
+        score = 2
+        if re.search(r"(begin|start|report)", lname):
+            score = 0
+        elif re.search(r"(off|out|dep)", lname):
+            score = 1
+        if re.search(r"(end|arriv|finish|complete|in|release)", lname):
+            score += 3
+        return score, cols.index(name)
+
+    date_candidates = sorted(date_candidates, key=date_score)
+
+    date_col = None
+    for c in date_candidates:
+        parsed = parsed_series(c)
+        if parsed.notna().mean() > 0.5:
+            date_col = c
+            break
+
+    return pilot_col, date_col
+
+
+def infer_begin_end_columns(df, date_col=None, parsed_series=None):
+    cols = [c.strip() for c in df.columns]
+    df.columns = cols
+
+    parsed_series = parsed_series or _DatetimeColumns(df)
+
+    begin_cols = []
+    end_cols = []
+    for c in cols:
+        lname = c.lower()
+        # Only columns whose name marks a begin/end time are worth parsing.
+        if re.search(r"(begin|start|report|sign\s*in|show)", lname):
+            target = begin_cols
+        elif re.search(r"(end|finish|release|off|arriv|complete)", lname):
+            target = end_cols
+        else:
+            continue
+        if parsed_series(c).notna().mean() <= 0.2:
+            continue
+        target.append(c)
+
+    if date_col:
+        begin_cols = [c for c in begin_cols if c != date_col]
+        end_cols = [c for c in end_cols if c != date_col]
+
+    return begin_cols, end_cols
+
+
+def infer_duty_column(df):
+    cols = list(df.columns)
+    duty_candidates = [c for c in cols if re.search(r"(duty).*?(time|duration|hrs|hours)?", c, re.I)]
+    duty_candidates += [c for c in cols if re.search(r"(total).*duty", c, re.I)]
+    seen = set(); duty_candidates = [x for x in duty_candidates if not (x in seen or seen.add(x))]
+    duty_col = None; best_rate = -1.0
+    for c in duty_candidates:
+        sample = df[c].astype(str).head(300).tolist()
+        parsed = [parse_duration_to_hours(x) for x in sample]
+        rate = np.mean([not pd.isna(x) for x in parsed])
+        if rate > best_rate and rate > 0.3:
+            best_rate = rate; duty_col = c
+    if duty_col is None:
+        for c in cols:
+            sample = df[c].astype(str).head(600).tolist()
+            parsed = [parse_duration_to_hours(x) for x in sample]
+            rate = np.mean([not pd.isna(x) for x in parsed])
+            plausible = [x for x in parsed if not pd.isna(x) and 1.0 <= x <= 18.0]
+            if rate > 0.4 and len(plausible) >= 10:
+                duty_col = c; break
+    return duty_col
+
+
+def infer_duty_day_boundary_column(df):
+    cols = list(df.columns)
+    boundary_candidates = []
+    for c in cols:
+        series = df[c]
+        if series.dtype.kind not in ("O", "U", "S") and not pd.api.types.is_string_dtype(series):
+            continue
+        values = series.astype(str).str.strip()
+        mask = values.str.contains(r"\brest\b", case=False, na=False)
+        if mask.sum() == 0:
+            continue
+        # We prefer columns that predominantly contain textual markers ("Rest")
+        if (mask.sum() >= 3) or (mask.mean() >= 0.01):
+            boundary_candidates.append((c, mask.sum()))
+    if not boundary_candidates:
+        return None
+    boundary_candidates.sort(key=lambda x: (-x[1], cols.index(x[0])))
+    return boundary_candidates[0][0]
+
+
+def infer_rest_pair_columns_ftl(df):
+    cols = [c.strip() for c in df.columns]
+    df.columns = cols
+
+    rest_before_act = _find_column(cols, REST_BEFORE_ACT_PATTERNS)
+    rest_after_act = _find_column(cols, REST_AFTER_ACT_PATTERNS)
+
+    if rest_before_act == rest_after_act:
+        rest_before_act = _find_column(cols, REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
+    if rest_after_act == rest_before_act:
+        rest_after_act = _find_column(cols, REST_AFTER_ACT_PATTERNS, exclude=rest_before_act)
+
+    return rest_before_act, rest_after_act
+
+
+# ---------- Column inference (Duty Violation CSV) with robust Before/After ----------
+def infer_policy_columns(dv_df):
+    cols = [c.strip() for c in dv_df.columns]
+    dv_df.columns = cols
+    # Pilot
+    pilot_candidates = [c for c in cols if re.search(r"(pilot|crew|user|employee|person|name)", c, re.I)]
+    pilot_col = pilot_candidates[0] if pilot_candidates else None
+    # 7d/30d
+    c7_candidates = [c for c in cols if re.search(r"\b7\s*d(ay|ays)?\b|\b7d\b|past\s*7", c, re.I)]
+    c30_candidates = [c for c in cols if re.search(r"\b30\s*d(ay|ays)?\b|\b30d\b|past\s*30", c, re.I)]
+    if not c7_candidates:
+        c7_candidates = [c for c in cols if re.search(r"(7d|past.?7).*(flight|block|time)", c, re.I)]
+    if not c30_candidates:
+        c30_candidates = [c for c in cols if re.search(r"(30d|past.?30).*(flight|block|time)", c, re.I)]
+    c7 = c7_candidates[0] if c7_candidates else None
+    c30 = c30_candidates[0] if c30_candidates else None
+
+    rest_after_act = _find_column(cols, REST_AFTER_ACT_PATTERNS)
+    rest_after_min = _find_column(cols, REST_AFTER_MIN_PATTERNS)
+    rest_before_act = _find_column(cols, REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
+    rest_before_min = _find_column(cols, REST_BEFORE_MIN_PATTERNS, exclude=rest_after_min)
+
+    # Guard: ensure distinct matches
+    if rest_before_act == rest_after_act:
+        rest_before_act = _find_column(cols, REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
+    if rest_before_min == rest_after_min:
+        rest_before_min = _find_column(cols, REST_BEFORE_MIN_PATTERNS, exclude=rest_after_min)
+
+    # FDP act/max
+    fdp_act = next((c for c in cols if re.search(r"(Flight\s*)?Duty\s*Period.*\(act\)|\bFDP\b.*\(act\)", c, re.I)), None)
+    fdp_max = next((c for c in cols if re.search(r"(Flight\s*)?Duty\s*Period.*\(max\)|\bFDP\b.*\(max\)", c, re.I)), None)
+
+    # Date (optional)
+    date_candidates = [c for c in cols if re.search(r"(date|day)", c, re.I)]
+    date_col = None
+    for c in date_candidates:
+        parsed = pd.to_datetime(dv_df[c], errors="coerce", dayfirst=True)
+        if parsed.notna().mean() > 0.5:
+            date_col = c
+            break
+
+    return {
+        "pilot_col": pilot_col, "c7": c7, "c30": c30,
+        "rest_after_act": rest_after_act, "rest_after_min": rest_after_min,
+        "rest_before_act": rest_before_act, "rest_before_min": rest_before_min,
+        "fdp_act": fdp_act, "fdp_max": fdp_max, "date_col": date_col,
+        "all_cols": cols,
+    }
+
+
+# -----------------------------
+# Derived tables
+# -----------------------------
+def streak_runs(df, flag_col):
+    """Return every run of flagged, calendar-consecutive days per pilot.
+
+    Rows are sorted by pilot and date; a run continues while the previous row
+    belongs to the same pilot, is flagged and falls exactly one day earlier.
+    """
+
+    if df.empty:
+        return pd.DataFrame(columns=STREAK_COLUMNS)
+    work = df[["Pilot", "Date", flag_col]].sort_values(["Pilot", "Date"], kind="mergesort")
+    flagged = work[flag_col].astype(bool).to_numpy()
+    pilots = work["Pilot"].to_numpy()
+    dates = pd.to_datetime(work["Date"]).to_numpy()
+
+    continues = np.zeros(len(work), dtype=bool)
+    continues[1:] = (
+        flagged[1:]
+        & flagged[:-1]
+        & (pilots[1:] == pilots[:-1])
+        & (dates[1:] - dates[:-1] == np.timedelta64(1, "D"))
+    )
+    run_id = np.cumsum(~continues)[flagged]
+    runs = (
+        pd.DataFrame({"Pilot": pilots[flagged], "Date": dates[flagged], "Run": run_id})
+        .groupby("Run", sort=False)
+        .agg(
+            Pilot=("Pilot", "first"),
+            StartDate=("Date", "first"),
+            EndDate=("Date", "last"),
+            ConsecutiveDays=("Date", "size"),
+        )
+    )
+    if runs.empty:
+        return pd.DataFrame(columns=STREAK_COLUMNS)
+    runs["StartDate"] = runs["StartDate"].dt.strftime("%Y-%m-%d")
+    runs["EndDate"] = runs["EndDate"].dt.strftime("%Y-%m-%d")
+    return runs.sort_values(["Pilot", "StartDate"]).reset_index(drop=True)[STREAK_COLUMNS]
+
+
+def filter_streaks(runs, min_consecutive=3):
+    selected = runs[runs["ConsecutiveDays"] >= min_consecutive]
+    if selected.empty:
+        return pd.DataFrame(columns=STREAK_COLUMNS)
+    return selected.reset_index(drop=True)
+
+
+def streaks(df, flag_col, min_consecutive=3):
+    return filter_streaks(streak_runs(df, flag_col), min_consecutive)
+
+
+def _coalesce_datetime_columns(df, primary_col, fallback_cols, parsed=None):
+    parsed = parsed or _DatetimeColumns(df)
+
+    series = parsed(primary_col)
+    if fallback_cols:
+        # Prefer the primary column values and only fall back when they're missing.
+        # Previously we let the fallback columns override the detected "Date"
+        # column which caused multi-leg duties (with different report times)
+        # to be split across multiple days even when the CSV already provided a
+        # single date value for the duty.  By combining the fallback values into
+        # the primary series instead of the other way around we preserve the
+        # duty-day date and only use begin/report timestamps when the primary
+        # column is blank.
+        for col in fallback_cols:
+            series = series.combine_first(parsed(col))
+    return series
+
+
+def _normalize_dates(series):
+    if series.empty:
+        return series
+    dtype = series.dtype
+    if hasattr(dtype, "tz") and dtype.tz is not None:
+        try:
+            series = series.dt.tz_convert(None)
+        except TypeError:
+            series = series.dt.tz_localize(None)
+    return series.dt.floor("D")
+
+
+def duty_days_from_markers(pilots, dates, hours, boundary):
+    """Collapse duty rows into duty days closed by rest-marker rows.
+
+    Per pilot, rows are ordered by date (then file order) and each row whose
+    ``boundary`` flag is set closes the running duty day. A day starts on the
+    date of its first dated row and keeps the longest duty hours seen; days
+    without any parsed hours are dropped.
+    """
+
+    frame = pd.DataFrame({
+        "Pilot": pilots,
+        "Date": dates,
+        "DutyHours": hours,
+        "Boundary": np.asarray(boundary, dtype=bool),
+        "__row_order": np.arange(len(pilots)),
+    })
+    frame = frame.dropna(subset=["Pilot", "Date"])
+    if frame.empty:
+        return pd.DataFrame(columns=["Pilot", "Date", "DutyHours"])
+    frame = frame.sort_values(["Pilot", "Date", "__row_order"])
+
+    pilot_values = frame["Pilot"].to_numpy()
+    closed = frame["Boundary"].to_numpy()
+    starts = np.ones(len(frame), dtype=bool)
+    starts[1:] = closed[:-1] | (pilot_values[1:] != pilot_values[:-1])
+    frame["__segment"] = np.cumsum(starts)
+
+    days = frame.groupby("__segment", sort=False).agg(
+        Pilot=("Pilot", "first"),
+        Date=("Date", "first"),
+        DutyHours=("DutyHours", "max"),
+    )
+    days = days.dropna(subset=["DutyHours"]).reset_index(drop=True)
+    days["DutyHours"] = days["DutyHours"].astype(float)
+    return days
+
+
+def build_duty_table(df, pilot_col, date_col, duty_col, min_hours=12.0, begin_cols=None, end_marker_col=None,
+                     parsed=None):
+    df = df.copy()
+    df[pilot_col] = df[pilot_col].ffill()
+    parsed = parsed or _DatetimeColumns(df)
+
+    begin_cols = begin_cols or []
+    date_series = _coalesce_datetime_columns(df, date_col, begin_cols, parsed)
+    normalized_date = _normalize_dates(date_series)
+    if begin_cols:
+        primary_begin = begin_cols[0]
+        fallback_begin = begin_cols[1:]
+        begin_series = _normalize_dates(_coalesce_datetime_columns(df, primary_begin, fallback_begin, parsed))
+        # Prefer the duty start/report date when available so that duties that
+        # cross midnight remain associated with the calendar day on which they
+        # began instead of appearing as duplicate long-duty days on the
+        # following date.
+        normalized_date = begin_series.combine_first(normalized_date)
+
+    duty_hours = parse_duration_series(df[duty_col])
+
+    work = None
+    if end_marker_col and end_marker_col in df.columns:
+        marker_series = df[end_marker_col].astype(str).str.strip()
+        boundary = marker_series.str.contains(r"\brest\b", case=False, na=False)
+        work = duty_days_from_markers(df[pilot_col], normalized_date, duty_hours, boundary)
+        if work.empty:
+            work = None
+    if work is None:
+        work = pd.DataFrame({
+            "Pilot": df[pilot_col],
+            "Date": normalized_date,
+            "DutyHours": duty_hours,
+        })
+    work = work.dropna(subset=["Pilot", "Date", "DutyHours"])
+    if not work.empty:
+        work["Date"] = _normalize_dates(pd.to_datetime(work["Date"], errors="coerce"))
+        work = work.sort_values(["Pilot", "Date"]).groupby(["Pilot", "Date"], as_index=False)["DutyHours"].max()
+    else:
+        work = pd.DataFrame(columns=["Pilot", "Date", "DutyHours"])
+    work["LongDuty"] = work["DutyHours"] >= float(min_hours)
+    return work
+
+
+def summarize_long_duty_days(df, pilot_col, date_col, duty_col, rest_marker_col, begin_cols=None,
+                             min_hours=12.0, parsed=None):
+    """Count duty days of ``min_hours`` or more using the rest marker as the day boundary.
+
+    Returns ``(summary, detail)``, or ``None`` when no duty day can be
+    reconstructed from the selected columns.
+    """
+
+    parsed = parsed or _DatetimeColumns(df)
+    pilots = df[pilot_col].ffill()
+    duty_hours = parse_duration_series(df[duty_col])
+    # Build a date series combining the date column + begin/report times
+    duty_dates = _normalize_dates(_coalesce_datetime_columns(df, date_col, begin_cols or [], parsed))
+    boundary = df[rest_marker_col].astype(str).str.contains("rest", case=False, na=False)
+
+    duty_days = duty_days_from_markers(pilots, duty_dates, duty_hours, boundary)
+    if duty_days.empty:
+        return None
+
+    # Normalize and filter long duty days
+    duty_days["Date"] = duty_days["Date"].dt.date
+    duty_days["DutyHours"] = duty_days["DutyHours"].round(2)
+    duty_days["LongDuty"] = duty_days["DutyHours"] >= float(min_hours)
+
+    long_only = duty_days[duty_days["LongDuty"]].copy()
+
+    # Deduplicate: one row per (Pilot, Date), keeping the FINAL/MAX duty hours
+    detail = (
+        long_only.sort_values(["Pilot", "Date", "DutyHours"], ascending=[True, True, False])
+                 .groupby(["Pilot", "Date"], as_index=False)
+                 .first()
+    )
+
+    # Summary built from DEDUPLICATED rows
+    summary = (
+        detail.groupby("Pilot")
+            .agg(
+                Days=("Date", "nunique"),
+                AvgHours=("DutyHours", "mean"),
+                MaxHours=("DutyHours", "max")
+            )
+            .reset_index()
+    )
+
+    summary["AvgHours"] = summary["AvgHours"].round(2)
+    summary["MaxHours"] = summary["MaxHours"].round(2)
+    return summary, detail
+
+
+def build_consecutive_short_rest_rows(df, pilot_col, date_col, rest_before_col, rest_after_col, short_thresh=11.0,
+                                      parsed=None):
+    work = df[[pilot_col, date_col, rest_before_col, rest_after_col]].copy()
+    work.columns = ["Pilot", "DateRaw", "RestBeforeRaw", "RestAfterRaw"]
+    work["Pilot"] = work["Pilot"].ffill()
+
+    if date_col:
+        if parsed is not None:
+            work["DutyDate"] = parsed(date_col)
+        else:
+            work["DutyDate"] = pd.to_datetime(work["DateRaw"], errors="coerce", dayfirst=True)
+    else:
+        work["DutyDate"] = pd.NaT
+
+    work["RestBeforeHours"] = parse_duration_series(work["RestBeforeRaw"])
+    work["RestAfterHours"] = parse_duration_series(work["RestAfterRaw"])
+    work = work.dropna(subset=["Pilot", "RestBeforeHours", "RestAfterHours"])
+
+    if date_col:
+        work = work.dropna(subset=["DutyDate"])
+
+    if not work.empty:
+        group_keys = ["Pilot"] + (["DutyDate"] if date_col else [])
+        aggdict = {"RestBeforeHours": "min", "RestAfterHours": "max"}
+        grouped = work.groupby(group_keys, as_index=False).agg(aggdict)
+    else:
+        grouped = work
+
+    grouped["BothShort"] = (grouped["RestBeforeHours"] < float(short_thresh)) & (
+        grouped["RestAfterHours"] < float(short_thresh)
+    )
+
+    flagged = grouped[grouped["BothShort"]].copy()
+    if date_col and "DutyDate" in flagged.columns:
+        flagged["DutyDate"] = flagged["DutyDate"].dt.date
+
+    flagged = flagged.drop(columns=["BothShort"], errors="ignore")
+    flagged = flagged.rename(columns={
+        "RestBeforeHours": "RestBefore_act (hrs)",
+        "RestAfterHours": "RestAfter_act (hrs)",
+    })
+    for col in ["RestBefore_act (hrs)", "RestAfter_act (hrs)"]:
+        if col in flagged.columns:
+            flagged[col] = flagged[col].round(2)
+    return flagged.sort_values(["Pilot"] + (["DutyDate"] if "DutyDate" in flagged.columns else []))
+
+
+def summarize_min_rest_days(df, pilot_col, date_col, rest_prior_col, short_thresh=11.0, lower_bound=10.0,
+                            parsed=None):
+    work = df[[pilot_col, rest_prior_col]].copy()
+    work.columns = ["Pilot", "RestPriorRaw"]
+    work["Pilot"] = work["Pilot"].ffill()
+
+    work["RestPriorHours"] = parse_duration_series(work["RestPriorRaw"])
+
+    if date_col:
+        dates = parsed(date_col) if parsed is not None else pd.to_datetime(df[date_col], errors="coerce", dayfirst=True)
+        work["DutyDate"] = _normalize_dates(dates)
+    else:
+        work["DutyDate"] = pd.NaT
+
+    min_rest_lower = float(lower_bound)
+    min_rest_upper = float(short_thresh)
+
+    flagged = work[
+        work["RestPriorHours"].between(min_rest_lower, min_rest_upper, inclusive="left")
+    ].dropna(subset=["Pilot", "RestPriorHours"])
+
+    summary = pd.DataFrame(columns=["Pilot", "DaysWithMinRest"])
+    detail = pd.DataFrame(columns=["Pilot", "DutyDate", "RestPriorHours"])
+
+    if flagged.empty:
+        return summary, detail
+
+    if date_col:
+        flagged = flagged.dropna(subset=["DutyDate"])
+        if flagged.empty:
+            return summary, detail
+
+        detail = flagged.groupby(["Pilot", "DutyDate"], as_index=False)["RestPriorHours"].min()
+        summary = detail.groupby("Pilot", as_index=False).agg(DaysWithMinRest=("DutyDate", "nunique"))
+    else:
+        summary = flagged.groupby("Pilot", as_index=False).agg(DaysWithMinRest=("RestPriorHours", "count"))
+        detail = flagged.groupby("Pilot", as_index=False).agg(RestPriorHours=("RestPriorHours", "min"))
+
+    if "RestPriorHours" in detail.columns:
+        detail["RestPriorHours"] = detail["RestPriorHours"].round(2)
+
+    return summary, detail
+
+
+def coverage_table(df, flag_col_name):
+    cov = df.groupby("Pilot").agg(
+        FirstDate=("Date", "min"),
+        LastDate=("Date", "max"),
+        DaysCount=("Date", "nunique"),
+        FlaggedDays=(flag_col_name, "sum")
+    ).reset_index().sort_values("Pilot")
+    cov["FirstDate"] = cov["FirstDate"].dt.date
+    cov["LastDate"] = cov["LastDate"].dt.date
+    return cov
+
+
+# -----------------------------
+# One-pass analysis
+# -----------------------------
+@dataclass
+class FtlColumns:
+    pilot: Optional[str] = None
+    date: Optional[str] = None
+    begin: List[str] = field(default_factory=list)
+    duty: Optional[str] = None
+    duty_boundary: Optional[str] = None
+    rest_before: Optional[str] = None
+    rest_after: Optional[str] = None
+
+
+@dataclass
+class FtlAnalysis:
+    """Inferred columns and derived tables for one FTL export.
+
+    Tables that depend on a user-selected column (minimum rest days and the
+    12+ hr duty day counter) are memoised per column choice, so reruns with
+    the same selection reuse the earlier result.
+    """
+
+    frame: pd.DataFrame
+    columns: FtlColumns
+    duty_days: Optional[pd.DataFrame] = None
+    duty_streaks: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=STREAK_COLUMNS))
+    rest_pairs: pd.DataFrame = field(default_factory=pd.DataFrame)
+    _parsed: Optional[_DatetimeColumns] = field(default=None, repr=False)
+    _memo: Dict[Tuple[Any, ...], Any] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._parsed is None:
+            self._parsed = _DatetimeColumns(self.frame)
+
+    def streaks(self, min_consecutive: int) -> pd.DataFrame:
+        return filter_streaks(self.duty_streaks, min_consecutive)
+
+    def default_rest_prior_column(self) -> Optional[str]:
+        """Return the rest prior column, else the first rest-like column, else the first column."""
+
+        columns = list(self.frame.columns)
+        if self.columns.rest_before in columns:
+            return self.columns.rest_before
+        rest_like = [c for c in columns if re.search(r"rest", str(c), re.I)]
+        return _default_choice(rest_like or columns, None)
+
+    def min_rest_days(self, rest_col: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        key = ("min_rest", rest_col)
+        if key not in self._memo:
+            self._memo[key] = summarize_min_rest_days(
+                self.frame,
+                self.columns.pilot,
+                self.columns.date,
+                rest_col,
+                short_thresh=SHORT_REST_HOURS,
+                lower_bound=MIN_REST_LOWER_HOURS,
+                parsed=self._parsed,
+            )
+        return self._memo[key]
+
+    def long_duty_days(
+        self, pilot_col: str, date_col: str, duty_col: str, rest_marker_col: str
+    ) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        key = ("long_duty", pilot_col, date_col, duty_col, rest_marker_col)
+        if key not in self._memo:
+            self._memo[key] = summarize_long_duty_days(
+                self.frame,
+                pilot_col,
+                date_col,
+                duty_col,
+                rest_marker_col,
+                begin_cols=self.columns.begin,
+                min_hours=LONG_DUTY_HOURS,
+                parsed=self._parsed,
+            )
+        return self._memo[key]
+
+
+def _default_choice(columns: Iterable[str], preferred: Optional[str]) -> Optional[str]:
+    columns = list(columns)
+    if preferred in columns:
+        return preferred
+    return columns[0] if columns else None
+
+
+def analyze_ftl(df: pd.DataFrame) -> FtlAnalysis:
+    """Infer the FTL columns once and build every derived FTL table."""
+
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    parsed = _DatetimeColumns(df)
+
+    pilot_col, date_col = infer_common_columns(df, parsed)
+    begin_cols, _ = infer_begin_end_columns(df, date_col=date_col, parsed_series=parsed)
+    duty_col = infer_duty_column(df)
+    boundary_col = infer_duty_day_boundary_column(df)
+    rest_before_col, rest_after_col = infer_rest_pair_columns_ftl(df)
+    columns = FtlColumns(
+        pilot=pilot_col,
+        date=date_col,
+        begin=begin_cols,
+        duty=duty_col,
+        duty_boundary=boundary_col,
+        rest_before=rest_before_col,
+        rest_after=rest_after_col,
+    )
+    analysis = FtlAnalysis(frame=df, columns=columns, _parsed=parsed)
+    if not (pilot_col and date_col):
+        return analysis
+
+    if duty_col:
+        analysis.duty_days = build_duty_table(
+            df,
+            pilot_col,
+            date_col,
+            duty_col,
+            min_hours=LONG_DUTY_HOURS,
+            begin_cols=begin_cols,
+            end_marker_col=boundary_col,
+            parsed=parsed,
+        )
+        analysis.duty_streaks = streak_runs(analysis.duty_days, "LongDuty")
+
+    if rest_before_col and rest_after_col:
+        analysis.rest_pairs = build_consecutive_short_rest_rows(
+            df,
+            pilot_col,
+            date_col,
+            rest_before_col,
+            rest_after_col,
+            short_thresh=SHORT_REST_HOURS,
+            parsed=parsed,
+        )
+
+    rest_col = analysis.default_rest_prior_column()
+    if rest_col is not None:
+        analysis.min_rest_days(rest_col)
+
+    defaults = [_default_choice(df.columns, col) for col in (pilot_col, date_col, duty_col, boundary_col)]
+    if all(col is not None for col in defaults):
+        analysis.long_duty_days(*defaults)
+    return analysis
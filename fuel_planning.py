@@ -0,0 +1,781 @@
+"""ForeFlight/FL3XX matching and performance enrichment for the Fuel Planning Assistant.
+
+ForeFlight flights are paired with FL3XX legs by booking identifier first, then
+by a tail/route/time score. Fallback candidates are blocked by route
+(tail, departure, arrival) and by UTC departure date, so a ForeFlight flight is
+only scored against FL3XX legs that could pass the departure-gap limit.
+
+Performance payloads are fetched concurrently with one ``requests.Session`` per
+worker, and successful payloads are kept in a :class:`fl3xx_api.PayloadCache`
+keyed by ForeFlight flight ID.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import re
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from fl3xx_api import PayloadCache, fetch_many, unique_ids
+from foreflight_utils import (
+    extract_first,
+    extract_foreflight_flights,
+    normalize_airport,
+    normalize_tail,
+    normalize_text,
+    parse_datetime,
+)
+
+FORE_FLIGHT_BASE_URL = "https://public-api.foreflight.com/public/api/Flights/flights"
+FORE_FLIGHT_PERFORMANCE_URL = "https://public-api.foreflight.com/public/api/Flights/{flight_id}/performance"
+TAG_PATTERN = re.compile(r"^[A-Z]{5}\d?$")
+BOOKING_MATCH_SCORE = 100
+TAIL_MATCH_SCORE = 40
+AIRPORT_MATCH_SCORE = 25
+DEPARTURE_WITHIN_30_MIN_SCORE = 20
+ARRIVAL_WITHIN_30_MIN_SCORE = 10
+DURATION_WITHIN_20_MIN_SCORE = 10
+FALLBACK_MATCH_MIN_SCORE = 90
+MAX_FALLBACK_DEPARTURE_DIFF_MINUTES = 180
+DEFAULT_PERFORMANCE_WORKERS = 8
+# Dispatch re-plans flights during the day, so cached performance goes stale quickly.
+DEFAULT_PERFORMANCE_CACHE_TTL_SECONDS = 300
+
+_PERFORMANCE = "foreflight_performance"
+# Any departure within MAX_FALLBACK_DEPARTURE_DIFF_MINUTES lands on the same or an adjacent UTC date.
+_DATE_BLOCK_SPAN = timedelta(minutes=MAX_FALLBACK_DEPARTURE_DIFF_MINUTES + 1)
+
+
+@dataclass
+class FlightRecord:
+    source: str
+    tail: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: Optional[datetime]
+    arrival_time: Optional[datetime]
+    duration_minutes: Optional[int]
+    flight_id: Optional[str]
+    booking_identifier: Optional[str]
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    foreflight_record: FlightRecord
+    fl3xx_record: FlightRecord
+    match_reason: str
+    confidence: str
+    score: int
+    departure_diff_minutes: Optional[int]
+    arrival_diff_minutes: Optional[int]
+    duration_diff_minutes: Optional[int]
+
+
+def _extract_booking_identifier_from_tags(tags: Any) -> Optional[str]:
+    if not isinstance(tags, list):
+        return None
+    for tag in tags:
+        normalized = normalize_text(tag)
+        if not normalized:
+            continue
+        candidate = normalized.upper()
+        if TAG_PATTERN.match(candidate):
+            return candidate
+    return None
+
+
+def _duration_minutes(start: Optional[datetime], end: Optional[datetime]) -> Optional[int]:
+    if not start or not end:
+        return None
+    delta = end - start
+    return int(round(delta.total_seconds() / 60))
+
+
+def _map_tail_type(value: Any) -> Optional[str]:
+    normalized = normalize_text(value)
+    if not normalized:
+        return None
+    upper = normalized.upper()
+    if upper in {"C25A", "C25B"}:
+        return "CJ"
+    return "Embraer"
+
+
+def infer_aircraft_type(
+    legs: Iterable[Mapping[str, Any]],
+    tail: Optional[str],
+) -> Optional[str]:
+    """Return ``"CJ"`` or ``"Embraer"`` from the first FL3XX leg flown by ``tail``."""
+
+    normalized_tail = normalize_tail(tail)
+    if not normalized_tail:
+        return None
+    for leg in legs:
+        if normalize_tail(leg.get("tail")) != normalized_tail:
+            continue
+        for key in ("aircraftCategory", "assignedAircraftType", "aircraftType", "aircraftClass"):
+            inferred = _map_tail_type(leg.get(key))
+            if inferred:
+                return inferred
+    return None
+
+
+def foreflight_record(flight: Mapping[str, Any]) -> Optional[FlightRecord]:
+    tail = normalize_tail(
+        extract_first(
+            flight,
+            "aircraftRegistration",
+            "registration",
+            "tail",
+            "tailNumber",
+            "aircraft",
+        )
+    )
+    if not tail and isinstance(flight.get("aircraft"), Mapping):
+        tail = normalize_tail(extract_first(flight["aircraft"], "registration", "tailNumber"))
+
+    departure_airport = normalize_airport(
+        extract_first(
+            flight,
+            "departure",
+            "departureAirport",
+            "origin",
+            "departureAirportCode",
+            "departureAirportIcao",
+        )
+    )
+    arrival_airport = normalize_airport(
+        extract_first(
+            flight,
+            "destination",
+            "destinationAirport",
+            "arrival",
+            "arrivalAirport",
+            "destinationAirportCode",
+            "destinationAirportIcao",
+        )
+    )
+
+    departure_time = parse_datetime(
+        extract_first(
+            flight,
+            "departureTimeUtc",
+            "departureTime",
+            "scheduledDepartureTime",
+            "scheduledDeparture",
+            "departure",
+        )
+    )
+    arrival_time = parse_datetime(
+        extract_first(
+            flight,
+            "arrivalTimeUtc",
+            "arrivalTime",
+            "scheduledArrivalTime",
+            "scheduledArrival",
+            "arrival",
+        )
+    )
+
+    if not tail or not departure_airport or not arrival_airport:
+        return None
+
+    booking_identifier = normalize_text(extract_first(flight, "bookingIdentifier", "booking_identifier"))
+    if not booking_identifier:
+        booking_identifier = _extract_booking_identifier_from_tags(flight.get("tags"))
+
+    return FlightRecord(
+        source="ForeFlight",
+        tail=tail,
+        departure_airport=departure_airport,
+        arrival_airport=arrival_airport,
+        departure_time=departure_time,
+        arrival_time=arrival_time,
+        duration_minutes=_duration_minutes(departure_time, arrival_time),
+        flight_id=normalize_text(extract_first(flight, "flightId", "flight_id", "id")),
+        booking_identifier=booking_identifier,
+    )
+
+
+def fl3xx_record(leg: Mapping[str, Any]) -> Optional[FlightRecord]:
+    tail = normalize_tail(extract_first(leg, "tail", "aircraftRegistration", "registration"))
+    departure_airport = normalize_airport(
+        extract_first(
+            leg,
+            "departure_airport",
+            "departureAirport",
+            "departure",
+            "origin",
+            "from",
+        )
+    )
+    arrival_airport = normalize_airport(
+        extract_first(
+            leg,
+            "arrival_airport",
+            "arrivalAirport",
+            "destination",
+            "arrival",
+            "to",
+        )
+    )
+
+    departure_time = parse_datetime(
+        extract_first(
+            leg,
+            "dep_time",
+            "departureTimeUtc",
+            "departureTime",
+            "departure_time",
+            "scheduledDeparture",
+        )
+    )
+    arrival_time = parse_datetime(
+        extract_first(
+            leg,
+            "arrival_time",
+            "arrivalTimeUtc",
+            "arrivalTime",
+            "arrival_time",
+            "scheduledArrival",
+        )
+    )
+
+    if not tail or not departure_airport or not arrival_airport:
+        return None
+
+    return FlightRecord(
+        source="FL3XX",
+        tail=tail,
+        departure_airport=departure_airport,
+        arrival_airport=arrival_airport,
+        departure_time=departure_time,
+        arrival_time=arrival_time,
+        duration_minutes=_duration_minutes(departure_time, arrival_time),
+        flight_id=normalize_text(extract_first(leg, "leg_id", "flightId", "id")),
+        booking_identifier=normalize_text(extract_first(leg, "bookingIdentifier", "booking_identifier")),
+    )
+
+
+def build_records(records: Iterable[Optional[FlightRecord]]) -> List[FlightRecord]:
+    return [record for record in records if record is not None]
+
+
+def _record_key(record: FlightRecord) -> Tuple[str, str, str]:
+    return (record.tail, record.departure_airport, record.arrival_airport)
+
+
+def _time_diff_minutes(left: Optional[datetime], right: Optional[datetime]) -> Optional[int]:
+    if not left or not right:
+        return None
+    return int(round(abs((left - right).total_seconds()) / 60))
+
+
+def _int_diff_minutes(left: Optional[int], right: Optional[int]) -> Optional[int]:
+    if left is None or right is None:
+        return None
+    return abs(left - right)
+
+
+def _classify_match_confidence(score: int, match_reason: str) -> str:
+    if match_reason == "booking_identifier":
+        return "High"
+    if score >= 110:
+        return "High"
+    if score >= FALLBACK_MATCH_MIN_SCORE:
+        return "Medium"
+    return "Low"
+
+
+def score_match(
+    foreflight_record: FlightRecord,
+    fl3xx_record: FlightRecord,
+) -> Tuple[int, Optional[int], Optional[int], Optional[int]]:
+    score = 0
+    if foreflight_record.tail == fl3xx_record.tail:
+        score += TAIL_MATCH_SCORE
+    if foreflight_record.departure_airport == fl3xx_record.departure_airport:
+        score += AIRPORT_MATCH_SCORE
+    if foreflight_record.arrival_airport == fl3xx_record.arrival_airport:
+        score += AIRPORT_MATCH_SCORE
+
+    departure_diff_minutes = _time_diff_minutes(
+        foreflight_record.departure_time,
+        fl3xx_record.departure_time,
+    )
+    if departure_diff_minutes is not None and departure_diff_minutes <= 30:
+        score += DEPARTURE_WITHIN_30_MIN_SCORE
+
+    arrival_diff_minutes = _time_diff_minutes(
+        foreflight_record.arrival_time,
+        fl3xx_record.arrival_time,
+    )
+    if arrival_diff_minutes is not None and arrival_diff_minutes <= 30:
+        score += ARRIVAL_WITHIN_30_MIN_SCORE
+
+    duration_diff_minutes = _int_diff_minutes(
+        foreflight_record.duration_minutes,
+        fl3xx_record.duration_minutes,
+    )
+    if duration_diff_minutes is not None and duration_diff_minutes <= 20:
+        score += DURATION_WITHIN_20_MIN_SCORE
+
+    return score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes
+
+
+class _CandidateIndex:
+    """Unmatched FL3XX records, blocked by booking identifier and by route + departure date.
+
+    Records are referred to by their position in the input list; matching a
+    record only marks it taken, and the blocks skip taken records lazily.
+    """
+
+    def __init__(self, records: List[FlightRecord]) -> None:
+        self.records = records
+        self.available = [True] * len(records)
+        self.by_booking: Dict[str, Deque[int]] = {}
+        self.by_route: Dict[Tuple[str, str, str], Dict[Optional[date], List[int]]] = {}
+        self.route_order: Dict[Tuple[str, str, str], int] = {}
+        for position, record in enumerate(records):
+            if record.booking_identifier:
+                self.by_booking.setdefault(record.booking_identifier, deque()).append(position)
+            key = _record_key(record)
+            self.route_order.setdefault(key, len(self.route_order))
+            day = record.departure_time.date() if record.departure_time else None
+            self.by_route.setdefault(key, {}).setdefault(day, []).append(position)
+
+    def take_booking(self, booking_identifier: str) -> Optional[int]:
+        queue = self.by_booking.get(booking_identifier)
+        while queue:
+            position = queue.popleft()
+            if self.available[position]:
+                return position
+        return None
+
+    def route_candidates(self, record: FlightRecord) -> Tuple[bool, List[int]]:
+        """Return whether any record shares the route, and the ones near its departure date."""
+
+        blocks = self.by_route.get(_record_key(record), {})
+        has_route = any(self.available[position] for positions in blocks.values() for position in positions)
+        if not has_route:
+            return False, []
+        if record.departure_time is None:
+            days: Iterable[Optional[date]] = blocks.keys()
+        else:
+            days = {
+                (record.departure_time - _DATE_BLOCK_SPAN).date(),
+                record.departure_time.date(),
+                (record.departure_time + _DATE_BLOCK_SPAN).date(),
+                None,
+            }
+        positions = [
+            position
+            for day in days
+            for position in blocks.get(day, ())
+            if self.available[position]
+        ]
+        positions.sort()
+        return True, positions
+
+    def take(self, position: int) -> FlightRecord:
+        self.available[position] = False
+        return self.records[position]
+
+    def remaining(self) -> List[FlightRecord]:
+        positions = [position for position, available in enumerate(self.available) if available]
+        positions.sort(key=lambda position: (self.route_order[_record_key(self.records[position])], position))
+        return [self.records[position] for position in positions]
+
+
+def match_records(
+    foreflight_records: List[FlightRecord],
+    fl3xx_records: List[FlightRecord],
+) -> Tuple[List[MatchResult], List[FlightRecord], List[FlightRecord]]:
+    """Pair ForeFlight flights with FL3XX legs.
+
+    Returns the matches plus the ForeFlight and FL3XX records left unmatched.
+    A shared booking identifier always wins. Otherwise the best tail/route/time
+    score on the same route is taken if it reaches
+    ``FALLBACK_MATCH_MIN_SCORE`` and departs within
+    ``MAX_FALLBACK_DEPARTURE_DIFF_MINUTES``.
+    """
+
+    index = _CandidateIndex(fl3xx_records)
+    matches: List[MatchResult] = []
+    unmatched_foreflight: List[FlightRecord] = []
+
+    for ff_record in foreflight_records:
+        position = index.take_booking(ff_record.booking_identifier) if ff_record.booking_identifier else None
+        if position is not None:
+            matched = index.take(position)
+            matches.append(
+                MatchResult(
+                    foreflight_record=ff_record,
+                    fl3xx_record=matched,
+                    match_reason="booking_identifier",
+                    confidence="High",
+                    score=BOOKING_MATCH_SCORE,
+                    departure_diff_minutes=_time_diff_minutes(ff_record.departure_time, matched.departure_time),
+                    arrival_diff_minutes=_time_diff_minutes(ff_record.arrival_time, matched.arrival_time),
+                    duration_diff_minutes=_int_diff_minutes(ff_record.duration_minutes, matched.duration_minutes),
+                )
+            )
+            continue
+
+        has_route, positions = index.route_candidates(ff_record)
+        if not has_route:
+            unmatched_foreflight.append(ff_record)
+            continue
+
+        scored_candidates: List[Tuple[int, Optional[int], Optional[int], Optional[int], int]] = []
+        for position in positions:
+            score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes = score_match(
+                ff_record, fl3xx_records[position]
+            )
+            if departure_diff_minutes is not None and departure_diff_minutes > MAX_FALLBACK_DEPARTURE_DIFF_MINUTES:
+                continue
+            scored_candidates.append(
+                (score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes, position)
+            )
+
+        if not scored_candidates:
+            unmatched_foreflight.append(ff_record)
+            continue
+
+        best_score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes, position = min(
+            scored_candidates,
+            key=lambda item: (
+                -item[0],
+                item[1] if item[1] is not None else float("inf"),
+                item[2] if item[2] is not None else float("inf"),
+                item[3] if item[3] is not None else float("inf"),
+                item[4],
+            ),
+        )
+        if best_score < FALLBACK_MATCH_MIN_SCORE:
+            unmatched_foreflight.append(ff_record)
+            continue
+        matches.append(
+            MatchResult(
+                foreflight_record=ff_record,
+                fl3xx_record=index.take(position),
+                match_reason="tail_route_time",
+                confidence=_classify_match_confidence(best_score, "tail_route_time"),
+                score=best_score,
+                departure_diff_minutes=departure_diff_minutes,
+                arrival_diff_minutes=arrival_diff_minutes,
+                duration_diff_minutes=duration_diff_minutes,
+            )
+        )
+
+    return matches, unmatched_foreflight, index.remaining()
+
+
+def fetch_performance(
+    flight_id: str,
+    *,
+    token: str,
+    session: Optional[requests.Session] = None,
+) -> Optional[Mapping[str, Any]]:
+    url = FORE_FLIGHT_PERFORMANCE_URL.format(flight_id=flight_id)
+    headers = {
+        "x-api-key": token,
+        "Accept": "application/json",
+    }
+    http = session if session is not None else requests
+    response = http.get(url, headers=headers, timeout=30)
+    if not response.ok:
+        return None
+    return response.json()
+
+
+def fetch_performance_payloads(
+    flight_ids: Iterable[Any],
+    *,
+    token: str,
+    max_workers: int = DEFAULT_PERFORMANCE_WORKERS,
+    cache: Optional[PayloadCache] = None,
+    fetch_performance_fn: Optional[Callable[..., Optional[Mapping[str, Any]]]] = None,
+) -> Dict[str, Optional[Mapping[str, Any]]]:
+    """Return ``{flight_id: payload}`` for ForeFlight flights, ``None`` where unavailable.
+
+    Payloads found in ``cache`` are reused; the rest are requested concurrently
+    and successful ones are written back. Failed requests are not cached.
+    """
+
+    fetch_performance_fn = fetch_performance_fn or fetch_performance
+    identifiers = unique_ids(flight_ids)
+
+    payloads: Dict[str, Optional[Mapping[str, Any]]] = {}
+    to_fetch: List[str] = []
+    for flight_id in identifiers:
+        hit, payload = (False, None)
+        if cache is not None:
+            hit, payload = cache.get((_PERFORMANCE, FORE_FLIGHT_PERFORMANCE_URL, flight_id))
+        if hit:
+            payloads[flight_id] = payload
+        else:
+            to_fetch.append(flight_id)
+
+    fetched = fetch_many(
+        to_fetch,
+        lambda flight_id, http: fetch_performance_fn(flight_id, token=token, session=http),
+        max_workers=max_workers,
+    )
+    for flight_id, (ok, payload) in fetched.items():
+        if not ok:
+            if not isinstance(payload, requests.RequestException):
+                raise payload
+            payload = None
+        payloads[flight_id] = payload
+        if payload and cache is not None:
+            cache.set((_PERFORMANCE, FORE_FLIGHT_PERFORMANCE_URL, flight_id), payload)
+
+    return {flight_id: payloads[flight_id] for flight_id in identifiers}
+
+
+def extract_performance_fields(payload: Mapping[str, Any]) -> Dict[str, Optional[float]]:
+    performance = payload.get("performance", {}) if isinstance(payload, Mapping) else {}
+    fuel = performance.get("fuel", {}) if isinstance(performance, Mapping) else {}
+    weights = performance.get("weights", {}) if isinstance(performance, Mapping) else {}
+    return {
+        "fuel_to_destination": fuel.get("fuelToDestination"),
+        "taxi_fuel": fuel.get("taxiFuel"),
+        "flight_fuel": fuel.get("flightFuel"),
+        "landing_fuel": fuel.get("landingFuel"),
+        "total_fuel": fuel.get("totalFuel"),
+        "max_total_fuel": fuel.get("maxTotalFuel"),
+        "ramp_weight": weights.get("rampWeight"),
+        "max_ramp_weight": weights.get("maxRampWeight"),
+        "takeoff_weight": weights.get("takeOffWeight"),
+        "max_takeoff_weight": weights.get("maxTakeOffWeight"),
+        "landing_weight": weights.get("landingWeight"),
+        "max_landing_weight": weights.get("maxLandingWeight"),
+        "zero_fuel_weight": weights.get("zeroFuelWeight"),
+        "max_zero_fuel_weight": weights.get("maxZeroFuelWeight"),
+    }
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if pd.isna(value):
+            return None
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def calculate_required_departure_fuel(
+    performance: Mapping[str, Any],
+    target_landing_fuel: float,
+) -> Optional[float]:
+    flight_fuel = _as_float(performance.get("flight_fuel"))
+    fuel_to_destination = _as_float(performance.get("fuel_to_destination"))
+    taxi_fuel = _as_float(performance.get("taxi_fuel")) or 0.0
+    burn_fuel = flight_fuel if flight_fuel is not None else fuel_to_destination
+    if burn_fuel is None:
+        return None
+    return burn_fuel + taxi_fuel + target_landing_fuel
+
+
+def _min_optional(*values: Optional[float]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    if not present:
+        return None
+    return min(present)
+
+
+def calculate_weight_limited_max_fuel(
+    performance: Mapping[str, Any],
+) -> Optional[float]:
+    total_fuel = _as_float(performance.get("total_fuel"))
+    if total_fuel is None:
+        return None
+
+    margins: List[float] = []
+    for weight_key, max_key in (
+        ("ramp_weight", "max_ramp_weight"),
+        ("takeoff_weight", "max_takeoff_weight"),
+        ("landing_weight", "max_landing_weight"),
+    ):
+        weight = _as_float(performance.get(weight_key))
+        max_weight = _as_float(performance.get(max_key))
+        if weight is not None and max_weight is not None:
+            margins.append(max_weight - weight)
+
+    if not margins:
+        return None
+
+    return total_fuel + min(margins)
+
+
+def _format_timestamp(value: Optional[datetime]) -> str:
+    if not value:
+        return "—"
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%MZ")
+
+
+def build_performance_rows(
+    matches: Iterable[MatchResult],
+    payloads: Mapping[str, Optional[Mapping[str, Any]]],
+    target_landing_fuel: float,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Return one fuel planning row per matched leg plus the legs missing performance."""
+
+    rows: List[Dict[str, Any]] = []
+    missing_performance: List[str] = []
+    for match in matches:
+        ff_record = match.foreflight_record
+        payload = payloads.get(ff_record.flight_id) if ff_record.flight_id else None
+        if not payload:
+            missing_performance.append(f"{ff_record.departure_airport} → {ff_record.arrival_airport}")
+            continue
+        perf = extract_performance_fields(payload)
+        required_departure_fuel = calculate_required_departure_fuel(perf, target_landing_fuel)
+        weight_limited_max_fuel = calculate_weight_limited_max_fuel(perf)
+        max_total_fuel = _as_float(perf.get("max_total_fuel"))
+        effective_max_fuel = _min_optional(max_total_fuel, weight_limited_max_fuel)
+
+        rows.append(
+            {
+                "Departure": ff_record.departure_airport,
+                "Arrival": ff_record.arrival_airport,
+                "Dep Time (UTC)": _format_timestamp(ff_record.departure_time),
+                "Arr Time (UTC)": _format_timestamp(ff_record.arrival_time),
+                "Match Reason": match.match_reason,
+                "Match Confidence": match.confidence,
+                "Match Score": match.score,
+                "Dep Δ (min)": match.departure_diff_minutes,
+                "Arr Δ (min)": match.arrival_diff_minutes,
+                "Duration Δ (min)": match.duration_diff_minutes,
+                "Fuel To Dest (lb)": perf.get("fuel_to_destination"),
+                "Taxi Fuel (lb)": perf.get("taxi_fuel"),
+                "Total Fuel (lb)": perf.get("total_fuel"),
+                "Max Total Fuel (lb)": max_total_fuel,
+                "Max Fuel by Weight (lb)": weight_limited_max_fuel,
+                "Effective Max Fuel (lb)": effective_max_fuel,
+                "Required Dep Fuel (lb)": required_departure_fuel,
+                "Fuel Price ($/unit)": None,
+                "Ramp Fee ($)": None,
+                "Waiver Fuel (unit)": None,
+            }
+        )
+    return rows, missing_performance
+
+
+def build_recommendations(df: pd.DataFrame) -> pd.DataFrame:
+    recommendations: List[str] = []
+    notes: List[str] = []
+
+    rows = df.to_dict(orient="records")
+
+    for index, row in enumerate(rows):
+        required_departure_fuel = _as_float(row.get("Required Dep Fuel (lb)"))
+        max_total_fuel = _as_float(row.get("Max Total Fuel (lb)"))
+        max_fuel_by_weight = _as_float(row.get("Max Fuel by Weight (lb)"))
+        effective_max_fuel = _as_float(row.get("Effective Max Fuel (lb)")) or _min_optional(
+            max_total_fuel, max_fuel_by_weight
+        )
+        fuel_price = _as_float(row.get("Fuel Price ($/unit)"))
+        ramp_fee = _as_float(row.get("Ramp Fee ($)"))
+        waiver_fuel = _as_float(row.get("Waiver Fuel (unit)"))
+
+        decision = "Review manually"
+        detail: List[str] = []
+
+        if required_departure_fuel is None:
+            detail.append("Missing required departure fuel.")
+        else:
+            decision = f"Take at least {required_departure_fuel:,.0f} lb"
+            detail.append("Meets target landing fuel requirement.")
+            if (
+                max_total_fuel is not None
+                and max_fuel_by_weight is not None
+                and max_fuel_by_weight < max_total_fuel
+            ):
+                detail.append(
+                    f"Weight limits cap max fuel at {max_fuel_by_weight:,.0f} lb."
+                )
+
+            if waiver_fuel and waiver_fuel > 0:
+                if effective_max_fuel is not None and waiver_fuel > effective_max_fuel:
+                    detail.append("Waiver threshold exceeds max fuel; cannot waive.")
+                elif required_departure_fuel >= waiver_fuel:
+                    decision = "Waiver already met"
+                    detail.append("Required fuel already meets waiver threshold.")
+                elif fuel_price is not None and ramp_fee is not None:
+                    extra_needed = waiver_fuel - required_departure_fuel
+                    extra_cost = extra_needed * fuel_price
+                    if ramp_fee > extra_cost:
+                        decision = "Buy waiver only"
+                        detail.append(
+                            f"Extra {extra_needed:,.0f} lb to waive saves about "
+                            f"${ramp_fee - extra_cost:,.0f}."
+                        )
+                    else:
+                        decision = "Take minimum and pay ramp fee"
+                        detail.append(
+                            f"Ramp fee (${ramp_fee:,.0f}) is cheaper than extra fuel "
+                            f"(${extra_cost:,.0f})."
+                        )
+                else:
+                    detail.append("Add fuel price and ramp fee to compare waiver savings.")
+
+        next_row = rows[index + 1] if index + 1 < len(rows) else None
+        next_price = _as_float(next_row.get("Fuel Price ($/unit)")) if next_row else None
+        if (
+            fuel_price is not None
+            and next_price is not None
+            and required_departure_fuel is not None
+            and effective_max_fuel is not None
+        ):
+            extra_capacity = effective_max_fuel - required_departure_fuel
+            if extra_capacity > 0 and fuel_price < next_price:
+                decision = f"{decision} • Tankering recommended"
+                detail.append(
+                    f"Fuel is ${next_price - fuel_price:,.2f}/unit cheaper than next leg."
+                )
+
+        recommendations.append(decision)
+        notes.append(" ".join(detail))
+
+    result = df.copy()
+    result["Recommendation"] = recommendations
+    result["Decision Notes"] = notes
+    return result
+
+
+__all__ = [
+    "DEFAULT_PERFORMANCE_CACHE_TTL_SECONDS",
+    "DEFAULT_PERFORMANCE_WORKERS",
+    "FALLBACK_MATCH_MIN_SCORE",
+    "FORE_FLIGHT_BASE_URL",
+    "FORE_FLIGHT_PERFORMANCE_URL",
+    "MAX_FALLBACK_DEPARTURE_DIFF_MINUTES",
+    "FlightRecord",
+    "MatchResult",
+    "build_performance_rows",
+    "build_recommendations",
+    "build_records",
+    "calculate_required_departure_fuel",
+    "calculate_weight_limited_max_fuel",
+    "extract_foreflight_flights",
+    "extract_performance_fields",
+    "fetch_performance",
+    "fetch_performance_payloads",
+    "fl3xx_record",
+    "foreflight_record",
+    "infer_aircraft_type",
+    "match_records",
+    "normalize_tail",
+    "score_match",
+]
@@ -5,6 +5,8 @@ from __future__ import annotations
 from datetime import UTC, datetime, time, timedelta
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
+import pandas as pd
+
 
 def roster_window_bounds(now: Optional[datetime] = None) -> tuple[datetime, datetime]:
     """Return default roster pull bounds: -10 days to +5 days (UTC)."""
@@ -77,26 +79,6 @@ def _event_route(event: Mapping[str, Any]) -> Optional[str]:
     return None
 
 
-def _latest_positioning_before(
-    entries: Iterable[Mapping[str, Any]],
-    *,
-    at_time: datetime,
-) -> Optional[Dict[str, Any]]:
-    best: Optional[Dict[str, Any]] = None
-    for entry in entries:
-        event_type = str(_pick(entry, ("type", "eventType")) or "").upper()
-        if event_type not in {"P", "POSITIONING"}:
-            continue
-        end = _to_utc(_pick(entry, ("to", "end", "arrivalTime", "in")))
-        if not isinstance(end, datetime) or end > at_time:
-            continue
-        if at_time - end > timedelta(hours=48):
-            continue
-        if best is None or end > best["end"]:
-            best = {"end": end, "route": _event_route(entry)}
-    return best
-
-
 def _crew_display(person: Mapping[str, Any]) -> str:
     first = str(person.get("firstName") or "").strip()
     last = str(person.get("lastName") or "").strip()
@@ -133,27 +115,52 @@ def _flight_payloads_from_row(row: Mapping[str, Any]) -> List[Mapping[str, Any]]
     return payloads
 
 
-def assign_roster_to_schedule_rows(
-    schedule_rows: List[Dict[str, Any]],
-    roster_rows: Iterable[Mapping[str, Any]],
-) -> List[Dict[str, Any]]:
-    """Attach crew, positioning, and roster flight details to schedule rows."""
+_META_FIELDS = (
+    "roster_flight_id",
+    "booking_reference",
+    "flight_status",
+    "workflow_name",
+    "pax_number",
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_POSITIONING_LOOKBACK_US = int(timedelta(hours=48) / timedelta(microseconds=1))
+
+
+def _key_text(key: Optional[Tuple[str, str, str, int]]) -> Optional[str]:
+    return "|".join(str(part) for part in key) if key else None
 
-    def _append_unique(target: List[str], values: Iterable[str]) -> None:
-        for value in values:
-            if value and value not in target:
-                target.append(value)
 
-    index_by_tuple: Dict[Tuple[str, str, str, int], Dict[str, Any]] = {}
-    index_by_task_id: Dict[str, Dict[str, Any]] = {}
+def _explode_roster(
+    roster_rows: Iterable[Mapping[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Flatten roster rows into flight, crew and positioning records."""
+
+    flight_records: List[Dict[str, Any]] = []
+    crew_records: List[Dict[str, Any]] = []
+    positioning_records: List[Dict[str, Any]] = []
 
-    for row in roster_rows:
+    for row_pos, row in enumerate(roster_rows):
         if not isinstance(row, MutableMapping):
             continue
 
-        entries = [
-            item for item in (row.get("entries") if isinstance(row.get("entries"), list) else []) if isinstance(item, Mapping)
-        ]
+        entries = row.get("entries") if isinstance(row.get("entries"), list) else []
+        for entry in entries:
+            if not isinstance(entry, Mapping):
+                continue
+            event_type = str(_pick(entry, ("type", "eventType")) or "").upper()
+            if event_type not in {"P", "POSITIONING"}:
+                continue
+            end = _to_utc(_pick(entry, ("to", "end", "arrivalTime", "in")))
+            if not isinstance(end, datetime):
+                continue
+            route = _event_route(entry)
+            positioning_records.append(
+                {
+                    "row_pos": row_pos,
+                    "end_us": _epoch_us(end),
+                    "label": f"{route} ({end.strftime('%Y-%m-%d %H:%MZ')})" if route else None,
+                }
+            )
 
         default_crew: List[str] = []
         user = row.get("user") if isinstance(row.get("user"), Mapping) else None
@@ -199,70 +206,172 @@ def assign_roster_to_schedule_rows(
                 continue
 
             crew_payload = flight.get("crew") if isinstance(flight.get("crew"), list) else []
-            crew_names = [
-                _crew_display(member)
-                for member in crew_payload
-                if isinstance(member, Mapping)
-            ]
+            crew_names = [_crew_display(member) for member in crew_payload if isinstance(member, Mapping)]
             if not crew_names:
                 crew_names = default_crew
 
-            positioning_markers: List[str] = []
-            if isinstance(start, datetime):
-                for crew_name in crew_names:
-                    positioning = _latest_positioning_before(entries, at_time=start)
-                    if positioning and positioning.get("route"):
-                        marker = (
-                            f"{crew_name}: {positioning['route']} "
-                            f"({positioning['end'].strftime('%Y-%m-%d %H:%MZ')})"
-                        )
-                        if marker not in positioning_markers:
-                            positioning_markers.append(marker)
-
-            bucket: Dict[str, Any] = {
-                "crew": list(crew_names),
-                "positioning": list(positioning_markers),
-                "roster_flight_id": str(_pick(flight, ("flightId", "id")) or ""),
-                "booking_reference": str(_pick(flight, ("bookingReference", "bookingIdentifier")) or ""),
-                "flight_status": str(_pick(flight, ("flightStatus", "status")) or ""),
-                "workflow_name": str(_pick(flight, ("workflowCustomName", "workflow")) or ""),
-                "pax_number": _pick(flight, ("paxNumber",)),
+            flight_pos = len(flight_records)
+            flight_records.append(
+                {
+                    "flight_pos": flight_pos,
+                    "row_pos": row_pos,
+                    "start_us": _epoch_us(start) if isinstance(start, datetime) else None,
+                    "task_id": task_id,
+                    "key": _key_text(key),
+                    "roster_flight_id": str(_pick(flight, ("flightId", "id")) or ""),
+                    "booking_reference": str(_pick(flight, ("bookingReference", "bookingIdentifier")) or ""),
+                    "flight_status": str(_pick(flight, ("flightStatus", "status")) or ""),
+                    "workflow_name": str(_pick(flight, ("workflowCustomName", "workflow")) or ""),
+                    "pax_number": _pick(flight, ("paxNumber",)),
+                }
+            )
+            crew_records.extend(
+                {"flight_pos": flight_pos, "crew_order": order, "crew": name} for order, name in enumerate(crew_names)
+            )
+
+    return flight_records, crew_records, positioning_records
+
+
+def _epoch_us(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _positioning_markers(
+    flights: pd.DataFrame,
+    crew: pd.DataFrame,
+    positioning_records: List[Dict[str, Any]],
+) -> pd.DataFrame:
+    """Match each flight to the latest positioning of its roster row via ``merge_asof``."""
+
+    empty = pd.DataFrame({"flight_pos": pd.Series(dtype="int64"), "crew_order": pd.Series(dtype="int64"), "marker": pd.Series(dtype=object)})
+    timed = flights.loc[flights["start_us"].notna(), ["flight_pos", "row_pos", "start_us"]]
+    if timed.empty or not positioning_records or crew.empty:
+        return empty
+
+    timed = timed.astype({"start_us": "int64", "row_pos": "int64"})
+    positioning = pd.DataFrame.from_records(positioning_records)
+    # Equal end times resolve to the first entry in roster order.
+    positioning = positioning.drop_duplicates(["row_pos", "end_us"], keep="first")
+
+    matched = pd.merge_asof(
+        timed.sort_values("start_us", kind="stable"),
+        positioning.sort_values("end_us", kind="stable"),
+        left_on="start_us",
+        right_on="end_us",
+        by="row_pos",
+        direction="backward",
+        tolerance=_POSITIONING_LOOKBACK_US,
+    )
+    matched = matched[matched["label"].notna()]
+    if matched.empty:
+        return empty
+
+    suffix = " " + matched["label"]
+    markers = crew.merge(
+        pd.DataFrame({"flight_pos": matched["flight_pos"].astype("int64"), "suffix": suffix}),
+        on="flight_pos",
+    )
+    markers["marker"] = markers["crew"] + ":" + markers["suffix"]
+    return markers[["flight_pos", "crew_order", "marker"]]
+
+
+def _schedule_frame(schedule_rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    records: List[Dict[str, Any]] = []
+    for position, row in enumerate(schedule_rows):
+        if row.get("category") not in {"Client Flight", "OCS Flight"}:
+            continue
+        start = row.get("start_utc") if isinstance(row.get("start_utc"), datetime) else None
+        dep = _airport(_pick(row, ("departure_airport",)))
+        arr = _airport(_pick(row, ("arrival_airport",)))
+        key = _flight_key(_normalize_tail(row.get("tail")), dep, arr, start)
+        records.append(
+            {
+                "position": position,
+                "task_id": str(row.get("task_id") or "").strip().lower(),
+                "key": _key_text(key),
             }
+        )
+    return pd.DataFrame(records, columns=["position", "task_id", "key"], dtype=object)
+
+
+def _match_schedule(schedule: pd.DataFrame, flights: pd.DataFrame) -> pd.DataFrame:
+    """Pair schedule rows with roster flights: task id first, then flight key."""
+
+    columns = ["position", "flight_pos"]
+    if schedule.empty:
+        return pd.DataFrame(columns=columns)
+
+    roster_tasks = flights.loc[flights["task_id"].notna(), ["flight_pos", "task_id"]]
+    task_pairs = schedule[["position", "task_id"]].merge(roster_tasks, on="task_id", how="inner")[columns]
+
+    remaining = schedule[~schedule["position"].isin(task_pairs["position"])].dropna(subset=["key"])
+    roster_keys = flights.loc[flights["key"].notna(), ["flight_pos", "key"]]
+    key_pairs = remaining[["position", "key"]].merge(roster_keys, on="key", how="inner")[columns]
+
+    pairs = pd.concat([task_pairs, key_pairs], ignore_index=True).astype("int64")
+    return pairs.sort_values(columns, kind="stable")
+
+
+def _collect_unique(pairs: pd.DataFrame, values: pd.DataFrame, column: str) -> Dict[int, List[str]]:
+    """Group ``column`` per schedule row, keeping first-seen order without repeats."""
 
-            if key is not None:
-                existing = index_by_tuple.setdefault(key, {"crew": [], "positioning": []})
-                _append_unique(existing["crew"], bucket["crew"])
-                for marker in bucket["positioning"]:
-                    if marker not in existing["positioning"]:
-                        existing["positioning"].append(marker)
-                for meta_field in (
-                    "roster_flight_id",
-                    "booking_reference",
-                    "flight_status",
-                    "workflow_name",
-                    "pax_number",
-                ):
-                    if not existing.get(meta_field) and bucket.get(meta_field) not in (None, ""):
-                        existing[meta_field] = bucket.get(meta_field)
-
-            if task_id:
-                existing = index_by_task_id.setdefault(task_id, {"crew": [], "positioning": []})
-                _append_unique(existing["crew"], bucket["crew"])
-                for marker in bucket["positioning"]:
-                    if marker not in existing["positioning"]:
-                        existing["positioning"].append(marker)
-                for meta_field in (
-                    "roster_flight_id",
-                    "booking_reference",
-                    "flight_status",
-                    "workflow_name",
-                    "pax_number",
-                ):
-                    if not existing.get(meta_field) and bucket.get(meta_field) not in (None, ""):
-                        existing[meta_field] = bucket.get(meta_field)
+    joined = pairs.merge(values, on="flight_pos").sort_values(["position", "flight_pos", "crew_order"], kind="stable")
+    joined = joined.drop_duplicates(["position", column], keep="first")
+    collected: Dict[int, List[str]] = {}
+    for position, value in zip(joined["position"].tolist(), joined[column].tolist()):
+        collected.setdefault(position, []).append(value)
+    return collected
+
+
+def _collect_meta(pairs: pd.DataFrame, flights: pd.DataFrame) -> Dict[str, Dict[int, Any]]:
+    """Pick each metadata field's first non-empty value per schedule row.
+
+    Later roster flights only replace a falsy value (e.g. ``paxNumber`` 0).
+    """
+
+    joined = pairs.merge(flights[["flight_pos", *_META_FIELDS]], on="flight_pos")
+    collected: Dict[str, Dict[int, Any]] = {}
+    for field in _META_FIELDS:
+        values = joined[field]
+        present = joined.loc[values.notna() & values.ne(""), ["position", "flight_pos", field]]
+        if field == "pax_number":
+            falsy = ~present[field].map(bool).astype(bool)
+            present = present.assign(_falsy=falsy).sort_values(["position", "_falsy", "flight_pos"], kind="stable")
+        present = present.drop_duplicates("position", keep="first")
+        collected[field] = dict(zip(present["position"].tolist(), present[field].tolist()))
+    return collected
+
+
+def assign_roster_to_schedule_rows(
+    schedule_rows: List[Dict[str, Any]],
+    roster_rows: Iterable[Mapping[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Attach crew, positioning, and roster flight details to schedule rows.
+
+    Roster flights are exploded into a keyed table and joined to the schedule
+    on task id (falling back to tail/route/minute), while the latest
+    positioning before each flight comes from a single sorted ``merge_asof``.
+    """
+
+    flight_records, crew_records, positioning_records = _explode_roster(roster_rows)
+    crew_by_row: Dict[int, List[str]] = {}
+    positioning_by_row: Dict[int, List[str]] = {}
+    meta_by_row: Dict[str, Dict[int, Any]] = {field: {} for field in _META_FIELDS}
+
+    if flight_records:
+        flights = pd.DataFrame.from_records(flight_records)
+        # Keep ``paxNumber`` values as supplied instead of upcasting to float.
+        flights["pax_number"] = pd.Series([record["pax_number"] for record in flight_records], dtype=object)
+        crew = pd.DataFrame(crew_records, columns=["flight_pos", "crew_order", "crew"])
+        pairs = _match_schedule(_schedule_frame(schedule_rows), flights)
+        if not pairs.empty:
+            markers = _positioning_markers(flights, crew, positioning_records)
+            crew_by_row = _collect_unique(pairs, crew, "crew")
+            positioning_by_row = _collect_unique(pairs, markers, "marker")
+            meta_by_row = _collect_meta(pairs, flights)
 
     enriched: List[Dict[str, Any]] = []
-    for row in schedule_rows:
+    for position, row in enumerate(schedule_rows):
         if row.get("category") not in {"Client Flight", "OCS Flight"}:
             row["crew"] = ""
             row["positioning"] = ""
@@ -274,25 +383,12 @@ def assign_roster_to_schedule_rows(
             enriched.append(row)
             continue
 
-        task_id = str(row.get("task_id") or "").strip().lower()
-        start = row.get("start_utc") if isinstance(row.get("start_utc"), datetime) else None
-        dep = _airport(_pick(row, ("departure_airport",)))
-        arr = _airport(_pick(row, ("arrival_airport",)))
-        key = _flight_key(_normalize_tail(row.get("tail")), dep, arr, start)
-
-        bucket = index_by_task_id.get(task_id)
-        if bucket is None and key is not None:
-            bucket = index_by_tuple.get(key)
-        if bucket is None:
-            bucket = {"crew": [], "positioning": []}
-
-        row["crew"] = " | ".join(bucket.get("crew") or [])
-        row["positioning"] = " | ".join(bucket.get("positioning") or [])
-        row["roster_flight_id"] = str(bucket.get("roster_flight_id") or "")
-        row["booking_reference"] = str(bucket.get("booking_reference") or "")
-        row["flight_status"] = str(bucket.get("flight_status") or "")
-        row["workflow_name"] = str(bucket.get("workflow_name") or "")
-        row["pax_number"] = bucket.get("pax_number") if bucket.get("pax_number") is not None else ""
+        row["crew"] = " | ".join(crew_by_row.get(position, []))
+        row["positioning"] = " | ".join(positioning_by_row.get(position, []))
+        for meta_field in _META_FIELDS[:-1]:
+            row[meta_field] = str(meta_by_row[meta_field].get(position) or "")
+        pax_number = meta_by_row["pax_number"].get(position)
+        row["pax_number"] = pax_number if pax_number is not None else ""
         enriched.append(row)
 
     return enriched
@@ -2,8 +2,21 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Mapping, Optional, Sequence
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from flight_leg_utils import (
+    ARRIVAL_AIRPORT_COLUMNS,
+    DEPARTURE_AIRPORT_COLUMNS,
+    filter_out_subcharter_rows,
+    normalize_fl3xx_payload,
+)
 
 UTC = timezone.utc
 
@@ -223,3 +236,450 @@ def leg_duration_hours(leg: Mapping[str, Any]) -> Optional[float]:
     if delta_hours <= 0:
         return None
     return round(delta_hours, 2)
+
+
+# ---------------------------------------------------------------------------
+# Columnar analytics
+# ---------------------------------------------------------------------------
+
+FOCUS_REGIONS = {
+    "Atlantic Canada": "atlantic_canada",
+    "Caribbean": "caribbean",
+    "Europe": "europe",
+}
+
+LEG_TYPE_PAX = "PAX"
+LEG_TYPE_POS = "POS"
+LEG_TYPE_OTHER = "OTHER"
+
+DEPARTURE_CODE_COLUMNS: Tuple[str, ...] = ("departure_airport",) + tuple(DEPARTURE_AIRPORT_COLUMNS)
+ARRIVAL_CODE_COLUMNS: Tuple[str, ...] = ("arrival_airport",) + tuple(ARRIVAL_AIRPORT_COLUMNS)
+POSITIONING_COLUMNS = ("flightType", "flight_type", "workflowCustomName", "workflow", "operation_type")
+
+ENRICHED_COLUMNS = [
+    "dep_time",
+    "arrival_time",
+    "tail",
+    "flightType",
+    "dep_airport",
+    "arr_airport",
+    "dep_country",
+    "arr_country",
+    "is_pos",
+    "duration_hours",
+    "is_pax",
+]
+PIVOT_KEYS = ["day", "dep_airport", "arr_airport", "leg_type"]
+PIVOT_COLUMNS = PIVOT_KEYS + ["legs", "timed_legs", "duration_hours"]
+DAY_STAT_COLUMNS = [
+    "day",
+    "flights_returned",
+    "legs_after_filter",
+    "skipped_subcharter",
+    "skipped_add_lines",
+]
+
+PARTITION_CACHE_SIZE = 64
+
+_PLACEHOLDER_PREFIXES = {"ADD", "REMOVE"}
+
+
+def is_add_line_leg(leg: Mapping[str, Any]) -> bool:
+    tail_value = leg.get("tail")
+    if tail_value is None:
+        return False
+    tail_text = str(tail_value).strip()
+    if not tail_text:
+        return False
+    first_word = tail_text.split()[0].upper()
+    return first_word in _PLACEHOLDER_PREFIXES
+
+
+def filter_out_add_lines(rows: Iterable[Mapping[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    filtered: List[Dict[str, Any]] = []
+    skipped = 0
+    for row in rows:
+        if is_add_line_leg(row):
+            skipped += 1
+            continue
+        filtered.append(dict(row))
+    return filtered, skipped
+
+
+def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name in frame.columns:
+        return frame[name].astype(object)
+    return pd.Series(None, index=frame.index, dtype=object)
+
+
+def airport_code_column(frame: pd.DataFrame, columns: Sequence[str]) -> pd.Series:
+    """Vectorised :func:`extract_airport_code`: the first usable code across ``columns``."""
+
+    codes = pd.Series(None, index=frame.index, dtype=object)
+    for name in columns:
+        pending = codes.isna()
+        if not pending.any():
+            break
+        if name not in frame.columns:
+            continue
+        values = frame.loc[pending, name].astype(object)
+        values = values[values.notna()]
+        if values.empty:
+            continue
+        # Codes repeat heavily, so normalise each distinct string once.
+        is_text = values.map(type).eq(str)
+        labels, uniques = pd.factorize(values[is_text])
+        cleaned = pd.Index(uniques, dtype=object).str.strip().str.upper()
+        cleaned = pd.array([code or None for code in cleaned] + [None], dtype=object)
+        codes[values.index[is_text.to_numpy()]] = cleaned[labels]
+        # Nested mappings and non-string scalars are rare; resolve them one by one.
+        others = values[~is_text]
+        if not others.empty:
+            codes[others.index] = others.map(_coerce_airport_code)
+    return codes
+
+
+def airport_attributes(codes: pd.Series, lookup: Mapping[str, Mapping[str, Any]]) -> pd.DataFrame:
+    """Return ``country``/``subdivision`` for each code, looked up once per distinct code."""
+
+    categorical = pd.Categorical(codes)
+    categories = list(categorical.categories)
+    countries = [airport_country_code(code, lookup) for code in categories]
+    subdivisions = [airport_subdivision(code, lookup) for code in categories]
+
+    def _take(values: List[Optional[str]]) -> pd.Series:
+        table = pd.array(values + [None], dtype=object)
+        return pd.Series(table[categorical.codes], index=codes.index, dtype=object)
+
+    return pd.DataFrame({"country": _take(countries), "subdivision": _take(subdivisions)}, index=codes.index)
+
+
+def focus_mask(country: pd.Series, subdivision: pd.Series, focus: str) -> pd.Series:
+    """Vectorised :func:`airport_matches_focus` over looked-up country/subdivision columns."""
+
+    focus_key = focus.strip().lower()
+    if focus_key == "atlantic_canada":
+        return country.eq("CA") & subdivision.isin(ATLANTIC_CANADA_SUBDIVISIONS)
+    if focus_key == "caribbean":
+        return country.isin(CARIBBEAN_COUNTRY_CODES)
+    if focus_key == "europe":
+        return country.isin(EUROPE_COUNTRY_CODES)
+    return pd.Series(False, index=country.index)
+
+
+def positioning_mask(frame: pd.DataFrame) -> pd.Series:
+    """Vectorised :func:`is_positioning_leg`."""
+
+    mask = pd.Series(False, index=frame.index)
+    for name in POSITIONING_COLUMNS:
+        if name not in frame.columns:
+            continue
+        values = frame[name]
+        text = values[values.notna()].astype(str).str.strip().str.upper()
+        matches = text.eq("POS") | text.str.contains("POSITION", regex=False)
+        mask = mask | matches.reindex(frame.index, fill_value=False)
+    return mask
+
+
+def pax_type_mask(flight_types: pd.Series) -> pd.Series:
+    text = flight_types.fillna("").astype(str).str.strip().str.upper()
+    return text.eq("PAX") | text.str.contains("PASSENGER", regex=False)
+
+
+def duration_hours_column(dep: pd.Series, arr: pd.Series) -> pd.Series:
+    """Vectorised :func:`leg_duration_hours` using array arithmetic on UTC timestamps."""
+
+    def _parse(values: pd.Series) -> pd.Series:
+        text = values.where(values.notna() & values.astype(str).ne(""), None)
+        return pd.to_datetime(text, utc=True, errors="coerce", format="ISO8601")
+
+    hours = (_parse(arr) - _parse(dep)).dt.total_seconds() / 3600.0
+    return hours.where(hours > 0).round(2)
+
+
+def enrich_legs_frame(
+    legs: Sequence[Mapping[str, Any]] | pd.DataFrame,
+    airport_lookup: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> pd.DataFrame:
+    """Return one analysis row per leg with airport, type and duration columns.
+
+    Airport codes are categorical. Countries are only added when
+    ``airport_lookup`` is supplied; see :func:`add_airport_attributes`.
+    """
+
+    frame = legs if isinstance(legs, pd.DataFrame) else pd.DataFrame(list(legs))
+    flight_type = _column(frame, "flightType")
+    flight_type = flight_type.where(flight_type.notna() & flight_type.astype(bool), _column(frame, "flight_type"))
+    is_pos = positioning_mask(frame)
+    is_pax = pax_type_mask(flight_type) & ~is_pos
+    enriched = pd.DataFrame(
+        {
+            "dep_time": _column(frame, "dep_time"),
+            "arrival_time": _column(frame, "arrival_time"),
+            "tail": _column(frame, "tail"),
+            "flightType": flight_type,
+            "dep_airport": pd.Categorical(airport_code_column(frame, DEPARTURE_CODE_COLUMNS)),
+            "arr_airport": pd.Categorical(airport_code_column(frame, ARRIVAL_CODE_COLUMNS)),
+            "is_pos": is_pos,
+            "duration_hours": duration_hours_column(_column(frame, "dep_time"), _column(frame, "arrival_time")),
+            "is_pax": is_pax,
+            "leg_type": pd.Categorical(
+                is_pos.map({True: LEG_TYPE_POS, False: LEG_TYPE_OTHER}).where(~is_pax, LEG_TYPE_PAX),
+                categories=[LEG_TYPE_PAX, LEG_TYPE_POS, LEG_TYPE_OTHER],
+            ),
+        },
+        index=frame.index,
+    )
+    if "day" in frame.columns:
+        enriched.insert(0, "day", frame["day"].astype(str))
+    if airport_lookup is not None:
+        enriched = add_airport_attributes(enriched, airport_lookup)
+    return enriched
+
+
+def add_airport_attributes(frame: pd.DataFrame, airport_lookup: Mapping[str, Mapping[str, Any]]) -> pd.DataFrame:
+    """Add ``dep_``/``arr_`` country and subdivision columns to an analysis frame."""
+
+    frame = frame.copy()
+    for prefix in ("dep", "arr"):
+        attributes = airport_attributes(frame[f"{prefix}_airport"], airport_lookup)
+        frame[f"{prefix}_country"] = attributes["country"]
+        frame[f"{prefix}_subdivision"] = attributes["subdivision"]
+    return frame
+
+
+def touches_focus(frame: pd.DataFrame, focus: str) -> pd.Series:
+    """Return rows whose departure or arrival airport is in the focus region."""
+
+    return focus_mask(frame["dep_country"], frame["dep_subdivision"], focus) | focus_mask(
+        frame["arr_country"], frame["arr_subdivision"], focus
+    )
+
+
+def build_leg_pivot(enriched: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate legs by day, airport pair and leg type.
+
+    ``timed_legs`` counts legs with a usable duration and ``duration_hours``
+    sums them, so averages over any slice are ``duration_hours / timed_legs``.
+    """
+
+    if enriched.empty:
+        return pd.DataFrame(columns=PIVOT_COLUMNS)
+    return (
+        enriched.groupby(PIVOT_KEYS, dropna=False, observed=True)
+        .agg(
+            legs=("leg_type", "size"),
+            timed_legs=("duration_hours", "count"),
+            duration_hours=("duration_hours", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def departure_counts(pivot: pd.DataFrame) -> pd.DataFrame:
+    counts = pivot[pivot["dep_airport"].notna()].groupby("dep_airport", observed=True)["legs"].sum()
+    counts = counts[counts > 0]
+    return (
+        pd.DataFrame({"Airport": counts.index.astype(str), "Departures": counts.to_numpy(dtype=int)})
+        .sort_values(["Departures", "Airport"], ascending=[False, True])
+        .reset_index(drop=True)
+    )
+
+
+def _mean_hours(subset: pd.DataFrame) -> Optional[float]:
+    timed = int(subset["timed_legs"].sum())
+    if not timed:
+        return None
+    return round(float(subset["duration_hours"].sum()) / timed, 2)
+
+
+def average_flight_length_summary(
+    pivot: pd.DataFrame,
+    regions: Mapping[str, str] = FOCUS_REGIONS,
+) -> pd.DataFrame:
+    """Average PAX/POS flight length overall and per focus region from a pivot with airport attributes."""
+
+    rows: List[Dict[str, Any]] = []
+    for label, focus_key in {"Overall": "overall", **regions}.items():
+        subset = pivot if focus_key == "overall" else pivot[touches_focus(pivot, focus_key)]
+        pax_subset = subset[subset["leg_type"] == LEG_TYPE_PAX]
+        pos_subset = subset[subset["leg_type"] == LEG_TYPE_POS]
+        rows.append(
+            {
+                "Region": label,
+                "PAX legs": int(pax_subset["timed_legs"].sum()),
+                "Avg PAX flight length (hours)": _mean_hours(pax_subset),
+                "POS legs": int(pos_subset["timed_legs"].sum()),
+                "Avg POS flight length (hours)": _mean_hours(pos_subset),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def focus_pos_summary(pivot: pd.DataFrame, focus: str) -> Tuple[Dict[str, Any], pd.DataFrame, pd.DataFrame]:
+    """Return POS totals, POS legs by departure airport and by departure country for a focus region."""
+
+    pos = pivot[pivot["leg_type"] == LEG_TYPE_POS]
+    focus_pos = pos[touches_focus(pos, focus)]
+    totals = {
+        "pos_legs_total": int(pos["legs"].sum()),
+        "pos_legs_touching_focus": int(focus_pos["legs"].sum()),
+        "pos_hours_touching_focus": round(float(focus_pos["duration_hours"].sum()), 2),
+    }
+    by_dep_airport = (
+        focus_pos[focus_pos["dep_airport"].notna()]
+        .assign(dep_airport=lambda frame: frame["dep_airport"].astype(str))
+        .groupby("dep_airport")
+        .agg(pos_legs=("legs", "sum"), pos_hours=("duration_hours", "sum"))
+        .reset_index()
+        .sort_values(["pos_legs", "dep_airport"], ascending=[False, True])
+    )
+    by_country = (
+        focus_pos.assign(country=focus_pos["dep_country"].fillna("Unknown"))
+        .groupby("country")
+        .agg(pos_legs=("legs", "sum"), pos_hours=("duration_hours", "sum"))
+        .reset_index()
+        .sort_values(["pos_legs", "country"], ascending=[False, True])
+    )
+    return totals, by_dep_airport, by_country
+
+
+def airport_visits(pivot: pd.DataFrame, airport: str) -> pd.DataFrame:
+    """Return monthly departures and arrivals at ``airport`` by leg type."""
+
+    code = (airport or "").strip().upper()
+    departures = pivot[pivot["dep_airport"] == code]
+    arrivals = pivot[pivot["arr_airport"] == code]
+    frames = [
+        subset.assign(month=subset["day"].str[:7], direction=direction)
+        for subset, direction in ((departures, "Departures"), (arrivals, "Arrivals"))
+    ]
+    visits = pd.concat(frames, ignore_index=True)
+    if visits.empty:
+        return pd.DataFrame(columns=["month", "leg_type", "Departures", "Arrivals"])
+    table = visits.pivot_table(
+        index=["month", "leg_type"],
+        columns="direction",
+        values="legs",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,
+    )
+    table = table.reindex(columns=["Departures", "Arrivals"], fill_value=0).reset_index()
+    table.columns.name = None
+    table["leg_type"] = table["leg_type"].astype(str)
+    return table.astype({"Departures": int, "Arrivals": int})
+
+
+# ---------------------------------------------------------------------------
+# Per-partition cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PartitionAnalysis:
+    """Enriched legs, leg pivot and per-day fetch stats for one archive partition."""
+
+    legs: pd.DataFrame
+    pivot: pd.DataFrame
+    day_stats: pd.DataFrame
+
+
+def analyze_archive_rows(rows: pd.DataFrame) -> PartitionAnalysis:
+    """Normalise, filter and enrich archived flights (``day``/``payload`` rows)."""
+
+    leg_rows: List[Dict[str, Any]] = []
+    day_stats: List[Dict[str, Any]] = []
+    for day, group in rows.groupby("day", sort=True):
+        flights = [json.loads(payload) for payload in group["payload"]]
+        normalized, _ = normalize_fl3xx_payload({"items": flights})
+        non_subcharter, skipped_subcharter = filter_out_subcharter_rows(normalized)
+        filtered, skipped_add = filter_out_add_lines(non_subcharter)
+        for leg in filtered:
+            leg["day"] = day
+        leg_rows.extend(filtered)
+        day_stats.append(
+            {
+                "day": day,
+                "flights_returned": len(flights),
+                "legs_after_filter": len(filtered),
+                "skipped_subcharter": skipped_subcharter,
+                "skipped_add_lines": skipped_add,
+            }
+        )
+    legs = enrich_legs_frame(leg_rows) if leg_rows else enrich_legs_frame(pd.DataFrame(columns=["day"]))
+    return PartitionAnalysis(
+        legs=legs,
+        pivot=build_leg_pivot(legs),
+        day_stats=pd.DataFrame(day_stats, columns=DAY_STAT_COLUMNS),
+    )
+
+
+_PARTITION_CACHE: "OrderedDict[Tuple[str, str, str], PartitionAnalysis]" = OrderedDict()
+_PARTITION_CACHE_LOCK = threading.Lock()
+
+
+def clear_partition_cache() -> None:
+    with _PARTITION_CACHE_LOCK:
+        _PARTITION_CACHE.clear()
+
+
+def partition_analysis(archive: Any, month: str, version: str) -> PartitionAnalysis:
+    """Return the cached analysis for one archive month, rebuilding it when the partition changed."""
+
+    key = (str(archive.root), month, version)
+    with _PARTITION_CACHE_LOCK:
+        cached = _PARTITION_CACHE.get(key)
+        if cached is not None:
+            _PARTITION_CACHE.move_to_end(key)
+            return cached
+    analysis = analyze_archive_rows(archive.read_partition(month))
+    with _PARTITION_CACHE_LOCK:
+        _PARTITION_CACHE[key] = analysis
+        while len(_PARTITION_CACHE) > PARTITION_CACHE_SIZE:
+            _PARTITION_CACHE.popitem(last=False)
+    return analysis
+
+
+@dataclass
+class WindowAnalysis:
+    """Leg-level and pivoted analysis for a date window assembled from partitions."""
+
+    legs: pd.DataFrame
+    pivot: pd.DataFrame
+    day_stats: pd.DataFrame
+
+    def stats(self) -> Dict[str, int]:
+        return {column: int(self.day_stats[column].sum()) for column in DAY_STAT_COLUMNS[1:]}
+
+
+def analyze_window(
+    archive: Any,
+    start: Any,
+    end: Any,
+    airport_lookup: Mapping[str, Mapping[str, Any]],
+) -> WindowAnalysis:
+    """Combine cached partition analyses for ``[start, end]`` and attach airport attributes."""
+
+    first, last = start.isoformat(), end.isoformat()
+    parts = [
+        partition_analysis(archive, month, version)
+        for month, version in archive.partition_versions(start, end).items()
+    ]
+
+    def _window(frames: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+        frames = [frame[frame["day"].between(first, last)] for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    legs = _window([part.legs for part in parts], ["day"] + ENRICHED_COLUMNS + ["leg_type"])
+    pivot = _window([part.pivot for part in parts], PIVOT_COLUMNS)
+    for frame in (legs, pivot):
+        for column in ("dep_airport", "arr_airport"):
+            frame[column] = pd.Categorical(frame[column].astype(object))
+    return WindowAnalysis(
+        legs=add_airport_attributes(legs, airport_lookup),
+        pivot=add_airport_attributes(pivot, airport_lookup),
+        day_stats=_window([part.day_stats for part in parts], DAY_STAT_COLUMNS),
+    )
@@ -0,0 +1,307 @@
+"""Local append-only archive of historical FL3XX flights.
+
+Flights are stored as Parquet partitions, one file per departure month, with
+the raw FL3XX payload kept as JSON next to its archive day and flight key. A
+small manifest records when each day was fetched. A day fetched more than
+``mutable_days`` after it happened is treated as settled and is never fetched
+again; anything more recent is re-fetched on the next load, so only the tail of
+the window ever reaches the API.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+import hashlib
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from fl3xx_api import MOUNTAIN_TIME_ZONE_NAME, instance_key
+from flight_leg_utils import safe_parse_dt
+from zoneinfo_compat import ZoneInfo
+
+DEFAULT_ARCHIVE_ROOT = Path(__file__).resolve().parent / "data" / "leg_archive"
+DEFAULT_MUTABLE_DAYS = 14
+DEFAULT_ARCHIVE_WORKERS = 4
+CHUNK_DAYS = 3
+
+ARCHIVE_COLUMNS = ["day", "flight_key", "payload"]
+MANIFEST_NAME = "manifest.json"
+
+_DEPARTURE_KEYS = (
+    "blockOffEstUTC",
+    "blocksoffestimated",
+    "departureTimeUtc",
+    "departureTime",
+    "etd",
+    "realDateOUT",
+    "dep_time",
+)
+_MOUNTAIN_TZ = ZoneInfo(MOUNTAIN_TIME_ZONE_NAME)
+_ROOT_LOCKS: Dict[Path, threading.Lock] = {}
+_ROOT_LOCKS_GUARD = threading.Lock()
+
+FetchChunkFn = Callable[[date, date], Tuple[List[Dict[str, Any]], Dict[str, Any]]]
+
+
+def archive_root_for(base_url: Optional[str], root: Path = DEFAULT_ARCHIVE_ROOT) -> Path:
+    """Return the archive directory for one FL3XX instance."""
+
+    return root / instance_key(base_url)
+
+
+def chunk_ranges(start: date, end_inclusive: date, chunk_days: int = CHUNK_DAYS) -> Iterable[Tuple[date, date]]:
+    """Yield ``(chunk_start, chunk_end_exclusive)`` windows covering the range."""
+
+    end_exclusive = end_inclusive + timedelta(days=1)
+    current = start
+    while current < end_exclusive:
+        chunk_end = min(current + timedelta(days=chunk_days), end_exclusive)
+        yield current, chunk_end
+        current = chunk_end
+
+
+def _day_runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Group days into ``(first, last)`` runs of consecutive dates."""
+
+    runs: List[Tuple[date, date]] = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def _month_key(day: str) -> str:
+    return day[:7]
+
+
+def flight_key(flight: Mapping[str, Any]) -> str:
+    for key in ("flightId", "id"):
+        value = flight.get(key)
+        if value not in (None, ""):
+            return str(value)
+    payload = json.dumps(flight, sort_keys=True, default=str)
+    return "sha1:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def flight_day(flight: Mapping[str, Any], chunk_start: date, chunk_end: date) -> date:
+    """Return the archive day for ``flight`` fetched in ``[chunk_start, chunk_end)``.
+
+    The departure time is read in Mountain time, matching the FL3XX query time
+    zone, and clamped into the chunk so re-fetching a chunk always replaces the
+    flights it returned before.
+    """
+
+    last_day = chunk_end - timedelta(days=1)
+    for key in _DEPARTURE_KEYS:
+        value = flight.get(key)
+        if not value:
+            continue
+        try:
+            parsed = safe_parse_dt(str(value))
+        except Exception:
+            continue
+        local_day = parsed.astimezone(_MOUNTAIN_TZ).date()
+        return min(max(local_day, chunk_start), last_day)
+    return chunk_start
+
+
+def _root_lock(root: Path) -> threading.Lock:
+    with _ROOT_LOCKS_GUARD:
+        return _ROOT_LOCKS.setdefault(root.resolve(), threading.Lock())
+
+
+def _write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+@dataclass
+class ArchiveLoad:
+    """Flights for a window plus a record of what had to be fetched."""
+
+    flights: List[Dict[str, Any]]
+    days_fetched: int = 0
+    days_from_archive: int = 0
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class LegArchive:
+    """Month-partitioned Parquet archive of raw FL3XX flights."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        mutable_days: int = DEFAULT_MUTABLE_DAYS,
+        chunk_days: int = CHUNK_DAYS,
+        max_workers: int = DEFAULT_ARCHIVE_WORKERS,
+        today_fn: Callable[[], date] = lambda: datetime.now(timezone.utc).date(),
+    ) -> None:
+        self.root = Path(root)
+        self.mutable_days = mutable_days
+        self.chunk_days = chunk_days
+        self.max_workers = max_workers
+        self.today_fn = today_fn
+
+    # -- manifest -----------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def partition_path(self, month: str) -> Path:
+        return self.root / f"{month}.parquet"
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault("days", {})
+        manifest.setdefault("partitions", {})
+        return manifest
+
+    def _write_manifest(self, manifest: Mapping[str, Any]) -> None:
+        def write(tmp: Path) -> None:
+            with tmp.open("w", encoding="utf-8") as handle:
+                json.dump(manifest, handle, sort_keys=True, indent=1)
+
+        _write_atomic(self.manifest_path, write)
+
+    def partition_versions(self, start: date, end: date) -> Dict[str, str]:
+        """Return ``{month: written_at}`` for archived partitions overlapping the range."""
+
+        partitions = self._read_manifest()["partitions"]
+        first, last = start.isoformat()[:7], end.isoformat()[:7]
+        return {
+            month: entry["written_at"]
+            for month, entry in sorted(partitions.items())
+            if first <= month <= last
+        }
+
+    def stale_days(self, start: date, end: date) -> List[date]:
+        """Return days in ``[start, end]`` that are missing or not yet settled."""
+
+        fetched = self._read_manifest()["days"]
+        stale: List[date] = []
+        day = start
+        while day <= end:
+            fetched_on = fetched.get(day.isoformat())
+            if fetched_on is None or (date.fromisoformat(fetched_on) - day).days <= self.mutable_days:
+                stale.append(day)
+            day += timedelta(days=1)
+        return stale
+
+    # -- fetch / write ------------------------------------------------------------
+
+    def refresh(self, start: date, end: date, fetch_chunk_fn: FetchChunkFn) -> Tuple[int, List[Dict[str, Any]]]:
+        """Fetch stale days in the range concurrently and merge them into the archive.
+
+        Returns the number of days fetched and the metadata of every chunk.
+        """
+
+        stale = self.stale_days(start, end)
+        if not stale:
+            return 0, []
+
+        chunks = [
+            chunk
+            for run_start, run_end in _day_runs(stale)
+            for chunk in chunk_ranges(run_start, run_end, self.chunk_days)
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks)))) as pool:
+            results = list(pool.map(lambda chunk: fetch_chunk_fn(*chunk), chunks))
+
+        rows: Dict[str, List[Tuple[str, str, str]]] = {}
+        chunk_meta: List[Dict[str, Any]] = []
+        for (chunk_start, chunk_end), (flights, meta) in zip(chunks, results):
+            chunk_meta.append(meta)
+            for flight in flights:
+                if not isinstance(flight, Mapping):
+                    continue
+                day = flight_day(flight, chunk_start, chunk_end).isoformat()
+                payload = json.dumps(flight, separators=(",", ":"), default=str)
+                rows.setdefault(_month_key(day), []).append((day, flight_key(flight), payload))
+
+        fetched_days = {day.isoformat() for day in stale}
+        today = self.today_fn().isoformat()
+        with _root_lock(self.root):
+            self.root.mkdir(parents=True, exist_ok=True)
+            manifest = self._read_manifest()
+            for month in sorted({_month_key(day) for day in fetched_days}):
+                count = self._merge_partition(month, fetched_days, rows.get(month, []))
+                manifest["partitions"][month] = {
+                    "rows": count,
+                    "written_at": datetime.now(timezone.utc).isoformat(),
+                }
+            for day in fetched_days:
+                manifest["days"][day] = today
+            self._write_manifest(manifest)
+        return len(stale), chunk_meta
+
+    def _merge_partition(self, month: str, fetched_days: set[str], rows: List[Tuple[str, str, str]]) -> int:
+        path = self.partition_path(month)
+        frames = []
+        if path.exists():
+            existing = pd.read_parquet(path)
+            frames.append(existing[~existing["day"].isin(fetched_days)])
+        frames.append(pd.DataFrame(rows, columns=ARCHIVE_COLUMNS))
+        merged = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates("flight_key", keep="last")
+            .sort_values(["day", "flight_key"], kind="stable")
+            .reset_index(drop=True)
+        )
+        _write_atomic(path, lambda tmp: merged.to_parquet(tmp, index=False))
+        return len(merged)
+
+    # -- read ---------------------------------------------------------------------
+
+    def read_partition(self, month: str) -> pd.DataFrame:
+        """Return every archived row for one ``YYYY-MM`` partition."""
+
+        path = self.partition_path(month)
+        if not path.exists():
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+        return pd.read_parquet(path)
+
+    def read_frame(self, start: date, end: date) -> pd.DataFrame:
+        """Return archived ``day``/``flight_key``/``payload`` rows for the range."""
+
+        frames = [self.read_partition(month) for month in self.partition_versions(start, end)]
+        if not frames:
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+        frame = pd.concat(frames, ignore_index=True)
+        in_range = frame["day"].between(start.isoformat(), end.isoformat())
+        return frame[in_range].drop_duplicates("flight_key", keep="last").reset_index(drop=True)
+
+    def read(self, start: date, end: date) -> List[Dict[str, Any]]:
+        return [json.loads(payload) for payload in self.read_frame(start, end)["payload"]]
+
+    def load(self, start: date, end: date, fetch_chunk_fn: Optional[FetchChunkFn] = None) -> ArchiveLoad:
+        """Return flights departing in ``[start, end]``, refreshing stale days first.
+
+        Without ``fetch_chunk_fn`` the archive is read as-is, fully offline.
+        """
+
+        days_fetched, chunk_meta = (0, [])
+        if fetch_chunk_fn is not None:
+            days_fetched, chunk_meta = self.refresh(start, end, fetch_chunk_fn)
+        total_days = (end - start).days + 1
+        return ArchiveLoad(
+            flights=self.read(start, end),
+            days_fetched=days_fetched,
+            days_from_archive=total_days - days_fetched,
+            chunks=chunk_meta,
+        )
@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
 
+import numpy as np
+import pandas as pd
 import pytz
 
+from fl3xx_api import Fl3xxApiConfig
+from flight_leg_utils import ARRIVAL_AIRPORT_COLUMNS, DEPARTURE_AIRPORT_COLUMNS, fetch_legs_dataframe
+
 
 CARIBBEAN_COUNTRY_NAMES = {
     "anguilla",
@@ -102,6 +111,21 @@ ALLOWED_COUNTRY_CODES.update(CARIBBEAN_COUNTRY_CODES)
 ALLOWED_COUNTRY_IDENTIFIERS = ALLOWED_COUNTRY_NAMES | ALLOWED_COUNTRY_CODES
 
 
+CUBAN_OVERFLIGHT_COUNTRIES = {
+    "aruba",
+    "aw",
+    "cayman islands",
+    "ky",
+    "curacao",
+    "cw",
+    "jamaica",
+    "jm",
+}
+
+DEFAULT_ITP_CHUNK_DAYS = 5
+DEFAULT_ITP_FETCH_WORKERS = 4
+
+
 COUNTRY_CODE_OVERRIDES = {
     "bq": "Bonaire, Sint Eustatius, and Saba",
     "bl": "Saint Barthélemy",
@@ -143,3 +167,265 @@ def country_display_name(country: Optional[str]) -> Optional[str]:
         return text.title()
 
     return text
+
+
+# ---------------------------------------------------------------------------
+# Leg fetching
+# ---------------------------------------------------------------------------
+
+
+def iter_date_chunks(start: date, end: date, chunk_size: int) -> Iterable[Tuple[date, date]]:
+    """Yield inclusive ``(chunk_start, chunk_end)`` pairs covering ``start..end``."""
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    current = start
+    delta = timedelta(days=chunk_size - 1)
+    while current <= end:
+        chunk_end = min(current + delta, end)
+        yield current, chunk_end
+        current = chunk_end + timedelta(days=1)
+
+
+@dataclass
+class ItpLegFetch:
+    """Legs fetched for an ITP report, with per-chunk metadata in date order.
+
+    ``error`` holds ``(chunk_start, chunk_end, exception)`` for the earliest
+    chunk that failed; ``legs`` then only covers the chunks that succeeded.
+    """
+
+    legs: pd.DataFrame
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[Tuple[date, date, Exception]] = None
+
+
+def fetch_itp_legs(
+    config: Fl3xxApiConfig,
+    start: date,
+    end: date,
+    *,
+    chunk_days: int = DEFAULT_ITP_CHUNK_DAYS,
+    max_workers: int = DEFAULT_ITP_FETCH_WORKERS,
+    fetch_legs_fn: Optional[Callable[..., Tuple[pd.DataFrame, Dict[str, Any], Any]]] = None,
+    on_chunk_done: Optional[Callable[[int, int], None]] = None,
+) -> ItpLegFetch:
+    """Fetch legs departing ``start..end`` (UTC) in ``chunk_days`` windows, concurrently.
+
+    Each chunk is requested through :func:`flight_leg_utils.fetch_legs_dataframe`
+    with a departure window covering its whole days. ``on_chunk_done(done,
+    total)`` is called from the calling thread as chunks finish, so it may
+    update Streamlit elements.
+    """
+
+    fetch_legs_fn = fetch_legs_fn or fetch_legs_dataframe
+    chunks = list(iter_date_chunks(start, end, chunk_days))
+
+    def _fetch(chunk: Tuple[date, date]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        chunk_start, chunk_end = chunk
+        request_end = chunk_end + timedelta(days=1)
+        window_start = datetime.combine(chunk_start, time.min).replace(tzinfo=timezone.utc)
+        window_end = datetime.combine(request_end, time.min).replace(tzinfo=timezone.utc) - timedelta(microseconds=1)
+        chunk_df, chunk_meta, _ = fetch_legs_fn(
+            config,
+            from_date=chunk_start,
+            to_date=request_end,
+            departure_window=(window_start, window_end),
+            fetch_crew=False,
+        )
+        return chunk_df, chunk_meta
+
+    results: Dict[int, Tuple[bool, Any]] = {}
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            futures = {pool.submit(_fetch, chunk): idx for idx, chunk in enumerate(chunks)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    results[futures[future]] = (True, future.result())
+                except Exception as exc:
+                    results[futures[future]] = (False, exc)
+                if on_chunk_done is not None:
+                    on_chunk_done(done, len(chunks))
+
+    fetch = ItpLegFetch(legs=pd.DataFrame())
+    frames: List[pd.DataFrame] = []
+    for idx, (chunk_start, chunk_end) in enumerate(chunks):
+        ok, value = results[idx]
+        if not ok:
+            if fetch.error is None:
+                fetch.error = (chunk_start, chunk_end, value)
+            continue
+        chunk_df, chunk_meta = value
+        if not chunk_df.empty:
+            frames.append(chunk_df)
+        fetch.chunks.append(
+            {
+                "chunk_index": idx + 1,
+                "request_range": {
+                    "from": chunk_start.isoformat(),
+                    "to": (chunk_end + timedelta(days=1)).isoformat(),
+                },
+                "response": chunk_meta,
+            }
+        )
+    if frames:
+        fetch.legs = pd.concat(frames, ignore_index=True)
+    return fetch
+
+
+# ---------------------------------------------------------------------------
+# Country classification
+# ---------------------------------------------------------------------------
+
+
+_CODE_PATTERN = re.compile(r"\b[A-Za-z0-9]{3,4}\b")
+
+
+def extract_airport_codes(value: Any) -> List[str]:
+    """Return the 3-4 character airport codes mentioned in a leg's airport field."""
+
+    if value is None:
+        return []
+    if isinstance(value, float) and pd.isna(value):
+        return []
+    text = str(value).strip()
+    if not text:
+        return []
+    upper = text.upper()
+    if len(upper.replace(" ", "")) in {3, 4} and upper.replace(" ", "").isalnum():
+        return [upper.replace(" ", "")]
+    return [match.upper() for match in _CODE_PATTERN.findall(upper)]
+
+
+@dataclass
+class ItpClassification:
+    """Per-leg ITP classification aligned with the legs frame it was built from.
+
+    ``frame`` has ``dep_country``/``dep_code``/``arr_country``/``arr_code`` (the
+    first airport code on each side that resolves to a country), the display
+    names of the countries that trigger each report (``itp_countries``,
+    ``cuban_countries``; empty when none) and the boolean masks
+    ``requires_itp`` and ``requires_cuban_overflight``. ``missing_codes`` are
+    codes that were tried before a match and are not in the airport DB.
+    """
+
+    frame: pd.DataFrame
+    missing_codes: Set[str] = field(default_factory=set)
+
+
+_SIDE_COLUMNS = ["country", "code", "normalized"]
+
+
+def _resolve_side(
+    legs: pd.DataFrame,
+    columns: Sequence[str],
+    lookup: Mapping[str, Mapping[str, Optional[Any]]],
+    missing_codes: Set[str],
+) -> pd.DataFrame:
+    """Resolve one side of every leg to its first known country in one join.
+
+    Codes are extracted once per distinct column value, exploded into a long
+    ``(row, column order, position, code)`` frame and joined with the airport
+    records for the distinct codes seen; the first row per leg with a country
+    is the answer, exactly as a per-leg walk over ``columns`` would find it.
+    """
+
+    result = pd.DataFrame({name: pd.Series([None] * len(legs), dtype=object) for name in _SIDE_COLUMNS})
+    pieces: List[pd.DataFrame] = []
+    for order, column in enumerate(column for column in columns if column in legs.columns):
+        value_index, uniques = pd.factorize(legs[column], use_na_sentinel=True)
+        per_value = [
+            (value_id, position, code)
+            for value_id, value in enumerate(uniques)
+            for position, code in enumerate(extract_airport_codes(value))
+        ]
+        if not per_value:
+            continue
+        codes = pd.DataFrame(per_value, columns=["value_id", "position", "code"])
+        rows = pd.DataFrame({"row": np.arange(len(legs)), "value_id": value_index})
+        piece = rows.merge(codes, on="value_id")
+        piece["order"] = order
+        pieces.append(piece)
+    if not pieces:
+        return result
+
+    long = pd.concat(pieces, ignore_index=True).sort_values(["row", "order", "position"], kind="mergesort")
+    airports = pd.DataFrame({"code": pd.unique(long["code"])})
+    records = [lookup.get(code) for code in airports["code"]]
+    countries = [record.get("country") if record else None for record in records]
+    airports["known"] = [bool(record) for record in records]
+    airports["country"] = pd.Series(countries, dtype=object)
+    airports["normalized"] = pd.Series([normalize_country_name(country) for country in countries], dtype=object)
+    long = long.merge(airports, on="code", how="left", sort=False)
+    long["seq"] = long.groupby("row").cumcount()
+
+    matched = long[long["normalized"].notna()].drop_duplicates("row")
+    first_seq = pd.Series(np.inf, index=np.arange(len(legs)))
+    first_seq[matched["row"].to_numpy()] = matched["seq"].to_numpy()
+    unknown = long[~long["known"] & (long["seq"] < first_seq.to_numpy()[long["row"].to_numpy()])]
+    missing_codes.update(unknown["code"])
+
+    rows = matched["row"].to_numpy()
+    for name in _SIDE_COLUMNS:
+        result.loc[rows, name] = matched[name].to_numpy()
+    return result
+
+
+def _display_names(side: pd.DataFrame, mask: pd.Series) -> pd.Series:
+    names = pd.Series("", index=side.index, dtype=object)
+    if mask.any():
+        flagged = side.loc[mask]
+        display = {
+            country: country_display_name(country) or normalized.title()
+            for country, normalized in zip(flagged["country"], flagged["normalized"])
+        }
+        names[mask] = flagged["country"].map(display)
+    return names
+
+
+def _join_names(first: pd.Series, second: pd.Series) -> pd.Series:
+    joined = first.where(first != "", second)
+    both = (first != "") & (second != "") & (first != second)
+    joined[both] = first[both] + ", " + second[both]
+    return joined
+
+
+def classify_itp_legs(
+    legs: pd.DataFrame,
+    lookup: Mapping[str, Mapping[str, Optional[Any]]],
+    *,
+    departure_columns: Sequence[str] = DEPARTURE_AIRPORT_COLUMNS,
+    arrival_columns: Sequence[str] = ARRIVAL_AIRPORT_COLUMNS,
+) -> ItpClassification:
+    """Classify every leg for the Jeppesen ITP and Cuban overflight reports.
+
+    A side triggers the ITP report when its country resolves and is not in
+    :data:`ALLOWED_COUNTRY_IDENTIFIERS`, and the Cuban overflight report when it
+    is in :data:`CUBAN_OVERFLIGHT_COUNTRIES`.
+    """
+
+    missing_codes: Set[str] = set()
+    dep = _resolve_side(legs, departure_columns, lookup, missing_codes)
+    arr = _resolve_side(legs, arrival_columns, lookup, missing_codes)
+
+    allowed = list(ALLOWED_COUNTRY_IDENTIFIERS)
+    cuban = list(CUBAN_OVERFLIGHT_COUNTRIES)
+    dep_itp = dep["normalized"].notna() & ~dep["normalized"].isin(allowed)
+    arr_itp = arr["normalized"].notna() & ~arr["normalized"].isin(allowed)
+    dep_cuban = dep["normalized"].isin(cuban)
+    arr_cuban = arr["normalized"].isin(cuban)
+
+    frame = pd.DataFrame(
+        {
+            "dep_country": dep["country"],
+            "dep_code": dep["code"],
+            "arr_country": arr["country"],
+            "arr_code": arr["code"],
+            "itp_countries": _join_names(_display_names(dep, dep_itp), _display_names(arr, arr_itp)),
+            "cuban_countries": _join_names(_display_names(dep, dep_cuban), _display_names(arr, arr_cuban)),
+            "requires_itp": dep_itp | arr_itp,
+            "requires_cuban_overflight": dep_cuban | arr_cuban,
+        }
+    )
+    frame.index = legs.index
+    return ItpClassification(frame=frame, missing_codes=missing_codes)
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
+import math
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
 from urllib.parse import urlsplit
@@ -14,12 +15,14 @@ import requests
 from fl3xx_api import (
     DEFAULT_FL3XX_BASE_URL,
     Fl3xxApiConfig,
+    PayloadCache,
     fetch_flight_pax_details,
     fetch_flights,
     fetch_leg_details,
+    fetch_many,
 )
-from feasibility.checker_weight_balance import STD_WEIGHTS, determine_season
 from flight_leg_utils import FlightDataError, format_utc, load_airport_metadata_lookup, safe_parse_dt
+from payload_weights import compute_payload_weights, determine_season, flatten_pax_payloads, pax_breakdown
 
 _RUNWAY_DATA_PATH = Path(__file__).with_name("runways.csv")
 _RUNWAY_LENGTH_CACHE: Optional[Dict[str, int]] = None
@@ -463,230 +466,25 @@ def _normalise_high_pax_category(category: Optional[str]) -> Optional[str]:
     return None
 
 
-def _coerce_number(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    try:
-        number = float(value)
-    except (TypeError, ValueError):
-        return None
-    if number != number:  # NaN guard
-        return None
-    return number
-
-
-def _normalize_gender_label(value: Optional[str]) -> Optional[str]:
-    if not value:
-        return None
-    cleaned = str(value).strip().lower()
-    if cleaned.startswith("f"):
-        return "Female"
-    if cleaned.startswith("m"):
-        return "Male"
-    return None
-
-
-def _extract_label(value: Any, *keys: str) -> Optional[str]:
-    """Return a non-empty string from ``value`` or selected mapping keys."""
-
-    if isinstance(value, str) and value.strip():
-        return value.strip()
-    if isinstance(value, Mapping):
-        for key in keys:
-            candidate = value.get(key)
-            if isinstance(candidate, str) and candidate.strip():
-                return candidate.strip()
-    return None
-
-
-def _pax_category(ticket: Mapping[str, Any]) -> str:
-    pax_type_raw = (
-        _extract_label(ticket.get("paxType"), "code", "type", "name", "label")
-        or _extract_label(ticket.get("type"))
-        or _extract_label(ticket.get("pax_type"))
-        or "ADULT"
-    )
-    pax_type = pax_type_raw.upper()
-
-    if "INFANT" in pax_type:
-        return "Infant"
-    if "CHILD" in pax_type or "CHD" in pax_type:
-        return "Child"
-
-    pax_user = ticket.get("paxUser") if isinstance(ticket.get("paxUser"), Mapping) else {}
-    gender_raw = (
-        _extract_label(pax_user.get("gender"))
-        or _extract_label(pax_user.get("sex"))
-        or _extract_label(pax_user.get("salutation"))
-        or _extract_label(pax_user.get("title"))
-        or _extract_label(pax_type_raw)
-    )
-
-    gender_label = _normalize_gender_label(gender_raw)
-    return gender_label or "Male"
-
-
-def _standard_pax_weight(season: str, category: str) -> float:
-    season_label = season if season in STD_WEIGHTS else "Winter"
-    return STD_WEIGHTS.get(season_label, STD_WEIGHTS["Winter"]).get(category, STD_WEIGHTS["Winter"]["Male"])
-
-
-def _iter_pax_tickets(payload: Mapping[str, Any]) -> Iterable[Mapping[str, Any]]:
-    """Yield passenger tickets from nested payloads."""
-
-    search_queue: List[Any] = []
-    if payload is not None:
-        search_queue.append(payload)
-
-    visited: set[int] = set()
-    yielded: set[int] = set()
-
-    while search_queue:
-        current = search_queue.pop(0)
-        marker = id(current)
-        if marker in visited:
-            continue
-        visited.add(marker)
-
-        if isinstance(current, Mapping):
-            entries = current.get("tickets")
-            if isinstance(entries, Iterable) and not isinstance(entries, (str, bytes, bytearray)):
-                for entry in entries:
-                    if isinstance(entry, Mapping):
-                        entry_marker = id(entry)
-                        if entry_marker in yielded:
-                            continue
-                        yielded.add(entry_marker)
-                        yield entry
-
-            for key in (
-                "pax",
-                "pax_details",
-                "paxDetails",
-                "paxPayload",
-                "passengers",
-                "payload",
-            ):
-                child = current.get(key)
-                if child is not None:
-                    search_queue.append(child)
-
-            for child in current.values():
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-        elif isinstance(current, Iterable) and not isinstance(current, (str, bytes, bytearray)):
-            for child in current:
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-
-def _iter_cargo(payload: Mapping[str, Any]) -> Iterable[Tuple[Mapping[str, Any], str]]:
-    """Yield cargo and animal entries from nested payload structures."""
-
-    search_queue: List[Any] = []
-    if payload is not None:
-        search_queue.append(payload)
-
-    visited: set[int] = set()
-    yielded: set[int] = set()
-    cargo_keys = {"cargo", "cargoItems", "cargo_items", "animal", "animals"}
-
-    while search_queue:
-        current = search_queue.pop(0)
-        marker = id(current)
-        if marker in visited:
-            continue
-        visited.add(marker)
-
-        if isinstance(current, Mapping):
-            for key in cargo_keys:
-                entries = current.get(key)
-                if isinstance(entries, Iterable) and not isinstance(entries, (str, bytes, bytearray)):
-                    for entry in entries:
-                        if isinstance(entry, Mapping):
-                            entry_marker = id(entry)
-                            if entry_marker in yielded:
-                                continue
-                            yielded.add(entry_marker)
-                            entry_type = "animal" if key in {"animal", "animals"} else "cargo"
-                            yield entry, entry_type
-
-            for child in (
-                current.get("pax"),
-                current.get("paxPayload"),
-                current.get("payload"),
-            ):
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-            for child in current.values():
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-        elif isinstance(current, Iterable) and not isinstance(current, (str, bytes, bytearray)):
-            for child in current:
-                if isinstance(child, (Mapping, list, tuple, set)):
-                    search_queue.append(child)
-
-
 def _calculate_pax_payload_weight(
     payload: Mapping[str, Any], *, season: str
 ) -> Tuple[Optional[float], int, int, Dict[str, int], float, float]:
-    tickets = list(_iter_pax_tickets(payload))
-    pax_weight = 0.0
-    missing_weights = 0
-    pax_breakdown: Dict[str, int] = {}
-
-    for ticket in tickets:
-        pax_user = ticket.get("paxUser") if isinstance(ticket.get("paxUser"), Mapping) else {}
-        explicit_weight = _coerce_number(
-            ticket.get("bodyWeight")
-            or ticket.get("weight")
-            or (pax_user.get("bodyWeight") if isinstance(pax_user, Mapping) else None)
-        )
-        category = _pax_category(ticket)
-
-        if explicit_weight is None:
-            missing_weights += 1
-        base_weight = (
-            explicit_weight
-            if explicit_weight is not None
-            else _standard_pax_weight(season, category)
-        )
-
-        luggage_weight = _coerce_number(ticket.get("luggageWeight") or ticket.get("luggage_weight")) or 0
-        pax_weight += base_weight + luggage_weight
+    weights = compute_payload_weights(flatten_pax_payloads({0: payload}), {0: season})
+    return _payload_weight_result(weights.to_dict("records")[0])
 
-        pax_breakdown[category] = pax_breakdown.get(category, 0) + 1
 
-    cargo_entries = list(_iter_cargo(payload))
-    cargo_weights: List[float] = []
-    animal_weights: List[float] = []
-    for entry, entry_type in cargo_entries:
-        weight = _coerce_number(
-            entry.get("weightQty") or entry.get("weight") or entry.get("weight_qty")
-        )
-        if weight is None:
-            continue
-        if entry_type == "animal":
-            animal_weights.append(weight)
-        else:
-            cargo_weights.append(weight)
-
-    if cargo_weights or animal_weights:
-        cargo_weight = sum(cargo_weights)
-        animal_weight = sum(animal_weights)
-    else:
-        cargo_weight = 30 * len(tickets)
-        animal_weight = 0.0
-
-    total_weight = pax_weight + cargo_weight + animal_weight
-
-    if not tickets and not cargo_entries:
-        return None, 0, missing_weights, pax_breakdown, cargo_weight, animal_weight
-
-    return total_weight, len(tickets), missing_weights, pax_breakdown, cargo_weight, animal_weight
+def _payload_weight_result(
+    row: Mapping[str, Any]
+) -> Tuple[Optional[float], int, int, Dict[str, int], float, float]:
+    total_weight = float(row["total_weight"])
+    return (
+        None if math.isnan(total_weight) else total_weight,
+        int(row["pax_count"]),
+        int(row["missing_weights"]),
+        pax_breakdown(row),
+        float(row["cargo_weight"]),
+        float(row["animal_weight"]),
+    )
 
 
 def _lookup_threshold_minutes(category: Optional[str], pax_count: Optional[int]) -> Optional[int]:
@@ -869,6 +667,197 @@ def _format_pax_breakdown(breakdown: Mapping[str, int]) -> str:
     return ", ".join(parts) if parts else "—"
 
 
+OCA_PAYLOAD_CACHE_TTL_SECONDS = 3600
+# A week of legs needs roughly two payloads per leg; the cap only bites if
+# several long windows are scanned within the hour.
+OCA_PAYLOAD_CACHE_MAX_ENTRIES = 5000
+DEFAULT_OCA_FETCH_WORKERS = 8
+
+_LEG_DETAILS = "leg_details"
+_PAX_DETAILS = "pax_details"
+
+
+_PAYLOAD_CACHE = PayloadCache(OCA_PAYLOAD_CACHE_TTL_SECONDS, max_entries=OCA_PAYLOAD_CACHE_MAX_ENTRIES)
+
+
+def clear_payload_cache() -> None:
+    _PAYLOAD_CACHE.clear()
+
+
+def _payload_key(config: Fl3xxApiConfig, kind: str, identifier: Any) -> Tuple[str, str, str]:
+    return kind, str(config.base_url), str(identifier)
+
+
+def _needs_leg_details(row: Mapping[str, Any]) -> bool:
+    """Return True when the max-time or ZFW check will read this row's leg payload."""
+
+    if str(row.get("flightType") or "").upper() != "PAX" or not row.get("quoteId"):
+        return False
+
+    pax_count = _extract_pax_count(row)
+    threshold = _lookup_threshold_minutes(row.get("aircraftCategory"), pax_count)
+    if threshold is not None:
+        duration_minutes = _compute_duration_minutes(row)
+        if duration_minutes is not None and duration_minutes > threshold:
+            return True
+
+    if pax_count is None:
+        return False
+    zfw_threshold = _ZFW_PAX_THRESHOLDS.get(_normalise_category(row.get("aircraftCategory")) or "")
+    return zfw_threshold is not None and pax_count >= zfw_threshold
+
+
+def _needs_pax_details(row: Mapping[str, Any]) -> bool:
+    """Return True when the high pax weight check will read this row's pax payload."""
+
+    if str(row.get("flightType") or "").upper() != "PAX" or not row.get("flightId"):
+        return False
+    normalized_category = _normalise_high_pax_category(row.get("aircraftCategory"))
+    if normalized_category is None:
+        return False
+    duration_threshold = _HIGH_PAX_DURATION_THRESHOLDS.get(normalized_category)
+    duration_minutes = _compute_duration_minutes(row)
+    return duration_threshold is not None and duration_minutes is not None and duration_minutes > duration_threshold
+
+
+@dataclass
+class OcaRunData:
+    """Flights for one OCA report window plus the detail payloads its checks read.
+
+    ``leg_details`` is keyed by quote ID and ``pax_details`` by flight ID.
+    Failed fetches are kept in ``errors`` and re-raised by the accessors so
+    each check records them in its own diagnostics. An ID that was not
+    prefetched is fetched (and cached) on first access.
+    """
+
+    flights: List[Dict[str, Any]]
+    metadata: Dict[str, Any]
+    config: Optional[Fl3xxApiConfig] = None
+    leg_details: Dict[str, Any] = field(default_factory=dict)
+    pax_details: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[Tuple[str, str], Exception] = field(default_factory=dict)
+    diagnostics: Dict[str, Any] = field(default_factory=dict)
+    fetch_leg_details_fn: Any = field(default=fetch_leg_details, repr=False)
+    fetch_pax_details_fn: Any = field(default=fetch_flight_pax_details, repr=False)
+    cache: Optional[PayloadCache] = field(default=None, repr=False)
+
+    def leg_payload(self, quote_id: Any) -> Any:
+        return self._payload(_LEG_DETAILS, quote_id)
+
+    def pax_payload(self, flight_id: Any) -> Any:
+        return self._payload(_PAX_DETAILS, flight_id)
+
+    def _payload(self, kind: str, identifier: Any) -> Any:
+        store = self.leg_details if kind == _LEG_DETAILS else self.pax_details
+        key = str(identifier)
+        if key in store:
+            return store[key]
+        error = self.errors.get((kind, key))
+        if error is not None:
+            raise error
+        if self.config is None:
+            raise FlightDataError(f"No {kind.replace('_', ' ')} payload was prepared for {identifier}.")
+        fetch_fn = self.fetch_leg_details_fn if kind == _LEG_DETAILS else self.fetch_pax_details_fn
+        self.diagnostics["late_fetches"] = self.diagnostics.get("late_fetches", 0) + 1
+        try:
+            payload = fetch_fn(self.config, identifier)
+        except Exception as exc:  # pragma: no cover - network/runtime issues
+            self.errors[(kind, key)] = exc
+            raise
+        store[key] = payload
+        if self.cache is not None:
+            self.cache.set(_payload_key(self.config, kind, identifier), payload)
+        return payload
+
+
+def prepare_oca_run(
+    config: Fl3xxApiConfig,
+    *,
+    from_date: date,
+    to_date: date,
+    fetch_flights_fn=fetch_flights,
+    fetch_leg_details_fn=fetch_leg_details,
+    fetch_pax_details_fn=fetch_flight_pax_details,
+    max_workers: int = DEFAULT_OCA_FETCH_WORKERS,
+    cache: Optional[PayloadCache] = _PAYLOAD_CACHE,
+) -> OcaRunData:
+    """Fetch the flights and every detail payload the OCA checks need, once.
+
+    Quote IDs needed by the max-time and ZFW checks and flight IDs needed by
+    the high pax weight check are collected as one de-duplicated set. Payloads
+    still in ``cache`` are reused and the rest are fetched concurrently.
+    """
+
+    if to_date <= from_date:
+        raise FlightDataError("The end date must be after the start date for the OCA report window.")
+
+    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+
+    wanted: Dict[Tuple[str, str], Any] = {}
+    for row in flights:
+        if _needs_leg_details(row):
+            wanted.setdefault((_LEG_DETAILS, str(row["quoteId"])), row["quoteId"])
+        if _needs_pax_details(row):
+            wanted.setdefault((_PAX_DETAILS, str(row["flightId"])), row["flightId"])
+
+    data = OcaRunData(
+        flights=flights,
+        metadata=metadata,
+        config=config,
+        fetch_leg_details_fn=fetch_leg_details_fn,
+        fetch_pax_details_fn=fetch_pax_details_fn,
+        cache=cache,
+    )
+    jobs: List[Tuple[str, Any]] = []
+    cache_hits = 0
+    for (kind, key), identifier in wanted.items():
+        if cache is not None:
+            hit, payload = cache.get(_payload_key(config, kind, identifier))
+            if hit:
+                cache_hits += 1
+                (data.leg_details if kind == _LEG_DETAILS else data.pax_details)[key] = payload
+                continue
+        jobs.append((kind, identifier))
+
+    fetchers = {_LEG_DETAILS: fetch_leg_details_fn, _PAX_DETAILS: fetch_pax_details_fn}
+    fetched = fetch_many(
+        jobs,
+        lambda job, http: fetchers[job[0]](config, job[1], session=http),
+        max_workers=max_workers,
+    )
+    for (kind, identifier), (ok, result) in fetched.items():
+        key = str(identifier)
+        if not ok:
+            data.errors[(kind, key)] = result
+            continue
+        (data.leg_details if kind == _LEG_DETAILS else data.pax_details)[key] = result
+        if cache is not None:
+            cache.set(_payload_key(config, kind, identifier), result)
+
+    data.diagnostics = {
+        "total_flights": len(flights),
+        "leg_details_needed": sum(1 for kind, _ in wanted if kind == _LEG_DETAILS),
+        "pax_details_needed": sum(1 for kind, _ in wanted if kind == _PAX_DETAILS),
+        "cache_hits": cache_hits,
+        "payloads_fetched": len(jobs) - len(data.errors),
+        "payload_errors": len(data.errors),
+        "late_fetches": 0,
+    }
+    return data
+
+
+def _run_flights(
+    config: Fl3xxApiConfig,
+    from_date: date,
+    to_date: date,
+    data: Optional[OcaRunData],
+    fetch_flights_fn,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    if data is not None:
+        return data.flights, data.metadata
+    return fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+
+
 def evaluate_flights_for_max_time(
     config: Fl3xxApiConfig,
     *,
@@ -876,13 +865,18 @@ def evaluate_flights_for_max_time(
     to_date: date,
     fetch_flights_fn=fetch_flights,
     fetch_leg_details_fn=fetch_leg_details,
+    data: Optional[OcaRunData] = None,
 ) -> Tuple[List[MaxFlightTimeAlert], Dict[str, Any], Dict[str, Any]]:
-    """Return flights that exceed the allowable block time window."""
+    """Return flights that exceed the allowable block time window.
+
+    When ``data`` from :func:`prepare_oca_run` is supplied its flights and
+    leg payloads are used instead of fetching them again.
+    """
 
     if to_date <= from_date:
         raise FlightDataError("The end date must be after the start date for the OCA report window.")
 
-    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+    flights, metadata = _run_flights(config, from_date, to_date, data, fetch_flights_fn)
 
     diagnostics: Dict[str, Any] = {
         "total_flights": len(flights),
@@ -953,10 +947,13 @@ def evaluate_flights_for_max_time(
 
             quote_id = alert.quote_id
             if quote_id:
-                if session is None:
+                if session is None and data is None:
                     session = requests.Session()
                 try:
-                    payload = fetch_leg_details_fn(config, quote_id, session=session)
+                    if data is not None:
+                        payload = data.leg_payload(quote_id)
+                    else:
+                        payload = fetch_leg_details_fn(config, quote_id, session=session)
                 except Exception as exc:  # pragma: no cover - network/runtime issues
                     diagnostics["note_errors"] += 1
                     diagnostics["note_error_messages"].append(str(exc))
@@ -1015,13 +1012,18 @@ def evaluate_flights_for_high_pax_weight(
     to_date: date,
     fetch_flights_fn=fetch_flights,
     fetch_pax_details_fn=fetch_flight_pax_details,
+    data: Optional[OcaRunData] = None,
 ) -> Tuple[List[HighPaxWeightAlert], Dict[str, Any], Dict[str, Any]]:
-    """Return PAX flights that exceed the configured pax weight thresholds."""
+    """Return PAX flights that exceed the configured pax weight thresholds.
+
+    When ``data`` from :func:`prepare_oca_run` is supplied its flights and
+    pax payloads are used instead of fetching them again.
+    """
 
     if to_date <= from_date:
         raise FlightDataError("The end date must be after the start date for the OCA report window.")
 
-    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+    flights, metadata = _run_flights(config, from_date, to_date, data, fetch_flights_fn)
 
     diagnostics: Dict[str, Any] = {
         "total_flights": len(flights),
@@ -1035,6 +1037,9 @@ def evaluate_flights_for_high_pax_weight(
     }
 
     items: List[HighPaxWeightAlert] = []
+    candidates: List[Dict[str, Any]] = []
+    payloads: Dict[int, Any] = {}
+    seasons: Dict[int, str] = {}
     session: Optional[requests.Session] = None
 
     try:
@@ -1084,68 +1089,34 @@ def evaluate_flights_for_high_pax_weight(
             if not flight_id:
                 continue
 
-            if session is None:
+            if session is None and data is None:
                 session = requests.Session()
 
             try:
-                payload = fetch_pax_details_fn(config, flight_id, session=session)
+                if data is not None:
+                    payload = data.pax_payload(flight_id)
+                else:
+                    payload = fetch_pax_details_fn(config, flight_id, session=session)
             except Exception as exc:  # pragma: no cover - network/runtime issues
                 diagnostics["payload_errors"] += 1
                 diagnostics.setdefault("payload_error_messages", []).append(str(exc))
                 continue
             diagnostics["payloads_requested"] += 1
 
-            (
-                total_weight,
-                pax_count,
-                missing_weights,
-                pax_breakdown,
-                cargo_weight,
-                animal_weight,
-            ) = _calculate_pax_payload_weight(payload, season=season_label)
-            if total_weight is None:
-                diagnostics["missing_pax_weights"] += 1
-                continue
-
-            weight_threshold = _HIGH_PAX_WEIGHT_THRESHOLDS.get(normalized_category)
-            if weight_threshold is None or total_weight <= weight_threshold:
-                continue
-
-            item = HighPaxWeightAlert(
-                flight_id=flight_id,
-                quote_id=row.get("quoteId"),
-                flight_reference=_extract_flight_reference(row),
-                booking_reference=_extract_booking_reference(row),
-                aircraft_category=row.get("aircraftCategory"),
-                pax_count=pax_count,
-                missing_pax_weights=missing_weights,
-                pax_weight_lbs=total_weight,
-                pax_weight_threshold_lbs=int(weight_threshold),
-                pax_breakdown=pax_breakdown,
-                cargo_weight_lbs=cargo_weight,
-                animal_weight_lbs=animal_weight,
-                duration_minutes=duration_minutes,
-                duration_threshold_minutes=int(duration_threshold),
-                departure_utc=format_utc(departure_dt) if departure_dt else None,
-                arrival_utc=format_utc(arrival_dt) if arrival_dt else None,
-                airport_from=row.get("airportFrom"),
-                airport_to=row.get("airportTo"),
-                registration=row.get("registrationNumber"),
-                flight_number=row.get("flightNumberCompany") or row.get("flightNumber"),
+            key = len(candidates)
+            payloads[key] = payload
+            seasons[key] = season_label
+            candidates.append(
+                {
+                    "row": row,
+                    "flight_id": flight_id,
+                    "category": normalized_category,
+                    "duration_minutes": duration_minutes,
+                    "duration_threshold": duration_threshold,
+                    "departure_dt": departure_dt,
+                    "arrival_dt": arrival_dt,
+                }
             )
-
-            payload_reference = _extract_flight_reference(payload)
-            payload_booking_reference = _extract_booking_reference(payload)
-            updates: Dict[str, Any] = {}
-            if payload_reference and payload_reference != item.flight_reference:
-                updates["flight_reference"] = payload_reference
-            if payload_booking_reference and not item.booking_reference:
-                updates["booking_reference"] = payload_booking_reference
-            if updates:
-                item = HighPaxWeightAlert(**{**item.as_dict(), **updates})
-
-            items.append(item)
-            diagnostics["flagged_flights"] += 1
     finally:
         if session is not None:
             try:
@@ -1153,6 +1124,64 @@ def evaluate_flights_for_high_pax_weight(
             except AttributeError:  # pragma: no cover - defensive cleanup
                 pass
 
+    # Every candidate's payload is weighed together in one vectorised pass.
+    weights = compute_payload_weights(flatten_pax_payloads(payloads), seasons).to_dict("records")
+    for key, candidate in enumerate(candidates):
+        (
+            total_weight,
+            pax_count,
+            missing_weights,
+            breakdown,
+            cargo_weight,
+            animal_weight,
+        ) = _payload_weight_result(weights[key])
+        if total_weight is None:
+            diagnostics["missing_pax_weights"] += 1
+            continue
+
+        weight_threshold = _HIGH_PAX_WEIGHT_THRESHOLDS.get(candidate["category"])
+        if weight_threshold is None or total_weight <= weight_threshold:
+            continue
+
+        row = candidate["row"]
+        departure_dt = candidate["departure_dt"]
+        arrival_dt = candidate["arrival_dt"]
+        item = HighPaxWeightAlert(
+            flight_id=candidate["flight_id"],
+            quote_id=row.get("quoteId"),
+            flight_reference=_extract_flight_reference(row),
+            booking_reference=_extract_booking_reference(row),
+            aircraft_category=row.get("aircraftCategory"),
+            pax_count=pax_count,
+            missing_pax_weights=missing_weights,
+            pax_weight_lbs=total_weight,
+            pax_weight_threshold_lbs=int(weight_threshold),
+            pax_breakdown=breakdown,
+            cargo_weight_lbs=cargo_weight,
+            animal_weight_lbs=animal_weight,
+            duration_minutes=candidate["duration_minutes"],
+            duration_threshold_minutes=int(candidate["duration_threshold"]),
+            departure_utc=format_utc(departure_dt) if departure_dt else None,
+            arrival_utc=format_utc(arrival_dt) if arrival_dt else None,
+            airport_from=row.get("airportFrom"),
+            airport_to=row.get("airportTo"),
+            registration=row.get("registrationNumber"),
+            flight_number=row.get("flightNumberCompany") or row.get("flightNumber"),
+        )
+
+        payload_reference = _extract_flight_reference(payloads[key])
+        payload_booking_reference = _extract_booking_reference(payloads[key])
+        updates: Dict[str, Any] = {}
+        if payload_reference and payload_reference != item.flight_reference:
+            updates["flight_reference"] = payload_reference
+        if payload_booking_reference and not item.booking_reference:
+            updates["booking_reference"] = payload_booking_reference
+        if updates:
+            item = HighPaxWeightAlert(**{**item.as_dict(), **updates})
+
+        items.append(item)
+        diagnostics["flagged_flights"] += 1
+
     items.sort(key=lambda a: (a.departure_utc or "", a.flight_id or 0))
 
     return items, metadata, diagnostics
@@ -1165,13 +1194,18 @@ def evaluate_flights_for_zfw_check(
     to_date: date,
     fetch_flights_fn=fetch_flights,
     fetch_leg_details_fn=fetch_leg_details,
+    data: Optional[OcaRunData] = None,
 ) -> Tuple[List[ZfwFlightCheck], Dict[str, Any], Dict[str, Any]]:
-    """Return PAX flights that require a Zero Fuel Weight note review."""
+    """Return PAX flights that require a Zero Fuel Weight note review.
+
+    When ``data`` from :func:`prepare_oca_run` is supplied its flights and
+    leg payloads are used instead of fetching them again.
+    """
 
     if to_date <= from_date:
         raise FlightDataError("The end date must be after the start date for the OCA report window.")
 
-    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+    flights, metadata = _run_flights(config, from_date, to_date, data, fetch_flights_fn)
 
     diagnostics: Dict[str, Any] = {
         "total_flights": len(flights),
@@ -1241,10 +1275,13 @@ def evaluate_flights_for_zfw_check(
 
             quote_id = item.quote_id
             if quote_id:
-                if session is None:
+                if session is None and data is None:
                     session = requests.Session()
                 try:
-                    payload = fetch_leg_details_fn(config, quote_id, session=session)
+                    if data is not None:
+                        payload = data.leg_payload(quote_id)
+                    else:
+                        payload = fetch_leg_details_fn(config, quote_id, session=session)
                 except Exception as exc:  # pragma: no cover - network/runtime issues
                     diagnostics["note_errors"] += 1
                     diagnostics["note_error_messages"].append(str(exc))
@@ -1304,15 +1341,19 @@ def evaluate_flights_for_runway_length(
     to_date: date,
     runway_threshold_ft: int = 5000,
     fetch_flights_fn=fetch_flights,
+    data: Optional[OcaRunData] = None,
 ) -> Tuple[List[RunwayLengthCheck], Dict[str, Any], Dict[str, Any]]:
-    """Return flights departing or arriving at airports below a runway length threshold."""
+    """Return flights departing or arriving at airports below a runway length threshold.
+
+    When ``data`` is supplied its flights are scanned instead of fetching them.
+    """
 
     if to_date <= from_date:
         raise FlightDataError("The end date must be after the start date for the OCA report window.")
     if runway_threshold_ft <= 0:
         raise FlightDataError("The runway length threshold must be a positive value.")
 
-    flights, metadata = fetch_flights_fn(config, from_date=from_date, to_date=to_date)
+    flights, metadata = _run_flights(config, from_date, to_date, data, fetch_flights_fn)
 
     diagnostics: Dict[str, Any] = {
         "total_flights": len(flights),
@@ -0,0 +1,415 @@
+"""Match FL3XX legs against OCS/GIR slot allocations.
+
+Slots are grouped once by ``(airport, movement)`` into minute timelines sorted
+by slot time, so each leg finds its candidates with ``searchsorted`` instead of
+masking the whole slot frame. Allocated and suggested slots are tracked as
+boolean arrays over the slot rows.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+WINDOWS_MIN = {"CYYC": 30, "CYVR": 30, "CYYZ": 30, "CYUL": 15}
+REQUIREMENT_HORIZON_DAYS = {"CYYC": 30, "CYYZ": 30, "CYUL": 10, "CYVR": 3}
+SLOT_AIRPORTS = set(WINDOWS_MIN.keys())
+
+SLOT_COLUMNS = ["SlotAirport", "Date", "Movement", "SlotTimeHHMM", "Tail", "SlotRef"]
+LEG_COLUMNS = ["Flight", "Tail", "Airport", "Movement", "SchedDT", "PAX/OCS", "OtherAirport", "AircraftType"]
+
+_MINUTES_PER_DAY = 24 * 60
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+
+def _utc_today() -> date:
+    return pd.Timestamp.now("UTC").date()
+
+
+def _is_within_requirement_horizon(ap: str, sched_dt: pd.Timestamp, today: Optional[date] = None) -> bool:
+    """Return True when a leg is inside the airport requirement look-ahead window."""
+    if pd.isna(sched_dt):
+        return False
+    threshold_days = REQUIREMENT_HORIZON_DAYS.get(ap)
+    if threshold_days is None:
+        return True
+    today = today or _utc_today()
+    days_out = (sched_dt.date() - today).days
+    return days_out <= threshold_days
+
+
+def _is_tail_mismatch_suppressed(sched_dt: pd.Timestamp, today: Optional[date] = None) -> bool:
+    """Suppress tail mismatches when the leg is farther out than tomorrow."""
+    if pd.isna(sched_dt):
+        return False
+    today = today or _utc_today()
+    days_out = (sched_dt.date() - today).days
+    return days_out > 1
+
+
+def _normalize_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+    else:
+        text = str(value).strip()
+    return text or None
+
+
+def _leg_category(flight_type: Any, workflow: Any) -> str:
+    ft_norm = _normalize_str(flight_type)
+    if ft_norm:
+        ft_upper = ft_norm.upper()
+        if ft_upper == "POS":
+            return "OCS (POS)"
+        if ft_upper == "PAX":
+            return "PAX"
+        return ft_upper
+    wf_norm = _normalize_str(workflow)
+    if wf_norm and "POS" in wf_norm.upper():
+        return "OCS (POS)"
+    return ""
+
+
+def _column(df: pd.DataFrame, name: str, default: Any = None) -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def build_slot_legs(fl3xx_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Return one arrival/departure record per FL3XX leg touching a slot airport.
+
+    Records keep the flight order (arrival before departure for the same row)
+    and duplicates of the same flight/tail/airport/movement/minute are dropped.
+    """
+
+    if fl3xx_df is None or fl3xx_df.empty:
+        return []
+
+    frame = fl3xx_df.reset_index(drop=True)
+    tails = [str(value).upper() for value in _column(frame, "Tail", "")]
+    categories = [
+        _leg_category(flight_type, workflow)
+        for flight_type, workflow in zip(_column(frame, "Flight Type"), _column(frame, "Workflow"))
+    ]
+    aircraft_types = [str(value or "").upper() for value in _column(frame, "Aircraft Type")]
+    base = pd.DataFrame(
+        {
+            "Flight": _column(frame, "Booking").to_numpy(dtype=object),
+            "Tail": tails,
+            "PAX/OCS": categories,
+            "AircraftType": aircraft_types,
+            "_row": np.arange(len(frame)),
+        }
+    )
+    from_ap = _column(frame, "From (ICAO)").to_numpy(dtype=object)
+    to_ap = _column(frame, "To (ICAO)").to_numpy(dtype=object)
+
+    sides = []
+    for movement, airport, other, time_col, rank in (
+        ("ARR", to_ap, from_ap, "OnBlock", 0),
+        ("DEP", from_ap, to_ap, "OffBlock", 1),
+    ):
+        sched = _column(frame, time_col).to_numpy(dtype=object)
+        keep = np.fromiter(
+            (isinstance(ap, str) and ap in SLOT_AIRPORTS for ap in airport), dtype=bool, count=len(frame)
+        ) & pd.notna(sched)
+        side = base[keep].copy()
+        side["Airport"] = airport[keep]
+        side["Movement"] = movement
+        side["SchedDT"] = sched[keep]
+        side["OtherAirport"] = other[keep]
+        side["_rank"] = rank
+        sides.append(side)
+
+    legs_df = pd.concat(sides, ignore_index=True)
+    if legs_df.empty:
+        return []
+    legs_df = legs_df.sort_values(["_row", "_rank"], kind="mergesort")
+    legs_df["SchedDT"] = pd.to_datetime(legs_df["SchedDT"]).dt.floor("min")
+    leg_key = (
+        legs_df["Flight"].astype(str) + "|" +
+        legs_df["Tail"].astype(str) + "|" +
+        legs_df["Airport"].astype(str) + "|" +
+        legs_df["Movement"].astype(str) + "|" +
+        legs_df["SchedDT"].astype(str)
+    )
+    legs_df = legs_df[~leg_key.duplicated()]
+    return legs_df[LEG_COLUMNS].to_dict("records")
+
+
+def _timestamp_minutes(value: pd.Timestamp) -> int:
+    return int(value.value // _NS_PER_MINUTE)
+
+
+class SlotIndex:
+    """OCS slots grouped by ``(airport, movement)`` with per-year minute timelines.
+
+    Slot rows only carry a day and month, so absolute slot times depend on the
+    year of the leg being matched; timelines are built lazily per year and
+    reused for every leg in that year.
+    """
+
+    def __init__(self, ocs_df: pd.DataFrame) -> None:
+        self.frame = ocs_df
+        size = len(ocs_df)
+        self.airports = ocs_df["SlotAirport"].to_numpy(dtype=object)
+        self.movements = ocs_df["Movement"].to_numpy(dtype=object)
+        self.tails = ocs_df["Tail"].to_numpy(dtype=object)
+        self.times = ocs_df["SlotTimeHHMM"].to_numpy(dtype=object)
+        self.refs = ocs_df["SlotRef"].to_numpy(dtype=object)
+        dates = ocs_df["Date"].tolist()
+        self.days = np.array([d for d, _ in dates], dtype=np.int64)
+        self.months = np.array([m for _, m in dates], dtype=np.int64)
+        self.hours = np.array([int(str(t)[:2]) for t in self.times], dtype=np.int64)
+        self.minutes = np.array([int(str(t)[2:]) for t in self.times], dtype=np.int64)
+
+        self.allocated = np.zeros(size, dtype=bool)
+        self.suggested = np.zeros(size, dtype=bool)
+
+        self._groups: Dict[Tuple[Any, Any], np.ndarray] = {}
+        group_positions: Dict[Tuple[Any, Any], List[int]] = {}
+        for pos, key in enumerate(zip(self.airports, self.movements)):
+            group_positions.setdefault(key, []).append(pos)
+        for key, positions in group_positions.items():
+            self._groups[key] = np.asarray(positions, dtype=np.int64)
+        self._available = {key: len(positions) for key, positions in self._groups.items()}
+        self._group_of = [(ap, mv) for ap, mv in zip(self.airports, self.movements)]
+
+        self._ref_positions: Dict[str, List[int]] = {}
+        for pos, ref in enumerate(self.refs):
+            self._ref_positions.setdefault(str(ref), []).append(pos)
+
+        self._timelines: Dict[Tuple[Any, Any, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def available(self, airport: str, movement: str) -> int:
+        """Return how many slots for ``airport``/``movement`` are still unallocated."""
+
+        return self._available.get((airport, movement), 0)
+
+    def timeline(self, airport: str, movement: str, year: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(minutes, positions)`` for a group in ``year``, sorted by slot time.
+
+        Day/month combinations that do not exist in ``year`` are left out.
+        """
+
+        key = (airport, movement, year)
+        cached = self._timelines.get(key)
+        if cached is not None:
+            return cached
+        positions = self._groups.get((airport, movement), np.empty(0, dtype=np.int64))
+        stamps = pd.to_datetime(
+            pd.DataFrame(
+                {
+                    "year": np.full(len(positions), year, dtype=np.int64),
+                    "month": self.months[positions],
+                    "day": self.days[positions],
+                    "hour": self.hours[positions],
+                    "minute": self.minutes[positions],
+                }
+            ),
+            errors="coerce",
+        )
+        valid = stamps.notna().to_numpy()
+        minutes = stamps[valid].to_numpy(dtype="datetime64[m]").astype(np.int64)
+        positions = positions[valid]
+        order = np.argsort(minutes, kind="stable")
+        cached = (minutes[order], positions[order])
+        self._timelines[key] = cached
+        return cached
+
+    def candidates(self, airport: str, movement: str, sched_dt: pd.Timestamp) -> Tuple[np.ndarray, np.ndarray]:
+        """Return unallocated ``(positions, minute deltas)`` within ±1 day of ``sched_dt``."""
+
+        minutes, positions = self.timeline(airport, movement, sched_dt.year)
+        sched_min = _timestamp_minutes(sched_dt)
+        day_start = sched_min - sched_min % _MINUTES_PER_DAY
+        lo, hi = np.searchsorted(
+            minutes, [day_start - _MINUTES_PER_DAY, day_start + 2 * _MINUTES_PER_DAY], side="left"
+        )
+        window_positions = positions[lo:hi]
+        keep = ~self.allocated[window_positions]
+        return window_positions[keep], np.abs(minutes[lo:hi][keep] - sched_min)
+
+    def allocate(self, pos: int) -> None:
+        """Mark every slot sharing the reference of row ``pos`` as allocated."""
+
+        for other in self._ref_positions[str(self.refs[pos])]:
+            if not self.allocated[other]:
+                self.allocated[other] = True
+                self._available[self._group_of[other]] -= 1
+
+    def suggest(self, pos: int) -> None:
+        for other in self._ref_positions[str(self.refs[pos])]:
+            self.suggested[other] = True
+
+
+def _closest(positions: np.ndarray, deltas: np.ndarray) -> Tuple[int, int]:
+    """Return ``(position, delta)`` with the smallest delta, earliest slot row on ties."""
+
+    best = np.lexsort((positions, deltas))[0]
+    return int(positions[best]), int(deltas[best])
+
+
+class _LegTimeline:
+    """Legs of one airport/movement/year sorted by local calendar date."""
+
+    def __init__(self) -> None:
+        self.ordinals: List[int] = []
+        self.legs: List[Dict[str, Any]] = []
+
+    def add(self, leg: Dict[str, Any]) -> None:
+        self.ordinals.append(leg["SchedDT"].date().toordinal())
+        self.legs.append(leg)
+
+    def finalise(self) -> None:
+        order = sorted(range(len(self.legs)), key=lambda idx: self.ordinals[idx])
+        self.ordinals = [self.ordinals[idx] for idx in order]
+        self.legs = [self.legs[idx] for idx in order]
+
+    def near(self, ordinal: int) -> List[Dict[str, Any]]:
+        return self.legs[bisect_left(self.ordinals, ordinal - 1) : bisect_right(self.ordinals, ordinal + 1)]
+
+
+def _stale_mask(index: SlotIndex, legs: List[Dict[str, Any]], today: date) -> np.ndarray:
+    """Return which slots are unused and unexplained by any nearby leg.
+
+    A slot is NOT stale if:
+      (a) there is ANY leg with same airport/movement/TAIL within ±1 day of the slot's date, or
+      (b) we've already used it (Matched) or suggested it (Tail mismatch), or
+      (c) the leg is outside the airport requirement look-ahead window, or
+      (d) it's a suppressed far-future wrong-tail case (farther out than tomorrow).
+    """
+
+    timelines: Dict[Tuple[Any, Any], Dict[int, _LegTimeline]] = {}
+    for leg in legs:
+        if pd.isna(leg["SchedDT"]):
+            continue
+        by_year = timelines.setdefault((leg["Airport"], leg["Movement"]), {})
+        by_year.setdefault(leg["SchedDT"].year, _LegTimeline()).add(leg)
+    for by_year in timelines.values():
+        for timeline in by_year.values():
+            timeline.finalise()
+
+    stale = ~(index.allocated | index.suggested)
+    for pos in np.flatnonzero(stale):
+        ap = index.airports[pos]
+        by_year = timelines.get((ap, index.movements[pos]))
+        if not by_year:
+            continue
+        tail = index.tails[pos]
+        month = int(index.months[pos])
+        day = int(index.days[pos])
+        for year, timeline in by_year.items():
+            try:
+                # build slot date using leg's year (slots have no year)
+                slot_date = date(year, month, day)
+            except ValueError:
+                continue
+            for leg in timeline.near(slot_date.toordinal()):
+                if leg["Tail"] == tail:
+                    stale[pos] = False
+                elif _is_tail_mismatch_suppressed(leg["SchedDT"], today):
+                    stale[pos] = False
+                if not _is_within_requirement_horizon(ap, leg["SchedDT"], today):
+                    stale[pos] = False
+                if not stale[pos]:
+                    break
+            if not stale[pos]:
+                break
+    return stale
+
+
+def compare(fl3xx_df: pd.DataFrame, ocs_df: pd.DataFrame):
+    """Classify FL3XX legs against OCS slots.
+
+    Returns ``(results, stale_df)`` where ``results`` holds ``Matched``,
+    ``Missing``, ``MisalignedTail`` and ``MisalignedTime`` record lists and
+    ``stale_df`` is the slice of ``ocs_df`` no leg accounts for.
+    """
+
+    # Split misaligned into tail vs time
+    results: Dict[str, List[Dict[str, Any]]] = {
+        "Matched": [],
+        "Missing": [],
+        "MisalignedTail": [],
+        "MisalignedTime": [],
+    }
+    legs = build_slot_legs(fl3xx_df)
+    index = SlotIndex(ocs_df)
+    today = _utc_today()
+
+    for leg in legs:
+        ap, move, tail, sched_dt = leg["Airport"], leg["Movement"], leg["Tail"], leg["SchedDT"]
+
+        if not _is_within_requirement_horizon(ap, sched_dt, today):
+            continue
+
+        # Only slots for the same airport & movement that are NOT already allocated
+        if not index.available(ap, move):
+            results["Missing"].append({**leg, "Reason": "No slot for airport/movement"})
+            continue
+
+        # Keep slots on the same day or ±1 day of the leg (cross-midnight tolerance)
+        positions, deltas = index.candidates(ap, move, sched_dt)
+        if not len(positions):
+            results["Missing"].append({**leg, "Reason": "No slot (±1 day)"})
+            continue
+
+        window = WINDOWS_MIN.get(ap, 30)
+
+        # Compute best same-tail and best any-tail deltas
+        same_tail = index.tails[positions] == tail
+        same_tail_best, same_tail_pos = None, None
+        if same_tail.any():
+            same_tail_pos, same_tail_best = _closest(positions[same_tail], deltas[same_tail])
+        any_pos, any_best = _closest(positions, deltas)
+
+        # Decision order:
+        # 1) same-tail within window → Matched (allocate; cannot be reused)
+        if same_tail_best is not None and same_tail_best <= window:
+            results["Matched"].append({
+                **leg,
+                "SlotTime": index.times[same_tail_pos],
+                "DeltaMin": same_tail_best,
+                "SlotRef": index.refs[same_tail_pos],
+            })
+            index.allocate(same_tail_pos)
+            continue
+
+        # 2) any-tail within window → Tail mismatch (do NOT allocate; wrong tail booked)
+        if any_best <= window:
+            if not _is_tail_mismatch_suppressed(sched_dt, today) and not index.suggested[any_pos]:
+                results["MisalignedTail"].append({
+                    **leg,
+                    "NearestSlotTime": index.times[any_pos],
+                    "DeltaMin": any_best,
+                    "WindowMin": window,
+                    "SlotTail": index.tails[any_pos],
+                    "SlotRef": index.refs[any_pos],
+                })
+                index.suggest(any_pos)
+            continue
+
+        # 3) same-tail exists but out of window → Time mismatch (do NOT allocate)
+        if same_tail_best is not None:
+            results["MisalignedTime"].append({
+                **leg,
+                "NearestSlotTime": index.times[same_tail_pos],
+                "DeltaMin": same_tail_best,
+                "WindowMin": window,
+                "SlotRef": index.refs[same_tail_pos],
+            })
+            continue
+
+        # 4) otherwise → Missing
+        results["Missing"].append({**leg, "Reason": "No matching tail/time within window"})
+
+    stale_df = ocs_df[_stale_mask(index, legs, today)].copy()
+    return results, stale_df
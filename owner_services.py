@@ -2,8 +2,18 @@
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Mapping, Optional, Sequence
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from fl3xx_api import Fl3xxApiConfig, fetch_flight_services, fetch_leg_details, fetch_many, unique_ids
+
+DEFAULT_OWNER_SERVICES_FETCH_WORKERS = 8
+# Legs whose note digests the scanner remembers before dropping the oldest.
+DEFAULT_NOTE_CACHE_SIZE = 20000
 
 
 def _normalise_status(value: Any) -> str:
@@ -391,3 +401,207 @@ def format_owner_service_entries(entries: Sequence[OwnerServiceEntry]) -> str:
 
     body = "\n".join(lines)
     return f"{header}\n{body}" if body else header
+
+
+@dataclass
+class OwnerServicePayloads:
+    """Leg-detail and services payloads for a window, keyed by ``str(id)``."""
+
+    leg_details: Dict[str, Any] = field(default_factory=dict)
+    services: Dict[str, Any] = field(default_factory=dict)
+    leg_detail_errors: Dict[str, Exception] = field(default_factory=dict)
+    service_errors: Dict[str, Exception] = field(default_factory=dict)
+    requests: int = 0
+
+
+def fetch_owner_service_payloads(
+    config: Fl3xxApiConfig,
+    *,
+    quote_ids: Iterable[Any] = (),
+    flight_ids: Iterable[Any] = (),
+    max_workers: int = DEFAULT_OWNER_SERVICES_FETCH_WORKERS,
+    fetch_leg_details_fn: Optional[Callable[..., Any]] = None,
+    fetch_services_fn: Optional[Callable[..., Any]] = None,
+) -> OwnerServicePayloads:
+    """Fetch leg details per quote and services per flight on one worker pool.
+
+    Identifiers are de-duplicated and every request runs on a per-thread
+    ``requests.Session``. Failures are collected per identifier instead of
+    raised, so callers can warn about them in leg order.
+    """
+
+    fetch_leg_details_fn = fetch_leg_details_fn or fetch_leg_details
+    fetch_services_fn = fetch_services_fn or fetch_flight_services
+    payloads = OwnerServicePayloads()
+    jobs: List[Tuple[bool, str]] = [(True, quote_id) for quote_id in unique_ids(quote_ids)]
+    jobs.extend((False, flight_id) for flight_id in unique_ids(flight_ids))
+
+    def _fetch(job: Tuple[bool, str], http: Any) -> Any:
+        is_leg, identifier = job
+        fetch_fn = fetch_leg_details_fn if is_leg else fetch_services_fn
+        return fetch_fn(config, identifier, session=http)
+
+    results = fetch_many(jobs, _fetch, max_workers=max_workers)
+    payloads.requests = len(jobs)
+    for (is_leg, identifier), (ok, value) in results.items():
+        if ok:
+            (payloads.leg_details if is_leg else payloads.services)[identifier] = value
+        else:
+            (payloads.leg_detail_errors if is_leg else payloads.service_errors)[identifier] = value
+    return payloads
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher for whole-word, case-insensitive keywords.
+
+    Matches are what ``re.finditer(r"\\b(k1|k2|...)\\b", text, re.IGNORECASE)``
+    reports for the same keywords in the same order: scanning left to right,
+    the earliest-listed keyword wins at each start and matches never overlap.
+    Unlike that alternation, the cost of a scan grows with the text rather
+    than with the number of keywords.
+    """
+
+    def __init__(self, keywords: Iterable[Any]) -> None:
+        terms = (str(term).lower() for term in keywords if term not in (None, ""))
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(term for term in terms if term))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[List[int]] = [[]]
+        for index, term in enumerate(self.keywords):
+            state = 0
+            for char in term:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                outputs[next_state].extend(outputs[self._fail[next_state]])
+        self._outputs: List[Tuple[int, ...]] = [tuple(indices) for indices in outputs]
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def find(self, text: str) -> List[str]:
+        """Return the distinct keywords matched in ``text``, sorted."""
+
+        if not self.keywords or not text:
+            return []
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+        goto, fail, outputs, keywords = self._goto, self._fail, self._outputs, self.keywords
+        length = len(lowered)
+
+        def _boundary(position: int) -> bool:
+            before = position > 0 and _is_word_char(lowered[position - 1])
+            after = position < length and _is_word_char(lowered[position])
+            return before != after
+
+        candidates: List[Tuple[int, int, int]] = []
+        state = 0
+        for end, char in enumerate(lowered, start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in outputs[state]:
+                start = end - len(keywords[index])
+                if _boundary(start) and _boundary(end):
+                    candidates.append((start, index, end))
+
+        matched = set()
+        position = 0
+        for start, index, end in sorted(candidates):
+            if start >= position:
+                matched.add(keywords[index])
+                position = end
+        return sorted(matched)
+
+
+@dataclass(frozen=True)
+class NoteKeywordMatches:
+    """Keywords found in one leg's notes; both tuples are sorted."""
+
+    keywords: Tuple[str, ...] = ()
+    special_event_terms: Tuple[str, ...] = ()
+
+
+def note_blocks_digest(note_blocks: Sequence[Tuple[str, str]]) -> str:
+    """Return a stable digest of a leg's ``(label, text)`` note blocks."""
+
+    encoded = json.dumps([list(block) for block in note_blocks], ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class SensitiveNoteScanner:
+    """Scan leg notes for monitored keywords, remembering results per leg.
+
+    Monitored keywords are matched in every note block; special-event terms
+    only in blocks whose label is in ``special_event_labels``. Results are
+    cached per leg key together with a digest of the leg's notes, so a refresh
+    only rescans legs whose notes changed. A scanner is tied to one keyword
+    list; build a new one when the list changes.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[Any],
+        special_event_terms: Iterable[Any] = (),
+        *,
+        special_event_labels: Sequence[str] = ("Planning notes",),
+        max_entries: int = DEFAULT_NOTE_CACHE_SIZE,
+    ) -> None:
+        self.keywords = KeywordAutomaton(keywords)
+        self.special_event_terms = KeywordAutomaton(special_event_terms)
+        self.special_event_labels = frozenset(special_event_labels)
+        self.max_entries = max_entries
+        self._results: Dict[str, Tuple[str, NoteKeywordMatches]] = {}
+        self._lock = threading.Lock()
+
+    def _scan_blocks(self, note_blocks: Sequence[Tuple[str, str]]) -> NoteKeywordMatches:
+        keywords: set[str] = set()
+        special: set[str] = set()
+        for label, text in note_blocks:
+            keywords.update(self.keywords.find(text))
+            if label in self.special_event_labels:
+                special.update(self.special_event_terms.find(text))
+        return NoteKeywordMatches(tuple(sorted(keywords)), tuple(sorted(special)))
+
+    def scan(self, leg_key: Optional[str], note_blocks: Sequence[Tuple[str, str]]) -> Tuple[NoteKeywordMatches, bool]:
+        """Return the matches for one leg and whether they had to be rescanned.
+
+        Legs without a key are always scanned and never cached.
+        """
+
+        if not leg_key:
+            return self._scan_blocks(note_blocks), True
+        digest = note_blocks_digest(note_blocks)
+        with self._lock:
+            cached = self._results.pop(leg_key, None)
+            if cached is not None and cached[0] == digest:
+                self._results[leg_key] = cached
+                return cached[1], False
+        matches = self._scan_blocks(note_blocks)
+        with self._lock:
+            self._results[leg_key] = (digest, matches)
+            while len(self._results) > self.max_entries:
+                del self._results[next(iter(self._results))]
+        return matches, True
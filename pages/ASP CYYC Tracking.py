@@ -1,5 +1,4 @@
-import email
-import imaplib
+import io
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -8,6 +7,7 @@ from streamlit_autorefresh import st_autorefresh
 from zoneinfo_compat import ZoneInfo
 
 from Home import configure_page, get_secret, password_gate, render_sidebar, require_secret
+from tracking_email_ingest import DEFAULT_IMAP_SERVER, TrackingMailbox, TrackingSnapshot
 
 configure_page(page_title="Aircraft Presence (McCall/Palmer)")
 password_gate()
@@ -25,7 +25,7 @@ st_autorefresh(interval=180 * 1000, key="gpsfeedrefresh")
 # Load credentials from secrets
 EMAIL_ACCOUNT = require_secret("EMAIL_ACCOUNT")
 EMAIL_PASSWORD = require_secret("EMAIL_PASSWORD")
-IMAP_SERVER = get_secret("IMAP_SERVER", "imap.gmail.com")
+IMAP_SERVER = get_secret("IMAP_SERVER", DEFAULT_IMAP_SERVER)
 
 SENDER = "no-reply@telematics.guru"
 SUBJECT = "ASP TRACKING EMAIL"
@@ -43,47 +43,6 @@ HANGAR_ALIASES = {
 }
 
 
-# ----------------------------
-# Fetch Latest CSV
-# ----------------------------
-def fetch_latest_csv() -> pd.DataFrame:
-    try:
-        mail = imaplib.IMAP4_SSL(IMAP_SERVER)
-        mail.login(EMAIL_ACCOUNT, EMAIL_PASSWORD)
-        mail.select("inbox")
-
-        status, messages = mail.search(None, f'(FROM "{SENDER}" SUBJECT "{SUBJECT}")')
-        if status != "OK" or not messages[0]:
-            return pd.DataFrame()
-
-        latest_id = messages[0].split()[-1]
-        status, msg_data = mail.fetch(latest_id, "(RFC822)")
-        msg = email.message_from_bytes(msg_data[0][1])
-
-        for part in msg.walk():
-            if part.get_content_maintype() == "multipart":
-                continue
-            if part.get("Content-Disposition") is None:
-                continue
-            filename = part.get_filename()
-            if not filename:
-                continue
-
-            filename = filename.strip()
-            is_expected_file = filename == FILENAME
-            is_csv_attachment = filename.lower().endswith(".csv")
-
-            if is_expected_file or is_csv_attachment:
-                payload = part.get_payload(decode=True)
-                df = pd.read_csv(pd.io.common.BytesIO(payload))
-                return df
-
-        return pd.DataFrame()
-
-    except Exception:
-        return pd.DataFrame()
-
-
 # ----------------------------
 # Helpers
 # ----------------------------
@@ -155,11 +114,39 @@ def render_hangar(name: str, df: pd.DataFrame):
             col.success(f"🛩️ {row['Tail']}", icon="✅")
 
 
+# ----------------------------
+# Fetch Latest CSV
+# ----------------------------
+def parse_attachment(payload: bytes) -> pd.DataFrame:
+    return parse_df(pd.read_csv(io.BytesIO(payload)))
+
+
+@st.cache_resource(show_spinner=False)
+def get_tracking_mailbox(server: str, account: str, password: str) -> TrackingMailbox:
+    # One mailbox per app keeps the IMAP connection and last-seen UID across refreshes.
+    return TrackingMailbox(
+        account=account,
+        password=password,
+        server=server,
+        sender=SENDER,
+        subject=SUBJECT,
+        filename=FILENAME,
+        parse_fn=parse_attachment,
+    )
+
+
+def fetch_latest_report() -> TrackingSnapshot:
+    return get_tracking_mailbox(IMAP_SERVER, EMAIL_ACCOUNT, EMAIL_PASSWORD).poll()
+
+
 # ----------------------------
 # Main
 # ----------------------------
-df = fetch_latest_csv()
-df = parse_df(df)
+snapshot = fetch_latest_report()
+df = snapshot.frame
+
+if snapshot.error:
+    st.caption(f"⚠️ {snapshot.error}")
 
 if df.empty:
     st.warning("No data available yet.")
@@ -1,11 +1,16 @@
-import itertools
-import math
-import random
-
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from cargo_packing import (
+    CONTAINERS as containers,
+    STANDARD_BAGGAGE as standard_baggage,
+    bag_volume,
+    cargo_volume,
+    fits_inside,
+    fits_through_door,
+    multi_strategy_packing,
+)
 from Home import configure_page, password_gate, render_sidebar
 
 configure_page(page_title="Aircraft Cargo Fit Checker")
@@ -30,565 +35,6 @@ st.markdown(
     "Actual results may vary depending on actual baggage size, materials, fullness, and shape. "
     )
 
-# ============================================================
-# Predefined Containers
-# ============================================================
-containers = {
-    "CJ": {
-        "door": {"width_min": 24, "width_max": 26, "height": 20, "diag": 31},
-        "interior": {
-            "height": 22,         # z
-            "depth": 45,          # x (front -> back)
-            "width": 84,          # y (left -> right)
-            "restricted": {"width": 20, "depth": 20},   # near the door, right side (y high, x near 0)
-            # Long tunnel: against the BACK WALL (x near cargo_L), spans full width (y 0->84)
-            "tunnel": {"depth": 24, "width": 84}
-        }
-    },
-    "Sprinter Van (Rear)": {
-        "door": {"width": 68, "height": 46, "diag": math.hypot(68, 46)},
-        "interior": {
-            "height": 46,
-            "depth": 33,
-            "width": 68,
-            "depth_profile": {
-                "slope_start": 13,
-                "slope_end": 40,
-                "depth_max": 33,
-                "depth_min": 20
-            }
-        }
-    },
-    "Legacy": {
-        "door": {"width": 34, "height": 22, "diag": 38},
-        "interior": {
-            "height": 36,
-            "depth": 89,
-            "width_min": 36,
-            "width_max": 54
-        }
-    },
-    "Full-Size SUV": {
-        "modes": [
-            {
-                "label": "Third Row Up (All Seats in Use)",
-                "cargo_volume_cf": 41,
-                "door": {"width": 49, "height": 28, "diag": math.hypot(49, 28)},
-                "interior": {"depth": 22, "width": 49, "height": 28}
-            },
-            {
-                "label": "Third Row Folded",
-                "cargo_volume_cf": 94,
-                "door": {"width": 49, "height": 28, "diag": math.hypot(49, 28)},
-                "interior": {"depth": 50, "width": 49, "height": 28}
-            }
-        ]
-    }
-}
-
-# ============================================================
-# Standard Baggage Presets (with Flexibility)
-# ============================================================
-standard_baggage = {
-    "Small Carry-on": {"dims": (22, 14, 9), "flex": 1.0},
-    "Standard Suitcase": {"dims": (26, 18, 10), "flex": 1.0},
-    "Large Suitcase": {"dims": (30, 19, 11), "flex": 1.0},
-    "Golf Clubs (Soft Bag)": {"dims": (55, 13, 13), "flex": 0.85},
-    "Ski Bag (Soft)": {"dims": (70, 12, 7), "flex": 0.9},
-    "Custom": {"dims": None, "flex": 1.0}
-}
-
-# ============================================================
-# Helper Functions
-# ============================================================
-def fits_through_door(box_dims, door, flex=1.0):
-    dims_flex = apply_flex(box_dims, flex)
-    for dims in itertools.permutations(dims_flex):
-        bw, bh = dims[0], dims[1]
-        diag = math.hypot(bw, bh)
-        if "width_min" in door:  # CJ style door with narrowest span
-            width_ok_min = bw <= door["width_min"]
-            width_ok_max = bw <= door["width_max"]
-            height_ok = bh <= door["height"]
-            if width_ok_min and height_ok:
-                return True
-            if width_ok_min and width_ok_max and diag <= door["diag"]:
-                return True
-        else:  # Legacy style door (single width)
-            width_ok = bw <= door["width"]
-            height_ok = bh <= door["height"]
-            if width_ok and height_ok:
-                return True
-            if width_ok and diag <= door["diag"]:
-                return True
-    return False
-
-def legacy_width_at_height(interior, z):
-    """Linear interpolation of width at height z (Legacy taper)."""
-    h = interior["height"]
-    wmin, wmax = interior["width_min"], interior["width_max"]
-    return wmin + (wmax - wmin) * (z / h)
-
-def depth_at_height(interior, z):
-    """Return available depth at height z for sloped holds."""
-    profile = interior.get("depth_profile")
-    if not profile:
-        return interior["depth"]
-    slope_start = profile["slope_start"]
-    slope_end = profile["slope_end"]
-    depth_max = profile["depth_max"]
-    depth_min = profile["depth_min"]
-    if z <= slope_start:
-        return depth_max
-    if z >= slope_end:
-        return depth_min
-    slope = (depth_min - depth_max) / (slope_end - slope_start)
-    return depth_max + slope * (z - slope_start)
-
-def apply_flex(dims, flex):
-    """Apply flexibility/squish factor (for fit checks only)."""
-    l, w, h = dims
-    return (l * flex, w * flex, h * flex)
-
-def fits_in_space(box_dims, space_dims):
-    """Return an oriented (l,w,h) that fits inside space_dims (L,W,H), else None."""
-    l, w, h = box_dims
-    for dims in itertools.permutations([l, w, h]):
-        bl, bw, bh = dims
-        if bl <= space_dims[0] and bw <= space_dims[1] and bh <= space_dims[2]:
-            return dims
-    return None
-
-def can_fit_rotated_in_plane(item_length, item_width, space_length, space_width, step_degrees=1.0):
-    """Check if a rectangle can fit in a rectangle via in-plane rotation."""
-    for angle_deg in [i * step_degrees for i in range(int(90 / step_degrees) + 1)]:
-        angle = math.radians(angle_deg)
-        cos_a = abs(math.cos(angle))
-        sin_a = abs(math.sin(angle))
-        proj_length = item_length * cos_a + item_width * sin_a
-        proj_width = item_length * sin_a + item_width * cos_a
-        if proj_length <= space_length and proj_width <= space_width:
-            return True
-    return False
-
-def box_diagonal(length, width, height):
-    return math.sqrt(length ** 2 + width ** 2 + height ** 2)
-
-def fits_inside(box_dims, interior, container_type, flex=1.0, allow_diagonal=False):
-    """Check if a single box can fit somewhere in the empty hold (not a packing check)."""
-    dims_flex = apply_flex(box_dims, flex)
-    for dims in itertools.permutations(dims_flex):
-        bl, bw, bh = dims
-        if container_type == "CJ":
-            if bh <= interior["height"] and bl <= interior["depth"] and bw <= interior["width"]:
-                r = interior["restricted"]
-                main_depth = max(0.0, interior["depth"] - r["depth"])
-                main_width = max(0.0, interior["width"] - r["width"])
-                fits_outside_restricted = (
-                    bl > r["depth"]
-                    or bw > r["width"]
-                    or bl <= main_depth
-                    or bw <= main_width
-                )
-                if fits_outside_restricted:
-                    return True, False
-            if allow_diagonal and bh <= interior["height"]:
-                r = interior["restricted"]
-                main_depth = max(0.0, interior["depth"] - r["depth"])
-                main_width = max(0.0, interior["width"] - r["width"])
-                diagonal_spaces = [
-                    (r["depth"], main_width),
-                    (main_depth, interior["width"]),
-                    (interior["depth"], interior["width"]),
-                ]
-                for space_depth, space_width in diagonal_spaces:
-                    if can_fit_rotated_in_plane(bl, bw, space_depth, space_width):
-                        return True, True
-                space_diag = box_diagonal(interior["depth"], interior["width"], interior["height"])
-                if bl <= space_diag and bw <= interior["width"] and bh <= interior["height"]:
-                    return True, True
-        elif container_type == "Legacy":
-            width_limit = min(
-                legacy_width_at_height(interior, 0),
-                legacy_width_at_height(interior, bh)
-            )
-            if bl <= interior["depth"] and bh <= interior["height"]:
-                if bw <= width_limit:
-                    return True, False
-            if allow_diagonal and bh <= interior["height"]:
-                if can_fit_rotated_in_plane(bl, bw, interior["depth"], width_limit):
-                    return True, True
-                space_diag = box_diagonal(interior["depth"], width_limit, interior["height"])
-                if bl <= space_diag and bw <= width_limit and bh <= interior["height"]:
-                    return True, True
-        else:
-            depth_limit = depth_at_height(interior, bh)
-            if bh <= interior["height"] and bl <= depth_limit and bw <= interior["width"]:
-                return True, False
-            if allow_diagonal and bh <= interior["height"]:
-                if can_fit_rotated_in_plane(bl, bw, depth_limit, interior["width"]):
-                    return True, True
-                space_diag = box_diagonal(depth_limit, interior["width"], interior["height"])
-                if bl <= space_diag and bw <= interior["width"] and bh <= interior["height"]:
-                    return True, True
-    return False, False
-
-def bag_volume(dims):
-    l, w, h = dims
-    return l * w * h
-
-def cargo_volume(interior, container_type):
-    if container_type == "CJ":
-        main_vol = interior["depth"] * interior["width"] * interior["height"]
-        restricted = interior["restricted"]
-        restricted_vol = restricted["depth"] * restricted["width"] * interior["height"]
-        return max(0.0, main_vol - restricted_vol)
-    if container_type == "Legacy":
-        # approximate trapezoidal cross-section (average width)
-        return interior["depth"] * ((interior["width_min"] + interior["width_max"]) / 2) * interior["height"]
-    if "depth_profile" in interior:
-        profile = interior["depth_profile"]
-        slope_start = profile["slope_start"]
-        slope_end = profile["slope_end"]
-        depth_max = profile["depth_max"]
-        depth_min = profile["depth_min"]
-        height = interior["height"]
-        width = interior["width"]
-        lower_vol = depth_max * slope_start
-        middle_height = max(0.0, slope_end - slope_start)
-        middle_vol = ((depth_max + depth_min) / 2) * middle_height
-        upper_vol = depth_min * max(0.0, height - slope_end)
-        return width * (lower_vol + middle_vol + upper_vol)
-    return interior["depth"] * interior["width"] * interior["height"]
-
-# ============================================================
-# Free-Space 3D Packing (with CJ Tunnel specialization)
-# ============================================================
-def space_volume(space):
-    return space["L"] * space["W"] * space["H"]
-
-def prune_spaces(spaces):
-    pruned = []
-    for i, space in enumerate(spaces):
-        contained = False
-        for j, other in enumerate(spaces):
-            if i == j:
-                continue
-            if (
-                space["x"] >= other["x"]
-                and space["y"] >= other["y"]
-                and space["z"] >= other["z"]
-                and space["x"] + space["L"] <= other["x"] + other["L"]
-                and space["y"] + space["W"] <= other["y"] + other["W"]
-                and space["z"] + space["H"] <= other["z"] + other["H"]
-                and space["Section"] == other["Section"]
-            ):
-                contained = True
-                break
-        if not contained:
-            pruned.append(space)
-    return pruned
-
-def initial_spaces(container_type, interior):
-    if container_type == "CJ":
-        cargo_L = interior["depth"]
-        cargo_W = interior["width"]
-        cargo_H = interior["height"]
-        r = interior["restricted"]
-        t = interior["tunnel"]
-
-        spaces = []
-        # Space near door, left side (exclude restricted block)
-        spaces.append({
-            "x": 0.0,
-            "y": 0.0,
-            "z": 0.0,
-            "L": r["depth"],
-            "W": max(0.0, cargo_W - r["width"]),
-            "H": cargo_H,
-            "Section": "Main"
-        })
-        # Space behind restricted block, before tunnel
-        spaces.append({
-            "x": r["depth"],
-            "y": 0.0,
-            "z": 0.0,
-            "L": max(0.0, cargo_L - r["depth"] - t["depth"]),
-            "W": cargo_W,
-            "H": cargo_H,
-            "Section": "Main"
-        })
-        # Space beside tunnel at back wall
-        spaces.append({
-            "x": max(0.0, cargo_L - t["depth"]),
-            "y": t["width"],
-            "z": 0.0,
-            "L": t["depth"],
-            "W": max(0.0, cargo_W - t["width"]),
-            "H": cargo_H,
-            "Section": "Main"
-        })
-        # Tunnel space
-        spaces.append({
-            "x": max(0.0, cargo_L - t["depth"]),
-            "y": 0.0,
-            "z": 0.0,
-            "L": t["depth"],
-            "W": t["width"],
-            "H": cargo_H,
-            "Section": "Tunnel"
-        })
-        return [s for s in spaces if s["L"] > 0 and s["W"] > 0 and s["H"] > 0]
-
-    if container_type == "Legacy":
-        # Legacy (tapered) - use max width with taper checks on placement
-        return [{
-            "x": 0.0,
-            "y": 0.0,
-            "z": 0.0,
-            "L": interior["depth"],
-            "W": interior["width_max"],
-            "H": interior["height"],
-            "Section": "Main"
-        }]
-
-    return [{
-        "x": 0.0,
-        "y": 0.0,
-        "z": 0.0,
-        "L": interior["depth"],
-        "W": interior["width"],
-        "H": interior["height"],
-        "Section": "Main"
-    }]
-
-def legacy_width_ok(interior, y1, z0, z1):
-    from_bottom = legacy_width_at_height(interior, z0)
-    to_top = legacy_width_at_height(interior, z1)
-    w_avail = min(from_bottom, to_top)
-    return y1 <= w_avail
-
-def choose_oriented_fit(box_dims, space_dims, prefer_long_axis=False):
-    permutations = list(itertools.permutations(box_dims))
-    if prefer_long_axis:
-        longest = max(box_dims)
-        preferred = [dims for dims in permutations if dims[1] == longest]
-        permutations = preferred + [dims for dims in permutations if dims not in preferred]
-    for dims in permutations:
-        bl, bw, bh = dims
-        if bl <= space_dims[0] and bw <= space_dims[1] and bh <= space_dims[2]:
-            return dims
-    return None
-
-def split_space(space, dims):
-    l, w, h = dims
-    spaces = []
-    if space["L"] - l > 1e-6:
-        spaces.append({
-            "x": space["x"] + l,
-            "y": space["y"],
-            "z": space["z"],
-            "L": space["L"] - l,
-            "W": space["W"],
-            "H": space["H"],
-            "Section": space["Section"]
-        })
-    if space["W"] - w > 1e-6:
-        spaces.append({
-            "x": space["x"],
-            "y": space["y"] + w,
-            "z": space["z"],
-            "L": l,
-            "W": space["W"] - w,
-            "H": space["H"],
-            "Section": space["Section"]
-        })
-    if space["H"] - h > 1e-6:
-        spaces.append({
-            "x": space["x"],
-            "y": space["y"],
-            "z": space["z"] + h,
-            "L": l,
-            "W": w,
-            "H": space["H"] - h,
-            "Section": space["Section"]
-        })
-    return spaces
-
-def greedy_3d_packing(
-    baggage_list,
-    container_type,
-    interior,
-    force_tunnel_for_long=True,
-    long_threshold=50,
-    allow_tunnel_for_short=False
-):
-    """
-    Returns (success: bool, placements: list[dict]).
-    Each placement: {Item, Type, Dims: (x,y,z) oriented, Position: (x0,y0,z0), Section: "Tunnel"/"Main"}
-    """
-    placements = []
-    spaces = initial_spaces(container_type, interior)
-
-    for i, item in enumerate(baggage_list):
-        dims_flex = apply_flex(item["Dims"], item.get("Flex", 1.0))
-        placed = False
-        is_long = max(dims_flex) >= long_threshold
-
-        tunnel_first = container_type == "CJ" and is_long and force_tunnel_for_long
-        allowed_tunnel = container_type == "CJ" and (allow_tunnel_for_short or is_long)
-
-        space_order = []
-        if tunnel_first:
-            space_order.extend([s for s in spaces if s["Section"] == "Tunnel"])
-            space_order.extend([s for s in spaces if s["Section"] == "Main"])
-        elif allowed_tunnel:
-            space_order.extend(spaces)
-        else:
-            space_order.extend([s for s in spaces if s["Section"] == "Main"])
-
-        best_choice = None
-        best_space = None
-        best_dims = None
-
-        for space in space_order:
-            if space["Section"] == "Tunnel" and not allowed_tunnel:
-                continue
-            oriented = choose_oriented_fit(
-                dims_flex,
-                (space["L"], space["W"], space["H"]),
-                prefer_long_axis=(
-                    container_type == "CJ"
-                    and space["Section"] == "Tunnel"
-                    and is_long
-                    and force_tunnel_for_long
-                )
-            )
-            if not oriented:
-                continue
-            l, w, h = oriented
-            x0, y0, z0 = space["x"], space["y"], space["z"]
-            x1, y1, z1 = x0 + l, y0 + w, z0 + h
-
-            if container_type == "Legacy" and not legacy_width_ok(interior, y1, z0, z1):
-                continue
-            if "depth_profile" in interior and x1 > depth_at_height(interior, z1):
-                continue
-
-            leftover = space_volume(space) - (l * w * h)
-            if best_choice is None or leftover < best_choice:
-                best_choice = leftover
-                best_space = space
-                best_dims = (l, w, h)
-
-        if best_space and best_dims:
-            l, w, h = best_dims
-            placements.append({
-                "Item": i + 1,
-                "Type": item["Type"],
-                "Dims": best_dims,
-                "Position": (best_space["x"], best_space["y"], best_space["z"]),
-                "Section": best_space["Section"]
-            })
-            spaces.remove(best_space)
-            spaces.extend(split_space(best_space, best_dims))
-            spaces = prune_spaces([s for s in spaces if s["L"] > 1e-6 and s["W"] > 1e-6 and s["H"] > 1e-6])
-            placed = True
-
-        if not placed:
-            return False, placements
-
-    return True, placements
-
-# ============================================================
-# Multi-Strategy Packing Wrapper
-# ============================================================
-def multi_strategy_packing(baggage_list, container_type, interior):
-    # Different orderings can impact greedy results
-    strategies = {
-        "Original Order": baggage_list,
-        "Largest Volume First": sorted(baggage_list, key=lambda x: bag_volume(x["Dims"]), reverse=True),
-        "Largest Dimension First": sorted(baggage_list, key=lambda x: max(x["Dims"]), reverse=True),
-        "Largest Footprint First": sorted(baggage_list, key=lambda x: (x["Dims"][0] * x["Dims"][1]), reverse=True),
-        "Smallest First": sorted(baggage_list, key=lambda x: bag_volume(x["Dims"]))
-    }
-
-    for seed in (7, 23, 91):
-        shuffled = baggage_list[:]
-        random.Random(seed).shuffle(shuffled)
-        strategies[f"Random Shuffle {seed}"] = shuffled
-
-    if container_type == "CJ":
-        def is_long(item):
-            return max(item["Dims"]) >= 50
-
-        tunnel_priority = sorted(
-            baggage_list,
-            key=lambda x: (
-                not is_long(x),
-                -bag_volume(x["Dims"])
-            )
-        )
-        strategies["Tunnel Priority Ordering"] = tunnel_priority
-
-    if container_type == "CJ":
-        variant_settings = [
-            {
-                "force_tunnel_for_long": True,
-                "long_threshold": 50,
-                "allow_tunnel_for_short": False,
-                "label": "Prefer tunnel ≥50\""
-            },
-            {
-                "force_tunnel_for_long": True,
-                "long_threshold": 60,
-                "allow_tunnel_for_short": False,
-                "label": "Prefer tunnel ≥60\""
-            },
-            {
-                "force_tunnel_for_long": False,
-                "long_threshold": 50,
-                "allow_tunnel_for_short": True,
-                "label": "Tunnel allowed all"
-            },
-        ]
-    else:
-        variant_settings = [
-            {"force_tunnel_for_long": True, "long_threshold": 50, "allow_tunnel_for_short": False, "label": None}
-        ]
-
-    best_result = {"success": False, "placements": [], "strategy": None, "fit_count": 0}
-
-    for name, bags in strategies.items():
-        for variant in variant_settings:
-            success, placements = greedy_3d_packing(
-                bags,
-                container_type,
-                interior,
-                force_tunnel_for_long=variant["force_tunnel_for_long"],
-                long_threshold=variant["long_threshold"],
-                allow_tunnel_for_short=variant["allow_tunnel_for_short"]
-            )
-            strategy_label = name
-            if container_type == "CJ" and variant["label"]:
-                strategy_label = f"{name} / {variant['label']}"
-            if success:
-                return {
-                    "success": True,
-                    "placements": placements,
-                    "strategy": strategy_label,
-                    "fit_count": len(placements)
-                }
-            if len(placements) > best_result["fit_count"]:
-                best_result = {
-                    "success": False,
-                    "placements": placements,
-                    "strategy": strategy_label,
-                    "fit_count": len(placements)
-                }
-
-    return best_result
-
 # ============================================================
 # Visualization
 # ============================================================
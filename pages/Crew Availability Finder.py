@@ -7,7 +7,7 @@ import pandas as pd
 import streamlit as st
 
 from Home import configure_page, password_gate, render_sidebar
-from crew_presence import crew_at_airport, results_to_rows
+from crew_presence import build_presence_index, crew_at_airport, results_to_rows
 from flight_leg_utils import FlightDataError, build_fl3xx_api_config
 from ops_snapshot import pull_ops_snapshot
 
@@ -71,6 +71,14 @@ if not roster_rows:
     st.info("No shared roster data in memory yet. Press **Pull / Refresh Shared Data**.")
     st.stop()
 
+# Index the shared roster once per pull so scrubbing the query time only runs
+# bisect/interval-tree lookups instead of rescanning every roster row.
+cached_index = st.session_state.get("crew_presence_index")
+if not isinstance(cached_index, tuple) or cached_index[0] != id(roster_rows):
+    cached_index = (id(roster_rows), build_presence_index(roster_rows))
+    st.session_state["crew_presence_index"] = cached_index
+presence_index = cached_index[1]
+
 st.subheader("Availability query")
 col1, col2, col3 = st.columns([1.2, 1, 1])
 
@@ -88,7 +96,7 @@ if not query_airport:
 
 fleet_filter = "" if query_fleet == "Any" else query_fleet
 results = crew_at_airport(
-    roster_rows,
+    presence_index,
     at_time=query_time if isinstance(query_time, datetime) else datetime.combine(query_time, datetime.min.time(), tzinfo=UTC),
     airport=query_airport,
     fleet=fleet_filter,
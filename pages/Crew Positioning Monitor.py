@@ -9,9 +9,9 @@ import streamlit as st
 
 from Home import configure_page, password_gate, render_sidebar
 from crew_positioning import build_positioning_statuses
-from fl3xx_api import fetch_staff_roster
+from fl3xx_api import iter_staff_roster
 from flight_leg_utils import FlightDataError, build_fl3xx_api_config
-from roster_pull import filter_active_roster_rows, parse_roster_payload
+from roster_pull import filter_active_roster_rows, parse_roster_payload, row_has_activity
 
 
 configure_page(page_title="Crew Positioning Monitor")
@@ -29,7 +29,8 @@ with st.sidebar:
     source = st.radio("Choose source", ["Live FL3XX API", "Repo file", "Upload .txt/.json", "Paste JSON"], index=0)
 
 raw_text = ""
-rows: list[dict[str, object]] = []
+row_count = 0
+active_rows: list[dict[str, object]] = []
 
 if source == "Live FL3XX API":
     default_start = datetime.now(UTC).date() - timedelta(days=3)
@@ -61,29 +62,40 @@ if source == "Live FL3XX API":
         st.stop()
 
     fetch_clicked = st.button("Fetch roster from FL3XX", type="primary")
-    cache_key = "crew_positioning_monitor_live_rows"
+    cache_key = "crew_positioning_monitor_live_active_rows"
 
     if fetch_clicked:
         with st.spinner("Fetching live roster from FL3XX..."):
             try:
-                rows = fetch_staff_roster(
+                row_count = 0
+                active_rows = []
+                progress = st.empty()
+                for row in iter_staff_roster(
                     config,
                     from_time=from_time,
                     to_time=to_time,
                     filter_value="STAFF",
                     include_flights=include_flights,
                     drop_empty_rows=False,
-                )
-                st.session_state[cache_key] = rows
-                st.success(f"Loaded {len(rows)} roster rows from FL3XX.")
+                ):
+                    # Inactive rows are only counted; holding them would keep
+                    # the whole pull in memory.
+                    row_count += 1
+                    if row_has_activity(row):
+                        active_rows.append(row)
+                    if row_count % 25 == 0:
+                        progress.caption(f"Received {row_count} roster rows so far...")
+                progress.empty()
+                st.session_state[cache_key] = (row_count, active_rows)
+                st.success(f"Loaded {row_count} roster rows from FL3XX.")
             except Exception as exc:  # noqa: BLE001
                 st.error(f"Failed to fetch roster from FL3XX: {exc}")
                 st.stop()
     else:
-        cached_rows = st.session_state.get(cache_key)
-        if isinstance(cached_rows, list):
-            rows = cached_rows
-            st.info(f"Using cached FL3XX pull with {len(rows)} rows. Click fetch to refresh.")
+        cached = st.session_state.get(cache_key)
+        if isinstance(cached, tuple):
+            row_count, active_rows = cached
+            st.info(f"Using cached FL3XX pull with {row_count} rows. Click fetch to refresh.")
         else:
             st.info("Set your window and click 'Fetch roster from FL3XX' to load live data.")
             st.stop()
@@ -111,8 +123,8 @@ if source != "Live FL3XX API":
     except ValueError as exc:
         st.error(str(exc))
         st.stop()
-
-active_rows = filter_active_roster_rows(rows)
+    row_count = len(rows)
+    active_rows = filter_active_roster_rows(rows)
 
 query_cols = st.columns([1, 1, 1])
 at_time = query_cols[0].datetime_input("Reference time (UTC)", value=datetime.now(UTC))
@@ -166,7 +178,7 @@ if status_filter:
     frame = frame[frame["status"].isin(status_filter)]
 
 metric_cols = st.columns(4)
-metric_cols[0].metric("Rows in pull", len(rows))
+metric_cols[0].metric("Rows in pull", row_count)
 metric_cols[1].metric("Rows after activity filter", len(active_rows))
 metric_cols[2].metric("Crew statuses", len(statuses))
 metric_cols[3].metric(
@@ -5,6 +5,7 @@ from __future__ import annotations
 import hashlib
 import json
 import math
+import time
 from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
@@ -13,13 +14,15 @@ from zoneinfo import ZoneInfo
 import pandas as pd
 import requests
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 
 from fl3xx_api import (
     MOUNTAIN_TIME_ZONE,
+    MissingQualificationAlert,
+    PreflightConflictAlert,
     extract_conflicts_from_preflight,
     extract_missing_qualifications_from_preflight,
     fetch_flights,
-    fetch_preflight,
 )
 from flight_leg_utils import (
     FlightDataError,
@@ -32,6 +35,7 @@ from flight_leg_utils import (
     load_airport_tz_lookup,
 )
 from Home import configure_page, password_gate, render_sidebar
+from preflight_scanner import PreflightDigestStore, PreflightScan, PreflightScanner
 
 
 configure_page(page_title="Crew Qualification Monitor")
@@ -231,111 +235,117 @@ def _select_primary_leg(legs: Sequence[Mapping[str, Any]]) -> Mapping[str, Any]:
     return min(legs, key=_sort_key)
 
 
-@st.cache_data(show_spinner=False, ttl=300, hash_funcs={dict: lambda _: "0"})
+def _parse_preflight(payload: Any) -> Tuple[List[MissingQualificationAlert], List[PreflightConflictAlert]]:
+    return extract_missing_qualifications_from_preflight(payload), extract_conflicts_from_preflight(payload)
+
+
+@st.cache_resource(show_spinner=False)
+def _preflight_scanner(settings_digest: str, base_url: str) -> PreflightScanner:
+    _ = settings_digest  # one scanner per credential set
+    return PreflightScanner(
+        _parse_preflight,
+        store=PreflightDigestStore.for_consumer("crew_qualification_monitor", base_url),
+    )
+
+
 def analyze_preflight_results(
-    analysis_digest: str,
-    settings: Dict[str, Any],
+    scan: PreflightScan,
     legs_by_flight_items: Sequence[Tuple[str, List[Dict[str, Any]]]],
-) -> Dict[str, List[Dict[str, Any]]]:
-    _ = analysis_digest
-
-    config = build_fl3xx_api_config(settings)
+) -> Dict[str, Any]:
     total_flights = len(legs_by_flight_items)
+    changed_flights = set(scan.changed)
 
     missing_rows: List[Dict[str, Any]] = []
     conflict_rows: List[Dict[str, Any]] = []
     errors: List[Dict[str, str]] = []
+    changed_alerts: List[str] = []
 
-    session: Optional[requests.Session] = None
-    try:
-        for flight_id, flight_legs in legs_by_flight_items:
-            if session is None:
-                session = requests.Session()
+    for flight_id, flight_legs in legs_by_flight_items:
+        if flight_id in scan.errors:
+            errors.append({"flight_id": flight_id, "error": str(scan.errors[flight_id])})
+            continue
 
-            try:
-                payload = fetch_preflight(config, flight_id, session=session)
-            except requests.HTTPError as exc:
-                errors.append({"flight_id": flight_id, "error": str(exc)})
-                continue
-            except Exception as exc:  # pragma: no cover - defensive path
-                errors.append({"flight_id": flight_id, "error": str(exc)})
-                continue
+        alerts, conflicts = scan.parsed.get(flight_id, ([], []))
+        if not alerts and not conflicts:
+            continue
 
-            alerts = extract_missing_qualifications_from_preflight(payload)
-            conflicts = extract_conflicts_from_preflight(payload)
-            if not alerts and not conflicts:
+        primary_leg = _select_primary_leg(flight_legs)
+        booking_identifier = _normalise_identifier(
+            primary_leg.get("bookingIdentifier") or primary_leg.get("booking_identifier")
+        )
+        dep_airport = _coerce_code(
+            primary_leg.get("departure_airport")
+            or primary_leg.get("departureAirport")
+            or primary_leg.get("airportFrom")
+        )
+        arr_airport = _coerce_code(
+            primary_leg.get("arrival_airport")
+            or primary_leg.get("arrivalAirport")
+            or primary_leg.get("airportTo")
+        )
+        dep_local = _parse_leg_time(primary_leg.get("dep_time"), dep_airport)
+        arr_local = _parse_leg_time(primary_leg.get("arrival_time"), arr_airport)
+        tail = str(primary_leg.get("tail") or "").strip()
+        leg_id = primary_leg.get("leg_id") or primary_leg.get("legId") or ""
+
+        display_identifier = booking_identifier or flight_id
+        rows_before = len(missing_rows) + len(conflict_rows)
+
+        for alert in alerts:
+            if not _should_include_missing_qualification(
+                alert.qualification_name,
+                departure_airport=dep_airport or "",
+                arrival_airport=arr_airport or "",
+            ):
                 continue
-
-            primary_leg = _select_primary_leg(flight_legs)
-            booking_identifier = _normalise_identifier(
-                primary_leg.get("bookingIdentifier") or primary_leg.get("booking_identifier")
+            missing_rows.append(
+                {
+                    "Booking Identifier": display_identifier,
+                    "Leg": leg_id,
+                    "Tail": tail or "—",
+                    "Route": f"{dep_airport or 'UNK'} → {arr_airport or 'UNK'}",
+                    "Departure": _format_local(dep_local),
+                    "Arrival": _format_local(arr_local),
+                    "Seat": alert.seat,
+                    "Crew member": alert.pilot_name or "Unknown",
+                    "Missing qualification": alert.qualification_name,
+                }
             )
-            dep_airport = _coerce_code(
-                primary_leg.get("departure_airport")
-                or primary_leg.get("departureAirport")
-                or primary_leg.get("airportFrom")
-            )
-            arr_airport = _coerce_code(
-                primary_leg.get("arrival_airport")
-                or primary_leg.get("arrivalAirport")
-                or primary_leg.get("airportTo")
+
+        for conflict in conflicts:
+            conflict_rows.append(
+                {
+                    "Booking Identifier": display_identifier,
+                    "Leg": leg_id,
+                    "Tail": tail or "—",
+                    "Route": f"{dep_airport or 'UNK'} → {arr_airport or 'UNK'}",
+                    "Departure": _format_local(dep_local),
+                    "Arrival": _format_local(arr_local),
+                    "Seat": conflict.seat or "—",
+                    "Type": conflict.category,
+                    "Status": conflict.status,
+                    "Conflict": conflict.description,
+                }
             )
-            dep_local = _parse_leg_time(primary_leg.get("dep_time"), dep_airport)
-            arr_local = _parse_leg_time(primary_leg.get("arrival_time"), arr_airport)
-            tail = str(primary_leg.get("tail") or "").strip()
-            leg_id = primary_leg.get("leg_id") or primary_leg.get("legId") or ""
-
-            display_identifier = booking_identifier or flight_id
-
-            for alert in alerts:
-                if not _should_include_missing_qualification(
-                    alert.qualification_name,
-                    departure_airport=dep_airport or "",
-                    arrival_airport=arr_airport or "",
-                ):
-                    continue
-                missing_rows.append(
-                    {
-                        "Booking Identifier": display_identifier,
-                        "Leg": leg_id,
-                        "Tail": tail or "—",
-                        "Route": f"{dep_airport or 'UNK'} → {arr_airport or 'UNK'}",
-                        "Departure": _format_local(dep_local),
-                        "Arrival": _format_local(arr_local),
-                        "Seat": alert.seat,
-                        "Crew member": alert.pilot_name or "Unknown",
-                        "Missing qualification": alert.qualification_name,
-                    }
-                )
-
-            for conflict in conflicts:
-                conflict_rows.append(
-                    {
-                        "Booking Identifier": display_identifier,
-                        "Leg": leg_id,
-                        "Tail": tail or "—",
-                        "Route": f"{dep_airport or 'UNK'} → {arr_airport or 'UNK'}",
-                        "Departure": _format_local(dep_local),
-                        "Arrival": _format_local(arr_local),
-                        "Seat": conflict.seat or "—",
-                        "Type": conflict.category,
-                        "Status": conflict.status,
-                        "Conflict": conflict.description,
-                    }
-                )
-    finally:
-        if session is not None:
-            session.close()
+
+        if flight_id in changed_flights and len(missing_rows) + len(conflict_rows) > rows_before:
+            changed_alerts.append(str(display_identifier))
 
     return {
         "missing_rows": missing_rows,
         "conflict_rows": conflict_rows,
         "errors": errors,
         "total_flights": total_flights,
+        "changed_alerts": changed_alerts,
     }
 
 
 _FETCH_RESULTS_KEY = "crew_qualification_fetch_results"
+_SCAN_RESULTS_KEY = "crew_qualification_scan_results"
+_SEEN_DIGESTS_KEY = "crew_qualification_seen_digests"
+# Ordinary reruns (widget changes) reuse the last scan for this long; only a
+# fetch or an auto-refresh tick re-checks sooner.
+_SCAN_REUSE_SECONDS = 300
 with st.sidebar:
     st.header("Flight selection")
     today_local = datetime.now(tz=MOUNTAIN_TIME_ZONE).date()
@@ -352,6 +362,15 @@ with st.sidebar:
     start_date, end_date = _normalise_date_range(date_selection, today_local, default_end)
     fetch_to_date = end_date + timedelta(days=1)
     show_metadata = st.checkbox("Show fetch details", value=False)
+    auto_refresh = st.checkbox(
+        "Auto-refresh preflight checks",
+        value=False,
+        help=(
+            "Re-check the fetched flights on a timer. Preflights are re-requested at most once a "
+            "minute and only flights whose preflight changed are re-parsed and re-alerted."
+        ),
+    )
+    refresh_minutes = st.selectbox("Refresh every (minutes)", (1, 2, 5, 10), index=2, disabled=not auto_refresh)
 
 
 fl3xx_settings_raw = st.secrets.get("fl3xx_api")  # type: ignore[attr-defined]
@@ -429,27 +448,57 @@ if total_flights == 0:
     st.info("No flights with valid identifiers were available for qualification checks.")
     st.stop()
 
-analysis_signature = {
-    "settings_digest": settings_digest,
-    "start_date": start_date.isoformat(),
-    "end_date": end_date.isoformat(),
-    "flight_ids": sorted(legs_by_flight.keys()),
-}
-analysis_digest = _settings_digest(analysis_signature)
+refresh_tick = (
+    st_autorefresh(interval=int(refresh_minutes) * 60 * 1000, key="crew_qualification_autorefresh")
+    if auto_refresh
+    else None
+)
+
 legs_by_flight_items = sorted((flight_id, flight_legs) for flight_id, flight_legs in legs_by_flight.items())
+analysis_digest = _settings_digest(
+    {
+        "settings_digest": settings_digest,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "flight_ids": [flight_id for flight_id, _ in legs_by_flight_items],
+    }
+)
 
-status_placeholder = st.empty()
-progress_bar = st.progress(0)
-status_placeholder.info(f"Fetching preflights for {total_flights} flight{'s' if total_flights != 1 else ''}…")
-progress_bar.progress(0.5)
-analysis_results = analyze_preflight_results(
-    analysis_digest,
-    fl3xx_settings,
-    legs_by_flight_items,
+cached_scan = st.session_state.get(_SCAN_RESULTS_KEY)
+rescan = (
+    submit_fetch
+    or not isinstance(cached_scan, dict)
+    or cached_scan["analysis_digest"] != analysis_digest
+    or (refresh_tick is not None and refresh_tick != cached_scan["refresh_tick"])
+    or time.monotonic() - cached_scan["scanned_at"] > _SCAN_REUSE_SECONDS
 )
-progress_bar.progress(1.0)
-status_placeholder.empty()
-progress_bar.empty()
+
+if rescan:
+    status_placeholder = st.empty()
+    progress_bar = st.progress(0)
+    status_placeholder.info(f"Fetching preflights for {total_flights} flight{'s' if total_flights != 1 else ''}…")
+    progress_bar.progress(0.5)
+    fl3xx_config = build_fl3xx_api_config(fl3xx_settings)
+    scanner = _preflight_scanner(settings_digest, fl3xx_config.base_url)
+    # The scanner is shared by every session; change detection runs against
+    # this session's own last-seen digests so each user gets their toasts.
+    seen_digests = st.session_state.setdefault(_SEEN_DIGESTS_KEY, {})
+    scan = scanner.scan(fl3xx_config, [flight_id for flight_id, _ in legs_by_flight_items], seen=seen_digests)
+    analysis_results = analyze_preflight_results(scan, legs_by_flight_items)
+    progress_bar.progress(1.0)
+    status_placeholder.empty()
+    progress_bar.empty()
+    cached_scan = {
+        "analysis_digest": analysis_digest,
+        "refresh_tick": refresh_tick,
+        "scanned_at": time.monotonic(),
+        "scan": scan,
+        "analysis_results": analysis_results,
+    }
+    st.session_state[_SCAN_RESULTS_KEY] = cached_scan
+else:
+    scan = cached_scan["scan"]
+    analysis_results = cached_scan["analysis_results"]
 
 missing_rows = list(analysis_results.get("missing_rows", []))
 conflict_rows = list(analysis_results.get("conflict_rows", []))
@@ -458,6 +507,15 @@ if errors:
     with st.expander("Preflight request errors", expanded=False):
         st.json(errors)
 
+if rescan:
+    for identifier in analysis_results.get("changed_alerts", []):
+        st.toast(f"Preflight changed for {identifier}; review its crew alerts.", icon="🔔")
+st.caption(
+    f"Checked {total_flights} preflight{'s' if total_flights != 1 else ''}: {scan.requests} requested from FL3XX, "
+    f"{scan.reused_payloads} reused from the last minute, {scan.reparsed} re-parsed, "
+    f"{len(scan.changed)} changed since the last check."
+)
+
 if not missing_rows:
     st.success("No missing crew qualifications detected for the selected flights.")
 else:
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Any, Dict, Mapping, Sequence
+from datetime import date, timedelta
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
 
 import pandas as pd
 import streamlit as st
 
-from delay_codes import collect_delay_code_records
+from delay_codes import DelayRecordStore, collect_delay_code_history, summarize_delay_reasons
 from flight_leg_utils import FlightDataError, build_fl3xx_api_config
 from Home import configure_page, get_secret, password_gate, render_sidebar
 
 
+MAX_RANGE_DAYS = 92
+
+
 def _default_target_date() -> date:
     return date.today()
 
 
+@st.cache_resource(show_spinner=False)
+def _delay_record_store(base_url: Optional[str]) -> DelayRecordStore:
+    """One store per FL3XX instance, shared by every session."""
+
+    return DelayRecordStore.for_instance(base_url)
+
+
+def _selected_range(value: Any) -> Tuple[date, date]:
+    if isinstance(value, (list, tuple)):
+        if not value:
+            today = _default_target_date()
+            return today, today
+        return value[0], value[-1]
+    return value, value
+
+
 def _row_background_color(record: Any, delay_threshold: int) -> str:
     delays_with_reasons = 0
     delay_columns = 0
@@ -59,6 +78,29 @@ def _build_row_styles(records: Sequence[Any], delay_threshold: int, columns: int
     return styles
 
 
+def _render_reason_analytics(records: Sequence[Any], delay_threshold: int) -> None:
+    summary = summarize_delay_reasons(records, delay_threshold)
+    if summary.empty:
+        return
+
+    st.subheader("Delay reasons")
+    totals = (
+        summary.groupby(["Reason", "Phase"])["Flights"].sum().unstack("Phase", fill_value=0)
+    )
+    totals["Total"] = totals.sum(axis=1)
+    totals = totals.sort_values("Total", ascending=False)
+    st.bar_chart(totals.drop(columns="Total"))
+    st.dataframe(totals, use_container_width=True)
+
+    if summary["Week"].nunique() > 1:
+        weekly = summary.pivot_table(
+            index="Reason", columns="Week", values="Flights", aggfunc="sum", fill_value=0
+        )
+        weekly = weekly.loc[totals.index]
+        st.caption("Delayed flights per reason, by week (weeks start Monday).")
+        st.dataframe(weekly, use_container_width=True)
+
+
 def _render_metadata(metadata: Dict[str, Any], diagnostics: Dict[str, Any]) -> None:
     with st.expander("Diagnostics", expanded=False):
         st.json({"fetch_metadata": metadata, "diagnostics": diagnostics})
@@ -80,7 +122,14 @@ else:
     fl3xx_settings = {}
 
 with st.form("delay_codes_form"):
-    target_date = st.date_input("Flight date", value=_default_target_date())
+    date_range = st.date_input(
+        "Flight dates",
+        value=(_default_target_date(), _default_target_date()),
+        help=(
+            "Pick one day or a range. Delay reasons of closed-out flights are kept locally, "
+            "so longer ranges only request postflights for flights that are still open."
+        ),
+    )
     delay_threshold = st.number_input(
         "Delay threshold (minutes)",
         min_value=1,
@@ -91,6 +140,7 @@ with st.form("delay_codes_form"):
     submitted = st.form_submit_button("Fetch Delay Codes")
 
 if submitted:
+    start_date, end_date = _selected_range(date_range)
     if not fl3xx_settings:
         st.error(
             "FL3XX API credentials are missing. Configure the `fl3xx_api` section in `.streamlit/secrets.toml`."
@@ -101,15 +151,20 @@ if submitted:
         except FlightDataError as exc:
             st.error(str(exc))
         else:
+            if end_date - start_date > timedelta(days=MAX_RANGE_DAYS - 1):
+                st.error(f"Select at most {MAX_RANGE_DAYS} days at a time.")
+                st.stop()
             with st.spinner("Fetching flights and postflight delay reasons…"):
-                records, metadata, diagnostics = collect_delay_code_records(
+                records, metadata, diagnostics = collect_delay_code_history(
                     config,
-                    target_date,
+                    start_date,
+                    end_date,
                     delay_threshold_min=int(delay_threshold),
+                    store=_delay_record_store(fl3xx_settings.get("base_url")),
                 )
 
             if not records:
-                st.warning("No flights met the delay threshold for the selected date.")
+                st.warning("No flights met the delay threshold for the selected dates.")
                 _render_metadata(metadata, diagnostics)
             else:
                 table = pd.DataFrame([record.as_dict() for record in records])
@@ -120,7 +175,12 @@ if submitted:
                 st.download_button(
                     "Download CSV",
                     data=table.to_csv(index=False),
-                    file_name=f"delay_codes_{target_date.isoformat()}.csv",
+                    file_name=(
+                        f"delay_codes_{start_date.isoformat()}.csv"
+                        if start_date == end_date
+                        else f"delay_codes_{start_date.isoformat()}_{end_date.isoformat()}.csv"
+                    ),
                     mime="text/csv",
                 )
+                _render_reason_analytics(records, int(delay_threshold))
                 _render_metadata(metadata, diagnostics)
@@ -1,47 +1,19 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import re
-from datetime import timedelta
+
+from ftl_analytics import (
+    FtlAnalysis,
+    analyze_ftl,
+    infer_policy_columns,
+    parse_duration_to_hours,
+    read_csv_bytes,
+    upload_digest,
+)
 
 st.set_page_config(page_title="FTL Audit: Duty, Rest & 7d/30d Policy", layout="wide")
 st.title("FTL Audit: Duty, Rest & 7d/30d Policy")
 
-REST_AFTER_ACT_PATTERNS = [
-    r"\bRest\s*After\s*(FDP|Duty)\b.*\(act\)",
-    r"\bRest\s*After\s*(FDP|Duty)\b.*\bact\b",
-    r"\b(Post|Following)\b.*(FDP|Duty).*\(act\)",
-    r"\b(Post|Following)\b.*(FDP|Duty).*\bact\b",
-    r"\bTurn\s*Time\s*After\b.*\(act\)",
-    r"\bTurn\s*Time\s*After\b.*\bact\b",
-]
-REST_AFTER_MIN_PATTERNS = [
-    r"\bRest\s*After\s*(FDP|Duty)\b.*\(min\)",
-    r"\bRest\s*After\s*(FDP|Duty)\b.*\bmin\b",
-    r"\b(Post|Following)\b.*(FDP|Duty).*\(min\)",
-    r"\b(Post|Following)\b.*(FDP|Duty).*\bmin\b",
-    r"\bTurn\s*Time\s*After\b.*\(min\)",
-    r"\bTurn\s*Time\s*After\b.*\bmin\b",
-]
-REST_BEFORE_ACT_PATTERNS = [
-    r"\bRest\s*Before\s*(FDP|Duty)\b.*\(act\)",
-    r"\bRest\s*Before\s*(FDP|Duty)\b.*\bact\b",
-    r"\b(Pre|Prior)\b.*(FDP|Duty).*\(act\)",
-    r"\b(Pre|Prior)\b.*(FDP|Duty).*\bact\b",
-    r"\bTurn\s*Time\s*Before\b.*\(act\)",
-    r"\bTurn\s*Time\s*Before\b.*\bact\b",
-]
-REST_BEFORE_MIN_PATTERNS = [
-    r"\bRest\s*Before\s*(FDP|Duty)\b.*\(min\)",
-    r"\bRest\s*Before\s*(FDP|Duty)\b.*\bmin\b",
-    r"\b(Pre|Prior)\b.*(FDP|Duty).*\(min\)",
-    r"\b(Pre|Prior)\b.*(FDP|Duty).*\bmin\b",
-    r"\bTurn\s*Time\s*Before\b.*\(min\)",
-    r"\bTurn\s*Time\s*Before\b.*\bmin\b",
-]
-
-
 st.markdown(
     "Upload the relevant CSV exports and the app will run three checks:"
     "\n\n1) **Duty Streaks**: ≥2 and ≥3 consecutive **12+ hr duty** days _(FTL CSV)_"
@@ -52,541 +24,36 @@ st.markdown(
 # -----------------------------
 # Helpers
 # -----------------------------
-def parse_duration_to_hours(val):
-    if pd.isna(val):
-        return np.nan
-
-    # ---------------------------------------------------------
-    # Excel datetime duration fix
-    # FL3XX sometimes encodes durations (e.g. "30:02") as a
-    # timestamp (e.g. 1900-01-02 06:02:00).
-    # This block extracts the *duration* from that timestamp.
-    # ---------------------------------------------------------
-    try:
-        # Detect raw datetime-like objects (numpy, pandas, python)
-        if isinstance(val, (pd.Timestamp, datetime)) or \
-           ("datetime" in str(type(val)).lower()):
-            dt = pd.to_datetime(val, errors="coerce")
-            if pd.notna(dt):
-                # Excel stores durations as "time of day" plus day rollover
-                hours = dt.hour + dt.minute / 60 + dt.second / 3600
-
-                # If day > 1, Excel has rolled over past midnight
-                # so each additional day = +24 hours
-                if dt.day > 1:
-                    hours += (dt.day - 1) * 24
-
-                return hours
-    except Exception:
-        pass
-
-    # ---------------------------------------------------------
-    # Normal string-based duration parsing
-    # ---------------------------------------------------------
-    s = str(val).strip()
-    if s == "":
-        return np.nan
-
-    # Remove annotations like "(split duty)"
-    s = re.sub(r"\([^)]*\)", "", s)
-
-    # Normalize common formats
-    s = s.replace("hours", ":").replace("hour", ":").replace("H", ":").replace("h", ":")
-    s = s.replace(" ", "").replace("::", ":").replace(".", ":")
-
-    # Match HH:MM or HHH:MM:SS
-    m = re.match(r"^(\d{1,3}):(\d{1,2})(?::(\d{1,2}))?$", s)
-    if m:
-        h = int(m.group(1))
-        mi = int(m.group(2))
-        se = int(m.group(3)) if m.group(3) else 0
-        return h + mi/60 + se/3600
-
-    # Match "45m" or "45 min"
-    m2 = re.match(r"^(\d+)\s*(m|min)$", s, flags=re.I)
-    if m2:
-        return int(m2.group(1)) / 60.0
-
-    # Pure number like "12.5"
-    if re.match(r"^\d+(\.\d+)?$", s):
-        return float(s)
-
-    # Match formats like "12h 30m"
-    h = re.search(r"(\d+)\s*h", s, flags=re.I)
-    mi = re.search(r"(\d+)\s*m", s, flags=re.I)
-    if h or mi:
-        hours = int(h.group(1)) if h else 0
-        minutes = int(mi.group(1)) if mi else 0
-        return hours + minutes / 60
-
-    # Last-resort timedelta parser
-    try:
-        td = pd.to_timedelta(s)
-        return td.total_seconds() / 3600.0
-    except Exception:
-        return np.nan
-
-
-def try_read_csv(uploaded_file):
-    try:
-        return pd.read_csv(uploaded_file, sep=None, engine="python", encoding="utf-8")
-    except Exception:
-        uploaded_file.seek(0)
-        return pd.read_csv(uploaded_file, sep=";", engine="python", encoding="utf-8", on_bad_lines="skip")
-
-
-def pick_column(columns, keywords=None, letter_fallback=None):
-    keywords = keywords or []
-    for col in columns:
-        lower = col.lower()
-        if any(key in lower for key in keywords):
-            return col
-
-    if letter_fallback:
-        idx = ord(letter_fallback.upper()) - ord("A")
-        if 0 <= idx < len(columns):
-            return columns[idx]
-
-    return None
-
-# ---------- Column inference (FTL CSV) ----------
-def infer_common_columns(df):
-    cols = [c.strip() for c in df.columns]
-    df.columns = cols
-    pilot_candidates = [c for c in cols if re.search(r"(pilot|crew|user|employee|person|name)", c, re.I)]
-    pilot_col = pilot_candidates[0] if pilot_candidates else None
-
-    parsed_cache = {}
-
-    def parsed_series(col):
-        if col is None or col not in df.columns:
-            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
-        if col not in parsed_cache:
-            parsed_cache[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-        return parsed_cache[col]
-
-    date_candidates = [c for c in cols if re.search(r"(date|day)", c, re.I)]
-    # Also consider columns that explicitly mention begin/start even if they lack "date"/"day"
-    date_candidates += [c for c in cols if re.search(r"(begin|start|report)", c, re.I)]
-    # Preserve first occurrence order while removing duplicates
-    seen = set()
-    date_candidates = [c for c in date_candidates if not (c in seen or seen.add(c))]
-
-    def date_score(name):
-        lname = name.lower()
-        score = 2
-        if re.search(r"(begin|start|report)", lname):
-            score = 0
-        elif re.search(r"(off|out|dep)", lname):
-            score = 1
-        if re.search(r"(end|arriv|finish|complete|in|release)", lname):
-            score += 3
-        return score, cols.index(name)
-
-    date_candidates = sorted(date_candidates, key=date_score)
-
-    date_col = None
-    for c in date_candidates:
-        parsed = parsed_series(c)
-        if parsed.notna().mean() > 0.5:
-            date_col = c
-            break
-
-    return pilot_col, date_col
-
-
-def infer_begin_end_columns(df, date_col=None):
-    cols = [c.strip() for c in df.columns]
-    df.columns = cols
-
-    parsed_cache = {}
-
-    def parsed_series(col):
-        if col is None or col not in df.columns:
-            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
-        if col not in parsed_cache:
-            parsed_cache[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-        return parsed_cache[col]
-
-    begin_cols = []
-    end_cols = []
-    for c in cols:
-        lname = c.lower()
-        parsed = parsed_series(c)
-        if parsed.notna().mean() <= 0.2:
-            continue
-        if re.search(r"(begin|start|report|sign\s*in|show)", lname):
-            begin_cols.append(c)
-        elif re.search(r"(end|finish|release|off|arriv|complete)", lname):
-            end_cols.append(c)
-
-    if date_col:
-        begin_cols = [c for c in begin_cols if c != date_col]
-        end_cols = [c for c in end_cols if c != date_col]
-
-    return begin_cols, end_cols
-
-def infer_duty_column(df):
-    cols = list(df.columns)
-    duty_candidates = [c for c in cols if re.search(r"(duty).*?(time|duration|hrs|hours)?", c, re.I)]
-    duty_candidates += [c for c in cols if re.search(r"(total).*duty", c, re.I)]
-    seen = set(); duty_candidates = [x for x in duty_candidates if not (x in seen or seen.add(x))]
-    duty_col = None; best_rate = -1.0
-    for c in duty_candidates:
-        sample = df[c].astype(str).head(300).tolist()
-        parsed = [parse_duration_to_hours(x) for x in sample]
-        rate = np.mean([not pd.isna(x) for x in parsed])
-        if rate > best_rate and rate > 0.3:
-            best_rate = rate; duty_col = c
-    if duty_col is None:
-        for c in cols:
-            sample = df[c].astype(str).head(600).tolist()
-            parsed = [parse_duration_to_hours(x) for x in sample]
-            rate = np.mean([not pd.isna(x) for x in parsed])
-            plausible = [x for x in parsed if not pd.isna(x) and 1.0 <= x <= 18.0]
-            if rate > 0.4 and len(plausible) >= 10:
-                duty_col = c; break
-    return duty_col
-
-def infer_duty_day_boundary_column(df):
-    cols = list(df.columns)
-    boundary_candidates = []
-    for c in cols:
-        series = df[c]
-        if series.dtype.kind not in ("O", "U", "S") and not pd.api.types.is_string_dtype(series):
-            continue
-        values = series.astype(str).str.strip()
-        mask = values.str.contains(r"\brest\b", case=False, na=False)
-        if mask.sum() == 0:
-            continue
-        # We prefer columns that predominantly contain textual markers ("Rest")
-        if (mask.sum() >= 3) or (mask.mean() >= 0.01):
-            boundary_candidates.append((c, mask.sum()))
-    if not boundary_candidates:
-        return None
-    boundary_candidates.sort(key=lambda x: (-x[1], cols.index(x[0])))
-    return boundary_candidates[0][0]
-
-
-# ---------- Column inference (Duty Violation CSV) with robust Before/After ----------
-def infer_policy_columns(dv_df):
-    cols = [c.strip() for c in dv_df.columns]
-    dv_df.columns = cols
-    # Pilot
-    pilot_candidates = [c for c in cols if re.search(r"(pilot|crew|user|employee|person|name)", c, re.I)]
-    pilot_col = pilot_candidates[0] if pilot_candidates else None
-    # 7d/30d
-    c7_candidates = [c for c in cols if re.search(r"\b7\s*d(ay|ays)?\b|\b7d\b|past\s*7", c, re.I)]
-    c30_candidates = [c for c in cols if re.search(r"\b30\s*d(ay|ays)?\b|\b30d\b|past\s*30", c, re.I)]
-    if not c7_candidates:
-        c7_candidates = [c for c in cols if re.search(r"(7d|past.?7).*(flight|block|time)", c, re.I)]
-    if not c30_candidates:
-        c30_candidates = [c for c in cols if re.search(r"(30d|past.?30).*(flight|block|time)", c, re.I)]
-    c7 = c7_candidates[0] if c7_candidates else None
-    c30 = c30_candidates[0] if c30_candidates else None
-
-    def find_col(patterns, exclude=None):
-        for pat in patterns:
-            for c in cols:
-                if exclude and c == exclude:
-                    continue
-                if re.search(pat, c, re.I):
-                    return c
-        return None
-
-    rest_after_act = find_col(REST_AFTER_ACT_PATTERNS)
-    rest_after_min = find_col(REST_AFTER_MIN_PATTERNS)
-    rest_before_act = find_col(REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
-    rest_before_min = find_col(REST_BEFORE_MIN_PATTERNS, exclude=rest_after_min)
-
-    # Guard: ensure distinct matches
-    if rest_before_act == rest_after_act:
-        rest_before_act = find_col(REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
-    if rest_before_min == rest_after_min:
-        rest_before_min = find_col(REST_BEFORE_MIN_PATTERNS, exclude=rest_after_min)
-
-    # FDP act/max
-    fdp_act = next((c for c in cols if re.search(r"(Flight\s*)?Duty\s*Period.*\(act\)|\bFDP\b.*\(act\)", c, re.I)), None)
-    fdp_max = next((c for c in cols if re.search(r"(Flight\s*)?Duty\s*Period.*\(max\)|\bFDP\b.*\(max\)", c, re.I)), None)
-
-    # Date (optional)
-    date_candidates = [c for c in cols if re.search(r"(date|day)", c, re.I)]
-    date_col = None
-    for c in date_candidates:
-        parsed = pd.to_datetime(dv_df[c], errors="coerce", dayfirst=True)
-        if parsed.notna().mean() > 0.5:
-            date_col = c
-            break
-
-    return {
-        "pilot_col": pilot_col, "c7": c7, "c30": c30,
-        "rest_after_act": rest_after_act, "rest_after_min": rest_after_min,
-        "rest_before_act": rest_before_act, "rest_before_min": rest_before_min,
-        "fdp_act": fdp_act, "fdp_max": fdp_max, "date_col": date_col,
-        "all_cols": cols,
-    }
-
-# ---------- Generic utils ----------
 def to_csv_download(df, filename, key=None):
     csv_bytes = df.to_csv(index=False).encode("utf-8")
     st.download_button("Download " + filename, data=csv_bytes, file_name=filename, mime="text/csv", key=key)
 
-def streaks(df, flag_col, min_consecutive=3):
-    sequences = []
-    for pilot, sub in df.groupby("Pilot"):
-        sub = sub.sort_values("Date").reset_index(drop=True)
-        count = 0; start_date = None; last_date = None
-        for _, r in sub.iterrows():
-            if r[flag_col]:
-                if last_date is not None and r["Date"] == last_date + timedelta(days=1):
-                    count += 1
-                else:
-                    count = 1; start_date = r["Date"]
-                last_date = r["Date"]
-            else:
-                if count >= min_consecutive and start_date is not None:
-                    sequences.append({"Pilot": pilot, "StartDate": start_date.date().isoformat(),
-                                      "EndDate": last_date.date().isoformat(), "ConsecutiveDays": count})
-                count = 0; start_date = None; last_date = None
-        if count >= min_consecutive and start_date is not None:
-            sequences.append({"Pilot": pilot, "StartDate": start_date.date().isoformat(),
-                              "EndDate": last_date.date().isoformat(), "ConsecutiveDays": count})
-    return pd.DataFrame(sequences).sort_values(["Pilot", "StartDate"]) if sequences else pd.DataFrame(
-        columns=["Pilot", "StartDate", "EndDate", "ConsecutiveDays"]
-    )
-
-def _coalesce_datetime_columns(df, primary_col, fallback_cols):
-    parsed_cache = {}
-
-    def parsed(col):
-        if col is None or col not in df.columns:
-            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
-        if col not in parsed_cache:
-            parsed_cache[col] = pd.to_datetime(df[col], errors="coerce", dayfirst=True)
-        return parsed_cache[col]
-
-    series = parsed(primary_col)
-    if fallback_cols:
-        # Prefer the primary column values and only fall back when they're missing.
-        # Previously we let the fallback columns override the detected "Date"
-        # column which caused multi-leg duties (with different report times)
-        # to be split across multiple days even when the CSV already provided a
-        # single date value for the duty.  By combining the fallback values into
-        # the primary series instead of the other way around we preserve the
-        # duty-day date and only use begin/report timestamps when the primary
-        # column is blank.
-        for col in fallback_cols:
-            series = series.combine_first(parsed(col))
-    return series
-
-
-def _normalize_dates(series):
-    if series.empty:
-        return series
-    dtype = series.dtype
-    if hasattr(dtype, "tz") and dtype.tz is not None:
-        try:
-            series = series.dt.tz_convert(None)
-        except TypeError:
-            series = series.dt.tz_localize(None)
-    return series.dt.floor("D")
-
-
-def build_duty_table(df, pilot_col, date_col, duty_col, min_hours=12.0, begin_cols=None, end_marker_col=None):
-    df = df.copy()
-    df[pilot_col] = df[pilot_col].ffill()
-    df["__row_order"] = np.arange(len(df))
-
-    begin_cols = begin_cols or []
-    date_series = _coalesce_datetime_columns(df, date_col, begin_cols)
-    begin_series = None
-    if begin_cols:
-        primary_begin = begin_cols[0]
-        fallback_begin = begin_cols[1:]
-        begin_series = _coalesce_datetime_columns(df, primary_begin, fallback_begin)
-
-    df["__date"] = date_series
-    df["__normalized_date"] = _normalize_dates(df["__date"])
-    if begin_series is not None:
-        begin_series = _normalize_dates(begin_series)
-        # Prefer the duty start/report date when available so that duties that
-        # cross midnight remain associated with the calendar day on which they
-        # began instead of appearing as duplicate long-duty days on the
-        # following date.
-        df["__normalized_date"] = begin_series.combine_first(df["__normalized_date"])
-
-    df["__duty_hours"] = df[duty_col].map(parse_duration_to_hours)
-
-    use_marker = end_marker_col and end_marker_col in df.columns
-    if use_marker:
-        marker_series = df[end_marker_col].astype(str).str.strip()
-        df["__duty_boundary"] = marker_series.str.contains(r"\brest\b", case=False, na=False)
-
-    if use_marker:
-        records = []
-        for pilot, sub in df.groupby(pilot_col):
-            sub = sub.sort_values(["__normalized_date", "__row_order"])
-            current_start = None
-            collected_hours = []
-            for _, row in sub.iterrows():
-                duty_date = row["__normalized_date"]
-                if pd.isna(duty_date):
-                    continue
-                if current_start is None:
-                    current_start = duty_date
-                if not pd.isna(row["__duty_hours"]):
-                    collected_hours.append(row["__duty_hours"])
-                if row.get("__duty_boundary", False):
-                    if collected_hours:
-                        total_hours = max(collected_hours)
-                    else:
-                        total_hours = row["__duty_hours"]
-                    if not pd.isna(total_hours) and current_start is not None:
-                        records.append({"Pilot": pilot, "Date": current_start, "DutyHours": float(total_hours)})
-                    current_start = None
-                    collected_hours = []
-            if current_start is not None and collected_hours:
-                total_hours = max(collected_hours)
-                if not pd.isna(total_hours):
-                    records.append({"Pilot": pilot, "Date": current_start, "DutyHours": float(total_hours)})
-        work = pd.DataFrame(records, columns=["Pilot", "Date", "DutyHours"])
-        if work.empty:
-            use_marker = False
-    if not use_marker:
-        work = pd.DataFrame({
-            "Pilot": df[pilot_col],
-            "Date": df["__normalized_date"],
-            "DutyHours": df["__duty_hours"],
-        })
-    work = work.dropna(subset=["Pilot", "Date", "DutyHours"])
-    if not work.empty:
-        work["Date"] = _normalize_dates(pd.to_datetime(work["Date"], errors="coerce"))
-        work = work.sort_values(["Pilot", "Date"]).groupby(["Pilot", "Date"], as_index=False)["DutyHours"].max()
-    else:
-        work = pd.DataFrame(columns=["Pilot", "Date", "DutyHours"])
-    work["LongDuty"] = work["DutyHours"] >= float(min_hours)
-    return work
-
-
-def infer_rest_pair_columns_ftl(df):
-    cols = [c.strip() for c in df.columns]
-    df.columns = cols
-
-    def find_col(patterns, exclude=None):
-        for pat in patterns:
-            for c in cols:
-                if exclude and c == exclude:
-                    continue
-                if re.search(pat, c, re.I):
-                    return c
-        return None
-
-    rest_before_act = find_col(REST_BEFORE_ACT_PATTERNS)
-    rest_after_act = find_col(REST_AFTER_ACT_PATTERNS)
-
-    if rest_before_act == rest_after_act:
-        rest_before_act = find_col(REST_BEFORE_ACT_PATTERNS, exclude=rest_after_act)
-    if rest_after_act == rest_before_act:
-        rest_after_act = find_col(REST_AFTER_ACT_PATTERNS, exclude=rest_before_act)
-
-    return rest_before_act, rest_after_act
-
-
-def build_consecutive_short_rest_rows(df, pilot_col, date_col, rest_before_col, rest_after_col, short_thresh=11.0):
-    work = df[[pilot_col, date_col, rest_before_col, rest_after_col]].copy()
-    work.columns = ["Pilot", "DateRaw", "RestBeforeRaw", "RestAfterRaw"]
-    work["Pilot"] = work["Pilot"].ffill()
-
-    if date_col:
-        work["DutyDate"] = pd.to_datetime(work["DateRaw"], errors="coerce", dayfirst=True)
-    else:
-        work["DutyDate"] = pd.NaT
-
-    p = parse_duration_to_hours
-    work["RestBeforeHours"] = work["RestBeforeRaw"].map(p)
-    work["RestAfterHours"] = work["RestAfterRaw"].map(p)
-    work = work.dropna(subset=["Pilot", "RestBeforeHours", "RestAfterHours"])
-
-    if date_col:
-        work = work.dropna(subset=["DutyDate"])
-
-    if not work.empty:
-        group_keys = ["Pilot"] + (["DutyDate"] if date_col else [])
-        aggdict = {"RestBeforeHours": "min", "RestAfterHours": "max"}
-        grouped = work.groupby(group_keys, as_index=False).agg(aggdict)
-    else:
-        grouped = work
-
-    grouped["BothShort"] = (grouped["RestBeforeHours"] < float(short_thresh)) & (
-        grouped["RestAfterHours"] < float(short_thresh)
-    )
-
-    flagged = grouped[grouped["BothShort"]].copy()
-    if date_col and "DutyDate" in flagged.columns:
-        flagged["DutyDate"] = flagged["DutyDate"].dt.date
-
-    flagged = flagged.drop(columns=["BothShort"], errors="ignore")
-    flagged = flagged.rename(columns={
-        "RestBeforeHours": "RestBefore_act (hrs)",
-        "RestAfterHours": "RestAfter_act (hrs)",
-    })
-    for col in ["RestBefore_act (hrs)", "RestAfter_act (hrs)"]:
-        if col in flagged.columns:
-            flagged[col] = flagged[col].round(2)
-    return flagged.sort_values(["Pilot"] + (["DutyDate"] if "DutyDate" in flagged.columns else []))
-
-
-def summarize_min_rest_days(df, pilot_col, date_col, rest_prior_col, short_thresh=11.0, lower_bound=10.0):
-    work = df[[pilot_col, rest_prior_col]].copy()
-    work.columns = ["Pilot", "RestPriorRaw"]
-    work["Pilot"] = work["Pilot"].ffill()
 
-    work["RestPriorHours"] = work["RestPriorRaw"].map(parse_duration_to_hours)
+@st.cache_data(show_spinner=False, max_entries=4)
+def _parse_upload(digest: str, _data: bytes) -> pd.DataFrame:
+    """Parse each distinct upload once; every call gets its own copy of the frame."""
 
-    if date_col:
-        work["DutyDate"] = _normalize_dates(pd.to_datetime(df[date_col], errors="coerce", dayfirst=True))
-    else:
-        work["DutyDate"] = pd.NaT
-
-    min_rest_lower = float(lower_bound)
-    min_rest_upper = float(short_thresh)
+    return read_csv_bytes(_data)
 
-    flagged = work[
-        work["RestPriorHours"].between(min_rest_lower, min_rest_upper, inclusive="left")
-    ].dropna(subset=["Pilot", "RestPriorHours"])
 
-    summary = pd.DataFrame(columns=["Pilot", "DaysWithMinRest"])
-    detail = pd.DataFrame(columns=["Pilot", "DutyDate", "RestPriorHours"])
+def _load_csv_upload(data: bytes) -> pd.DataFrame:
+    return _parse_upload(upload_digest(data), data)
 
-    if flagged.empty:
-        return summary, detail
 
-    if date_col:
-        flagged = flagged.dropna(subset=["DutyDate"])
-        if flagged.empty:
-            return summary, detail
-
-        detail = flagged.groupby(["Pilot", "DutyDate"], as_index=False)["RestPriorHours"].min()
-        summary = detail.groupby("Pilot", as_index=False).agg(DaysWithMinRest=("DutyDate", "nunique"))
-    else:
-        summary = flagged.groupby("Pilot", as_index=False).agg(DaysWithMinRest=("RestPriorHours", "count"))
-        detail = flagged.groupby("Pilot", as_index=False).agg(RestPriorHours=("RestPriorHours", "min"))
+def _load_ftl_upload(data: bytes) -> FtlAnalysis:
+    """Return this session's analysis of an FTL export, built once per upload.
 
-    if "RestPriorHours" in detail.columns:
-        detail["RestPriorHours"] = detail["RestPriorHours"].round(2)
+    The analysis memoises per-column tables as the user changes selections, so
+    it is kept in session state rather than shared between sessions.
+    """
 
-    return summary, detail
+    digest = upload_digest(data)
+    cached = st.session_state.get("ftl_upload_analysis")
+    if cached is None or cached[0] != digest:
+        cached = (digest, analyze_ftl(_parse_upload(digest, data)))
+        st.session_state["ftl_upload_analysis"] = cached
+    return cached[1]
 
-def coverage_table(df, flag_col_name):
-    cov = df.groupby("Pilot").agg(
-        FirstDate=("Date", "min"),
-        LastDate=("Date", "max"),
-        DaysCount=("Date", "nunique"),
-        FlaggedDays=(flag_col_name, "sum")
-    ).reset_index().sort_values("Pilot")
-    cov["FirstDate"] = cov["FirstDate"].dt.date
-    cov["LastDate"] = cov["LastDate"].dt.date
-    return cov
 
 # -----------------------------
 # Uploaders
@@ -595,8 +62,9 @@ st.sidebar.header("Uploads")
 ftl_file = st.sidebar.file_uploader("FTL CSV (for Duty & Short Rest checks)", type=["csv"], key="ftl_csv")
 dv_file = st.sidebar.file_uploader("Duty Violation CSV (for 7d/30d Policy + detailed checks)", type=["csv"], key="dv_csv")
 
-ftl_df = try_read_csv(ftl_file) if ftl_file else None
-dv_df = try_read_csv(dv_file) if dv_file else None
+ftl_analysis = _load_ftl_upload(ftl_file.getvalue()) if ftl_file else None
+ftl_df = ftl_analysis.frame if ftl_analysis is not None else None
+dv_df = _load_csv_upload(dv_file.getvalue()) if dv_file else None
 
 # Store uploaded dataframes so all tabs (including Debug) can access them
 if ftl_df is not None:
@@ -624,31 +92,20 @@ with tab_results:
         st.info("Upload the **FTL CSV** in the sidebar to run Duty Streaks and Short Rest checks.")
     else:
         df = ftl_df
-        pilot_col, date_col = infer_common_columns(df.copy())
-        begin_cols, _ = infer_begin_end_columns(df.copy(), date_col=date_col)
+        columns = ftl_analysis.columns
+        pilot_col, date_col = columns.pilot, columns.date
 
         if not pilot_col or not date_col:
             st.error("Could not confidently identify common columns (Pilot, Date) in the FTL CSV.")
             st.write("Columns:", list(df.columns)[:60])
         else:
-            duty_col = infer_duty_column(df.copy())
-            duty_boundary_col = infer_duty_day_boundary_column(df.copy())
+            duty_col = columns.duty
             if not duty_col:
                 st.error("Could not identify Duty columns in the FTL CSV.")
             else:
-                duty_work = None
-                if duty_col:
-                    duty_work = build_duty_table(
-                        df.copy(),
-                        pilot_col,
-                        date_col,
-                        duty_col,
-                        min_hours=12.0,
-                        begin_cols=begin_cols,
-                        end_marker_col=duty_boundary_col,
-                    )
-                    seq2_duty = streaks(duty_work, "LongDuty", min_consecutive=2)
-                    seq3_duty = streaks(duty_work, "LongDuty", min_consecutive=3)
+                duty_work = ftl_analysis.duty_days
+                seq2_duty = ftl_analysis.streaks(2)
+                seq3_duty = ftl_analysis.streaks(3)
                 st.subheader("Duty Streaks (12+ hr days)")
                 if duty_work is not None and not seq3_duty.empty:
                     pilots = sorted(seq3_duty["Pilot"].unique().tolist())
@@ -666,17 +123,8 @@ with tab_results:
                     if duty_work is not None:
                         to_csv_download(seq2_duty, "FTL_2x12hr_Consecutive_Duty_Summary.csv", key="dl_duty2")
 
-                rest_pairs = pd.DataFrame()
-                rest_before_col, rest_after_col = infer_rest_pair_columns_ftl(df.copy())
-                if rest_before_col and rest_after_col and date_col:
-                    rest_pairs = build_consecutive_short_rest_rows(
-                        df.copy(),
-                        pilot_col,
-                        date_col,
-                        rest_before_col,
-                        rest_after_col,
-                        short_thresh=11.0,
-                    )
+                rest_pairs = ftl_analysis.rest_pairs
+                rest_before_col, rest_after_col = columns.rest_before, columns.rest_after
 
                 st.markdown("**Consecutive minimum rest (< 11 h) periods**")
                 if rest_before_col and rest_after_col:
@@ -701,18 +149,12 @@ with tab_rest_duty:
         st.info("Upload the **FTL CSV** in the sidebar to calculate minimum rest days.")
     else:
         df = ftl_df
-        pilot_col, date_col = infer_common_columns(df.copy())
-        rest_before_col, _ = infer_rest_pair_columns_ftl(df.copy())
+        pilot_col, date_col = ftl_analysis.columns.pilot, ftl_analysis.columns.date
 
         st.markdown("**Rest prior column**")
         rest_options = list(df.columns)
-        default_index = 0
-        if rest_before_col in rest_options:
-            default_index = rest_options.index(rest_before_col)
-        else:
-            rest_like = [i for i, name in enumerate(rest_options) if re.search(r"rest", str(name), re.I)]
-            if rest_like:
-                default_index = rest_like[0]
+        default_rest_col = ftl_analysis.default_rest_prior_column()
+        default_index = rest_options.index(default_rest_col) if default_rest_col in rest_options else 0
 
         rest_column = st.selectbox(
             "Select the column that contains rest prior values",
@@ -726,9 +168,7 @@ with tab_rest_duty:
         elif rest_column is None:
             st.error("No columns available to evaluate rest prior values.")
         else:
-            summary, detail = summarize_min_rest_days(
-                df.copy(), pilot_col, date_col, rest_column, short_thresh=11.0, lower_bound=10.0
-            )
+            summary, detail = ftl_analysis.min_rest_days(rest_column)
 
             st.subheader("Days with minimum rest (10.0–10.99 h) by pilot")
             if summary.empty:
@@ -952,15 +392,15 @@ with tab_min_rest:
     if ftl_df is None:
         st.info("Upload the FTL CSV to compute 12+ hr duty days.")
     else:
-        df = ftl_df.copy()
+        df = ftl_df
 
         # --------------------------------------
-        # Auto-detect columns
+        # Auto-detected columns
         # --------------------------------------
-        pilot_col, date_col = infer_common_columns(df.copy())
-        duty_col = infer_duty_column(df.copy())
-        rest_marker_col = infer_duty_day_boundary_column(df.copy())
-        begin_cols, _ = infer_begin_end_columns(df.copy(), date_col=date_col)
+        columns = ftl_analysis.columns
+        pilot_col, date_col = columns.pilot, columns.date
+        duty_col = columns.duty
+        rest_marker_col = columns.duty_boundary
 
         st.subheader("Column Mapping")
         c1, c2, c3, c4 = st.columns(4)
@@ -990,103 +430,13 @@ with tab_min_rest:
                 index=list(df.columns).index(rest_marker_col) if rest_marker_col in df.columns else 0
             )
 
-        # --------------------------------------
-        # Parse values
-        # --------------------------------------
-        work = df.copy()
-        work[pilot_col] = work[pilot_col].ffill()
-
-        # Duty hours
-        work["DutyHours"] = work[duty_col].map(parse_duration_to_hours)
+        long_duty = ftl_analysis.long_duty_days(pilot_col, date_col, duty_col, rest_marker_col)
 
-        # Build a date series combining the date column + begin/report times
-        date_series = _coalesce_datetime_columns(work, date_col, begin_cols)
-        date_series = _normalize_dates(date_series)
-        work["DutyDate"] = date_series
-
-        # Boundary detection
-        work["BoundaryRest"] = work[rest_marker_col].astype(str).str.contains("rest", case=False, na=False)
-
-        # Row ordering for grouping
-        work["__row_order"] = np.arange(len(work))
-
-        # --------------------------------------
-        # Reconstruct duty days using the rest boundary
-        # --------------------------------------
-        records = []
-        for pilot, sub in work.groupby(pilot_col):
-            sub = sub.sort_values(["DutyDate", "__row_order"])
-
-            current_date = None
-            collected_hours = []
-
-            for _, row in sub.iterrows():
-                ddate = row["DutyDate"]
-                if pd.isna(ddate):
-                    continue
-
-                if current_date is None:
-                    current_date = ddate
-
-                if not pd.isna(row["DutyHours"]):
-                    collected_hours.append(row["DutyHours"])
-
-                # When boundary line hits → close out duty day
-                if row["BoundaryRest"]:
-                    if collected_hours:
-                        records.append({
-                            "Pilot": pilot,
-                            "Date": current_date,
-                            "DutyHours": max(collected_hours)
-                        })
-                    current_date = None
-                    collected_hours = []
-
-            # End-of-file open block (if no final rest cell)
-            if current_date is not None and collected_hours:
-                records.append({
-                    "Pilot": pilot,
-                    "Date": current_date,
-                    "DutyHours": max(collected_hours)
-                })
-
-        duty_days = pd.DataFrame(records)
-
-        if duty_days.empty:
+        if long_duty is None:
             st.warning("No valid duty days could be reconstructed with the selected columns.")
             st.stop()
 
-        # Normalize and filter long duty days
-        duty_days["Date"] = duty_days["Date"].dt.date
-        duty_days["DutyHours"] = duty_days["DutyHours"].round(2)
-        duty_days["LongDuty"] = duty_days["DutyHours"] >= 12.0
-
-        long_only = duty_days[duty_days["LongDuty"]].copy()
-
-        # --------------------------------------
-        # Deduplicate: one row per (Pilot, Date), keeping the FINAL/MAX duty hours
-        # --------------------------------------
-        detail = (
-            long_only.sort_values(["Pilot", "Date", "DutyHours"], ascending=[True, True, False])
-                     .groupby(["Pilot", "Date"], as_index=False)
-                     .first()
-        )
-
-        # --------------------------------------
-        # Summary built from DEDUPLICATED rows
-        # --------------------------------------
-        summary = (
-            detail.groupby("Pilot")
-                .agg(
-                    Days=("Date", "nunique"),
-                    AvgHours=("DutyHours", "mean"),
-                    MaxHours=("DutyHours", "max")
-                )
-                .reset_index()
-        )
-
-        summary["AvgHours"] = summary["AvgHours"].round(2)
-        summary["MaxHours"] = summary["MaxHours"].round(2)
+        summary, detail = long_duty
 
         # --------------------------------------
         # Display Summary
@@ -1,62 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-import re
-from typing import Any, Iterable, Mapping, Optional
+from typing import Any, Mapping, Optional
 
 import pandas as pd
 import requests
 import streamlit as st
 
-from fl3xx_api import Fl3xxApiConfig, fetch_flights
+from fl3xx_api import Fl3xxApiConfig, PayloadCache, fetch_flights
 from flight_leg_utils import filter_rows_by_departure_window, format_utc, normalize_fl3xx_payload
+from fuel_planning import (
+    DEFAULT_PERFORMANCE_CACHE_TTL_SECONDS,
+    FORE_FLIGHT_BASE_URL,
+    build_performance_rows,
+    build_recommendations,
+    build_records,
+    extract_foreflight_flights,
+    fetch_performance_payloads,
+    fl3xx_record,
+    foreflight_record,
+    infer_aircraft_type,
+    match_records,
+)
 from Home import configure_page, get_secret, password_gate, render_sidebar
 
 
-FORE_FLIGHT_BASE_URL = "https://public-api.foreflight.com/public/api/Flights/flights"
-FORE_FLIGHT_PERFORMANCE_URL = "https://public-api.foreflight.com/public/api/Flights/{flight_id}/performance"
-TAG_PATTERN = re.compile(r"^[A-Z]{5}\d?$")
 TARGET_LANDING_FUEL_LBS = {
     "CJ": 1200,
     "Embraer": 3000,
 }
-BOOKING_MATCH_SCORE = 100
-TAIL_MATCH_SCORE = 40
-AIRPORT_MATCH_SCORE = 25
-DEPARTURE_WITHIN_30_MIN_SCORE = 20
-ARRIVAL_WITHIN_30_MIN_SCORE = 10
-DURATION_WITHIN_20_MIN_SCORE = 10
-FALLBACK_MATCH_MIN_SCORE = 90
-MAX_FALLBACK_DEPARTURE_DIFF_MINUTES = 180
 FLIGHT_FETCH_WINDOW_START_HOUR_UTC = 8
 
 
-@dataclass
-class FlightRecord:
-    source: str
-    tail: str
-    departure_airport: str
-    arrival_airport: str
-    departure_time: Optional[datetime]
-    arrival_time: Optional[datetime]
-    duration_minutes: Optional[int]
-    flight_id: Optional[str]
-    booking_identifier: Optional[str]
-
-
-@dataclass(frozen=True)
-class MatchResult:
-    foreflight_record: FlightRecord
-    fl3xx_record: FlightRecord
-    match_reason: str
-    confidence: str
-    score: int
-    departure_diff_minutes: Optional[int]
-    arrival_diff_minutes: Optional[int]
-    duration_diff_minutes: Optional[int]
-
-
 configure_page(page_title="Fuel Planning Assistant")
 password_gate()
 render_sidebar()
@@ -68,101 +43,6 @@ st.caption(
 )
 
 
-def _normalize_text(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    text = str(value).strip()
-    return text or None
-
-
-def _normalize_tail(value: Any) -> Optional[str]:
-    text = _normalize_text(value)
-    if not text:
-        return None
-    return text.replace("-", "").upper()
-
-
-def _normalize_airport(value: Any) -> Optional[str]:
-    if isinstance(value, Mapping):
-        for key in ("icao", "icaoCode", "icao_code", "identifier", "ident", "code", "id"):
-            if key in value and value[key]:
-                return _normalize_text(value[key])
-    return _normalize_text(value)
-
-
-def _extract_booking_identifier_from_tags(tags: Any) -> Optional[str]:
-    if not isinstance(tags, list):
-        return None
-    for tag in tags:
-        normalized = _normalize_text(tag)
-        if not normalized:
-            continue
-        candidate = normalized.upper()
-        if TAG_PATTERN.match(candidate):
-            return candidate
-    return None
-
-
-def _parse_datetime(value: Any) -> Optional[datetime]:
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        text = _normalize_text(value)
-        if not text:
-            return None
-        dt = pd.to_datetime(text, utc=True, errors="coerce")
-        if pd.isna(dt):
-            return None
-        if isinstance(dt, pd.Timestamp):
-            dt = dt.to_pydatetime()
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
-def _duration_minutes(start: Optional[datetime], end: Optional[datetime]) -> Optional[int]:
-    if not start or not end:
-        return None
-    delta = end - start
-    return int(round(delta.total_seconds() / 60))
-
-
-def _extract_first(container: Mapping[str, Any], *keys: str) -> Any:
-    for key in keys:
-        if key in container and container[key] not in (None, ""):
-            return container[key]
-    return None
-
-
-def _map_tail_type(value: Any) -> Optional[str]:
-    normalized = _normalize_text(value)
-    if not normalized:
-        return None
-    upper = normalized.upper()
-    if upper in {"C25A", "C25B"}:
-        return "CJ"
-    return "Embraer"
-
-
-def _infer_aircraft_type(
-    legs: Iterable[Mapping[str, Any]],
-    tail: Optional[str],
-) -> Optional[str]:
-    normalized_tail = _normalize_tail(tail)
-    if not normalized_tail:
-        return None
-    for leg in legs:
-        if _normalize_tail(leg.get("tail")) != normalized_tail:
-            continue
-        for key in ("aircraftCategory", "assignedAircraftType", "aircraftType", "aircraftClass"):
-            inferred = _map_tail_type(leg.get(key))
-            if inferred:
-                return inferred
-    return None
-
-
 def _build_fl3xx_config(token: Optional[str] = None) -> Fl3xxApiConfig:
     secrets_section = get_secret("fl3xx_api", {})
     base_url = secrets_section.get("base_url") or Fl3xxApiConfig().base_url
@@ -212,512 +92,11 @@ def _compute_selected_window_utc(selected_day: date) -> tuple[datetime, datetime
     return start_utc, end_utc
 
 
-def _extract_foreflight_flights(payload: Any) -> list[Mapping[str, Any]]:
-    if isinstance(payload, Mapping):
-        flights = payload.get("flights")
-        if isinstance(flights, list):
-            return [flight for flight in flights if isinstance(flight, Mapping)]
-    if isinstance(payload, list):
-        return [flight for flight in payload if isinstance(flight, Mapping)]
-    return []
-
-
-def _foreflight_record(flight: Mapping[str, Any]) -> Optional[FlightRecord]:
-    tail = _normalize_tail(
-        _extract_first(
-            flight,
-            "aircraftRegistration",
-            "registration",
-            "tail",
-            "tailNumber",
-            "aircraft",
-        )
-    )
-    if not tail and isinstance(flight.get("aircraft"), Mapping):
-        tail = _normalize_tail(_extract_first(flight["aircraft"], "registration", "tailNumber"))
-
-    departure_airport = _normalize_airport(
-        _extract_first(
-            flight,
-            "departure",
-            "departureAirport",
-            "origin",
-            "departureAirportCode",
-            "departureAirportIcao",
-        )
-    )
-    arrival_airport = _normalize_airport(
-        _extract_first(
-            flight,
-            "destination",
-            "destinationAirport",
-            "arrival",
-            "arrivalAirport",
-            "destinationAirportCode",
-            "destinationAirportIcao",
-        )
-    )
-
-    departure_time = _parse_datetime(
-        _extract_first(
-            flight,
-            "departureTimeUtc",
-            "departureTime",
-            "scheduledDepartureTime",
-            "scheduledDeparture",
-            "departure",
-        )
-    )
-    arrival_time = _parse_datetime(
-        _extract_first(
-            flight,
-            "arrivalTimeUtc",
-            "arrivalTime",
-            "scheduledArrivalTime",
-            "scheduledArrival",
-            "arrival",
-        )
-    )
-
-    if not tail or not departure_airport or not arrival_airport:
-        return None
-
-    booking_identifier = _normalize_text(_extract_first(flight, "bookingIdentifier", "booking_identifier"))
-    if not booking_identifier:
-        booking_identifier = _extract_booking_identifier_from_tags(flight.get("tags"))
-
-    return FlightRecord(
-        source="ForeFlight",
-        tail=tail,
-        departure_airport=departure_airport,
-        arrival_airport=arrival_airport,
-        departure_time=departure_time,
-        arrival_time=arrival_time,
-        duration_minutes=_duration_minutes(departure_time, arrival_time),
-        flight_id=_normalize_text(_extract_first(flight, "flightId", "flight_id", "id")),
-        booking_identifier=booking_identifier,
-    )
-
-
-def _fl3xx_record(leg: Mapping[str, Any]) -> Optional[FlightRecord]:
-    tail = _normalize_tail(_extract_first(leg, "tail", "aircraftRegistration", "registration"))
-    departure_airport = _normalize_airport(
-        _extract_first(
-            leg,
-            "departure_airport",
-            "departureAirport",
-            "departure",
-            "origin",
-            "from",
-        )
-    )
-    arrival_airport = _normalize_airport(
-        _extract_first(
-            leg,
-            "arrival_airport",
-            "arrivalAirport",
-            "destination",
-            "arrival",
-            "to",
-        )
-    )
-
-    departure_time = _parse_datetime(
-        _extract_first(
-            leg,
-            "dep_time",
-            "departureTimeUtc",
-            "departureTime",
-            "departure_time",
-            "scheduledDeparture",
-        )
-    )
-    arrival_time = _parse_datetime(
-        _extract_first(
-            leg,
-            "arrival_time",
-            "arrivalTimeUtc",
-            "arrivalTime",
-            "arrival_time",
-            "scheduledArrival",
-        )
-    )
-
-    if not tail or not departure_airport or not arrival_airport:
-        return None
-
-    return FlightRecord(
-        source="FL3XX",
-        tail=tail,
-        departure_airport=departure_airport,
-        arrival_airport=arrival_airport,
-        departure_time=departure_time,
-        arrival_time=arrival_time,
-        duration_minutes=_duration_minutes(departure_time, arrival_time),
-        flight_id=_normalize_text(_extract_first(leg, "leg_id", "flightId", "id")),
-        booking_identifier=_normalize_text(_extract_first(leg, "bookingIdentifier", "booking_identifier")),
-    )
-
-
-def _build_records(records: Iterable[Optional[FlightRecord]]) -> list[FlightRecord]:
-    return [record for record in records if record is not None]
-
-
-def _record_key(record: FlightRecord) -> tuple[str, str, str]:
-    return (record.tail, record.departure_airport, record.arrival_airport)
-
+@st.cache_resource(show_spinner=False)
+def _performance_cache() -> PayloadCache:
+    """ForeFlight performance payloads shared by every session, keyed by flight ID."""
 
-def _time_diff_minutes(left: Optional[datetime], right: Optional[datetime]) -> Optional[int]:
-    if not left or not right:
-        return None
-    return int(round(abs((left - right).total_seconds()) / 60))
-
-
-def _int_diff_minutes(left: Optional[int], right: Optional[int]) -> Optional[int]:
-    if left is None or right is None:
-        return None
-    return abs(left - right)
-
-
-def _classify_match_confidence(score: int, match_reason: str) -> str:
-    if match_reason == "booking_identifier":
-        return "High"
-    if score >= 110:
-        return "High"
-    if score >= FALLBACK_MATCH_MIN_SCORE:
-        return "Medium"
-    return "Low"
-
-
-def _score_match(
-    foreflight_record: FlightRecord,
-    fl3xx_record: FlightRecord,
-) -> tuple[int, Optional[int], Optional[int], Optional[int]]:
-    score = 0
-    if foreflight_record.tail == fl3xx_record.tail:
-        score += TAIL_MATCH_SCORE
-    if foreflight_record.departure_airport == fl3xx_record.departure_airport:
-        score += AIRPORT_MATCH_SCORE
-    if foreflight_record.arrival_airport == fl3xx_record.arrival_airport:
-        score += AIRPORT_MATCH_SCORE
-
-    departure_diff_minutes = _time_diff_minutes(
-        foreflight_record.departure_time,
-        fl3xx_record.departure_time,
-    )
-    if departure_diff_minutes is not None and departure_diff_minutes <= 30:
-        score += DEPARTURE_WITHIN_30_MIN_SCORE
-
-    arrival_diff_minutes = _time_diff_minutes(
-        foreflight_record.arrival_time,
-        fl3xx_record.arrival_time,
-    )
-    if arrival_diff_minutes is not None and arrival_diff_minutes <= 30:
-        score += ARRIVAL_WITHIN_30_MIN_SCORE
-
-    duration_diff_minutes = _int_diff_minutes(
-        foreflight_record.duration_minutes,
-        fl3xx_record.duration_minutes,
-    )
-    if duration_diff_minutes is not None and duration_diff_minutes <= 20:
-        score += DURATION_WITHIN_20_MIN_SCORE
-
-    return score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes
-
-
-def _match_records(
-    foreflight_records: list[FlightRecord],
-    fl3xx_records: list[FlightRecord],
-) -> tuple[list[MatchResult], list[FlightRecord], list[FlightRecord]]:
-    fl3xx_by_booking: dict[str, list[FlightRecord]] = {}
-    for record in fl3xx_records:
-        if record.booking_identifier:
-            fl3xx_by_booking.setdefault(record.booking_identifier, []).append(record)
-
-    fl3xx_by_key: dict[tuple[str, str, str], list[FlightRecord]] = {}
-    for record in fl3xx_records:
-        fl3xx_by_key.setdefault(_record_key(record), []).append(record)
-
-    matches: list[MatchResult] = []
-    unmatched_foreflight: list[FlightRecord] = []
-
-    for ff_record in foreflight_records:
-        candidates: Optional[list[FlightRecord]] = None
-        if ff_record.booking_identifier:
-            candidates = fl3xx_by_booking.get(ff_record.booking_identifier)
-        if candidates:
-            matched = candidates.pop(0)
-            matches.append(
-                MatchResult(
-                    foreflight_record=ff_record,
-                    fl3xx_record=matched,
-                    match_reason="booking_identifier",
-                    confidence="High",
-                    score=BOOKING_MATCH_SCORE,
-                    departure_diff_minutes=_time_diff_minutes(ff_record.departure_time, matched.departure_time),
-                    arrival_diff_minutes=_time_diff_minutes(ff_record.arrival_time, matched.arrival_time),
-                    duration_diff_minutes=(
-                        abs(ff_record.duration_minutes - matched.duration_minutes)
-                        if ff_record.duration_minutes is not None and matched.duration_minutes is not None
-                        else None
-                    ),
-                )
-            )
-        else:
-            key = _record_key(ff_record)
-            candidates = fl3xx_by_key.get(key)
-            if not candidates:
-                unmatched_foreflight.append(ff_record)
-                continue
-
-            scored_candidates: list[tuple[int, Optional[int], Optional[int], Optional[int], FlightRecord]] = []
-            for candidate in candidates:
-                score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes = _score_match(ff_record, candidate)
-                if (
-                    departure_diff_minutes is not None
-                    and departure_diff_minutes > MAX_FALLBACK_DEPARTURE_DIFF_MINUTES
-                ):
-                    continue
-                scored_candidates.append(
-                    (score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes, candidate)
-                )
-
-            if not scored_candidates:
-                unmatched_foreflight.append(ff_record)
-                continue
-
-            scored_candidates.sort(
-                key=lambda item: (
-                    -item[0],
-                    item[1] if item[1] is not None else float("inf"),
-                    item[2] if item[2] is not None else float("inf"),
-                    item[3] if item[3] is not None else float("inf"),
-                )
-            )
-            best_score, departure_diff_minutes, arrival_diff_minutes, duration_diff_minutes, matched = scored_candidates[0]
-            if best_score < FALLBACK_MATCH_MIN_SCORE:
-                unmatched_foreflight.append(ff_record)
-                continue
-            candidates.remove(matched)
-            matches.append(
-                MatchResult(
-                    foreflight_record=ff_record,
-                    fl3xx_record=matched,
-                    match_reason="tail_route_time",
-                    confidence=_classify_match_confidence(best_score, "tail_route_time"),
-                    score=best_score,
-                    departure_diff_minutes=departure_diff_minutes,
-                    arrival_diff_minutes=arrival_diff_minutes,
-                    duration_diff_minutes=duration_diff_minutes,
-                )
-            )
-
-        if matched.booking_identifier:
-            booking_candidates = fl3xx_by_booking.get(matched.booking_identifier)
-            if booking_candidates and matched in booking_candidates:
-                booking_candidates.remove(matched)
-                if not booking_candidates:
-                    fl3xx_by_booking.pop(matched.booking_identifier, None)
-        matched_key = _record_key(matched)
-        key_candidates = fl3xx_by_key.get(matched_key)
-        if key_candidates and matched in key_candidates:
-            key_candidates.remove(matched)
-            if not key_candidates:
-                fl3xx_by_key.pop(matched_key, None)
-        if ff_record.booking_identifier:
-            ff_booking_candidates = fl3xx_by_booking.get(ff_record.booking_identifier)
-            if ff_booking_candidates is not None and not ff_booking_candidates:
-                fl3xx_by_booking.pop(ff_record.booking_identifier, None)
-
-    remaining_by_key = [record for records in fl3xx_by_key.values() for record in records]
-    remaining_by_booking = [
-        record for records in fl3xx_by_booking.values() for record in records
-    ]
-    unmatched_fl3xx = list({id(record): record for record in remaining_by_key + remaining_by_booking}.values())
-    return matches, unmatched_foreflight, unmatched_fl3xx
-
-
-def _format_timestamp(value: Optional[datetime]) -> str:
-    if not value:
-        return "—"
-    return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%MZ")
-
-
-def _fetch_performance(
-    flight_id: str,
-    *,
-    token: str,
-) -> Optional[Mapping[str, Any]]:
-    url = FORE_FLIGHT_PERFORMANCE_URL.format(flight_id=flight_id)
-    headers = {
-        "x-api-key": token,
-        "Accept": "application/json",
-    }
-    response = requests.get(url, headers=headers, timeout=30)
-    if not response.ok:
-        return None
-    return response.json()
-
-
-def _extract_performance_fields(payload: Mapping[str, Any]) -> dict[str, Optional[float]]:
-    performance = payload.get("performance", {}) if isinstance(payload, Mapping) else {}
-    fuel = performance.get("fuel", {}) if isinstance(performance, Mapping) else {}
-    weights = performance.get("weights", {}) if isinstance(performance, Mapping) else {}
-    return {
-        "fuel_to_destination": fuel.get("fuelToDestination"),
-        "taxi_fuel": fuel.get("taxiFuel"),
-        "flight_fuel": fuel.get("flightFuel"),
-        "landing_fuel": fuel.get("landingFuel"),
-        "total_fuel": fuel.get("totalFuel"),
-        "max_total_fuel": fuel.get("maxTotalFuel"),
-        "ramp_weight": weights.get("rampWeight"),
-        "max_ramp_weight": weights.get("maxRampWeight"),
-        "takeoff_weight": weights.get("takeOffWeight"),
-        "max_takeoff_weight": weights.get("maxTakeOffWeight"),
-        "landing_weight": weights.get("landingWeight"),
-        "max_landing_weight": weights.get("maxLandingWeight"),
-        "zero_fuel_weight": weights.get("zeroFuelWeight"),
-        "max_zero_fuel_weight": weights.get("maxZeroFuelWeight"),
-    }
-
-
-def _as_float(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        if pd.isna(value):
-            return None
-        return float(value)
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _calculate_required_departure_fuel(
-    performance: Mapping[str, Any],
-    target_landing_fuel: float,
-) -> Optional[float]:
-    flight_fuel = _as_float(performance.get("flight_fuel"))
-    fuel_to_destination = _as_float(performance.get("fuel_to_destination"))
-    taxi_fuel = _as_float(performance.get("taxi_fuel")) or 0.0
-    burn_fuel = flight_fuel if flight_fuel is not None else fuel_to_destination
-    if burn_fuel is None:
-        return None
-    return burn_fuel + taxi_fuel + target_landing_fuel
-
-
-def _min_optional(*values: Optional[float]) -> Optional[float]:
-    present = [value for value in values if value is not None]
-    if not present:
-        return None
-    return min(present)
-
-
-def _calculate_weight_limited_max_fuel(
-    performance: Mapping[str, Any],
-) -> Optional[float]:
-    total_fuel = _as_float(performance.get("total_fuel"))
-    if total_fuel is None:
-        return None
-
-    margins: list[float] = []
-    for weight_key, max_key in (
-        ("ramp_weight", "max_ramp_weight"),
-        ("takeoff_weight", "max_takeoff_weight"),
-        ("landing_weight", "max_landing_weight"),
-    ):
-        weight = _as_float(performance.get(weight_key))
-        max_weight = _as_float(performance.get(max_key))
-        if weight is not None and max_weight is not None:
-            margins.append(max_weight - weight)
-
-    if not margins:
-        return None
-
-    return total_fuel + min(margins)
-
-
-def _build_recommendations(df: pd.DataFrame) -> pd.DataFrame:
-    recommendations: list[str] = []
-    notes: list[str] = []
-
-    rows = df.to_dict(orient="records")
-
-    for index, row in enumerate(rows):
-        required_departure_fuel = _as_float(row.get("Required Dep Fuel (lb)"))
-        max_total_fuel = _as_float(row.get("Max Total Fuel (lb)"))
-        max_fuel_by_weight = _as_float(row.get("Max Fuel by Weight (lb)"))
-        effective_max_fuel = _as_float(row.get("Effective Max Fuel (lb)")) or _min_optional(
-            max_total_fuel, max_fuel_by_weight
-        )
-        fuel_price = _as_float(row.get("Fuel Price ($/unit)"))
-        ramp_fee = _as_float(row.get("Ramp Fee ($)"))
-        waiver_fuel = _as_float(row.get("Waiver Fuel (unit)"))
-
-        decision = "Review manually"
-        detail: list[str] = []
-
-        if required_departure_fuel is None:
-            detail.append("Missing required departure fuel.")
-        else:
-            decision = f"Take at least {required_departure_fuel:,.0f} lb"
-            detail.append("Meets target landing fuel requirement.")
-            if (
-                max_total_fuel is not None
-                and max_fuel_by_weight is not None
-                and max_fuel_by_weight < max_total_fuel
-            ):
-                detail.append(
-                    f"Weight limits cap max fuel at {max_fuel_by_weight:,.0f} lb."
-                )
-
-            if waiver_fuel and waiver_fuel > 0:
-                if effective_max_fuel is not None and waiver_fuel > effective_max_fuel:
-                    detail.append("Waiver threshold exceeds max fuel; cannot waive.")
-                elif required_departure_fuel >= waiver_fuel:
-                    decision = "Waiver already met"
-                    detail.append("Required fuel already meets waiver threshold.")
-                elif fuel_price is not None and ramp_fee is not None:
-                    extra_needed = waiver_fuel - required_departure_fuel
-                    extra_cost = extra_needed * fuel_price
-                    if ramp_fee > extra_cost:
-                        decision = "Buy waiver only"
-                        detail.append(
-                            f"Extra {extra_needed:,.0f} lb to waive saves about "
-                            f"${ramp_fee - extra_cost:,.0f}."
-                        )
-                    else:
-                        decision = "Take minimum and pay ramp fee"
-                        detail.append(
-                            f"Ramp fee (${ramp_fee:,.0f}) is cheaper than extra fuel "
-                            f"(${extra_cost:,.0f})."
-                        )
-                else:
-                    detail.append("Add fuel price and ramp fee to compare waiver savings.")
-
-        next_row = rows[index + 1] if index + 1 < len(rows) else None
-        next_price = _as_float(next_row.get("Fuel Price ($/unit)")) if next_row else None
-        if (
-            fuel_price is not None
-            and next_price is not None
-            and required_departure_fuel is not None
-            and effective_max_fuel is not None
-        ):
-            extra_capacity = effective_max_fuel - required_departure_fuel
-            if extra_capacity > 0 and fuel_price < next_price:
-                decision = f"{decision} • Tankering recommended"
-                detail.append(
-                    f"Fuel is ${next_price - fuel_price:,.2f}/unit cheaper than next leg."
-                )
-
-        recommendations.append(decision)
-        notes.append(" ".join(detail))
-
-    result = df.copy()
-    result["Recommendation"] = recommendations
-    result["Decision Notes"] = notes
-    return result
+    return PayloadCache(DEFAULT_PERFORMANCE_CACHE_TTL_SECONDS)
 
 
 def _sort_by_departure_time(df: pd.DataFrame) -> pd.DataFrame:
@@ -854,17 +233,17 @@ if fetch:
             window_end_utc,
         )
 
-    foreflight_records = _build_records(_foreflight_record(flight) for flight in _extract_foreflight_flights(foreflight_payload))
-    fl3xx_records = _build_records(_fl3xx_record(leg) for leg in fl3xx_normalized)
+    foreflight_records = build_records(foreflight_record(flight) for flight in extract_foreflight_flights(foreflight_payload))
+    fl3xx_records = build_records(fl3xx_record(leg) for leg in fl3xx_normalized)
 
-    inferred_type = _infer_aircraft_type(fl3xx_normalized, tail_input)
+    inferred_type = infer_aircraft_type(fl3xx_normalized, tail_input)
     if inferred_type and inferred_type != st.session_state.get("fuel_planning_aircraft_type"):
         st.session_state["fuel_planning_aircraft_type_pending"] = inferred_type
 
     foreflight_records = [record for record in foreflight_records if record.tail == tail_input]
     fl3xx_records = [record for record in fl3xx_records if record.tail == tail_input]
 
-    matches, unmatched_foreflight, unmatched_fl3xx = _match_records(foreflight_records, fl3xx_records)
+    matches, unmatched_foreflight, unmatched_fl3xx = match_records(foreflight_records, fl3xx_records)
 
     summary = {
         "matched": len(matches),
@@ -880,8 +259,6 @@ if fetch:
         st.session_state["fuel_planning_recommendations"] = pd.DataFrame()
         st.stop()
 
-    rows: list[dict[str, Any]] = []
-    missing_performance: list[str] = []
     effective_aircraft_type = inferred_type or st.session_state["fuel_planning_aircraft_type"]
     effective_target_landing_fuel = (
         float(TARGET_LANDING_FUEL_LBS[effective_aircraft_type])
@@ -890,49 +267,12 @@ if fetch:
     )
 
     with st.spinner("Fetching ForeFlight performance data..."):
-        for match in matches:
-            ff_record = match.foreflight_record
-            if not ff_record.flight_id:
-                missing_performance.append(f"{ff_record.departure_airport} → {ff_record.arrival_airport}")
-                continue
-            payload = _fetch_performance(ff_record.flight_id, token=foreflight_token)
-            if not payload:
-                missing_performance.append(f"{ff_record.departure_airport} → {ff_record.arrival_airport}")
-                continue
-            perf = _extract_performance_fields(payload)
-            fuel_to_destination = perf.get("fuel_to_destination")
-            required_departure_fuel = _calculate_required_departure_fuel(
-                perf,
-                effective_target_landing_fuel,
-            )
-            weight_limited_max_fuel = _calculate_weight_limited_max_fuel(perf)
-            max_total_fuel = _as_float(perf.get("max_total_fuel"))
-            effective_max_fuel = _min_optional(max_total_fuel, weight_limited_max_fuel)
-
-            rows.append(
-                {
-                    "Departure": ff_record.departure_airport,
-                    "Arrival": ff_record.arrival_airport,
-                    "Dep Time (UTC)": _format_timestamp(ff_record.departure_time),
-                    "Arr Time (UTC)": _format_timestamp(ff_record.arrival_time),
-                    "Match Reason": match.match_reason,
-                    "Match Confidence": match.confidence,
-                    "Match Score": match.score,
-                    "Dep Δ (min)": match.departure_diff_minutes,
-                    "Arr Δ (min)": match.arrival_diff_minutes,
-                    "Duration Δ (min)": match.duration_diff_minutes,
-                    "Fuel To Dest (lb)": fuel_to_destination,
-                    "Taxi Fuel (lb)": perf.get("taxi_fuel"),
-                    "Total Fuel (lb)": perf.get("total_fuel"),
-                    "Max Total Fuel (lb)": max_total_fuel,
-                    "Max Fuel by Weight (lb)": weight_limited_max_fuel,
-                    "Effective Max Fuel (lb)": effective_max_fuel,
-                    "Required Dep Fuel (lb)": required_departure_fuel,
-                    "Fuel Price ($/unit)": None,
-                    "Ramp Fee ($)": None,
-                    "Waiver Fuel (unit)": None,
-                }
-            )
+        payloads = fetch_performance_payloads(
+            (match.foreflight_record.flight_id for match in matches),
+            token=foreflight_token,
+            cache=_performance_cache(),
+        )
+    rows, missing_performance = build_performance_rows(matches, payloads, effective_target_landing_fuel)
 
     st.session_state["fuel_planning_df"] = _sort_by_departure_time(pd.DataFrame(rows))
     st.session_state["fuel_planning_missing_performance"] = missing_performance
@@ -1023,7 +363,7 @@ if fuel_df is not None and not fuel_df.empty:
         "ramp-fee waivers vs fuel price savings."
     )
     if st.button("Generate recommendations"):
-        st.session_state["fuel_planning_recommendations"] = _build_recommendations(
+        st.session_state["fuel_planning_recommendations"] = build_recommendations(
             st.session_state.get("fuel_planning_editor_df", editor_source)
         )
 
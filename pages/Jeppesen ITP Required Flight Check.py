@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import re
 from collections.abc import Mapping
 from dataclasses import replace
-from datetime import date, datetime, time, timedelta, timezone
+from datetime import date, datetime, timedelta
 from math import inf
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 import streamlit as st
@@ -13,18 +12,17 @@ import streamlit as st
 
 from flight_leg_utils import (
     AIRPORT_TZ_FILENAME,
-    ARRIVAL_AIRPORT_COLUMNS,
-    DEPARTURE_AIRPORT_COLUMNS,
     FlightDataError,
     build_fl3xx_api_config,
-    fetch_legs_dataframe,
     load_airport_metadata_lookup,
     safe_parse_dt,
 )
 from jeppesen_itp_utils import (
-    ALLOWED_COUNTRY_IDENTIFIERS,
-    country_display_name,
-    normalize_country_name,
+    DEFAULT_ITP_CHUNK_DAYS,
+    classify_itp_legs,
+    extract_airport_codes,
+    fetch_itp_legs,
+    iter_date_chunks,
 )
 from Home import configure_page, password_gate, render_sidebar
 
@@ -63,71 +61,7 @@ def _load_fl3xx_settings() -> Dict[str, Any]:
 
 
 
-_CHUNK_SIZE_DAYS = 5
-CUBAN_OVERFLIGHT_COUNTRIES = {
-    "aruba",
-    "aw",
-    "cayman islands",
-    "ky",
-    "curacao",
-    "cw",
-    "jamaica",
-    "jm",
-}
-
-
-def _iter_date_chunks(start: date, end: date, chunk_size: int) -> Iterable[Tuple[date, date]]:
-    if chunk_size <= 0:
-        raise ValueError("chunk_size must be positive")
-    current = start
-    delta = timedelta(days=chunk_size - 1)
-    while current <= end:
-        chunk_end = min(current + delta, end)
-        yield current, chunk_end
-        current = chunk_end + timedelta(days=1)
-
-
-def _normalize_country_name(name: Optional[str]) -> Optional[str]:
-    return normalize_country_name(name)
-
-
-_CODE_PATTERN = re.compile(r"\b[A-Za-z0-9]{3,4}\b")
-
-
-def _extract_codes(value: Any) -> Iterable[str]:
-    if value is None:
-        return []
-    if isinstance(value, float) and pd.isna(value):
-        return []
-    text = str(value).strip()
-    if not text:
-        return []
-    upper = text.upper()
-    if len(upper.replace(" ", "")) in {3, 4} and upper.replace(" ", "").isalnum():
-        return [upper.replace(" ", "")]
-    return [match.upper() for match in _CODE_PATTERN.findall(upper)]
-
-
-def _detect_country(
-    row: Mapping[str, Any],
-    columns: Sequence[str],
-    lookup: Mapping[str, Mapping[str, Optional[str]]],
-    missing_codes: set[str],
-) -> Tuple[Optional[str], Optional[str]]:
-    for column in columns:
-        if column not in row:
-            continue
-        value = row[column]
-        for code in _extract_codes(value):
-            record = lookup.get(code)
-            if record:
-                country = record.get("country")
-                normalized = _normalize_country_name(country)
-                if normalized:
-                    return country, code
-            else:
-                missing_codes.add(code)
-    return None, None
+_CHUNK_SIZE_DAYS = DEFAULT_ITP_CHUNK_DAYS
 
 
 def _coerce_text(row: Mapping[str, Any], keys: Sequence[str], default: str = "") -> str:
@@ -225,60 +159,38 @@ except Exception as exc:
     st.error(f"Error preparing FL3XX API configuration: {exc}")
     st.stop()
 
-chunks = list(_iter_date_chunks(start_date, end_date, _CHUNK_SIZE_DAYS))
+chunks = list(iter_date_chunks(start_date, end_date, _CHUNK_SIZE_DAYS))
 progress_placeholder = st.empty()
 progress_bar = progress_placeholder.progress(0.0) if len(chunks) > 1 else None
 
-chunk_dataframes: List[pd.DataFrame] = []
-chunk_metadata: List[Dict[str, Any]] = []
+
+def _update_progress(done: int, total: int) -> None:
+    if progress_bar is not None:
+        progress_bar.progress(done / total)
+
 
 with st.spinner(f"Fetching flights from FL3XX in {_CHUNK_SIZE_DAYS}-day batches..."):
-    for idx, (chunk_start, chunk_end) in enumerate(chunks, start=1):
-        request_end = chunk_end + timedelta(days=1)
-        window_start = datetime.combine(chunk_start, time.min).replace(tzinfo=timezone.utc)
-        window_end = (
-            datetime.combine(request_end, time.min).replace(tzinfo=timezone.utc)
-            - timedelta(microseconds=1)
-        )
-        try:
-            chunk_df, chunk_meta, _ = fetch_legs_dataframe(
-                config,
-                from_date=chunk_start,
-                to_date=request_end,
-                departure_window=(window_start, window_end),
-                fetch_crew=False,
-            )
-        except Exception as exc:
-            st.error(
-                "Error fetching data from FL3XX API for %s to %s: %s"
-                % (chunk_start.isoformat(), chunk_end.isoformat(), exc)
-            )
-            st.stop()
-
-        if not chunk_df.empty:
-            chunk_dataframes.append(chunk_df)
-
-        chunk_metadata.append(
-            {
-                "chunk_index": idx,
-                "request_range": {
-                    "from": chunk_start.isoformat(),
-                    "to": request_end.isoformat(),
-                },
-                "response": chunk_meta,
-            }
-        )
+    leg_fetch = fetch_itp_legs(
+        config,
+        start_date,
+        end_date,
+        chunk_days=_CHUNK_SIZE_DAYS,
+        on_chunk_done=_update_progress,
+    )
 
-        if progress_bar is not None:
-            progress_bar.progress(idx / len(chunks))
+if leg_fetch.error is not None:
+    failed_start, failed_end, exc = leg_fetch.error
+    st.error(
+        "Error fetching data from FL3XX API for %s to %s: %s"
+        % (failed_start.isoformat(), failed_end.isoformat(), exc)
+    )
+    st.stop()
 
 if progress_bar is not None:
     progress_placeholder.empty()
 
-if chunk_dataframes:
-    legs_df = pd.concat(chunk_dataframes, ignore_index=True)
-else:
-    legs_df = pd.DataFrame()
+legs_df = leg_fetch.legs
+chunk_metadata = leg_fetch.chunks
 
 metadata = {
     "chunk_size_days": _CHUNK_SIZE_DAYS,
@@ -299,7 +211,8 @@ if not lookup:
     )
     st.stop()
 
-missing_airports: set[str] = set()
+classification = classify_itp_legs(legs_df, lookup)
+missing_airports = classification.missing_codes
 report_entries: List[Tuple[float, int, str]] = []
 cuban_overflight_entries: List[Tuple[float, int, str]] = []
 
@@ -311,41 +224,18 @@ def _preferred_airport_display(
         if column not in row:
             continue
         value = row[column]
-        for code in _extract_codes(value):
+        for code in extract_airport_codes(value):
             return code
     display = _coerce_text(row, columns, default=fallback)
     return display or fallback
 
-for idx, (_, leg) in enumerate(legs_df.iterrows()):
-    row = leg.to_dict()
-    dep_country, dep_code = _detect_country(row, DEPARTURE_AIRPORT_COLUMNS, lookup, missing_airports)
-    arr_country, arr_code = _detect_country(row, ARRIVAL_AIRPORT_COLUMNS, lookup, missing_airports)
-
-    triggered_countries: List[str] = []
-
-    dep_normalized = _normalize_country_name(dep_country)
-    if dep_normalized and dep_normalized not in ALLOWED_COUNTRY_IDENTIFIERS:
-        display = country_display_name(dep_country) or dep_normalized.title()
-        triggered_countries.append(display)
-
-    arr_normalized = _normalize_country_name(arr_country)
-    if arr_normalized and arr_normalized not in ALLOWED_COUNTRY_IDENTIFIERS:
-        display = country_display_name(arr_country) or arr_normalized.title()
-        triggered_countries.append(display)
-
-    cuban_overflight_countries: List[str] = []
-    if dep_normalized in CUBAN_OVERFLIGHT_COUNTRIES:
-        cuban_overflight_countries.append(
-            country_display_name(dep_country) or dep_normalized.title()
-        )
-    if arr_normalized in CUBAN_OVERFLIGHT_COUNTRIES:
-        cuban_overflight_countries.append(
-            country_display_name(arr_country) or arr_normalized.title()
-        )
-    cuban_overflight_countries = list(dict.fromkeys(cuban_overflight_countries))
 
-    if not triggered_countries and not cuban_overflight_countries:
-        continue
+flagged = classification.frame["requires_itp"] | classification.frame["requires_cuban_overflight"]
+for idx in flagged.to_numpy().nonzero()[0].tolist():
+    row = legs_df.iloc[idx].to_dict()
+    leg_class = classification.frame.iloc[idx]
+    dep_code = leg_class["dep_code"]
+    arr_code = leg_class["arr_code"]
 
     dep_code_display = dep_code or _preferred_airport_display(
         row, ("departure_airport", "departureAirport", "airportFrom")
@@ -371,8 +261,8 @@ for idx, (_, leg) in enumerate(legs_df.iterrows()):
     except Exception:
         sort_key = inf
 
-    country_display = ", ".join(dict.fromkeys(triggered_countries))
-    if triggered_countries:
+    country_display = leg_class["itp_countries"]
+    if leg_class["requires_itp"]:
         report_entries.append(
             (
                 sort_key,
@@ -381,8 +271,8 @@ for idx, (_, leg) in enumerate(legs_df.iterrows()):
             )
         )
 
-    if cuban_overflight_countries:
-        display = ", ".join(cuban_overflight_countries)
+    if leg_class["requires_cuban_overflight"]:
+        display = leg_class["cuban_countries"]
         cuban_overflight_entries.append(
             (
                 sort_key,
@@ -3,6 +3,7 @@ from datetime import date
 import streamlit as st
 
 from Home import configure_page, password_gate, render_sidebar
+from payload_weights import DEFAULT_CARGO_PER_PAX, STD_WEIGHTS, season_for_month
 
 configure_page(page_title="Max ZFW (Pax + Cargo) Checker")
 password_gate()
@@ -46,11 +47,6 @@ CJ2_TAIL_LIMITS = {
     },
 }
 
-STD_WEIGHTS = {
-    "Summer": {"Male": 193, "Female": 159, "Child": 75, "Infant": 30},
-    "Winter": {"Male": 199, "Female": 165, "Child": 75, "Infant": 30},
-}
-
 def color_text(text: str, color: str, bold: bool = False, size_px: int | None = None):
     style = []
     if color: style.append(f"color:{color}")
@@ -87,10 +83,7 @@ with cols_top[1]:
     )
 
     # Auto-assign season from month
-    if selected_month in ["April", "May", "June", "July", "August", "September", "October"]:
-        auto_season = "Summer"
-    else:
-        auto_season = "Winter"
+    auto_season = season_for_month(months.index(selected_month) + 1)
     st.caption(f"Auto-detected season from month: **{auto_season}**")
 
 with cols_top[2]:
@@ -170,7 +163,7 @@ else:
 # --------------------------
 st.subheader("Cargo")
 
-default_cargo = 30 * total_pax
+default_cargo = DEFAULT_CARGO_PER_PAX * total_pax
 cargo_override = st.checkbox("Override cargo (enter total cargo weight)", key="cargo_override")
 
 if cargo_override:
@@ -189,7 +182,7 @@ if cargo_override:
 else:
     cargo_weight = float(default_cargo)
     st.session_state.cargo_weight = cargo_weight  # reset when not overriding
-    st.write(f"Assumed cargo: {default_cargo} lb (30 lb × {total_pax} pax)")
+    st.write(f"Assumed cargo: {default_cargo} lb ({DEFAULT_CARGO_PER_PAX} lb × {total_pax} pax)")
 
 
 
@@ -14,14 +14,17 @@ from oca_reports import (
     HighPaxWeightAlert,
     MaxFlightTimeAlert,
     MelHoldItem,
+    OcaRunData,
     RunwayLengthCheck,
     ZfwFlightCheck,
+    clear_payload_cache,
     evaluate_flights_for_max_time,
     evaluate_flights_for_high_pax_weight,
     evaluate_flights_for_runway_length,
     evaluate_flights_for_zfw_check,
     evaluate_mel_hold_items,
     format_duration_label,
+    prepare_oca_run,
     _format_pax_breakdown,
 )
 from fl3xx_api import fetch_flights
@@ -1099,6 +1102,13 @@ with primary_tab:
         )
         submitted = st.form_submit_button("Run OCA Reports")
 
+    if st.button(
+        "🧹 Clear cached booking details",
+        help="Leg and pax payloads are reused for an hour. Clear them to re-fetch everything on the next run.",
+    ):
+        clear_payload_cache()
+        st.success("Cached booking details cleared. The next run re-fetches them from FL3XX.")
+
     if submitted:
         if api_settings is None:
             st.error(
@@ -1117,78 +1127,103 @@ with primary_tab:
                 zfw_state: Dict[str, Any] = {}
                 high_pax_weight_state: Dict[str, Any] = {}
 
+                # Flights and the leg/pax payloads for all three checks are
+                # fetched once here; payloads stay cached for an hour.
+                run_data: Optional[OcaRunData] = None
+                prep_error: Optional[str] = None
                 try:
-                    with st.spinner("Evaluating max flight time limits..."):
-                        alerts, metadata, diagnostics = evaluate_flights_for_max_time(
+                    with st.spinner("Fetching flights and booking details..."):
+                        run_data = prepare_oca_run(
                             config,
                             from_date=start_date,
                             to_date=to_date_exclusive,
                         )
-                except FlightDataError as exc:
-                    max_time_state["error"] = str(exc)
-                    st.error(str(exc))
-                except Exception as exc:  # pragma: no cover - defensive UI path
-                    max_time_state["error"] = str(exc)
-                    st.error(str(exc))
+                except Exception as exc:  # FlightDataError or a defensive UI path
+                    prep_error = str(exc)
+                    st.error(prep_error)
+
+                if prep_error is not None:
+                    # Every check reads the shared run data, so report the
+                    # failure once rather than re-fetching per check.
+                    max_time_state = {"error": prep_error}
+                    zfw_state = {"error": prep_error}
+                    high_pax_weight_state = {"error": prep_error}
                 else:
-                    max_time_state = {
-                        "alerts": [
-                            alert.as_dict() if isinstance(alert, MaxFlightTimeAlert) else dict(alert)
-                            for alert in alerts
-                        ],
-                        "metadata": metadata,
-                        "diagnostics": diagnostics,
-                    }
-
-                try:
-                    with st.spinner("Evaluating ZFW review thresholds..."):
-                        zfw_items, zfw_metadata, zfw_diagnostics = evaluate_flights_for_zfw_check(
-                            config,
-                            from_date=start_date,
-                            to_date=to_date_exclusive,
-                        )
-                except FlightDataError as exc:
-                    zfw_state["error"] = str(exc)
-                    st.error(str(exc))
-                except Exception as exc:  # pragma: no cover - defensive UI path
-                    zfw_state["error"] = str(exc)
-                    st.error(str(exc))
-                else:
-                    zfw_state = {
-                        "items": [
-                            item.as_dict() if isinstance(item, ZfwFlightCheck) else dict(item)
-                            for item in zfw_items
-                        ],
-                        "metadata": zfw_metadata,
-                        "diagnostics": zfw_diagnostics,
-                    }
+                    try:
+                        with st.spinner("Evaluating max flight time limits..."):
+                            alerts, metadata, diagnostics = evaluate_flights_for_max_time(
+                                config,
+                                from_date=start_date,
+                                to_date=to_date_exclusive,
+                                data=run_data,
+                            )
+                    except FlightDataError as exc:
+                        max_time_state["error"] = str(exc)
+                        st.error(str(exc))
+                    except Exception as exc:  # pragma: no cover - defensive UI path
+                        max_time_state["error"] = str(exc)
+                        st.error(str(exc))
+                    else:
+                        max_time_state = {
+                            "alerts": [
+                                alert.as_dict() if isinstance(alert, MaxFlightTimeAlert) else dict(alert)
+                                for alert in alerts
+                            ],
+                            "metadata": metadata,
+                            "diagnostics": diagnostics,
+                        }
 
-                try:
-                    with st.spinner("Evaluating high pax weight thresholds..."):
-                        high_pax_items, high_pax_metadata, high_pax_diagnostics = (
-                            evaluate_flights_for_high_pax_weight(
+                    try:
+                        with st.spinner("Evaluating ZFW review thresholds..."):
+                            zfw_items, zfw_metadata, zfw_diagnostics = evaluate_flights_for_zfw_check(
                                 config,
                                 from_date=start_date,
                                 to_date=to_date_exclusive,
+                                data=run_data,
                             )
-                        )
-                except FlightDataError as exc:
-                    high_pax_weight_state["error"] = str(exc)
-                    st.error(str(exc))
-                except Exception as exc:  # pragma: no cover - defensive UI path
-                    high_pax_weight_state["error"] = str(exc)
-                    st.error(str(exc))
-                else:
-                    high_pax_weight_state = {
-                        "items": [
-                            item.as_dict()
-                            if isinstance(item, HighPaxWeightAlert)
-                            else dict(item)
-                            for item in high_pax_items
-                        ],
-                        "metadata": high_pax_metadata,
-                        "diagnostics": high_pax_diagnostics,
-                    }
+                    except FlightDataError as exc:
+                        zfw_state["error"] = str(exc)
+                        st.error(str(exc))
+                    except Exception as exc:  # pragma: no cover - defensive UI path
+                        zfw_state["error"] = str(exc)
+                        st.error(str(exc))
+                    else:
+                        zfw_state = {
+                            "items": [
+                                item.as_dict() if isinstance(item, ZfwFlightCheck) else dict(item)
+                                for item in zfw_items
+                            ],
+                            "metadata": zfw_metadata,
+                            "diagnostics": zfw_diagnostics,
+                        }
+
+                    try:
+                        with st.spinner("Evaluating high pax weight thresholds..."):
+                            high_pax_items, high_pax_metadata, high_pax_diagnostics = (
+                                evaluate_flights_for_high_pax_weight(
+                                    config,
+                                    from_date=start_date,
+                                    to_date=to_date_exclusive,
+                                    data=run_data,
+                                )
+                            )
+                    except FlightDataError as exc:
+                        high_pax_weight_state["error"] = str(exc)
+                        st.error(str(exc))
+                    except Exception as exc:  # pragma: no cover - defensive UI path
+                        high_pax_weight_state["error"] = str(exc)
+                        st.error(str(exc))
+                    else:
+                        high_pax_weight_state = {
+                            "items": [
+                                item.as_dict()
+                                if isinstance(item, HighPaxWeightAlert)
+                                else dict(item)
+                                for item in high_pax_items
+                            ],
+                            "metadata": high_pax_metadata,
+                            "diagnostics": high_pax_diagnostics,
+                        }
 
                 _store_state(
                     {
@@ -1382,11 +1417,11 @@ with mel_tab:
                                         from_date=scheduled_start,
                                         to_date=scheduled_end,
                                         runway_threshold_ft=4500,
-                                        fetch_flights_fn=lambda _config, from_date, to_date: (
-                                            flights,
-                                            {
-                                                "from_date": from_date.isoformat(),
-                                                "to_date": to_date.isoformat(),
+                                        data=OcaRunData(
+                                            flights=flights,
+                                            metadata={
+                                                "from_date": scheduled_start.isoformat(),
+                                                "to_date": scheduled_end.isoformat(),
                                             },
                                         ),
                                     )
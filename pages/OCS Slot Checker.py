@@ -18,6 +18,7 @@ from flight_leg_utils import (
     safe_parse_dt,
 )
 from Home import configure_page, get_secret, password_gate, render_sidebar
+from ocs_slot_matching import WINDOWS_MIN, compare
 
 configure_page(page_title="OCS vs Fl3xx Slot Compliance")
 password_gate()
@@ -36,8 +37,6 @@ This tool normalizes both formats and compares them against Fl3xx with airport-s
 """)
 
 # ---------------- Config ----------------
-WINDOWS_MIN = {"CYYC": 30, "CYVR": 30, "CYYZ": 30, "CYUL": 15}
-REQUIREMENT_HORIZON_DAYS = {"CYYC": 30, "CYYZ": 30, "CYUL": 10, "CYVR": 3}
 FL3XX_FETCH_CHUNK_DAYS = 3
 MONTHS = {m: i for i, m in enumerate(
     ["JAN","FEB","MAR","APR","MAY","JUN","JUL","AUG","SEP","OCT","NOV","DEC"], 1)}
@@ -71,9 +70,6 @@ def with_datestr(df: pd.DataFrame, date_col="Date"):
     return out
 
 
-SLOT_AIRPORTS = set(WINDOWS_MIN.keys())
-
-
 def _prepare_dataframe_for_streamlit(df: pd.DataFrame) -> pd.DataFrame:
     """Return a display-safe dataframe for Streamlit Arrow serialization."""
     if df is None or df.empty:
@@ -576,25 +572,6 @@ def fetch_fl3xx_dataframe(start: date, end: date, token: Optional[str] = None) -
     return df, metadata
 
 # ---------------- Helpers ----------------
-def _is_within_requirement_horizon(ap: str, sched_dt: pd.Timestamp) -> bool:
-    """Return True when a leg is inside the airport requirement look-ahead window."""
-    if pd.isna(sched_dt):
-        return False
-    threshold_days = REQUIREMENT_HORIZON_DAYS.get(ap)
-    if threshold_days is None:
-        return True
-    today = pd.Timestamp.utcnow().date()
-    days_out = (sched_dt.date() - today).days
-    return days_out <= threshold_days
-
-def _is_tail_mismatch_suppressed(sched_dt: pd.Timestamp) -> bool:
-    """Suppress tail mismatches when the leg is farther out than tomorrow."""
-    if pd.isna(sched_dt):
-        return False
-    today = pd.Timestamp.utcnow().date()
-    days_out = (sched_dt.date() - today).days
-    return days_out > 1
-
 def show_table(df: pd.DataFrame, title: str, key: str):
     st.subheader(title)
     if df is None or df.empty:
@@ -1430,222 +1407,6 @@ def parse_fl3xx_file(file):
     cols = [c for c in keep if c in df.columns]
     return df[cols].copy()
 
-# ---------------- Comparison ----------------
-def compare(fl3xx_df: pd.DataFrame, ocs_df: pd.DataFrame):
-    # Split misaligned into tail vs time
-    results = {"Matched": [], "Missing": [], "MisalignedTail": [], "MisalignedTime": []}
-
-    # Build Fl3xx legs at slot airports
-    legs = []
-    for _, r in fl3xx_df.iterrows():
-        tail = str(r.get("Tail", "")).upper()
-        flight_type = r.get("Flight Type")
-        workflow = r.get("Workflow")
-        aircraft_type = str(r.get("Aircraft Type") or "").upper()
-        category = ""
-        ft_norm = _normalize_str(flight_type)
-        if ft_norm:
-            ft_upper = ft_norm.upper()
-            if ft_upper == "POS":
-                category = "OCS (POS)"
-            elif ft_upper == "PAX":
-                category = "PAX"
-            else:
-                category = ft_upper
-        else:
-            wf_norm = _normalize_str(workflow)
-            if wf_norm and "POS" in wf_norm.upper():
-                category = "OCS (POS)"
-
-        to_ap = r.get("To (ICAO)")
-        if isinstance(to_ap, str) and to_ap in SLOT_AIRPORTS and pd.notna(r.get("OnBlock")):
-            legs.append({"Flight": r.get("Booking"), "Tail": tail, "Airport": to_ap,
-                         "Movement": "ARR", "SchedDT": r.get("OnBlock"), "PAX/OCS": category,
-                         "OtherAirport": r.get("From (ICAO)"), "AircraftType": aircraft_type})
-        from_ap = r.get("From (ICAO)")
-        if isinstance(from_ap, str) and from_ap in SLOT_AIRPORTS and pd.notna(r.get("OffBlock")):
-            legs.append({"Flight": r.get("Booking"), "Tail": tail, "Airport": from_ap,
-                         "Movement": "DEP", "SchedDT": r.get("OffBlock"), "PAX/OCS": category,
-                         "OtherAirport": r.get("To (ICAO)"), "AircraftType": aircraft_type})
-
-    # De-duplicate legs so the same flight isn't processed twice
-    if legs:
-        legs_df = pd.DataFrame(legs)
-        legs_df["SchedDT"] = pd.to_datetime(legs_df["SchedDT"]).dt.floor("min")
-        legs_df["LegKey"] = (
-            legs_df["Flight"].astype(str) + "|" +
-            legs_df["Tail"].astype(str) + "|" +
-            legs_df["Airport"].astype(str) + "|" +
-            legs_df["Movement"].astype(str) + "|" +
-            legs_df["SchedDT"].astype(str)
-        )
-        legs_df = legs_df.drop_duplicates(subset="LegKey").drop(columns="LegKey")
-        legs = legs_df.to_dict("records")
-
-    def minutes_diff(a, b):
-        return abs(int((a - b).total_seconds() // 60))
-
-    # Prevent reusing a slot once it is matched to a leg
-    allocated_slot_refs = set()
-    # Optional: avoid suggesting the same slot for multiple legs
-    suggested_slot_refs = set()
-
-    for leg in legs:
-        ap, move, tail, sched_dt = leg["Airport"], leg["Movement"], leg["Tail"], leg["SchedDT"]
-
-        if not _is_within_requirement_horizon(ap, sched_dt):
-            continue
-
-        # Start with slots for same airport & movement that are NOT already allocated
-        cand = ocs_df[
-            (ocs_df["SlotAirport"] == ap) &
-            (ocs_df["Movement"] == move) &
-            (~ocs_df["SlotRef"].astype(str).isin(allocated_slot_refs))
-        ].copy()
-
-        if cand.empty:
-            results["Missing"].append({**leg, "Reason": "No slot for airport/movement"})
-            continue
-
-        # Build each slot's absolute datetime using the slot's own (day, month)
-        def slot_dt_for_row(row):
-            d, m = row["Date"]
-            hhmm = row["SlotTimeHHMM"]; hh = int(hhmm[:2]); mm = int(hhmm[2:])
-            return datetime(sched_dt.year, m, d, hh, mm)
-
-        cand["_SlotDT"] = cand.apply(slot_dt_for_row, axis=1)
-
-        # Keep slots on the same day or ±1 day of the leg (cross-midnight tolerance)
-        cand = cand[cand["_SlotDT"].apply(lambda d: abs((d.date() - sched_dt.date()).days) <= 1)]
-        if cand.empty:
-            results["Missing"].append({**leg, "Reason": "No slot (±1 day)"})
-            continue
-
-        window = WINDOWS_MIN.get(ap, 30)
-
-        # Compute best same-tail and best any-tail deltas
-        same_tail = cand[cand["Tail"] == tail]
-        same_tail_best, same_tail_row = None, None
-        if not same_tail.empty:
-            deltas_same = same_tail["_SlotDT"].apply(lambda dt: minutes_diff(sched_dt, dt))
-            same_idx = deltas_same.idxmin()
-            same_tail_best = int(deltas_same.loc[same_idx])
-            same_tail_row  = same_tail.loc[same_idx]
-
-        deltas_any = cand["_SlotDT"].apply(lambda dt: minutes_diff(sched_dt, dt))
-        any_idx = deltas_any.idxmin()
-        any_best = int(deltas_any.loc[any_idx])
-        any_row  = cand.loc[any_idx]
-
-        # Decision order:
-        # 1) same-tail within window → Matched (allocate; cannot be reused)
-        if same_tail_best is not None and same_tail_best <= window:
-            results["Matched"].append({
-                **leg,
-                "SlotTime": same_tail_row["SlotTimeHHMM"],
-                "DeltaMin": same_tail_best,
-                "SlotRef":  same_tail_row["SlotRef"]
-            })
-            allocated_slot_refs.add(str(same_tail_row["SlotRef"]))
-            continue
-
-        # 2) any-tail within window → Tail mismatch (do NOT allocate; wrong tail booked)
-        if any_best <= window:
-            if not _is_tail_mismatch_suppressed(sched_dt):
-                if str(any_row["SlotRef"]) not in suggested_slot_refs:
-                    results["MisalignedTail"].append({
-                        **leg,
-                        "NearestSlotTime": any_row["SlotTimeHHMM"],
-                        "DeltaMin": any_best,
-                        "WindowMin": window,
-                        "SlotTail": any_row["Tail"],
-                        "SlotRef":  any_row["SlotRef"]
-                    })
-                    suggested_slot_refs.add(str(any_row["SlotRef"]))
-            continue
-
-        # 3) same-tail exists but out of window → Time mismatch (do NOT allocate)
-        if same_tail_best is not None:
-            results["MisalignedTime"].append({
-                **leg,
-                "NearestSlotTime": same_tail_row["SlotTimeHHMM"],
-                "DeltaMin": same_tail_best,
-                "WindowMin": window,
-                "SlotRef":  same_tail_row["SlotRef"]
-            })
-            continue
-
-        # 4) otherwise → Missing
-        results["Missing"].append({**leg, "Reason": "No matching tail/time within window"})
-
-    # --- Slot-side evaluation (Stale)
-    # A slot is NOT stale if:
-    #   (a) there is ANY leg with same airport/movement/TAIL within ±1 day of the slot's date, or
-    #   (b) we've already used it (Matched) or suggested it (Tail mismatch), or
-    #   (c) the leg is outside the airport requirement look-ahead window, or
-    #   (d) it's a suppressed far-future wrong-tail case (farther out than tomorrow).
-    def has_leg_for_slot(slot_row):
-        ap   = slot_row["SlotAirport"]
-        mv   = slot_row["Movement"]
-        tail = slot_row["Tail"]
-        day, month = slot_row["Date"]
-
-        for lg in legs:
-            if lg["Airport"] != ap or lg["Movement"] != mv or lg["Tail"] != tail:
-                continue
-            # build slot date using leg's year (slots have no year)
-            slot_date = datetime(lg["SchedDT"].year, month, day).date()
-            if abs((slot_date - lg["SchedDT"].date()).days) <= 1:
-                return True
-        return False
-
-    def _outside_requirement_horizon(slot_row):
-        ap   = slot_row["SlotAirport"]
-        mv   = slot_row["Movement"]
-        day, month = slot_row["Date"]
-        for lg in legs:
-            if lg["Airport"] != ap or lg["Movement"] != mv:
-                continue
-            # slot date in the leg's year
-            slot_date = datetime(lg["SchedDT"].year, month, day).date()
-            # same day ±1 indicates this slot relates to that leg's operation
-            if abs((slot_date - lg["SchedDT"].date()).days) <= 1:
-                if not _is_within_requirement_horizon(ap, lg["SchedDT"]):
-                    return True
-        return False
-
-    def _suppressed_tail_mismatch(slot_row):
-        ap = slot_row["SlotAirport"]
-        mv = slot_row["Movement"]
-        tail = slot_row["Tail"]
-        day, month = slot_row["Date"]
-        for lg in legs:
-            if lg["Airport"] != ap or lg["Movement"] != mv:
-                continue
-            slot_date = datetime(lg["SchedDT"].year, month, day).date()
-            if abs((slot_date - lg["SchedDT"].date()).days) <= 1:
-                if lg["Tail"] != tail and _is_tail_mismatch_suppressed(lg["SchedDT"]):
-                    return True
-        return False
-
-    # Slots already used (Matched) or suggested (Tail mismatch) should not be stale
-    used_or_suggested = set()
-    used_or_suggested.update(allocated_slot_refs)
-    used_or_suggested.update(suggested_slot_refs)
-
-    stale_df = ocs_df[
-        (~ocs_df["SlotRef"].astype(str).isin(used_or_suggested)) &
-        (~ocs_df.apply(has_leg_for_slot, axis=1)) &
-        (~ocs_df.apply(_outside_requirement_horizon, axis=1)) &
-        (~ocs_df.apply(_suppressed_tail_mismatch, axis=1))
-    ].copy()
-
-
-
-
-    return results, stale_df
-
-
 # ---------------- UI ----------------
 fl3xx_files = st.file_uploader("Upload Fl3xx CSV(s)", type="csv", accept_multiple_files=True)
 ocs_files = st.file_uploader("Upload OCS CSV(s)", type="csv", accept_multiple_files=True)
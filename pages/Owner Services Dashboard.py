@@ -1,12 +1,10 @@
 import json
 import re
 from datetime import date, datetime, timedelta, timezone
-from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 import pandas as pd
-import requests
 import streamlit as st
 
 from fl3xx_api import (
@@ -26,7 +24,9 @@ from flight_leg_utils import (
 from Home import configure_page, password_gate, render_sidebar
 from owner_services import (
     OwnerServicesSummary,
+    SensitiveNoteScanner,
     extract_owner_service_audit_entries,
+    fetch_owner_service_payloads,
     format_owner_service_entries,
 )
 
@@ -280,19 +280,13 @@ def _get_sensitive_keywords() -> tuple[str, ...]:
     return tuple(keywords)
 
 
-@lru_cache(maxsize=32)
-def _compile_keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
-    if not keywords:
-        return re.compile(r"$^")
-    return re.compile(
-        r"\b(" + "|".join(re.escape(term) for term in keywords) + r")\b",
-        re.IGNORECASE,
-    )
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _sensitive_note_scanner(keywords: tuple[str, ...]) -> SensitiveNoteScanner:
+    return SensitiveNoteScanner(keywords, _SPECIAL_EVENT_PLANNING_TERMS)
 
 
-def _get_keyword_pattern() -> re.Pattern[str]:
-    keywords = _get_sensitive_keywords()
-    return _compile_keyword_pattern(keywords)
+def _get_note_scanner() -> SensitiveNoteScanner:
+    return _sensitive_note_scanner(_get_sensitive_keywords())
 
 
 def _add_sensitive_keyword(term: str) -> bool:
@@ -311,7 +305,6 @@ def _add_sensitive_keyword(term: str) -> bool:
         return False
 
     st.session_state[_SENSITIVE_TERMS_STATE_KEY] = updated_keywords
-    _compile_keyword_pattern.cache_clear()
     st.success(f"Added `{normalised}` to the monitored keyword list.")
     return True
 
@@ -334,7 +327,6 @@ def _remove_sensitive_keywords(terms: Sequence[str]) -> bool:
         return False
 
     st.session_state[_SENSITIVE_TERMS_STATE_KEY] = new_keywords
-    _compile_keyword_pattern.cache_clear()
     removed_display = ", ".join(f"`{term}`" for term in sorted(removal_targets))
     st.success(f"Stopped monitoring {removed_display}.")
     return True
@@ -590,56 +582,57 @@ def _build_dashboard_rows(
     services_cache: Dict[str, Optional[Any]] = {}
     missing_seen: set[tuple[str, str]] = set()
 
-    session = requests.Session()
-    try:
-        for leg in rows:
-            flight_id = leg.get("flightId") or leg.get("flight_id")
-            if not flight_id:
-                stats["missing_flight_ids"] += 1
-                key = (str(leg.get("tail") or "Unknown"), str(leg.get("leg_id") or ""))
-                if key not in missing_seen:
-                    missing_seen.add(key)
-                    warnings.append(
-                        f"Leg {key[1] or 'unknown'} ({key[0]}) is missing a flight identifier; "
-                        "skipping services lookup."
-                    )
-                continue
+    payloads = fetch_owner_service_payloads(
+        config,
+        flight_ids=[leg.get("flightId") or leg.get("flight_id") for leg in rows],
+        fetch_services_fn=fetch_flight_services,
+    )
 
-            flight_key = str(flight_id)
-            if flight_key not in services_cache:
-                stats["service_requests"] += 1
-                try:
-                    payload = fetch_flight_services(config, flight_key, session=session)
-                except Exception as exc:
-                    stats["service_failures"] += 1
-                    services_cache[flight_key] = None
-                    warnings.append(
-                        f"Failed to fetch services for flight {flight_key}: {exc}"
-                    )
-                else:
-                    services_cache[flight_key] = payload
-
-            payload = services_cache.get(flight_key)
-            services_available = payload is not None
-            if not services_available:
-                stats["legs_without_services_data"] += 1
-
-            summary = OwnerServicesSummary.from_payload(payload)
-            if summary.has_owner_services:
-                stats["legs_with_owner_services"] += 1
-                stats["owner_service_entries"] += len(summary.all_entries())
-            if summary.needs_attention:
-                stats["legs_needing_attention"] += 1
-
-            row = _build_display_row(
-                leg, summary, services_available=services_available
-            )
-            if row.get("Owner Services Status") == "No owner services":
-                continue
+    for leg in rows:
+        flight_id = leg.get("flightId") or leg.get("flight_id")
+        if not flight_id:
+            stats["missing_flight_ids"] += 1
+            key = (str(leg.get("tail") or "Unknown"), str(leg.get("leg_id") or ""))
+            if key not in missing_seen:
+                missing_seen.add(key)
+                warnings.append(
+                    f"Leg {key[1] or 'unknown'} ({key[0]}) is missing a flight identifier; "
+                    "skipping services lookup."
+                )
+            continue
+
+        flight_key = str(flight_id)
+        if flight_key not in services_cache:
+            stats["service_requests"] += 1
+            if flight_key in payloads.service_errors:
+                stats["service_failures"] += 1
+                services_cache[flight_key] = None
+                warnings.append(
+                    f"Failed to fetch services for flight {flight_key}: "
+                    f"{payloads.service_errors[flight_key]}"
+                )
+            else:
+                services_cache[flight_key] = payloads.services.get(flight_key)
+
+        payload = services_cache.get(flight_key)
+        services_available = payload is not None
+        if not services_available:
+            stats["legs_without_services_data"] += 1
+
+        summary = OwnerServicesSummary.from_payload(payload)
+        if summary.has_owner_services:
+            stats["legs_with_owner_services"] += 1
+            stats["owner_service_entries"] += len(summary.all_entries())
+        if summary.needs_attention:
+            stats["legs_needing_attention"] += 1
+
+        row = _build_display_row(
+            leg, summary, services_available=services_available
+        )
+        if row.get("Owner Services Status") == "No owner services":
+            continue
 
-            display_rows.append(row)
-    finally:
-        session.close()
+        display_rows.append(row)
 
     display_rows.sort(key=lambda row: row.get("_sort_key") or "")
     for row in display_rows:
@@ -662,60 +655,63 @@ def _build_audit_rows(
     }
 
     services_cache: Dict[str, Optional[Any]] = {}
-    session = requests.Session()
-    try:
-        for leg in rows:
-            flight_id = leg.get("flightId") or leg.get("flight_id")
-            if not flight_id:
-                warnings.append("Encountered a leg without flight ID; skipped service lookup.")
-                continue
+    payloads = fetch_owner_service_payloads(
+        config,
+        flight_ids=[leg.get("flightId") or leg.get("flight_id") for leg in rows],
+        fetch_services_fn=fetch_flight_services,
+    )
 
-            flight_key = str(flight_id)
-            if flight_key not in services_cache:
-                stats["service_requests"] += 1
-                try:
-                    services_cache[flight_key] = fetch_flight_services(
-                        config, flight_key, session=session
-                    )
-                except Exception as exc:
-                    stats["service_failures"] += 1
-                    services_cache[flight_key] = None
-                    warnings.append(f"Failed to fetch services for flight {flight_key}: {exc}")
+    for leg in rows:
+        flight_id = leg.get("flightId") or leg.get("flight_id")
+        if not flight_id:
+            warnings.append("Encountered a leg without flight ID; skipped service lookup.")
+            continue
 
-            payload = services_cache.get(flight_key)
-            entries = extract_owner_service_audit_entries(payload)
-            if not entries:
-                continue
+        flight_key = str(flight_id)
+        if flight_key not in services_cache:
+            stats["service_requests"] += 1
+            if flight_key in payloads.service_errors:
+                stats["service_failures"] += 1
+                services_cache[flight_key] = None
+                warnings.append(
+                    f"Failed to fetch services for flight {flight_key}: "
+                    f"{payloads.service_errors[flight_key]}"
+                )
+            else:
+                services_cache[flight_key] = payloads.services.get(flight_key)
+
+        payload = services_cache.get(flight_key)
+        entries = extract_owner_service_audit_entries(payload)
+        if not entries:
+            continue
+
+        departure_label, sort_key = _format_datetime(
+            leg.get("dep_time") or leg.get("departureTimeUtc")
+        )
+        account_label = _extract_account_label(leg)
+        booking_identifier = _extract_booking_identifier(leg) or "—"
+        tail = str(leg.get("tail") or "Unknown")
+        dep_ap = _extract_airport_code(leg.get("departure_airport") or leg.get("departureAirport"))
+        arr_ap = _extract_airport_code(leg.get("arrival_airport") or leg.get("arrivalAirport"))
 
-            departure_label, sort_key = _format_datetime(
-                leg.get("dep_time") or leg.get("departureTimeUtc")
+        for entry in entries:
+            stats["services_found"] += 1
+
+            report_rows.append(
+                {
+                    "_sort_key": sort_key or departure_label,
+                    "Departure (UTC)": departure_label,
+                    "Tail": tail,
+                    "Booking Identifier": booking_identifier,
+                    "Account Name": account_label,
+                    "Route": f"{dep_ap or '?'} → {arr_ap or '?'}",
+                    "Category": entry.category,
+                    "Direction": entry.direction,
+                    "Status": entry.status,
+                    "Service Description": entry.description,
+                    "Notes": entry.notes or "",
+                }
             )
-            account_label = _extract_account_label(leg)
-            booking_identifier = _extract_booking_identifier(leg) or "—"
-            tail = str(leg.get("tail") or "Unknown")
-            dep_ap = _extract_airport_code(leg.get("departure_airport") or leg.get("departureAirport"))
-            arr_ap = _extract_airport_code(leg.get("arrival_airport") or leg.get("arrivalAirport"))
-
-            for entry in entries:
-                stats["services_found"] += 1
-
-                report_rows.append(
-                    {
-                        "_sort_key": sort_key or departure_label,
-                        "Departure (UTC)": departure_label,
-                        "Tail": tail,
-                        "Booking Identifier": booking_identifier,
-                        "Account Name": account_label,
-                        "Route": f"{dep_ap or '?'} → {arr_ap or '?'}",
-                        "Category": entry.category,
-                        "Direction": entry.direction,
-                        "Status": entry.status,
-                        "Service Description": entry.description,
-                        "Notes": entry.notes or "",
-                    }
-                )
-    finally:
-        session.close()
 
     report_rows.sort(key=lambda row: row.get("_sort_key") or "")
     for row in report_rows:
@@ -869,23 +865,14 @@ def _extract_service_notes(payload: Any) -> List[tuple[str, str]]:
     return notes
 
 
-def _highlight_keywords(note_text: str) -> tuple[str, List[str]]:
-    normalized = note_text.replace("\r\n", "\n").replace("\r", "\n")
-    pattern = _get_keyword_pattern()
-    matches = sorted({match.group(0).lower() for match in pattern.finditer(normalized)})
-    return normalized, [match.upper() for match in matches]
-
-
-@lru_cache(maxsize=1)
-def _get_special_event_pattern() -> re.Pattern[str]:
-    return _compile_keyword_pattern(_SPECIAL_EVENT_PLANNING_TERMS)
+def _normalise_note_text(note_text: str) -> str:
+    return note_text.replace("\r\n", "\n").replace("\r", "\n")
 
 
-def _highlight_special_event_terms(note_text: str) -> List[str]:
-    normalized = note_text.replace("\r\n", "\n").replace("\r", "\n")
-    pattern = _get_special_event_pattern()
-    matches = sorted({match.group(0).lower() for match in pattern.finditer(normalized)})
-    return [match.upper() for match in matches]
+def _highlight_keywords(note_text: str) -> tuple[str, List[str]]:
+    normalized = _normalise_note_text(note_text)
+    matches = _get_note_scanner().keywords.find(normalized)
+    return normalized, [match.upper() for match in matches]
 
 
 def _build_sensitive_notes_rows(
@@ -911,6 +898,8 @@ def _build_sensitive_notes_rows(
         "legs_with_service_data": 0,
         "legs_with_service_notes": 0,
         "legs_missing_special_event_disclosure": 0,
+        "notes_rescanned": 0,
+        "notes_reused": 0,
     }
 
     detail_cache: Dict[str, Optional[Any]] = {}
@@ -918,161 +907,163 @@ def _build_sensitive_notes_rows(
     missing_flight_seen: set[tuple[str, str]] = set()
     analysed_legs: List[Dict[str, Any]] = []
 
-    session = requests.Session()
-    try:
-        for leg in rows:
-            note_blocks: List[tuple[str, str]] = []
+    payloads = fetch_owner_service_payloads(
+        config,
+        quote_ids=[_extract_quote_identifier(leg) for leg in rows],
+        flight_ids=[leg.get("flightId") or leg.get("flight_id") for leg in rows],
+        fetch_leg_details_fn=fetch_leg_details,
+        fetch_services_fn=fetch_flight_services,
+    )
+    scanner = _get_note_scanner()
 
-            row_note_blocks = _extract_row_note_blocks(leg)
-            if row_note_blocks:
-                note_blocks.extend(row_note_blocks)
+    for leg in rows:
+        note_blocks: List[tuple[str, str]] = []
 
-            quote_id = _extract_quote_identifier(leg)
-            payload: Optional[Any] = None
-            if not quote_id:
-                stats["missing_quote_ids"] += 1
-            else:
-                if quote_id not in detail_cache:
-                    stats["detail_requests"] += 1
-                    try:
-                        payload = fetch_leg_details(config, quote_id, session=session)
-                    except Exception as exc:
-                        stats["detail_failures"] += 1
-                        detail_cache[quote_id] = None
-                        warnings.append(
-                            f"Failed to fetch leg details for quote {quote_id}: {exc}"
-                        )
-                    else:
-                        detail_cache[quote_id] = payload
-                payload = detail_cache.get(quote_id)
-                if payload is not None:
-                    stats["legs_with_detail"] += 1
-                    detail_note_blocks = _extract_leg_note_blocks(payload)
-                    for label, note_text in detail_note_blocks:
-                        if label == "Leg notes":
-                            stats["legs_with_leg_notes"] += 1
-                        elif label == "Planning notes":
-                            stats["legs_with_planning_notes"] += 1
-                        note_blocks.append((label, note_text))
-
-            flight_id = leg.get("flightId") or leg.get("flight_id")
-            services_payload: Optional[Any] = None
-            if not flight_id:
-                stats["missing_flight_ids"] += 1
-                leg_identifier = (
-                    str(leg.get("leg_id") or leg.get("legId") or leg.get("id") or "")
-                )
-                warning_key = (str(leg.get("tail") or "Unknown"), leg_identifier)
-                if warning_key not in missing_flight_seen:
-                    missing_flight_seen.add(warning_key)
+        row_note_blocks = _extract_row_note_blocks(leg)
+        if row_note_blocks:
+            note_blocks.extend(row_note_blocks)
+
+        quote_id = _extract_quote_identifier(leg)
+        payload: Optional[Any] = None
+        if not quote_id:
+            stats["missing_quote_ids"] += 1
+        else:
+            if quote_id not in detail_cache:
+                stats["detail_requests"] += 1
+                if quote_id in payloads.leg_detail_errors:
+                    stats["detail_failures"] += 1
+                    detail_cache[quote_id] = None
                     warnings.append(
-                        f"Leg {leg_identifier or 'unknown'} ({warning_key[0]}) is missing a flight "
-                        "identifier; skipping owner services note lookup."
+                        f"Failed to fetch leg details for quote {quote_id}: "
+                        f"{payloads.leg_detail_errors[quote_id]}"
                     )
-            else:
-                flight_key = str(flight_id)
-                if flight_key not in services_cache:
-                    stats["service_requests"] += 1
-                    try:
-                        services_payload = fetch_flight_services(
-                            config, flight_key, session=session
-                        )
-                    except Exception as exc:
-                        stats["service_failures"] += 1
-                        services_cache[flight_key] = None
-                        warnings.append(
-                            f"Failed to fetch services for flight {flight_key}: {exc}"
-                        )
-                    else:
-                        services_cache[flight_key] = services_payload
-                services_payload = services_cache.get(flight_key)
-                if services_payload is not None:
-                    stats["legs_with_service_data"] += 1
-                    service_notes = _extract_service_notes(services_payload)
-                    if service_notes:
-                        stats["legs_with_service_notes"] += 1
-                        note_blocks.extend(service_notes)
-
-            if note_blocks:
-                deduped_note_blocks: List[tuple[str, str]] = []
-                seen_note_blocks: set[tuple[str, str]] = set()
-                for note_block in note_blocks:
-                    if note_block in seen_note_blocks:
-                        continue
-                    seen_note_blocks.add(note_block)
-                    deduped_note_blocks.append(note_block)
-                note_blocks = deduped_note_blocks
-
-            if note_blocks:
-                stats["legs_with_notes"] += 1
-
-            rendered_blocks = []
-            aggregated_matches: set[str] = set()
-            special_event_matches: set[str] = set()
-            for label, text in note_blocks:
-                rendered_text, matched_keywords = _highlight_keywords(text)
-                aggregated_matches.update(matched_keywords)
-                if label == "Planning notes":
-                    special_event_matches.update(_highlight_special_event_terms(text))
-                rendered_blocks.append(
-                    {
-                        "label": label,
-                        "highlighted": rendered_text,
-                        "raw": text,
-                    }
+                else:
+                    detail_cache[quote_id] = payloads.leg_details.get(quote_id)
+            payload = detail_cache.get(quote_id)
+            if payload is not None:
+                stats["legs_with_detail"] += 1
+                detail_note_blocks = _extract_leg_note_blocks(payload)
+                for label, note_text in detail_note_blocks:
+                    if label == "Leg notes":
+                        stats["legs_with_leg_notes"] += 1
+                    elif label == "Planning notes":
+                        stats["legs_with_planning_notes"] += 1
+                    note_blocks.append((label, note_text))
+
+        flight_id = leg.get("flightId") or leg.get("flight_id")
+        services_payload: Optional[Any] = None
+        if not flight_id:
+            stats["missing_flight_ids"] += 1
+            leg_identifier = (
+                str(leg.get("leg_id") or leg.get("legId") or leg.get("id") or "")
+            )
+            warning_key = (str(leg.get("tail") or "Unknown"), leg_identifier)
+            if warning_key not in missing_flight_seen:
+                missing_flight_seen.add(warning_key)
+                warnings.append(
+                    f"Leg {leg_identifier or 'unknown'} ({warning_key[0]}) is missing a flight "
+                    "identifier; skipping owner services note lookup."
                 )
+        else:
+            flight_key = str(flight_id)
+            if flight_key not in services_cache:
+                stats["service_requests"] += 1
+                if flight_key in payloads.service_errors:
+                    stats["service_failures"] += 1
+                    services_cache[flight_key] = None
+                    warnings.append(
+                        f"Failed to fetch services for flight {flight_key}: "
+                        f"{payloads.service_errors[flight_key]}"
+                    )
+                else:
+                    services_cache[flight_key] = payloads.services.get(flight_key)
+            services_payload = services_cache.get(flight_key)
+            if services_payload is not None:
+                stats["legs_with_service_data"] += 1
+                service_notes = _extract_service_notes(services_payload)
+                if service_notes:
+                    stats["legs_with_service_notes"] += 1
+                    note_blocks.extend(service_notes)
+
+        if note_blocks:
+            deduped_note_blocks: List[tuple[str, str]] = []
+            seen_note_blocks: set[tuple[str, str]] = set()
+            for note_block in note_blocks:
+                if note_block in seen_note_blocks:
+                    continue
+                seen_note_blocks.add(note_block)
+                deduped_note_blocks.append(note_block)
+            note_blocks = deduped_note_blocks
+
+        if note_blocks:
+            stats["legs_with_notes"] += 1
+
+        note_matches, rescanned = scanner.scan(
+            str(flight_id) if flight_id else None, note_blocks
+        )
+        stats["notes_rescanned" if rescanned else "notes_reused"] += 1
+        aggregated_matches = {match.upper() for match in note_matches.keywords}
+        special_event_matches = {
+            match.upper() for match in note_matches.special_event_terms
+        }
+        rendered_blocks = [
+            {
+                "label": label,
+                "highlighted": _normalise_note_text(text),
+                "raw": text,
+            }
+            for label, text in note_blocks
+        ]
 
-            if special_event_matches:
-                stats["legs_with_special_event_terms"] += 1
+        if special_event_matches:
+            stats["legs_with_special_event_terms"] += 1
 
-            departure_label, sort_key = _format_datetime(
-                leg.get("dep_time") or leg.get("departureTimeUtc")
-            )
+        departure_label, sort_key = _format_datetime(
+            leg.get("dep_time") or leg.get("departureTimeUtc")
+        )
 
-            tail = str(leg.get("tail") or "Unknown")
-            booking_identifier = _extract_booking_identifier(leg) or "—"
-            dep_ap = _extract_airport_code(
-                leg.get("departure_airport") or leg.get("departureAirport")
-            )
-            arr_ap = _extract_airport_code(
-                leg.get("arrival_airport") or leg.get("arrivalAirport")
-            )
-            route = f"{dep_ap or '?'} → {arr_ap or '?'}"
-            account_label = _extract_account_label(leg)
-
-            if not rendered_blocks:
-                notes_display = "—"
-                raw_notes = ""
-            elif len(rendered_blocks) == 1 and rendered_blocks[0]["label"] == "Leg notes":
-                notes_display = rendered_blocks[0]["highlighted"]
-                raw_notes = rendered_blocks[0]["raw"]
-            else:
-                sections = []
-                raw_sections = []
-                for block in rendered_blocks:
-                    sections.append(f"{block['label']}:\n{block['highlighted']}")
-                    raw_sections.append(f"{block['label']}: {block['raw']}")
-                notes_display = "\n\n".join(sections)
-                raw_notes = "\n\n---\n\n".join(raw_sections)
-
-            analysed_legs.append(
-                {
-                    "sort_key": sort_key or departure_label,
-                    "Departure (UTC)": departure_label,
-                    "Tail": tail,
-                    "Booking Identifier": booking_identifier,
-                    "Account Name": account_label,
-                    "_is_airsprint_inc": _is_airsprint_inc_account(account_label),
-                    "Route": route,
-                    "Matched Keywords": sorted(aggregated_matches),
-                    "Matched Special Event Terms": sorted(special_event_matches),
-                    "Notes": notes_display,
-                    "_notes_raw": raw_notes,
-                    "_airports": {code for code in (dep_ap, arr_ap) if code},
-                }
-            )
-    finally:
-        session.close()
+        tail = str(leg.get("tail") or "Unknown")
+        booking_identifier = _extract_booking_identifier(leg) or "—"
+        dep_ap = _extract_airport_code(
+            leg.get("departure_airport") or leg.get("departureAirport")
+        )
+        arr_ap = _extract_airport_code(
+            leg.get("arrival_airport") or leg.get("arrivalAirport")
+        )
+        route = f"{dep_ap or '?'} → {arr_ap or '?'}"
+        account_label = _extract_account_label(leg)
+
+        if not rendered_blocks:
+            notes_display = "—"
+            raw_notes = ""
+        elif len(rendered_blocks) == 1 and rendered_blocks[0]["label"] == "Leg notes":
+            notes_display = rendered_blocks[0]["highlighted"]
+            raw_notes = rendered_blocks[0]["raw"]
+        else:
+            sections = []
+            raw_sections = []
+            for block in rendered_blocks:
+                sections.append(f"{block['label']}:\n{block['highlighted']}")
+                raw_sections.append(f"{block['label']}: {block['raw']}")
+            notes_display = "\n\n".join(sections)
+            raw_notes = "\n\n---\n\n".join(raw_sections)
+
+        analysed_legs.append(
+            {
+                "sort_key": sort_key or departure_label,
+                "Departure (UTC)": departure_label,
+                "Tail": tail,
+                "Booking Identifier": booking_identifier,
+                "Account Name": account_label,
+                "_is_airsprint_inc": _is_airsprint_inc_account(account_label),
+                "Route": route,
+                "Matched Keywords": sorted(aggregated_matches),
+                "Matched Special Event Terms": sorted(special_event_matches),
+                "Notes": notes_display,
+                "_notes_raw": raw_notes,
+                "_airports": {code for code in (dep_ap, arr_ap) if code},
+            }
+        )
 
     special_event_airports = {
         airport
@@ -9,25 +9,17 @@ import streamlit as st
 from dateutil.relativedelta import relativedelta
 
 from Home import configure_page, password_gate, render_sidebar
-from fl3xx_api import (
-    PassengerDetail,
-    extract_passengers_from_pax_details,
-    fetch_flights,
-    fetch_flight_pax_details,
-    fetch_preflight,
-    backfill_missing_passenger_passports,
-)
+from fl3xx_api import PassengerDetail
 from flight_leg_utils import (
     FlightDataError,
     build_fl3xx_api_config,
-    filter_out_subcharter_rows,
     is_customs_leg,
     leg_countries,
     load_airport_metadata_lookup,
     normalize_country_code,
-    normalize_fl3xx_payload,
     safe_parse_dt,
 )
+from passport_service import PassportData, fetch_passport_data, load_passport_legs
 
 configure_page(page_title="Pax Passport Check")
 password_gate()
@@ -71,15 +63,6 @@ def _settings_digest(settings: Mapping[str, Any]) -> str:
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
-def _chunk_ranges(start: date, end_inclusive: date, *, span_days: int = CHUNK_DAYS) -> Iterable[Tuple[date, date]]:
-    end_exclusive = end_inclusive + timedelta(days=1)
-    current = start
-    while current < end_exclusive:
-        chunk_end = min(current + timedelta(days=span_days), end_exclusive)
-        yield current, chunk_end
-        current = chunk_end
-
-
 def _format_passenger_name(pax: PassengerDetail) -> str:
     parts = [
         part
@@ -89,14 +72,6 @@ def _format_passenger_name(pax: PassengerDetail) -> str:
     return " ".join(parts) if parts else "Unknown"
 
 
-def _needs_passport_backfill(pax: PassengerDetail) -> bool:
-    return not (
-        pax.document_number
-        and pax.document_issue_country_iso3
-        and pax.document_expiration is not None
-    )
-
-
 def _format_display_date(value: date) -> str:
     return value.strftime("%d %b %Y")
 
@@ -185,8 +160,8 @@ def _departs_us(leg: Mapping[str, Any], airport_lookup: Mapping[str, Mapping[str
     return bool(normalized and normalized in US_COUNTRY_CODES)
 
 
-@st.cache_data(show_spinner=True, ttl=300, hash_funcs={dict: lambda _: "0"})
-def _load_legs(
+@st.cache_data(show_spinner=False, ttl=300, hash_funcs={dict: lambda _: "0"})
+def _load_passport_legs(
     settings_digest: str,
     settings: Dict[str, Any],
     *,
@@ -195,53 +170,27 @@ def _load_legs(
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     _ = settings_digest  # participate in cache key without hashing secrets
     config = build_fl3xx_api_config(settings)
-    flights: list[dict[str, Any]] = []
-    chunk_meta: list[dict[str, Any]] = []
-
-    for chunk_start, chunk_end in _chunk_ranges(from_date, to_date):
-        chunk_flights, meta = fetch_flights(config, from_date=chunk_start, to_date=chunk_end)
-        flights.extend(chunk_flights)
-        chunk_meta.append(meta)
-
-    normalized_rows, normalization_stats = normalize_fl3xx_payload({"items": flights})
-    filtered_rows, subcharter_skipped = filter_out_subcharter_rows(normalized_rows)
-
-    metadata = {
-        "total_flights": len(flights),
-        "legs_after_filter": len(filtered_rows),
-        "subcharters_filtered": subcharter_skipped,
-        "chunks": chunk_meta,
-        "normalization": normalization_stats,
-    }
-    return filtered_rows, metadata
+    return load_passport_legs(config, from_date=from_date, to_date=to_date, chunk_days=CHUNK_DAYS)
 
 
-@st.cache_data(show_spinner=False, ttl=300, hash_funcs={dict: lambda _: "0"})
-def _load_passengers(
+def _load_passport_data(
     settings_digest: str,
     settings: Dict[str, Any],
-    flight_id: str,
-) -> List[PassengerDetail]:
-    _ = settings_digest
-    config = build_fl3xx_api_config(settings)
-    pax_payload = fetch_flight_pax_details(config, flight_id)
-    passengers = extract_passengers_from_pax_details(pax_payload)
-
-    if any(_needs_passport_backfill(pax) for pax in passengers):
-        passengers = backfill_missing_passenger_passports(config, passengers)
-
-    return passengers
-
-
-@st.cache_data(show_spinner=False, ttl=300, hash_funcs={dict: lambda _: "0"})
-def _load_preflight(
-    settings_digest: str,
-    settings: Dict[str, Any],
-    flight_id: str,
-) -> Mapping[str, Any]:
-    _ = settings_digest
+    *,
+    from_date: date,
+    to_date: date,
+) -> PassportData:
+    # Pax, preflight and passport payloads are cached per flight inside
+    # passport_service, so only the legs are cached here.
+    legs, metadata = _load_passport_legs(settings_digest, settings, from_date=from_date, to_date=to_date)
     config = build_fl3xx_api_config(settings)
-    return fetch_preflight(config, flight_id)
+    airport_lookup = load_airport_metadata_lookup()
+    flight_ids = [
+        leg.get("flightId") or leg.get("flight_id") or leg.get("id")
+        for leg in legs
+        if is_customs_leg(leg, airport_lookup) and _is_pax_leg(leg)
+    ]
+    return fetch_passport_data(config, flight_ids, legs=legs, metadata=metadata)
 
 
 def _extract_dep_time(leg: Mapping[str, Any]) -> Optional[datetime]:
@@ -314,8 +263,7 @@ def _is_customs_status_ok(status: Optional[str]) -> bool:
 def _collect_customs_statuses(
     legs: Iterable[Mapping[str, Any]],
     *,
-    settings_digest: str,
-    settings: Dict[str, Any],
+    data: PassportData,
     airport_lookup: Mapping[str, Mapping[str, Optional[Any]]],
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     rows: list[dict[str, Any]] = []
@@ -330,11 +278,11 @@ def _collect_customs_statuses(
             errors.append(f"Missing flight ID for {leg.get('tail', 'Unknown tail')} { _build_flight_label(leg)}")
             continue
 
-        try:
-            preflight_payload = _load_preflight(settings_digest, settings, str(flight_id))
-        except Exception as exc:  # pragma: no cover - runtime fetch failures
-            errors.append(f"Unable to load preflight for flight {flight_id}: {exc}")
+        preflight_error = data.preflight_errors.get(str(flight_id))
+        if preflight_error is not None:
+            errors.append(f"Unable to load preflight for flight {flight_id}: {preflight_error}")
             continue
+        preflight_payload = data.preflights.get(str(flight_id))
 
         dep_dt = _extract_dep_time(leg)
         dep_time_label = dep_dt.isoformat().replace("+00:00", "Z") if dep_dt else "Unknown"
@@ -364,8 +312,7 @@ def _collect_customs_statuses(
 def _collect_flagged_passports(
     legs: Iterable[Mapping[str, Any]],
     *,
-    settings_digest: str,
-    settings: Dict[str, Any],
+    data: PassportData,
     airport_lookup: Mapping[str, Mapping[str, Optional[Any]]],
     require_us_arrival: bool,
     require_us_departure: bool,
@@ -395,11 +342,11 @@ def _collect_flagged_passports(
             errors.append(f"Missing flight ID for {leg.get('tail', 'Unknown tail')} { _build_flight_label(leg)}")
             continue
 
-        try:
-            passengers = _load_passengers(settings_digest, settings, str(flight_id))
-        except Exception as exc:  # pragma: no cover - runtime fetch failures
-            errors.append(f"Unable to load passengers for flight {flight_id}: {exc}")
+        passenger_error = data.passenger_errors.get(str(flight_id))
+        if passenger_error is not None:
+            errors.append(f"Unable to load passengers for flight {flight_id}: {passenger_error}")
             continue
+        passengers = data.passengers.get(str(flight_id), [])
 
         dep_dt = _extract_dep_time(leg)
         dep_time_label = dep_dt.isoformat().replace("+00:00", "Z") if dep_dt else "Unknown"
@@ -686,13 +633,14 @@ with tabs[0]:
             st.error("The start date must be on or before the end date.")
         else:
             try:
-                with st.spinner("Fetching flights…"):
-                    legs, fetch_metadata = _load_legs(
+                with st.spinner("Fetching flights and passenger data…"):
+                    passport_data = _load_passport_data(
                         settings_digest,
                         dict(api_settings),
                         from_date=start_date,
                         to_date=end_date,
                     )
+                legs, fetch_metadata = passport_data.legs, passport_data.metadata
             except FlightDataError as exc:
                 st.error(str(exc))
             except Exception as exc:  # pragma: no cover - runtime fetch failures
@@ -702,8 +650,7 @@ with tabs[0]:
                 with st.spinner("Evaluating passport expirations…"):
                     expiring_passports, missing_passports, _, fetch_errors = _collect_flagged_passports(
                         legs,
-                        settings_digest=settings_digest,
-                        settings=dict(api_settings),
+                        data=passport_data,
                         airport_lookup=airport_lookup,
                         require_us_arrival=False,
                         require_us_departure=False,
@@ -809,13 +756,14 @@ with tabs[1]:
             st.error("The start date must be on or before the end date.")
         else:
             try:
-                with st.spinner("Fetching flights…"):
-                    legs, fetch_metadata = _load_legs(
+                with st.spinner("Fetching flights and passenger data…"):
+                    passport_data = _load_passport_data(
                         settings_digest,
                         dict(api_settings),
                         from_date=start_date,
                         to_date=end_date,
                     )
+                legs, fetch_metadata = passport_data.legs, passport_data.metadata
             except FlightDataError as exc:
                 st.error(str(exc))
             except Exception as exc:  # pragma: no cover - runtime fetch failures
@@ -841,8 +789,7 @@ with tabs[1]:
                     expiring_passports, missing_passports, missing_addresses, fetch_errors = (
                         _collect_flagged_passports(
                             legs,
-                            settings_digest=settings_digest,
-                            settings=dict(api_settings),
+                            data=passport_data,
                             airport_lookup=airport_lookup,
                             require_us_arrival=True,
                             require_us_departure=False,
@@ -855,8 +802,7 @@ with tabs[1]:
                 with st.spinner("Evaluating outbound US international flights…"):
                     outbound_expiring, outbound_missing, _, outbound_errors = _collect_flagged_passports(
                         legs,
-                        settings_digest=settings_digest,
-                        settings=dict(api_settings),
+                        data=passport_data,
                         airport_lookup=airport_lookup,
                         require_us_arrival=False,
                         require_us_departure=True,
@@ -946,13 +892,14 @@ with tabs[2]:
             st.error("The start date must be on or before the end date.")
         else:
             try:
-                with st.spinner("Fetching flights…"):
-                    legs, fetch_metadata = _load_legs(
+                with st.spinner("Fetching flights and passenger data…"):
+                    passport_data = _load_passport_data(
                         settings_digest,
                         dict(api_settings),
                         from_date=start_date,
                         to_date=end_date,
                     )
+                legs, fetch_metadata = passport_data.legs, passport_data.metadata
             except FlightDataError as exc:
                 st.error(str(exc))
             except Exception as exc:  # pragma: no cover - runtime fetch failures
@@ -967,8 +914,7 @@ with tabs[2]:
                 with st.spinner("Evaluating customs status…"):
                     customs_rows, errors = _collect_customs_statuses(
                         international_legs,
-                        settings_digest=settings_digest,
-                        settings=dict(api_settings),
+                        data=passport_data,
                         airport_lookup=airport_lookup,
                     )
                 st.session_state[CUSTOMS_STATUS_RESULTS_KEY] = {
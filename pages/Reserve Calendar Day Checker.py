@@ -3,8 +3,10 @@ import streamlit as st
 
 from flight_leg_utils import FlightDataError, build_fl3xx_api_config
 from reserve_calendar_checker import (
+    RESERVE_CALENDAR_YEARS,
     TARGET_DATES,
     run_reserve_day_check,
+    select_reserve_dates_for_year,
     select_reserve_dates_in_range,
     select_upcoming_reserve_dates,
 )
@@ -30,9 +32,12 @@ if not TARGET_DATES:
 
 date_mode = st.radio(
     "Reserve day selection",
-    options=("Upcoming count", "Date range"),
+    options=("Upcoming count", "Date range", "Reserve season"),
     horizontal=True,
-    help="Choose whether to check the next set of reserve days or all reserve days within a date range.",
+    help=(
+        "Choose whether to check the next set of reserve days, all reserve days within a date range, "
+        "or every reserve day configured for a year."
+    ),
 )
 
 if date_mode == "Upcoming count":
@@ -46,6 +51,15 @@ if date_mode == "Upcoming count":
         help="The checker evaluates the next set of configured reserve days in chronological order.",
     )
     upcoming_dates = select_upcoming_reserve_dates(limit=limit)
+elif date_mode == "Reserve season":
+    current_year = pd.Timestamp.now().year
+    years = list(RESERVE_CALENDAR_YEARS)
+    season = st.selectbox(
+        "Reserve calendar year",
+        options=years,
+        index=years.index(current_year) if current_year in years else len(years) - 1,
+    )
+    upcoming_dates = select_reserve_dates_for_year(season)
 else:
     min_date = min(TARGET_DATES)
     max_date = max(TARGET_DATES)
@@ -118,6 +132,15 @@ if not result.dates:
     st.info("No reserve days were evaluated.")
     st.stop()
 
+run_diagnostics = result.diagnostics
+if run_diagnostics:
+    timings = run_diagnostics.get("timings", {})
+    st.caption(
+        f"{len(result.dates)} reserve days from {run_diagnostics.get('flight_windows', 0)} flight request(s) · "
+        f"{run_diagnostics.get('planning_note_requests', 0)} planning notes fetched in "
+        f"{timings.get('planning_note_requests_s', 0.0):.1f}s · total {timings.get('total_s', 0.0):.1f}s"
+    )
+
 for date_result in result.dates:
     label = date_result.date.strftime("%Y-%m-%d")
     st.subheader(f"{label}")
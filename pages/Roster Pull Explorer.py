@@ -3,15 +3,15 @@ from __future__ import annotations
 from collections import Counter
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-import json
+from typing import Iterable, Iterator, Mapping
 
 import pandas as pd
 import streamlit as st
 
 from Home import configure_page, password_gate, render_sidebar
-from fl3xx_api import fetch_staff_roster
+from fl3xx_api import iter_staff_roster
 from flight_leg_utils import FlightDataError, build_fl3xx_api_config
-from roster_pull import parse_roster_payload
+from roster_pull import iter_crew_records, parse_roster_payload
 
 
 CREW_IDENTIFIER_ENTRY_TYPES = {"A"}
@@ -145,11 +145,15 @@ def infer_role_from_flights(user_internal_id: object, flights: list[dict]) -> st
     return Counter(roles).most_common(1)[0][0]
 
 
-@st.cache_data(show_spinner=False)
-def parse_fl3xx_roster(raw_text: str) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    payload = json.loads(raw_text)
-    staff = payload.get("staff") if isinstance(payload, dict) else []
-    staff = staff if isinstance(staff, list) else []
+RosterTables = tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]
+
+
+def build_roster_tables(staff: Iterable[Mapping[str, object]]) -> RosterTables:
+    """Normalize roster rows into crew, entry and flight tables.
+
+    ``staff`` is consumed one row at a time and only the table rows are kept,
+    so a streamed pull never has to be held whole.
+    """
 
     people_rows: list[dict] = []
     entry_rows: list[dict] = []
@@ -261,6 +265,12 @@ def parse_fl3xx_roster(raw_text: str) -> tuple[pd.DataFrame, pd.DataFrame, pd.Da
     return people_df, entries_df, flights_df
 
 
+@st.cache_data(show_spinner=False)
+def parse_fl3xx_roster(raw_text: str) -> tuple[int, RosterTables]:
+    staff_rows = parse_roster_payload(raw_text)
+    return len(staff_rows), build_roster_tables(staff_rows)
+
+
 def build_daily_schedule(entries_df: pd.DataFrame) -> pd.DataFrame:
     if entries_df.empty:
         return pd.DataFrame()
@@ -277,9 +287,10 @@ def build_daily_schedule(entries_df: pd.DataFrame) -> pd.DataFrame:
     return matrix.reset_index()
 
 
-def load_staff_rows(source: str) -> list[dict[str, object]]:
+def load_roster_tables(source: str) -> tuple[int, RosterTables]:
+    """Return ``(rows in pull, normalized tables)`` for the selected source."""
+
     raw_text = ""
-    staff_rows: list[dict[str, object]] = []
 
     if source == "Live FL3XX API":
         default_start = datetime.now(UTC).date() - timedelta(days=3)
@@ -311,34 +322,53 @@ def load_staff_rows(source: str) -> list[dict[str, object]]:
             st.stop()
 
         fetch_clicked = st.button("Fetch roster from FL3XX", type="primary")
-        cache_key = "roster_pull_explorer_live_rows"
+        cache_key = "roster_pull_explorer_live_tables"
 
         if fetch_clicked:
             with st.spinner("Fetching live roster from FL3XX..."):
                 try:
-                    staff_rows = fetch_staff_roster(
-                        config,
-                        from_time=from_time,
-                        to_time=to_time,
-                        filter_value="STAFF",
-                        include_flights=include_flights,
-                        drop_empty_rows=False,
+                    received = 0
+                    progress = st.empty()
+
+                    def _counted(rows: Iterable[dict[str, object]]) -> Iterator[dict[str, object]]:
+                        nonlocal received
+                        for row in rows:
+                            received += 1
+                            if received % 25 == 0:
+                                progress.caption(f"Received {received} roster rows so far...")
+                            yield row
+
+                    # Rows are reduced to compact crew records as they stream in, so
+                    # only the active crew's user/entries/flights are ever held.
+                    records = iter_crew_records(
+                        _counted(
+                            iter_staff_roster(
+                                config,
+                                from_time=from_time,
+                                to_time=to_time,
+                                filter_value="STAFF",
+                                include_flights=include_flights,
+                                drop_empty_rows=False,
+                            )
+                        )
                     )
-                    st.session_state[cache_key] = staff_rows
-                    st.success(f"Loaded {len(staff_rows)} roster rows from FL3XX.")
+                    tables = build_roster_tables(record.row for record in records)
+                    progress.empty()
+                    st.session_state[cache_key] = (received, tables)
+                    st.success(f"Loaded {received} roster rows from FL3XX.")
                 except Exception as exc:  # noqa: BLE001
                     st.error(f"Failed to fetch roster from FL3XX: {exc}")
                     st.stop()
         else:
-            cached_rows = st.session_state.get(cache_key)
-            if isinstance(cached_rows, list):
-                staff_rows = cached_rows
-                st.info(f"Using cached FL3XX pull with {len(staff_rows)} rows. Click fetch to refresh.")
+            cached = st.session_state.get(cache_key)
+            if isinstance(cached, tuple):
+                received, tables = cached
+                st.info(f"Using cached FL3XX pull with {received} rows. Click fetch to refresh.")
             else:
                 st.info("Set your window and click 'Fetch roster from FL3XX' to load live data.")
                 st.stop()
 
-        return staff_rows
+        return received, tables
 
     if source == "Repo file":
         default_repo_path = next((candidate for candidate in DEFAULT_PATH_CANDIDATES if Path(candidate).exists()), DEFAULT_PATH_CANDIDATES[0])
@@ -366,10 +396,13 @@ def load_staff_rows(source: str) -> list[dict[str, object]]:
         st.stop()
 
     try:
-        return parse_roster_payload(raw_text)
+        return parse_fl3xx_roster(raw_text)
     except ValueError as exc:
         st.error(str(exc))
         st.stop()
+    except Exception as exc:  # noqa: BLE001
+        st.error(f"Could not parse roster payload: {exc}")
+        st.stop()
 
 
 def render_page() -> None:
@@ -385,26 +418,15 @@ def render_page() -> None:
         st.header("Roster source")
         source = st.radio("Choose source", ["Live FL3XX API", "Repo file", "Upload .txt/.json", "Paste JSON"], index=0)
 
-    staff_rows = load_staff_rows(source)
-    if not staff_rows:
+    row_count, (people_df, entries_df, flights_df) = load_roster_tables(source)
+    if not row_count:
         st.info("No roster rows found for the selected source.")
         st.stop()
 
-    normalized_raw_text = json.dumps({"staff": staff_rows}, ensure_ascii=False)
-
-    try:
-        people_df, entries_df, flights_df = parse_fl3xx_roster(normalized_raw_text)
-    except json.JSONDecodeError:
-        st.error("Invalid JSON in roster payload. Please verify the source data.")
-        st.stop()
-    except Exception as exc:  # noqa: BLE001
-        st.error(f"Could not parse roster payload: {exc}")
-        st.stop()
-
     schedule_df = build_daily_schedule(entries_df)
 
     metric_cols = st.columns(4)
-    metric_cols[0].metric("Rows in pull", len(staff_rows))
+    metric_cols[0].metric("Rows in pull", row_count)
     metric_cols[1].metric("Included crewmembers", len(people_df))
     metric_cols[2].metric("Kept entries", len(entries_df))
     metric_cols[3].metric("Kept flights", len(flights_df))
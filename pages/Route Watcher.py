@@ -1,29 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Iterable, Mapping, Optional
+from typing import Optional
 
 import pandas as pd
 import requests
 import streamlit as st
 
 from Home import configure_page, get_secret, password_gate, render_sidebar
+from route_scanning import (
+    DEFAULT_WATCH_LIST,
+    ROUTE_TERMS,
+    RouteScanner,
+    extract_foreflight_flights,
+    parse_watch_lists,
+    scan_flights,
+)
 
 
 FORE_FLIGHT_BASE_URL = "https://public-api.foreflight.com/public/api/Flights/flights"
-ROUTE_TERMS = ("ROVMA", "KUGTC", "OWEBO", "ROZZL")
-
-
-@dataclass
-class RouteMatch:
-    flight_id: str
-    tail: str
-    departure_airport: str
-    arrival_airport: str
-    departure_time: Optional[datetime]
-    route: str
-    matched_terms: list[str]
 
 
 configure_page(page_title="Route Watcher")
@@ -34,142 +29,12 @@ st.title("🧭 Route Watcher")
 st.caption("Scan ForeFlight flight routes for watchlist terms and surface matching flights.")
 
 
-def _normalize_text(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    text = str(value).strip()
-    return text or None
-
-
-def _normalize_tail(value: Any) -> Optional[str]:
-    text = _normalize_text(value)
-    if not text:
-        return None
-    return text.replace("-", "").upper()
-
-
-def _normalize_airport(value: Any) -> Optional[str]:
-    if isinstance(value, Mapping):
-        for key in ("icao", "icaoCode", "icao_code", "identifier", "ident", "code", "id"):
-            if key in value and value[key]:
-                return _normalize_text(value[key])
-    return _normalize_text(value)
-
-
-def _parse_datetime(value: Any) -> Optional[datetime]:
-    if value is None:
-        return None
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        text = _normalize_text(value)
-        if not text:
-            return None
-        dt = pd.to_datetime(text, utc=True, errors="coerce")
-        if pd.isna(dt):
-            return None
-        if isinstance(dt, pd.Timestamp):
-            dt = dt.to_pydatetime()
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
 def _format_timestamp(value: Optional[datetime]) -> str:
     if not value:
         return "—"
     return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
 
-def _extract_first(container: Mapping[str, Any], *keys: str) -> Any:
-    for key in keys:
-        if key in container and container[key] not in (None, ""):
-            return container[key]
-    return None
-
-
-def _extract_foreflight_flights(payload: Any) -> list[Mapping[str, Any]]:
-    if isinstance(payload, Mapping):
-        flights = payload.get("flights")
-        if isinstance(flights, list):
-            return [flight for flight in flights if isinstance(flight, Mapping)]
-    if isinstance(payload, list):
-        return [flight for flight in payload if isinstance(flight, Mapping)]
-    return []
-
-
-def _extract_route_terms(route: str, terms: Iterable[str]) -> list[str]:
-    upper_route = route.upper()
-    matches = [term for term in terms if term.upper() in upper_route]
-    return sorted(set(matches))
-
-
-def _build_match_record(flight: Mapping[str, Any], terms: Iterable[str]) -> Optional[RouteMatch]:
-    route_raw = _normalize_text(flight.get("route"))
-    if not route_raw:
-        return None
-
-    matched_terms = _extract_route_terms(route_raw, terms)
-    if not matched_terms:
-        return None
-
-    flight_id = _normalize_text(_extract_first(flight, "flightId", "flight_id", "id")) or "—"
-    tail = _normalize_tail(
-        _extract_first(
-            flight,
-            "aircraftRegistration",
-            "registration",
-            "tail",
-            "tailNumber",
-            "aircraft",
-        )
-    )
-    if not tail and isinstance(flight.get("aircraft"), Mapping):
-        tail = _normalize_tail(_extract_first(flight["aircraft"], "registration", "tailNumber"))
-
-    departure_airport = _normalize_airport(
-        _extract_first(
-            flight,
-            "departure",
-            "departureAirport",
-            "origin",
-            "departureAirportCode",
-            "departureAirportIcao",
-        )
-    )
-    arrival_airport = _normalize_airport(
-        _extract_first(
-            flight,
-            "destination",
-            "destinationAirport",
-            "arrival",
-            "arrivalAirportCode",
-            "arrivalAirportIcao",
-        )
-    )
-
-    departure_time = _parse_datetime(
-        _extract_first(
-            flight,
-            "departureTimeUtc",
-            "departureTime",
-            "scheduledDepartureTime",
-            "scheduledDepartureTimeUtc",
-            "departureTimeZulu",
-        )
-    )
-
-    return RouteMatch(
-        flight_id=flight_id,
-        tail=tail or "—",
-        departure_airport=departure_airport or "—",
-        arrival_airport=arrival_airport or "—",
-        departure_time=departure_time,
-        route=route_raw,
-        matched_terms=matched_terms,
-    )
-
-
 today = date.today()
 date_range = st.date_input(
     "Date range",
@@ -177,7 +42,21 @@ date_range = st.date_input(
 )
 
 st.subheader("Watchlist terms")
-st.write(", ".join(ROUTE_TERMS))
+watch_list_text = st.text_area(
+    "Watch lists",
+    value=f"{DEFAULT_WATCH_LIST}: {', '.join(ROUTE_TERMS)}",
+    help=(
+        "One watch list per line as `Name: TERM, TERM`. `ROV*` matches any waypoint or airway "
+        "starting with ROV; a one- or two-letter prefix such as `Q*` or `RO*` matches airways only."
+    ),
+)
+watch_lists = parse_watch_lists(watch_list_text)
+scanner = RouteScanner(watch_lists)
+if scanner.airway_wildcards:
+    st.caption(
+        f"Airway-only wildcards: {', '.join(f'`{term}`' for term in scanner.airway_wildcards)}. "
+        "Use three or more letters before `*` to match waypoints too."
+    )
 
 fetch = st.button("Scan routes")
 
@@ -188,6 +67,10 @@ if fetch:
         st.error("ForeFlight API token is missing. Add it to Streamlit secrets under [foreflight_api].")
         st.stop()
 
+    if not scanner:
+        st.error("Add at least one watch term.")
+        st.stop()
+
     if isinstance(date_range, tuple) and len(date_range) == 2:
         start_date, end_date = date_range
     else:
@@ -209,16 +92,17 @@ if fetch:
         response.raise_for_status()
         foreflight_payload = response.json()
 
-    flights = _extract_foreflight_flights(foreflight_payload)
-    matches = [
-        record
-        for flight in flights
-        for record in [_build_match_record(flight, ROUTE_TERMS)]
-        if record is not None
-    ]
+    flights = extract_foreflight_flights(foreflight_payload)
+    scan = scan_flights(flights, scanner)
+    matches = scan.matches
 
     st.subheader("Results")
     st.caption(f"Scanned {len(flights)} flights between {start_date} and {end_date}.")
+    st.caption(
+        f"{scan.routes_scanned} distinct routes ({scan.tokens_scanned} tokens) checked against "
+        f"{len(scanner.watch_lists)} watch list(s) in {scan.total_seconds * 1000:.1f} ms "
+        f"(tokenize {scan.tokenize_seconds * 1000:.1f} ms, match {scan.match_seconds * 1000:.1f} ms)."
+    )
 
     if matches:
         rows = [
@@ -230,6 +114,7 @@ if fetch:
                 "Departure Time (UTC)": _format_timestamp(match.departure_time),
                 "Route": match.route,
                 "Matched Terms": ", ".join(match.matched_terms),
+                "Watch Lists": ", ".join(match.watch_lists),
             }
             for match in matches
         ]
@@ -9,6 +9,7 @@ import streamlit as st
 
 from fl3xx_api import Fl3xxApiConfig, fetch_flights, fetch_postflight
 from Home import configure_page, get_secret, password_gate, render_sidebar
+from short_turn_utils import compute_short_turns
 
 configure_page(page_title="Short Turns Highlighter")
 password_gate()
@@ -640,157 +641,6 @@ def load_uploaded(file) -> pd.DataFrame:
 
     return df.dropna(subset=["tail"]) if "tail" in df else df
 
-# ----------------------------
-# Core: Compute Turns
-# ----------------------------
-def compute_short_turns(
-    legs: pd.DataFrame,
-    threshold_min: int,
-    priority_threshold_min: int = PRIORITY_TURN_THRESHOLD_MIN,
-) -> pd.DataFrame:
-    if legs.empty:
-        return pd.DataFrame(columns=[
-            "tail",
-            "station",
-            "arr_leg_id",
-            "arr_onblock",
-            "dep_leg_id",
-            "dep_offblock",
-            "turn_min",
-            "required_threshold_min",
-            "priority_flag",
-            "arr_priority_label",
-            "dep_priority_label",
-        ])
-
-    # Ensure dtypes
-    legs = legs.copy()
-    legs["dep_offblock"] = legs["dep_offblock"].apply(parse_dt)
-    legs["arr_onblock"] = legs["arr_onblock"].apply(parse_dt)
-    if "flight_id" not in legs.columns:
-        legs["flight_id"] = legs.get("leg_id")
-    if "booking_code" not in legs.columns:
-        legs["booking_code"] = None
-    if "is_priority" not in legs.columns:
-        legs["is_priority"] = False
-    if "priority_label" not in legs.columns:
-        legs["priority_label"] = None
-
-    # We'll compute turns per tail per station: find next departure from the ARR station after ARR onblock
-    # Prepare two views: arrivals and departures
-    arrs = legs.dropna(subset=["arr_airport", "arr_onblock"]).copy()
-    arrs.rename(columns={"arr_airport": "station", "arr_onblock": "arr_onblock"}, inplace=True)
-
-    deps = legs.dropna(subset=["dep_airport", "dep_offblock"]).copy()
-    deps.rename(columns={"dep_airport": "station", "dep_offblock": "dep_offblock"}, inplace=True)
-
-    arrs = arrs[
-        [
-            "tail",
-            "station",
-            "arr_onblock",
-            "leg_id",
-            "flight_id",
-            "booking_code",
-            "is_priority",
-            "priority_label",
-        ]
-    ].rename(
-        columns={
-            "leg_id": "arr_leg_id",
-            "flight_id": "arr_flight_id",
-            "booking_code": "arr_booking_code",
-            "is_priority": "arr_is_priority",
-            "priority_label": "arr_priority_label",
-        }
-    )
-    deps = deps[
-        [
-            "tail",
-            "station",
-            "dep_offblock",
-            "leg_id",
-            "flight_id",
-            "booking_code",
-            "is_priority",
-            "priority_label",
-        ]
-    ].rename(
-        columns={
-            "leg_id": "dep_leg_id",
-            "flight_id": "dep_flight_id",
-            "booking_code": "dep_booking_code",
-            "is_priority": "dep_is_priority",
-            "priority_label": "dep_priority_label",
-        }
-    )
-
-    # Sort for asof merge (next departure after arrival)
-    arrs = arrs.sort_values(["tail", "station", "arr_onblock"]).reset_index(drop=True)
-    deps = deps.sort_values(["tail", "station", "dep_offblock"]).reset_index(drop=True)
-
-    # Merge by tail & station; for each arrival, find the FIRST departure strictly after arrival
-    short_turn_rows = []
-    # We'll iterate per (tail, station) to keep memory small
-    for (tail, station), arr_grp in arrs.groupby(["tail", "station"], sort=False):
-        dep_grp = deps[(deps["tail"] == tail) & (deps["station"] == station)]
-        if dep_grp.empty:
-            continue
-        dep_records = dep_grp.to_dict("records")
-        for _, r in arr_grp.iterrows():
-            arr_t = r["arr_onblock"]
-            # find first dep time > arr_t
-            next_dep = None
-            for dep_row in dep_records:
-                dep_t = dep_row.get("dep_offblock")
-                if pd.notna(arr_t) and pd.notna(dep_t) and dep_t > arr_t:
-                    next_dep = dep_row
-                    break
-            if next_dep is None:
-                continue
-            dep_t = next_dep.get("dep_offblock")
-            dep_id = next_dep.get("dep_leg_id")
-            turn_min = (dep_t - arr_t).total_seconds() / 60.0
-            arr_priority = bool(r.get("arr_is_priority"))
-            dep_priority = bool(next_dep.get("dep_is_priority"))
-            priority_flag = dep_priority
-            arr_code = r.get("arr_booking_code")
-            dep_code = next_dep.get("dep_booking_code")
-            same_booking_code = False
-            if arr_code and dep_code:
-                arr_code_str = str(arr_code).strip().upper()
-                dep_code_str = str(dep_code).strip().upper()
-                same_booking_code = bool(arr_code_str and arr_code_str == dep_code_str)
-
-            required_threshold = threshold_min
-            if priority_flag and not same_booking_code:
-                required_threshold = max(threshold_min, priority_threshold_min)
-            if turn_min < required_threshold:
-                short_turn_rows.append({
-                    "tail": tail,
-                    "station": station,
-                    "arr_leg_id": r.get("arr_leg_id"),
-                    "arr_flight_id": r.get("arr_flight_id"),
-                    "arr_onblock": arr_t,
-                    "dep_leg_id": dep_id,
-                    "dep_flight_id": next_dep.get("dep_flight_id"),
-                    "dep_offblock": dep_t,
-                    "turn_min": round(turn_min, 1),
-                    "required_threshold_min": required_threshold,
-                    "priority_flag": priority_flag,
-                    "arr_priority_label": r.get("arr_priority_label"),
-                    "dep_priority_label": next_dep.get("dep_priority_label"),
-                    "arr_booking_code": arr_code,
-                    "dep_booking_code": dep_code,
-                    "same_booking_code": same_booking_code,
-                })
-
-    out = pd.DataFrame(short_turn_rows)
-    if not out.empty:
-        out = out.sort_values(["turn_min", "tail", "station"]).reset_index(drop=True)
-    return out
-
-
 def _extract_checkin_values(payload: Any) -> list[Any]:
     """Return all values stored under a ``checkin`` key in the payload."""
 
@@ -17,7 +17,7 @@ st.title("🧾 Syndicate Audit")
 st.write(
     """
     This audit compares syndicate or partner notes in preflight booking notes against the
-    list of accounts flying on a selected day. It flags when a syndicate partner is also
+    list of accounts flying on each selected day. It flags when a syndicate partner is also
     flying on that same date.
     """
 )
@@ -49,16 +49,25 @@ def _pair_key(row: pd.Series) -> str:
     owner = _normalize_account(row["Owner Account"])
     partner_raw = row["Partner Account"] if row["Partner Account"] != "—" else row["Syndicate Partner"]
     partner = _normalize_account(str(partner_raw))
-    return "||".join(sorted([owner, partner]))
+    pair = "||".join(sorted([owner, partner]))
+    # Partners only conflict when flying on the same day.
+    return f"{row['Date']}||{pair}" if "Date" in row.index else pair
 
 
 tabs = st.tabs(["Daily audit", "Quote audit"])
 
 with tabs[0]:
-    selected_date = st.date_input(
-        "Audit date (Mountain Time)",
-        value=pd.Timestamp.now(tz=MOUNTAIN_TIME_ZONE).date(),
+    today = pd.Timestamp.now(tz=MOUNTAIN_TIME_ZONE).date()
+    selected_range = st.date_input(
+        "Audit dates (Mountain Time)",
+        value=(today, today),
+        help="Pick a single day or a range, such as a full month.",
     )
+    if isinstance(selected_range, (list, tuple)):
+        selected_date = selected_range[0]
+        selected_end = selected_range[-1]
+    else:
+        selected_date = selected_end = selected_range
 
     run_check = st.button("Run Syndicate Audit", type="primary")
 
@@ -70,7 +79,7 @@ with tabs[0]:
     else:
         if run_check or "syndicate_daily_result" not in st.session_state:
             with st.spinner("Fetching flights and syndicate booking notes..."):
-                result = run_syndicate_audit(config, target_date=selected_date)
+                result = run_syndicate_audit(config, target_date=selected_date, end_date=selected_end)
             st.session_state["syndicate_daily_result"] = result
         else:
             result = st.session_state["syndicate_daily_result"]
@@ -83,17 +92,32 @@ with tabs[0]:
         metrics[2].metric("Unique accounts", summary.get("unique_accounts", 0))
         metrics[3].metric("Syndicate matches", summary.get("syndicate_matches", 0))
 
+        timings = summary.get("timings") or {}
+        if timings:
+            st.caption(
+                f"{summary.get('preflight_requests', 0)} preflight requests in "
+                f"{timings.get('preflight_requests_s', 0.0):.1f}s · flights request "
+                f"{timings.get('flights_request_s', 0.0):.1f}s · partner matching "
+                f"{timings.get('partner_matching_s', 0.0) * 1000:.0f}ms · total {timings.get('total_s', 0.0):.1f}s"
+            )
+
         if result.warnings:
             for warning in result.warnings:
                 st.warning(warning)
 
+        multi_day = result.end_date is not None and result.end_date != result.date
+
         if not result.entries:
-            st.success("No syndicate or partner notes were detected for the selected day.")
+            st.success("No syndicate or partner notes were detected for the selected dates.")
         else:
             rows = []
             for entry in result.entries:
+                date_column = {}
+                if multi_day:
+                    date_column["Date"] = entry.flight_date.isoformat() if entry.flight_date else "—"
                 rows.append(
                     {
+                        **date_column,
                         "Owner Account": entry.owner_account,
                         "Syndicate Partner": entry.partner_account,
                         "Partner Flying": "Yes" if entry.partner_present else "No",
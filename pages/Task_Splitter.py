@@ -1,16 +1,12 @@
 import re
 from collections import Counter, defaultdict
 from collections.abc import Mapping
-from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta, timezone
-import math
-from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
-import pytz
 import streamlit as st
 from pandas.api.types import is_scalar
 from zoneinfo_compat import ZoneInfo
@@ -33,13 +29,13 @@ from flight_leg_utils import (
     compute_departure_window_bounds,
     fetch_legs_dataframe,
     format_utc,
-    is_canadian_country,
-    is_customs_leg,
-    leg_countries,
-    load_airport_metadata_lookup,
-    safe_parse_dt,
 )
 from Home import configure_page, get_secret, password_gate, render_sidebar
+from task_splitter import (
+    TailPackage,
+    assign_preference_weighted,
+    build_tail_packages,
+)
 
 configure_page(page_title="Night-Shift Tail Splitter")
 password_gate()
@@ -59,54 +55,6 @@ LOCAL_TZ = ZoneInfo("America/Edmonton")
 DEPARTURE_WINDOW_START_UTC = time(hour=8, tzinfo=UTC)
 DEPARTURE_WINDOW_END_UTC = time(hour=8, tzinfo=UTC)
 
-# ----------------------------
-# Types
-# ----------------------------
-@dataclass
-class TailPackage:
-    tail: str
-    legs: int
-    workload: float
-    first_local_dt: datetime  # first dep local datetime for the day
-    sample_legs: List[Dict[str, Any]]  # optional preview rows for UI (subset)
-    has_priority: bool = False
-    priority_labels: List[str] = field(default_factory=list)
-    customs_legs: int = 0
-
-
-# ----------------------------
-# Helpers
-# ----------------------------
-_TAIL_BASE_WORKLOAD = 2.5
-_BASE_LEG_WORKLOAD = 1.0
-_CUSTOMS_LEG_BONUS = 0.25
-
-def _to_local(dt: datetime, tz_name: str | None) -> datetime:
-    if tz_name:
-        try:
-            return dt.astimezone(ZoneInfo(tz_name))
-        except Exception:
-            pass
-    # Fallback: leave in original tz; if naive, assume UTC then convert to LOCAL_TZ so ordering is at least consistent
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=pytz.UTC)
-    return dt.astimezone(LOCAL_TZ)
-
-
-def _priority_label(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        text = value.strip()
-    else:
-        text = str(value).strip()
-    if not text:
-        return None
-    if "priority" in text.lower():
-        return text
-    return None
-
-
 def _normalize_person_name(value: Any) -> str:
     if value is None:
         return ""
@@ -230,34 +178,6 @@ def _crew_names_from_package(pkg: "TailPackage") -> Tuple[str, str]:
     return _condense_person_name(pic), _condense_person_name(sic)
 
 
-_TAIL_PLACEHOLDER_PREFIXES = ("ADD", "NEW", "TBD", "TEMP", "HOLD", "UNKNOWN", "UNK")
-_TAIL_PLACEHOLDER_VALUES = {"", "NA", "N/A", "NONE", "NULL", "-"}
-_TAIL_US_PATTERN = re.compile(r"^N[0-9]{1,5}[A-Z]{0,2}$")
-_TAIL_HYPHEN_PATTERN = re.compile(r"^[A-Z0-9]{1,2}-[A-Z0-9]{2,5}$")
-_TAIL_ALNUM_PATTERN = re.compile(r"^[A-Z0-9]{4,7}$")
-
-
-def _is_valid_tail_registration(value: Any) -> bool:
-    if not isinstance(value, str):
-        return False
-    candidate = value.strip().upper()
-    if not candidate or candidate in _TAIL_PLACEHOLDER_VALUES:
-        return False
-    if any(ch.isspace() for ch in candidate):
-        return False
-    if candidate.startswith(_TAIL_PLACEHOLDER_PREFIXES):
-        return False
-    if len(candidate) < 3:
-        return False
-    if _TAIL_US_PATTERN.fullmatch(candidate):
-        return True
-    if _TAIL_HYPHEN_PATTERN.fullmatch(candidate):
-        return True
-    if "-" not in candidate and not any(ch.isdigit() for ch in candidate):
-        return False
-    if _TAIL_ALNUM_PATTERN.fullmatch(candidate):
-        return True
-    return False
 
 
 def _default_target_date() -> date:
@@ -444,870 +364,6 @@ def fetch_next_day_legs(
     return df, metadata, crew_summary
 
 
-def build_tail_packages(df: pd.DataFrame, target_date: date) -> Tuple[List[TailPackage], Set[str]]:
-    if df.empty:
-        return [], set()
-    # Ensure required columns
-    required = {"tail", "leg_id", "dep_time"}
-    missing = required - set(df.columns)
-    if missing:
-        raise ValueError(f"Missing required columns in data: {missing}")
-
-    df = df.copy()
-    df["tail"] = df["tail"].astype(str)
-
-    invalid_tails: Set[str] = set()
-
-    def _valid_tail(value: Any) -> bool:
-        tail_str = str(value)
-        is_valid = _is_valid_tail_registration(tail_str)
-        if not is_valid:
-            invalid_tails.add(tail_str.strip())
-        return is_valid
-
-    df = df[df["tail"].map(_valid_tail)]
-    if df.empty:
-        return [], invalid_tails
-
-    # Derive local first departure per tail for the day
-    def first_local_for_tail(g: pd.DataFrame) -> datetime:
-        # Filter legs that depart on target_date in their *local* timezone
-        times_local: List[datetime] = []
-        for _, row in g.iterrows():
-            dt = safe_parse_dt(str(row["dep_time"]))
-            tz_name = str(row.get("dep_tz", "")) or None
-            dt_local = _to_local(dt, tz_name)
-            if dt_local.date() == target_date:
-                times_local.append(dt_local)
-        if not times_local:
-            # If none match exactly by local date, fall back to min local
-            for _, row in g.iterrows():
-                dt = safe_parse_dt(str(row["dep_time"]))
-                tz_name = str(row.get("dep_tz", "")) or None
-                times_local.append(_to_local(dt, tz_name))
-        return min(times_local)
-
-    airport_lookup = load_airport_metadata_lookup()
-
-    packages: List[TailPackage] = []
-    for tail, g in df.groupby("tail", sort=False):
-        # Limit to target_date legs (by local date)
-        legs_rows: List[Dict[str, Any]] = []
-        all_rows: List[Dict[str, Any]] = []
-        priority_values: Set[str] = set()
-        for _, row in g.iterrows():
-            row_dict = row.to_dict()
-            dep_country, arr_country = leg_countries(row_dict, airport_lookup)
-            row_dict["departure_country"] = dep_country
-            row_dict["arrival_country"] = arr_country
-            is_customs = is_customs_leg(row_dict, airport_lookup)
-            row_dict["is_customs_leg"] = is_customs
-            row_dict["is_customs_workload_leg"] = bool(
-                is_customs and arr_country and not is_canadian_country(arr_country)
-            )
-            all_rows.append(row_dict)
-            priority_label = _priority_label(row_dict.get("workflowCustomName"))
-            if priority_label:
-                priority_values.add(priority_label)
-            dt = safe_parse_dt(str(row_dict["dep_time"]))
-            tz_name = str(row_dict.get("dep_tz", "")) or None
-            dt_local = _to_local(dt, tz_name)
-            if dt_local.date() == target_date:
-                legs_rows.append(row_dict)
-        # If none strictly on target_date by local, treat all as same-day package
-        if not legs_rows:
-            legs_rows = all_rows
-        first_dt = first_local_for_tail(pd.DataFrame(legs_rows))
-        customs_count = sum(
-            1 for leg in legs_rows if leg.get("is_customs_workload_leg")
-        )
-        workload = _TAIL_BASE_WORKLOAD
-        for leg in legs_rows:
-            workload += _BASE_LEG_WORKLOAD
-            if leg.get("is_customs_workload_leg"):
-                workload += _CUSTOMS_LEG_BONUS
-        packages.append(
-            TailPackage(
-                tail=str(tail),
-                legs=len(legs_rows),
-                workload=workload,
-                first_local_dt=first_dt,
-                sample_legs=legs_rows[:3],
-                has_priority=bool(priority_values),
-                priority_labels=sorted(priority_values),
-                customs_legs=customs_count,
-            )
-        )
-    return packages, invalid_tails
-
-
-def assign_round_robin_by_first(packages: List[TailPackage], labels: List[str]) -> Dict[str, List[TailPackage]]:
-    packages_sorted = sorted(packages, key=lambda p: p.first_local_dt)
-    buckets: Dict[str, List[TailPackage]] = {lab: [] for lab in labels}
-    for i, pkg in enumerate(packages_sorted):
-        label = labels[i % len(labels)]
-        buckets[label].append(pkg)
-    return buckets
-
-
-def assign_balanced_by_legs(packages: List[TailPackage], labels: List[str]) -> Dict[str, List[TailPackage]]:
-    # Greedy bin-pack: biggest packages first → assign to bucket with lowest total legs
-    buckets: Dict[str, List[TailPackage]] = {lab: [] for lab in labels}
-    totals = {lab: 0.0 for lab in labels}
-
-    def _workload(pkg: TailPackage) -> float:
-        return pkg.workload if pkg.workload else float(pkg.legs)
-
-    for pkg in sorted(packages, key=lambda p: _workload(p), reverse=True):
-        # choose label with smallest total, then smallest count, then order
-        label = sorted(
-            labels,
-            key=lambda lab: (totals[lab], len(buckets[lab]), labels.index(lab)),
-        )[0]
-        buckets[label].append(pkg)
-        totals[label] += _workload(pkg)
-    return buckets
-
-
-def _offset_hours(dt: datetime) -> float:
-    offset = dt.utcoffset()
-    if offset is None:
-        return 0.0
-    return offset.total_seconds() / 3600
-
-
-_EASTERLY_OFFSET_MIN = -5.5
-_EASTERLY_OFFSET_MAX = -2.0
-_WESTERLY_OFFSET_THRESHOLD = -6.75
-_CENTRAL_OR_LATER_THRESHOLD = -6.0
-
-
-def _is_easterly_offset(offset: float) -> bool:
-    return _EASTERLY_OFFSET_MIN <= offset <= _EASTERLY_OFFSET_MAX
-
-
-def _is_westerly_offset(offset: float) -> bool:
-    return offset <= _WESTERLY_OFFSET_THRESHOLD
-
-
-def _soft_shift_distance_penalty(
-    pkg_offset: float,
-    *,
-    preferred_idx: int,
-    target_idx: int,
-    labels_count: int,
-    force_easterly_first: bool,
-) -> float:
-    if labels_count <= 1:
-        return 0.0
-
-    later_distance = max(0, target_idx - preferred_idx)
-    earlier_distance = max(0, preferred_idx - target_idx)
-    penalty = 0.0
-
-    if force_easterly_first and _is_easterly_offset(pkg_offset) and later_distance:
-        penalty += later_distance * 1.5
-        if target_idx == labels_count - 1:
-            penalty += max(2.0, float(labels_count - 1))
-
-    if _is_westerly_offset(pkg_offset) and earlier_distance:
-        penalty += earlier_distance * 0.75
-
-    return penalty
-
-
-def _coarse_preferred_index(offset: float, last_idx: int) -> int:
-    return 0 if offset >= _CENTRAL_OR_LATER_THRESHOLD else last_idx
-
-
-def assign_preference_weighted(
-    packages: List[TailPackage],
-    labels: List[str],
-    label_weights: Optional[Sequence[float]] = None,
-    force_westerly_last: bool = True,
-    force_easterly_first: bool = False,
-) -> Dict[str, List[TailPackage]]:
-    if not packages or not labels:
-        return {lab: [] for lab in labels}
-
-    offsets = [_offset_hours(pkg.first_local_dt) for pkg in packages]
-    min_off, max_off = min(offsets), max(offsets)
-    span = max_off - min_off
-
-    def _workload(pkg: TailPackage) -> float:
-        return pkg.workload if pkg.workload else float(pkg.legs)
-
-    total_workload = sum(_workload(pkg) for pkg in packages)
-
-    weights: Dict[str, float] = {}
-    for idx, lab in enumerate(labels):
-        weight = 1.0
-        if label_weights and idx < len(label_weights):
-            try:
-                weight = float(label_weights[idx])
-            except (TypeError, ValueError):
-                weight = 1.0
-        if weight <= 0:
-            weight = 1.0
-        weights[lab] = weight
-
-    total_weight = sum(weights.values()) or float(len(labels))
-    baseline_target = total_workload / total_weight if total_weight else 0.0
-    workload_targets = {lab: baseline_target * weights[lab] for lab in labels}
-    # Tail count balance should follow the same workload weighting so reduced
-    # workload shifts also receive proportionally fewer tails.
-    count_targets = {
-        lab: (len(packages) * (weights[lab] / total_weight)) if total_weight else 0.0
-        for lab in labels
-    }
-
-    # Use a tighter tolerance (10% of the even-share workload) so we aggressively
-    # balance the workload while still respecting the east↔west preference ordering.
-    tolerance = max(0.25, round(baseline_target * 0.10, 2)) if baseline_target else 0.25
-
-    if len(labels) == 1:
-        tz_targets = [max_off]
-    elif span == 0:
-        tz_targets = [max_off for _ in labels]
-    else:
-        step = span / (len(labels) - 1)
-        tz_targets = [max_off - step * idx for idx in range(len(labels))]
-
-    # Stage 1: assign each package to the shift that best matches its timezone
-    # preference. We start by grouping everything strictly east→early and
-    # west→late before considering workload balancing.
-    buckets_by_index: List[List[TailPackage]] = [[] for _ in labels]
-    totals_by_index: List[float] = [0.0 for _ in labels]
-    counts_by_index: List[int] = [0 for _ in labels]
-    preferred_index: Dict[str, int] = {}
-    pkg_offsets: Dict[str, float] = {}
-    forced_late: Set[str] = set()
-    packages_sorted = sorted(packages, key=lambda p: (p.first_local_dt, p.tail))
-
-    for pkg in packages_sorted:
-        pkg_offset = _offset_hours(pkg.first_local_dt)
-        pkg_offsets[pkg.tail] = pkg_offset
-        if len(labels) == 1:
-            idx = 0
-        else:
-            idx = _coarse_preferred_index(pkg_offset, len(labels) - 1)
-        preferred_idx = idx
-        assign_idx = idx
-        if (
-            force_easterly_first
-            and len(labels) > 1
-            and _is_easterly_offset(pkg_offset)
-        ):
-            preferred_idx = 0
-            assign_idx = 0
-        if (
-            force_westerly_last
-            and len(labels) > 1
-            and _is_westerly_offset(pkg_offset)
-        ):
-            preferred_idx = len(labels) - 1
-            assign_idx = len(labels) - 1
-            forced_late.add(pkg.tail)
-        preferred_index[pkg.tail] = preferred_idx
-        buckets_by_index[assign_idx].append(pkg)
-        totals_by_index[assign_idx] += _workload(pkg)
-        counts_by_index[assign_idx] += 1
-
-    def _assign_via_search() -> Optional[Dict[str, List[TailPackage]]]:
-        """
-        Explore a globally optimal assignment using a dynamic-programming search
-        when the number of packages is modest. This avoids the local optima that
-        the greedy balancing pass can fall into (e.g. leaving the later shifts
-        empty) while still respecting timezone preferences and per-shift
-        workload targets.
-        """
-
-        max_packages_for_search = 14
-        if len(packages_sorted) > max_packages_for_search or not packages_sorted:
-            return None
-
-        scale = 4  # workload granularity (base workload increments are 0.25)
-        workloads_int = [
-            max(1, int(round(_workload(pkg) * scale))) for pkg in packages_sorted
-        ]
-        targets_int = [
-            int(round(workload_targets[label] * scale)) for label in labels
-        ]
-
-        expected_counts: List[float] = [count_targets[label] for label in labels]
-
-        tz_penalties: List[List[int]] = []
-        for pkg in packages_sorted:
-            pref_idx = preferred_index.get(pkg.tail, 0)
-            pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-            is_easterly = _is_easterly_offset(pkg_offset)
-            is_westerly = _is_westerly_offset(pkg_offset)
-            penalty_row: List[int] = []
-            for idx, label in enumerate(labels):
-                tz_target = tz_targets[idx]
-                hours_diff = abs(pkg_offsets.get(pkg.tail, tz_target) - tz_target)
-                distance = abs(idx - pref_idx)
-                later_distance = max(0, idx - pref_idx)
-                earlier_distance = max(0, pref_idx - idx)
-                penalty = int(round(hours_diff * scale)) * 2
-                penalty += distance * distance * scale
-                later_penalty = later_distance * scale
-                if is_easterly:
-                    later_penalty *= 1.5
-                    if force_easterly_first and idx == len(labels) - 1:
-                        later_penalty += scale * max(2, len(labels) - 1)
-                penalty += int(round(later_penalty))
-                earlier_penalty = earlier_distance * scale
-                if is_westerly:
-                    earlier_penalty *= 0.75
-                if force_westerly_last and pkg.tail in forced_late:
-                    earlier_penalty *= 0.5
-                penalty += int(round(earlier_penalty))
-                if pkg.has_priority and idx > pref_idx:
-                    penalty += scale * 6
-                penalty_row.append(penalty)
-            tz_penalties.append(penalty_row)
-
-        choice_cache: Dict[Tuple[int, Tuple[int, ...], Tuple[int, ...]], int] = {}
-
-        @lru_cache(None)
-        def _solve(
-            i: int, totals: Tuple[int, ...], counts: Tuple[int, ...]
-        ) -> float:
-            if i == len(packages_sorted):
-                cost = 0.0
-                for idx in range(len(labels)):
-                    count_diff = counts[idx] - expected_counts[idx]
-                    cost += count_diff * count_diff * 120.0
-                    cost += abs(count_diff) * 40.0
-                    if expected_counts[idx] > 0.0 and counts[idx] == 0:
-                        cost += scale * 50
-                    diff = totals[idx] - targets_int[idx]
-                    cost += diff * diff * 2.0
-                    cost += abs(diff) * 1.5
-                return cost
-
-            best_cost = math.inf
-            best_choice = 0
-            for idx in range(len(labels)):
-                new_totals = list(totals)
-                new_totals[idx] += workloads_int[i]
-                new_counts = list(counts)
-                new_counts[idx] += 1
-                new_totals_tuple = tuple(new_totals)
-                new_counts_tuple = tuple(new_counts)
-                cost = tz_penalties[i][idx] + _solve(
-                    i + 1, new_totals_tuple, new_counts_tuple
-                )
-                if cost < best_cost:
-                    best_cost = cost
-                    best_choice = idx
-            choice_cache[(i, totals, counts)] = best_choice
-            return best_cost
-
-        try:
-            zeros = tuple(0 for _ in labels)
-            _solve(0, zeros, zeros)
-        except RecursionError:
-            return None
-
-        assignment: Dict[str, List[TailPackage]] = {label: [] for label in labels}
-        totals_progress = [0 for _ in labels]
-        counts_progress = [0 for _ in labels]
-        for i, pkg in enumerate(packages_sorted):
-            state_totals = tuple(totals_progress)
-            state_counts = tuple(counts_progress)
-            idx = choice_cache.get((i, state_totals, state_counts))
-            if idx is None:
-                return None
-            assignment[labels[idx]].append(pkg)
-            totals_progress[idx] += workloads_int[i]
-            counts_progress[idx] += 1
-
-        for label in labels:
-            assignment[label] = sorted(
-                assignment[label], key=lambda p: (p.first_local_dt, p.tail)
-            )
-
-        return assignment
-
-    optimized_assignment = _assign_via_search()
-    def _ensure_non_empty_shifts(
-        assignment: Dict[str, List[TailPackage]],
-    ) -> Dict[str, List[TailPackage]]:
-        if len(packages_sorted) < len(labels):
-            return assignment
-
-        empty_indices = [
-            idx for idx, label in enumerate(labels) if not assignment.get(label)
-        ]
-        if not empty_indices:
-            return assignment
-
-        for empty_idx in empty_indices:
-            best_donor_idx: Optional[int] = None
-            best_pkg: Optional[TailPackage] = None
-            best_score: Optional[Tuple[float, float, float, float]] = None
-
-            for donor_idx, label in enumerate(labels):
-                bucket = assignment.get(label, [])
-                if len(bucket) <= 1:
-                    continue
-                for pkg in bucket:
-                    pref_idx = preferred_index.get(pkg.tail, donor_idx)
-                    pref_distance = abs(empty_idx - pref_idx)
-                    pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-                    tz_penalty = abs(
-                        pkg_offsets.get(pkg.tail, tz_targets[empty_idx])
-                        - tz_targets[empty_idx]
-                    )
-                    shift_penalty = _soft_shift_distance_penalty(
-                        pkg_offset,
-                        preferred_idx=pref_idx,
-                        target_idx=empty_idx,
-                        labels_count=len(labels),
-                        force_easterly_first=force_easterly_first,
-                    )
-                    score = (pref_distance, shift_penalty, tz_penalty, _workload(pkg))
-                    if best_score is None or score < best_score:
-                        best_score = score
-                        best_pkg = pkg
-                        best_donor_idx = donor_idx
-
-            if best_pkg is None or best_donor_idx is None:
-                continue
-
-            assignment[labels[best_donor_idx]].remove(best_pkg)
-            assignment[labels[empty_idx]].append(best_pkg)
-            assignment[labels[empty_idx]] = sorted(
-                assignment[labels[empty_idx]],
-                key=lambda p: (p.first_local_dt, p.tail),
-            )
-            assignment[labels[best_donor_idx]] = sorted(
-                assignment[labels[best_donor_idx]],
-                key=lambda p: (p.first_local_dt, p.tail),
-            )
-
-        return assignment
-
-    def _shift_assignment_cost(pkg: TailPackage, shift_idx: int) -> float:
-        pref_idx = preferred_index.get(pkg.tail, shift_idx)
-        pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-        tz_penalty = abs(pkg_offsets.get(pkg.tail, tz_targets[shift_idx]) - tz_targets[shift_idx])
-        distance = abs(shift_idx - pref_idx)
-        return (
-            float(distance)
-            + _soft_shift_distance_penalty(
-                pkg_offset,
-                preferred_idx=pref_idx,
-                target_idx=shift_idx,
-                labels_count=len(labels),
-                force_easterly_first=force_easterly_first,
-            )
-            + tz_penalty
-        )
-
-    def _reduce_timezone_crossovers(
-        assignment: Dict[str, List[TailPackage]],
-    ) -> Dict[str, List[TailPackage]]:
-        if len(labels) <= 1:
-            return assignment
-
-        totals = [sum(_workload(pkg) for pkg in assignment.get(label, [])) for label in labels]
-        iterations_left = len(packages) * max(1, len(labels) - 1) * 3
-
-        while iterations_left > 0:
-            iterations_left -= 1
-            best_swap: Optional[
-                Tuple[Tuple[float, float, float, float], int, int, TailPackage, TailPackage]
-            ] = None
-
-            for early_idx in range(len(labels) - 1):
-                early_bucket = assignment.get(labels[early_idx], [])
-                if not early_bucket:
-                    continue
-                for late_idx in range(early_idx + 1, len(labels)):
-                    late_bucket = assignment.get(labels[late_idx], [])
-                    if not late_bucket:
-                        continue
-
-                    for early_pkg in early_bucket:
-                        for late_pkg in late_bucket:
-                            current_cost = _shift_assignment_cost(early_pkg, early_idx) + _shift_assignment_cost(
-                                late_pkg, late_idx
-                            )
-                            swapped_cost = _shift_assignment_cost(early_pkg, late_idx) + _shift_assignment_cost(
-                                late_pkg, early_idx
-                            )
-                            improvement = current_cost - swapped_cost
-                            if improvement <= 0.25:
-                                continue
-
-                            current_workload_error = abs(totals[early_idx] - workload_targets[labels[early_idx]]) + abs(
-                                totals[late_idx] - workload_targets[labels[late_idx]]
-                            )
-                            new_early_total = totals[early_idx] - _workload(early_pkg) + _workload(late_pkg)
-                            new_late_total = totals[late_idx] - _workload(late_pkg) + _workload(early_pkg)
-                            new_workload_error = abs(new_early_total - workload_targets[labels[early_idx]]) + abs(
-                                new_late_total - workload_targets[labels[late_idx]]
-                            )
-                            workload_penalty = new_workload_error - current_workload_error
-                            if workload_penalty > max(tolerance * 2, 1.5):
-                                continue
-
-                            score = (
-                                -improvement,
-                                workload_penalty,
-                                abs(_workload(early_pkg) - _workload(late_pkg)),
-                                float(late_idx - early_idx),
-                            )
-                            if best_swap is None or score < best_swap[0]:
-                                best_swap = (score, early_idx, late_idx, early_pkg, late_pkg)
-
-            if best_swap is None:
-                break
-
-            _, early_idx, late_idx, early_pkg, late_pkg = best_swap
-            assignment[labels[early_idx]].remove(early_pkg)
-            assignment[labels[late_idx]].remove(late_pkg)
-            assignment[labels[early_idx]].append(late_pkg)
-            assignment[labels[late_idx]].append(early_pkg)
-            totals[early_idx] = totals[early_idx] - _workload(early_pkg) + _workload(late_pkg)
-            totals[late_idx] = totals[late_idx] - _workload(late_pkg) + _workload(early_pkg)
-            assignment[labels[early_idx]] = sorted(
-                assignment[labels[early_idx]], key=lambda p: (p.first_local_dt, p.tail)
-            )
-            assignment[labels[late_idx]] = sorted(
-                assignment[labels[late_idx]], key=lambda p: (p.first_local_dt, p.tail)
-            )
-
-        return assignment
-
-    def _rebalance_tail_counts(
-        assignment: Dict[str, List[TailPackage]],
-    ) -> Dict[str, List[TailPackage]]:
-        totals = [sum(_workload(pkg) for pkg in assignment.get(label, [])) for label in labels]
-        counts = [len(assignment.get(label, [])) for label in labels]
-
-        def _count_delta(idx: int) -> float:
-            return counts[idx] - count_targets[labels[idx]]
-
-        iterations_left = len(packages) * max(1, len(labels) - 1) * 4
-        while iterations_left > 0:
-            iterations_left -= 1
-            over_idx = max(range(len(labels)), key=_count_delta)
-            under_idx = min(range(len(labels)), key=_count_delta)
-            if _count_delta(over_idx) <= 0.5 and _count_delta(under_idx) >= -0.5:
-                break
-            if len(assignment.get(labels[over_idx], [])) <= 1:
-                break
-
-            current_count_error = sum(abs(_count_delta(idx)) for idx in range(len(labels)))
-            best_move: Optional[Tuple[Tuple[float, float, float, float, float, float], TailPackage, int]] = None
-
-            for target_idx in range(len(labels)):
-                if target_idx == over_idx:
-                    continue
-                for pkg in assignment.get(labels[over_idx], []):
-                    pref_idx = preferred_index.get(pkg.tail, over_idx)
-                    pref_distance = abs(target_idx - pref_idx)
-                    pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-                    tz_penalty = abs(
-                        pkg_offsets.get(pkg.tail, tz_targets[target_idx]) - tz_targets[target_idx]
-                    )
-                    shift_penalty = _soft_shift_distance_penalty(
-                        pkg_offset,
-                        preferred_idx=pref_idx,
-                        target_idx=target_idx,
-                        labels_count=len(labels),
-                        force_easterly_first=force_easterly_first,
-                    )
-                    new_counts = list(counts)
-                    new_counts[over_idx] -= 1
-                    new_counts[target_idx] += 1
-                    new_count_error = sum(
-                        abs(new_counts[idx] - count_targets[labels[idx]])
-                        for idx in range(len(labels))
-                    )
-                    count_improvement = current_count_error - new_count_error
-                    work = _workload(pkg)
-                    new_over_total = totals[over_idx] - work
-                    new_target_total = totals[target_idx] + work
-                    workload_penalty = abs(new_over_total - workload_targets[labels[over_idx]]) + abs(
-                        new_target_total - workload_targets[labels[target_idx]]
-                    )
-                    score = (
-                        -count_improvement,
-                        float(pref_distance),
-                        shift_penalty,
-                        tz_penalty,
-                        workload_penalty,
-                        work,
-                    )
-                    if best_move is None or score < best_move[0]:
-                        best_move = (score, pkg, target_idx)
-
-            if best_move is None:
-                break
-
-            score, pkg, target_idx = best_move
-            count_improvement = -score[0]
-            if count_improvement <= 0:
-                break
-
-            assignment[labels[over_idx]].remove(pkg)
-            assignment[labels[target_idx]].append(pkg)
-            work = _workload(pkg)
-            totals[over_idx] -= work
-            totals[target_idx] += work
-            counts[over_idx] -= 1
-            counts[target_idx] += 1
-            assignment[labels[over_idx]] = sorted(
-                assignment[labels[over_idx]], key=lambda p: (p.first_local_dt, p.tail)
-            )
-            assignment[labels[target_idx]] = sorted(
-                assignment[labels[target_idx]], key=lambda p: (p.first_local_dt, p.tail)
-            )
-
-        return assignment
-
-    if optimized_assignment is not None:
-        optimized_assignment = _ensure_non_empty_shifts(optimized_assignment)
-        optimized_assignment = _rebalance_tail_counts(optimized_assignment)
-        return _reduce_timezone_crossovers(optimized_assignment)
-
-    def _totals_delta(idx: int) -> float:
-        label = labels[idx]
-        return totals_by_index[idx] - workload_targets[label]
-
-    def _counts_delta(idx: int) -> float:
-        label = labels[idx]
-        return counts_by_index[idx] - count_targets[label]
-
-    max_iterations = len(packages) * max(1, len(labels) - 1) * 4
-    iterations = 0
-
-    # Stage 2: iteratively nudge packages forward/backward to reduce workload
-    # skew, but only after the initial east→early / west→late grouping.
-    while iterations < max_iterations:
-        iterations += 1
-        over_idx = max(range(len(labels)), key=_totals_delta)
-        under_idx = min(range(len(labels)), key=_totals_delta)
-        over_delta = _totals_delta(over_idx)
-        under_delta = _totals_delta(under_idx)
-        if over_delta <= tolerance and abs(under_delta) <= tolerance:
-            break
-        if over_delta <= 0 or under_delta >= 0:
-            break
-
-        step_direction = -1 if over_idx > under_idx else 1
-        candidate_indices = range(
-            over_idx + step_direction,
-            under_idx + step_direction,
-            step_direction,
-        )
-
-        best_pkg: Optional[TailPackage] = None
-        best_target: Optional[int] = None
-        best_score: Optional[Tuple[float, float, float, float, float, float]] = None
-
-        over_label = labels[over_idx]
-        over_target_total = workload_targets[over_label]
-        current_over_error = abs(totals_by_index[over_idx] - over_target_total)
-
-        for target_idx in candidate_indices:
-            if target_idx < 0 or target_idx >= len(labels):
-                continue
-            target_label = labels[target_idx]
-            target_target_total = workload_targets[target_label]
-            current_target_error = abs(
-                totals_by_index[target_idx] - target_target_total
-            )
-
-            for pkg in buckets_by_index[over_idx]:
-                work = _workload(pkg)
-                new_over_total = totals_by_index[over_idx] - work
-                new_target_total = totals_by_index[target_idx] + work
-                new_over_error = abs(new_over_total - over_target_total)
-                new_target_error = abs(new_target_total - target_target_total)
-                delta_error = (new_over_error + new_target_error) - (
-                    current_over_error + current_target_error
-                )
-                pref_idx = preferred_index.get(pkg.tail, over_idx)
-                pref_distance = abs(target_idx - pref_idx)
-                max_late_distance = len(labels) - 1
-                max_early_distance = len(labels) - 1
-                if target_idx > pref_idx and pref_distance > max_late_distance:
-                    # Eastern-preferred packages (low preferred index) should not
-                    # drift multiple shifts later unless the workload savings are
-                    # overwhelming. Skip these moves so the eastern tails stay on
-                    # the earlier shifts when possible.
-                    continue
-                if target_idx < pref_idx and pref_distance > max_early_distance:
-                    continue
-                tz_penalty = abs(
-                    pkg_offsets.get(pkg.tail, tz_targets[target_idx])
-                    - tz_targets[target_idx]
-                )
-                distance_from_over = abs(target_idx - over_idx)
-                offset_priority = 0.0
-                preference_penalty = float(pref_distance)
-                pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-                preference_penalty += _soft_shift_distance_penalty(
-                    pkg_offset,
-                    preferred_idx=pref_idx,
-                    target_idx=target_idx,
-                    labels_count=len(labels),
-                    force_easterly_first=force_easterly_first,
-                )
-                if target_idx > pref_idx and _is_easterly_offset(pkg_offset):
-                    preference_penalty += pref_distance * 0.25
-                elif target_idx < pref_idx and _is_westerly_offset(pkg_offset):
-                    preference_penalty *= 0.75
-                if force_westerly_last and over_idx == len(labels) - 1:
-                    offset_priority = -pkg_offsets.get(pkg.tail, 0.0)
-                score = (
-                    delta_error,
-                    preference_penalty,
-                    float(distance_from_over),
-                    tz_penalty,
-                    work,
-                    offset_priority,
-                )
-                if best_score is None or score < best_score:
-                    best_score = score
-                    best_pkg = pkg
-                    best_target = target_idx
-
-        if not best_pkg or best_score is None or best_target is None:
-            break
-
-        delta_error = best_score[0]
-        pref_distance = int(best_score[1])
-        target_idx = best_target
-        if delta_error > 0 and pref_distance > 1:
-            # Moving this package would both worsen balance and ignore the
-            # timezone preference; stop balancing.
-            break
-        if delta_error > 0 and pref_distance >= 1:
-            break
-
-        # Apply the move.
-        buckets_by_index[over_idx].remove(best_pkg)
-        buckets_by_index[target_idx].append(best_pkg)
-        work = _workload(best_pkg)
-        totals_by_index[over_idx] -= work
-        totals_by_index[target_idx] += work
-        counts_by_index[over_idx] -= 1
-        counts_by_index[target_idx] += 1
-
-    # Stage 3: smooth out tail counts aggressively because even tail splits are
-    # the strongest preference. Still prefer short hops between adjacent shifts
-    # so we keep the east→early / west→late ordering when possible.
-    count_iterations = len(packages) * max(1, len(labels) - 1) * 4
-    while count_iterations > 0:
-        count_iterations -= 1
-        over_idx = max(range(len(labels)), key=_counts_delta)
-        under_idx = min(range(len(labels)), key=_counts_delta)
-        over_count_delta = _counts_delta(over_idx)
-        under_count_delta = _counts_delta(under_idx)
-        if over_count_delta <= 0.5 and under_count_delta >= -0.5:
-            break
-        if len(buckets_by_index[over_idx]) <= 1:
-            break
-
-        step_direction = -1 if over_idx > under_idx else 1
-        candidate_indices = range(
-            over_idx + step_direction,
-            under_idx + step_direction,
-            step_direction,
-        )
-        current_count_error = sum(abs(_counts_delta(idx)) for idx in range(len(labels)))
-
-        best_pkg: Optional[TailPackage] = None
-        best_target_idx: Optional[int] = None
-        best_score: Optional[Tuple[float, float, float, float, float, float, float]] = None
-        over_label = labels[over_idx]
-        over_target_total = workload_targets[over_label]
-        current_over_error = abs(totals_by_index[over_idx] - over_target_total)
-
-        for target_idx in candidate_indices:
-            target_label = labels[target_idx]
-            target_target_total = workload_targets[target_label]
-            current_target_error = abs(totals_by_index[target_idx] - target_target_total)
-
-            for pkg in buckets_by_index[over_idx]:
-                work = _workload(pkg)
-                new_over_total = totals_by_index[over_idx] - work
-                new_target_total = totals_by_index[target_idx] + work
-                new_over_error = abs(new_over_total - over_target_total)
-                new_target_error = abs(new_target_total - target_target_total)
-                workload_penalty = (new_over_error + new_target_error) - (
-                    current_over_error + current_target_error
-                )
-                pref_idx = preferred_index.get(pkg.tail, over_idx)
-                pref_distance = abs(target_idx - pref_idx)
-                pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
-                tz_penalty = abs(
-                    pkg_offsets.get(pkg.tail, tz_targets[target_idx]) - tz_targets[target_idx]
-                )
-                shift_penalty = _soft_shift_distance_penalty(
-                    pkg_offset,
-                    preferred_idx=pref_idx,
-                    target_idx=target_idx,
-                    labels_count=len(labels),
-                    force_easterly_first=force_easterly_first,
-                )
-                new_counts = list(counts_by_index)
-                new_counts[over_idx] -= 1
-                new_counts[target_idx] += 1
-                new_count_error = sum(
-                    abs(new_counts[idx] - count_targets[labels[idx]])
-                    for idx in range(len(labels))
-                )
-                count_improvement = current_count_error - new_count_error
-                distance_from_over = abs(target_idx - over_idx)
-                score = (
-                    -count_improvement,
-                    float(distance_from_over),
-                    float(pref_distance),
-                    shift_penalty,
-                    workload_penalty,
-                    tz_penalty,
-                    work,
-                )
-                if best_score is None or score < best_score:
-                    best_score = score
-                    best_pkg = pkg
-                    best_target_idx = target_idx
-
-        if best_pkg is None or best_score is None or best_target_idx is None:
-            break
-        count_improvement = -best_score[0]
-        workload_penalty = best_score[4]
-        if count_improvement <= 0:
-            break
-        if workload_penalty > max(tolerance * 3, 2.5):
-            break
-
-        buckets_by_index[over_idx].remove(best_pkg)
-        buckets_by_index[best_target_idx].append(best_pkg)
-        work = _workload(best_pkg)
-        totals_by_index[over_idx] -= work
-        totals_by_index[best_target_idx] += work
-        counts_by_index[over_idx] -= 1
-        counts_by_index[best_target_idx] += 1
-
-    result: Dict[str, List[TailPackage]] = {}
-    for idx, label in enumerate(labels):
-        pkgs = sorted(
-            buckets_by_index[idx], key=lambda p: (p.first_local_dt, p.tail)
-        )
-        result[label] = pkgs
-    result = _ensure_non_empty_shifts(result)
-    result = _rebalance_tail_counts(result)
-    return _reduce_timezone_crossovers(result)
-
 
 def buckets_to_df(
     buckets: Dict[str, List[TailPackage]],
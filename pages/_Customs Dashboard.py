@@ -1,24 +1,25 @@
 import io
 import re
 from collections.abc import Mapping
-from datetime import date, datetime, time, timedelta
-from pathlib import Path
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
 
 import pandas as pd
 import pytz
 import streamlit as st
-import requests
 from zoneinfo_compat import ZoneInfo
 
-from customs_deadline_utils import (
-    DEFAULT_BUSINESS_DAY_END,
-    DEFAULT_BUSINESS_DAY_START,
-    build_followup_candidates,
-    rule_hours_for_weekday,
+from customs_deadline_utils import DEFAULT_BUSINESS_DAY_END, DEFAULT_BUSINESS_DAY_START
+from customs_service import (
+    DEFAULT_CUSTOMS_RULES_PATH,
+    candidate_timezone_from_row,
+    compile_customs_rules,
+    compute_clearance_windows,
+    extract_airport_timezone,
+    extract_arrival_dt,
+    load_customs_rule_book,
+    prefetch_customs_payloads,
 )
-
-
 from flight_leg_utils import (
     AIRPORT_TZ_FILENAME,
     ARRIVAL_AIRPORT_COLUMNS,
@@ -35,7 +36,6 @@ from Home import configure_page, get_secret, password_gate, render_sidebar
 configure_page(page_title="Customs Dashboard")
 password_gate()
 render_sidebar()
-from fl3xx_api import fetch_flight_migration, fetch_leg_details
 
 
 MOUNTAIN_TIMEZONE = ZoneInfo("America/Edmonton")
@@ -82,7 +82,7 @@ URGENCY_SORT_ORDER = {
     "ok": 5,
 }
 
-CUSTOMS_RULES_PATH = Path(__file__).resolve().parent.parent / "customs_rules.csv"
+CUSTOMS_RULES_PATH = DEFAULT_CUSTOMS_RULES_PATH
 
 _SESSION_STATE_KEY = "customs_dashboard_cached_data"
 
@@ -171,6 +171,16 @@ def _extract_quote_identifier(row: Mapping[str, Any]) -> Optional[str]:
     return None
 
 
+def _extract_flight_identifier(row: Mapping[str, Any]) -> Any:
+    return (
+        row.get("flightId")
+        or row.get("flight_id")
+        or row.get("flightID")
+        or row.get("id")
+        or row.get("flight")
+    )
+
+
 def _extract_leg_notes(payload: Any) -> Optional[str]:
     if isinstance(payload, Mapping):
         detail = payload
@@ -311,100 +321,6 @@ def _format_time_to_clear(row: Mapping[str, Any], reference: datetime) -> str:
     return f"{sign}{' '.join(parts)}"
 
 
-def _extract_airport_timezone(
-    airport_code: str, lookup: Dict[str, Dict[str, Optional[str]]]
-) -> Optional[str]:
-    if not airport_code:
-        return None
-    record = lookup.get(airport_code)
-    if not isinstance(record, Mapping):
-        return None
-    tz_value = record.get("tz")
-    if isinstance(tz_value, str) and tz_value.strip():
-        return tz_value.strip()
-    return None
-
-
-def _candidate_timezone_from_row(row: Mapping[str, Any]) -> Optional[str]:
-    timezone_keys = (
-        "arrivalTimeZone",
-        "arrival_tz",
-        "arr_tz",
-        "dep_tz",
-        "departureTimeZone",
-    )
-    for key in timezone_keys:
-        value = row.get(key)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
-    return None
-
-
-def _previous_business_day(reference: date) -> date:
-    candidate = reference - timedelta(days=1)
-    while candidate.weekday() >= 5:  # 5=Saturday, 6=Sunday
-        candidate -= timedelta(days=1)
-    return candidate
-
-
-def _parse_lead_time_hours(value: Any) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        normalized = value.strip()
-        if not normalized:
-            return None
-        match = re.search(r"(\d+(?:\.\d+)?)", normalized)
-        if not match:
-            return None
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
-    return None
-
-
-def _extract_arrival_dt(row: Mapping[str, Any]) -> Optional[datetime]:
-    arrival_keys = (
-        "arrivalTime",
-        "arrival_time",
-        "arr_time",
-        "eta",
-        "sta",
-        "scheduledArrival",
-    )
-    for key in arrival_keys:
-        raw_value = row.get(key)
-        if not raw_value:
-            continue
-        try:
-            return safe_parse_dt(str(raw_value))
-        except Exception:
-            continue
-    return None
-
-
-def _extract_departure_dt(row: Mapping[str, Any]) -> Optional[datetime]:
-    departure_keys = (
-        "departureTime",
-        "dep_time",
-        "std",
-        "scheduledDeparture",
-        "etd",
-    )
-    for key in departure_keys:
-        raw_value = row.get(key)
-        if not raw_value:
-            continue
-        try:
-            return safe_parse_dt(str(raw_value))
-        except Exception:
-            continue
-    return None
-
-
 def _classify_arrival_country(
     row: Mapping[str, Any],
     dep_airport: str,
@@ -422,14 +338,14 @@ def _classify_arrival_country(
 
     include_leg = True
     if special_rule.get("weekend_only"):
-        arrival_dt = _extract_arrival_dt(row)
+        arrival_dt = extract_arrival_dt(row)
         if isinstance(arrival_dt, datetime):
             tz_name = (
-                _extract_airport_timezone(airport_code, lookup)
-                or _candidate_timezone_from_row(row)
+                extract_airport_timezone(airport_code, lookup)
+                or candidate_timezone_from_row(row)
             )
             if not tz_name and dep_airport:
-                tz_name = _extract_airport_timezone(dep_airport, lookup)
+                tz_name = extract_airport_timezone(dep_airport, lookup)
             if tz_name:
                 try:
                     arrival_local = arrival_dt.astimezone(ZoneInfo(tz_name))
@@ -447,218 +363,6 @@ def _classify_arrival_country(
     return False, "", ""
 
 
-def _find_operating_window_before(
-    reference_local: datetime,
-    rule: Optional[Mapping[str, Any]],
-    *,
-    allow_same_day: bool,
-) -> Tuple[date, time, time]:
-    reference_date = reference_local.date()
-    reference_time = reference_local.time()
-
-    if isinstance(rule, Mapping):
-        start_offset = 0 if allow_same_day else 1
-        for offset in range(start_offset, 8):
-            candidate_date = reference_date - timedelta(days=offset)
-            hours = rule_hours_for_weekday(rule, candidate_date.weekday())
-            if not hours:
-                continue
-            start_time, end_time = hours
-            if offset == 0:
-                if reference_time < start_time:
-                    continue
-                if reference_time < end_time:
-                    end_time = reference_time
-            if end_time <= start_time:
-                end_time = start_time
-            return candidate_date, start_time, end_time
-
-    if allow_same_day:
-        fallback_date = reference_date
-        fallback_start = DEFAULT_BUSINESS_DAY_START
-        fallback_end = DEFAULT_BUSINESS_DAY_END
-        if fallback_date.weekday() >= 5 or reference_time < fallback_start:
-            fallback_date = _previous_business_day(reference_date)
-        else:
-            fallback_end = min(reference_time, fallback_end)
-            if fallback_end <= fallback_start:
-                fallback_end = fallback_start
-            return fallback_date, fallback_start, fallback_end
-
-        return fallback_date, fallback_start, fallback_end
-
-    target_date = _previous_business_day(reference_date)
-    return target_date, DEFAULT_BUSINESS_DAY_START, DEFAULT_BUSINESS_DAY_END
-
-
-def _compute_clearance_window(
-    row: Mapping[str, Any],
-    dep_airport: str,
-    arr_airport: str,
-    lookup: Dict[str, Dict[str, Optional[str]]],
-    rule: Optional[Mapping[str, Any]],
-    arrival_status: str,
-) -> Tuple[Optional[datetime], Optional[datetime], str, str]:
-    event_candidates = (
-        "arrivalTime",
-        "arrival_time",
-        "arr_time",
-        "eta",
-        "sta",
-        "scheduledArrival",
-        "dep_time",
-        "departureTime",
-    )
-    event_dt: Optional[datetime] = None
-    for key in event_candidates:
-        raw_value = row.get(key)
-        if not raw_value:
-            continue
-        try:
-            event_dt = safe_parse_dt(str(raw_value))
-            break
-        except Exception:
-            continue
-
-    if event_dt is None:
-        return None, None, "", "Unknown"
-
-    tz_name = _extract_airport_timezone(arr_airport, lookup) or _candidate_timezone_from_row(row)
-    if not tz_name:
-        tz_name = _extract_airport_timezone(dep_airport, lookup)
-
-    if tz_name:
-        try:
-            event_local = event_dt.astimezone(ZoneInfo(tz_name))
-        except Exception:
-            event_local = _to_local(event_dt, None)
-    else:
-        event_local = _to_local(event_dt, None)
-
-    tzinfo = event_local.tzinfo or ZoneInfo("UTC")
-    lead_hours: Optional[float] = None
-    lead_deadline_local: Optional[datetime] = None
-    if isinstance(rule, Mapping):
-        lead_hours = _parse_lead_time_hours(rule.get("lead_time_arrival_hours"))
-        if lead_hours and lead_hours > 0:
-            lead_deadline_candidate = event_local - timedelta(hours=lead_hours)
-            if lead_deadline_candidate.tzinfo is None:
-                lead_deadline_candidate = lead_deadline_candidate.replace(tzinfo=tzinfo)
-            try:
-                lead_deadline_local = lead_deadline_candidate.astimezone(tzinfo)
-            except Exception:
-                lead_deadline_local = lead_deadline_candidate
-
-    target_date, window_start_time, window_end_time = _find_operating_window_before(
-        event_local,
-        rule,
-        allow_same_day=False,
-    )
-    start_local = datetime.combine(target_date, window_start_time, tzinfo=tzinfo)
-    end_local = datetime.combine(target_date, window_end_time, tzinfo=tzinfo)
-    timing_label = "Prior Day"
-    deadline_port_closed = False
-
-    if isinstance(lead_deadline_local, datetime):
-        if lead_deadline_local < start_local:
-            target_date, window_start_time, window_end_time = _find_operating_window_before(
-                lead_deadline_local,
-                rule,
-                allow_same_day=True,
-            )
-            start_local = datetime.combine(target_date, window_start_time, tzinfo=tzinfo)
-            end_local = datetime.combine(target_date, window_end_time, tzinfo=tzinfo)
-            if end_local > lead_deadline_local:
-                end_local = lead_deadline_local
-            timing_label = "Lead Time"
-            deadline_port_closed = start_local.date() != lead_deadline_local.date()
-        elif lead_deadline_local < end_local:
-            end_local = lead_deadline_local
-
-    goal_summary_parts: List[str] = []
-    if timing_label == "Lead Time":
-        if lead_hours:
-            goal_summary_parts.append(
-                f"Lead time requirement {lead_hours:g}h prior to arrival "
-                f"(deadline {lead_deadline_local.strftime('%Y-%m-%d %H:%M %Z')})."
-            )
-        goal_summary_parts.append(
-            "Last port window before deadline: "
-            f"{start_local.strftime('%Y-%m-%d %H:%M %Z')}"
-            " → "
-            f"{end_local.strftime('%Y-%m-%d %H:%M %Z')}."
-        )
-        if deadline_port_closed:
-            goal_summary_parts.append(
-                "Port unavailable at deadline; window pulled from previous operating day."
-            )
-    else:
-        goal_summary_parts.append(
-            "Prior operating window: "
-            f"{start_local.strftime('%Y-%m-%d %H:%M %Z')}"
-            " → "
-            f"{end_local.strftime('%Y-%m-%d %H:%M %Z')}."
-        )
-        if isinstance(lead_deadline_local, datetime) and lead_hours:
-            goal_summary_parts.append(
-                "Lead time "
-                f"({lead_hours:g}h) deadline {lead_deadline_local.strftime('%Y-%m-%d %H:%M %Z')}."
-            )
-
-    goal_summary = " ".join(goal_summary_parts)
-
-    normalized_status = (arrival_status or "").strip().upper()
-    if normalized_status != "OK" and isinstance(end_local, datetime):
-        now_local = datetime.now(end_local.tzinfo or ZoneInfo("UTC"))
-        if now_local > end_local:
-            departure_dt = _extract_departure_dt(row)
-            departure_local: Optional[datetime] = None
-            if isinstance(departure_dt, datetime):
-                if departure_dt.tzinfo is None:
-                    departure_dt = departure_dt.replace(tzinfo=pytz.UTC)
-                try:
-                    departure_local = departure_dt.astimezone(tzinfo)
-                except Exception:
-                    departure_local = departure_dt
-
-            fallback_candidates = build_followup_candidates(
-                event_local=event_local,
-                tzinfo=tzinfo,
-                rule=rule,
-                lead_deadline_local=lead_deadline_local,
-                lead_hours=lead_hours,
-                departure_local=departure_local,
-            )
-
-            if fallback_candidates:
-                selected = fallback_candidates[-1]
-                for candidate in fallback_candidates:
-                    if now_local <= candidate.end:
-                        selected = candidate
-                        break
-
-                start_local = selected.start
-                end_local = selected.end
-                goal_summary = selected.summary
-                timing_label = selected.label
-
-    return start_local, end_local, goal_summary, timing_label
-
-
-@st.cache_data(show_spinner=False)
-def _load_customs_rules(path: str) -> pd.DataFrame:
-    try:
-        df = pd.read_csv(path)
-    except FileNotFoundError:
-        return pd.DataFrame()
-    except Exception:
-        raise
-    if df.empty:
-        return df
-    df.columns = [str(col).strip() for col in df.columns]
-    return df
-
-
 def _format_in_timezone(dt: Optional[datetime], tz: ZoneInfo) -> str:
     if dt is None:
         return ""
@@ -716,28 +420,6 @@ def _normalize_bool(value: Any) -> Optional[bool]:
     return None
 
 
-def _format_hours_summary(rule: Mapping[str, Any]) -> str:
-    days = (
-        ("Mon", "open_mon"),
-        ("Tue", "open_tue"),
-        ("Wed", "open_wed"),
-        ("Thu", "open_thu"),
-        ("Fri", "open_fri"),
-        ("Sat", "open_sat"),
-        ("Sun", "open_sun"),
-    )
-    segments: List[str] = []
-    for label, key in days:
-        value = rule.get(key)
-        if value is None:
-            continue
-        value_str = str(value).strip()
-        if not value_str or value_str.upper() == "NAN":
-            continue
-        segments.append(f"{label}: {value_str}")
-    return "; ".join(segments)
-
-
 st.sidebar.header("Configuration")
 
 fl3xx_cfg: Dict[str, Any] = {}
@@ -776,16 +458,16 @@ clearance_file = st.sidebar.file_uploader(
     help="Provide airport-specific customs lead times or notes to display alongside each leg.",
 )
 
-customs_rules_df = pd.DataFrame()
+rule_book = compile_customs_rules(pd.DataFrame())
 customs_rules_note = ""
 
 if CUSTOMS_RULES_PATH.exists():
     try:
-        customs_rules_df = _load_customs_rules(str(CUSTOMS_RULES_PATH))
+        rule_book = load_customs_rule_book(CUSTOMS_RULES_PATH)
     except Exception as exc:  # pragma: no cover - defensive
         st.sidebar.error(f"Error loading bundled customs rules: {exc}")
     else:
-        if customs_rules_df.empty:
+        if rule_book.frame.empty:
             st.sidebar.warning(
                 f"Bundled customs rules file `{CUSTOMS_RULES_PATH.name}` is empty."
             )
@@ -808,7 +490,7 @@ if clearance_file is not None:
         if uploaded_df.empty:
             st.sidebar.warning("Uploaded customs rules sheet is empty.")
         else:
-            customs_rules_df = uploaded_df.copy()
+            rule_book = compile_customs_rules(uploaded_df.copy())
             customs_rules_note = f"Using uploaded rules file `{clearance_file.name}`."
             st.sidebar.success("Customs rules overridden by uploaded sheet.")
             with st.sidebar.expander("Preview uploaded rules", expanded=False):
@@ -817,8 +499,9 @@ if clearance_file is not None:
 if customs_rules_note:
     st.sidebar.caption(customs_rules_note)
 
-clearance_requirements: Dict[str, str] = {}
-rules_lookup: Dict[str, Mapping[str, Any]] = {}
+customs_rules_df = rule_book.frame
+clearance_requirements = rule_book.clearance_requirements
+rules_lookup = rule_book.rules
 
 if not customs_rules_df.empty:
     normalized_country_col = None
@@ -827,14 +510,6 @@ if not customs_rules_df.empty:
     elif "Country" in customs_rules_df.columns:
         normalized_country_col = "Country"
 
-    for _, rec in customs_rules_df.iterrows():
-        code = str(rec.get("airport_icao") or rec.get("Airport_icao") or rec.get("airport") or "").strip().upper()
-        if not code:
-            continue
-        rules_lookup[code] = rec.to_dict()
-        if "notes" in rec and isinstance(rec["notes"], str):
-            clearance_requirements[code] = rec["notes"].strip()
-
     us_rules = customs_rules_df
     if normalized_country_col is not None:
         us_mask = customs_rules_df[normalized_country_col].astype(str).str.upper() == "US"
@@ -945,148 +620,152 @@ if fetch_button:
     customs_df["dep_time"] = customs_df["dep_time"].astype(str)
     customs_df = customs_df.sort_values("dep_time").reset_index(drop=True)
 
-    migration_cache: Dict[Any, Optional[Dict[str, Any]]] = {}
-    detail_cache: Dict[str, Optional[Any]] = {}
-    detail_session = requests.Session() if keyword_pattern else None
+    included_legs: List[Tuple[Dict[str, Any], str, str, str, str]] = []
+    for leg in customs_df.to_dict("records"):
+        dep_airport = _detect_airport_value(leg, DEPARTURE_AIRPORT_COLUMNS)
+        arr_airport = _detect_airport_value(leg, ARRIVAL_AIRPORT_COLUMNS)
+        include_leg, arrival_country_label, arrival_country_category = _classify_arrival_country(
+            leg,
+            dep_airport,
+            arr_airport,
+            lookup,
+        )
+        if include_leg:
+            included_legs.append(
+                (leg, dep_airport, arr_airport, arrival_country_label, arrival_country_category)
+            )
+
+    with st.spinner("Fetching leg notes and customs migrations..."):
+        payloads = prefetch_customs_payloads(
+            config,
+            quote_ids=(
+                [_extract_quote_identifier(leg) for leg, *_ in included_legs] if keyword_pattern else ()
+            ),
+            flight_ids=[_extract_flight_identifier(leg) for leg, *_ in included_legs],
+        )
+
+    reported_quote_errors: set[str] = set()
+    reported_flight_errors: set[str] = set()
     missing_quote_warnings: set[str] = set()
     rows: List[Dict[str, Any]] = []
+    clearance_inputs: List[Tuple[Mapping[str, Any], str, str, str]] = []
+
+    for row, dep_airport, arr_airport, arrival_country_label, arrival_country_category in included_legs:
+        tail = str(row.get("tail") or "")
+        dep_utc, dep_local = _format_local_time(row)
+
+        keyword_matches: List[str] = []
+        if keyword_pattern:
+            quote_id = _extract_quote_identifier(row)
+            if quote_id:
+                exc = payloads.leg_detail_errors.get(quote_id)
+                if exc is not None and quote_id not in reported_quote_errors:
+                    reported_quote_errors.add(quote_id)
+                    errors.append(
+                        f"Quote {quote_id}: {exc} (unable to check leg notes for keywords)"
+                    )
+                note_text = _extract_leg_notes(payloads.leg_details.get(quote_id))
+                if isinstance(note_text, str) and note_text:
+                    keyword_matches = _find_keyword_matches(
+                        note_text, keyword_pattern
+                    )
+            else:
+                identifier = f"{tail or 'Unknown tail'} departing {dep_utc or 'unknown time'}"
+                if identifier not in missing_quote_warnings:
+                    missing_quote_warnings.add(identifier)
+                    errors.append(
+                        f"Missing quote identifier for {identifier}; unable to check leg notes keywords."
+                    )
+
+        rule = rules_lookup.get(arr_airport.upper()) if arr_airport else None
+        lead_time_arrival = ""
+        hours_summary = ""
+        after_hours = ""
+        contacts = ""
+        if isinstance(rule, Mapping):
+            lead_time_arrival = str(rule.get("lead_time_arrival_hours") or "").strip()
+            hours_summary = rule.hours_summary
+            after_hours_bool = _normalize_bool(rule.get("after_hours_available"))
+            if after_hours_bool is None and "after_hours_available" in rule:
+                after_hours = str(rule.get("after_hours_available") or "").strip()
+            elif after_hours_bool is not None:
+                after_hours = "Yes" if after_hours_bool else "No"
+            contacts = str(rule.get("contacts") or "").strip()
+
+        flight_id = _extract_flight_identifier(row)
+
+        migration_payload: Optional[Dict[str, Any]] = None
+        if flight_id:
+            flight_key = str(flight_id)
+            exc = payloads.migration_errors.get(flight_key)
+            if exc is not None and flight_key not in reported_flight_errors:
+                reported_flight_errors.add(flight_key)
+                errors.append(f"Flight {flight_id}: {exc}")
+            migration_payload = payloads.migrations.get(flight_key)
+        else:
+            errors.append(f"Missing flight ID for tail {tail} departing {dep_utc}.")
 
-    try:
-        for _, leg in customs_df.iterrows():
-            row = leg.to_dict()
-            tail = str(row.get("tail") or "")
-            dep_airport = _detect_airport_value(row, DEPARTURE_AIRPORT_COLUMNS)
-            arr_airport = _detect_airport_value(row, ARRIVAL_AIRPORT_COLUMNS)
-            include_leg, arrival_country_label, arrival_country_category = _classify_arrival_country(
-                row,
-                dep_airport,
-                arr_airport,
-                lookup,
-            )
-            if not include_leg:
-                continue
-            dep_utc, dep_local = _format_local_time(row)
-
-            keyword_matches: List[str] = []
-            if keyword_pattern:
-                quote_id = _extract_quote_identifier(row)
-                if quote_id:
-                    if quote_id not in detail_cache:
-                        try:
-                            payload = fetch_leg_details(
-                                config, quote_id, session=detail_session
-                            )
-                        except Exception as exc:  # pragma: no cover - defensive
-                            errors.append(
-                                f"Quote {quote_id}: {exc} (unable to check leg notes for keywords)"
-                            )
-                            detail_cache[quote_id] = None
-                        else:
-                            detail_cache[quote_id] = payload
-                    payload = detail_cache.get(quote_id)
-                    note_text = _extract_leg_notes(payload)
-                    if isinstance(note_text, str) and note_text:
-                        keyword_matches = _find_keyword_matches(
-                            note_text, keyword_pattern
-                        )
-                else:
-                    identifier = f"{tail or 'Unknown tail'} departing {dep_utc or 'unknown time'}"
-                    if identifier not in missing_quote_warnings:
-                        missing_quote_warnings.add(identifier)
-                        errors.append(
-                            f"Missing quote identifier for {identifier}; unable to check leg notes keywords."
-                        )
-
-            rule = rules_lookup.get(arr_airport.upper()) if arr_airport else None
-            lead_time_arrival = ""
-            hours_summary = ""
-            after_hours = ""
-            contacts = ""
-            if isinstance(rule, Mapping):
-                lead_time_arrival = str(rule.get("lead_time_arrival_hours") or "").strip()
-                hours_summary = _format_hours_summary(rule)
-                after_hours_bool = _normalize_bool(rule.get("after_hours_available"))
-                if after_hours_bool is None and "after_hours_available" in rule:
-                    after_hours = str(rule.get("after_hours_available") or "").strip()
-                elif after_hours_bool is not None:
-                    after_hours = "Yes" if after_hours_bool else "No"
-                contacts = str(rule.get("contacts") or "").strip()
-
-            flight_id = (
-                row.get("flightId")
-                or row.get("flight_id")
-                or row.get("flightID")
-                or row.get("id")
-                or row.get("flight")
-            )
+        arr_status, arr_by, arr_notes, _arr_docs, arr_doc_names = _extract_migration_fields(
+            migration_payload, "arrivalMigration"
+        )
 
-            migration_payload: Optional[Dict[str, Any]] = None
-            if flight_id:
-                if flight_id not in migration_cache:
-                    try:
-                        migration_cache[flight_id] = fetch_flight_migration(config, flight_id)
-                    except Exception as exc:  # pragma: no cover - defensive
-                        errors.append(f"Flight {flight_id}: {exc}")
-                        migration_cache[flight_id] = None
-                migration_payload = migration_cache.get(flight_id)
+        clearance_note = ""
+        if clearance_requirements and arr_airport:
+            clearance_note = clearance_requirements.get(arr_airport.upper(), "")
+        if not clearance_note and isinstance(rule, Mapping):
+            clearance_note = str(rule.get("notes") or "").strip()
+        if clearance_note:
+            arr_notes = arr_notes.strip()
+            if arr_notes:
+                arr_notes = f"{arr_notes} | {clearance_note}"
             else:
-                errors.append(f"Missing flight ID for tail {tail} departing {dep_utc}.")
-
-            arr_status, arr_by, arr_notes, _arr_docs, arr_doc_names = _extract_migration_fields(
-                migration_payload, "arrivalMigration"
-            )
+                arr_notes = clearance_note
+
+        keyword_alert = ""
+        if keyword_matches:
+            keyword_alert = f"⚠️ {' / '.join(keyword_matches)}"
+
+        clearance_inputs.append((row, dep_airport, arr_airport, arr_status))
+        rows.append(
+            {
+                "Tail": tail,
+                "Departure": dep_airport,
+                "Arrival": arr_airport,
+                "Arrival Country": arrival_country_label,
+                "Departure Local": dep_local,
+                "Arrival Status": arr_status,
+                "Arrival By": arr_by,
+                "Arrival Notes": arr_notes,
+                "Arrival Doc Names": arr_doc_names,
+                "Keyword Alerts": keyword_alert,
+                "Clearance Target Start (MT)": "",
+                "Clearance Target End (MT)": "",
+                "Clearance Goal": "",
+                "Clearance Timing": "",
+                "Rule Lead Time Arrival (hrs)": lead_time_arrival,
+                "Rule Operating Hours": hours_summary,
+                "Rule After Hours Available": after_hours,
+                "Rule Contacts": contacts,
+                "_clearance_start_dt": None,
+                "_clearance_end_dt": None,
+                "_flagged_keywords": keyword_matches,
+                "_arrival_country_category": arrival_country_category,
+            }
+        )
 
-            clearance_note = ""
-            if clearance_requirements and arr_airport:
-                clearance_note = clearance_requirements.get(arr_airport.upper(), "")
-            if not clearance_note and isinstance(rule, Mapping):
-                clearance_note = str(rule.get("notes") or "").strip()
-            if clearance_note:
-                arr_notes = arr_notes.strip()
-                if arr_notes:
-                    arr_notes = f"{arr_notes} | {clearance_note}"
-                else:
-                    arr_notes = clearance_note
-
-            clearance_start_dt, clearance_end_dt, clearance_goal, clearance_timing = _compute_clearance_window(
-                row, dep_airport, arr_airport, lookup, rule, arr_status
-            )
-            clearance_start_mt = _format_in_timezone(clearance_start_dt, MOUNTAIN_TIMEZONE)
-            clearance_end_mt = _format_in_timezone(clearance_end_dt, MOUNTAIN_TIMEZONE)
-
-            keyword_alert = ""
-            if keyword_matches:
-                keyword_alert = f"⚠️ {' / '.join(keyword_matches)}"
-
-            rows.append(
-                {
-                    "Tail": tail,
-                    "Departure": dep_airport,
-                    "Arrival": arr_airport,
-                    "Arrival Country": arrival_country_label,
-                    "Departure Local": dep_local,
-                    "Arrival Status": arr_status,
-                    "Arrival By": arr_by,
-                    "Arrival Notes": arr_notes,
-                    "Arrival Doc Names": arr_doc_names,
-                    "Keyword Alerts": keyword_alert,
-                    "Clearance Target Start (MT)": clearance_start_mt,
-                    "Clearance Target End (MT)": clearance_end_mt,
-                    "Clearance Goal": clearance_goal,
-                    "Clearance Timing": clearance_timing,
-                    "Rule Lead Time Arrival (hrs)": lead_time_arrival,
-                    "Rule Operating Hours": hours_summary,
-                    "Rule After Hours Available": after_hours,
-                    "Rule Contacts": contacts,
-                    "_clearance_start_dt": clearance_start_dt,
-                    "_clearance_end_dt": clearance_end_dt,
-                    "_flagged_keywords": keyword_matches,
-                    "_arrival_country_category": arrival_country_category,
-                }
-            )
-    finally:
-        if detail_session is not None:
-            detail_session.close()
+    windows = compute_clearance_windows(
+        clearance_inputs,
+        lookup,
+        rules_lookup,
+        calendar=rule_book.calendar(start_date, additional_days + 2),
+    )
+    for record, (clearance_start_dt, clearance_end_dt, clearance_goal, clearance_timing) in zip(rows, windows):
+        record["Clearance Target Start (MT)"] = _format_in_timezone(clearance_start_dt, MOUNTAIN_TIMEZONE)
+        record["Clearance Target End (MT)"] = _format_in_timezone(clearance_end_dt, MOUNTAIN_TIMEZONE)
+        record["Clearance Goal"] = clearance_goal
+        record["Clearance Timing"] = clearance_timing
+        record["_clearance_start_dt"] = clearance_start_dt
+        record["_clearance_end_dt"] = clearance_end_dt
 
     if not rows:
         st.success("No customs arrivals found in the selected window.")
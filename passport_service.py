@@ -0,0 +1,273 @@
+"""Data layer for the Pax Passport Check page.
+
+All three passport tabs read the same FL3XX data for a date window: the legs,
+each customs pax leg's ``pax_details`` and ``preflight`` payloads, and the
+staff/crew records used to backfill passports missing from ``pax_details``.
+This module loads that once per window:
+
+* legs are fetched in the same 3-day chunks the page has always used;
+* pax and preflight payloads for every flight are requested concurrently and
+  shared between sessions for a few minutes;
+* passport backfills are looked up once per passenger ID, however many flights
+  that passenger is on, and merged with the regular
+  :func:`fl3xx_api.backfill_missing_passenger_passports` rules.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from fl3xx_api import (
+    Fl3xxApiConfig,
+    PassengerDetail,
+    PayloadCache,
+    backfill_missing_passenger_passports,
+    extract_passengers_from_pax_details,
+    fetch_crew_member,
+    fetch_flight_pax_details,
+    fetch_flights,
+    fetch_many,
+    fetch_preflight,
+    unique_ids,
+)
+from flight_leg_utils import filter_out_subcharter_rows, normalize_fl3xx_payload
+
+DEFAULT_CHUNK_DAYS = 3
+DEFAULT_PASSPORT_FETCH_WORKERS = 8
+# Matches the five minute cache the page used for its per-flight loaders.
+PASSPORT_PAYLOAD_CACHE_TTL_SECONDS = 300
+
+_PAX = "pax_details"
+_PREFLIGHT = "preflight"
+_MEMBER = "crew_member"
+
+_PAX_CACHE = PayloadCache(PASSPORT_PAYLOAD_CACHE_TTL_SECONDS)
+_PREFLIGHT_CACHE = PayloadCache(PASSPORT_PAYLOAD_CACHE_TTL_SECONDS)
+_MEMBER_CACHE = PayloadCache(PASSPORT_PAYLOAD_CACHE_TTL_SECONDS)
+
+
+def clear_passport_payload_cache() -> None:
+    """Drop every cached pax, preflight and passport lookup."""
+
+    _PAX_CACHE.clear()
+    _PREFLIGHT_CACHE.clear()
+    _MEMBER_CACHE.clear()
+
+
+# ---------------------------------------------------------------------------
+# Legs
+# ---------------------------------------------------------------------------
+
+
+def chunk_ranges(
+    start: date, end_inclusive: date, *, span_days: int = DEFAULT_CHUNK_DAYS
+) -> Iterable[Tuple[date, date]]:
+    """Yield ``[start, end)`` windows of ``span_days`` covering ``start..end_inclusive``."""
+
+    end_exclusive = end_inclusive + timedelta(days=1)
+    current = start
+    while current < end_exclusive:
+        chunk_end = min(current + timedelta(days=span_days), end_exclusive)
+        yield current, chunk_end
+        current = chunk_end
+
+
+def load_passport_legs(
+    config: Fl3xxApiConfig,
+    *,
+    from_date: date,
+    to_date: date,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+    fetch_flights_fn: Optional[Callable[..., Tuple[List[Dict[str, Any]], Dict[str, Any]]]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Return normalized, subcharter-filtered legs for the window plus fetch metadata."""
+
+    fetch_flights_fn = fetch_flights_fn or fetch_flights
+    flights: List[Dict[str, Any]] = []
+    chunk_meta: List[Dict[str, Any]] = []
+
+    for chunk_start, chunk_end in chunk_ranges(from_date, to_date, span_days=chunk_days):
+        chunk_flights, meta = fetch_flights_fn(config, from_date=chunk_start, to_date=chunk_end)
+        flights.extend(chunk_flights)
+        chunk_meta.append(meta)
+
+    normalized_rows, normalization_stats = normalize_fl3xx_payload({"items": flights})
+    filtered_rows, subcharter_skipped = filter_out_subcharter_rows(normalized_rows)
+
+    metadata = {
+        "total_flights": len(flights),
+        "legs_after_filter": len(filtered_rows),
+        "subcharters_filtered": subcharter_skipped,
+        "chunks": chunk_meta,
+        "normalization": normalization_stats,
+    }
+    return filtered_rows, metadata
+
+
+# ---------------------------------------------------------------------------
+# Passenger and preflight payloads
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PassportData:
+    """Everything the passport tabs need for one window.
+
+    Passengers, preflights and errors are keyed by ``str(flight_id)``. Errors
+    are kept as messages rather than exceptions so the whole result can be
+    pickled into Streamlit's data cache.
+    """
+
+    legs: List[Dict[str, Any]] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    passengers: Dict[str, List[PassengerDetail]] = field(default_factory=dict)
+    preflights: Dict[str, Any] = field(default_factory=dict)
+    passenger_errors: Dict[str, str] = field(default_factory=dict)
+    preflight_errors: Dict[str, str] = field(default_factory=dict)
+    requests: int = 0
+    cache_hits: int = 0
+    passport_lookups: int = 0
+
+
+def _needs_passport_backfill(pax: PassengerDetail) -> bool:
+    return bool(pax.user_id) and not (
+        pax.document_number
+        and pax.document_issue_country_iso3
+        and pax.document_expiration is not None
+    )
+
+
+def _fetch_concurrently(
+    config: Fl3xxApiConfig,
+    jobs: List[Tuple[str, str]],
+    fetchers: Dict[str, Callable[..., Any]],
+    max_workers: int,
+) -> Dict[Tuple[str, str], Tuple[bool, Any]]:
+    return fetch_many(
+        jobs,
+        lambda job, http: fetchers[job[0]](config, job[1], session=http),
+        max_workers=max_workers,
+    )
+
+
+def _cached_or_queue(
+    kind: str,
+    identifiers: Iterable[str],
+    cache: Optional[PayloadCache],
+    base_url: str,
+    found: Dict[str, Any],
+    jobs: List[Tuple[str, str]],
+) -> int:
+    hits = 0
+    for identifier in identifiers:
+        hit, payload = cache.get((kind, base_url, identifier)) if cache is not None else (False, None)
+        if hit:
+            found[identifier] = payload
+            hits += 1
+        else:
+            jobs.append((kind, identifier))
+    return hits
+
+
+def fetch_passport_data(
+    config: Fl3xxApiConfig,
+    flight_ids: Iterable[Any],
+    *,
+    legs: Optional[List[Dict[str, Any]]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    max_workers: int = DEFAULT_PASSPORT_FETCH_WORKERS,
+    fetch_pax_fn: Optional[Callable[..., Any]] = None,
+    fetch_preflight_fn: Optional[Callable[..., Any]] = None,
+    fetch_member_fn: Optional[Callable[..., Any]] = None,
+    pax_cache: Optional[PayloadCache] = _PAX_CACHE,
+    preflight_cache: Optional[PayloadCache] = _PREFLIGHT_CACHE,
+    member_cache: Optional[PayloadCache] = _MEMBER_CACHE,
+) -> PassportData:
+    """Fetch pax details and preflights for ``flight_ids`` and backfill passports.
+
+    Pax and preflight payloads for every flight are requested together on one
+    worker pool. Passengers still missing passport details afterwards are
+    collected across all flights and each distinct passenger ID is looked up
+    once, again concurrently. Failed passport lookups leave the passenger as
+    returned by ``pax_details``, exactly as the one-flight backfill does.
+    """
+
+    fetchers = {
+        _PAX: fetch_pax_fn or fetch_flight_pax_details,
+        _PREFLIGHT: fetch_preflight_fn or fetch_preflight,
+        _MEMBER: fetch_member_fn or fetch_crew_member,
+    }
+    data = PassportData(legs=list(legs or []), metadata=dict(metadata or {}))
+    base_url = str(config.base_url)
+    identifiers = unique_ids(flight_ids)
+
+    pax_payloads: Dict[str, Any] = {}
+    jobs: List[Tuple[str, str]] = []
+    data.cache_hits += _cached_or_queue(_PAX, identifiers, pax_cache, base_url, pax_payloads, jobs)
+    data.cache_hits += _cached_or_queue(_PREFLIGHT, identifiers, preflight_cache, base_url, data.preflights, jobs)
+
+    for (kind, identifier), (ok, value) in _fetch_concurrently(config, jobs, fetchers, max_workers).items():
+        is_pax = kind == _PAX
+        if not ok:
+            (data.passenger_errors if is_pax else data.preflight_errors)[identifier] = str(value)
+            continue
+        (pax_payloads if is_pax else data.preflights)[identifier] = value
+        cache = pax_cache if is_pax else preflight_cache
+        if cache is not None:
+            cache.set((kind, base_url, identifier), value)
+    data.requests += len(jobs)
+
+    for identifier, payload in pax_payloads.items():
+        data.passengers[identifier] = extract_passengers_from_pax_details(payload)
+
+    member_ids = unique_ids(
+        pax.user_id
+        for passengers in data.passengers.values()
+        for pax in passengers
+        if _needs_passport_backfill(pax)
+    )
+    if not member_ids:
+        return data
+
+    members: Dict[str, Any] = {}
+    jobs = []
+    data.cache_hits += _cached_or_queue(_MEMBER, member_ids, member_cache, base_url, members, jobs)
+    for (_, identifier), (ok, value) in _fetch_concurrently(config, jobs, fetchers, max_workers).items():
+        if ok:
+            members[identifier] = value
+            if member_cache is not None:
+                member_cache.set((_MEMBER, base_url, identifier), value)
+    data.requests += len(jobs)
+    data.passport_lookups = len(member_ids)
+
+    def _lookup_member(_config: Fl3xxApiConfig, user_id: Any, session: Any = None) -> Any:
+        try:
+            return members[str(user_id)]
+        except KeyError:
+            raise LookupError(f"No passport record loaded for {user_id}") from None
+
+    # The lookup never touches the network; one shared session just stops the
+    # backfill helper from opening (and closing) a new one for every flight.
+    with requests.Session() as http:
+        for identifier, passengers in data.passengers.items():
+            if any(_needs_passport_backfill(pax) for pax in passengers):
+                data.passengers[identifier] = backfill_missing_passenger_passports(
+                    config, passengers, session=http, fetch_member_fn=_lookup_member
+                )
+    return data
+
+
+__all__ = [
+    "DEFAULT_CHUNK_DAYS",
+    "DEFAULT_PASSPORT_FETCH_WORKERS",
+    "PASSPORT_PAYLOAD_CACHE_TTL_SECONDS",
+    "PassportData",
+    "chunk_ranges",
+    "clear_passport_payload_cache",
+    "fetch_passport_data",
+    "load_passport_legs",
+]
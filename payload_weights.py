@@ -0,0 +1,389 @@
+"""Standard-weight pax and cargo payloads from FL3XX pax details.
+
+Pax detail payloads are flattened once into two compact tables, one row per
+ticket and one row per cargo/animal entry, and payload weights for every flight
+in a window are then computed with a single vectorised pass over those tables.
+The OCA high pax weight report, the feasibility weight and balance checker and
+the Max ZFW Checker page all share these season and standard-weight rules.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+STD_WEIGHTS = {
+    "Summer": {"Male": 193, "Female": 159, "Child": 75, "Infant": 30},
+    "Winter": {"Male": 199, "Female": 165, "Child": 75, "Infant": 30},
+}
+
+PAX_CATEGORIES = ("Male", "Female", "Child", "Infant")
+SUMMER_MONTHS = range(4, 11)
+
+DEFAULT_CARGO_PER_PAX = 30
+DEFAULT_ANIMAL_WEIGHT = 30.0
+
+TICKET_COLUMNS = ["flight_id", "category", "gender", "declared_weight", "luggage_weight"]
+CARGO_COLUMNS = ["flight_id", "kind", "weight", "note", "type", "unit"]
+WEIGHT_COLUMNS = [
+    "season",
+    "pax_count",
+    "missing_weights",
+    "pax_weight",
+    "cargo_weight",
+    "animal_weight",
+    "total_weight",
+    *PAX_CATEGORIES,
+]
+
+_SEASON_CODES = {season: idx for idx, season in enumerate(STD_WEIGHTS)}
+_CATEGORY_CODES = {category: idx for idx, category in enumerate(PAX_CATEGORIES)}
+_STANDARD_WEIGHT_MATRIX = np.array(
+    [[STD_WEIGHTS[season][category] for category in PAX_CATEGORIES] for season in STD_WEIGHTS],
+    dtype=float,
+)
+
+_TICKET_CHILD_KEYS = ("pax", "pax_details", "paxDetails", "paxPayload", "passengers", "payload")
+_CARGO_KEYS = ("cargo", "cargoItems", "cargo_items", "animal", "animals")
+_ANIMAL_KEYS = {"animal", "animals"}
+_CARGO_CHILD_KEYS = ("pax", "paxPayload", "payload")
+_CONTAINERS = (Mapping, list, tuple, set)
+
+
+def season_for_month(month: Optional[int]) -> str:
+    """Return ``Summer`` for April through October and ``Winter`` otherwise."""
+
+    if month and month in SUMMER_MONTHS:
+        return "Summer"
+    return "Winter"
+
+
+def determine_season(departure_time: Any) -> str:
+    """Return ``Summer`` or ``Winter`` based on the month (UTC).
+
+    Defaults to ``Winter`` when the date cannot be determined.
+    """
+
+    month: Optional[int] = None
+    if isinstance(departure_time, (int, float)):
+        try:
+            if departure_time > 10**11:
+                departure_time = departure_time / 1000.0
+            month = datetime.utcfromtimestamp(float(departure_time)).month
+        except Exception:
+            month = None
+    elif isinstance(departure_time, str):
+        try:
+            parsed = datetime.fromisoformat(departure_time.replace("Z", "+00:00"))
+            month = parsed.month
+        except ValueError:
+            month = None
+    if month is None and isinstance(departure_time, Mapping):
+        for key in ("departureTime", "dep_time"):
+            candidate = departure_time.get(key)
+            if candidate:
+                return determine_season(candidate)
+    return season_for_month(month)
+
+
+def normalize_season(season: Any) -> str:
+    return season if season in STD_WEIGHTS else "Winter"
+
+
+def standard_pax_weight(season: str, category: str) -> float:
+    weights = STD_WEIGHTS[normalize_season(season)]
+    return float(weights.get(category, weights["Male"]))
+
+
+def coerce_weight(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number:  # NaN guard
+        return None
+    return number
+
+
+def _normalize_gender_label(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    cleaned = str(value).strip().lower()
+    if cleaned.startswith("f"):
+        return "Female"
+    if cleaned.startswith("m"):
+        return "Male"
+    return None
+
+
+def _extract_label(value: Any, *keys: str) -> Optional[str]:
+    """Return a non-empty string from ``value`` or selected mapping keys."""
+
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    if isinstance(value, Mapping):
+        for key in keys:
+            candidate = value.get(key)
+            if isinstance(candidate, str) and candidate.strip():
+                return candidate.strip()
+    return None
+
+
+def _pax_user(ticket: Mapping[str, Any]) -> Mapping[str, Any]:
+    pax_user = ticket.get("paxUser")
+    return pax_user if isinstance(pax_user, Mapping) else {}
+
+
+def ticket_gender(ticket: Mapping[str, Any]) -> Optional[str]:
+    """Return ``Male``/``Female`` from the ticket, its pax user or its pax type label."""
+
+    pax_user = _pax_user(ticket)
+    gender_raw = (
+        _extract_label(ticket.get("gender"))
+        or _extract_label(pax_user.get("gender"))
+        or _extract_label(pax_user.get("sex"))
+        or _extract_label(pax_user.get("salutation"))
+        or _extract_label(pax_user.get("title"))
+    )
+    return _normalize_gender_label(gender_raw) or _normalize_gender_label(_pax_type(ticket))
+
+
+def _pax_type(ticket: Mapping[str, Any]) -> str:
+    return (
+        _extract_label(ticket.get("paxType"), "code", "type", "name", "label")
+        or _extract_label(ticket.get("type"))
+        or _extract_label(ticket.get("pax_type"))
+        or "ADULT"
+    ).upper()
+
+
+def pax_category(ticket: Mapping[str, Any]) -> str:
+    """Return the standard-weight category (``Male``/``Female``/``Child``/``Infant``).
+
+    Adults whose gender cannot be determined fall back to ``Male``, the
+    conservative standard weight.
+    """
+
+    pax_type = _pax_type(ticket)
+    if "INFANT" in pax_type:
+        return "Infant"
+    if "CHILD" in pax_type or "CHD" in pax_type:
+        return "Child"
+    return ticket_gender(ticket) or "Male"
+
+
+def declared_pax_weight(ticket: Mapping[str, Any]) -> Optional[float]:
+    pax_user = _pax_user(ticket)
+    return coerce_weight(ticket.get("bodyWeight") or ticket.get("weight") or pax_user.get("bodyWeight"))
+
+
+def declared_cargo_weight(entry: Mapping[str, Any]) -> Optional[float]:
+    return coerce_weight(entry.get("weightQty") or entry.get("weight") or entry.get("weight_qty"))
+
+
+def _is_sequence(value: Any) -> bool:
+    return isinstance(value, Iterable) and not isinstance(value, (str, bytes, bytearray, Mapping))
+
+
+def iter_pax_tickets(payload: Any) -> Iterable[Mapping[str, Any]]:
+    """Yield ticket mappings from many possible pax payload shapes.
+
+    FL3XX responses sometimes nest ``tickets`` under several layers (e.g.
+    ``payload`` → ``paxPayload`` → ``tickets``). We traverse mappings/lists
+    breadth-first and emit each unique ticket mapping once.
+    """
+
+    search_queue: List[Any] = [payload] if payload is not None else []
+    visited: set[int] = set()
+    yielded: set[int] = set()
+
+    while search_queue:
+        current = search_queue.pop(0)
+        marker = id(current)
+        if marker in visited:
+            continue
+        visited.add(marker)
+
+        if isinstance(current, Mapping):
+            entries = current.get("tickets")
+            if _is_sequence(entries):
+                for entry in entries:
+                    if isinstance(entry, Mapping) and id(entry) not in yielded:
+                        yielded.add(id(entry))
+                        yield entry
+
+            for key in _TICKET_CHILD_KEYS:
+                child = current.get(key)
+                if child is not None:
+                    search_queue.append(child)
+            search_queue.extend(child for child in current.values() if isinstance(child, _CONTAINERS))
+
+        elif _is_sequence(current):
+            search_queue.extend(child for child in current if isinstance(child, _CONTAINERS))
+
+
+def iter_cargo(payload: Any) -> Iterable[Tuple[Mapping[str, Any], str]]:
+    """Yield ``(entry, kind)`` cargo items from nested payload structures.
+
+    ``kind`` is ``"animal"`` for entries under ``animal``/``animals`` keys and
+    ``"cargo"`` otherwise.
+    """
+
+    search_queue: List[Any] = [payload] if payload is not None else []
+    visited: set[int] = set()
+    yielded: set[int] = set()
+
+    while search_queue:
+        current = search_queue.pop(0)
+        marker = id(current)
+        if marker in visited:
+            continue
+        visited.add(marker)
+
+        if isinstance(current, Mapping):
+            for key in _CARGO_KEYS:
+                entries = current.get(key)
+                if not _is_sequence(entries):
+                    continue
+                for entry in entries:
+                    if isinstance(entry, Mapping) and id(entry) not in yielded:
+                        yielded.add(id(entry))
+                        yield entry, "animal" if key in _ANIMAL_KEYS else "cargo"
+
+            search_queue.extend(
+                child for child in (current.get(key) for key in _CARGO_CHILD_KEYS) if isinstance(child, _CONTAINERS)
+            )
+            search_queue.extend(child for child in current.values() if isinstance(child, _CONTAINERS))
+
+        elif _is_sequence(current):
+            search_queue.extend(child for child in current if isinstance(child, _CONTAINERS))
+
+
+@dataclass
+class PayloadTables:
+    """Flattened pax details: one row per ticket and one per cargo entry."""
+
+    flight_ids: List[Any]
+    tickets: pd.DataFrame
+    cargo: pd.DataFrame
+
+
+def flatten_pax_payloads(payloads: Mapping[Any, Any]) -> PayloadTables:
+    """Flatten ``{flight_id: pax_details payload}`` into ticket and cargo tables."""
+
+    ticket_rows: Dict[str, List[Any]] = {column: [] for column in TICKET_COLUMNS}
+    cargo_rows: Dict[str, List[Any]] = {column: [] for column in CARGO_COLUMNS}
+    for flight_id, payload in payloads.items():
+        for ticket in iter_pax_tickets(payload):
+            ticket_rows["flight_id"].append(flight_id)
+            ticket_rows["category"].append(pax_category(ticket))
+            ticket_rows["gender"].append(ticket_gender(ticket))
+            ticket_rows["declared_weight"].append(declared_pax_weight(ticket))
+            ticket_rows["luggage_weight"].append(
+                coerce_weight(ticket.get("luggageWeight") or ticket.get("luggage_weight"))
+            )
+        for entry, kind in iter_cargo(payload):
+            cargo_rows["flight_id"].append(flight_id)
+            cargo_rows["kind"].append(kind)
+            cargo_rows["weight"].append(declared_cargo_weight(entry))
+            cargo_rows["note"].append(entry.get("note"))
+            cargo_rows["type"].append(entry.get("type") or entry.get("cargoType"))
+            cargo_rows["unit"].append(entry.get("weightUnit") or entry.get("unit"))
+
+    for rows, columns in ((ticket_rows, ("declared_weight", "luggage_weight")), (cargo_rows, ("weight",))):
+        for column in columns:
+            rows[column] = np.array(rows[column], dtype=float)
+    return PayloadTables(
+        flight_ids=list(payloads.keys()),
+        tickets=pd.DataFrame(ticket_rows, columns=TICKET_COLUMNS),
+        cargo=pd.DataFrame(cargo_rows, columns=CARGO_COLUMNS),
+    )
+
+
+def _codes(lookup: Mapping[Any, int], values: Iterable[Any], count: int) -> np.ndarray:
+    return np.fromiter((lookup[value] for value in values), dtype=np.intp, count=count)
+
+
+def compute_payload_weights(
+    tables: PayloadTables,
+    seasons: Mapping[Any, str],
+    *,
+    animal_default_weight: Optional[float] = None,
+) -> pd.DataFrame:
+    """Return one row of payload weights per flight in ``tables``.
+
+    Tickets without a declared body weight use the standard weight for the
+    flight's season and pax category, plus any declared luggage. Cargo and
+    animal entries without a weight are ignored unless ``animal_default_weight``
+    is given for animals. When a flight has no weighted cargo at all, cargo
+    defaults to :data:`DEFAULT_CARGO_PER_PAX` per ticket. ``total_weight`` is
+    NaN for flights whose payload holds neither tickets nor cargo entries.
+    """
+
+    flight_ids = tables.flight_ids
+    count = len(flight_ids)
+    positions = {flight_id: idx for idx, flight_id in enumerate(flight_ids)}
+    season_labels = [normalize_season(seasons.get(flight_id)) for flight_id in flight_ids]
+    season_codes = _codes(_SEASON_CODES, season_labels, count)
+
+    tickets = tables.tickets
+    ticket_flights = _codes(positions, tickets["flight_id"], len(tickets))
+    category_codes = _codes(_CATEGORY_CODES, tickets["category"], len(tickets))
+    declared = tickets["declared_weight"].to_numpy(dtype=float)
+    missing = np.isnan(declared)
+    standard_weights = _STANDARD_WEIGHT_MATRIX[season_codes[ticket_flights], category_codes]
+    ticket_weights = np.where(missing, standard_weights, declared) + np.nan_to_num(
+        tickets["luggage_weight"].to_numpy(dtype=float)
+    )
+
+    pax_count = np.bincount(ticket_flights, minlength=count)
+    missing_weights = np.bincount(ticket_flights, weights=missing, minlength=count).astype(int)
+    pax_weight = np.bincount(ticket_flights, weights=ticket_weights, minlength=count)
+    category_counts = np.zeros((count, len(PAX_CATEGORIES)), dtype=int)
+    np.add.at(category_counts, (ticket_flights, category_codes), 1)
+
+    cargo = tables.cargo
+    cargo_flights = _codes(positions, cargo["flight_id"], len(cargo))
+    cargo_weights = cargo["weight"].to_numpy(dtype=float)
+    is_animal = (cargo["kind"] == "animal").to_numpy()
+    if animal_default_weight is not None:
+        cargo_weights = np.where(is_animal & np.isnan(cargo_weights), animal_default_weight, cargo_weights)
+    weighted = ~np.isnan(cargo_weights)
+    cargo_entries = np.bincount(cargo_flights, minlength=count)
+    has_weighted = np.bincount(cargo_flights, weights=weighted, minlength=count) > 0
+    cargo_sum = np.bincount(cargo_flights[weighted & ~is_animal], weights=cargo_weights[weighted & ~is_animal], minlength=count)
+    animal_sum = np.bincount(cargo_flights[weighted & is_animal], weights=cargo_weights[weighted & is_animal], minlength=count)
+
+    cargo_weight = np.where(has_weighted, cargo_sum, DEFAULT_CARGO_PER_PAX * pax_count)
+    animal_weight = np.where(has_weighted, animal_sum, 0.0)
+    total_weight = pax_weight + cargo_weight + animal_weight
+    total_weight = np.where((pax_count == 0) & (cargo_entries == 0), np.nan, total_weight)
+
+    columns: Dict[str, Any] = {
+        "season": season_labels,
+        "pax_count": pax_count,
+        "missing_weights": missing_weights,
+        "pax_weight": pax_weight,
+        "cargo_weight": cargo_weight.astype(float),
+        "animal_weight": animal_weight,
+        "total_weight": total_weight,
+    }
+    for idx, category in enumerate(PAX_CATEGORIES):
+        columns[category] = category_counts[:, idx]
+    return pd.DataFrame(columns, index=pd.Index(flight_ids, name="flight_id", dtype=object), columns=WEIGHT_COLUMNS)
+
+
+def pax_breakdown(row: Mapping[str, Any], *, include_zero: bool = False) -> Dict[str, int]:
+    """Return ``{category: count}`` for one row of :func:`compute_payload_weights`."""
+
+    return {
+        category: int(row[category])
+        for category in PAX_CATEGORIES
+        if include_zero or int(row[category])
+    }
@@ -0,0 +1,261 @@
+"""Concurrent FL3XX preflight scanning with change detection.
+
+Several tools read the preflight checklist of every flight in a window. This
+module gives them one way to do it:
+
+* :func:`fetch_preflights` requests the payloads concurrently through
+  :func:`fl3xx_api.fetch_many` and reports failures per flight.
+* :class:`PreflightScanner` wraps that for pages that poll. Payloads fetched
+  within the last ``min_refetch_seconds`` are reused rather than requested
+  again. Each payload is digested, and parsing only runs when a flight's digest
+  differs from the one it was last parsed at.
+* :class:`PreflightDigestStore` persists the last-seen digest per flight to a
+  small JSON file, so "changed since the last check" survives app restarts.
+  Callers that share one scanner between sessions pass each session's own
+  ``seen`` digests to :meth:`PreflightScanner.scan`, so one session's poll does
+  not swallow the changes another session has not seen yet.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+import requests
+
+from fl3xx_api import (
+    Fl3xxApiConfig,
+    JsonFileStore,
+    PayloadCache,
+    fetch_many,
+    fetch_preflight,
+    instance_key,
+    unique_ids,
+)
+
+DEFAULT_PREFLIGHT_WORKERS = 8
+DEFAULT_DIGEST_ROOT = Path(__file__).resolve().parent / "data" / "preflight_digests"
+# A page polling every few seconds still reaches FL3XX about once a minute per flight.
+DEFAULT_MIN_REFETCH_SECONDS = 60
+DEFAULT_DIGEST_RETENTION_DAYS = 14
+# Parsed results for flights no scan has asked about in a day are dropped.
+PARSED_RETENTION_SECONDS = 24 * 3600
+
+_PREFLIGHT = "preflight"
+
+
+def fetch_preflights(
+    config: Fl3xxApiConfig,
+    flight_ids: Iterable[Any],
+    *,
+    max_workers: int = DEFAULT_PREFLIGHT_WORKERS,
+    session: Optional[requests.Session] = None,
+    fetch_preflight_fn: Optional[Callable[..., Any]] = None,
+) -> Dict[str, Tuple[bool, Any]]:
+    """Fetch preflight payloads through :func:`fl3xx_api.fetch_many`.
+
+    Returns ``{str(flight_id): (ok, payload_or_exception)}`` in request order.
+    """
+
+    fetch_preflight_fn = fetch_preflight_fn or fetch_preflight
+    return fetch_many(
+        unique_ids(flight_ids),
+        lambda flight_id, http: fetch_preflight_fn(config, flight_id, session=http),
+        max_workers=max_workers,
+        session=session,
+    )
+
+
+def preflight_digest(payload: Any) -> str:
+    """Return a stable SHA256 digest of a preflight payload."""
+
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PreflightDigestStore(JsonFileStore):
+    """Last-seen preflight digest per flight, persisted as one JSON file.
+
+    Entries not seen for ``retention_days`` are dropped on the next save so the
+    file only ever covers the flights a tool has looked at recently.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        retention_days: int = DEFAULT_DIGEST_RETENTION_DAYS,
+        now_fn: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        super().__init__(path)
+        self.retention_days = retention_days
+        self._now = now_fn
+
+    @classmethod
+    def for_consumer(
+        cls, consumer: str, base_url: Optional[str] = None, root: Path = DEFAULT_DIGEST_ROOT
+    ) -> "PreflightDigestStore":
+        """Return the store one tool uses for one FL3XX instance."""
+
+        return cls(root / instance_key(base_url) / f"{consumer}.json")
+
+    def get(self, flight_id: Any) -> Optional[str]:
+        with self._lock:
+            entry = self._load().get(str(flight_id))
+        return entry.get("digest") if isinstance(entry, dict) else None
+
+    def update(self, digests: Mapping[str, str]) -> None:
+        """Record ``digests`` as seen now and write the file atomically."""
+
+        now = self._now()
+        cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+        seen_at = now.isoformat()
+        with self._lock:
+            entries = self._load()
+            for flight_id, digest in digests.items():
+                entries[str(flight_id)] = {"digest": digest, "seen_at": seen_at}
+            for flight_id in [key for key, entry in entries.items() if str(entry.get("seen_at", "")) < cutoff]:
+                del entries[flight_id]
+            self._save()
+
+
+@dataclass
+class PreflightScan:
+    """Result of one :meth:`PreflightScanner.scan`, keyed by ``str(flight_id)``.
+
+    ``changed`` lists flights whose preflight differs from the digest seen at
+    the previous check; ``new`` lists flights that had never been seen.
+    """
+
+    parsed: Dict[str, Any] = field(default_factory=dict)
+    digests: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    changed: List[str] = field(default_factory=list)
+    new: List[str] = field(default_factory=list)
+    requests: int = 0
+    reused_payloads: int = 0
+    reparsed: int = 0
+
+
+class PreflightScanner:
+    """Poll preflights for a set of flights, re-parsing only what changed.
+
+    One scanner is meant to live for the whole app (``st.cache_resource``), so
+    the parsed results and recently fetched payloads are shared by every
+    session polling the same flights. ``parse_fn`` must not mutate the payload.
+    """
+
+    def __init__(
+        self,
+        parse_fn: Callable[[Any], Any],
+        *,
+        store: Optional[PreflightDigestStore] = None,
+        max_workers: int = DEFAULT_PREFLIGHT_WORKERS,
+        min_refetch_seconds: float = DEFAULT_MIN_REFETCH_SECONDS,
+        fetch_preflight_fn: Optional[Callable[..., Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.parse_fn = parse_fn
+        self.store = store
+        self.max_workers = max_workers
+        self.fetch_preflight_fn = fetch_preflight_fn
+        self._clock = clock
+        self._payloads = PayloadCache(min_refetch_seconds, clock=clock)
+        self._parsed: Dict[str, Tuple[str, Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def scan(
+        self,
+        config: Fl3xxApiConfig,
+        flight_ids: Iterable[Any],
+        *,
+        seen: Optional[MutableMapping[str, str]] = None,
+    ) -> PreflightScan:
+        """Scan ``flight_ids`` and report changes against the previous check.
+
+        With ``seen`` (one session's ``{flight_id: digest}``), changes are
+        measured against that mapping, which is then updated in place. Flights
+        it has no entry for fall back to the persisted store. Without it, the
+        store alone is the baseline, so any scan consumes the change for all.
+        """
+
+        result = PreflightScan()
+        base_url = str(config.base_url)
+        payloads: Dict[str, Any] = {}
+        to_fetch: List[str] = []
+        for flight_id in unique_ids(flight_ids):
+            hit, payload = self._payloads.get((_PREFLIGHT, base_url, flight_id))
+            if hit:
+                payloads[flight_id] = payload
+                result.reused_payloads += 1
+            else:
+                to_fetch.append(flight_id)
+
+        fetched = fetch_preflights(
+            config,
+            to_fetch,
+            max_workers=self.max_workers,
+            fetch_preflight_fn=self.fetch_preflight_fn,
+        )
+        result.requests = len(to_fetch)
+        for flight_id, (ok, value) in fetched.items():
+            if ok:
+                payloads[flight_id] = value
+                self._payloads.set((_PREFLIGHT, base_url, flight_id), value)
+            else:
+                result.errors[flight_id] = value
+
+        now = self._clock()
+        with self._lock:
+            for flight_id, payload in payloads.items():
+                digest = preflight_digest(payload)
+                result.digests[flight_id] = digest
+                cached = self._parsed.get(flight_id)
+                if cached is None or cached[0] != digest:
+                    parsed = self.parse_fn(payload)
+                    result.reparsed += 1
+                else:
+                    parsed = cached[1]
+                self._parsed[flight_id] = (digest, parsed, now)
+                result.parsed[flight_id] = parsed
+
+                previous = seen.get(flight_id) if seen is not None else None
+                if previous is None and self.store is not None:
+                    previous = self.store.get(flight_id)
+                if seen is not None or self.store is not None:
+                    if previous is None:
+                        result.new.append(flight_id)
+                    elif previous != digest:
+                        result.changed.append(flight_id)
+
+            stale = [key for key, (_, _, seen_at) in self._parsed.items() if now - seen_at > PARSED_RETENTION_SECONDS]
+            for flight_id in stale:
+                del self._parsed[flight_id]
+        # Payloads expire long before parsed results; drop the ones no scan
+        # has re-read so a long-lived scanner does not keep every flight.
+        self._payloads.prune()
+
+        if seen is not None:
+            seen.update(result.digests)
+
+        if self.store is not None and result.digests:
+            self.store.update(result.digests)
+        return result
+
+
+__all__ = [
+    "DEFAULT_DIGEST_ROOT",
+    "DEFAULT_MIN_REFETCH_SECONDS",
+    "DEFAULT_PREFLIGHT_WORKERS",
+    "PreflightDigestStore",
+    "PreflightScan",
+    "PreflightScanner",
+    "fetch_preflights",
+    "preflight_digest",
+]
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from collections.abc import Iterable as IterableABC, Mapping as MappingABC
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import requests
 
@@ -14,6 +15,7 @@ from fl3xx_api import (
     MOUNTAIN_TIME_ZONE,
     fetch_flights,
     fetch_flight_planning_note,
+    fetch_many,
 )
 from flight_leg_utils import (
     filter_out_subcharter_rows,
@@ -86,6 +88,12 @@ _TARGET_DATE_VALUES: Sequence[date] = tuple(
 
 TARGET_DATES: Sequence[date] = tuple(sorted(set(_TARGET_DATE_VALUES)))
 
+RESERVE_CALENDAR_YEARS: Sequence[int] = tuple(sorted(_RESERVE_CALENDAR_DAYS))
+
+# Reserve dates closer together than this share one flights request.
+DEFAULT_WINDOW_GAP_DAYS = 7
+DEFAULT_PLANNING_NOTE_WORKERS = 8
+
 
 @dataclass
 class ReserveDateCheck:
@@ -103,6 +111,7 @@ class ReserveCheckResult:
 
     dates: List[ReserveDateCheck]
     warnings: List[str]
+    diagnostics: Dict[str, Any] = field(default_factory=dict)
 
     @property
     def has_matches(self) -> bool:
@@ -163,6 +172,33 @@ def select_reserve_dates_in_range(start: date, end: date) -> List[date]:
     return [target for target in TARGET_DATES if start <= target <= end]
 
 
+def select_reserve_dates_for_year(year: int) -> List[date]:
+    """Return every configured reserve date in a calendar year."""
+
+    return [target for target in TARGET_DATES if target.year == year]
+
+
+def group_reserve_dates(
+    target_dates: Iterable[date],
+    *,
+    max_gap_days: int = DEFAULT_WINDOW_GAP_DAYS,
+) -> List[List[date]]:
+    """Group sorted reserve dates into runs that one flights request can cover.
+
+    Dates no more than ``max_gap_days`` apart fall in the same run, so a
+    season's clustered reserve days share a single fetch while dates months
+    apart do not pull in every flight in between.
+    """
+
+    groups: List[List[date]] = []
+    for target_date in sorted(set(target_dates)):
+        if groups and (target_date - groups[-1][-1]).days <= max_gap_days:
+            groups[-1].append(target_date)
+        else:
+            groups.append([target_date])
+    return groups
+
+
 def _extract_flight_identifier(row: Mapping[str, Any]) -> Optional[str]:
     for key in (
         "flightId",
@@ -396,6 +432,34 @@ def evaluate_flights_for_date(
     )
 
 
+def prefetch_planning_notes(
+    config: Fl3xxApiConfig,
+    flight_ids: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_PLANNING_NOTE_WORKERS,
+    fetch_planning_note_fn=None,
+) -> Dict[str, Tuple[bool, Any]]:
+    """Fetch each planning note once, concurrently, as ``{flight_id: (ok, payload_or_error)}``."""
+
+    if fetch_planning_note_fn is None:
+        fetch_planning_note_fn = fetch_flight_planning_note
+    return fetch_many(
+        flight_ids,
+        lambda flight_id, http: fetch_planning_note_fn(config, flight_id, session=http),
+        max_workers=max_workers,
+    )
+
+
+def _prefetched_planning_note_fn(notes: Mapping[str, Tuple[bool, Any]]):
+    def _lookup(config: Fl3xxApiConfig, flight_id: Any, session: Any = None) -> Any:
+        ok, payload = notes[str(flight_id)]
+        if not ok:
+            raise payload
+        return payload
+
+    return _lookup
+
+
 def run_reserve_day_check(
     config: Fl3xxApiConfig,
     *,
@@ -403,8 +467,16 @@ def run_reserve_day_check(
     now: Optional[Any] = None,
     limit: int = 4,
     session: Optional[requests.Session] = None,
+    max_gap_days: int = DEFAULT_WINDOW_GAP_DAYS,
+    max_workers: int = DEFAULT_PLANNING_NOTE_WORKERS,
 ) -> ReserveCheckResult:
-    """Fetch flights for upcoming reserve dates and flag club workflows."""
+    """Fetch flights for reserve dates and flag club workflows.
+
+    Dates are grouped by :func:`group_reserve_dates` and each group is
+    covered by a single flights request. Planning notes for every targeted
+    flight across all dates are fetched once, concurrently, and each date is
+    then evaluated from the shared payloads.
+    """
 
     if target_dates is not None:
         upcoming = sorted(target_dates)
@@ -414,22 +486,61 @@ def run_reserve_day_check(
     if not upcoming:
         return ReserveCheckResult(dates=[], warnings=[])
 
+    started = perf_counter()
     http = session or requests.Session()
     close_session = session is None
     results: List[ReserveDateCheck] = []
     warnings: List[str] = []
+    windows = group_reserve_dates(upcoming, max_gap_days=max_gap_days)
+    targeted: Dict[date, Tuple[List[Mapping[str, Any]], Dict[str, Any]]] = {}
+    errors: Dict[date, str] = {}
 
     try:
-        for target_date in upcoming:
+        for window in windows:
             try:
                 flights, metadata = fetch_flights(
                     config,
-                    from_date=target_date,
-                    to_date=target_date + timedelta(days=1),
+                    from_date=window[0],
+                    to_date=window[-1] + timedelta(days=1),
                     session=http,
                 )
             except Exception as exc:  # pragma: no cover - defensive path
-                message = f"{target_date.isoformat()}: Unable to fetch flights: {exc}"
+                for target_date in window:
+                    errors[target_date] = f"{target_date.isoformat()}: Unable to fetch flights: {exc}"
+                continue
+
+            normalized_rows, normalization_stats = normalize_fl3xx_payload({"items": flights})
+            filtered_rows, skipped_subcharter = filter_out_subcharter_rows(normalized_rows)
+            for target_date in window:
+                targeted[target_date] = (
+                    _filter_rows_for_target_date(filtered_rows, target_date),
+                    {
+                        "fetch_metadata": metadata,
+                        "normalization_stats": normalization_stats,
+                        "skipped_subcharter": skipped_subcharter,
+                    },
+                )
+        flights_seconds = perf_counter() - started
+
+        flight_ids = [
+            flight_id
+            for rows, _ in targeted.values()
+            for flight_id in (_extract_flight_identifier(row) for row in rows)
+            if flight_id
+        ]
+        notes_started = perf_counter()
+        notes = prefetch_planning_notes(
+            config,
+            flight_ids,
+            max_workers=max_workers,
+            fetch_planning_note_fn=fetch_flight_planning_note,
+        )
+        notes_seconds = perf_counter() - notes_started
+        planning_note_fn = _prefetched_planning_note_fn(notes)
+
+        for target_date in upcoming:
+            if target_date in errors:
+                message = errors[target_date]
                 warnings.append(message)
                 results.append(
                     ReserveDateCheck(
@@ -441,24 +552,16 @@ def run_reserve_day_check(
                 )
                 continue
 
-            normalized_rows, normalization_stats = normalize_fl3xx_payload({"items": flights})
-            filtered_rows, skipped_subcharter = filter_out_subcharter_rows(normalized_rows)
-            targeted_rows = _filter_rows_for_target_date(filtered_rows, target_date)
-
+            targeted_rows, fetch_diagnostics = targeted[target_date]
             date_result = evaluate_flights_for_date(
                 config,
                 targeted_rows,
                 target_date,
                 session=http,
+                fetch_planning_note_fn=planning_note_fn,
             )
-            date_result.diagnostics.update(
-                {
-                    "fetch_metadata": metadata,
-                    "normalization_stats": normalization_stats,
-                    "skipped_subcharter": skipped_subcharter,
-                    "targeted_flights": len(targeted_rows),
-                }
-            )
+            date_result.diagnostics.update(fetch_diagnostics)
+            date_result.diagnostics["targeted_flights"] = len(targeted_rows)
             warnings.extend(date_result.warnings)
             results.append(date_result)
     finally:
@@ -468,15 +571,31 @@ def run_reserve_day_check(
             except AttributeError:
                 pass
 
-    return ReserveCheckResult(dates=results, warnings=warnings)
+    diagnostics = {
+        "flight_windows": len(windows),
+        "planning_note_requests": len(notes),
+        "planning_note_lookups": len(flight_ids),
+        "timings": {
+            "flights_requests_s": flights_seconds,
+            "planning_note_requests_s": notes_seconds,
+            "total_s": perf_counter() - started,
+        },
+    }
+    return ReserveCheckResult(dates=results, warnings=warnings, diagnostics=diagnostics)
 
 
 __all__ = [
+    "DEFAULT_PLANNING_NOTE_WORKERS",
+    "DEFAULT_WINDOW_GAP_DAYS",
+    "RESERVE_CALENDAR_YEARS",
     "ReserveCheckResult",
     "ReserveDateCheck",
     "TARGET_DATES",
     "evaluate_flights_for_date",
+    "group_reserve_dates",
+    "prefetch_planning_notes",
     "run_reserve_day_check",
+    "select_reserve_dates_for_year",
     "select_reserve_dates_in_range",
     "select_upcoming_reserve_dates",
 ]
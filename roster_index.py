@@ -0,0 +1,274 @@
+"""Indexed roster timelines for fast point-in-time crew queries.
+
+Roster pulls are parsed once into per-crew event arrays sorted by time plus an
+interval tree over every timed event, so questions such as "latest positioning
+before t", "who is in the air at t" or "who is at CYYC at 14:00" become
+``bisect``/tree lookups instead of rescans of every roster row.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+
+T = TypeVar("T")
+
+EventBuilder = Callable[[Mapping[str, Any]], List[Dict[str, Any]]]
+
+
+class SortedTimeline:
+    """Events ordered by one datetime field with ``bisect`` lookups.
+
+    Events whose key is not a ``datetime`` are dropped. Ordering is stable, so
+    events sharing a timestamp keep the order they were supplied in.
+    """
+
+    def __init__(self, events: Iterable[Mapping[str, Any]], key: str) -> None:
+        keyed = [(event[key], event) for event in events if isinstance(event.get(key), datetime)]
+        keyed.sort(key=lambda item: item[0])
+        self._keys: List[datetime] = [item[0] for item in keyed]
+        self._events: List[Mapping[str, Any]] = [item[1] for item in keyed]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._events)
+
+    def latest_at_or_before(self, at_time: datetime, *, first_on_tie: bool = False) -> Optional[Mapping[str, Any]]:
+        """Return the event with the greatest key ``<= at_time``.
+
+        When several events share that key the last supplied one wins, unless
+        ``first_on_tie`` is set.
+        """
+
+        idx = bisect_right(self._keys, at_time) - 1
+        if idx < 0:
+            return None
+        if first_on_tie:
+            idx = bisect_left(self._keys, self._keys[idx])
+        return self._events[idx]
+
+    def first_after(self, at_time: datetime) -> Optional[Mapping[str, Any]]:
+        idx = bisect_right(self._keys, at_time)
+        if idx >= len(self._events):
+            return None
+        return self._events[idx]
+
+    def after(self, at_time: datetime) -> List[Mapping[str, Any]]:
+        """Return events whose key is strictly after ``at_time`` in order."""
+
+        return self._events[bisect_right(self._keys, at_time) :]
+
+    def between(self, start: datetime, end: datetime) -> List[Mapping[str, Any]]:
+        """Return events whose key falls inside ``[start, end]``."""
+
+        return self._events[bisect_left(self._keys, start) : bisect_right(self._keys, end)]
+
+
+@dataclass
+class _IntervalNode(Generic[T]):
+    center: datetime
+    starts: List[datetime]
+    by_start: List[Tuple[datetime, datetime, T]]
+    ends: List[datetime]
+    by_end: List[Tuple[datetime, datetime, T]]
+    left: Optional["_IntervalNode[T]"] = None
+    right: Optional["_IntervalNode[T]"] = None
+
+
+class IntervalTree(Generic[T]):
+    """Static centered interval tree over closed ``[start, end]`` intervals."""
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]]) -> None:
+        items = [
+            (start, end, value)
+            for start, end, value in intervals
+            if isinstance(start, datetime) and isinstance(end, datetime) and start <= end
+        ]
+        self._size = len(items)
+        self._root = self._build(sorted(items, key=lambda item: item[0]))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def _build(cls, items: Sequence[Tuple[datetime, datetime, T]]) -> Optional[_IntervalNode[T]]:
+        if not items:
+            return None
+        # ``items`` arrive sorted by start, so the median interval always
+        # contains the center and every level makes progress.
+        center = items[len(items) // 2][0]
+        left: List[Tuple[datetime, datetime, T]] = []
+        right: List[Tuple[datetime, datetime, T]] = []
+        here: List[Tuple[datetime, datetime, T]] = []
+        for item in items:
+            if item[1] < center:
+                left.append(item)
+            elif item[0] > center:
+                right.append(item)
+            else:
+                here.append(item)
+        by_end = sorted(here, key=lambda item: item[1])
+        return _IntervalNode(
+            center=center,
+            starts=[item[0] for item in here],
+            by_start=here,
+            ends=[item[1] for item in by_end],
+            by_end=by_end,
+            left=cls._build(left),
+            right=cls._build(right),
+        )
+
+    def at(self, point: datetime) -> List[T]:
+        """Return values of every interval containing ``point``."""
+
+        return self.overlapping(point, point)
+
+    def overlapping(self, start: datetime, end: datetime) -> List[T]:
+        """Return values of every interval intersecting ``[start, end]``."""
+
+        found: List[T] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                count = bisect_right(node.starts, end)
+                found.extend(item[2] for item in node.by_start[:count])
+                stack.append(node.left)
+            elif start > node.center:
+                offset = bisect_left(node.ends, start)
+                found.extend(item[2] for item in node.by_end[offset:])
+                stack.append(node.right)
+            else:
+                found.extend(item[2] for item in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+
+@dataclass
+class CrewTimeline:
+    """One roster row with its events sorted by start time."""
+
+    position: int
+    row: Mapping[str, Any]
+    user: Mapping[str, Any]
+    events: List[Dict[str, Any]]
+    by_start: SortedTimeline
+    cache: Dict[Any, Any] = field(default_factory=dict)
+
+    def ending(self, predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None, *, name: str = "") -> SortedTimeline:
+        """Return (and memoize under ``name``) a timeline keyed by event end."""
+
+        cache_key = ("ending", name)
+        timeline = self.cache.get(cache_key)
+        if timeline is None:
+            selected = self.events if predicate is None else [event for event in self.events if predicate(event)]
+            timeline = SortedTimeline(selected, "end")
+            self.cache[cache_key] = timeline
+        return timeline
+
+
+class RosterIndex:
+    """Per-crew sorted event arrays plus an interval tree for one roster pull.
+
+    ``event_builder`` turns a roster row into event dictionaries carrying at
+    least ``start`` and ``end`` datetimes; each consumer passes its own
+    extractor so field precedence stays identical to the unindexed code.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]], *, event_builder: EventBuilder) -> None:
+        self.event_builder = event_builder
+        self.rows: List[Mapping[str, Any]] = []
+        self.crews: List[CrewTimeline] = []
+        self._intervals: List[Tuple[Any, Any, Tuple[int, int]]] = []
+        for row in rows:
+            if isinstance(row, Mapping):
+                self._add(row, event_builder(row))
+        self._finalise()
+
+    @classmethod
+    def from_events(
+        cls,
+        pairs: Iterable[Tuple[Mapping[str, Any], List[Dict[str, Any]]]],
+        *,
+        event_builder: EventBuilder,
+    ) -> "RosterIndex":
+        """Build an index from ``(row, events)`` pairs already run through ``event_builder``."""
+
+        index = cls([], event_builder=event_builder)
+        for row, events in pairs:
+            index._add(row, events)
+        index._finalise()
+        return index
+
+    def _add(self, row: Mapping[str, Any], events: List[Dict[str, Any]]) -> None:
+        self.rows.append(row)
+        user = row.get("user") if isinstance(row.get("user"), Mapping) else {}
+        crew = CrewTimeline(
+            position=len(self.crews),
+            row=row,
+            user=user,
+            events=events,
+            by_start=SortedTimeline(events, "start"),
+        )
+        self.crews.append(crew)
+        for order, event in enumerate(events):
+            self._intervals.append((event.get("start"), event.get("end"), (crew.position, order)))
+
+    def _finalise(self) -> None:
+        self._tree: IntervalTree[Tuple[int, int]] = IntervalTree(self._intervals)
+        self._intervals = []
+
+    def __len__(self) -> int:
+        return len(self.crews)
+
+    def active_events(
+        self,
+        at_time: datetime,
+        predicate: Optional[Callable[[Mapping[str, Any]], bool]] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Map crew position to its last (in start order) event spanning ``at_time``."""
+
+        latest_order: Dict[int, int] = {}
+        for crew_pos, order in self._tree.at(at_time):
+            if predicate is not None and not predicate(self.crews[crew_pos].events[order]):
+                continue
+            if order > latest_order.get(crew_pos, -1):
+                latest_order[crew_pos] = order
+        return {crew_pos: self.crews[crew_pos].events[order] for crew_pos, order in latest_order.items()}
+
+    def events_overlapping(self, start: datetime, end: datetime) -> List[Tuple[CrewTimeline, Dict[str, Any]]]:
+        """Return ``(crew, event)`` pairs for events intersecting ``[start, end]``."""
+
+        pairs = sorted(self._tree.overlapping(start, end))
+        return [(self.crews[crew_pos], self.crews[crew_pos].events[order]) for crew_pos, order in pairs]
+
+
+def ensure_index(rows: Any, event_builder: EventBuilder) -> RosterIndex:
+    """Return ``rows`` if it is an index built by ``event_builder``, else build one."""
+
+    if isinstance(rows, RosterIndex):
+        if rows.event_builder is event_builder:
+            return rows
+        return RosterIndex(rows.rows, event_builder=event_builder)
+    return RosterIndex(rows, event_builder=event_builder)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import codecs
 from dataclasses import dataclass
 from datetime import UTC, datetime
 import json
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from roster_index import RosterIndex, ensure_index
 
 
 @dataclass(frozen=True)
@@ -81,18 +84,144 @@ def parse_roster_payload(raw_text: str) -> List[Dict[str, Any]]:
     raise ValueError("Unable to parse roster payload as JSON")
 
 
+_ROSTER_LIST_KEYS = ("items", "data", "results", "rows", "roster", "staff")
+_ROSTER_ROW_KEYS = ("user", "entries", "flights")
+_JSON_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    """Text buffer over a chunk iterator that only keeps unconsumed input."""
+
+    def __init__(self, chunks: Iterable[Union[str, bytes]]) -> None:
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk; return ``False`` once input is exhausted."""
+
+        while not self.exhausted:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.exhausted = True
+                text = self._text_decoder.decode(b"", final=True)
+            else:
+                text = chunk if isinstance(chunk, str) else self._text_decoder.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos :] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> Optional[str]:
+        """Return the next non-whitespace character without consuming it."""
+
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Unable to parse roster payload as JSON: expected {char!r}")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks until it closes."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if self.fill():
+                    continue
+                raise ValueError(f"Unable to parse roster payload as JSON: {exc}") from exc
+            # A scalar ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array_rows(reader: _ChunkReader) -> Iterator[Dict[str, Any]]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        value = reader.decode_value()
+        if isinstance(value, Mapping):
+            yield dict(value)
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Unable to parse roster payload as JSON: malformed roster array")
+
+
+def iter_roster_rows(chunks: Iterable[Union[str, bytes]]) -> Iterator[Dict[str, Any]]:
+    """Incrementally parse a roster payload, yielding each row as it completes.
+
+    ``chunks`` may be text or UTF-8 bytes (e.g. ``response.iter_content()``).
+    Only the row currently being decoded is buffered, so memory stays bounded
+    by the largest single crew row rather than the whole download. Accepts the
+    same shapes as :func:`parse_roster_payload` except escaped/quoted exports;
+    for wrapped objects the first roster list in document order is streamed.
+    """
+
+    reader = _ChunkReader(chunks)
+    first = reader.peek()
+    if first == "[":
+        yield from _iter_array_rows(reader)
+        return
+    if first != "{":
+        raise ValueError("Unable to parse roster payload as JSON")
+
+    reader.pos += 1
+    scalars: Dict[str, Any] = {}
+    while reader.peek() != "}":
+        key = reader.decode_value()
+        if not isinstance(key, str):
+            raise ValueError("Unable to parse roster payload as JSON: expected an object key")
+        reader.expect(":")
+        if key in _ROSTER_LIST_KEYS and reader.peek() == "[":
+            yield from _iter_array_rows(reader)
+            return
+        scalars[key] = reader.decode_value()
+        if reader.peek() == ",":
+            reader.pos += 1
+        elif reader.peek() != "}":
+            raise ValueError("Unable to parse roster payload as JSON: malformed object")
+
+    if any(key in scalars for key in _ROSTER_ROW_KEYS):
+        yield scalars
+        return
+    raise ValueError("Unable to parse roster payload as JSON: no roster rows found")
+
+
+def row_has_activity(row: Mapping[str, Any]) -> bool:
+    """Return ``True`` when a roster row has any ``entries`` or ``flights``."""
+
+    entries = row.get("entries")
+    flights = row.get("flights")
+    has_entries = isinstance(entries, list) and len(entries) > 0
+    has_flights = isinstance(flights, list) and len(flights) > 0
+    return has_entries or has_flights
+
+
 def filter_active_roster_rows(rows: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
     """Drop rows where both ``entries`` and ``flights`` are empty lists."""
 
-    filtered: List[Dict[str, Any]] = []
-    for row in rows:
-        entries = row.get("entries")
-        flights = row.get("flights")
-        has_entries = isinstance(entries, list) and len(entries) > 0
-        has_flights = isinstance(flights, list) and len(flights) > 0
-        if has_entries or has_flights:
-            filtered.append(dict(row))
-    return filtered
+    return [dict(row) for row in rows if row_has_activity(row)]
 
 
 def _user_value(user: Mapping[str, Any], *keys: str) -> str:
@@ -137,16 +266,61 @@ def _build_events(row: Mapping[str, Any]) -> List[Dict[str, Any]]:
     return events
 
 
-def build_crew_snapshots(rows: Iterable[Mapping[str, Any]], at_time: datetime) -> List[CrewSnapshot]:
-    """Build current-state snapshots for each crew member at ``at_time``."""
+@dataclass(frozen=True)
+class CrewRecord:
+    """Compact roster row (``user``/``entries``/``flights``) with parsed events."""
+
+    row: Dict[str, Any]
+    events: List[Dict[str, Any]]
+
+
+def iter_crew_records(rows: Iterable[Mapping[str, Any]]) -> Iterator[CrewRecord]:
+    """Filter active rows and extract their events as each row arrives.
+
+    Pair with :func:`iter_roster_rows` to build crew records while a roster
+    download is still in flight.
+    """
+
+    for row in rows:
+        if not isinstance(row, Mapping) or not row_has_activity(row):
+            continue
+        compact = {key: row[key] for key in _ROSTER_ROW_KEYS if key in row}
+        yield CrewRecord(row=compact, events=_build_events(compact))
+
+
+def build_roster_index(rows: Iterable[Union[Mapping[str, Any], CrewRecord]]) -> RosterIndex:
+    """Index roster rows once so repeated snapshot queries avoid rescans.
+
+    :class:`CrewRecord` items reuse their already extracted events.
+    """
+
+    items = list(rows)
+    if items and all(isinstance(item, CrewRecord) for item in items):
+        return RosterIndex.from_events(
+            ((record.row, record.events) for record in items),  # type: ignore[union-attr]
+            event_builder=_build_events,
+        )
+    return RosterIndex(items, event_builder=_build_events)  # type: ignore[arg-type]
+
+
+def build_crew_snapshots(
+    rows: Union[Iterable[Mapping[str, Any]], RosterIndex],
+    at_time: datetime,
+) -> List[CrewSnapshot]:
+    """Build current-state snapshots for each crew member at ``at_time``.
+
+    ``rows`` may be a :class:`RosterIndex` from :func:`build_roster_index` so
+    callers scrubbing through time reuse the sorted event arrays.
+    """
 
     reference = at_time.astimezone(UTC) if at_time.tzinfo else at_time.replace(tzinfo=UTC)
+    index = ensure_index(rows, _build_events)
+    active_by_crew = index.active_events(reference)
     snapshots: List[CrewSnapshot] = []
 
-    for row in rows:
-        user = row.get("user") if isinstance(row.get("user"), Mapping) else {}
-        events = _build_events(row)
-        if not events:
+    for crew in index.crews:
+        user = crew.user
+        if not crew.events:
             continue
 
         name = " ".join(
@@ -163,18 +337,9 @@ def build_crew_snapshots(rows: Iterable[Mapping[str, Any]], at_time: datetime) -
         personnel = _user_value(user, "personnelNumber", "id")
         trigram = _user_value(user, "trigram")
 
-        active: Optional[Dict[str, Any]] = None
-        latest: Optional[Dict[str, Any]] = None
-        next_event: Optional[Dict[str, Any]] = None
-        for event in events:
-            start = event.get("start")
-            end = event.get("end")
-            if isinstance(start, datetime) and start <= reference:
-                latest = event
-            if isinstance(start, datetime) and start > reference and next_event is None:
-                next_event = event
-            if isinstance(start, datetime) and isinstance(end, datetime) and start <= reference <= end:
-                active = event
+        active = active_by_crew.get(crew.position)
+        latest = crew.by_start.latest_at_or_before(reference)
+        next_event = crew.by_start.first_after(reference)
 
         chosen = active or latest or next_event
         if chosen is None:
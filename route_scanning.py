@@ -0,0 +1,278 @@
+"""Scan filed ForeFlight routes for watch-list terms in one pass.
+
+Each distinct route string is split once into tokens (waypoints, airways,
+procedures, speed/level groups), and every watch list is compiled into one
+hashed lookup table, so the cost of a scan grows with the number of route
+tokens rather than routes × terms.
+
+Watch terms are case-insensitive and take three forms:
+
+* ``ROVMA`` matches the token ``ROVMA`` and procedures named after the fix,
+  such as ``ROVMA3`` or ``ROVMA3A``.
+* ``ROV*`` matches any token starting with ``ROV``.
+* ``Q*`` (one or two letters before the ``*``) is an airway wildcard. It only
+  matches airway designators such as ``Q984`` or ``UL9``, not waypoints that
+  happen to share the prefix: ``RO*`` matches ``RO12`` but not ``ROVMA``. Use
+  three or more letters (``ROV*``) to match waypoints. Such terms are listed
+  in :attr:`RouteScanner.airway_wildcards` so callers can point this out.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import re
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from foreflight_utils import (
+    extract_first,
+    extract_foreflight_flights,
+    normalize_airport,
+    normalize_tail,
+    normalize_text,
+    parse_datetime,
+)
+
+ROUTE_TERMS = ("ROVMA", "KUGTC", "OWEBO", "ROZZL")
+DEFAULT_WATCH_LIST = "Watchlist"
+
+_TOKEN_SPLIT = re.compile(r"[^A-Z0-9]+")
+_AIRWAY = re.compile(r"^[A-Z]{1,2}\d{1,4}[A-Z]?$")
+_AIRWAY_PREFIX = re.compile(r"^[A-Z]{1,2}$")
+_PROCEDURE = re.compile(r"^([A-Z]{3,})\d[A-Z]?$")
+
+
+def tokenize_route(route: str) -> List[str]:
+    """Split a filed route into upper-case tokens, dropping separators."""
+
+    return [token for token in _TOKEN_SPLIT.split(route.upper()) if token]
+
+
+def parse_watch_lists(text: str) -> Dict[str, List[str]]:
+    """Parse ``Name: TERM, TERM`` lines into watch lists.
+
+    Lines without a name add to :data:`DEFAULT_WATCH_LIST`. Terms may be
+    separated by commas or whitespace.
+    """
+
+    watch_lists: Dict[str, List[str]] = {}
+    for line in text.splitlines():
+        name, separator, terms = line.partition(":")
+        if not separator:
+            name, terms = DEFAULT_WATCH_LIST, line
+        name = name.strip() or DEFAULT_WATCH_LIST
+        parsed = [term for term in re.split(r"[,\s]+", terms) if term]
+        if parsed:
+            watch_lists.setdefault(name, []).extend(parsed)
+    return watch_lists
+
+
+class RouteScanner:
+    """Watch lists compiled into hashed lookups keyed by token, prefix and airway prefix."""
+
+    def __init__(self, watch_lists: Mapping[str, Iterable[str]]) -> None:
+        self._exact: Dict[str, Set[Tuple[str, str]]] = {}
+        self._prefix: Dict[str, Set[Tuple[str, str]]] = {}
+        self._airway_prefix: Dict[str, Set[Tuple[str, str]]] = {}
+        self.watch_lists: Dict[str, List[str]] = {}
+        self.airway_wildcards: List[str] = []
+        for name, terms in watch_lists.items():
+            compiled = self.watch_lists.setdefault(name, [])
+            for raw in terms:
+                term = str(raw).strip()
+                key = term.upper()
+                if not key or key == "*":
+                    continue
+                if key.endswith("*"):
+                    prefix = key[:-1]
+                    if _AIRWAY_PREFIX.match(prefix):
+                        self._airway_prefix.setdefault(prefix, set()).add((name, term))
+                        if term not in self.airway_wildcards:
+                            self.airway_wildcards.append(term)
+                    else:
+                        self._prefix.setdefault(prefix, set()).add((name, term))
+                else:
+                    self._exact.setdefault(key, set()).add((name, term))
+                compiled.append(term)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefix})
+        self._airway_prefix_lengths = sorted({len(prefix) for prefix in self._airway_prefix})
+        # Filed routes reuse a small vocabulary of fixes and airways, so each
+        # distinct token is resolved once per scanner.
+        self._token_hits: Dict[str, FrozenSet[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self._exact or self._prefix or self._airway_prefix)
+
+    def match_tokens(self, tokens: Iterable[str]) -> Dict[str, List[str]]:
+        """Return ``{watch_list: sorted matched terms}`` for already tokenized routes."""
+
+        hits: Set[Tuple[str, str]] = set()
+        token_hits = self._token_hits
+        for token in tokens:
+            found = token_hits.get(token)
+            if found is None:
+                found = self._resolve_token(token)
+            if found:
+                hits.update(found)
+
+        by_list: Dict[str, List[str]] = {}
+        for name, term in hits:
+            by_list.setdefault(name, []).append(term)
+        return {name: sorted(set(terms)) for name, terms in sorted(by_list.items())}
+
+    def _resolve_token(self, token: str) -> FrozenSet[Tuple[str, str]]:
+        hits: Set[Tuple[str, str]] = set(self._exact.get(token, ()))
+        procedure = _PROCEDURE.match(token)
+        if procedure:
+            hits.update(self._exact.get(procedure.group(1), ()))
+        for length in self._prefix_lengths:
+            hits.update(self._prefix.get(token[:length], ()))
+        if self._airway_prefix_lengths and _AIRWAY.match(token):
+            for length in self._airway_prefix_lengths:
+                hits.update(self._airway_prefix.get(token[:length], ()))
+        resolved = frozenset(hits)
+        with self._lock:
+            self._token_hits[token] = resolved
+        return resolved
+
+    def scan(self, route: str) -> Dict[str, List[str]]:
+        return self.match_tokens(tokenize_route(route))
+
+
+@dataclass
+class RouteMatch:
+    flight_id: str
+    tail: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: Optional[datetime]
+    route: str
+    matched_terms: List[str]
+    watch_lists: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class RouteScanResult:
+    """Matches from :func:`scan_flights` plus what the scan cost."""
+
+    matches: List[RouteMatch] = field(default_factory=list)
+    flights_scanned: int = 0
+    routes_scanned: int = 0
+    tokens_scanned: int = 0
+    tokenize_seconds: float = 0.0
+    match_seconds: float = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.tokenize_seconds + self.match_seconds
+
+
+def build_route_match(flight: Mapping[str, Any], route: str, watch_hits: Mapping[str, List[str]]) -> RouteMatch:
+    flight_id = normalize_text(extract_first(flight, "flightId", "flight_id", "id")) or "—"
+    tail = normalize_tail(
+        extract_first(
+            flight,
+            "aircraftRegistration",
+            "registration",
+            "tail",
+            "tailNumber",
+            "aircraft",
+        )
+    )
+    if not tail and isinstance(flight.get("aircraft"), Mapping):
+        tail = normalize_tail(extract_first(flight["aircraft"], "registration", "tailNumber"))
+
+    departure_airport = normalize_airport(
+        extract_first(
+            flight,
+            "departure",
+            "departureAirport",
+            "origin",
+            "departureAirportCode",
+            "departureAirportIcao",
+        )
+    )
+    arrival_airport = normalize_airport(
+        extract_first(
+            flight,
+            "destination",
+            "destinationAirport",
+            "arrival",
+            "arrivalAirportCode",
+            "arrivalAirportIcao",
+        )
+    )
+
+    departure_time = parse_datetime(
+        extract_first(
+            flight,
+            "departureTimeUtc",
+            "departureTime",
+            "scheduledDepartureTime",
+            "scheduledDepartureTimeUtc",
+            "departureTimeZulu",
+        )
+    )
+
+    return RouteMatch(
+        flight_id=flight_id,
+        tail=tail or "—",
+        departure_airport=departure_airport or "—",
+        arrival_airport=arrival_airport or "—",
+        departure_time=departure_time,
+        route=route,
+        matched_terms=sorted({term for terms in watch_hits.values() for term in terms}),
+        watch_lists=dict(watch_hits),
+    )
+
+
+def scan_flights(flights: Iterable[Mapping[str, Any]], scanner: RouteScanner) -> RouteScanResult:
+    """Scan every flight's filed route against all of ``scanner``'s watch lists.
+
+    Flights filed on the same route string share one tokenization and one
+    lookup pass.
+    """
+
+    result = RouteScanResult()
+    routed: List[Tuple[Mapping[str, Any], str]] = []
+    for flight in flights:
+        result.flights_scanned += 1
+        route = normalize_text(flight.get("route"))
+        if route:
+            routed.append((flight, route))
+
+    start = time.perf_counter()
+    tokens_by_route: Dict[str, List[str]] = {}
+    for _, route in routed:
+        if route not in tokens_by_route:
+            tokens_by_route[route] = tokenize_route(route)
+    result.tokenize_seconds = time.perf_counter() - start
+    result.routes_scanned = len(tokens_by_route)
+    result.tokens_scanned = sum(len(tokens) for tokens in tokens_by_route.values())
+
+    start = time.perf_counter()
+    hits_by_route = {route: scanner.match_tokens(tokens) for route, tokens in tokens_by_route.items()}
+    result.matches = [
+        build_route_match(flight, route, hits_by_route[route])
+        for flight, route in routed
+        if hits_by_route[route]
+    ]
+    result.match_seconds = time.perf_counter() - start
+    return result
+
+
+__all__ = [
+    "DEFAULT_WATCH_LIST",
+    "ROUTE_TERMS",
+    "RouteMatch",
+    "RouteScanResult",
+    "RouteScanner",
+    "build_route_match",
+    "extract_foreflight_flights",
+    "parse_watch_lists",
+    "scan_flights",
+    "tokenize_route",
+]
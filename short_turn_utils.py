@@ -443,166 +443,146 @@ def normalise_flights_for_short_turns(
     return df, stats
 
 
+_SHORT_TURN_COLUMNS: List[str] = [
+    "tail",
+    "station",
+    "arr_leg_id",
+    "arr_flight_id",
+    "arr_onblock",
+    "dep_leg_id",
+    "dep_flight_id",
+    "dep_offblock",
+    "turn_min",
+    "required_threshold_min",
+    "priority_flag",
+    "arr_priority_label",
+    "dep_priority_label",
+    "arr_booking_code",
+    "dep_booking_code",
+    "same_booking_code",
+    "arr_is_priority",
+    "dep_is_priority",
+    "arr_account_name",
+    "dep_account_name",
+]
+
+_TURN_SIDE_COLUMNS = ("leg_id", "flight_id", "booking_code", "account_name", "is_priority", "priority_label")
+
+
+def _parse_dt_column(values: pd.Series, *, local_tz: Optional[ZoneInfo] = None) -> pd.Series:
+    """Vectorised :func:`parse_dt`: parse once, treat naive values as UTC, convert to local."""
+
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        parsed = values.dt.tz_convert(timezone.utc)
+    else:
+        cleaned = values.where(values.ne(""))
+        try:
+            parsed = pd.to_datetime(cleaned, utc=True)
+        except (TypeError, ValueError, OverflowError):
+            # Mixed formats: fall back to per-element parsing, still in one call.
+            parsed = pd.to_datetime(cleaned, utc=True, errors="coerce", format="mixed")
+    return parsed.dt.tz_convert(_resolve_local_tz(local_tz))
+
+
+def _same_booking_code(arr_code: Any, dep_code: Any) -> bool:
+    if arr_code and dep_code:
+        arr_code_str = str(arr_code).strip().upper()
+        dep_code_str = str(dep_code).strip().upper()
+        return bool(arr_code_str and arr_code_str == dep_code_str)
+    return False
+
+
+def _turn_side(legs: pd.DataFrame, prefix: str, airport_col: str, time_col: str) -> pd.DataFrame:
+    # Legs without a tail never pair (the old groupby dropped null keys), so
+    # drop them before the keys are cast to str and "nan"/"None" collide.
+    mask = legs["tail"].notna() & legs[airport_col].notna() & legs[time_col].notna()
+    side = legs.loc[mask, ["tail", airport_col, time_col, *_TURN_SIDE_COLUMNS]]
+    return side.rename(
+        columns={airport_col: "station", **{column: f"{prefix}_{column}" for column in _TURN_SIDE_COLUMNS}}
+    )
+
+
 def compute_short_turns(
     legs: pd.DataFrame,
     threshold_min: int,
     priority_threshold_min: int = _PRIORITY_TURN_THRESHOLD_MIN,
 ) -> pd.DataFrame:
+    """Pair each arrival with the next departure of the same tail/station.
+
+    Timestamps are parsed once per column and arrivals are matched to the
+    first strictly later departure with a single ``merge_asof`` keyed by
+    ``(tail, station)``, so the cost grows linearly with the schedule.
+    """
+
+    empty = pd.DataFrame(columns=_SHORT_TURN_COLUMNS)
     if legs.empty:
-        return pd.DataFrame(
-            columns=[
-                "tail",
-                "station",
-                "arr_leg_id",
-                "arr_onblock",
-                "dep_leg_id",
-                "dep_offblock",
-                "turn_min",
-                "required_threshold_min",
-                "priority_flag",
-                "arr_priority_label",
-                "dep_priority_label",
-                "arr_booking_code",
-                "dep_booking_code",
-                "same_booking_code",
-                "arr_account_name",
-                "dep_account_name",
-            ]
-        )
+        return empty
 
     legs = legs.copy()
-    legs["dep_offblock"] = legs["dep_offblock"].apply(parse_dt)
-    legs["arr_onblock"] = legs["arr_onblock"].apply(parse_dt)
+    legs["dep_offblock"] = _parse_dt_column(legs["dep_offblock"])
+    legs["arr_onblock"] = _parse_dt_column(legs["arr_onblock"])
     if "flight_id" not in legs.columns:
         legs["flight_id"] = legs.get("leg_id")
-    if "booking_code" not in legs.columns:
-        legs["booking_code"] = None
-    if "is_priority" not in legs.columns:
-        legs["is_priority"] = False
-    if "priority_label" not in legs.columns:
-        legs["priority_label"] = None
-
-    arrs = legs.dropna(subset=["arr_airport", "arr_onblock"]).copy()
-    arrs.rename(columns={"arr_airport": "station"}, inplace=True)
-
-    deps = legs.dropna(subset=["dep_airport", "dep_offblock"]).copy()
-    deps.rename(columns={"dep_airport": "station"}, inplace=True)
-
-    arrs = arrs[
-        [
-            "tail",
-            "station",
-            "arr_onblock",
-            "leg_id",
-            "flight_id",
-            "booking_code",
-            "account_name",
-            "is_priority",
-            "priority_label",
-        ]
-    ].rename(
-        columns={
-            "leg_id": "arr_leg_id",
-            "flight_id": "arr_flight_id",
-            "booking_code": "arr_booking_code",
-            "account_name": "arr_account_name",
-            "is_priority": "arr_is_priority",
-            "priority_label": "arr_priority_label",
-        }
+    for column, default in (
+        ("leg_id", None),
+        ("booking_code", None),
+        ("account_name", None),
+        ("is_priority", False),
+        ("priority_label", None),
+    ):
+        if column not in legs.columns:
+            legs[column] = default
+
+    arrs = _turn_side(legs, "arr", "arr_airport", "arr_onblock")
+    deps = _turn_side(legs, "dep", "dep_airport", "dep_offblock")
+    if arrs.empty or deps.empty:
+        return empty
+
+    # merge_asof needs matching key dtypes on both sides.
+    for frame in (arrs, deps):
+        frame["tail"] = frame["tail"].astype(str)
+        frame["station"] = frame["station"].astype(str)
+
+    arrs = arrs.sort_values(["tail", "station", "arr_onblock"], kind="mergesort")
+    turns = pd.merge_asof(
+        arrs.sort_values("arr_onblock", kind="mergesort"),
+        deps.sort_values("dep_offblock", kind="mergesort"),
+        left_on="arr_onblock",
+        right_on="dep_offblock",
+        by=["tail", "station"],
+        direction="forward",
+        allow_exact_matches=False,
     )
+    turns = turns[turns["dep_offblock"].notna()]
+    if turns.empty:
+        return empty
 
-    deps = deps[
+    turn_min = (turns["dep_offblock"] - turns["arr_onblock"]).dt.total_seconds() / 60.0
+    priority_flag = turns["dep_is_priority"].map(bool).astype(bool)
+    same_booking = pd.Series(
         [
-            "tail",
-            "station",
-            "dep_offblock",
-            "leg_id",
-            "flight_id",
-            "booking_code",
-            "account_name",
-            "is_priority",
-            "priority_label",
-        ]
-    ].rename(
-        columns={
-            "leg_id": "dep_leg_id",
-            "flight_id": "dep_flight_id",
-            "booking_code": "dep_booking_code",
-            "account_name": "dep_account_name",
-            "is_priority": "dep_is_priority",
-            "priority_label": "dep_priority_label",
-        }
+            _same_booking_code(arr_code, dep_code)
+            for arr_code, dep_code in zip(turns["arr_booking_code"].tolist(), turns["dep_booking_code"].tolist())
+        ],
+        index=turns.index,
+        dtype=bool,
     )
-
-    arrs = arrs.sort_values(["tail", "station", "arr_onblock"]).reset_index(drop=True)
-    deps = deps.sort_values(["tail", "station", "dep_offblock"]).reset_index(drop=True)
-
-    short_turn_rows: List[Dict[str, Any]] = []
-
-    for (tail, station), arr_grp in arrs.groupby(["tail", "station"], sort=False):
-        dep_grp = deps[(deps["tail"] == tail) & (deps["station"] == station)]
-        if dep_grp.empty:
-            continue
-        dep_records = dep_grp.to_dict("records")
-        for _, arr_row in arr_grp.iterrows():
-            arr_time = arr_row["arr_onblock"]
-            next_dep: Optional[Dict[str, Any]] = None
-            for dep_row in dep_records:
-                dep_time = dep_row.get("dep_offblock")
-                if pd.notna(arr_time) and pd.notna(dep_time) and dep_time > arr_time:
-                    next_dep = dep_row
-                    break
-            if next_dep is None:
-                continue
-            dep_time = next_dep.get("dep_offblock")
-            turn_min = (dep_time - arr_time).total_seconds() / 60.0
-
-            arr_priority = bool(arr_row.get("arr_is_priority"))
-            dep_priority = bool(next_dep.get("dep_is_priority"))
-            priority_flag = dep_priority
-
-            arr_code = arr_row.get("arr_booking_code")
-            dep_code = next_dep.get("dep_booking_code")
-            same_booking_code = False
-            if arr_code and dep_code:
-                arr_code_str = str(arr_code).strip().upper()
-                dep_code_str = str(dep_code).strip().upper()
-                same_booking_code = bool(arr_code_str and arr_code_str == dep_code_str)
-
-            required_threshold = threshold_min
-            if priority_flag and not same_booking_code:
-                required_threshold = max(threshold_min, priority_threshold_min)
-
-            if turn_min < required_threshold:
-                short_turn_rows.append(
-                    {
-                        "tail": tail,
-                        "station": station,
-                        "arr_leg_id": arr_row.get("arr_leg_id"),
-                        "arr_flight_id": arr_row.get("arr_flight_id"),
-                        "arr_onblock": arr_time,
-                        "dep_leg_id": next_dep.get("dep_leg_id"),
-                        "dep_flight_id": next_dep.get("dep_flight_id"),
-                        "dep_offblock": dep_time,
-                        "turn_min": round(turn_min, 1),
-                        "required_threshold_min": required_threshold,
-                        "priority_flag": priority_flag,
-                        "arr_priority_label": arr_row.get("arr_priority_label"),
-                        "dep_priority_label": next_dep.get("dep_priority_label"),
-                        "arr_booking_code": arr_code,
-                        "dep_booking_code": dep_code,
-                        "same_booking_code": same_booking_code,
-                        "arr_is_priority": arr_priority,
-                        "dep_is_priority": dep_priority,
-                        "arr_account_name": arr_row.get("arr_account_name"),
-                        "dep_account_name": next_dep.get("dep_account_name"),
-                    }
-                )
-
-    short_df = pd.DataFrame(short_turn_rows)
-    if not short_df.empty:
-        short_df = short_df.sort_values(["turn_min", "tail", "station"]).reset_index(drop=True)
-    return short_df
+    required = pd.Series(threshold_min, index=turns.index)
+    required = required.where(~(priority_flag & ~same_booking), max(threshold_min, priority_threshold_min))
+
+    turns = turns.assign(
+        turn_min=turn_min,
+        required_threshold_min=required,
+        priority_flag=priority_flag,
+        same_booking_code=same_booking,
+        arr_is_priority=turns["arr_is_priority"].map(bool).astype(bool),
+        dep_is_priority=priority_flag,
+    )
+    short_df = turns.loc[turn_min < required, _SHORT_TURN_COLUMNS].copy()
+    if short_df.empty:
+        return empty
+    short_df["turn_min"] = [round(value, 1) for value in short_df["turn_min"].tolist()]
+    return short_df.sort_values(["turn_min", "tail", "station"], kind="mergesort").reset_index(drop=True)
 
 
 def build_short_turn_summary_text(
@@ -5,8 +5,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
 import difflib
+import math
 import re
-from typing import Any, Dict, Iterable, List, Mapping, Optional
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 
 import requests
 
@@ -18,8 +20,12 @@ from fl3xx_api import (
     fetch_preflight,
 )
 from flight_leg_utils import filter_out_subcharter_rows, normalize_fl3xx_payload, safe_parse_dt
+from preflight_scanner import fetch_preflights
 
 
+DEFAULT_SYNDICATE_FETCH_WORKERS = 8
+_FUZZY_RATIO_THRESHOLD = 0.9
+
 _NOTE_KEYS = (
     "bookingNotes",
     "bookingNote",
@@ -50,6 +56,7 @@ class SyndicateAuditEntry:
     note_type: str
     note_line: str
     syndicate_tail_type: str
+    flight_date: Optional[date] = None
 
 
 @dataclass
@@ -58,6 +65,7 @@ class SyndicateAuditResult:
     entries: List[SyndicateAuditEntry]
     diagnostics: Dict[str, Any]
     warnings: List[str]
+    end_date: Optional[date] = None
 
 
 @dataclass
@@ -165,11 +173,113 @@ def _find_fuzzy_account_match(
         if ratio > best_ratio:
             best_ratio = ratio
             best_ratio_match = normalized_account
-    if best_ratio >= 0.9:
+    if best_ratio >= _FUZZY_RATIO_THRESHOLD:
         return best_ratio_match
     return None
 
 
+def _trigrams(value: str) -> FrozenSet[Tuple[str, int]]:
+    """Return the padded trigrams of ``value`` tagged with their occurrence number.
+
+    Tagging keeps repeated trigrams distinct, so the size of a set
+    intersection is the multiset overlap.
+    """
+
+    padded = f" {value} "
+    seen: Dict[str, int] = {}
+    grams = []
+    for idx in range(len(padded) - 2):
+        gram = padded[idx : idx + 3]
+        seen[gram] = seen.get(gram, 0) + 1
+        grams.append((gram, seen[gram]))
+    return frozenset(grams)
+
+
+class AccountIndex:
+    """Normalised account names indexed by token and trigram for partner lookups.
+
+    :meth:`match` returns the same account as :func:`_find_fuzzy_account_match`
+    but only compares the partner against accounts that share its tokens or
+    enough of its trigrams, instead of scanning every account in the window.
+    """
+
+    def __init__(self, account_display: Mapping[str, str]) -> None:
+        self.account_display = account_display
+        self._order: Dict[str, int] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, FrozenSet[Tuple[str, int]]] = {}
+        self._postings: Dict[Tuple[str, int], List[str]] = {}
+        self._matchers: Dict[str, difflib.SequenceMatcher] = {}
+        for position, normalized_account in enumerate(account_display):
+            self._order[normalized_account] = position
+            for token in set(normalized_account.split()):
+                self._tokens.setdefault(token, set()).add(normalized_account)
+            grams = _trigrams(normalized_account)
+            self._grams[normalized_account] = grams
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(normalized_account)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def match(self, partner_normalized: str) -> Optional[str]:
+        if not partner_normalized:
+            return None
+        if partner_normalized in self._order:
+            return partner_normalized
+
+        partner_tokens = set(partner_normalized.split())
+        if partner_tokens and (len(partner_tokens) >= 2 or len(partner_normalized) >= 8):
+            postings = [self._tokens.get(token, set()) for token in partner_tokens]
+            supersets = set.intersection(*postings)
+            if supersets:
+                return min(supersets, key=self._order.__getitem__)
+
+        # SequenceMatcher.ratio() is 2M / L for M matched characters in k blocks.
+        # Consecutive blocks are split by at least one unmatched character, so
+        # k <= L - 2M + 1 and the strings share at least M - 2k >= 5M - 2L - 2
+        # trigrams. A ratio of 0.9 (M >= 0.45L) therefore needs at least
+        # L / 4 - 2 shared trigrams; anything shorter only matches exactly.
+        partner_grams = _trigrams(partner_normalized)
+        partner_length = len(partner_normalized)
+        shortest = math.floor(partner_length * _FUZZY_RATIO_THRESHOLD / (2 - _FUZZY_RATIO_THRESHOLD))
+        required = max(1, math.ceil((partner_length + shortest) / 4 - 2))
+        # An account sharing ``required`` trigrams must share one of the
+        # partner's rarest ``n - required + 1`` trigrams, so only their
+        # postings are read.
+        rarest = sorted(partner_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in rarest[: len(partner_grams) - required + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        best_ratio = 0.0
+        best_ratio_match: Optional[str] = None
+        for normalized_account in sorted(candidates, key=self._order.__getitem__):
+            account_length = len(normalized_account)
+            total_length = partner_length + account_length
+            bound = 2.0 * min(partner_length, account_length) / total_length
+            if bound < _FUZZY_RATIO_THRESHOLD or bound <= best_ratio:
+                continue
+            if len(partner_grams & self._grams[normalized_account]) < total_length / 4 - 2:
+                continue
+            matcher = self._matchers.get(normalized_account)
+            if matcher is None:
+                matcher = difflib.SequenceMatcher(None)
+                matcher.set_seq2(normalized_account)
+                self._matchers[normalized_account] = matcher
+            matcher.set_seq1(partner_normalized)
+            quick = matcher.quick_ratio()
+            if quick < _FUZZY_RATIO_THRESHOLD or quick <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_ratio_match = normalized_account
+        if best_ratio >= _FUZZY_RATIO_THRESHOLD:
+            return best_ratio_match
+        return None
+
+
 def _is_na_name(value: str) -> bool:
     normalized = _normalize_name(value)
     return normalized in {"na", "n a", "none", "no partner"}
@@ -470,12 +580,38 @@ def _is_pax_flight(row: Mapping[str, Any]) -> bool:
     return normalized == "PAX" or "PAX" in normalized or "PASSENGER" in normalized
 
 
+def _group_rows_by_date(
+    rows: Iterable[Mapping[str, Any]], start_date: date, end_date: date
+) -> Dict[date, List[Mapping[str, Any]]]:
+    grouped: Dict[date, List[Mapping[str, Any]]] = {}
+    for row in rows:
+        mountain_dt = _parse_mountain_datetime(row.get("dep_time"))
+        if mountain_dt and start_date <= mountain_dt.date() <= end_date:
+            grouped.setdefault(mountain_dt.date(), []).append(row)
+    return grouped
+
+
 def run_syndicate_audit(
     config: Fl3xxApiConfig,
     *,
     target_date: date,
+    end_date: Optional[date] = None,
     session: Optional[requests.Session] = None,
+    max_workers: int = DEFAULT_SYNDICATE_FETCH_WORKERS,
+    fetch_flights_fn: Callable[..., Tuple[List[Dict[str, Any]], Dict[str, Any]]] = fetch_flights,
+    fetch_preflight_fn: Callable[..., Any] = fetch_preflight,
 ) -> SyndicateAuditResult:
+    """Audit syndicate notes for ``target_date`` or the inclusive range up to ``end_date``.
+
+    Flights for the whole range come from one flights request. Each day is
+    audited against the accounts flying that day, and the preflight payloads
+    for every day are fetched together on a pool of ``max_workers`` threads.
+    """
+
+    last_date = end_date or target_date
+    if last_date < target_date:
+        raise ValueError("end_date must not be before target_date")
+
     diagnostics: Dict[str, Any] = {
         "total_flights": 0,
         "targeted_flights": 0,
@@ -488,96 +624,128 @@ def run_syndicate_audit(
         "missing_booking_notes": 0,
         "syndicate_matches": 0,
     }
+    timings: Dict[str, float] = {}
     warnings: List[str] = []
     entries: List[SyndicateAuditEntry] = []
+    started = time.perf_counter()
 
     http = session or requests.Session()
     close_session = session is None
     try:
-        flights, metadata = fetch_flights(
+        flights, metadata = fetch_flights_fn(
             config,
             from_date=target_date,
-            to_date=target_date + timedelta(days=1),
+            to_date=last_date + timedelta(days=1),
             session=http,
         )
+        timings["flights_request_s"] = time.perf_counter() - started
         diagnostics["fetch_metadata"] = metadata
         diagnostics["total_flights"] = len(flights)
 
         normalized_rows, normalization_stats = normalize_fl3xx_payload({"items": flights})
         filtered_rows, skipped_subcharter = filter_out_subcharter_rows(normalized_rows)
-        targeted_rows = _filter_rows_for_target_date(filtered_rows, target_date)
+        rows_by_date = _group_rows_by_date(filtered_rows, target_date, last_date)
         diagnostics["normalization_stats"] = normalization_stats
         diagnostics["skipped_subcharter"] = skipped_subcharter
-        diagnostics["targeted_flights"] = len(targeted_rows)
-
-        pax_rows = [row for row in targeted_rows if _is_pax_flight(row)]
-        diagnostics["pax_flights"] = len(pax_rows)
-
-        account_rows: Dict[str, Mapping[str, Any]] = {}
-        account_display: Dict[str, str] = {}
-        for row in pax_rows:
-            account_name = _extract_account_name(row)
-            if not account_name:
-                diagnostics["missing_accounts"] += 1
-                continue
-            normalized_account = _normalize_name(account_name)
-            if not normalized_account:
-                diagnostics["missing_accounts"] += 1
-                continue
-            if normalized_account not in account_rows:
-                account_rows[normalized_account] = row
-                account_display[normalized_account] = account_name
-
-        diagnostics["unique_accounts"] = len(account_rows)
-
-        for normalized_account, row in account_rows.items():
-            flight_id = _extract_flight_identifier(row)
-            if not flight_id:
-                diagnostics["missing_flight_ids"] += 1
-                continue
-            diagnostics["preflight_requests"] += 1
-            try:
-                payload = fetch_preflight(config, flight_id, session=http)
-            except Exception as exc:  # pragma: no cover - defensive path
-                diagnostics["preflight_errors"] += 1
-                warnings.append(f"{target_date.isoformat()}: Unable to fetch preflight for flight {flight_id}: {exc}")
-                continue
-
-            booking_notes = _extract_booking_notes(payload)
-            if not booking_notes:
-                diagnostics["missing_booking_notes"] += 1
-                continue
-
-            matches = _extract_syndicate_matches(booking_notes)
-            if not matches:
-                continue
-
-            booking_reference = _extract_booking_reference(row) or flight_id
-            aircraft_type = _extract_aircraft_type(row) or ""
-            workflow = _extract_workflow_label(row) or ""
-            for match in matches:
-                diagnostics["syndicate_matches"] += 1
-                partner_normalized = _normalize_name(match.partner_name)
-                matched_account = _find_fuzzy_account_match(partner_normalized, account_display)
-                partner_present = matched_account is not None
-                partner_match = account_display.get(matched_account) if matched_account else None
-
-                syndicate_tail_type = _extract_tail_type_label(match.tail_type or match.note_line)
-                entry = SyndicateAuditEntry(
-                    owner_account=account_display.get(normalized_account, normalized_account),
-                    partner_account=match.partner_name,
-                    partner_present=partner_present,
-                    partner_match=partner_match,
-                    booking_reference=booking_reference,
-                    aircraft_type=aircraft_type,
-                    workflow=workflow,
-                    tail=_extract_tail(row),
-                    route=_format_route(row),
-                    note_type=match.note_type,
-                    note_line=match.note_line,
-                    syndicate_tail_type=syndicate_tail_type,
-                )
-                entries.append(entry)
+        diagnostics["targeted_flights"] = sum(len(rows) for rows in rows_by_date.values())
+
+        days: List[Tuple[date, Dict[str, Mapping[str, Any]], Dict[str, str]]] = []
+        for flight_date in sorted(rows_by_date):
+            pax_rows = [row for row in rows_by_date[flight_date] if _is_pax_flight(row)]
+            diagnostics["pax_flights"] += len(pax_rows)
+
+            account_rows: Dict[str, Mapping[str, Any]] = {}
+            account_display: Dict[str, str] = {}
+            for row in pax_rows:
+                account_name = _extract_account_name(row)
+                if not account_name:
+                    diagnostics["missing_accounts"] += 1
+                    continue
+                normalized_account = _normalize_name(account_name)
+                if not normalized_account:
+                    diagnostics["missing_accounts"] += 1
+                    continue
+                if normalized_account not in account_rows:
+                    account_rows[normalized_account] = row
+                    account_display[normalized_account] = account_name
+
+            diagnostics["unique_accounts"] += len(account_rows)
+            days.append((flight_date, account_rows, account_display))
+
+        flight_ids: Dict[str, None] = {}
+        for _, account_rows, _ in days:
+            for row in account_rows.values():
+                flight_id = _extract_flight_identifier(row)
+                if not flight_id:
+                    diagnostics["missing_flight_ids"] += 1
+                    continue
+                flight_ids.setdefault(flight_id, None)
+
+        diagnostics["preflight_requests"] = len(flight_ids)
+        preflight_started = time.perf_counter()
+        preflights = fetch_preflights(
+            config,
+            flight_ids,
+            session=http,
+            max_workers=max_workers,
+            fetch_preflight_fn=fetch_preflight_fn,
+        )
+        timings["preflight_requests_s"] = time.perf_counter() - preflight_started
+
+        match_seconds = 0.0
+        for flight_date, account_rows, account_display in days:
+            index = AccountIndex(account_display)
+            for normalized_account, row in account_rows.items():
+                flight_id = _extract_flight_identifier(row)
+                if not flight_id:
+                    continue
+                ok, payload = preflights[flight_id]
+                if not ok:
+                    diagnostics["preflight_errors"] += 1
+                    warnings.append(
+                        f"{flight_date.isoformat()}: Unable to fetch preflight for flight {flight_id}: {payload}"
+                    )
+                    continue
+
+                booking_notes = _extract_booking_notes(payload)
+                if not booking_notes:
+                    diagnostics["missing_booking_notes"] += 1
+                    continue
+
+                matches = _extract_syndicate_matches(booking_notes)
+                if not matches:
+                    continue
+
+                booking_reference = _extract_booking_reference(row) or flight_id
+                aircraft_type = _extract_aircraft_type(row) or ""
+                workflow = _extract_workflow_label(row) or ""
+                for match in matches:
+                    diagnostics["syndicate_matches"] += 1
+                    partner_normalized = _normalize_name(match.partner_name)
+                    match_started = time.perf_counter()
+                    matched_account = index.match(partner_normalized)
+                    match_seconds += time.perf_counter() - match_started
+                    partner_present = matched_account is not None
+                    partner_match = account_display.get(matched_account) if matched_account else None
+
+                    syndicate_tail_type = _extract_tail_type_label(match.tail_type or match.note_line)
+                    entry = SyndicateAuditEntry(
+                        owner_account=account_display.get(normalized_account, normalized_account),
+                        partner_account=match.partner_name,
+                        partner_present=partner_present,
+                        partner_match=partner_match,
+                        booking_reference=booking_reference,
+                        aircraft_type=aircraft_type,
+                        workflow=workflow,
+                        tail=_extract_tail(row),
+                        route=_format_route(row),
+                        note_type=match.note_type,
+                        note_line=match.note_line,
+                        syndicate_tail_type=syndicate_tail_type,
+                        flight_date=flight_date,
+                    )
+                    entries.append(entry)
+        timings["partner_matching_s"] = match_seconds
     finally:
         if close_session:
             try:
@@ -585,11 +753,14 @@ def run_syndicate_audit(
             except AttributeError:
                 pass
 
+    timings["total_s"] = time.perf_counter() - started
+    diagnostics["timings"] = timings
     return SyndicateAuditResult(
         date=target_date,
         entries=entries,
         diagnostics=diagnostics,
         warnings=warnings,
+        end_date=end_date,
     )
 
 
@@ -717,9 +888,10 @@ def run_syndicate_quote_audit(
             owner_account = _extract_account_name(owner_row)
 
         if matches:
+            index = AccountIndex(account_display)
             for entry in matches:
                 partner_normalized = _normalize_name(entry.partner_account)
-                matched_account = _find_fuzzy_account_match(partner_normalized, account_display)
+                matched_account = index.match(partner_normalized)
                 entry.partner_present = matched_account is not None
                 entry.partner_match = account_display.get(matched_account) if matched_account else None
 
@@ -759,6 +931,8 @@ def run_syndicate_quote_audit(
 
 
 __all__ = [
+    "AccountIndex",
+    "DEFAULT_SYNDICATE_FETCH_WORKERS",
     "SyndicateAuditEntry",
     "SyndicateAuditResult",
     "SyndicateQuoteAuditResult",
@@ -0,0 +1,1022 @@
+"""Tail packaging and night-shift assignment for the Task Splitter page.
+
+Legs are grouped into one :class:`TailPackage` per tail and the packages are
+split across shifts so tail counts and workload stay balanced while easterly
+tails land on the earlier shifts and westerly tails on the later ones.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from flight_leg_utils import (
+    is_canadian_country,
+    is_customs_leg,
+    leg_countries,
+    load_airport_metadata_lookup,
+    safe_parse_dt,
+)
+from zoneinfo_compat import ZoneInfo
+
+LOCAL_TZ = ZoneInfo("America/Edmonton")
+
+
+@dataclass
+class TailPackage:
+    tail: str
+    legs: int
+    workload: float
+    first_local_dt: datetime  # first dep local datetime for the day
+    sample_legs: List[Dict[str, Any]]  # optional preview rows for UI (subset)
+    has_priority: bool = False
+    priority_labels: List[str] = field(default_factory=list)
+    customs_legs: int = 0
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+_TAIL_BASE_WORKLOAD = 2.5
+_BASE_LEG_WORKLOAD = 1.0
+_CUSTOMS_LEG_BONUS = 0.25
+
+def _to_local(dt: datetime, tz_name: str | None) -> datetime:
+    if tz_name:
+        try:
+            return dt.astimezone(ZoneInfo(tz_name))
+        except Exception:
+            pass
+    # Fallback: leave in original tz; if naive, assume UTC then convert to LOCAL_TZ so ordering is at least consistent
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=pytz.UTC)
+    return dt.astimezone(LOCAL_TZ)
+
+
+def _priority_label(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+    else:
+        text = str(value).strip()
+    if not text:
+        return None
+    if "priority" in text.lower():
+        return text
+    return None
+
+
+_TAIL_PLACEHOLDER_PREFIXES = ("ADD", "NEW", "TBD", "TEMP", "HOLD", "UNKNOWN", "UNK")
+_TAIL_PLACEHOLDER_VALUES = {"", "NA", "N/A", "NONE", "NULL", "-"}
+_TAIL_US_PATTERN = re.compile(r"^N[0-9]{1,5}[A-Z]{0,2}$")
+_TAIL_HYPHEN_PATTERN = re.compile(r"^[A-Z0-9]{1,2}-[A-Z0-9]{2,5}$")
+_TAIL_ALNUM_PATTERN = re.compile(r"^[A-Z0-9]{4,7}$")
+
+
+def _is_valid_tail_registration(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    candidate = value.strip().upper()
+    if not candidate or candidate in _TAIL_PLACEHOLDER_VALUES:
+        return False
+    if any(ch.isspace() for ch in candidate):
+        return False
+    if candidate.startswith(_TAIL_PLACEHOLDER_PREFIXES):
+        return False
+    if len(candidate) < 3:
+        return False
+    if _TAIL_US_PATTERN.fullmatch(candidate):
+        return True
+    if _TAIL_HYPHEN_PATTERN.fullmatch(candidate):
+        return True
+    if "-" not in candidate and not any(ch.isdigit() for ch in candidate):
+        return False
+    if _TAIL_ALNUM_PATTERN.fullmatch(candidate):
+        return True
+    return False
+
+
+def build_tail_packages(df: pd.DataFrame, target_date: date) -> Tuple[List[TailPackage], Set[str]]:
+    if df.empty:
+        return [], set()
+    # Ensure required columns
+    required = {"tail", "leg_id", "dep_time"}
+    missing = required - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns in data: {missing}")
+
+    df = df.copy()
+    df["tail"] = df["tail"].astype(str)
+
+    invalid_tails: Set[str] = set()
+
+    def _valid_tail(value: Any) -> bool:
+        tail_str = str(value)
+        is_valid = _is_valid_tail_registration(tail_str)
+        if not is_valid:
+            invalid_tails.add(tail_str.strip())
+        return is_valid
+
+    df = df[df["tail"].map(_valid_tail)]
+    if df.empty:
+        return [], invalid_tails
+
+    # Derive local first departure per tail for the day
+    def first_local_for_tail(g: pd.DataFrame) -> datetime:
+        # Filter legs that depart on target_date in their *local* timezone
+        times_local: List[datetime] = []
+        for _, row in g.iterrows():
+            dt = safe_parse_dt(str(row["dep_time"]))
+            tz_name = str(row.get("dep_tz", "")) or None
+            dt_local = _to_local(dt, tz_name)
+            if dt_local.date() == target_date:
+                times_local.append(dt_local)
+        if not times_local:
+            # If none match exactly by local date, fall back to min local
+            for _, row in g.iterrows():
+                dt = safe_parse_dt(str(row["dep_time"]))
+                tz_name = str(row.get("dep_tz", "")) or None
+                times_local.append(_to_local(dt, tz_name))
+        return min(times_local)
+
+    airport_lookup = load_airport_metadata_lookup()
+
+    packages: List[TailPackage] = []
+    for tail, g in df.groupby("tail", sort=False):
+        # Limit to target_date legs (by local date)
+        legs_rows: List[Dict[str, Any]] = []
+        all_rows: List[Dict[str, Any]] = []
+        priority_values: Set[str] = set()
+        for _, row in g.iterrows():
+            row_dict = row.to_dict()
+            dep_country, arr_country = leg_countries(row_dict, airport_lookup)
+            row_dict["departure_country"] = dep_country
+            row_dict["arrival_country"] = arr_country
+            is_customs = is_customs_leg(row_dict, airport_lookup)
+            row_dict["is_customs_leg"] = is_customs
+            row_dict["is_customs_workload_leg"] = bool(
+                is_customs and arr_country and not is_canadian_country(arr_country)
+            )
+            all_rows.append(row_dict)
+            priority_label = _priority_label(row_dict.get("workflowCustomName"))
+            if priority_label:
+                priority_values.add(priority_label)
+            dt = safe_parse_dt(str(row_dict["dep_time"]))
+            tz_name = str(row_dict.get("dep_tz", "")) or None
+            dt_local = _to_local(dt, tz_name)
+            if dt_local.date() == target_date:
+                legs_rows.append(row_dict)
+        # If none strictly on target_date by local, treat all as same-day package
+        if not legs_rows:
+            legs_rows = all_rows
+        first_dt = first_local_for_tail(pd.DataFrame(legs_rows))
+        customs_count = sum(
+            1 for leg in legs_rows if leg.get("is_customs_workload_leg")
+        )
+        workload = _TAIL_BASE_WORKLOAD
+        for leg in legs_rows:
+            workload += _BASE_LEG_WORKLOAD
+            if leg.get("is_customs_workload_leg"):
+                workload += _CUSTOMS_LEG_BONUS
+        packages.append(
+            TailPackage(
+                tail=str(tail),
+                legs=len(legs_rows),
+                workload=workload,
+                first_local_dt=first_dt,
+                sample_legs=legs_rows[:3],
+                has_priority=bool(priority_values),
+                priority_labels=sorted(priority_values),
+                customs_legs=customs_count,
+            )
+        )
+    return packages, invalid_tails
+
+
+def assign_round_robin_by_first(packages: List[TailPackage], labels: List[str]) -> Dict[str, List[TailPackage]]:
+    packages_sorted = sorted(packages, key=lambda p: p.first_local_dt)
+    buckets: Dict[str, List[TailPackage]] = {lab: [] for lab in labels}
+    for i, pkg in enumerate(packages_sorted):
+        label = labels[i % len(labels)]
+        buckets[label].append(pkg)
+    return buckets
+
+
+def assign_balanced_by_legs(packages: List[TailPackage], labels: List[str]) -> Dict[str, List[TailPackage]]:
+    # Greedy bin-pack: biggest packages first → assign to bucket with lowest total legs
+    buckets: Dict[str, List[TailPackage]] = {lab: [] for lab in labels}
+    totals = {lab: 0.0 for lab in labels}
+
+    def _workload(pkg: TailPackage) -> float:
+        return pkg.workload if pkg.workload else float(pkg.legs)
+
+    for pkg in sorted(packages, key=lambda p: _workload(p), reverse=True):
+        # choose label with smallest total, then smallest count, then order
+        label = sorted(
+            labels,
+            key=lambda lab: (totals[lab], len(buckets[lab]), labels.index(lab)),
+        )[0]
+        buckets[label].append(pkg)
+        totals[label] += _workload(pkg)
+    return buckets
+
+
+def _offset_hours(dt: datetime) -> float:
+    offset = dt.utcoffset()
+    if offset is None:
+        return 0.0
+    return offset.total_seconds() / 3600
+
+
+_EASTERLY_OFFSET_MIN = -5.5
+_EASTERLY_OFFSET_MAX = -2.0
+_WESTERLY_OFFSET_THRESHOLD = -6.75
+_CENTRAL_OR_LATER_THRESHOLD = -6.0
+
+
+def _is_easterly_offset(offset: float) -> bool:
+    return _EASTERLY_OFFSET_MIN <= offset <= _EASTERLY_OFFSET_MAX
+
+
+def _is_westerly_offset(offset: float) -> bool:
+    return offset <= _WESTERLY_OFFSET_THRESHOLD
+
+
+def _soft_shift_distance_penalty(
+    pkg_offset: float,
+    *,
+    preferred_idx: int,
+    target_idx: int,
+    labels_count: int,
+    force_easterly_first: bool,
+) -> float:
+    if labels_count <= 1:
+        return 0.0
+
+    later_distance = max(0, target_idx - preferred_idx)
+    earlier_distance = max(0, preferred_idx - target_idx)
+    penalty = 0.0
+
+    if force_easterly_first and _is_easterly_offset(pkg_offset) and later_distance:
+        penalty += later_distance * 1.5
+        if target_idx == labels_count - 1:
+            penalty += max(2.0, float(labels_count - 1))
+
+    if _is_westerly_offset(pkg_offset) and earlier_distance:
+        penalty += earlier_distance * 0.75
+
+    return penalty
+
+
+def _coarse_preferred_index(offset: float, last_idx: int) -> int:
+    return 0 if offset >= _CENTRAL_OR_LATER_THRESHOLD else last_idx
+
+
+# ----------------------------
+# Shift assignment search
+# ----------------------------
+DEFAULT_SEARCH_TIME_BUDGET = 0.75
+
+_COUNT_SQUARE_WEIGHT = 120.0
+_COUNT_LINEAR_WEIGHT = 40.0
+_EMPTY_SHIFT_PENALTY = 200.0
+_WORKLOAD_SQUARE_WEIGHT = 2.0
+_WORKLOAD_LINEAR_WEIGHT = 1.5
+_LOCAL_SEARCH_SHARE = 0.15
+_COST_EPS = 1e-9
+
+
+@dataclass
+class ShiftSearchResult:
+    """Best shift index per package found by :func:`solve_shift_assignment`."""
+
+    choices: List[int]
+    cost: float
+    optimal: bool
+    elapsed: float
+
+
+def _count_cost(diff: float) -> float:
+    return diff * diff * _COUNT_SQUARE_WEIGHT + abs(diff) * _COUNT_LINEAR_WEIGHT
+
+
+def _workload_cost(diff: float) -> float:
+    return diff * diff * _WORKLOAD_SQUARE_WEIGHT + abs(diff) * _WORKLOAD_LINEAR_WEIGHT
+
+
+def _shift_cost(count: int, total: int, expected_count: float, target: int) -> float:
+    cost = _count_cost(count - expected_count)
+    if expected_count > 0.0 and count == 0:
+        cost += _EMPTY_SHIFT_PENALTY
+    return cost + _workload_cost(total - target)
+
+
+class _ShiftProblem:
+    """Packages with integer workloads to spread over shifts.
+
+    The cost of an assignment is the timezone penalty of every package on its
+    shift plus, per shift, a quadratic penalty on the distance of its tail
+    count from ``expected_counts`` and of its workload from ``targets``.
+    """
+
+    def __init__(
+        self,
+        workloads: Sequence[int],
+        penalties: Sequence[Sequence[float]],
+        targets: Sequence[int],
+        expected_counts: Sequence[float],
+    ) -> None:
+        self.workloads = list(workloads)
+        self.penalties = [list(row) for row in penalties]
+        self.targets = list(targets)
+        self.expected_counts = list(expected_counts)
+        self.n_items = len(self.workloads)
+        self.n_shifts = len(self.targets)
+
+    def shift_cost(self, shift: int, count: int, total: int) -> float:
+        return _shift_cost(count, total, self.expected_counts[shift], self.targets[shift])
+
+    def cost(self, choices: Sequence[int]) -> float:
+        counts = [0] * self.n_shifts
+        totals = [0] * self.n_shifts
+        cost = 0.0
+        for item, shift in enumerate(choices):
+            counts[shift] += 1
+            totals[shift] += self.workloads[item]
+            cost += self.penalties[item][shift]
+        for shift in range(self.n_shifts):
+            cost += self.shift_cost(shift, counts[shift], totals[shift])
+        return cost
+
+    def greedy(self) -> List[int]:
+        """Place the heaviest packages first wherever the marginal cost is lowest."""
+
+        counts = [0] * self.n_shifts
+        totals = [0] * self.n_shifts
+        choices = [0] * self.n_items
+        for item in sorted(range(self.n_items), key=lambda i: (-self.workloads[i], i)):
+            work = self.workloads[item]
+
+            def _marginal(shift: int) -> float:
+                return (
+                    self.penalties[item][shift]
+                    + self.shift_cost(shift, counts[shift] + 1, totals[shift] + work)
+                    - self.shift_cost(shift, counts[shift], totals[shift])
+                )
+
+            shift = min(range(self.n_shifts), key=lambda s: (_marginal(s), s))
+            choices[item] = shift
+            counts[shift] += 1
+            totals[shift] += work
+        return choices
+
+    def improve(self, choices: Sequence[int], deadline: Optional[float]) -> List[int]:
+        """Apply the best single move or pairwise swap until none helps."""
+
+        choices = list(choices)
+        counts = [0] * self.n_shifts
+        totals = [0] * self.n_shifts
+        for item, shift in enumerate(choices):
+            counts[shift] += 1
+            totals[shift] += self.workloads[item]
+
+        def _delta(shift: int, count_delta: int, total_delta: int) -> float:
+            return self.shift_cost(
+                shift, counts[shift] + count_delta, totals[shift] + total_delta
+            ) - self.shift_cost(shift, counts[shift], totals[shift])
+
+        workloads = self.workloads
+        penalties = self.penalties
+        while deadline is None or perf_counter() < deadline:
+            best_delta = -_COST_EPS
+            best_move: Optional[Tuple[int, int, Optional[int]]] = None
+            for item in range(self.n_items):
+                src = choices[item]
+                for dst in range(self.n_shifts):
+                    if dst == src:
+                        continue
+                    delta = (
+                        penalties[item][dst]
+                        - penalties[item][src]
+                        + _delta(src, -1, -workloads[item])
+                        + _delta(dst, 1, workloads[item])
+                    )
+                    if delta < best_delta:
+                        best_delta, best_move = delta, (item, dst, None)
+            for first in range(self.n_items):
+                src = choices[first]
+                for second in range(first + 1, self.n_items):
+                    dst = choices[second]
+                    if dst == src:
+                        continue
+                    moved = workloads[second] - workloads[first]
+                    delta = (
+                        penalties[first][dst]
+                        + penalties[second][src]
+                        - penalties[first][src]
+                        - penalties[second][dst]
+                        + _delta(src, 0, moved)
+                        + _delta(dst, 0, -moved)
+                    )
+                    if delta < best_delta:
+                        best_delta, best_move = delta, (first, dst, second)
+            if best_move is None:
+                break
+            item, dst, other = best_move
+            src = choices[item]
+            choices[item] = dst
+            counts[src] -= 1
+            counts[dst] += 1
+            totals[src] -= workloads[item]
+            totals[dst] += workloads[item]
+            if other is not None:
+                choices[other] = src
+                counts[dst] -= 1
+                counts[src] += 1
+                totals[dst] -= workloads[other]
+                totals[src] += workloads[other]
+        return choices
+
+    def solve_milp(
+        self, incumbent_cost: float, time_limit: Optional[float]
+    ) -> Optional[Tuple[List[int], bool]]:
+        """Solve the exact integer program with HiGHS via :func:`scipy.optimize.milp`.
+
+        Identical packages (same workload and penalty row) are merged into one
+        integer variable per shift, which removes the permutation symmetry
+        that makes busy days slow. The quadratic balance terms are linearised
+        with one tangent cut per integer step, which is exact at every integer
+        count and workload; ``incumbent_cost`` bounds how far a better
+        solution can stray from the targets, so only that band gets cuts.
+        Returns ``None`` when HiGHS finds no solution in ``time_limit``.
+        """
+
+        classes: Dict[Tuple[int, Tuple[float, ...]], List[int]] = {}
+        for item in range(self.n_items):
+            key = (self.workloads[item], tuple(self.penalties[item]))
+            classes.setdefault(key, []).append(item)
+        keys = list(classes)
+        n_classes = len(keys)
+        n_shifts = self.n_shifts
+
+        # Columns: class/shift counts, then per shift the count epigraph, the
+        # workload epigraph and an "empty shift" indicator.
+        n_x = n_classes * n_shifts
+        count_col = n_x
+        work_col = n_x + n_shifts
+        empty_col = n_x + 2 * n_shifts
+        n_vars = n_x + 3 * n_shifts
+
+        objective = np.zeros(n_vars)
+        upper = np.full(n_vars, np.inf)
+        integrality = np.zeros(n_vars)
+        integrality[:n_x] = 1
+        integrality[empty_col:] = 1
+        upper[empty_col:] = 1
+        for cls, key in enumerate(keys):
+            objective[cls * n_shifts : (cls + 1) * n_shifts] = key[1]
+            upper[cls * n_shifts : (cls + 1) * n_shifts] = len(classes[key])
+        objective[count_col:work_col] = 1.0
+        objective[work_col:empty_col] = 1.0
+        objective[empty_col:] = _EMPTY_SHIFT_PENALTY
+
+        rows: List[np.ndarray] = []
+        lower_bounds: List[float] = []
+        upper_bounds: List[float] = []
+
+        def _add(row: np.ndarray, low: float, high: float = np.inf) -> None:
+            rows.append(row)
+            lower_bounds.append(low)
+            upper_bounds.append(high)
+
+        for cls, key in enumerate(keys):
+            row = np.zeros(n_vars)
+            row[cls * n_shifts : (cls + 1) * n_shifts] = 1.0
+            _add(row, len(classes[key]), len(classes[key]))
+
+        count_reach = math.sqrt(incumbent_cost / _COUNT_SQUARE_WEIGHT) + 1
+        work_reach = math.sqrt(incumbent_cost / _WORKLOAD_SQUARE_WEIGHT) + 1
+        for shift in range(n_shifts):
+            expected = self.expected_counts[shift]
+            target = self.targets[shift]
+            count_row = np.zeros(n_vars)
+            count_row[shift:n_x:n_shifts] = 1.0
+            work_row = np.zeros(n_vars)
+            work_row[shift:n_x:n_shifts] = [key[0] for key in keys]
+
+            low = max(0, math.ceil(expected - count_reach))
+            high = min(self.n_items, math.floor(expected + count_reach))
+            _add(count_row, low, high)
+            for step in range(low, high):
+                base = _count_cost(step - expected)
+                slope = _count_cost(step + 1 - expected) - base
+                row = -slope * count_row
+                row[count_col + shift] = 1.0
+                _add(row, base - slope * step)
+
+            low = max(0, math.ceil(target - work_reach))
+            high = math.floor(target + work_reach)
+            _add(work_row, low, high)
+            for step in range(low, high):
+                base = _workload_cost(step - target)
+                slope = _workload_cost(step + 1 - target) - base
+                row = -slope * work_row
+                row[work_col + shift] = 1.0
+                _add(row, base - slope * step)
+
+            if expected > 0.0:
+                row = count_row.copy()
+                row[empty_col + shift] = 1.0
+                _add(row, 1.0)
+
+        options: Dict[str, Any] = {"disp": False}
+        if time_limit is not None:
+            options["time_limit"] = max(time_limit, 0.01)
+        result = milp(
+            objective,
+            constraints=LinearConstraint(np.vstack(rows), lower_bounds, upper_bounds),
+            integrality=integrality,
+            bounds=Bounds(np.zeros(n_vars), upper),
+            options=options,
+        )
+        if result.x is None:
+            return None
+
+        choices = [0] * self.n_items
+        for cls, key in enumerate(keys):
+            members = iter(classes[key])
+            for shift in range(n_shifts):
+                for _ in range(int(round(result.x[cls * n_shifts + shift]))):
+                    choices[next(members)] = shift
+        return choices, result.status == 0
+
+
+def solve_shift_assignment(
+    workloads: Sequence[int],
+    penalties: Sequence[Sequence[float]],
+    targets: Sequence[int],
+    expected_counts: Sequence[float],
+    *,
+    time_budget: Optional[float] = DEFAULT_SEARCH_TIME_BUDGET,
+    on_improvement: Optional[Callable[[List[int], float], None]] = None,
+) -> ShiftSearchResult:
+    """Assign each package to a shift minimising timezone and balance cost.
+
+    ``workloads`` are integer workload units per package, ``penalties[i][s]``
+    is the timezone cost of putting package ``i`` on shift ``s`` and the
+    balance cost per shift is quadratic in the distance from ``targets``
+    (workload units) and ``expected_counts`` (tails). A greedy pass polished
+    by local search seeds the incumbent, then the exact integer program runs
+    for the rest of ``time_budget`` seconds (``None`` for no limit).
+    ``on_improvement`` is called with every better incumbent so callers can
+    surface best-so-far results; ``optimal`` reports whether the returned
+    assignment was proven optimal.
+    """
+
+    started = perf_counter()
+    if not targets:
+        raise ValueError("At least one shift is required")
+    if len(penalties) != len(workloads) or len(expected_counts) != len(targets):
+        raise ValueError("penalties and expected_counts must match workloads and targets")
+
+    problem = _ShiftProblem(workloads, penalties, targets, expected_counts)
+    deadline = started + time_budget if time_budget is not None else None
+
+    best_choices = problem.greedy()
+    best_cost = problem.cost(best_choices)
+    if on_improvement is not None:
+        on_improvement(list(best_choices), best_cost)
+
+    def _offer(choices: List[int]) -> bool:
+        nonlocal best_choices, best_cost
+        cost = problem.cost(choices)
+        if cost >= best_cost - _COST_EPS:
+            return False
+        best_choices, best_cost = choices, cost
+        if on_improvement is not None:
+            on_improvement(list(choices), cost)
+        return True
+
+    polish_deadline = (
+        started + time_budget * _LOCAL_SEARCH_SHARE if time_budget is not None else None
+    )
+    _offer(problem.improve(best_choices, polish_deadline))
+
+    optimal = problem.n_items == 0 or problem.n_shifts == 1
+    if not optimal:
+        remaining = deadline - perf_counter() if deadline is not None else None
+        solved = problem.solve_milp(best_cost, remaining)
+        if solved is not None:
+            choices, optimal = solved
+            if _offer(choices) and not optimal and (deadline is None or perf_counter() < deadline):
+                _offer(problem.improve(best_choices, deadline))
+
+    return ShiftSearchResult(
+        choices=list(best_choices),
+        cost=best_cost,
+        optimal=optimal,
+        elapsed=perf_counter() - started,
+    )
+
+
+def assign_preference_weighted(
+    packages: List[TailPackage],
+    labels: List[str],
+    label_weights: Optional[Sequence[float]] = None,
+    force_westerly_last: bool = True,
+    force_easterly_first: bool = False,
+    time_budget: Optional[float] = DEFAULT_SEARCH_TIME_BUDGET,
+) -> Dict[str, List[TailPackage]]:
+    if not packages or not labels:
+        return {lab: [] for lab in labels}
+
+    offsets = [_offset_hours(pkg.first_local_dt) for pkg in packages]
+    min_off, max_off = min(offsets), max(offsets)
+    span = max_off - min_off
+
+    def _workload(pkg: TailPackage) -> float:
+        return pkg.workload if pkg.workload else float(pkg.legs)
+
+    total_workload = sum(_workload(pkg) for pkg in packages)
+
+    weights: Dict[str, float] = {}
+    for idx, lab in enumerate(labels):
+        weight = 1.0
+        if label_weights and idx < len(label_weights):
+            try:
+                weight = float(label_weights[idx])
+            except (TypeError, ValueError):
+                weight = 1.0
+        if weight <= 0:
+            weight = 1.0
+        weights[lab] = weight
+
+    total_weight = sum(weights.values()) or float(len(labels))
+    baseline_target = total_workload / total_weight if total_weight else 0.0
+    workload_targets = {lab: baseline_target * weights[lab] for lab in labels}
+    # Tail count balance should follow the same workload weighting so reduced
+    # workload shifts also receive proportionally fewer tails.
+    count_targets = {
+        lab: (len(packages) * (weights[lab] / total_weight)) if total_weight else 0.0
+        for lab in labels
+    }
+
+    # Use a tighter tolerance (10% of the even-share workload) so we aggressively
+    # balance the workload while still respecting the east↔west preference ordering.
+    tolerance = max(0.25, round(baseline_target * 0.10, 2)) if baseline_target else 0.25
+
+    if len(labels) == 1:
+        tz_targets = [max_off]
+    elif span == 0:
+        tz_targets = [max_off for _ in labels]
+    else:
+        step = span / (len(labels) - 1)
+        tz_targets = [max_off - step * idx for idx in range(len(labels))]
+
+    # Each package's preferred shift: east→early and west→late.
+    preferred_index: Dict[str, int] = {}
+    pkg_offsets: Dict[str, float] = {}
+    forced_late: Set[str] = set()
+    packages_sorted = sorted(packages, key=lambda p: (p.first_local_dt, p.tail))
+
+    for pkg in packages_sorted:
+        pkg_offset = _offset_hours(pkg.first_local_dt)
+        pkg_offsets[pkg.tail] = pkg_offset
+        if len(labels) == 1:
+            idx = 0
+        else:
+            idx = _coarse_preferred_index(pkg_offset, len(labels) - 1)
+        preferred_idx = idx
+        if (
+            force_easterly_first
+            and len(labels) > 1
+            and _is_easterly_offset(pkg_offset)
+        ):
+            preferred_idx = 0
+        if (
+            force_westerly_last
+            and len(labels) > 1
+            and _is_westerly_offset(pkg_offset)
+        ):
+            preferred_idx = len(labels) - 1
+            forced_late.add(pkg.tail)
+        preferred_index[pkg.tail] = preferred_idx
+
+    def _assign_via_search() -> Dict[str, List[TailPackage]]:
+        """
+        Search for the globally best assignment with the branch-and-bound
+        solver. This avoids the local optima that a greedy balancing pass falls
+        into (e.g. leaving the later shifts empty) while still respecting
+        timezone preferences and per-shift workload targets. Large days stop at
+        ``time_budget`` with the best assignment found so far.
+        """
+
+        scale = 4  # workload granularity (base workload increments are 0.25)
+        workloads_int = [
+            max(1, int(round(_workload(pkg) * scale))) for pkg in packages_sorted
+        ]
+        targets_int = [
+            int(round(workload_targets[label] * scale)) for label in labels
+        ]
+
+        expected_counts: List[float] = [count_targets[label] for label in labels]
+
+        tz_penalties: List[List[int]] = []
+        for pkg in packages_sorted:
+            pref_idx = preferred_index.get(pkg.tail, 0)
+            pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
+            is_easterly = _is_easterly_offset(pkg_offset)
+            is_westerly = _is_westerly_offset(pkg_offset)
+            penalty_row: List[int] = []
+            for idx, label in enumerate(labels):
+                tz_target = tz_targets[idx]
+                hours_diff = abs(pkg_offsets.get(pkg.tail, tz_target) - tz_target)
+                distance = abs(idx - pref_idx)
+                later_distance = max(0, idx - pref_idx)
+                earlier_distance = max(0, pref_idx - idx)
+                penalty = int(round(hours_diff * scale)) * 2
+                penalty += distance * distance * scale
+                later_penalty = later_distance * scale
+                if is_easterly:
+                    later_penalty *= 1.5
+                    if force_easterly_first and idx == len(labels) - 1:
+                        later_penalty += scale * max(2, len(labels) - 1)
+                penalty += int(round(later_penalty))
+                earlier_penalty = earlier_distance * scale
+                if is_westerly:
+                    earlier_penalty *= 0.75
+                if force_westerly_last and pkg.tail in forced_late:
+                    earlier_penalty *= 0.5
+                penalty += int(round(earlier_penalty))
+                if pkg.has_priority and idx > pref_idx:
+                    penalty += scale * 6
+                penalty_row.append(penalty)
+            tz_penalties.append(penalty_row)
+
+        result = solve_shift_assignment(
+            workloads_int,
+            tz_penalties,
+            targets_int,
+            expected_counts,
+            time_budget=time_budget,
+        )
+
+        assignment: Dict[str, List[TailPackage]] = {label: [] for label in labels}
+        for pkg, idx in zip(packages_sorted, result.choices):
+            assignment[labels[idx]].append(pkg)
+        return assignment
+
+    optimized_assignment = _assign_via_search()
+
+    def _ensure_non_empty_shifts(
+        assignment: Dict[str, List[TailPackage]],
+    ) -> Dict[str, List[TailPackage]]:
+        if len(packages_sorted) < len(labels):
+            return assignment
+
+        empty_indices = [
+            idx for idx, label in enumerate(labels) if not assignment.get(label)
+        ]
+        if not empty_indices:
+            return assignment
+
+        for empty_idx in empty_indices:
+            best_donor_idx: Optional[int] = None
+            best_pkg: Optional[TailPackage] = None
+            best_score: Optional[Tuple[float, float, float, float]] = None
+
+            for donor_idx, label in enumerate(labels):
+                bucket = assignment.get(label, [])
+                if len(bucket) <= 1:
+                    continue
+                for pkg in bucket:
+                    pref_idx = preferred_index.get(pkg.tail, donor_idx)
+                    pref_distance = abs(empty_idx - pref_idx)
+                    pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
+                    tz_penalty = abs(
+                        pkg_offsets.get(pkg.tail, tz_targets[empty_idx])
+                        - tz_targets[empty_idx]
+                    )
+                    shift_penalty = _soft_shift_distance_penalty(
+                        pkg_offset,
+                        preferred_idx=pref_idx,
+                        target_idx=empty_idx,
+                        labels_count=len(labels),
+                        force_easterly_first=force_easterly_first,
+                    )
+                    score = (pref_distance, shift_penalty, tz_penalty, _workload(pkg))
+                    if best_score is None or score < best_score:
+                        best_score = score
+                        best_pkg = pkg
+                        best_donor_idx = donor_idx
+
+            if best_pkg is None or best_donor_idx is None:
+                continue
+
+            assignment[labels[best_donor_idx]].remove(best_pkg)
+            assignment[labels[empty_idx]].append(best_pkg)
+            assignment[labels[empty_idx]] = sorted(
+                assignment[labels[empty_idx]],
+                key=lambda p: (p.first_local_dt, p.tail),
+            )
+            assignment[labels[best_donor_idx]] = sorted(
+                assignment[labels[best_donor_idx]],
+                key=lambda p: (p.first_local_dt, p.tail),
+            )
+
+        return assignment
+
+    def _shift_assignment_cost(pkg: TailPackage, shift_idx: int) -> float:
+        pref_idx = preferred_index.get(pkg.tail, shift_idx)
+        pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
+        tz_penalty = abs(pkg_offsets.get(pkg.tail, tz_targets[shift_idx]) - tz_targets[shift_idx])
+        distance = abs(shift_idx - pref_idx)
+        return (
+            float(distance)
+            + _soft_shift_distance_penalty(
+                pkg_offset,
+                preferred_idx=pref_idx,
+                target_idx=shift_idx,
+                labels_count=len(labels),
+                force_easterly_first=force_easterly_first,
+            )
+            + tz_penalty
+        )
+
+    def _reduce_timezone_crossovers(
+        assignment: Dict[str, List[TailPackage]],
+    ) -> Dict[str, List[TailPackage]]:
+        if len(labels) <= 1:
+            return assignment
+
+        totals = [sum(_workload(pkg) for pkg in assignment.get(label, [])) for label in labels]
+        iterations_left = len(packages) * max(1, len(labels) - 1) * 3
+
+        while iterations_left > 0:
+            iterations_left -= 1
+            best_swap: Optional[
+                Tuple[Tuple[float, float, float, float], int, int, TailPackage, TailPackage]
+            ] = None
+
+            for early_idx in range(len(labels) - 1):
+                early_bucket = assignment.get(labels[early_idx], [])
+                if not early_bucket:
+                    continue
+                for late_idx in range(early_idx + 1, len(labels)):
+                    late_bucket = assignment.get(labels[late_idx], [])
+                    if not late_bucket:
+                        continue
+
+                    for early_pkg in early_bucket:
+                        for late_pkg in late_bucket:
+                            current_cost = _shift_assignment_cost(early_pkg, early_idx) + _shift_assignment_cost(
+                                late_pkg, late_idx
+                            )
+                            swapped_cost = _shift_assignment_cost(early_pkg, late_idx) + _shift_assignment_cost(
+                                late_pkg, early_idx
+                            )
+                            improvement = current_cost - swapped_cost
+                            if improvement <= 0.25:
+                                continue
+
+                            current_workload_error = abs(totals[early_idx] - workload_targets[labels[early_idx]]) + abs(
+                                totals[late_idx] - workload_targets[labels[late_idx]]
+                            )
+                            new_early_total = totals[early_idx] - _workload(early_pkg) + _workload(late_pkg)
+                            new_late_total = totals[late_idx] - _workload(late_pkg) + _workload(early_pkg)
+                            new_workload_error = abs(new_early_total - workload_targets[labels[early_idx]]) + abs(
+                                new_late_total - workload_targets[labels[late_idx]]
+                            )
+                            workload_penalty = new_workload_error - current_workload_error
+                            if workload_penalty > max(tolerance * 2, 1.5):
+                                continue
+
+                            score = (
+                                -improvement,
+                                workload_penalty,
+                                abs(_workload(early_pkg) - _workload(late_pkg)),
+                                float(late_idx - early_idx),
+                            )
+                            if best_swap is None or score < best_swap[0]:
+                                best_swap = (score, early_idx, late_idx, early_pkg, late_pkg)
+
+            if best_swap is None:
+                break
+
+            _, early_idx, late_idx, early_pkg, late_pkg = best_swap
+            assignment[labels[early_idx]].remove(early_pkg)
+            assignment[labels[late_idx]].remove(late_pkg)
+            assignment[labels[early_idx]].append(late_pkg)
+            assignment[labels[late_idx]].append(early_pkg)
+            totals[early_idx] = totals[early_idx] - _workload(early_pkg) + _workload(late_pkg)
+            totals[late_idx] = totals[late_idx] - _workload(late_pkg) + _workload(early_pkg)
+            assignment[labels[early_idx]] = sorted(
+                assignment[labels[early_idx]], key=lambda p: (p.first_local_dt, p.tail)
+            )
+            assignment[labels[late_idx]] = sorted(
+                assignment[labels[late_idx]], key=lambda p: (p.first_local_dt, p.tail)
+            )
+
+        return assignment
+
+    def _rebalance_tail_counts(
+        assignment: Dict[str, List[TailPackage]],
+    ) -> Dict[str, List[TailPackage]]:
+        totals = [sum(_workload(pkg) for pkg in assignment.get(label, [])) for label in labels]
+        counts = [len(assignment.get(label, [])) for label in labels]
+
+        def _count_delta(idx: int) -> float:
+            return counts[idx] - count_targets[labels[idx]]
+
+        iterations_left = len(packages) * max(1, len(labels) - 1) * 4
+        while iterations_left > 0:
+            iterations_left -= 1
+            over_idx = max(range(len(labels)), key=_count_delta)
+            under_idx = min(range(len(labels)), key=_count_delta)
+            if _count_delta(over_idx) <= 0.5 and _count_delta(under_idx) >= -0.5:
+                break
+            if len(assignment.get(labels[over_idx], [])) <= 1:
+                break
+
+            current_count_error = sum(abs(_count_delta(idx)) for idx in range(len(labels)))
+            best_move: Optional[Tuple[Tuple[float, float, float, float, float, float], TailPackage, int]] = None
+
+            for target_idx in range(len(labels)):
+                if target_idx == over_idx:
+                    continue
+                for pkg in assignment.get(labels[over_idx], []):
+                    pref_idx = preferred_index.get(pkg.tail, over_idx)
+                    pref_distance = abs(target_idx - pref_idx)
+                    pkg_offset = pkg_offsets.get(pkg.tail, tz_targets[pref_idx])
+                    tz_penalty = abs(
+                        pkg_offsets.get(pkg.tail, tz_targets[target_idx]) - tz_targets[target_idx]
+                    )
+                    shift_penalty = _soft_shift_distance_penalty(
+                        pkg_offset,
+                        preferred_idx=pref_idx,
+                        target_idx=target_idx,
+                        labels_count=len(labels),
+                        force_easterly_first=force_easterly_first,
+                    )
+                    new_counts = list(counts)
+                    new_counts[over_idx] -= 1
+                    new_counts[target_idx] += 1
+                    new_count_error = sum(
+                        abs(new_counts[idx] - count_targets[labels[idx]])
+                        for idx in range(len(labels))
+                    )
+                    count_improvement = current_count_error - new_count_error
+                    work = _workload(pkg)
+                    new_over_total = totals[over_idx] - work
+                    new_target_total = totals[target_idx] + work
+                    workload_penalty = abs(new_over_total - workload_targets[labels[over_idx]]) + abs(
+                        new_target_total - workload_targets[labels[target_idx]]
+                    )
+                    score = (
+                        -count_improvement,
+                        float(pref_distance),
+                        shift_penalty,
+                        tz_penalty,
+                        workload_penalty,
+                        work,
+                    )
+                    if best_move is None or score < best_move[0]:
+                        best_move = (score, pkg, target_idx)
+
+            if best_move is None:
+                break
+
+            score, pkg, target_idx = best_move
+            count_improvement = -score[0]
+            if count_improvement <= 0:
+                break
+
+            assignment[labels[over_idx]].remove(pkg)
+            assignment[labels[target_idx]].append(pkg)
+            work = _workload(pkg)
+            totals[over_idx] -= work
+            totals[target_idx] += work
+            counts[over_idx] -= 1
+            counts[target_idx] += 1
+            assignment[labels[over_idx]] = sorted(
+                assignment[labels[over_idx]], key=lambda p: (p.first_local_dt, p.tail)
+            )
+            assignment[labels[target_idx]] = sorted(
+                assignment[labels[target_idx]], key=lambda p: (p.first_local_dt, p.tail)
+            )
+
+        return assignment
+
+    optimized_assignment = _ensure_non_empty_shifts(optimized_assignment)
+    optimized_assignment = _rebalance_tail_counts(optimized_assignment)
+    return _reduce_timezone_crossovers(optimized_assignment)
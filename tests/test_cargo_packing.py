@@ -0,0 +1,89 @@
+from itertools import combinations
+
+from cargo_packing import (
+    CONTAINERS,
+    STANDARD_BAGGAGE,
+    FreeSpaces,
+    beam_search_packing,
+    greedy_3d_packing,
+    multi_strategy_packing,
+)
+
+
+def _bags(*names):
+    return [
+        {"Type": name, "Dims": STANDARD_BAGGAGE[name]["dims"], "Flex": STANDARD_BAGGAGE[name]["flex"]}
+        for name in names
+    ]
+
+
+def _overlaps(first, second):
+    return all(
+        first["Position"][axis] < second["Position"][axis] + second["Dims"][axis] - 1e-9
+        and second["Position"][axis] < first["Position"][axis] + first["Dims"][axis] - 1e-9
+        for axis in range(3)
+    )
+
+
+def test_multi_strategy_packs_cj_ski_load_inside_the_hold() -> None:
+    bags = _bags("Ski Bag (Soft)", "Standard Suitcase", "Standard Suitcase", "Small Carry-on")
+    interior = CONTAINERS["CJ"]["interior"]
+
+    assert not greedy_3d_packing(bags, "CJ", interior)[0]
+    result = multi_strategy_packing(bags, "CJ", interior)
+
+    assert result["success"]
+    assert result["fit_count"] == 4
+    placements = result["placements"]
+    assert not any(_overlaps(a, b) for a, b in combinations(placements, 2))
+    for placement in placements:
+        end = [start + size for start, size in zip(placement["Position"], placement["Dims"])]
+        assert end[0] <= interior["depth"] and end[1] <= interior["width"] and end[2] <= interior["height"]
+
+
+def test_free_spaces_stay_disjoint_after_placements() -> None:
+    spaces = FreeSpaces.initial("Legacy", CONTAINERS["Legacy"]["interior"])
+    for dims in [(30, 19, 11), (26, 18, 10), (22, 14, 9)]:
+        spaces.place(0, dims)
+
+    boxes = [
+        {"Position": box[:3], "Dims": box[3:]}
+        for box in spaces.boxes
+    ]
+    assert len(boxes) == 7
+    assert not any(_overlaps(a, b) for a, b in combinations(boxes, 2))
+
+
+def test_parallel_strategies_pick_the_same_result_as_sequential() -> None:
+    bags = _bags(*(["Large Suitcase"] * 4 + ["Standard Suitcase"] * 4 + ["Golf Clubs (Soft Bag)"] * 2))
+    interior = CONTAINERS["Legacy"]["interior"]
+
+    sequential = multi_strategy_packing(bags, "Legacy", interior, beam_width=0)
+    parallel = multi_strategy_packing(bags, "Legacy", interior, beam_width=0, max_workers=2)
+
+    assert parallel == sequential
+
+
+def test_beam_search_packs_load_the_greedy_orderings_miss() -> None:
+    bags = _bags(
+        "Golf Clubs (Soft Bag)",
+        "Standard Suitcase",
+        "Small Carry-on",
+        "Large Suitcase",
+        "Standard Suitcase",
+        "Golf Clubs (Soft Bag)",
+        "Standard Suitcase",
+        "Standard Suitcase",
+    )
+    interior = CONTAINERS["CJ"]["interior"]
+
+    assert not multi_strategy_packing(bags, "CJ", interior, beam_width=0)["success"]
+
+    success, placements = beam_search_packing(bags, "CJ", interior)
+    assert success
+    assert len(placements) == len(bags)
+    assert not any(_overlaps(a, b) for a, b in combinations(placements, 2))
+
+    result = multi_strategy_packing(bags, "CJ", interior)
+    assert result["success"]
+    assert result["strategy"] == "Beam Search"
@@ -1,8 +1,13 @@
+from datetime import date
 from pathlib import Path
 import sys
 
+import pandas as pd
+
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from customs_service import compile_customs_rules
+from feasibility import airport_module
 from feasibility import checker_airport as airport
 from feasibility.data_access import CustomsRule
 from feasibility.schemas import CategoryResult
@@ -78,3 +83,37 @@ def test_evaluate_airport_calls_deice_helper_when_leg_context_missing(monkeypatc
 
     assert called == {"icao": "KTEB"}
     assert result.summary == "No deice available at KTEB"
+
+
+def test_evaluate_airport_checks_arrival_against_posted_customs_hours(monkeypatch):
+    rules = compile_customs_rules(
+        pd.DataFrame([{"airport_icao": "KPSP", "lead_time_arrival_hours": 5, "open_tue": "08:00-17:00"}])
+    )
+    requested = []
+
+    def fake_load_customs_calendar(start, days):  # noqa: ANN001
+        requested.append((start, days))
+        return rules.calendar(start, days)
+
+    monkeypatch.setattr(airport_module, "load_customs_calendar", fake_load_customs_calendar)
+
+    flight = {
+        "flightId": "LEG-1",
+        "dep_airport": "CYYC",
+        "arr_airport": "KPSP",
+        "departureDateUTC": "2025-11-19T02:00:00Z",
+        "arrivalDateUTC": "2025-11-19T04:30:00Z",
+        "pax": 2,
+        "blockTime": 150,
+    }
+    lookup = {
+        "CYYC": {"country": "CA", "tz": "America/Edmonton"},
+        "KPSP": {"country": "US", "tz": "America/Los_Angeles"},
+    }
+    customs_rules = {"KPSP": CustomsRule(airport="KPSP", service_type="US", notes=None)}
+
+    result = airport.evaluate_airport(flight, airport_lookup=lookup, customs_rules=customs_rules)
+
+    assert requested == [(date(2025, 11, 19), 1)]
+    assert any("outside posted customs hours (08:00-17:00)" in issue for issue in result.issues)
+    assert any("Customs notice due by 2025-11-18 15:30 PST" in issue for issue in result.issues)
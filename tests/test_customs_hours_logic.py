@@ -2,9 +2,13 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from feasibility.airport_module import CustomsProfile, evaluate_customs
+from customs_service import compile_customs_rules
+from feasibility.airport_module import CustomsProfile, _build_customs_profile, evaluate_customs
+from feasibility.data_access import CustomsRule
 from feasibility.airport_notes_parser import parse_customs_notes
 
 
@@ -306,3 +310,31 @@ def test_to_separated_hours_are_parsed_before_inline_warning() -> None:
     assert parsed["customs_hours"][0]["end"].startswith("16")
     assert parsed["customs_hours"][0]["days"] == ["Mon", "Tue", "Wed", "Thu", "Fri"]
     assert result.status == "PASS"
+
+
+def test_posted_rule_hours_and_notice_deadline_apply_without_note_hours() -> None:
+    rules = compile_customs_rules(
+        pd.DataFrame([{"airport_icao": "KPSP", "lead_time_arrival_hours": 5, "open_mon": "08:00-17:00"}])
+    )
+    calendar = rules.calendar(datetime(2024, 1, 1).date())
+    rule = CustomsRule(airport="KPSP", service_type="US", notes=None)
+
+    def evaluate(customs_calendar):
+        return evaluate_customs(
+            _build_customs_profile("KPSP", {"KPSP": rule}, customs_calendar),
+            _build_leg("2024-01-02T03:00:00Z"),
+            "ARR",
+            [],
+            parsed_customs=parse_customs_notes([]),
+            tz_name="America/Los_Angeles",
+        )
+
+    result = evaluate(calendar)
+    assert result.status == "CAUTION"
+    assert any("outside posted customs hours (08:00-17:00)" in issue for issue in result.issues)
+    assert "Customs notice due by 2024-01-01 14:00 PST (5h before arrival)." in result.issues
+
+    # Without a calendar the posted hours are not consulted at all.
+    plain = evaluate(None)
+    assert plain.status == "PASS"
+    assert not any("posted customs hours" in issue or "notice due" in issue for issue in plain.issues)
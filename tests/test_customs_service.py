@@ -0,0 +1,162 @@
+from datetime import date, datetime, time, timedelta
+import os
+
+import pandas as pd
+from zoneinfo_compat import ZoneInfo
+
+from customs_deadline_utils import rule_hours_for_weekday
+from fl3xx_api import Fl3xxApiConfig, PayloadCache
+from customs_service import (
+    CALENDAR_CACHE_SIZE,
+    compile_customs_rules,
+    compute_clearance_windows,
+    find_operating_window_before,
+    load_customs_calendar,
+    load_customs_rule_book,
+    prefetch_customs_payloads,
+)
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+LOOKUP = {"KPSP": {"tz": "America/Los_Angeles"}}
+
+
+def _rules_frame():
+    return pd.DataFrame(
+        [
+            {"airport_icao": "kpsp", "lead_time_arrival_hours": 1, "open_mon": "08:00-17:00", "notes": "old"},
+            {
+                "airport_icao": "KPSP",
+                "lead_time_arrival_hours": 5,
+                "open_mon": "08:00-17:00",
+                "open_fri": "08:00-17:00",
+                "open_sat": "CLOSED",
+                "notes": None,
+            },
+            {"airport_icao": None, "open_mon": "24H"},
+        ]
+    )
+
+
+def test_compiled_rules_keep_last_row_and_parse_weekly_hours():
+    book = compile_customs_rules(_rules_frame())
+
+    rule = book.get("kpsp")
+    assert list(book.rules) == ["KPSP"]
+    assert rule.weekly_hours == ((time(8), time(17)), None, None, None, (time(8), time(17)), None, None)
+    assert rule_hours_for_weekday(rule, 4) == (time(8), time(17))
+    assert rule.lead_time_arrival_hours == 5.0
+    assert rule.hours_summary == "Mon: 08:00-17:00; Fri: 08:00-17:00; Sat: CLOSED"
+    assert book.clearance_requirements == {"KPSP": "old"}
+
+
+def test_rule_book_recompiles_when_csv_changes(tmp_path):
+    path = tmp_path / "customs_rules.csv"
+    path.write_text("airport_icao,open_mon\nKPSP,08:00-17:00\n")
+    first = load_customs_rule_book(path)
+    assert load_customs_rule_book(path) is first
+
+    path.write_text("airport_icao,open_mon\nKPSP,09:00-18:00\nKLAS,24H\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = load_customs_rule_book(path)
+
+    assert second is not first
+    assert second.get("KPSP").weekly_hours[0] == (time(9), time(18))
+    assert "KLAS" in second.rules
+
+
+def test_prefetch_dedupes_collects_errors_and_reuses_cache():
+    calls = []
+
+    def leg_details(config, quote_id, session=None):
+        calls.append(("quote", quote_id))
+        return {"planningNotes": f"notes {quote_id}"}
+
+    def migration(config, flight_id, session=None):
+        calls.append(("flight", flight_id))
+        if flight_id == "2":
+            raise RuntimeError("boom")
+        return {"arrivalMigration": {"status": "OK"}}
+
+    config = Fl3xxApiConfig(api_token="t")
+    details_cache, migration_cache = PayloadCache(), PayloadCache()
+    kwargs = dict(
+        fetch_leg_details_fn=leg_details,
+        fetch_migration_fn=migration,
+        leg_details_cache=details_cache,
+        migration_cache=migration_cache,
+    )
+
+    first = prefetch_customs_payloads(config, quote_ids=["Q1", "Q1", None], flight_ids=[1, "1", 2], **kwargs)
+    assert sorted(calls) == [("flight", "1"), ("flight", "2"), ("quote", "Q1")]
+    assert first.leg_details == {"Q1": {"planningNotes": "notes Q1"}}
+    assert list(first.migrations) == ["1"]
+    assert str(first.migration_errors["2"]) == "boom"
+
+    calls.clear()
+    second = prefetch_customs_payloads(config, quote_ids=["Q1"], flight_ids=[1, 2], **kwargs)
+    assert calls == [("flight", "2")]
+    assert second.cache_hits == 2 and second.requests == 1
+
+
+def test_clearance_windows_fall_back_once_prior_window_passes():
+    rules = compile_customs_rules(_rules_frame()).rules
+    row = {"arrival_time": "2026-10-19T20:00:00Z", "dep_time": "2026-10-19T17:00:00Z"}
+    legs = [(row, "CYYC", "KPSP", "OK"), (row, "CYYC", "KPSP", "PENDING"), ({}, "CYYC", "KPSP", "")]
+
+    before = compute_clearance_windows(legs, LOOKUP, rules, now=datetime(2026, 10, 16, 12, tzinfo=PACIFIC))
+    after = compute_clearance_windows(legs, LOOKUP, rules, now=datetime(2026, 10, 19, 6, tzinfo=PACIFIC))
+
+    prior = (datetime(2026, 10, 16, 8, tzinfo=PACIFIC), datetime(2026, 10, 16, 17, tzinfo=PACIFIC))
+    assert [result[:2] for result in before[:2]] == [prior, prior]
+    assert before[0][3] == before[1][3] == "Prior Day"
+    assert "Lead time (5h) deadline 2026-10-19 08:00 PDT." in before[0][2]
+    assert after[0][:2] == prior
+    assert after[1][:2] == (datetime(2026, 10, 19, 8, tzinfo=PACIFIC), datetime(2026, 10, 19, 8, tzinfo=PACIFIC))
+    assert after[1][3] == "Same Day"
+    assert before[2] == (None, None, "", "Unknown")
+
+
+def test_port_calendar_matches_rule_walk_inside_and_outside_its_range():
+    rule_book = compile_customs_rules(_rules_frame())
+    calendar = rule_book.calendar(date(2026, 10, 18), days=5)
+    port = calendar.get("kpsp")
+    assert rule_book.calendar(date(2026, 10, 18), days=5) is calendar
+
+    reference = datetime(2026, 10, 5, 0, 30, tzinfo=PACIFIC)
+    while reference < datetime(2026, 11, 3, tzinfo=PACIFIC):
+        for allow_same_day in (True, False):
+            assert port.window_before(reference, allow_same_day=allow_same_day) == find_operating_window_before(
+                reference, port.rule, allow_same_day=allow_same_day
+            )
+        reference += timedelta(minutes=97)
+
+    assert port.is_open_at(datetime(2026, 10, 19, 16, 59, 30, tzinfo=PACIFIC)) is True
+    assert port.is_open_at(datetime(2026, 10, 20, 9, tzinfo=PACIFIC)) is False
+    assert port.notice_deadline(datetime(2026, 10, 19, 13, tzinfo=PACIFIC)) == datetime(2026, 10, 19, 8, tzinfo=PACIFIC)
+    assert calendar.open_ports({"KPSP": datetime(2026, 10, 23, 7, tzinfo=PACIFIC), "KXXX": reference}) == {"KPSP": False}
+
+
+def test_bundled_calendar_is_rebuilt_when_csv_changes(tmp_path):
+    path = tmp_path / "customs_rules.csv"
+    path.write_text("airport_icao,open_mon\nKPSP,08:00-17:00\n")
+    first = load_customs_calendar(date(2026, 10, 19), path=path)
+    assert load_customs_calendar(date(2026, 10, 19), path=path) is first
+
+    path.write_text("airport_icao,open_mon\nKPSP,10:00-12:00\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = load_customs_calendar(date(2026, 10, 19), path=path)
+
+    assert second is not first
+    assert second.get("KPSP").hours_on(date(2026, 10, 19)) == (time(10), time(12))
+
+
+def test_rule_book_keeps_only_recent_calendars():
+    book = compile_customs_rules(pd.DataFrame([{"airport_icao": "KPSP", "open_mon": "08:00-17:00"}]))
+    first = book.calendar(date(2026, 10, 1), 3)
+    for offset in range(1, CALENDAR_CACHE_SIZE + 2):
+        book.calendar(date(2026, 10, 1) + timedelta(days=offset), 3)
+
+    assert len(book._calendars) == CALENDAR_CACHE_SIZE
+    assert book.calendar(date(2026, 10, 1), 3) is not first
@@ -0,0 +1,121 @@
+from datetime import date
+
+from delay_codes import (
+    MISSING_REASON_LABEL,
+    DelayRecordStore,
+    collect_delay_code_history,
+    collect_delay_code_records,
+    fetch_postflights,
+    summarize_delay_reasons,
+)
+from fl3xx_api import Fl3xxApiConfig
+
+
+def _flight(flight_id, day, *, off_delay=0, on_delay=0, closed=False, landed=True):
+    flight = {
+        "flightId": flight_id,
+        "registrationNumber": "C-GASR",
+        "blockOffEstUTC": f"{day}T14:00:00Z",
+        "blockOnEstUTC": f"{day}T16:00:00Z",
+        "realDateOUT": f"{day}T14:{off_delay:02d}:00Z",
+    }
+    if landed:
+        flight["realDateIN"] = f"{day}T16:{on_delay:02d}:00Z"
+    if closed:
+        flight["postFlightClosed"] = True
+    return flight
+
+
+def test_fetch_postflights_dedupes_and_reports_failures():
+    calls = []
+
+    def fake_postflight(config, flight_id, session=None):
+        calls.append(flight_id)
+        if flight_id == "2":
+            raise RuntimeError("boom")
+        return {"flightId": flight_id}
+
+    results = fetch_postflights(Fl3xxApiConfig(), [1, "1", 2, None, 3], max_workers=4, fetch_postflight_fn=fake_postflight)
+
+    assert sorted(calls) == ["1", "2", "3"]
+    assert list(results) == ["1", "2", "3"]
+    assert results["1"] == (True, {"flightId": "1"})
+    assert results["2"][0] is False and str(results["2"][1]) == "boom"
+
+
+def test_history_serves_closed_flights_from_store(tmp_path):
+    flights = [
+        _flight(1, "2026-10-01", off_delay=30),
+        _flight(2, "2026-10-19", on_delay=40, closed=True),
+        _flight(3, "2026-10-19", off_delay=20),
+        _flight(4, "2026-10-19", off_delay=25, landed=False),
+        _flight(5, "2026-10-19", off_delay=5),
+    ]
+    payloads = {
+        "1": {"delayOffBlockReason": "ATC"},
+        "2": {"legs": [{"delayOnBlockReasons": ["Crew", " "]}]},
+        "3": {},
+        "4": {"delayOffBlockReason": "WX"},
+    }
+    fetched = []
+
+    def fake_flights(config, from_date, to_date):
+        assert (from_date, to_date) == (date(2026, 10, 1), date(2026, 10, 20))
+        return flights, {}
+
+    def fake_postflight(config, flight_id, session=None):
+        fetched.append(flight_id)
+        return payloads[flight_id]
+
+    def collect(store):
+        return collect_delay_code_history(
+            Fl3xxApiConfig(),
+            date(2026, 10, 1),
+            date(2026, 10, 19),
+            fetch_flights_fn=fake_flights,
+            fetch_postflight_fn=fake_postflight,
+            store=store,
+        )
+
+    records, _, diagnostics = collect(DelayRecordStore(tmp_path / "delays.json"))
+    assert sorted(fetched) == ["1", "2", "3", "4"]
+    assert diagnostics["flagged_flights"] == 4 and diagnostics["postflight_from_store"] == 0
+    by_id = {record.flight_id: record for record in records}
+    assert by_id[1].off_block_reasons == ["ATC"] and by_id[1].off_block_reason_status == "Provided"
+    assert by_id[2].on_block_reasons == ["Crew"]
+    assert by_id[3].off_block_reason_status == "Missing"
+
+    fetched.clear()
+    payloads["1"] = {"delayOffBlockReason": "changed"}
+    records, _, diagnostics = collect(DelayRecordStore(tmp_path / "delays.json"))
+    assert sorted(fetched) == ["1", "3", "4"]
+    assert diagnostics["postflight_requests"] == 3 and diagnostics["postflight_from_store"] == 1
+    assert {record.flight_id: record for record in records}[1].off_block_reasons == ["changed"]
+
+
+def test_summarize_delay_reasons_counts_per_week_phase_and_reason():
+    flights = [
+        _flight(1, "2026-10-05", off_delay=30, on_delay=30),
+        _flight(2, "2026-10-07", off_delay=30),
+        _flight(3, "2026-10-13", on_delay=20),
+    ]
+    payloads = {
+        "1": {"delayOffBlockReason": "ATC", "delayTakeOffReason": "ATC", "delayOnBlockReason": "WX"},
+        "2": {"delayOffBlockReason": "ATC"},
+        "3": {},
+    }
+    records, _, _ = collect_delay_code_records(
+        Fl3xxApiConfig(),
+        date(2026, 10, 5),
+        fetch_flights_fn=lambda config, from_date, to_date: (flights, {}),
+        fetch_postflight_fn=lambda config, flight_id, session=None: payloads[flight_id],
+    )
+
+    summary = summarize_delay_reasons(records)
+    rows = {tuple(row[:3]): row[3] for row in summary.itertuples(index=False)}
+
+    assert rows == {
+        ("2026-10-05", "Departure", "ATC"): 2,
+        ("2026-10-05", "Arrival", "WX"): 1,
+        ("2026-10-12", "Arrival", MISSING_REASON_LABEL): 1,
+    }
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+from datetime import date
 from pathlib import Path
 from pathlib import Path
 import sys
 from typing import Any, Dict, List, Optional, cast
 
+import pandas as pd
+
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from customs_service import compile_customs_rules
+from feasibility import airport_module
 from feasibility.engine_phase1 import _normalize_aircraft_label, run_feasibility_phase1
 from feasibility import checker_weight_balance
 from feasibility.duty_module import evaluate_generic_duty_day
@@ -60,6 +65,27 @@ def test_phase1_engine_runs_for_entire_quote() -> None:
     assert result["duty"]["status"] == "PASS"
     assert all(leg["weightBalance"]["status"] == "PASS" for leg in result["legs"])
 
+def test_phase1_engine_builds_one_customs_calendar_for_the_quote(monkeypatch) -> None:
+    requested: list[tuple[date, int]] = []
+    rules = compile_customs_rules(pd.DataFrame([{"airport_icao": "KPSP", "lead_time_arrival_hours": 5}]))
+
+    def fake_load_customs_calendar(start: date, days: int) -> Any:
+        requested.append((start, days))
+        return rules.calendar(start, days)
+
+    monkeypatch.setattr(airport_module, "load_customs_calendar", fake_load_customs_calendar)
+    quote = _build_simple_quote()
+    quote["legs"][0]["arrivalAirport"] = "KPSP"
+    quote["legs"][1]["departureAirport"] = "KPSP"
+    quote["legs"][1]["arrivalDateUTC"] = "2025-11-21T18:15:00Z"
+    tz_provider = {"CYYC": "America/Edmonton", "KPSP": "America/Los_Angeles"}.get
+
+    result = run_feasibility_phase1({"quote": quote, "tz_provider": tz_provider})
+
+    assert requested == [(date(2025, 11, 19), 3)]
+    customs = result["legs"][0]["arrival"]["customs"]
+    assert "Customs notice due by 2025-11-19 03:15 PST (5h before arrival)." in customs["issues"]
+
 def test_phase1_engine_uses_pax_details_fetcher() -> None:
     quote = {
         "bookingIdentifier": "PAX1",
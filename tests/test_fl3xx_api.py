@@ -25,9 +25,12 @@ from fl3xx_api import (
     extract_crew_from_preflight,
     extract_passengers_from_pax_details,
     extract_missing_qualifications_from_preflight,
+    fetch_many,
     fetch_staff_roster,
+    iter_staff_roster,
     parse_postflight_payload,
     parse_preflight_payload,
+    unique_ids,
 )
 
 
@@ -641,3 +644,79 @@ def test_fetch_staff_roster_can_keep_empty_rows_when_requested() -> None:
     )
 
     assert [row["user"]["personnelNumber"] for row in payload] == ["100"]
+
+
+def test_iter_staff_roster_streams_rows_and_drops_inactive_ones() -> None:
+    body = json.dumps(
+        {
+            "data": [
+                {"user": {"personnelNumber": "100"}, "entries": [], "flights": []},
+                {"user": {"personnelNumber": "200"}, "entries": [{"type": "P"}], "flights": []},
+            ]
+        }
+    ).encode("utf-8")
+
+    class DummyResponse:
+        closed = False
+
+        def raise_for_status(self):
+            return None
+
+        def iter_content(self, chunk_size=1):
+            for idx in range(0, len(body), 5):
+                yield body[idx : idx + 5]
+
+        def close(self):
+            self.closed = True
+
+    class DummySession:
+        def __init__(self):
+            self.kwargs = None
+            self.response = DummyResponse()
+
+        def get(self, url, **kwargs):
+            self.kwargs = kwargs
+            return self.response
+
+    session = DummySession()
+    rows = list(
+        iter_staff_roster(
+            Fl3xxApiConfig(base_url="https://app.fl3xx.us/api/external/flight/flights"),
+            from_time=datetime(2026, 2, 26, 12, 0),
+            to_time=datetime(2026, 2, 27, 12, 0),
+            session=session,
+        )
+    )
+
+    assert [row["user"]["personnelNumber"] for row in rows] == ["200"]
+    assert session.kwargs["stream"] is True
+    assert ("includeFlights", "true") in session.kwargs["params"]
+    assert session.response.closed
+
+
+def test_fetch_many_dedupes_keys_and_collects_failures() -> None:
+    sessions = []
+
+    def fetch(key, session):
+        sessions.append(session)
+        if key == ("pax", "2"):
+            raise RuntimeError("boom")
+        return {"key": key}
+
+    jobs = [("leg", "1"), ("pax", "2"), ("leg", "1"), ("pax", "3")]
+    results = fetch_many(jobs, fetch, max_workers=4)
+
+    assert list(results) == [("leg", "1"), ("pax", "2"), ("pax", "3")]
+    assert results[("leg", "1")] == (True, {"key": ("leg", "1")})
+    assert results[("pax", "2")][0] is False and str(results[("pax", "2")][1]) == "boom"
+    assert len(sessions) == 3 and all(session is not None for session in sessions)
+
+    shared = object()
+    sessions.clear()
+    assert fetch_many(["1", "2"], fetch, max_workers=1, session=shared) == {
+        "1": (True, {"key": "1"}),
+        "2": (True, {"key": "2"}),
+    }
+    assert sessions == [shared, shared]
+    assert fetch_many([], fetch, max_workers=4) == {}
+    assert unique_ids([1, "1", None, "", 2]) == ["1", "2"]
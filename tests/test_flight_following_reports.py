@@ -12,11 +12,13 @@ from flight_following_reports import (
     FlightFollowingReport,
     _merge_split_duty_information,
     _parse_pilot_blocks,
+    build_duty_ledger,
     build_rest_before_index,
     collect_duty_start_snapshots,
     DutyStartCollection,
     DutyStartPilotSnapshot,
     DutyStartSnapshot,
+    summarize_long_duty_days,
     summarize_split_duty_days,
     summarize_tight_turnarounds,
 )
@@ -282,6 +284,40 @@ def test_summarize_tight_turnarounds_no_note_when_rest_matches() -> None:
     assert all("non-flight duties" not in line.lower() for line in lines)
 
 
+def test_duty_ledger_is_cached_and_feeds_report_sections() -> None:
+    snapshot = DutyStartSnapshot(
+        tail="C-GLDG",
+        flight_id="F9",
+        block_off_est_utc=datetime(2025, 10, 26, 13, 0, tzinfo=timezone.utc),
+        pilots=[
+            DutyStartPilotSnapshot(
+                seat="PIC",
+                name="Taylor Captain",
+                person_id="P1",
+                fdp_actual_min=760,
+                fdp_max_min=800,
+                rest_after_actual_min=600,
+                rest_before_payload={"actual": "PT11H", "min": "600"},
+            ),
+            DutyStartPilotSnapshot(seat="SIC", name="Jordan Copilot", person_id="P2"),
+        ],
+    )
+    collection = _build_collection_with_snapshot(snapshot)
+
+    ledger = build_duty_ledger(collection)
+
+    assert build_duty_ledger(collection) is ledger
+    assert ledger["identifier"].tolist() == ["P1", "P2"]
+    assert ledger.loc[0, "duty_end_utc"] == datetime(2025, 10, 27, 1, 40, tzinfo=timezone.utc)
+    assert ledger.loc[0, "rest_before_min"] == 660
+    assert build_rest_before_index(collection)["P1"]["rest_before_required_min"] == 600
+    assert "rest_before_actual_min" not in build_rest_before_index(collection)["P2"]
+    assert summarize_long_duty_days(collection) == ["C-GLDG – 12:40 (PIC (Taylor Captain))"]
+    assert summarize_tight_turnarounds(collection) == [
+        "C-GLDG – 10:00 rest before next duty (PIC (Taylor Captain))"
+    ]
+
+
 def test_summarize_split_duty_days_adds_ground_time_offset() -> None:
     snapshot = DutyStartSnapshot(
         tail="C-FSDN",
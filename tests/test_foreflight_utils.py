@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+from foreflight_utils import (
+    extract_first,
+    extract_foreflight_flights,
+    normalize_airport,
+    normalize_tail,
+    parse_datetime,
+)
+
+
+def test_parse_datetime_reads_iso_and_other_formats_as_utc():
+    assert parse_datetime("2026-10-18T15:00:00Z") == datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+    assert parse_datetime("2026-10-18T09:00:00-06:00") == datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+    assert parse_datetime("2026-10-18 09:00") == datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+    assert parse_datetime("Oct 18 2026 09:00") == datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+    local = datetime(2026, 10, 18, 9, tzinfo=timezone(timedelta(hours=-6)))
+    assert parse_datetime(local) == datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+    assert parse_datetime("  ") is None and parse_datetime("junk") is None
+
+
+def test_field_helpers_normalise_foreflight_variants():
+    flight = {"tail": "", "aircraftRegistration": " c-gasr ", "departure": {"icaoCode": "CYYC"}}
+
+    assert normalize_tail(extract_first(flight, "tail", "aircraftRegistration")) == "CGASR"
+    assert normalize_airport(flight["departure"]) == "CYYC"
+    assert normalize_airport(" KPSP ") == "KPSP"
+    assert extract_foreflight_flights({"flights": [flight, "x"]}) == [flight]
+    assert extract_foreflight_flights([flight]) == [flight]
+    assert extract_foreflight_flights(None) == []
@@ -0,0 +1,95 @@
+import pandas as pd
+
+from ftl_analytics import (
+    analyze_ftl,
+    build_duty_table,
+    parse_duration_series,
+    parse_duration_to_hours,
+    read_csv_bytes,
+    streaks,
+)
+
+
+def _days(pilot: str, start: str, flags):
+    first = pd.Timestamp(start)
+    return [
+        {"Pilot": pilot, "Date": first + pd.Timedelta(days=offset), "LongDuty": flag}
+        for offset, flag in flags
+    ]
+
+
+def test_streaks_report_every_consecutive_run_including_runs_ended_by_a_gap():
+    df = pd.DataFrame(
+        _days("Bravo", "2025-03-01", [(0, True), (1, True), (2, True), (6, True), (7, True)])
+        + _days("Alpha", "2025-03-01", [(0, True), (1, False), (2, True), (3, True)])
+    )
+
+    result = streaks(df, "LongDuty", min_consecutive=2)
+
+    assert result.to_dict("records") == [
+        {"Pilot": "Alpha", "StartDate": "2025-03-03", "EndDate": "2025-03-04", "ConsecutiveDays": 2},
+        {"Pilot": "Bravo", "StartDate": "2025-03-01", "EndDate": "2025-03-03", "ConsecutiveDays": 3},
+        {"Pilot": "Bravo", "StartDate": "2025-03-07", "EndDate": "2025-03-08", "ConsecutiveDays": 2},
+    ]
+    assert streaks(df.iloc[0:0], "LongDuty").columns.tolist() == ["Pilot", "StartDate", "EndDate", "ConsecutiveDays"]
+
+
+def test_duty_table_closes_duty_days_on_rest_markers():
+    df = pd.DataFrame(
+        [
+            {"Name": "Pilot A", "Date": "01/03/2025", "Duty": "", "Marker": ""},
+            {"Name": None, "Date": "01/03/2025", "Duty": "12:30", "Marker": "Rest"},
+            {"Name": None, "Date": "02/03/2025", "Duty": "9:00", "Marker": ""},
+            {"Name": None, "Date": "03/03/2025", "Duty": "13:15", "Marker": "Rest"},
+            {"Name": None, "Date": "04/03/2025", "Duty": "", "Marker": "Rest"},
+            {"Name": "Pilot B", "Date": "01/03/2025", "Duty": "11:00", "Marker": ""},
+        ]
+    )
+
+    work = build_duty_table(df, "Name", "Date", "Duty", end_marker_col="Marker")
+
+    assert work.to_dict("records") == [
+        {"Pilot": "Pilot A", "Date": pd.Timestamp("2025-03-01"), "DutyHours": 12.5, "LongDuty": True},
+        {"Pilot": "Pilot A", "Date": pd.Timestamp("2025-03-02"), "DutyHours": 13.25, "LongDuty": True},
+        {"Pilot": "Pilot B", "Date": pd.Timestamp("2025-03-01"), "DutyHours": 11.0, "LongDuty": False},
+    ]
+
+
+def test_parse_duration_series_matches_scalar_parser():
+    values = pd.Series(["12:30", "12:30", None, "", "45 min", "12h 30m", "(split duty) 10:15", "14.5", "junk"])
+
+    parsed = parse_duration_series(values)
+
+    expected = [parse_duration_to_hours(value) for value in values]
+    pd.testing.assert_series_equal(parsed, pd.Series(expected, dtype=float))
+
+
+def test_ftl_upload_analysis_memoises_column_tables():
+    csv = (
+        "Name,Duty Date,Duty Time,Marker,Rest Before FDP (act),Rest After FDP (act)\n"
+        "Pilot A,01/03/2025,12:30,Rest,10:30,10:45\n"
+        ",02/03/2025,12:10,Rest,10:45,12:00\n"
+        ",03/03/2025,13:00,Rest,10:15,10:30\n"
+    ).encode("utf-8")
+
+    analysis = analyze_ftl(read_csv_bytes(csv))
+
+    assert analysis.columns.pilot == "Name"
+    assert analysis.columns.date == "Duty Date"
+    assert analysis.columns.duty == "Duty Time"
+    assert analysis.columns.duty_boundary == "Marker"
+    assert analysis.streaks(3)["ConsecutiveDays"].tolist() == [3]
+    assert analysis.rest_pairs["Pilot"].tolist() == ["Pilot A", "Pilot A"]
+    summary, detail = analysis.min_rest_days("Rest Before FDP (act)")
+    assert summary.to_dict("records") == [{"Pilot": "Pilot A", "DaysWithMinRest": 3}]
+    assert analysis.min_rest_days("Rest Before FDP (act)")[1] is detail
+    long_summary, _ = analysis.long_duty_days("Name", "Duty Date", "Duty Time", "Marker")
+    assert long_summary["Days"].tolist() == [3]
+
+
+def test_analysis_without_pilot_or_date_skips_tables():
+    analysis = analyze_ftl(pd.DataFrame({"Value": ["x", "y"]}))
+
+    assert analysis.columns.pilot is None
+    assert analysis.duty_days is None
+    assert analysis.streaks(2).empty
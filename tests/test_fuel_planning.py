@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+import re
+import threading
+
+import requests
+
+from fl3xx_api import PayloadCache
+from fuel_planning import (
+    FORE_FLIGHT_BASE_URL,
+    FlightRecord,
+    build_performance_rows,
+    build_records,
+    extract_foreflight_flights,
+    fetch_performance,
+    fetch_performance_payloads,
+    foreflight_record,
+    match_records,
+)
+
+BASE = datetime(2026, 10, 1, 14, 0, tzinfo=timezone.utc)
+
+
+class _FakeResponse:
+    def __init__(self, status, payload=None):
+        self.status_code = status
+        self.ok = 200 <= status < 300
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class FakeForeFlight:
+    """In-memory stand-in for the ForeFlight flights and performance endpoints."""
+
+    def __init__(self):
+        self.flights = []
+        self.performance = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def add_flight(self, flight_id, departure, arrival, off, minutes, *, tail="C-GASR", tags=(), fuel=None):
+        self.flights.append(
+            {
+                "flightId": flight_id,
+                "aircraftRegistration": tail,
+                "departure": departure,
+                "destination": arrival,
+                "departureTime": off.isoformat(),
+                "arrivalTime": (off + timedelta(minutes=minutes)).isoformat(),
+                "tags": list(tags),
+            }
+        )
+        if fuel is not None:
+            self.performance[flight_id] = {
+                "performance": {
+                    "fuel": {"flightFuel": fuel, "taxiFuel": 100, "totalFuel": fuel + 2000, "maxTotalFuel": 7000},
+                    "weights": {"rampWeight": 15000, "maxRampWeight": 16000},
+                }
+            }
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        assert headers["x-api-key"] == "token"
+        with self._lock:
+            self.requests.append(url)
+        if url == FORE_FLIGHT_BASE_URL:
+            return _FakeResponse(200, {"flights": self.flights})
+        flight_id = re.fullmatch(r".*/Flights/(.+)/performance", url).group(1)
+        if flight_id not in self.performance:
+            return _FakeResponse(404)
+        return _FakeResponse(200, self.performance[flight_id])
+
+    def fetch_performance(self, flight_id, *, token, session=None):
+        return fetch_performance(flight_id, token=token, session=self)
+
+
+def _fl3xx(tail, departure, arrival, off, minutes, booking=None, leg_id=None):
+    return FlightRecord(
+        source="FL3XX",
+        tail=tail,
+        departure_airport=departure,
+        arrival_airport=arrival,
+        departure_time=off,
+        arrival_time=off + timedelta(minutes=minutes),
+        duration_minutes=minutes,
+        flight_id=leg_id,
+        booking_identifier=booking,
+    )
+
+
+def test_match_records_blocks_fallback_candidates_by_route_and_date():
+    server = FakeForeFlight()
+    server.add_flight("ff-1", "CYYC", "CYVR", BASE, 90, tags=["fyi", "abcde"])
+    server.add_flight("ff-2", "CYVR", "CYYC", BASE + timedelta(hours=4), 85)
+    server.add_flight("ff-3", "CYYC", "CYVR", BASE + timedelta(days=2, hours=23, minutes=50), 90)
+    server.add_flight("ff-4", "CYYC", "KPSP", BASE, 150)
+    foreflight = build_records(foreflight_record(flight) for flight in extract_foreflight_flights({"flights": server.flights}))
+
+    fl3xx = [
+        _fl3xx("CGASR", "CYYC", "CYVR", BASE + timedelta(minutes=5), 95, booking="ABCDE", leg_id="1"),
+        _fl3xx("CGASR", "CYVR", "CYYC", BASE + timedelta(days=1, hours=4), 85, leg_id="2"),
+        _fl3xx("CGASR", "CYVR", "CYYC", BASE + timedelta(hours=4, minutes=20), 85, leg_id="3"),
+        _fl3xx("CGASR", "CYYC", "CYVR", BASE + timedelta(days=3, minutes=10), 90, leg_id="4"),
+        _fl3xx("CGASR", "CYYC", "KPSP", BASE + timedelta(hours=5), 150, leg_id="5"),
+    ]
+
+    matches, unmatched_foreflight, unmatched_fl3xx = match_records(foreflight, fl3xx)
+
+    assert [(m.foreflight_record.flight_id, m.fl3xx_record.flight_id, m.match_reason) for m in matches] == [
+        ("ff-1", "1", "booking_identifier"),
+        ("ff-2", "3", "tail_route_time"),
+        ("ff-3", "4", "tail_route_time"),
+    ]
+    assert matches[1].departure_diff_minutes == 20 and matches[1].confidence == "High"
+    assert matches[2].departure_diff_minutes == 20
+    assert [record.flight_id for record in unmatched_foreflight] == ["ff-4"]
+    assert [record.flight_id for record in unmatched_fl3xx] == ["2", "5"]
+
+
+def test_fetch_performance_payloads_runs_concurrently_and_caches_successes():
+    server = FakeForeFlight()
+    for index in range(6):
+        server.add_flight(f"ff-{index}", "CYYC", "CYVR", BASE, 90, fuel=None if index == 5 else 1000 + index)
+    cache = PayloadCache(300, clock=lambda: 0.0)
+
+    first = fetch_performance_payloads(
+        ["ff-0", "ff-1", "ff-1", None, "ff-2", "ff-3", "ff-4", "ff-5"],
+        token="token",
+        max_workers=4,
+        cache=cache,
+        fetch_performance_fn=server.fetch_performance,
+    )
+    assert list(first) == ["ff-0", "ff-1", "ff-2", "ff-3", "ff-4", "ff-5"]
+    assert first["ff-5"] is None
+    assert first["ff-3"]["performance"]["fuel"]["flightFuel"] == 1003
+    assert len(server.requests) == 6
+
+    server.requests.clear()
+    second = fetch_performance_payloads(
+        ["ff-0", "ff-5"], token="token", cache=cache, fetch_performance_fn=server.fetch_performance
+    )
+    assert second["ff-0"] is first["ff-0"]
+    assert len(server.requests) == 1 and server.requests[0].endswith("/ff-5/performance")
+
+
+def test_build_performance_rows_reports_legs_without_performance():
+    server = FakeForeFlight()
+    server.add_flight("ff-1", "CYYC", "CYVR", BASE, 90, tags=["ABCDE"], fuel=1500)
+    server.add_flight("ff-2", "CYVR", "CYYC", BASE + timedelta(hours=4), 85, tags=["FGHIJ"])
+    foreflight = build_records(foreflight_record(flight) for flight in server.flights)
+    fl3xx = [
+        _fl3xx("CGASR", "CYYC", "CYVR", BASE, 90, booking="ABCDE"),
+        _fl3xx("CGASR", "CYVR", "CYYC", BASE + timedelta(hours=4), 85, booking="FGHIJ"),
+    ]
+    matches, _, _ = match_records(foreflight, fl3xx)
+    payloads = fetch_performance_payloads(
+        [match.foreflight_record.flight_id for match in matches],
+        token="token",
+        fetch_performance_fn=server.fetch_performance,
+    )
+
+    rows, missing = build_performance_rows(matches, payloads, 1200.0)
+
+    assert missing == ["CYVR → CYYC"]
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["Dep Time (UTC)"] == "2026-10-01 14:00Z"
+    assert row["Required Dep Fuel (lb)"] == 1500 + 100 + 1200
+    assert row["Max Fuel by Weight (lb)"] == 3500 + 1000
+    assert row["Effective Max Fuel (lb)"] == 4500
@@ -112,3 +112,46 @@ def test_assign_roster_to_schedule_rows_leaves_non_flights_blank() -> None:
     assert enriched[0]["crew"] == ""
     assert enriched[0]["positioning"] == ""
     assert enriched[0]["roster_flight_id"] == ""
+
+
+def test_assign_roster_positioning_uses_latest_within_48_hours() -> None:
+    schedule_rows = [
+        {
+            "tail": "C-FASP",
+            "task_id": "flight_200",
+            "category": "OCS Flight",
+            "departure_airport": "CYUL",
+            "arrival_airport": "CYYZ",
+            "start_utc": datetime(2026, 3, 20, 14, 0, tzinfo=UTC),
+            "end_utc": datetime(2026, 3, 20, 15, 0, tzinfo=UTC),
+        },
+        {
+            "tail": "C-FASR",
+            "task_id": "flight_201",
+            "category": "Client Flight",
+            "departure_airport": "CYVR",
+            "arrival_airport": "CYYC",
+            "start_utc": datetime(2026, 3, 25, 14, 0, tzinfo=UTC),
+            "end_utc": datetime(2026, 3, 25, 15, 0, tzinfo=UTC),
+        },
+    ]
+    roster_rows = [
+        {
+            "user": {"firstName": "Alex", "lastName": "Pilot"},
+            "entries": [
+                {"type": "P", "fromAirport": "CYVR", "toAirport": "CYYC", "to": "2026-03-19T08:00:00Z"},
+                {"type": "P", "fromAirport": "CYYC", "toAirport": "CYUL", "to": "2026-03-20T09:00:00Z"},
+                {"type": "P", "fromAirport": "CYUL", "toAirport": "CYOW", "to": "2026-03-20T16:00:00Z"},
+            ],
+            "flights": [
+                {"flightId": 200, "departureTime": "2026-03-20T14:00:00Z", "fromAirport": "CYUL", "toAirport": "CYYZ"},
+                {"flightId": 201, "departureTime": "2026-03-25T14:00:00Z", "fromAirport": "CYVR", "toAirport": "CYYC"},
+            ],
+        }
+    ]
+
+    enriched = assign_roster_to_schedule_rows(schedule_rows, roster_rows)
+
+    assert enriched[0]["positioning"] == "Alex Pilot: CYYC-CYUL (2026-03-20 09:00Z)"
+    assert enriched[1]["crew"] == "Alex Pilot"
+    assert enriched[1]["positioning"] == ""
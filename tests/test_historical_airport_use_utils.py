@@ -7,10 +7,19 @@ import sys
 
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 
+import pandas as pd
+
 from historical_airport_use_utils import (
+    add_airport_attributes,
     airport_matches_focus,
     airport_country_code,
+    airport_visits,
+    average_flight_length_summary,
+    build_leg_pivot,
+    departure_counts,
+    enrich_legs_frame,
     extract_airport_code,
+    focus_pos_summary,
     is_positioning_leg,
     leg_duration_hours,
 )
@@ -49,3 +58,73 @@ def test_leg_duration_hours_returns_positive_utc_duration() -> None:
         "arrival_time": "2024-01-01T12:30:00Z",
     }
     assert leg_duration_hours(leg) == 2.5
+
+
+def _legs() -> list[dict]:
+    return [
+        {
+            "day": "2024-01-05",
+            "departure_airport": "cyhz",
+            "arrival_airport": {"icao": "MKJP"},
+            "flightType": "POS",
+            "dep_time": "2024-01-05T10:00:00Z",
+            "arrival_time": "2024-01-05T14:30:00Z",
+        },
+        {
+            "day": "2024-01-06",
+            "airportFrom": "MKJP",
+            "arrival_airport": "CYHZ",
+            "flight_type": "PAX",
+            "dep_time": "2024-01-06T15:00:00Z",
+            "arrival_time": "2024-01-06T14:00:00Z",
+        },
+        {
+            "day": "2024-02-01",
+            "departure_airport": "CYHZ",
+            "arrival_airport": "EGLL",
+            "flightType": "Passenger",
+            "dep_time": "2024-02-01T00:00:00Z",
+            "arrival_time": "2024-02-01T06:00:00Z",
+        },
+    ]
+
+
+_LOOKUP = {
+    "CYHZ": {"country": "CA", "subd": "NS"},
+    "MKJP": {"country": "JM", "subd": None},
+    "EGLL": {"country": "GB", "subd": None},
+}
+
+
+def test_enrich_legs_frame_matches_per_leg_helpers() -> None:
+    legs = _legs()
+    frame = enrich_legs_frame(legs, _LOOKUP)
+
+    assert frame["dep_airport"].astype(object).tolist() == ["CYHZ", "MKJP", "CYHZ"]
+    assert frame["arr_airport"].astype(object).tolist() == ["MKJP", "CYHZ", "EGLL"]
+    assert frame["dep_country"].tolist() == [airport_country_code(code, _LOOKUP) for code in ("CYHZ", "MKJP", "CYHZ")]
+    assert frame["is_pos"].tolist() == [is_positioning_leg(leg) for leg in legs]
+    assert frame["is_pax"].tolist() == [False, True, True]
+    assert frame["duration_hours"].tolist()[0] == leg_duration_hours(legs[0])
+    assert pd.isna(frame["duration_hours"].iloc[1])
+
+
+def test_leg_pivot_answers_usage_queries() -> None:
+    pivot = add_airport_attributes(build_leg_pivot(enrich_legs_frame(_legs())), _LOOKUP)
+
+    assert departure_counts(pivot).to_dict("records") == [
+        {"Airport": "CYHZ", "Departures": 2},
+        {"Airport": "MKJP", "Departures": 1},
+    ]
+    averages = average_flight_length_summary(pivot).set_index("Region")
+    assert averages.loc["Overall", "PAX legs"] == 1
+    assert averages.loc["Overall", "Avg PAX flight length (hours)"] == 6.0
+    assert averages.loc["Caribbean", "Avg POS flight length (hours)"] == 4.5
+    totals, by_airport, _ = focus_pos_summary(pivot, "atlantic_canada")
+    assert totals == {"pos_legs_total": 1, "pos_legs_touching_focus": 1, "pos_hours_touching_focus": 4.5}
+    assert by_airport["dep_airport"].tolist() == ["CYHZ"]
+    assert airport_visits(pivot, "cyhz").to_dict("records") == [
+        {"month": "2024-01", "leg_type": "PAX", "Departures": 0, "Arrivals": 1},
+        {"month": "2024-01", "leg_type": "POS", "Departures": 1, "Arrivals": 0},
+        {"month": "2024-02", "leg_type": "PAX", "Departures": 1, "Arrivals": 0},
+    ]
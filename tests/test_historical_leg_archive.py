@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+from historical_leg_archive import LegArchive, chunk_ranges, flight_day
+
+
+def _flight(flight_id, day, hour=18, tail="C-GASR"):
+    return {
+        "flightId": flight_id,
+        "blockOffEstUTC": f"{day.isoformat()}T{hour:02d}:00:00Z",
+        "registrationNumber": tail,
+    }
+
+
+class _FakeApi:
+    def __init__(self, flights):
+        self.flights = flights
+        self.calls = []
+
+    def __call__(self, chunk_start, chunk_end):
+        self.calls.append((chunk_start, chunk_end))
+        returned = [
+            flight
+            for flight in self.flights
+            if chunk_start.isoformat() <= flight["blockOffEstUTC"][:10] < chunk_end.isoformat()
+        ]
+        return returned, {"from": chunk_start.isoformat(), "to": chunk_end.isoformat()}
+
+
+def test_chunk_ranges_cover_inclusive_window():
+    assert list(chunk_ranges(date(2025, 1, 1), date(2025, 1, 7), 3)) == [
+        (date(2025, 1, 1), date(2025, 1, 4)),
+        (date(2025, 1, 4), date(2025, 1, 7)),
+        (date(2025, 1, 7), date(2025, 1, 8)),
+    ]
+
+
+def test_flight_day_uses_mountain_time_and_clamps_to_chunk():
+    late_utc = {"blockOffEstUTC": "2025-03-02T03:00:00Z"}
+    assert flight_day(late_utc, date(2025, 3, 1), date(2025, 3, 4)) == date(2025, 3, 1)
+    assert flight_day(late_utc, date(2025, 3, 2), date(2025, 3, 4)) == date(2025, 3, 2)
+    assert flight_day({}, date(2025, 3, 2), date(2025, 3, 4)) == date(2025, 3, 2)
+
+
+def test_archive_fetches_once_and_only_refreshes_mutable_days(tmp_path):
+    today = date(2025, 3, 20)
+    flights = [_flight(idx, date(2025, 2, 1) + timedelta(days=idx)) for idx in range(47)]
+    api = _FakeApi(flights)
+    archive = LegArchive(tmp_path, chunk_days=3, max_workers=4, today_fn=lambda: today)
+
+    first = archive.load(date(2025, 2, 1), date(2025, 3, 19), api)
+
+    assert first.days_fetched == 47
+    assert sorted(flight["flightId"] for flight in first.flights) == list(range(47))
+    assert sorted(archive.partition_versions(date(2025, 1, 1), date(2025, 12, 31))) == ["2025-02", "2025-03"]
+
+    api.calls.clear()
+    api.flights = flights[:-1] + [_flight(46, date(2025, 3, 19), tail="C-FASW")]
+    second = archive.load(date(2025, 2, 1), date(2025, 3, 19), api)
+
+    assert second.days_fetched == 14
+    assert min(start for start, _ in api.calls) == date(2025, 3, 6)
+    assert len(second.flights) == 47
+    updated = [flight for flight in second.flights if flight["flightId"] == 46]
+    assert updated[0]["registrationNumber"] == "C-FASW"
+
+
+def test_archive_drops_flights_removed_upstream_and_reads_offline(tmp_path):
+    today = date(2025, 3, 10)
+    api = _FakeApi([_flight(1, date(2025, 3, 8)), _flight(2, date(2025, 3, 9))])
+    archive = LegArchive(tmp_path, today_fn=lambda: today)
+    archive.load(date(2025, 3, 8), date(2025, 3, 9), api)
+
+    api.flights = [_flight(1, date(2025, 3, 8))]
+    archive.load(date(2025, 3, 8), date(2025, 3, 9), api)
+    offline = LegArchive(tmp_path).load(date(2025, 3, 1), date(2025, 3, 31))
+
+    assert [flight["flightId"] for flight in offline.flights] == [1]
+    assert offline.days_fetched == 0 and offline.chunks == []
+
+
+def test_window_analysis_reuses_cached_partitions(tmp_path, monkeypatch):
+    import historical_airport_use_utils as utils
+
+    today = date(2025, 3, 20)
+    flights = [
+        {**_flight(idx, date(2025, 1, 10) + timedelta(days=idx)), "airportFrom": "CYHZ", "airportTo": "MKJP", "flightType": "POS"}
+        for idx in range(60)
+    ]
+    archive = LegArchive(tmp_path, today_fn=lambda: today)
+    archive.refresh(date(2025, 1, 10), date(2025, 3, 10), _FakeApi(flights))
+    built = []
+    original = utils.analyze_archive_rows
+    monkeypatch.setattr(utils, "analyze_archive_rows", lambda rows: built.append(len(rows)) or original(rows))
+    utils.clear_partition_cache()
+    lookup = {"CYHZ": {"country": "CA", "subd": "NS"}, "MKJP": {"country": "JM"}}
+
+    window = utils.analyze_window(archive, date(2025, 1, 15), date(2025, 2, 14), lookup)
+    utils.analyze_window(archive, date(2025, 1, 1), date(2025, 3, 31), lookup)
+
+    assert window.stats()["flights_returned"] == 31
+    assert utils.departure_counts(window.pivot).to_dict("records") == [{"Airport": "CYHZ", "Departures": 31}]
+    assert built == [22, 28, 10]
+
+    archive.refresh(date(2025, 3, 1), date(2025, 3, 10), _FakeApi(flights))
+    utils.analyze_window(archive, date(2025, 1, 1), date(2025, 3, 31), lookup)
+    assert built == [22, 28, 10, 10]
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pandas as pd
+
+from fl3xx_api import Fl3xxApiConfig
+from jeppesen_itp_utils import classify_itp_legs, extract_airport_codes, fetch_itp_legs, iter_date_chunks
+
+LOOKUP = {
+    "CYYC": {"country": "CA"},
+    "KLAS": {"country": "US"},
+    "LFPB": {"country": "FR"},
+    "SKBO": {"country": "CO"},
+    "MKJP": {"country": "JM"},
+    "NOCN": {"country": None},
+}
+
+
+def test_extract_airport_codes_handles_free_text():
+    assert extract_airport_codes(" cyyc ") == ["CYYC"]
+    assert extract_airport_codes("Paris LFPB (Le Bourget)") == ["LFPB"]
+    assert extract_airport_codes(float("nan")) == []
+
+
+def test_classify_uses_first_resolvable_code_per_side():
+    legs = pd.DataFrame(
+        {
+            "departure_airport": ["CYYC", "XXXX", None, "LFPB", "NOCN"],
+            "airportFrom": [None, "SKBO", "KLAS", None, "LFPB"],
+            "arrival_airport": ["KLAS", "LFPB", "MKJP", "LFPB", "CYYC"],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+    result = classify_itp_legs(legs, LOOKUP)
+    frame = result.frame
+
+    assert list(frame.index) == [10, 11, 12, 13, 14]
+    assert list(frame["requires_itp"]) == [False, True, False, True, True]
+    assert list(frame["requires_cuban_overflight"]) == [False, False, True, False, False]
+    assert frame.loc[11, "dep_code"] == "SKBO"
+    assert frame.loc[11, "itp_countries"] == "Colombia, France"
+    assert frame.loc[13, "itp_countries"] == "France"
+    assert frame.loc[14, "dep_code"] == "LFPB"
+    assert frame.loc[12, "cuban_countries"] == "Jamaica"
+    assert result.missing_codes == {"XXXX"}
+
+
+def test_fetch_itp_legs_reports_chunks_in_order_and_earliest_error():
+    requested = []
+
+    def fetch_legs(config, from_date, to_date, departure_window=None, fetch_crew=True):
+        requested.append(from_date)
+        if from_date in (date(2026, 10, 6), date(2026, 10, 11)):
+            raise RuntimeError(f"failed {from_date}")
+        return pd.DataFrame({"flightId": [from_date.isoformat()]}), {"from": from_date}, None
+
+    progress = []
+    fetch = fetch_itp_legs(
+        Fl3xxApiConfig(),
+        date(2026, 10, 1),
+        date(2026, 10, 17),
+        chunk_days=5,
+        fetch_legs_fn=fetch_legs,
+        on_chunk_done=lambda done, total: progress.append((done, total)),
+    )
+
+    assert sorted(requested) == [start for start, _ in iter_date_chunks(date(2026, 10, 1), date(2026, 10, 17), 5)]
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    assert fetch.error[:2] == (date(2026, 10, 6), date(2026, 10, 10))
+    assert [chunk["chunk_index"] for chunk in fetch.chunks] == [1, 4]
+    assert fetch.chunks[1]["request_range"] == {"from": "2026-10-16", "to": "2026-10-18"}
+    assert list(fetch.legs["flightId"]) == ["2026-10-01", "2026-10-16"]
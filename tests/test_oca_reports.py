@@ -6,12 +6,15 @@ from typing import Any, Dict, List, Optional, Tuple
 from fl3xx_api import Fl3xxApiConfig
 from oca_reports import (
     MaxFlightTimeAlert,
+    PayloadCache,
     ZfwFlightCheck,
+    evaluate_flights_for_high_pax_weight,
     evaluate_flights_for_max_time,
     evaluate_flights_for_runway_length,
     evaluate_mel_hold_items,
     evaluate_flights_for_zfw_check,
     format_duration_label,
+    prepare_oca_run,
 )
 
 
@@ -540,3 +543,141 @@ def test_mel_hold_items_does_not_flag_non_autobrake():
     item = items[0]
     assert item.autobrake_related is False
     assert item.runway_limit_ft is None
+
+
+def _prepared_run_flights() -> List[Dict[str, Any]]:
+    block_off = dt.datetime(2025, 10, 2, 1, 0, tzinfo=dt.timezone.utc)
+    return [
+        # Over max time (and high pax duration) with three pax.
+        _flight(flight_id=1, quote_id="Q1", block_off=block_off, block_on=block_off + dt.timedelta(hours=5)),
+        # ZFW threshold pax on the same quote as a later leg.
+        _flight(flight_id=2, quote_id="Q2", pax=6, block_off=block_off, block_on=block_off + dt.timedelta(hours=1)),
+        _flight(flight_id=3, quote_id="Q2", pax=7, block_off=block_off, block_on=block_off + dt.timedelta(hours=2)),
+        # Short leg that no check needs details for.
+        _flight(flight_id=4, quote_id="Q4", pax=1, block_off=block_off, block_on=block_off + dt.timedelta(minutes=40)),
+    ]
+
+
+def test_prepared_run_fetches_each_payload_once_and_matches_direct_checks():
+    flights = _prepared_run_flights()
+    leg_payloads = {
+        "Q1": {"bookingNote": "FPL RUN BY OCA"},
+        "Q2": {"bookingNote": "ZFW OK WITH CURRENT PAX/BAGGAGE"},
+    }
+    pax_payloads = {
+        1: {"tickets": [{"bodyWeight": 500}, {"bodyWeight": 500}, {"bodyWeight": 500}]},
+        3: {"tickets": [{"bodyWeight": 150}]},
+    }
+    calls: List[Tuple[str, Any]] = []
+
+    def fake_fetch_flights(config, from_date, to_date):
+        calls.append(("flights", from_date))
+        return flights, {"from_date": from_date.isoformat(), "to_date": to_date.isoformat()}
+
+    def fake_fetch_leg_details(config, quote_id, session=None):
+        calls.append(("leg", quote_id))
+        return leg_payloads[quote_id]
+
+    def fake_fetch_pax_details(config, flight_id, session=None):
+        calls.append(("pax", flight_id))
+        return pax_payloads[flight_id]
+
+    config = Fl3xxApiConfig()
+    window = {"from_date": dt.date(2025, 10, 1), "to_date": dt.date(2025, 10, 4)}
+    cache = PayloadCache()
+    data = prepare_oca_run(
+        config,
+        fetch_flights_fn=fake_fetch_flights,
+        fetch_leg_details_fn=fake_fetch_leg_details,
+        fetch_pax_details_fn=fake_fetch_pax_details,
+        max_workers=4,
+        cache=cache,
+        **window,
+    )
+
+    assert sorted(calls, key=str) == sorted(
+        [("flights", window["from_date"]), ("leg", "Q1"), ("leg", "Q2"), ("pax", 1), ("pax", 3)], key=str
+    )
+    assert data.diagnostics["leg_details_needed"] == 2
+    assert data.diagnostics["pax_details_needed"] == 2
+
+    direct = {"fetch_flights_fn": fake_fetch_flights}
+    checks = [
+        (evaluate_flights_for_max_time, {"fetch_leg_details_fn": fake_fetch_leg_details}),
+        (evaluate_flights_for_zfw_check, {"fetch_leg_details_fn": fake_fetch_leg_details}),
+        (evaluate_flights_for_high_pax_weight, {"fetch_pax_details_fn": fake_fetch_pax_details}),
+        (evaluate_flights_for_runway_length, {}),
+    ]
+    for check, fetchers in checks:
+        calls.clear()
+        shared = check(config, data=data, **window)
+        assert calls == []
+        assert shared == check(config, **window, **direct, **fetchers)
+    assert data.diagnostics["late_fetches"] == 0
+    assert len(evaluate_flights_for_high_pax_weight(config, data=data, **window)[0]) == 1
+
+    calls.clear()
+    again = prepare_oca_run(
+        config,
+        fetch_flights_fn=fake_fetch_flights,
+        fetch_leg_details_fn=fake_fetch_leg_details,
+        fetch_pax_details_fn=fake_fetch_pax_details,
+        cache=cache,
+        **window,
+    )
+    assert calls == [("flights", window["from_date"])]
+    assert again.diagnostics["cache_hits"] == 4
+
+
+def test_prepared_run_errors_reach_check_diagnostics_and_are_not_cached():
+    block_off = dt.datetime(2025, 10, 2, 1, 0, tzinfo=dt.timezone.utc)
+    flights = [_flight(block_off=block_off, block_on=block_off + dt.timedelta(hours=5))]
+
+    def failing_leg_details(config, quote_id, session=None):
+        raise RuntimeError("leg endpoint unavailable")
+
+    cache = PayloadCache()
+    data = prepare_oca_run(
+        Fl3xxApiConfig(),
+        from_date=dt.date(2025, 10, 1),
+        to_date=dt.date(2025, 10, 4),
+        fetch_flights_fn=lambda config, from_date, to_date: (flights, {}),
+        fetch_leg_details_fn=failing_leg_details,
+        fetch_pax_details_fn=lambda config, flight_id, session=None: {},
+        cache=cache,
+    )
+
+    alerts, _, diagnostics = evaluate_flights_for_max_time(
+        Fl3xxApiConfig(), from_date=dt.date(2025, 10, 1), to_date=dt.date(2025, 10, 4), data=data
+    )
+
+    assert diagnostics["note_errors"] == 1
+    assert diagnostics["note_error_messages"] == ["leg endpoint unavailable"]
+    assert alerts[0].booking_note_present is False
+    assert len(cache) == 1  # only the pax payload
+
+
+def test_payload_cache_expires_entries_after_ttl():
+    now = [0.0]
+    cache = PayloadCache(ttl_seconds=60, clock=lambda: now[0])
+    cache.set(("leg_details", "base", "Q1"), {"note": 1})
+
+    now[0] = 59.0
+    assert cache.get(("leg_details", "base", "Q1")) == (True, {"note": 1})
+    now[0] = 61.0
+    assert cache.get(("leg_details", "base", "Q1")) == (False, None)
+    assert len(cache) == 0
+
+
+def test_payload_cache_sweeps_unread_entries_and_caps_size():
+    now = [0.0]
+    cache = PayloadCache(ttl_seconds=60, max_entries=3, clock=lambda: now[0])
+    for flight in ("Q1", "Q2", "Q3", "Q4"):
+        cache.set(("leg_details", "base", flight), {"flight": flight})
+    assert len(cache) == 3
+    assert cache.get(("leg_details", "base", "Q1")) == (False, None)
+
+    now[0] = 61.0
+    cache.set(("pax_details", "base", "Q9"), {"pax": 1})
+    assert len(cache) == 1
+    assert cache.get(("pax_details", "base", "Q9")) == (True, {"pax": 1})
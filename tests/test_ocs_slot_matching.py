@@ -0,0 +1,90 @@
+import pandas as pd
+
+from ocs_slot_matching import SLOT_COLUMNS, build_slot_legs, compare
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.now("UTC").tz_localize(None).normalize()
+
+
+def _slot(ref: str, when: pd.Timestamp, *, tail: str, movement: str = "DEP", airport: str = "CYYC"):
+    return {
+        "SlotAirport": airport,
+        "Date": (when.day, when.month),
+        "Movement": movement,
+        "SlotTimeHHMM": when.strftime("%H%M"),
+        "Tail": tail,
+        "SlotRef": ref,
+    }
+
+
+def _leg(booking: str, off_block: pd.Timestamp, *, tail: str = "CGABC"):
+    return {
+        "Booking": booking,
+        "From (ICAO)": "CYYC",
+        "To (ICAO)": "KPSP",
+        "Tail": tail,
+        "OffBlock": off_block,
+        "OnBlock": off_block + pd.Timedelta(hours=3),
+        "Flight Type": "PAX",
+    }
+
+
+def test_build_slot_legs_keeps_slot_airport_sides_and_drops_duplicates():
+    dep = _today() + pd.Timedelta(hours=10, seconds=20)
+    fl3xx = pd.DataFrame([_leg("B1", dep), _leg("B1", dep), {**_leg("B2", dep), "To (ICAO)": "CYVR"}])
+
+    legs = build_slot_legs(fl3xx)
+
+    assert [(leg["Flight"], leg["Airport"], leg["Movement"]) for leg in legs] == [
+        ("B1", "CYYC", "DEP"),
+        ("B2", "CYVR", "ARR"),
+        ("B2", "CYYC", "DEP"),
+    ]
+    assert legs[0]["SchedDT"] == _today() + pd.Timedelta(hours=10)
+    assert legs[0]["PAX/OCS"] == "PAX"
+
+
+def test_compare_allocates_closest_same_tail_slot_once():
+    dep = _today() + pd.Timedelta(hours=9)
+    fl3xx = pd.DataFrame([_leg("B1", dep), _leg("B2", dep + pd.Timedelta(minutes=5))])
+    ocs = pd.DataFrame(
+        [
+            _slot("FAR", dep + pd.Timedelta(minutes=25), tail="CGABC"),
+            _slot("NEAR", dep + pd.Timedelta(minutes=10), tail="CGABC"),
+            _slot("OTHER", dep - pd.Timedelta(days=3), tail="CGXYZ"),
+        ],
+        columns=SLOT_COLUMNS,
+    )
+
+    results, stale = compare(fl3xx, ocs)
+
+    assert [(row["Flight"], row["SlotRef"], row["DeltaMin"]) for row in results["Matched"]] == [
+        ("B1", "NEAR", 10),
+        ("B2", "FAR", 20),
+    ]
+    assert list(stale["SlotRef"]) == ["OTHER"]
+
+
+def test_compare_flags_wrong_tail_and_time_mismatches():
+    today = _today()
+    fl3xx = pd.DataFrame(
+        [
+            _leg("B1", today + pd.Timedelta(hours=8), tail="CGABC"),
+            _leg("B2", today + pd.Timedelta(hours=14), tail="CGDEF"),
+        ]
+    )
+    ocs = pd.DataFrame(
+        [
+            _slot("WRONG", today + pd.Timedelta(hours=8, minutes=10), tail="CGZZZ"),
+            _slot("LATE", today + pd.Timedelta(hours=16), tail="CGDEF"),
+        ],
+        columns=SLOT_COLUMNS,
+    )
+
+    results, stale = compare(fl3xx, ocs)
+
+    assert [row["SlotRef"] for row in results["MisalignedTail"]] == ["WRONG"]
+    assert [(row["SlotRef"], row["DeltaMin"]) for row in results["MisalignedTime"]] == [("LATE", 120)]
+    assert results["Matched"] == []
+    assert stale.empty
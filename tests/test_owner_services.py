@@ -1,6 +1,11 @@
+import re
+
 from owner_services import (
+    KeywordAutomaton,
     OwnerServicesSummary,
+    SensitiveNoteScanner,
     extract_owner_service_audit_entries,
+    fetch_owner_service_payloads,
     format_owner_service_entries,
 )
 
@@ -210,3 +215,65 @@ def test_extract_owner_service_audit_entries_filters_custom1_and_keeps_custom2()
 
     assert len(entries) == 1
     assert entries[0].description.startswith("SUV")
+
+
+def test_keyword_automaton_matches_regex_alternation():
+    keywords = ["special event fee", "special", "event", "fee", "first", "first flight", "c/o", "esta"]
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in keywords) + r")\b", re.IGNORECASE)
+    texts = [
+        "Owner advised of SPECIAL EVENT FEE; event parking fee extra.",
+        "First flight for the guest, first class catering. c/o Estate, not ESTA-ready",
+        "feeding fees_event specialist",
+    ]
+
+    automaton = KeywordAutomaton(keywords)
+
+    for text in texts:
+        expected = sorted({match.group(0).lower() for match in pattern.finditer(text)})
+        assert automaton.find(text) == expected
+    assert automaton.find(texts[0]) == ["event", "fee", "special event fee"]
+    assert KeywordAutomaton([]).find("anything") == []
+
+
+def test_sensitive_note_scanner_rescans_only_changed_notes():
+    scanner = SensitiveNoteScanner(["visa", "dogs"], ["special event fee"])
+    blocks = [("Leg notes", "Visa check, special event fee"), ("Planning notes", "Two dogs; special event fee")]
+
+    first, rescanned = scanner.scan("F-1", blocks)
+    assert rescanned
+    assert first.keywords == ("dogs", "visa")
+    assert first.special_event_terms == ("special event fee",)
+
+    assert scanner.scan("F-1", list(blocks)) == (first, False)
+
+    changed, rescanned = scanner.scan("F-1", [("Planning notes", "No pets")])
+    assert rescanned and changed.keywords == () and changed.special_event_terms == ()
+    assert scanner.scan(None, blocks)[1]
+
+
+def test_fetch_owner_service_payloads_dedupes_and_collects_failures():
+    calls = []
+
+    def fake_leg_details(config, quote_id, *, session=None):
+        calls.append(("leg", quote_id))
+        return {"planningNotes": quote_id}
+
+    def fake_services(config, flight_id, *, session=None):
+        calls.append(("services", flight_id))
+        if flight_id == "F-2":
+            raise RuntimeError("services unavailable")
+        return {"notes": []}
+
+    payloads = fetch_owner_service_payloads(
+        object(),
+        quote_ids=["Q-1", None, "Q-1"],
+        flight_ids=["F-1", "F-2", "F-1", ""],
+        fetch_leg_details_fn=fake_leg_details,
+        fetch_services_fn=fake_services,
+    )
+
+    assert sorted(calls) == [("leg", "Q-1"), ("services", "F-1"), ("services", "F-2")]
+    assert payloads.requests == 3
+    assert payloads.leg_details == {"Q-1": {"planningNotes": "Q-1"}}
+    assert payloads.services == {"F-1": {"notes": []}}
+    assert str(payloads.service_errors["F-2"]) == "services unavailable"
@@ -0,0 +1,97 @@
+from datetime import date
+
+from fl3xx_api import Fl3xxApiConfig, PayloadCache
+from passport_service import chunk_ranges, fetch_passport_data, load_passport_legs
+
+
+def _ticket(user_id, number=None):
+    card = {"number": number, "issueCountry": {"iso3": "CAN"}, "expirationDate": 1893456000000} if number else None
+    return {"paxUser": {"id": user_id, "firstName": f"Pax{user_id}"}, "idCard": card}
+
+
+class _FakeApi:
+    def __init__(self):
+        self.calls = []
+
+    def pax(self, config, flight_id, session=None):
+        self.calls.append(("pax", flight_id))
+        if flight_id == "3":
+            raise RuntimeError("pax_details GET failed")
+        return {"pax": {"tickets": [_ticket(10), _ticket(11, "ONFILE"), _ticket(int(flight_id) + 20)]}}
+
+    def preflight(self, config, flight_id, session=None):
+        self.calls.append(("preflight", flight_id))
+        return {"details": {"hndlgAndSvcs": {"cstm": "OK"}}}
+
+    def member(self, config, user_id, session=None):
+        self.calls.append(("member", user_id))
+        if user_id == "22":
+            raise RuntimeError("staff lookup failed")
+        return {"idCards": [{"type": "PASSPORT", "number": f"P{user_id}", "issueCountry": {"iso3": "USA"}}]}
+
+    def kwargs(self, **caches):
+        return dict(
+            fetch_pax_fn=self.pax,
+            fetch_preflight_fn=self.preflight,
+            fetch_member_fn=self.member,
+            pax_cache=caches.get("pax"),
+            preflight_cache=caches.get("preflight"),
+            member_cache=caches.get("member"),
+        )
+
+
+def test_chunked_leg_load_covers_inclusive_window():
+    requested = []
+
+    def fetch_flights(config, from_date, to_date):
+        requested.append((from_date, to_date))
+        flight = {
+            "flightId": len(requested),
+            "airportFrom": "CYYC",
+            "airportTo": "KLAS",
+            "blockOffEstUTC": f"{from_date.isoformat()}T18:00:00Z",
+            "registrationNumber": "C-GASR",
+        }
+        return [flight], {"from": from_date}
+
+    legs, metadata = load_passport_legs(
+        Fl3xxApiConfig(), from_date=date(2026, 10, 1), to_date=date(2026, 10, 5), fetch_flights_fn=fetch_flights
+    )
+
+    assert requested == list(chunk_ranges(date(2026, 10, 1), date(2026, 10, 5)))
+    assert requested[-1] == (date(2026, 10, 4), date(2026, 10, 6))
+    assert [leg["flightId"] for leg in legs] == [1, 2]
+    assert metadata["total_flights"] == 2 and len(metadata["chunks"]) == 2
+
+
+def test_passport_backfill_is_looked_up_once_per_passenger():
+    api = _FakeApi()
+
+    data = fetch_passport_data(Fl3xxApiConfig(), [1, "1", 2, 3], **api.kwargs())
+
+    pax_calls = sorted(call for call in api.calls if call[0] != "member")
+    member_calls = sorted(call for call in api.calls if call[0] == "member")
+    assert pax_calls == [("pax", "1"), ("pax", "2"), ("pax", "3"), ("preflight", "1"), ("preflight", "2"), ("preflight", "3")]
+    assert member_calls == [("member", "10"), ("member", "21"), ("member", "22")]
+    assert data.passport_lookups == 3
+
+    first = {pax.user_id: pax for pax in data.passengers["1"]}
+    second = {pax.user_id: pax for pax in data.passengers["2"]}
+    assert first["10"].document_number == second["10"].document_number == "P10"
+    assert first["11"].document_number == "ONFILE"
+    assert second["22"].document_number is None
+    assert data.passenger_errors == {"3": "pax_details GET failed"}
+    assert set(data.preflights) == {"1", "2", "3"}
+
+
+def test_payload_caches_are_shared_between_scans():
+    api = _FakeApi()
+    caches = {"pax": PayloadCache(), "preflight": PayloadCache(), "member": PayloadCache()}
+    fetch_passport_data(Fl3xxApiConfig(), [1, 2], **api.kwargs(**caches))
+
+    api.calls.clear()
+    data = fetch_passport_data(Fl3xxApiConfig(), [2, 4], **api.kwargs(**caches))
+
+    assert sorted(api.calls) == [("member", "22"), ("member", "24"), ("pax", "4"), ("preflight", "4")]
+    assert data.cache_hits == 3 and data.requests == 4
+    assert {pax.user_id: pax.document_number for pax in data.passengers["4"]}["10"] == "P10"
@@ -0,0 +1,101 @@
+import math
+
+import pytest
+
+from payload_weights import (
+    STD_WEIGHTS,
+    compute_payload_weights,
+    determine_season,
+    flatten_pax_payloads,
+    pax_breakdown,
+    pax_category,
+    season_for_month,
+)
+
+
+def _payloads():
+    return {
+        "A": {
+            "payload": {
+                "paxPayload": {
+                    "tickets": [
+                        {"paxUser": {"gender": "F"}},
+                        {"paxType": "CHILD", "luggageWeight": 20},
+                        {"bodyWeight": "180", "paxUser": {"gender": "M"}},
+                    ]
+                }
+            },
+            "cargo": [{"weightQty": 40, "note": "Skis"}],
+            "animals": [{"note": "Dog"}],
+        },
+        "B": {"tickets": [{"gender": "female"}, {"paxUser": {"title": "Mr"}}]},
+        "C": {},
+    }
+
+
+def test_flatten_builds_one_row_per_ticket_and_cargo_entry():
+    tables = flatten_pax_payloads(_payloads())
+
+    assert tables.flight_ids == ["A", "B", "C"]
+    assert tables.tickets["flight_id"].tolist() == ["A", "A", "A", "B", "B"]
+    assert tables.tickets["category"].tolist() == ["Female", "Child", "Male", "Female", "Male"]
+    assert tables.tickets["declared_weight"].tolist()[2] == 180.0
+    assert tables.cargo[["flight_id", "kind", "note"]].to_dict("records") == [
+        {"flight_id": "A", "kind": "cargo", "note": "Skis"},
+        {"flight_id": "A", "kind": "animal", "note": "Dog"},
+    ]
+    assert math.isnan(tables.cargo["weight"].iloc[1])
+
+
+def test_compute_payload_weights_for_all_flights_in_one_pass():
+    weights = compute_payload_weights(
+        flatten_pax_payloads(_payloads()), {"A": "Summer", "B": "Winter", "C": "Summer"}
+    )
+
+    summer, winter = STD_WEIGHTS["Summer"], STD_WEIGHTS["Winter"]
+    a, b, c = (weights.loc[key] for key in ("A", "B", "C"))
+    assert a["pax_weight"] == summer["Female"] + summer["Child"] + 20 + 180
+    assert a["missing_weights"] == 2
+    assert (a["cargo_weight"], a["animal_weight"]) == (40, 0)
+    assert a["total_weight"] == a["pax_weight"] + 40
+    assert pax_breakdown(a) == {"Male": 1, "Female": 1, "Child": 1}
+    assert b["pax_weight"] == winter["Female"] + winter["Male"]
+    assert b["cargo_weight"] == 60
+    assert c["pax_count"] == 0 and math.isnan(c["total_weight"])
+
+
+def test_animal_default_weight_applies_to_unweighted_animals():
+    payloads = {"A": {"tickets": [{}], "animals": [{"note": "Cat"}]}}
+
+    default = compute_payload_weights(flatten_pax_payloads(payloads), {"A": "Winter"})
+    animals = compute_payload_weights(
+        flatten_pax_payloads(payloads), {"A": "Winter"}, animal_default_weight=30.0
+    )
+
+    assert (default.loc["A", "cargo_weight"], default.loc["A", "animal_weight"]) == (30, 0)
+    assert (animals.loc["A", "cargo_weight"], animals.loc["A", "animal_weight"]) == (0, 30)
+
+
+@pytest.mark.parametrize(
+    "ticket, expected",
+    [
+        ({"paxType": {"code": "INFANT"}, "gender": "F"}, "Infant"),
+        ({"gender": "F", "paxUser": {"gender": "M"}}, "Female"),
+        ({"paxType": "FEMALE", "paxUser": {"title": "Dr"}}, "Female"),
+        ({}, "Male"),
+    ],
+)
+def test_pax_category(ticket, expected):
+    assert pax_category(ticket) == expected
+
+
+def test_season_helpers():
+    assert [season_for_month(month) for month in (3, 4, 10, 11, None)] == [
+        "Winter",
+        "Summer",
+        "Summer",
+        "Winter",
+        "Winter",
+    ]
+    assert determine_season("2025-07-01T12:00:00Z") == "Summer"
+    assert determine_season({"departureTime": "2025-01-01T00:00:00Z"}) == "Winter"
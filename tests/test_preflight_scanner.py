@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+from fl3xx_api import Fl3xxApiConfig
+from preflight_scanner import PreflightDigestStore, PreflightScanner, fetch_preflights
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fetch_preflights_dedupes_and_reports_failures():
+    calls = []
+
+    def fake_preflight(config, flight_id, session=None):
+        calls.append(flight_id)
+        if flight_id == "2":
+            raise RuntimeError("boom")
+        return {"flightId": flight_id}
+
+    results = fetch_preflights(Fl3xxApiConfig(), [1, "1", 2, 3], max_workers=4, fetch_preflight_fn=fake_preflight)
+
+    assert sorted(calls) == ["1", "2", "3"]
+    assert list(results) == ["1", "2", "3"]
+    assert results["1"] == (True, {"flightId": "1"})
+    assert results["2"][0] is False and str(results["2"][1]) == "boom"
+
+
+def test_scanner_reuses_recent_payloads_and_reparses_only_changed_flights(tmp_path):
+    payloads = {"1": {"crewAssign": {"v": 1}}, "2": {"crewAssign": {"v": 1}}}
+    fetched, parsed = [], []
+    clock = _Clock()
+
+    def fake_preflight(config, flight_id, session=None):
+        fetched.append(flight_id)
+        return payloads[flight_id]
+
+    def parse(payload):
+        parsed.append(payload["crewAssign"]["v"])
+        return payload["crewAssign"]["v"]
+
+    store = PreflightDigestStore(tmp_path / "digests.json")
+    scanner = PreflightScanner(parse, store=store, fetch_preflight_fn=fake_preflight, clock=clock)
+    config = Fl3xxApiConfig()
+
+    first = scanner.scan(config, ["1", "2"])
+    assert first.new == ["1", "2"] and first.changed == [] and first.reparsed == 2
+
+    second = scanner.scan(config, ["1", "2"])
+    assert second.requests == 0 and second.reused_payloads == 2 and second.reparsed == 0
+
+    clock.now += 61
+    payloads["2"] = {"crewAssign": {"v": 2}}
+    fetched.clear()
+    third = scanner.scan(config, ["1", "2"])
+    assert sorted(fetched) == ["1", "2"]
+    assert third.changed == ["2"] and third.reparsed == 1
+    assert third.parsed == {"1": 1, "2": 2}
+    assert parsed == [1, 1, 2]
+
+    restarted = PreflightScanner(parse, store=PreflightDigestStore(tmp_path / "digests.json"), fetch_preflight_fn=fake_preflight)
+    after_restart = restarted.scan(config, ["1", "2"])
+    assert after_restart.changed == [] and after_restart.new == []
+
+
+def test_digest_store_drops_flights_not_seen_within_retention(tmp_path):
+    now = [datetime(2026, 10, 1, tzinfo=timezone.utc)]
+    store = PreflightDigestStore(tmp_path / "digests.json", retention_days=3, now_fn=lambda: now[0])
+    store.update({"1": "a", "2": "b"})
+
+    now[0] += timedelta(days=4)
+    store.update({"2": "c"})
+    reloaded = PreflightDigestStore(tmp_path / "digests.json")
+
+    assert reloaded.get("1") is None
+    assert reloaded.get(2) == "c"
+
+
+def test_each_session_sees_changes_and_unpolled_payloads_are_pruned(tmp_path):
+    payloads = {"1": {"v": 1}, "2": {"v": 1}}
+    clock = _Clock()
+    scanner = PreflightScanner(
+        lambda payload: payload["v"],
+        store=PreflightDigestStore(tmp_path / "digests.json"),
+        fetch_preflight_fn=lambda config, flight_id, session=None: payloads[flight_id],
+        clock=clock,
+    )
+    config = Fl3xxApiConfig()
+    session_a, session_b = {}, {}
+    scanner.scan(config, ["1", "2"], seen=session_a)
+    scanner.scan(config, ["1", "2"], seen=session_b)
+
+    clock.now += 61
+    payloads["1"] = {"v": 2}
+    assert scanner.scan(config, ["1"], seen=session_a).changed == ["1"]
+    assert scanner.scan(config, ["1"], seen=session_b).changed == ["1"]
+    assert scanner.scan(config, ["1"], seen=session_b).changed == []
+    assert len(scanner._payloads) == 1  # flight 2 was not polled again
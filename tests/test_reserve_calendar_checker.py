@@ -7,7 +7,9 @@ from reserve_calendar_checker import (
     TARGET_DATES,
     ReserveCheckResult,
     evaluate_flights_for_date,
+    group_reserve_dates,
     run_reserve_day_check,
+    select_reserve_dates_for_year,
     select_upcoming_reserve_dates,
 )
 
@@ -123,3 +125,61 @@ def test_run_reserve_day_check_fetches_flagged_rows(monkeypatch):
     assert date_result.rows[0]["Flight ID"] == "BK-3"
     assert date_result.diagnostics["club_matches"] == 1
     assert date_result.diagnostics["targeted_flights"] == 1
+
+
+def test_group_reserve_dates_merges_clustered_days():
+    dates = select_reserve_dates_for_year(2025)[-7:]
+    assert dates == [
+        dt.date(2025, 11, 6),
+        dt.date(2025, 11, 7),
+        dt.date(2025, 11, 11),
+        dt.date(2025, 12, 21),
+        dt.date(2025, 12, 26),
+        dt.date(2025, 12, 27),
+        dt.date(2025, 12, 28),
+    ]
+    assert group_reserve_dates(dates) == [
+        [dt.date(2025, 11, 6), dt.date(2025, 11, 7), dt.date(2025, 11, 11)],
+        [dt.date(2025, 12, 21), dt.date(2025, 12, 26), dt.date(2025, 12, 27), dt.date(2025, 12, 28)],
+    ]
+    assert group_reserve_dates(dates, max_gap_days=0) == [[value] for value in dates]
+
+
+def test_run_reserve_day_check_batches_flights_and_planning_notes(monkeypatch):
+    target_dates = [dt.date(2025, 12, 26), dt.date(2025, 12, 27), dt.date(2025, 12, 28)]
+    flights_payload = [
+        {
+            "flightId": f"F-{day.day}",
+            "tail": "C-GLXY",
+            "dep_time": f"{day.isoformat()}T18:00:00Z",
+            "departure_airport": "CYYZ",
+            "arrival_airport": "CYUL",
+            "workflowCustomName": "Club as available" if day.day == 27 else "Reserve Club",
+        }
+        for day in target_dates
+    ]
+    flight_requests = []
+    note_requests = []
+
+    def stub_fetch_flights(config, from_date, to_date, session=None):
+        flight_requests.append((from_date, to_date))
+        return flights_payload, {}
+
+    def stub_fetch_planning(config, flight_id, session=None):
+        note_requests.append(flight_id)
+        if flight_id == "F-28":
+            raise RuntimeError("timeout")
+        return {"note": "Club rotation"}
+
+    monkeypatch.setattr("reserve_calendar_checker.fetch_flights", stub_fetch_flights)
+    monkeypatch.setattr("reserve_calendar_checker.fetch_flight_planning_note", stub_fetch_planning)
+
+    result = run_reserve_day_check(Fl3xxApiConfig(), target_dates=target_dates, max_workers=4)
+
+    assert flight_requests == [(dt.date(2025, 12, 26), dt.date(2025, 12, 29))]
+    assert sorted(note_requests) == ["F-26", "F-27", "F-28"]
+    assert [len(date_result.rows) for date_result in result.dates] == [1, 1, 0]
+    assert [date_result.diagnostics["missing_as_available"] for date_result in result.dates] == [1, 0, 0]
+    assert result.warnings == ["2025-12-28: Unable to fetch planning note for flight F-28: timeout"]
+    assert result.diagnostics["flight_windows"] == 1
+    assert result.diagnostics["planning_note_requests"] == 3
@@ -0,0 +1,100 @@
+from datetime import UTC, datetime, timedelta
+import random
+
+from crew_presence import build_presence_index, crew_at_airport
+from roster_index import IntervalTree, SortedTimeline
+from roster_pull import build_crew_snapshots, build_roster_index
+
+
+def _dt(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 25, hour, minute, tzinfo=UTC)
+
+
+def test_interval_tree_matches_brute_force_point_and_range_queries() -> None:
+    rng = random.Random(7)
+    base = datetime(2026, 3, 1, tzinfo=UTC)
+    intervals = []
+    for idx in range(400):
+        start = base + timedelta(minutes=rng.randint(0, 20_000))
+        end = start + timedelta(minutes=rng.randint(0, 600))
+        intervals.append((start, end, idx))
+    tree = IntervalTree(intervals)
+
+    for _ in range(100):
+        lo = base + timedelta(minutes=rng.randint(0, 21_000))
+        hi = lo + timedelta(minutes=rng.randint(0, 300))
+        expected_point = sorted(idx for start, end, idx in intervals if start <= lo <= end)
+        expected_range = sorted(idx for start, end, idx in intervals if start <= hi and end >= lo)
+        assert sorted(tree.at(lo)) == expected_point
+        assert sorted(tree.overlapping(lo, hi)) == expected_range
+
+
+def test_sorted_timeline_tie_breaking_and_bounds() -> None:
+    events = [
+        {"name": "first", "end": _dt(10)},
+        {"name": "second", "end": _dt(10)},
+        {"name": "late", "end": _dt(12)},
+        {"name": "untimed", "end": None},
+    ]
+    timeline = SortedTimeline(events, "end")
+
+    assert len(timeline) == 3
+    assert timeline.latest_at_or_before(_dt(11))["name"] == "second"
+    assert timeline.latest_at_or_before(_dt(11), first_on_tie=True)["name"] == "first"
+    assert timeline.latest_at_or_before(_dt(9)) is None
+    assert timeline.first_after(_dt(10))["name"] == "late"
+    assert [event["name"] for event in timeline.between(_dt(10), _dt(12))] == ["first", "second", "late"]
+
+
+def test_presence_index_answers_repeated_time_queries() -> None:
+    roster_rows = [
+        {
+            "user": {"firstName": "Alex", "lastName": "Pilot", "fleet": "CJ2"},
+            "flights": [
+                {
+                    "fromAirport": "CYYZ",
+                    "toAirport": "CYYC",
+                    "departureTime": "2026-03-25T10:00:00Z",
+                    "arrivalTime": "2026-03-25T14:00:00Z",
+                },
+                {
+                    "fromAirport": "CYYC",
+                    "toAirport": "CYVR",
+                    "departureTime": "2026-03-25T16:00:00Z",
+                    "arrivalTime": "2026-03-25T17:30:00Z",
+                },
+            ],
+            "entries": [],
+        }
+    ]
+    index = build_presence_index(roster_rows)
+
+    assert crew_at_airport(index, at_time=_dt(12), airport="CYYC", fleet="CJ2") == []
+    at_cyyc = crew_at_airport(index, at_time=_dt(15), airport="CYYC", fleet="CJ2")
+    assert [item.crew_name for item in at_cyyc] == ["Alex Pilot"]
+    assert crew_at_airport(index, at_time=_dt(16, 30), airport="CYYC", fleet="CJ2") == []
+    assert len(crew_at_airport(index, at_time=_dt(18), airport="CYVR", fleet="CJ2")) == 1
+
+
+def test_snapshots_from_index_match_row_based_results() -> None:
+    rows = [
+        {
+            "user": {"firstName": "Jamie", "lastName": "Crew", "personnelNumber": "42"},
+            "entries": [
+                {"type": "P", "from": "2026-03-25T08:00:00Z", "to": "2026-03-25T09:00:00Z", "toAirport": "CYUL"},
+            ],
+            "flights": [
+                {
+                    "departureTime": "2026-03-25T11:00:00Z",
+                    "arrivalTime": "2026-03-25T12:00:00Z",
+                    "departureAirport": "CYUL",
+                    "arrivalAirport": "CYYZ",
+                }
+            ],
+        }
+    ]
+    index = build_roster_index(rows)
+
+    for hour in (7, 8, 10, 11, 13):
+        assert build_crew_snapshots(index, _dt(hour)) == build_crew_snapshots(rows, _dt(hour))
+    assert build_crew_snapshots(index, _dt(11, 30))[0].current_airport == "CYUL"
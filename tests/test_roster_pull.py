@@ -1,6 +1,16 @@
 from datetime import UTC, datetime
+import json
 
-from roster_pull import build_crew_snapshots, filter_active_roster_rows, parse_roster_payload
+import pytest
+
+from roster_pull import (
+    build_crew_snapshots,
+    build_roster_index,
+    filter_active_roster_rows,
+    iter_crew_records,
+    iter_roster_rows,
+    parse_roster_payload,
+)
 
 
 def test_parse_roster_payload_supports_escaped_json_string() -> None:
@@ -57,3 +67,63 @@ def test_build_crew_snapshots_reports_available_and_location() -> None:
     assert snapshots[0].personnel_number == "200"
     assert snapshots[0].current_airport == "CYYZ"
     assert snapshots[0].available is False
+
+
+def _chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[idx : idx + size] for idx in range(0, len(data), size)]
+
+
+def test_iter_roster_rows_matches_full_parse_for_any_chunk_size() -> None:
+    rows = [
+        {"user": {"personnelNumber": str(idx), "lastName": "Ménard"}, "entries": [{"type": "A", "n": 1.5}], "flights": []}
+        for idx in range(5)
+    ]
+    payload = json.dumps({"meta": {"count": 5}, "total": 12, "staff": rows}, ensure_ascii=False).encode("utf-8")
+
+    for size in (1, 2, 3, 7, 64, len(payload)):
+        assert list(iter_roster_rows(_chunks(payload, size))) == rows
+
+
+def test_iter_roster_rows_accepts_bare_list_and_single_row_object() -> None:
+    assert list(iter_roster_rows(['[{"user": {"id": 1}}', ", 3, ", '{"user": {"id": 2}}]'])) == [
+        {"user": {"id": 1}},
+        {"user": {"id": 2}},
+    ]
+    assert list(iter_roster_rows(['{"user": {"id": 7}, "entries": []}'])) == [{"user": {"id": 7}, "entries": []}]
+
+
+def test_iter_roster_rows_yields_rows_before_payload_completes() -> None:
+    def _truncated_download():
+        yield b'{"data": [{"user": {"id": 1}, "entries": [{"type": "P"}]},'
+        raise AssertionError("first row should be yielded before reading more")
+
+    stream = iter_roster_rows(_truncated_download())
+
+    assert next(stream) == {"user": {"id": 1}, "entries": [{"type": "P"}]}
+
+
+def test_iter_roster_rows_rejects_truncated_payload() -> None:
+    with pytest.raises(ValueError):
+        list(iter_roster_rows(['[{"user": {"id": 1}}, {"user": ']))
+
+
+def test_iter_crew_records_filters_and_indexes_streamed_rows() -> None:
+    payload = json.dumps(
+        [
+            {"user": {"personnelNumber": "1"}, "entries": [], "flights": [], "extra": "x" * 50},
+            {
+                "user": {"personnelNumber": "2", "firstName": "Casey"},
+                "entries": [{"type": "OFF", "from": "2026-03-25T00:00:00Z", "to": "2026-03-25T23:59:00Z"}],
+                "flights": [],
+                "extra": "y",
+            },
+        ]
+    )
+
+    records = list(iter_crew_records(iter_roster_rows([payload])))
+
+    assert [record.row["user"]["personnelNumber"] for record in records] == ["2"]
+    assert "extra" not in records[0].row
+    assert records[0].events[0]["type"] == "OFF"
+    snapshots = build_crew_snapshots(build_roster_index(records), datetime(2026, 3, 25, 12, tzinfo=UTC))
+    assert [snapshot.name for snapshot in snapshots] == ["Casey"]
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from route_scanning import (
+    DEFAULT_WATCH_LIST,
+    RouteScanner,
+    parse_watch_lists,
+    scan_flights,
+    tokenize_route,
+)
+
+
+def test_scanner_matches_exact_procedure_prefix_and_airway_terms():
+    scanner = RouteScanner(
+        {
+            "Oceanic": ["rovma", "OWEBO", "Q*"],
+            "Mountain": ["ROZ*", "J522", "KUGTC"],
+        }
+    )
+
+    route = "CYYC ROVMA3A ROVMA J522 ROZZL/N0450F410 QUIRK Q984 KLAS"
+    assert tokenize_route(route.lower())[:3] == ["CYYC", "ROVMA3A", "ROVMA"]
+    assert scanner.scan(route) == {
+        "Mountain": ["J522", "ROZ*"],
+        "Oceanic": ["Q*", "rovma"],
+    }
+    assert scanner.scan("KPSP.KUGTC2.OWEBO DCT CYVR") == {"Mountain": ["KUGTC"], "Oceanic": ["OWEBO"]}
+    assert scanner.scan("CYYC QUIRK XROVMAY ROVMAX KLAS") == {}
+    assert scanner.scan(route) == scanner.scan(route)
+
+
+def test_short_wildcards_only_match_airways():
+    scanner = RouteScanner({"Watchlist": ["RO*", "ROV*", "q*", "RO*"]})
+
+    assert scanner.airway_wildcards == ["RO*", "q*"]
+    assert scanner.scan("CYYC ROVMA ROZZL KLAS") == {"Watchlist": ["ROV*"]}
+    assert scanner.scan("CYYC ROZZL RO12 QUIRK Q984 KLAS") == {"Watchlist": ["RO*", "q*"]}
+    assert RouteScanner({"Watchlist": ["ROVMA", "ROV*"]}).airway_wildcards == []
+
+
+def test_scan_flights_tokenizes_each_route_once_and_reports_timings():
+    shared = "CYYC ROVMA3 ROVMA J500 KPSP"
+    flights = [
+        {"flightId": 1, "route": shared, "aircraftRegistration": "C-GASR", "departure": {"icao": "CYYC"},
+         "destination": "KPSP", "departureTime": "2026-10-18T15:00:00Z"},
+        {"flightId": 2, "route": shared, "tail": "C-FJAS", "departureTime": "2026-10-18 09:00"},
+        {"flightId": 3, "route": "CYYC DUBUM KLAS"},
+        {"flightId": 4, "route": "  "},
+        {"flightId": 5},
+    ]
+
+    result = scan_flights(flights, RouteScanner({"Watchlist": ["ROVMA", "KUGTC"]}))
+
+    assert result.flights_scanned == 5
+    assert result.routes_scanned == 2 and result.tokens_scanned == 8
+    assert result.total_seconds >= result.match_seconds >= 0
+    assert [match.flight_id for match in result.matches] == ["1", "2"]
+    first, second = result.matches
+    assert (first.tail, first.departure_airport, first.arrival_airport) == ("CGASR", "CYYC", "KPSP")
+    assert first.departure_time == datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+    assert first.matched_terms == ["ROVMA"] and first.watch_lists == {"Watchlist": ["ROVMA"]}
+    assert (second.tail, second.arrival_airport) == ("CFJAS", "—")
+    assert second.departure_time == datetime(2026, 10, 18, 9, tzinfo=timezone.utc)
+
+
+def test_parse_watch_lists_reads_named_and_unnamed_lines():
+    text = "Oceanic: OWEBO, ROVMA\nKUGTC ROZZL\n\nAirways: Q*,  J5*\nOceanic: ROZ*"
+
+    watch_lists = parse_watch_lists(text)
+
+    assert watch_lists == {
+        "Oceanic": ["OWEBO", "ROVMA", "ROZ*"],
+        DEFAULT_WATCH_LIST: ["KUGTC", "ROZZL"],
+        "Airways": ["Q*", "J5*"],
+    }
+    assert not RouteScanner(parse_watch_lists(" \n*"))
@@ -1,11 +1,13 @@
 import datetime as dt
 from typing import Dict, List
 
+import pandas as pd
+
 from flight_following_reports import (
     DutyStartCollection,
     compute_short_turn_summary_for_collection,
 )
-from short_turn_utils import summarize_short_turns
+from short_turn_utils import compute_short_turns, summarize_short_turns
 
 
 def _build_flight(
@@ -119,6 +121,46 @@ def test_summarize_short_turns_respects_priority_threshold_override() -> None:
     assert "None" in summary_text_override
 
 
+def test_compute_short_turns_pairs_next_departure_per_tail_and_station() -> None:
+    legs = pd.DataFrame(
+        [
+            # Arrival at CYEG; the departure at the exact same minute is not a turn.
+            {"tail": "C-GAAA", "leg_id": "A1", "dep_airport": "CYYC", "arr_airport": "CYEG",
+             "dep_offblock": "2024-10-23T14:00:00Z", "arr_onblock": "2024-10-23T15:00:00Z"},
+            {"tail": "C-GAAA", "leg_id": "A2", "dep_airport": "CYEG", "arr_airport": "CYVR",
+             "dep_offblock": "2024-10-23T15:00:00Z", "arr_onblock": "2024-10-23T15:10:00Z"},
+            {"tail": "C-GAAA", "leg_id": "A3", "dep_airport": "CYEG", "arr_airport": "CYYZ",
+             "dep_offblock": "2024-10-23T15:30:00Z", "arr_onblock": "2024-10-23T18:00:00Z"},
+            # Another tail departing CYEG must not be paired with C-GAAA.
+            {"tail": "C-GBBB", "leg_id": "B1", "dep_airport": "CYEG", "arr_airport": "CYYC",
+             "dep_offblock": "2024-10-23T15:05:00Z", "arr_onblock": "2024-10-23T16:00:00Z"},
+        ]
+    )
+
+    short_df = compute_short_turns(legs, threshold_min=45)
+
+    assert short_df[["tail", "station", "arr_leg_id", "dep_leg_id", "turn_min"]].to_dict("records") == [
+        {"tail": "C-GAAA", "station": "CYEG", "arr_leg_id": "A1", "dep_leg_id": "A3", "turn_min": 30.0}
+    ]
+    assert short_df.loc[0, "arr_account_name"] is None
+    assert compute_short_turns(legs, threshold_min=15).empty
+
+
+def test_compute_short_turns_never_pairs_legs_without_a_tail() -> None:
+    legs = pd.DataFrame(
+        [
+            {"tail": None, "leg_id": "N1", "dep_airport": "CYYC", "arr_airport": "CYEG",
+             "dep_offblock": "2024-10-23T14:00:00Z", "arr_onblock": "2024-10-23T15:00:00Z"},
+            {"tail": float("nan"), "leg_id": "N2", "dep_airport": "CYEG", "arr_airport": "CYVR",
+             "dep_offblock": "2024-10-23T15:10:00Z", "arr_onblock": "2024-10-23T16:00:00Z"},
+            {"tail": None, "leg_id": "N3", "dep_airport": "CYEG", "arr_airport": "CYVR",
+             "dep_offblock": "2024-10-23T15:20:00Z", "arr_onblock": "2024-10-23T16:30:00Z"},
+        ]
+    )
+
+    assert compute_short_turns(legs, threshold_min=45).empty
+
+
 def test_compute_short_turn_summary_for_collection_extracts_flights() -> None:
     target_date = dt.date(2024, 10, 23)
     collection = DutyStartCollection(
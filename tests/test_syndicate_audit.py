@@ -0,0 +1,90 @@
+from datetime import date
+import random
+import threading
+
+from fl3xx_api import Fl3xxApiConfig
+from syndicate_audit import AccountIndex, _find_fuzzy_account_match, _normalize_name, run_syndicate_audit
+
+
+def _flight(flight_id, day, account, flight_type="PAX"):
+    return {
+        "flightId": flight_id,
+        "flightType": flight_type,
+        "accountName": account,
+        "blockOffEstUTC": f"{day.isoformat()}T16:00:00Z",
+        "airportFrom": "CYYC",
+        "airportTo": "CYVR",
+        "registrationNumber": "C-GASR",
+    }
+
+
+def test_account_index_matches_linear_fuzzy_scan():
+    rng = random.Random(4)
+    words = ["smith", "holdings", "jane", "doe", "capital", "family", "trust", "aviation", "mc", "ltd"]
+    accounts = {}
+    for _ in range(60):
+        name = _normalize_name(" ".join(rng.choice(words) for _ in range(rng.randint(1, 4))))
+        accounts.setdefault(name, name.title())
+    index = AccountIndex(accounts)
+
+    partners = list(accounts) + ["smith", "smith holdings", "jane doe capitl", "family trusts", "nobody", ""]
+    for account in list(accounts)[:20]:
+        partners.append(account[:-1])
+        partners.append(account.replace(" ", "", 1))
+
+    for partner in partners:
+        assert index.match(partner) == _find_fuzzy_account_match(partner, accounts), partner
+
+
+def test_range_audit_checks_partners_per_day_and_fetches_preflights_concurrently():
+    day_one, day_two = date(2025, 5, 5), date(2025, 5, 6)
+    flights = [
+        _flight("1", day_one, "Jane Doe Capital"),
+        _flight("2", day_one, "Smith Holdings Ltd"),
+        _flight("3", day_two, "Jane Doe Capital"),
+        _flight("4", day_two, "Robert Family Trust"),
+        _flight("5", day_two, "Smith Holdings Ltd", flight_type="POS"),
+    ]
+    notes = {
+        "1": {"bookingNotes": "CJ3\nSyndicate: Smith Holdings"},
+        "3": {"bookingNotes": "CJ3\nSyndicate: Smith Holdings"},
+        "4": {"bookingNotes": "Partner: N/A"},
+    }
+    threads = set()
+    requested = []
+
+    def fake_flights(config, *, from_date, to_date, session=None):
+        requested.append((from_date, to_date))
+        return flights, {}
+
+    def fake_preflight(config, flight_id, *, session=None):
+        threads.add(threading.get_ident())
+        if flight_id == "2":
+            raise RuntimeError("boom")
+        return notes[flight_id]
+
+    result = run_syndicate_audit(
+        Fl3xxApiConfig(),
+        target_date=day_one,
+        end_date=day_two,
+        session=object(),
+        max_workers=4,
+        fetch_flights_fn=fake_flights,
+        fetch_preflight_fn=fake_preflight,
+    )
+
+    assert requested == [(day_one, date(2025, 5, 7))]
+    assert [(entry.flight_date, entry.partner_present, entry.partner_match) for entry in result.entries] == [
+        (day_one, True, "Smith Holdings Ltd"),
+        (day_two, False, None),
+    ]
+    assert result.diagnostics["preflight_requests"] == 4
+    assert result.diagnostics["preflight_errors"] == 1
+    assert result.warnings == ["2025-05-05: Unable to fetch preflight for flight 2: boom"]
+    assert threading.get_ident() not in threads
+    assert set(result.diagnostics["timings"]) == {
+        "flights_request_s",
+        "preflight_requests_s",
+        "partner_matching_s",
+        "total_s",
+    }
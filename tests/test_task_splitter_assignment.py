@@ -1,3 +1,5 @@
+import itertools
+import random
 import sys
 import types
 from datetime import date, datetime
@@ -7,6 +9,8 @@ from zoneinfo import ZoneInfo
 import pytest
 import pandas as pd
 
+import task_splitter
+
 
 class _ContextStub:
     def __enter__(self):
@@ -167,13 +171,13 @@ def assign_preference_weighted(task_splitter_module):
 
 
 @pytest.fixture
-def is_easterly_offset(task_splitter_module):
-    return task_splitter_module._is_easterly_offset
+def is_easterly_offset():
+    return task_splitter._is_easterly_offset
 
 
 @pytest.fixture
-def is_westerly_offset(task_splitter_module):
-    return task_splitter_module._is_westerly_offset
+def is_westerly_offset():
+    return task_splitter._is_westerly_offset
 
 
 def test_force_easterly_option_moves_work_when_needed(TailPackage, assign_preference_weighted):
@@ -415,3 +419,54 @@ def test_is_westerly_offset_bounds(is_westerly_offset):
     assert is_westerly_offset(-7.0)
     assert not is_westerly_offset(-6.0)
     assert not is_westerly_offset(-4.0)
+
+
+def test_solver_matches_brute_force_and_reports_improvements():
+    rng = random.Random(3)
+    workloads = [rng.choice([14, 15, 18, 22]) for _ in range(7)]
+    penalties = [[rng.choice([0, 4, 8, 20]) for _ in range(3)] for _ in workloads]
+    targets = [sum(workloads) // 3] * 3
+    expected = [len(workloads) / 3] * 3
+
+    def _cost(choices):
+        cost = sum(penalties[i][shift] for i, shift in enumerate(choices))
+        for shift in range(3):
+            members = [i for i, chosen in enumerate(choices) if chosen == shift]
+            cost += task_splitter._shift_cost(
+                len(members), sum(workloads[i] for i in members), expected[shift], targets[shift]
+            )
+        return cost
+
+    best = min(_cost(choices) for choices in itertools.product(range(3), repeat=len(workloads)))
+    seen = []
+    result = task_splitter.solve_shift_assignment(
+        workloads,
+        penalties,
+        targets,
+        expected,
+        time_budget=None,
+        on_improvement=lambda choices, cost: seen.append(cost),
+    )
+
+    assert result.optimal
+    assert result.cost == pytest.approx(best)
+    assert _cost(result.choices) == pytest.approx(best)
+    assert seen == sorted(seen, reverse=True)
+    assert seen[-1] == pytest.approx(best)
+
+
+def test_busy_day_is_balanced_within_time_budget(TailPackage):
+    zones = ["America/Toronto", "America/Chicago", "America/Edmonton", "America/Vancouver"]
+    rng = random.Random(11)
+    packages = []
+    for i in range(60):
+        tail = _make_tail(TailPackage, f"T{i}", zones[i % len(zones)])
+        tail.workload = 2.5 + rng.randint(1, 5)
+        packages.append(tail)
+    labels = ["0400", "0500", "0600", "0700", "0800"]
+
+    buckets = task_splitter.assign_preference_weighted(packages, labels, time_budget=0.5)
+
+    counts = [len(buckets[label]) for label in labels]
+    assert sum(counts) == len(packages)
+    assert max(counts) - min(counts) <= 1
@@ -0,0 +1,234 @@
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+import imaplib
+import io
+import re
+
+import pandas as pd
+
+from tracking_email_ingest import TrackingMailbox, find_attachment_part, parse_imap_list
+
+SENDER = "no-reply@telematics.guru"
+SUBJECT = "ASP TRACKING EMAIL"
+FILENAME = "IOCCReport-2ndIteration.csv"
+
+
+def _quote(value):
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _params(pairs):
+    if not pairs:
+        return "NIL"
+    return "(" + " ".join(f"{_quote(key.upper())} {_quote(value)}" for key, value in pairs) + ")"
+
+
+def _bodystructure(part):
+    if part.is_multipart():
+        children = "".join(_bodystructure(child) for child in part.get_payload())
+        return f"({children} {_quote(part.get_content_subtype().upper())} {_params([('boundary', part.get_boundary())])} NIL NIL)"
+    raw = part.get_payload(decode=False).encode("ascii")
+    params = [(key, value) for key, value in part.get_params()[1:]]
+    encoding = part.get("Content-Transfer-Encoding", "7BIT").upper()
+    disposition = "NIL"
+    if part.get("Content-Disposition"):
+        disposition = f"({_quote(part.get_content_disposition().upper())} {_params([('filename', part.get_filename())])})"
+    line_count = raw.count(b"\n")
+    lines = f" {line_count}" if part.get_content_maintype() == "text" else ""
+    return (
+        f"({_quote(part.get_content_maintype().upper())} {_quote(part.get_content_subtype().upper())} "
+        f"{_params(params)} NIL NIL {_quote(encoding)} {len(raw)}{lines} NIL {disposition} NIL)"
+    )
+
+
+class FakeImapServer:
+    """In-memory stand-in for the parts of ``imaplib.IMAP4_SSL`` the mailbox uses."""
+
+    def __init__(self):
+        self.messages = {}
+        self.next_uid = 1
+        self.uidvalidity = 7
+        self.commands = []
+        self.fetched_bytes = 0
+        self.connections = 0
+        self.refuse_connections = False
+        self.live = set()
+
+    def add(self, csv_text=None, *, sender=SENDER, subject=SUBJECT, filename=FILENAME):
+        message = MIMEMultipart()
+        message["From"] = sender
+        message["Subject"] = subject
+        message.attach(MIMEText("Report attached."))
+        if csv_text is not None:
+            attachment = MIMEApplication(csv_text.encode("utf-8"), Name=filename)
+            attachment["Content-Disposition"] = f'attachment; filename="{filename}"'
+            message.attach(attachment)
+        self.messages[self.next_uid] = message
+        self.next_uid += 1
+
+    def connect(self):
+        if self.refuse_connections:
+            raise OSError("connection refused")
+        self.connections += 1
+        return _FakeConnection(self, self.connections)
+
+    def drop_connections(self):
+        self.live.clear()
+
+
+class _FakeConnection:
+    def __init__(self, server, number):
+        self.server = server
+        self.number = number
+        server.live.add(number)
+
+    def _check(self):
+        if self.number not in self.server.live:
+            raise imaplib.IMAP4.abort("socket error: EOF")
+
+    def login(self, account, password):
+        self._check()
+        return "OK", [b"Logged in"]
+
+    def select(self, mailbox, readonly=False):
+        self._check()
+        return "OK", [str(len(self.server.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self.server.uidvalidity).encode()]
+
+    def noop(self):
+        self._check()
+        return "OK", [b"NOOP completed"]
+
+    def logout(self):
+        self.server.live.discard(self.number)
+        return "BYE", [b""]
+
+    def uid(self, command, *args):
+        self._check()
+        self.server.commands.append((command, args[-1]))
+        if command == "SEARCH":
+            return "OK", [" ".join(str(uid) for uid in self._search(args[-1])).encode()]
+        uid, query = int(args[0]), args[1]
+        message = self.server.messages[uid]
+        if query == "(BODYSTRUCTURE)":
+            return "OK", [f"1 (UID {uid} BODYSTRUCTURE {_bodystructure(message)})".encode()]
+        section = re.fullmatch(r"\(BODY\.PEEK\[(.*)\]\)", query).group(1)
+        body = message.as_bytes() if not section else message.get_payload(int(section) - 1).get_payload().encode()
+        self.server.fetched_bytes += len(body)
+        return "OK", [(f"1 (UID {uid} BODY[{section}] {{{len(body)}}}".encode(), body), b")"]
+
+    def _search(self, criteria):
+        sender = re.search(r'FROM "([^"]*)"', criteria).group(1)
+        subject = re.search(r'SUBJECT "([^"]*)"', criteria).group(1)
+        uids = [
+            uid for uid, message in self.server.messages.items()
+            if sender in message["From"] and subject in message["Subject"]
+        ]
+        uid_range = re.search(r"UID (\d+):\*", criteria)
+        if uid_range and uids:
+            low = int(uid_range.group(1))
+            uids = [uid for uid in uids if uid >= low] or [max(uids)]
+        return uids
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _mailbox(server, clock=None, parsed=None):
+    def parse(payload):
+        if parsed is not None:
+            parsed.append(payload)
+        return pd.read_csv(io.BytesIO(payload))
+
+    return TrackingMailbox(
+        account="ops@example.com",
+        password="secret",
+        sender=SENDER,
+        subject=SUBJECT,
+        filename=FILENAME,
+        parse_fn=parse,
+        connect_fn=server.connect,
+        clock=clock or _Clock(),
+    )
+
+
+def test_poll_fetches_only_new_attachment_parts_and_reuses_parsed_reports():
+    server = FakeImapServer()
+    server.add("Name,Last Location\nC-GASR ASP,McCall Hangar\n")
+    server.add("Name,Last Location\nC-GZZZ ASP,Palmer Hangar\n", subject="OTHER")
+    parsed = []
+    mailbox = _mailbox(server, parsed=parsed)
+
+    first = mailbox.poll()
+    assert first.error is None and first.new_messages == 1 and first.reparsed
+    assert list(first.frame["Name"]) == ["C-GASR ASP"]
+    assert ("FETCH", "(BODY.PEEK[2])") in server.commands
+    assert all(query != "(BODY.PEEK[])" for _, query in server.commands)
+
+    server.commands.clear()
+    second = mailbox.poll()
+    assert second.new_messages == 0 and second.frame is first.frame
+    assert [command for command, _ in server.commands] == ["SEARCH"]
+
+    server.add("Name,Last Location\nC-GASR ASP,McCall Hangar\n")
+    third = mailbox.poll()
+    assert third.new_messages == 1 and not third.reparsed and third.frame is first.frame
+
+    server.add("Name,Last Location\nC-FNEW ASP,Palmer Hangar\n")
+    fourth = mailbox.poll()
+    assert fourth.reparsed and list(fourth.frame["Name"]) == ["C-FNEW ASP"]
+    assert len(parsed) == 2
+    assert server.connections == 1
+
+
+def test_poll_reconnects_after_drop_and_backs_off_when_server_is_down():
+    server = FakeImapServer()
+    server.add("Name\nC-GASR\n")
+    clock = _Clock()
+    mailbox = _mailbox(server, clock=clock)
+    assert mailbox.poll().error is None
+
+    server.drop_connections()
+    server.add("Name\nC-GTWO\n")
+    after_drop = mailbox.poll()
+    assert after_drop.error is None and list(after_drop.frame["Name"]) == ["C-GTWO"]
+    assert server.connections == 2
+
+    server.drop_connections()
+    server.refuse_connections = True
+    failed = mailbox.poll()
+    assert failed.error and list(failed.frame["Name"]) == ["C-GTWO"]
+
+    clock.now += 5
+    waiting = mailbox.poll()
+    assert "retrying" in waiting.error
+    assert server.connections == 2
+
+    server.refuse_connections = False
+    server.add("Name\nC-GTHREE\n")
+    clock.now += 15
+    recovered = mailbox.poll()
+    assert recovered.error is None and list(recovered.frame["Name"]) == ["C-GTHREE"]
+
+
+def test_find_attachment_part_walks_nested_multipart_structure():
+    data = (
+        b'((("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 10 1 NIL NIL NIL)'
+        b'("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "QUOTED-PRINTABLE" 20 1 NIL NIL NIL) "ALTERNATIVE" NIL NIL NIL)'
+        b'("APPLICATION" "PDF" ("NAME" "summary.pdf") NIL NIL "BASE64" 30 NIL ("ATTACHMENT" ("FILENAME" "summary.pdf")) NIL)'
+        b'("TEXT" "CSV" ("NAME" {8}\r\nrpt .csv) NIL NIL "BASE64" 40 2 NIL ("ATTACHMENT" NIL) NIL) "MIXED" NIL NIL NIL)'
+    )
+
+    structure = parse_imap_list(data)[0]
+
+    assert find_attachment_part(structure, FILENAME) == ("3", "base64")
+    assert find_attachment_part(structure, "summary.pdf") == ("2", "base64")
+    assert find_attachment_part(structure[0], "missing.txt", suffix=".txt") is None
@@ -0,0 +1,441 @@
+"""Incremental IMAP ingestion of the telematics tracking e-mails.
+
+The ASP CYYC tracking page shows where each aircraft was last seen, from a CSV
+report the telematics provider e-mails every few minutes. :class:`TrackingMailbox`
+reads those e-mails without starting from scratch on every refresh:
+
+* one IMAP connection is kept open between polls and re-opened with an
+  exponential back-off when the server drops it;
+* the highest UID already seen is remembered, so each poll only searches for
+  newer messages and does nothing else when there are none;
+* only the CSV attachment's body part is downloaded, located from the
+  message's ``BODYSTRUCTURE`` rather than by fetching the whole message;
+* parsed DataFrames are cached by the SHA256 of the attachment, so a report
+  identical to one already parsed is not parsed again.
+
+Everything IMAP-specific goes through the small subset of :mod:`imaplib` used
+here (``login``, ``select``, ``response``, ``uid``, ``noop``, ``logout``), so a
+local stand-in object can replace the server in tests.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import base64
+import binascii
+import email
+import hashlib
+import imaplib
+import io
+from itertools import takewhile
+import quopri
+import re
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+DEFAULT_IMAP_SERVER = "imap.gmail.com"
+DEFAULT_IMAP_TIMEOUT_SECONDS = 30
+DEFAULT_RETRY_SECONDS = 15
+MAX_RETRY_SECONDS = 600
+# Parsed reports kept per mailbox; reports rarely repeat beyond the last few.
+FRAME_CACHE_SIZE = 8
+
+
+def read_tracking_csv(payload: bytes) -> pd.DataFrame:
+    """Parse a tracking report attachment into a DataFrame."""
+
+    return pd.read_csv(io.BytesIO(payload))
+
+
+# ---------------------------------------------------------------------------
+# IMAP response parsing
+# ---------------------------------------------------------------------------
+
+
+def _join_response(data: Sequence[Any]) -> bytes:
+    """Re-assemble an :mod:`imaplib` response, putting literals back inline."""
+
+    chunks: List[bytes] = []
+    for item in data:
+        if isinstance(item, tuple):
+            prefix, literal = item[0], item[1]
+            chunks.append(prefix + b"\r\n" + literal)
+        elif isinstance(item, bytes):
+            chunks.append(item)
+    return b"".join(chunks)
+
+
+_LITERAL = re.compile(rb"\{(\d+)\}\r\n")
+
+
+def parse_imap_list(data: bytes) -> List[Any]:
+    """Parse an IMAP response into nested lists.
+
+    Atoms become ``str``, quoted strings and literals ``bytes``, ``NIL``
+    ``None`` and parenthesized lists ``list``. Bracketed sections such as
+    ``BODY[2]`` stay part of their atom.
+    """
+
+    stack: List[List[Any]] = [[]]
+    position = 0
+    length = len(data)
+    while position < length:
+        char = data[position:position + 1]
+        if char in (b" ", b"\r", b"\n"):
+            position += 1
+        elif char == b"(":
+            stack.append([])
+            position += 1
+        elif char == b")":
+            if len(stack) == 1:
+                raise ValueError("Unbalanced ')' in IMAP response")
+            closed = stack.pop()
+            stack[-1].append(closed)
+            position += 1
+        elif char == b'"':
+            position += 1
+            value = bytearray()
+            while position < length and data[position:position + 1] != b'"':
+                if data[position:position + 1] == b"\\":
+                    position += 1
+                value += data[position:position + 1]
+                position += 1
+            stack[-1].append(bytes(value))
+            position += 1
+        elif char == b"{":
+            match = _LITERAL.match(data, position)
+            if not match:
+                raise ValueError("Malformed literal in IMAP response")
+            start = match.end()
+            end = start + int(match.group(1))
+            stack[-1].append(data[start:end])
+            position = end
+        else:
+            start = position
+            depth = 0
+            while position < length:
+                char = data[position:position + 1]
+                if char == b"[":
+                    depth += 1
+                elif char == b"]":
+                    depth -= 1
+                elif depth == 0 and char in (b" ", b"(", b")", b"\r", b"\n"):
+                    break
+                position += 1
+            atom = data[start:position].decode("ascii", "replace")
+            stack[-1].append(None if atom.upper() == "NIL" else atom)
+    if len(stack) != 1:
+        raise ValueError("Unbalanced '(' in IMAP response")
+    return stack[0]
+
+
+def _fetch_items(data: Sequence[Any]) -> dict:
+    """Return the ``{ATTRIBUTE: value}`` pairs of a single-message FETCH response."""
+
+    parsed = parse_imap_list(_join_response(data))
+    for item in parsed:
+        if isinstance(item, list):
+            return {str(item[i]).upper(): item[i + 1] for i in range(0, len(item) - 1, 2)}
+    raise ValueError("FETCH response has no attribute list")
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return "" if value is None else str(value)
+
+
+def _param_value(params: Any, name: str) -> Optional[str]:
+    if not isinstance(params, list):
+        return None
+    for index in range(0, len(params) - 1, 2):
+        if _text(params[index]).lower() == name:
+            return _text(params[index + 1])
+    return None
+
+
+def _part_filename(part: List[Any]) -> Optional[str]:
+    for extension in part[7:]:
+        if isinstance(extension, list) and len(extension) == 2 and isinstance(extension[1], list):
+            filename = _param_value(extension[1], "filename")
+            if filename:
+                return filename
+    return _param_value(part[2], "name")
+
+
+def find_attachment_part(
+    structure: List[Any],
+    filename: str,
+    *,
+    suffix: str = ".csv",
+) -> Optional[Tuple[str, str]]:
+    """Return ``(part_number, transfer_encoding)`` of the first matching attachment.
+
+    ``structure`` is a parsed ``BODYSTRUCTURE``. Parts are visited in the same
+    order :meth:`email.message.Message.walk` visits them, and the first one
+    named ``filename`` or ending in ``suffix`` wins.
+    """
+
+    def _walk(node: List[Any], number: str) -> Optional[Tuple[str, str]]:
+        if node and isinstance(node[0], list):
+            # A multipart body lists its parts first, then its subtype and extensions.
+            children = list(takewhile(lambda child: isinstance(child, list), node))
+            for index, child in enumerate(children, start=1):
+                found = _walk(child, f"{number}.{index}" if number else str(index))
+                if found:
+                    return found
+            return None
+        if len(node) < 7:
+            return None
+        name = (_part_filename(node) or "").strip()
+        if name and (name == filename or name.lower().endswith(suffix)):
+            return number or "1", _text(node[5]).lower()
+        return None
+
+    return _walk(structure, "")
+
+
+def decode_transfer_encoding(payload: bytes, encoding: str) -> bytes:
+    """Decode a body part fetched raw from the server."""
+
+    encoding = (encoding or "").lower()
+    if encoding == "base64":
+        return base64.b64decode(payload)
+    if encoding == "quoted-printable":
+        return quopri.decodestring(payload)
+    return payload
+
+
+def _attachment_from_message(raw: bytes, filename: str, suffix: str = ".csv") -> Optional[bytes]:
+    message = email.message_from_bytes(raw)
+    for part in message.walk():
+        if part.get_content_maintype() == "multipart" or part.get("Content-Disposition") is None:
+            continue
+        name = (part.get_filename() or "").strip()
+        if name and (name == filename or name.lower().endswith(suffix)):
+            return part.get_payload(decode=True)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Mailbox
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TrackingSnapshot:
+    """The latest tracking report as of one :meth:`TrackingMailbox.poll`.
+
+    ``frame`` is shared with the mailbox's cache and must not be modified.
+    ``error`` is set when the poll failed; ``frame`` is then the last report
+    that was read successfully.
+    """
+
+    frame: pd.DataFrame
+    uid: Optional[int] = None
+    digest: Optional[str] = None
+    new_messages: int = 0
+    reparsed: bool = False
+    fetched_bytes: int = 0
+    error: Optional[str] = None
+
+
+class TrackingMailbox:
+    """Poll one mailbox for the newest tracking report, incrementally.
+
+    Meant to live for the whole app (``st.cache_resource``); polls are
+    serialized with a lock because an IMAP connection is not thread safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        account: str,
+        password: str,
+        sender: str,
+        subject: str,
+        filename: str,
+        server: str = DEFAULT_IMAP_SERVER,
+        mailbox: str = "inbox",
+        parse_fn: Callable[[bytes], pd.DataFrame] = read_tracking_csv,
+        connect_fn: Optional[Callable[[], Any]] = None,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+        max_retry_seconds: float = MAX_RETRY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.account = account
+        self.password = password
+        self.sender = sender
+        self.subject = subject
+        self.filename = filename
+        self.mailbox = mailbox
+        self.parse_fn = parse_fn
+        self._connect_fn = connect_fn or (
+            lambda: imaplib.IMAP4_SSL(server, timeout=DEFAULT_IMAP_TIMEOUT_SECONDS)
+        )
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Any = None
+        self._uidvalidity: Optional[str] = None
+        self._last_uid = 0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._frames: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._latest = TrackingSnapshot(frame=pd.DataFrame())
+        self.connections_opened = 0
+
+    # -- connection --------------------------------------------------------
+
+    def _open(self) -> Any:
+        conn = self._connect_fn()
+        try:
+            conn.login(self.account, self.password)
+            status, _ = conn.select(self.mailbox, readonly=True)
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"Cannot select mailbox {self.mailbox!r}")
+            _, validity = conn.response("UIDVALIDITY")
+        except Exception:
+            self._logout(conn)
+            raise
+        uidvalidity = _text(validity[0]) if validity and validity[0] is not None else None
+        if uidvalidity != self._uidvalidity:
+            self._uidvalidity = uidvalidity
+            self._last_uid = 0
+        self.connections_opened += 1
+        return conn
+
+    @staticmethod
+    def _logout(conn: Any) -> None:
+        try:
+            conn.logout()
+        except Exception:  # pragma: no cover - the connection is already gone
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._logout(self._conn)
+                self._conn = None
+
+    # -- polling -------------------------------------------------------------
+
+    def poll(self) -> TrackingSnapshot:
+        """Return the newest report, reading only what changed since the last poll."""
+
+        with self._lock:
+            now = self._clock()
+            if self._failures and now < self._retry_at:
+                wait = int(self._retry_at - now) + 1
+                return self._stale(f"Tracking mailbox unavailable; retrying in {wait}s.")
+
+            reused = self._conn is not None
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = self._open()
+                    else:
+                        self._conn.noop()
+                    snapshot = self._poll_connected()
+                except (imaplib.IMAP4.error, OSError, ValueError) as exc:
+                    if self._conn is not None:
+                        self._logout(self._conn)
+                        self._conn = None
+                    if attempt == 0 and reused:
+                        continue
+                    self._failures += 1
+                    delay = min(self.retry_seconds * 2 ** (self._failures - 1), self.max_retry_seconds)
+                    self._retry_at = self._clock() + delay
+                    return self._stale(f"Could not read the tracking mailbox: {exc}")
+                self._failures = 0
+                return snapshot
+            raise AssertionError("unreachable")  # pragma: no cover
+
+    def _stale(self, error: str) -> TrackingSnapshot:
+        latest = self._latest
+        return TrackingSnapshot(frame=latest.frame, uid=latest.uid, digest=latest.digest, error=error)
+
+    def _search_new(self) -> List[int]:
+        criteria = f'(FROM "{self.sender}" SUBJECT "{self.subject}"'
+        if self._last_uid:
+            criteria += f" UID {self._last_uid + 1}:*"
+        status, data = self._conn.uid("SEARCH", None, criteria + ")")
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"SEARCH failed: {status}")
+        uids = [int(uid) for uid in _join_response(data).split() if uid.isdigit()]
+        # "UID n:*" always matches the newest message, even when it is older than n.
+        return sorted(uid for uid in uids if uid > self._last_uid)
+
+    def _fetch_attachment(self, uid: int) -> Tuple[Optional[bytes], int]:
+        status, data = self._conn.uid("FETCH", str(uid), "(BODYSTRUCTURE)")
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"FETCH BODYSTRUCTURE failed: {status}")
+        try:
+            structure = _fetch_items(data)["BODYSTRUCTURE"]
+            part = find_attachment_part(structure, self.filename)
+        except (KeyError, IndexError, TypeError, ValueError):
+            # Unusual structures are left to the email package, at the cost of
+            # downloading the whole message.
+            status, data = self._conn.uid("FETCH", str(uid), "(BODY.PEEK[])")
+            if status != "OK":
+                raise imaplib.IMAP4.error(f"FETCH BODY[] failed: {status}")
+            raw = _fetch_items(data).get("BODY[]") or b""
+            return _attachment_from_message(raw, self.filename), len(raw)
+        if part is None:
+            return None, 0
+        number, encoding = part
+        status, data = self._conn.uid("FETCH", str(uid), f"(BODY.PEEK[{number}])")
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"FETCH BODY[{number}] failed: {status}")
+        body = _fetch_items(data).get(f"BODY[{number}]") or b""
+        body = body if isinstance(body, bytes) else _text(body).encode("ascii")
+        try:
+            return decode_transfer_encoding(body, encoding), len(body)
+        except (binascii.Error, ValueError) as exc:
+            raise ValueError(f"Cannot decode attachment of message {uid}: {exc}") from exc
+
+    def _poll_connected(self) -> TrackingSnapshot:
+        new_uids = self._search_new()
+        if not new_uids:
+            latest = self._latest
+            return TrackingSnapshot(frame=latest.frame, uid=latest.uid, digest=latest.digest)
+
+        newest = new_uids[-1]
+        payload, fetched = self._fetch_attachment(newest)
+        self._last_uid = newest
+        if payload is None:
+            self._latest = TrackingSnapshot(frame=pd.DataFrame(), uid=newest)
+            return replace(self._latest, new_messages=len(new_uids), fetched_bytes=fetched)
+
+        digest = hashlib.sha256(payload).hexdigest()
+        frame = self._frames.get(digest)
+        reparsed = frame is None
+        if frame is None:
+            try:
+                frame = self.parse_fn(payload)
+            except Exception as exc:
+                snapshot = self._stale(f"Could not parse the tracking report in message {newest}: {exc}")
+                return replace(snapshot, new_messages=len(new_uids), fetched_bytes=fetched)
+            self._frames[digest] = frame
+            while len(self._frames) > FRAME_CACHE_SIZE:
+                self._frames.popitem(last=False)
+        else:
+            self._frames.move_to_end(digest)
+        self._latest = TrackingSnapshot(frame=frame, uid=newest, digest=digest)
+        return replace(self._latest, new_messages=len(new_uids), reparsed=reparsed, fetched_bytes=fetched)
+
+
+__all__ = [
+    "DEFAULT_IMAP_SERVER",
+    "TrackingMailbox",
+    "TrackingSnapshot",
+    "decode_transfer_encoding",
+    "find_attachment_part",
+    "parse_imap_list",
+    "read_tracking_csv",
+]